@@ -11,12 +11,14 @@ Subpackages:
     - shadow: Shadow管理
     - grand: GrandDigest管理
     - finalize: Finalize処理
+    - search: 全文検索
 
 Usage:
     from application import DigestTimesTracker
     from application.shadow import ShadowTemplate
     from application.grand import ShadowGrandDigestManager
     from application.finalize import ShadowValidator
+    from application.search import DigestSearchIndex
 
 Note:
     バリデーション関数は domain.validators から直接インポートしてください:
@@ -37,6 +39,9 @@ from application.grand import (
     ShadowGrandDigestManager,
 )
 
+# Search
+from application.search import ContextPackBuilder, DigestSearchIndex, SearchHit
+
 # Shadow
 from application.shadow import (
     FileDetector,
@@ -64,4 +69,8 @@ __all__ = [
     "ProvisionalLoader",
     "RegularDigestBuilder",
     "DigestPersistence",
+    # Search
+    "DigestSearchIndex",
+    "SearchHit",
+    "ContextPackBuilder",
 ]
@@ -33,6 +33,9 @@ from infrastructure.config import (
 )
 from infrastructure.config.error_messages import initialization_failed_message
 from infrastructure.config.persistent_path import get_config_path
+from infrastructure.delta_log import resolve_delta_threshold
+from infrastructure.sharded_json import resolve_shadow_layout
+from infrastructure.sqlite_store import resolve_storage_backend
 
 # Application Config専用logger
 _logger = logging.getLogger("episodic_rag.config")
@@ -148,6 +151,21 @@ class DigestConfig:
         """GrandDigest配置先"""
         return self._path_resolver.essences_path
 
+    @property
+    def storage_backend(self) -> str:
+        """ストレージバックエンド（"json" / "sqlite"、EPISODIC_RAG_STORAGE_BACKEND で上書き可能）"""
+        return resolve_storage_backend(self.config)
+
+    @property
+    def shadow_layout(self) -> str:
+        """ShadowGrandDigest の保存レイアウト（"single" / "sharded"、EPISODIC_RAG_SHADOW_LAYOUT）"""
+        return resolve_shadow_layout(self.config)
+
+    @property
+    def shadow_delta_threshold(self) -> int:
+        """Shadow の差分ログのコンパクションしきい値（バイト、0で無効）"""
+        return resolve_delta_threshold(self.config)
+
     def get_identity_file_path(self) -> Optional[Path]:
         """外部identityファイルのパス"""
         return self._path_resolver.get_identity_file_path()
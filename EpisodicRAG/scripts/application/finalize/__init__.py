@@ -9,9 +9,12 @@ Components:
     - ProvisionalLoader: Provisional読み込みまたは自動生成
     - RegularDigestBuilder: RegularDigest構造の構築
     - DigestPersistence: 保存・更新・クリーンアップ処理
+    - FinalizeJournal: finalize の先行書き込みジャーナル
+    - FinalizeRecovery: 未完了の finalize の再実行・ロールバック
 """
 
 from .digest_builder import RegularDigestBuilder
+from .journal import FinalizeJournal, FinalizeRecovery, FinalizeTransaction
 from .persistence import DigestPersistence
 from .provisional_loader import ProvisionalLoader
 from .shadow_validator import ShadowValidator
@@ -21,4 +24,7 @@ __all__ = [
     "ProvisionalLoader",
     "RegularDigestBuilder",
     "DigestPersistence",
+    "FinalizeJournal",
+    "FinalizeRecovery",
+    "FinalizeTransaction",
 ]
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Finalize Journal
+================
+
+finalize の5ステップ（RegularDigest / GrandDigest / Shadowカスケード /
+last_digest_times / Provisional削除）を先行書き込みジャーナル
+（Essences/FinalizeJournal.jsonl）に記録し、途中で落ちた finalize を
+次回起動時に再実行またはロールバックするアプリケーション層モジュール。
+
+## 設計意図
+
+ARCHITECTURE: Write-Ahead Log + Roll-forward Recovery
+- begin: 確定の計画（レベル・ダイジェスト名・番号・保存先・Provisional）を記録
+- intent / done: 各ステップの書き込み前後に1行ずつ記録
+- commit / abort: 完了・中止。未完了のトランザクションがなくなればジャーナルを空にする
+- 復旧はジャーナルを1回読むだけで、ディレクトリの再走査は行わない
+- 各ステップは "finalize.<step>" の span で囲まれ、所要時間がログに出力される
+
+復旧の判断:
+- RegularDigest が保存されていない（ファイルなし、または上書き前の古いファイル）
+  → 何も書き込まれていないのでロールバック（abort を記録するのみ）。
+  保存の完了（done）が記録されていなければ、intent に記録した内容ハッシュと
+  ファイルの内容を比べて保存済みかを判定する
+- 保存されている → 保存済みの RegularDigest を読み、未完了のステップを再実行
+  （ロールフォワード）。GrandDigest 更新・時刻記録・Provisional削除は冪等。
+  Shadowカスケードは冪等でないため、Shadow の状態から適用済みかを判定する。
+  確定したダイジェストの source_files が当該レベルの Shadow から消えている、
+  または確定したダイジェストが次レベルの Shadow の source_files にあれば適用済み
+
+Usage:
+    from application.finalize import DigestPersistence, FinalizeJournal, FinalizeRecovery
+
+    journal = FinalizeJournal(config.essences_path)
+    FinalizeRecovery(journal, persistence).recover()   # 起動時
+
+    txn = journal.begin("weekly", {"digest_name": "W0001_x", ...})
+    txn.run(STEP_REGULAR_DIGEST, lambda: persistence.save_regular_digest(...))
+    ...
+    txn.commit()
+"""
+
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, cast
+
+from domain.constants import LOG_PREFIX_STATE
+from domain.file_constants import FINALIZE_JOURNAL_FILENAME
+from domain.types import RegularDigestData
+from infrastructure import get_structured_logger, log_debug, log_warning, try_read_json_from_file
+from infrastructure.journal import AppendOnlyJournal
+from infrastructure.json_repository import content_hash
+
+if TYPE_CHECKING:
+    from .persistence import DigestPersistence
+
+__all__ = [
+    "FINALIZE_STEPS",
+    "STEP_REGULAR_DIGEST",
+    "STEP_GRAND_DIGEST",
+    "STEP_SHADOW_CASCADE",
+    "STEP_DIGEST_TIMES",
+    "STEP_PROVISIONAL_CLEANUP",
+    "FinalizeJournal",
+    "FinalizeRecovery",
+    "FinalizeTransaction",
+]
+
+_logger = get_structured_logger(__name__)
+
+STEP_REGULAR_DIGEST = "regular_digest"
+STEP_GRAND_DIGEST = "grand_digest"
+STEP_SHADOW_CASCADE = "shadow_cascade"
+STEP_DIGEST_TIMES = "digest_times"
+STEP_PROVISIONAL_CLEANUP = "provisional_cleanup"
+
+FINALIZE_STEPS = (
+    STEP_REGULAR_DIGEST,
+    STEP_GRAND_DIGEST,
+    STEP_SHADOW_CASCADE,
+    STEP_DIGEST_TIMES,
+    STEP_PROVISIONAL_CLEANUP,
+)
+
+# レコードの op
+_OP_BEGIN = "begin"
+_OP_INTENT = "intent"
+_OP_DONE = "done"
+_OP_COMMIT = "commit"
+_OP_ABORT = "abort"
+
+
+class FinalizeTransaction:
+    """
+    1回の finalize に対応するジャーナル上のトランザクション
+
+    Attributes:
+        txn_id: トランザクションID
+        level: 確定するレベル
+        plan: begin で記録した計画
+        intents: ステップ名 → intent に記録したデータ
+        completed: 完了済みのステップ名
+    """
+
+    def __init__(
+        self,
+        journal: "FinalizeJournal",
+        txn_id: str,
+        level: str,
+        plan: Dict[str, Any],
+    ):
+        self.journal = journal
+        self.txn_id = txn_id
+        self.level = level
+        self.plan = plan
+        self.intents: Dict[str, Dict[str, Any]] = {}
+        self.completed: Set[str] = set()
+
+    def is_done(self, step: str) -> bool:
+        """ステップが完了済みか"""
+        return step in self.completed
+
+    def intent(self, step: str, **data: Any) -> None:
+        """ステップの書き込み前に意図を記録"""
+        self.intents[step] = data
+        self.journal._append(self.txn_id, _OP_INTENT, step=step, data=data)
+
+    def done(self, step: str) -> None:
+        """ステップの完了を記録"""
+        self.completed.add(step)
+        self.journal._append(self.txn_id, _OP_DONE, step=step)
+
+    def run(self, step: str, action: Callable[[], Any], **intent_data: Any) -> None:
+        """
+        intent → action → done の順に実行（完了済みのステップは実行しない）
+
+        intent から done までを "finalize.<step>" の span として記録する。
+
+        Args:
+            step: ステップ名
+            action: ステップの書き込み処理
+            **intent_data: intent に記録するデータ
+        """
+        if self.is_done(step):
+            log_debug(f"{LOG_PREFIX_STATE} journal step already done: {step}")
+            return
+        with _logger.span(f"finalize.{step}", level=self.level, txn_id=self.txn_id):
+            self.intent(step, **intent_data)
+            action()
+            self.done(step)
+
+    def commit(self) -> None:
+        """トランザクションの完了を記録"""
+        self.journal._append(self.txn_id, _OP_COMMIT)
+        self.journal.compact()
+
+    def abort(self, reason: str) -> None:
+        """トランザクションの中止を記録"""
+        self.journal._append(self.txn_id, _OP_ABORT, data={"reason": reason})
+        self.journal.compact()
+
+
+class FinalizeJournal:
+    """
+    finalize の先行書き込みジャーナル
+
+    Attributes:
+        path: ジャーナルファイルのパス（Essences/FinalizeJournal.jsonl）
+
+    Example:
+        >>> journal = FinalizeJournal(config.essences_path)
+        >>> txn = journal.begin("weekly", {"digest_name": "W0001_x"})
+        >>> journal.pending()[0].txn_id == txn.txn_id
+        True
+    """
+
+    def __init__(self, essences_path: Path):
+        self._journal = AppendOnlyJournal(essences_path / FINALIZE_JOURNAL_FILENAME)
+
+    @property
+    def path(self) -> Path:
+        """ジャーナルファイルのパス"""
+        return self._journal.path
+
+    def _append(self, txn_id: str, op: str, **fields: Any) -> None:
+        record = {"txn": txn_id, "op": op, "at": datetime.now().isoformat(), **fields}
+        self._journal.append(record)
+
+    def begin(self, level: str, plan: Dict[str, Any]) -> FinalizeTransaction:
+        """
+        トランザクションを開始（計画を記録）
+
+        Args:
+            level: 確定するレベル
+            plan: digest_name / digest_number / digest_path / provisional_file 等
+
+        Returns:
+            FinalizeTransaction
+        """
+        txn = FinalizeTransaction(self, uuid.uuid4().hex[:12], level, plan)
+        self._append(txn.txn_id, _OP_BEGIN, level=level, data=plan)
+        return txn
+
+    def pending(self) -> List[FinalizeTransaction]:
+        """
+        commit / abort されていないトランザクション（ジャーナルを1回読むだけ）
+
+        Returns:
+            開始順の FinalizeTransaction リスト（intents / completed を復元済み）
+        """
+        transactions: Dict[str, FinalizeTransaction] = {}
+        for record in self._journal.read():
+            txn_id = str(record.get("txn", ""))
+            op = record.get("op")
+            if op == _OP_BEGIN:
+                plan = record.get("data") or {}
+                transactions[txn_id] = FinalizeTransaction(
+                    self, txn_id, str(record.get("level", "")), plan
+                )
+                continue
+            txn = transactions.get(txn_id)
+            if txn is None:
+                continue
+            if op in (_OP_COMMIT, _OP_ABORT):
+                del transactions[txn_id]
+            elif op == _OP_INTENT:
+                txn.intents[str(record.get("step"))] = record.get("data") or {}
+            elif op == _OP_DONE:
+                txn.completed.add(str(record.get("step")))
+        return list(transactions.values())
+
+    def compact(self) -> None:
+        """未完了のトランザクションがなければジャーナルを空にする"""
+        if not self.pending():
+            self._journal.truncate()
+
+
+class FinalizeRecovery:
+    """
+    ジャーナルに残った未完了の finalize を再実行またはロールバックする
+
+    Example:
+        >>> recovery = FinalizeRecovery(FinalizeJournal(essences), persistence)
+        >>> recovery.recover()
+        [{'txn': 'a1b2c3d4e5f6', 'level': 'weekly', 'action': 'replayed', 'steps': [...]}]
+    """
+
+    def __init__(self, journal: FinalizeJournal, persistence: "DigestPersistence"):
+        self.journal = journal
+        self.persistence = persistence
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        未完了の finalize をすべて処理
+
+        Returns:
+            トランザクションごとの結果
+            {"txn", "level", "action": "replayed" | "rolled_back", "steps": [再実行したステップ]}
+        """
+        results = []
+        for txn in self.journal.pending():
+            results.append(self._recover(txn))
+        return results
+
+    def _recover(self, txn: FinalizeTransaction) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"txn": txn.txn_id, "level": txn.level, "steps": []}
+        digest_path = Path(str(txn.plan.get("digest_path", "")))
+        regular_digest = (
+            try_read_json_from_file(digest_path, log_on_error=False)
+            if digest_path.is_file()
+            else None
+        )
+
+        if not isinstance(regular_digest, dict) or not self._regular_digest_written(
+            txn, regular_digest
+        ):
+            # RegularDigest が保存されていない: 以降のステップも未実行
+            txn.abort("regular digest not written")
+            _logger.info(f"未完了の確定処理をロールバック: {txn.level} ({txn.txn_id})")
+            result["action"] = "rolled_back"
+            return result
+
+        if not txn.is_done(STEP_REGULAR_DIGEST):
+            # 保存（アトミック）の直後、done の記録前に落ちた
+            txn.done(STEP_REGULAR_DIGEST)
+
+        if not txn.is_done(STEP_SHADOW_CASCADE) and self._cascade_applied(
+            txn.level, digest_path.name, cast(RegularDigestData, regular_digest)
+        ):
+            log_debug(f"{LOG_PREFIX_STATE} shadow already cascaded, skipping cascade")
+            txn.done(STEP_SHADOW_CASCADE)
+
+        pending_steps = [step for step in FINALIZE_STEPS if not txn.is_done(step)]
+        try:
+            self.persistence.replay(
+                txn,
+                str(txn.plan["digest_name"]),
+                int(txn.plan["digest_number"]),
+                cast(RegularDigestData, regular_digest),
+                _optional_path(txn.plan.get("provisional_file")),
+            )
+        except Exception as e:
+            log_warning(f"未完了の確定処理の再実行に失敗: {txn.level} ({txn.txn_id}): {e}")
+            raise
+        txn.commit()
+        _logger.info(f"未完了の確定処理を再実行: {txn.level} ({txn.txn_id}) steps={pending_steps}")
+        result["action"] = "replayed"
+        result["steps"] = pending_steps
+        return result
+
+    @staticmethod
+    def _regular_digest_written(txn: FinalizeTransaction, regular_digest: Dict[str, Any]) -> bool:
+        """
+        ファイルの RegularDigest がこのトランザクションで保存したものか
+
+        保存の完了が記録されていなければ、intent の内容ハッシュと比べる。
+        ハッシュのない intent では、上書き（existed）の場合に古いファイルと
+        区別できないため未保存とみなす。
+        """
+        if txn.is_done(STEP_REGULAR_DIGEST):
+            return True
+        intent = txn.intents.get(STEP_REGULAR_DIGEST, {})
+        expected = intent.get("content_hash")
+        if expected:
+            return content_hash(regular_digest) == str(expected)
+        return not intent.get("existed", False)
+
+    def _cascade_applied(
+        self, level: str, digest_file: str, regular_digest: RegularDigestData
+    ) -> bool:
+        """
+        Shadowカスケードが適用済みか（Shadow の内容から判定）
+
+        Args:
+            level: 確定したレベル
+            digest_file: 確定したダイジェストのファイル名
+            regular_digest: 保存済みのRegularDigest
+
+        Returns:
+            確定したソースが当該レベルの Shadow から消えている、または
+            確定したダイジェストが次レベルの Shadow に追加されていれば True
+        """
+        shadow_manager = self.persistence.shadow_manager
+        overall = regular_digest.get("overall_digest")
+        finalized_sources = (
+            set(overall.get("source_files") or []) if isinstance(overall, dict) else set()
+        )
+        if finalized_sources:
+            current = shadow_manager.get_shadow_digest_for_level(level)
+            current_sources = set(current["source_files"]) if current else set()
+            if not finalized_sources & current_sources:
+                return True
+
+        hierarchy = shadow_manager.level_hierarchy.get(level)
+        next_level = hierarchy["next"] if hierarchy else None
+        if next_level:
+            next_digest = shadow_manager.get_shadow_digest_for_level(next_level)
+            if next_digest and digest_file in next_digest["source_files"]:
+                return True
+        return False
+
+
+def _optional_path(value: Optional[Any]) -> Optional[Path]:
+    return Path(str(value)) if value else None
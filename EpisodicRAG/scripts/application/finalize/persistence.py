@@ -4,13 +4,19 @@ Digest Persistence
 ==================
 
 RegularDigestの保存、GrandDigest更新、カスケード処理を担当
+
+process_cascade_and_cleanup() / replay() に FinalizeTransaction を渡すと、
+各ステップの前後をジャーナルに記録し、完了済みのステップは実行しない
+（application.finalize.journal）。
 """
 
 from pathlib import Path
-from typing import Callable, Optional, cast
+from typing import TYPE_CHECKING, Callable, Optional, cast
 
 from application.config import DigestConfig
 from application.grand import GrandDigestManager, ShadowGrandDigestManager
+from application.search import DigestSearchIndex
+from application.storage import get_digest_store
 from application.tracking import DigestTimesTracker
 from domain.constants import (
     LEVEL_CONFIG,
@@ -31,6 +37,16 @@ from infrastructure import (
     save_json,
 )
 
+from .journal import (
+    STEP_DIGEST_TIMES,
+    STEP_GRAND_DIGEST,
+    STEP_PROVISIONAL_CLEANUP,
+    STEP_SHADOW_CASCADE,
+)
+
+if TYPE_CHECKING:
+    from .journal import FinalizeTransaction
+
 _logger = get_structured_logger(__name__)
 
 
@@ -44,6 +60,7 @@ class DigestPersistence:
         shadow_manager: ShadowGrandDigestManager,
         times_tracker: DigestTimesTracker,
         confirm_callback: Optional[Callable[[str], bool]] = None,
+        search_index: Optional[DigestSearchIndex] = None,
     ):
         """
         Args:
@@ -52,6 +69,7 @@ class DigestPersistence:
             shadow_manager: ShadowGrandDigestManager インスタンス
             times_tracker: DigestTimesTracker インスタンス
             confirm_callback: 確認コールバック関数（テスト用にモック可能）
+            search_index: 全文検索インデックス（省略時は初回保存時に生成）
         """
         self.config = config
         self.digests_path = config.digests_path
@@ -60,9 +78,29 @@ class DigestPersistence:
         self.times_tracker = times_tracker
         self.level_config = LEVEL_CONFIG
         self.confirm_callback = confirm_callback or get_default_confirm_callback()
+        self._search_index = search_index
+        # storage.backend が "sqlite" の場合は RegularDigest を DB にも記録
+        self._store = get_digest_store(config)
+
+    def regular_digest_path(self, level: str, new_digest_name: str) -> Path:
+        """
+        RegularDigestの保存先パス
+
+        Args:
+            level: ダイジェストレベル
+            new_digest_name: 新しいダイジェスト名
+
+        Returns:
+            {digests_path}/{レベルのディレクトリ}/{new_digest_name}.txt
+        """
+        return self.digests_path / str(self.level_config[level]["dir"]) / f"{new_digest_name}.txt"
 
     def save_regular_digest(
-        self, level: str, regular_digest: RegularDigestData, new_digest_name: str
+        self,
+        level: str,
+        regular_digest: RegularDigestData,
+        new_digest_name: str,
+        update_search_index: bool = True,
     ) -> Path:
         """
         RegularDigestをファイルに保存
@@ -71,6 +109,8 @@ class DigestPersistence:
             level: ダイジェストレベル
             regular_digest: RegularDigest構造体
             new_digest_name: 新しいダイジェスト名
+            update_search_index: 全文検索インデックスに反映するか
+                （一括取り込みでは最後に1回だけ refresh するため False）
 
         Returns:
             保存先のPath
@@ -85,15 +125,13 @@ class DigestPersistence:
             >>> path.name
             'W0042_2025年11月第4週.txt'
         """
-        config = self.level_config[level]
-        target_dir = self.digests_path / str(config["dir"])
+        final_path = self.regular_digest_path(level, new_digest_name)
+        target_dir = final_path.parent
 
         log_debug(f"{LOG_PREFIX_FILE} save_regular_digest: target_dir={target_dir}")
         log_debug(f"{LOG_PREFIX_STATE} creating directory if needed")
 
         target_dir.mkdir(parents=True, exist_ok=True)
-        final_filename = f"{new_digest_name}.txt"
-        final_path = target_dir / final_filename
 
         log_debug(f"{LOG_PREFIX_FILE} final_path: {final_path}")
         log_debug(f"{LOG_PREFIX_FILE} file_exists: {final_path.exists()}")
@@ -113,9 +151,38 @@ class DigestPersistence:
             formatter = get_error_formatter()
             raise FileIOError(formatter.file.file_io_error("save", final_path, e))
 
+        # テキストファイルはカスケードの入力（次レベルのソース）なので常に書き出し、
+        # SQLite バックエンドでは逆引き用に digests / source_links テーブルにも記録
+        if self._store is not None:
+            self._store.save_regular_digest(level, new_digest_name, as_dict(regular_digest))
+
         _logger.info(f"RegularDigest保存完了: {final_path}")
+        if update_search_index:
+            self._update_search_index(level, final_path, regular_digest)
         return final_path
 
+    def _update_search_index(
+        self, level: str, digest_path: Path, regular_digest: RegularDigestData
+    ) -> None:
+        """
+        保存したRegularDigestを全文検索インデックスに反映
+
+        検索インデックスは派生データのため、更新に失敗しても確定処理は継続する
+        （次回の digest_search 実行時の refresh で再索引される）。
+
+        Args:
+            level: ダイジェストレベル
+            digest_path: 保存したRegularDigestのパス
+            regular_digest: RegularDigest構造体
+        """
+        try:
+            if self._search_index is None:
+                self._search_index = DigestSearchIndex(self.config)
+            count = self._search_index.update_file(level, digest_path, as_dict(regular_digest))
+            log_debug(f"{LOG_PREFIX_FILE} search index updated: {digest_path.name} ({count} docs)")
+        except Exception as e:  # FileIOError / OSError 等
+            log_warning(f"検索インデックスの更新に失敗: {e}")
+
     def update_grand_digest(
         self, level: str, regular_digest: RegularDigestData, new_digest_name: str
     ) -> None:
@@ -206,6 +273,7 @@ class DigestPersistence:
         digest_number: int,
         provisional_file_to_delete: Optional[Path],
         finalized_digest: Optional[RegularDigestData] = None,
+        transaction: Optional["FinalizeTransaction"] = None,
     ) -> None:
         """
         カスケード処理とProvisional削除（オーケストレーター）
@@ -215,6 +283,7 @@ class DigestPersistence:
             digest_number: 確定したダイジェスト番号
             provisional_file_to_delete: 削除するProvisionalファイル
             finalized_digest: 確定したRegularDigest（次レベルProvisional追加用）
+            transaction: ジャーナルのトランザクション（省略時は記録しない）
 
         Example:
             >>> persistence = DigestPersistence(config, grand_manager, shadow_manager, tracker)
@@ -225,8 +294,47 @@ class DigestPersistence:
         log_debug(f"{LOG_PREFIX_STATE} digest_number: {digest_number}")
         log_debug(f"{LOG_PREFIX_FILE} provisional_to_delete: {provisional_file_to_delete}")
 
-        self._update_shadow_cascade(level, finalized_digest)
-        self._update_digest_times(level, digest_number)
-        self._cleanup_provisional_file(provisional_file_to_delete)
+        if transaction is None:
+            self._update_shadow_cascade(level, finalized_digest)
+            self._update_digest_times(level, digest_number)
+            self._cleanup_provisional_file(provisional_file_to_delete)
+        else:
+            transaction.run(
+                STEP_SHADOW_CASCADE, lambda: self._update_shadow_cascade(level, finalized_digest)
+            )
+            transaction.run(
+                STEP_DIGEST_TIMES, lambda: self._update_digest_times(level, digest_number)
+            )
+            transaction.run(
+                STEP_PROVISIONAL_CLEANUP,
+                lambda: self._cleanup_provisional_file(provisional_file_to_delete),
+            )
 
         log_debug(f"{LOG_PREFIX_STATE} cascade_and_cleanup completed for level={level}")
+
+    def replay(
+        self,
+        transaction: "FinalizeTransaction",
+        new_digest_name: str,
+        digest_number: int,
+        regular_digest: RegularDigestData,
+        provisional_file_to_delete: Optional[Path],
+    ) -> None:
+        """
+        保存済みの RegularDigest から、未完了の処理2〜5を再実行（ジャーナル復旧用）
+
+        Args:
+            transaction: 未完了のトランザクション
+            new_digest_name: 確定したダイジェスト名
+            digest_number: 確定したダイジェスト番号
+            regular_digest: 保存済みのRegularDigest
+            provisional_file_to_delete: 削除するProvisionalファイル
+        """
+        level = transaction.level
+        transaction.run(
+            STEP_GRAND_DIGEST,
+            lambda: self.update_grand_digest(level, regular_digest, new_digest_name),
+        )
+        self.process_cascade_and_cleanup(
+            level, digest_number, provisional_file_to_delete, regular_digest, transaction
+        )
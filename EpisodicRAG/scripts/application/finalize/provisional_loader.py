@@ -4,6 +4,9 @@ Provisional Loader
 ==================
 
 ProvisionalDigestの読み込みまたはソースファイルからの自動生成
+
+ソースファイルは overall_digest しか使わないため、ヘッダー索引
+（infrastructure.digest_headers）から読み、individual_digests はパースしない。
 """
 
 from pathlib import Path
@@ -27,8 +30,8 @@ from infrastructure import (
     load_json,
     log_debug,
     log_warning,
-    try_read_json_from_file,
 )
+from infrastructure.digest_headers import DigestHeaderIndex, get_header_index
 
 _logger = get_structured_logger(__name__)
 
@@ -170,21 +173,20 @@ class ProvisionalLoader:
         }
 
     def _process_single_source(
-        self, source_dir: Path, source_file: str
+        self, headers: DigestHeaderIndex, source_file: str
     ) -> Optional[IndividualDigestData]:
         """
         単一ソースファイルを処理してIndividualDigestDataを生成
 
         Args:
-            source_dir: ソースファイルのディレクトリパス
+            headers: ソースファイルのディレクトリのヘッダー索引
             source_file: ソースファイル名
 
         Returns:
             IndividualDigestData、または読み込み失敗時はNone
         """
-        source_path = source_dir / source_file
-        log_debug(f"{LOG_PREFIX_FILE} processing: {source_path}")
-        source_data = try_read_json_from_file(source_path)
+        log_debug(f"{LOG_PREFIX_FILE} processing: {headers.directory / source_file}")
+        source_data = headers.get(source_file)
 
         if source_data is None:
             log_debug(f"{LOG_PREFIX_FILE} skipped (read failed): {source_file}")
@@ -220,9 +222,11 @@ class ProvisionalLoader:
         log_debug(f"{LOG_PREFIX_FILE} source_dir: {source_dir}")
 
         # 各ソースファイルを処理し、成功したもののみ収集
+        headers = get_header_index(source_dir)
         results = [
-            self._process_single_source(source_dir, source_file) for source_file in source_files
+            self._process_single_source(headers, source_file) for source_file in source_files
         ]
+        headers.flush()
         individual_digests = [entry for entry in results if entry is not None]
 
         # スキップ数の計算とログ出力
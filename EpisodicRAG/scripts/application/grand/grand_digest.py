@@ -19,9 +19,12 @@ Usage:
     # 読み込み（存在しなければ自動作成）
     data = manager.load_or_create()
 
-    # 特定レベルの更新
+    # 特定レベルの更新（リビジョン競合時は自動で再試行）
     manager.update_digest("weekly", "W0001", overall_digest_data)
 
+    # 楽観的並行制御: 読み込み後に別の書き込みがあれば RevisionConflictError
+    manager.save(data, expected_revision=get_revision(data))
+
 Design Pattern:
     - Repository Pattern: ファイルI/Oを抽象化
     - Template Method: テンプレート生成の標準化
@@ -37,9 +40,10 @@ Note:
 """
 
 from datetime import datetime
-from typing import cast
+from typing import Callable, Mapping, Optional, Tuple
 
 from application.config import DigestConfig
+from application.storage import get_digest_store
 from domain.constants import (
     DIGEST_LEVEL_NAMES,
     LOG_PREFIX_STATE,
@@ -51,7 +55,18 @@ from domain.file_constants import GRAND_DIGEST_FILENAME
 from domain.types import GrandDigestData, OverallDigestData, as_dict
 from domain.validators import is_valid_dict
 from domain.version import DIGEST_FORMAT_VERSION
-from infrastructure import get_structured_logger, load_json_with_template, log_debug, save_json
+from infrastructure import (
+    get_structured_logger,
+    load_json_with_template,
+    log_debug,
+    shared_lock,
+)
+from infrastructure.revision import (
+    DEFAULT_MAX_RETRIES,
+    is_unchanged,
+    retry_on_conflict,
+    save_with_revision,
+)
 
 _logger = get_structured_logger(__name__)
 
@@ -77,11 +92,17 @@ class GrandDigestManager:
     Note:
         GrandDigest.txtが存在しない場合、get_template()で
         自動的にテンプレートが作成される。
+        保存ごとに metadata.revision が1進む。update() / update_digest() は
+        読み込み時の revision を期待値として保存し、競合時は読み直して再試行する
+        （infrastructure.revision）。
+        storage.backend が "sqlite" の場合は EpisodicRAG.db を読み書きし、
+        GrandDigest.txt は保存のたびに書き出す写しになる（エージェントが Read する）。
     """
 
     def __init__(self, config: DigestConfig):
         self.config = config
         self.grand_digest_file = config.essences_path / GRAND_DIGEST_FILENAME
+        self.store = get_digest_store(config)
 
     def get_template(self) -> GrandDigestData:
         """
@@ -122,20 +143,31 @@ class GrandDigestManager:
             >>> "major_digests" in data
             True
         """
-        return load_json_with_template(
-            target_file=self.grand_digest_file,
-            default_factory=self.get_template,
-            log_message="GrandDigest.txt not found. Creating new file.",
-        )
+        if self.store is not None:
+            # DB に未保存なら既存ファイル（写し）を取り込む。編集された写しも取り込む
+            data = self.store.load_mirrored_document(GRAND_DIGEST_FILENAME, self.grand_digest_file)
+            return data if data is not None else self.get_template()  # type: ignore[return-value]
+
+        with shared_lock(self.grand_digest_file):
+            return load_json_with_template(
+                target_file=self.grand_digest_file,
+                default_factory=self.get_template,
+                log_message="GrandDigest.txt not found. Creating new file.",
+            )
 
-    def save(self, data: GrandDigestData) -> None:
+    def save(self, data: GrandDigestData, expected_revision: Optional[int] = None) -> None:
         """
-        GrandDigest.txtを保存
+        GrandDigest.txtを保存（metadata.revision を1進める）
+
+        保存済みの内容と last_updated / revision 以外が同じ場合は書き込まない。
 
         Args:
             data: 保存するGrandDigestデータ
+            expected_revision: 読み込み時の metadata.revision
+                （指定時、ファイルの revision と異なれば保存しない）
 
         Raises:
+            RevisionConflictError: 読み込み後に別の書き込みがあった場合
             FileIOError: ファイル書き込みに失敗した場合
 
         Example:
@@ -143,7 +175,37 @@ class GrandDigestManager:
             >>> data = manager.load_or_create()
             >>> manager.save(data)
         """
-        save_json(self.grand_digest_file, as_dict(data))
+        if self.store is not None:
+            self.store.save_mirrored_document(
+                GRAND_DIGEST_FILENAME, as_dict(data), self.grand_digest_file, expected_revision
+            )
+            return
+        if is_unchanged(self.grand_digest_file, as_dict(data), expected_revision):
+            return
+        save_with_revision(self.grand_digest_file, as_dict(data), expected_revision, fsync_dir=True)
+
+    def update(
+        self,
+        mutate: Callable[[GrandDigestData], None],
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> GrandDigestData:
+        """
+        読み込み → 変更 → 保存を、リビジョン競合時は最新を読み直してやり直す
+
+        別レベルを並行して更新する複数のエージェントは、ロックを待たずに
+        それぞれの変更を失うことなく保存できる。
+
+        Args:
+            mutate: 文書をその場で変更する関数（競合時は再度呼ばれるため副作用を持たないこと）
+            max_retries: 競合時の再試行回数
+
+        Returns:
+            保存した文書
+
+        Raises:
+            RevisionConflictError: 再試行回数を超えて競合した場合
+        """
+        return retry_on_conflict(self.load_or_create, self.save, mutate, max_retries)
 
     def update_digest(
         self, level: str, digest_name: str, overall_digest: OverallDigestData
@@ -164,7 +226,45 @@ class GrandDigestManager:
             >>> manager.update_digest("weekly", "W0042", overall_digest)
             # GrandDigest.txt の weeklyセクションが更新される
         """
-        grand_data = self.load_or_create()
+
+        # 読み込みから保存までの間に他の更新があれば、最新を読み直して適用し直す
+        def apply(grand_data: GrandDigestData) -> None:
+            self._apply_digest(grand_data, level, digest_name, overall_digest)
+
+        self.update(apply)
+        _logger.info(f"GrandDigest.txt更新完了: レベル {level}")
+
+    def update_digests(self, digests: Mapping[str, Tuple[str, OverallDigestData]]) -> None:
+        """
+        複数レベルのダイジェストを1回の保存で更新（一括取り込み用）
+
+        Args:
+            digests: レベル → (ダイジェスト名, overall_digest)
+
+        Raises:
+            DigestError: GrandDigest.txtのフォーマットが不正、またはレベルが無効な場合
+
+        Example:
+            >>> manager.update_digests({"weekly": ("W0042", weekly), "monthly": ("M0010", monthly)})
+        """
+        if not digests:
+            return
+
+        def apply(grand_data: GrandDigestData) -> None:
+            for level, (digest_name, overall_digest) in digests.items():
+                self._apply_digest(grand_data, level, digest_name, overall_digest)
+
+        self.update(apply)
+        _logger.info(f"GrandDigest.txt更新完了: レベル {', '.join(digests)}")
+
+    def _apply_digest(
+        self,
+        grand_data: GrandDigestData,
+        level: str,
+        digest_name: str,
+        overall_digest: OverallDigestData,
+    ) -> None:
+        """update_digest() の変更内容（update() から呼ばれる）"""
 
         log_debug(f"{LOG_PREFIX_STATE} update_digest: level={level}, digest_name={digest_name}")
         log_debug(f"{LOG_PREFIX_VALIDATE} grand_data: is_valid={is_valid_dict(grand_data)}")
@@ -193,7 +293,3 @@ class GrandDigestManager:
         # メタデータを更新
         grand_data["metadata"]["last_updated"] = datetime.now().isoformat()
         log_debug(f"{LOG_PREFIX_STATE} updated_timestamp: {grand_data['metadata']['last_updated']}")
-
-        # 保存
-        self.save(cast(GrandDigestData, grand_data))
-        _logger.info(f"GrandDigest.txt更新完了: レベル {level}")
@@ -21,13 +21,20 @@ GrandDigest更新後に作成された新しいコンテンツを保持し、
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 # Plugin版: application.configをインポート
 from application.config import DigestConfig
 
 # 分割したモジュールをインポート
-from application.shadow import FileDetector, ShadowIO, ShadowTemplate, ShadowUpdater
+from application.shadow import (
+    FileDetector,
+    ShadowIO,
+    ShadowTemplate,
+    ShadowUpdater,
+    ShardedShadowIO,
+)
+from application.storage import get_digest_store
 from application.tracking import DigestTimesTracker
 from domain.constants import (
     DIGEST_LEVEL_NAMES,
@@ -36,8 +43,10 @@ from domain.constants import (
     build_level_hierarchy,
 )
 from domain.file_constants import GRAND_DIGEST_FILENAME, SHADOW_GRAND_DIGEST_FILENAME
-from domain.types import OverallDigestData, RegularDigestData
+from domain.types import OverallDigestData, RegularDigestData, ShadowDigestData
 from infrastructure import get_structured_logger, log_warning
+from infrastructure.revision import get_revision
+from infrastructure.sharded_json import SHADOW_LAYOUT_SHARDED
 
 _logger = get_structured_logger(__name__)
 
@@ -80,15 +89,73 @@ class ShadowGrandDigestManager:
         self._template = ShadowTemplate(self.levels)
         self.digest_times_tracker = DigestTimesTracker(config)
         self._detector = FileDetector(config, self.digest_times_tracker)
-        self._io = ShadowIO(self.shadow_digest_file, self._template.get_template)
+        self._io = self._create_io(config)
         self._updater = ShadowUpdater(
             self._io, self._detector, self._template, self.level_hierarchy, config
         )
 
+    def _create_io(self, config: DigestConfig) -> ShadowIO:
+        """保存先（SQLite > 分割レイアウト > 単一ファイル）に応じた ShadowIO を生成"""
+        store = get_digest_store(config)
+        if store is None and getattr(config, "shadow_layout", None) == SHADOW_LAYOUT_SHARDED:
+            return ShardedShadowIO(self.shadow_digest_file, self._template.get_template)
+        threshold = getattr(config, "shadow_delta_threshold", 0)
+        return ShadowIO(
+            self.shadow_digest_file,
+            self._template.get_template,
+            store,
+            delta_threshold=threshold if isinstance(threshold, int) else 0,
+        )
+
     # ========================================
     # パブリックAPI
     # ========================================
 
+    def get_revision(self) -> int:
+        """
+        ShadowGrandDigest の metadata.revision（未保存なら 0）
+
+        Example:
+            >>> manager.get_revision()
+            12
+        """
+        return get_revision(self._io.load_or_create())
+
+    def compact(self) -> int:
+        """
+        差分ログをベースの ShadowGrandDigest.txt に書き戻す（差分がなければ何もしない）
+
+        エージェントは ShadowGrandDigest.txt を直接 Read / Edit するため、
+        /digest の入口（interfaces.digest_entry）で呼ぶ。それ以外では差分ログが
+        しきい値を超えたとき、または文書全体の保存（finalize 等）で書き戻される。
+
+        Returns:
+            現在の revision
+
+        Example:
+            >>> manager.compact()
+            13
+        """
+        return self._io.compact()
+
+    def update_shadow(self, mutate: Callable[[ShadowDigestData], None]) -> ShadowDigestData:
+        """
+        ShadowGrandDigest 全体を読み込み → 変更 → 1回で保存（競合時は再試行）
+
+        Args:
+            mutate: 文書をその場で変更する関数（競合時は再度呼ばれる）
+
+        Returns:
+            保存した文書
+
+        Note:
+            ShadowIO.update() に委譲。
+
+        Example:
+            >>> manager.update_shadow(lambda data: data["latest_digests"]["weekly"].clear())
+        """
+        return self._io.update(mutate)
+
     def add_files_to_shadow(self, level: str, new_files: List[Path]) -> None:
         """
         指定レベルのShadowに新しいファイルを追加（増分更新）
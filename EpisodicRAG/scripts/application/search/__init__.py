@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Search Package - Full-text retrieval components
+================================================
+
+Loop / RegularDigest の全文検索コンポーネント
+
+Components:
+    - DigestSearchIndex: BM25 検索インデックス（Essences/SearchIndex.json）
+    - SearchHit: 検索結果
+    - DigestTree: 階層の親→子隣接リスト（Essences/DigestTree.json）
+    - BM25Index: インメモリ転置インデックス
+    - HashedVectorIndex: ハッシュ化 TF-IDF ベクトルの類似度インデックス（Essences/VectorIndex.bin）
+    - tokenize: 日本語対応トークナイザ（文字 n-gram）
+    - ContextPackBuilder: セッション継承用コンテキストパック（Essences/ContextPack.json）
+"""
+
+from .bm25 import BM25Index
+from .context_pack import ContextPack, ContextPackBuilder
+from .digest_search import DigestSearchIndex, SearchHit
+from .digest_tree import DigestTree
+from .tokenizer import tokenize
+from .vector_index import HashedVectorIndex
+
+__all__ = [
+    "DigestSearchIndex",
+    "SearchHit",
+    "DigestTree",
+    "BM25Index",
+    "HashedVectorIndex",
+    "tokenize",
+    "ContextPack",
+    "ContextPackBuilder",
+]
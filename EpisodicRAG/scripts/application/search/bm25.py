@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+BM25 Index
+==========
+
+Okapi BM25 スコアリングによるインメモリ転置インデックス。
+
+転置リスト（語 → {文書ID: 語頻度}）と文書長を保持する。
+文書単位の追加・置換・削除に対応し、インクリメンタル更新が可能。
+
+永続化形式は転置リストと文書長そのもので、from_dict() はパース済みの辞書を
+そのまま採用する（読み込み時に転置リストを再構築しない）。
+削除に必要な文書ごとの語頻度は、最初の remove() で転置リストから復元する。
+
+Usage:
+    from application.search.bm25 import BM25Index
+
+    index = BM25Index()
+    index.add("doc1", ["検索", "索機", "機能"])
+    index.search(["検索"], top_k=5)   # [("doc1", 0.28...)]
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+__all__ = ["BM25Index", "DEFAULT_K1", "DEFAULT_B"]
+
+# BM25 パラメータ（一般的な既定値）
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+
+class BM25Index:
+    """
+    BM25 転置インデックス
+
+    Attributes:
+        k1: 語頻度の飽和パラメータ
+        b: 文書長の正規化パラメータ
+
+    Example:
+        >>> index = BM25Index()
+        >>> index.add("a", ["週次", "次の", "の振", "振り", "返り"])
+        >>> index.add("b", ["月次", "次の", "の振", "振り", "返り"])
+        >>> [doc_id for doc_id, _ in index.search(["週次"])]
+        ['a']
+    """
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        初期化
+
+        Args:
+            k1: 語頻度の飽和パラメータ
+            b: 文書長の正規化パラメータ
+        """
+        self.k1 = k1
+        self.b = b
+        # 文書 → {語: 語頻度}（remove() 用。None は未構築）
+        self._term_freqs: Optional[Dict[str, Dict[str, int]]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._doc_lengths
+
+    # =========================================================================
+    # 更新
+    # =========================================================================
+
+    def add(self, doc_id: str, tokens: Iterable[str]) -> None:
+        """
+        文書を追加（既存の doc_id は置き換え）
+
+        Args:
+            doc_id: 文書ID
+            tokens: 索引語のイテラブル
+        """
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        term_freqs = dict(Counter(tokens))
+        self._add_term_freqs(doc_id, term_freqs)
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        文書を削除
+
+        Args:
+            doc_id: 文書ID
+
+        Returns:
+            削除した場合True、存在しなかった場合False
+        """
+        if doc_id not in self._doc_lengths:
+            return False
+        term_freqs = self._term_freqs_by_doc().pop(doc_id, {})
+        for term in term_freqs:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+
+    def _add_term_freqs(self, doc_id: str, term_freqs: Dict[str, int]) -> None:
+        if self._term_freqs is not None:
+            self._term_freqs[doc_id] = term_freqs
+        length = sum(term_freqs.values())
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        for term, freq in term_freqs.items():
+            self._postings.setdefault(term, {})[doc_id] = freq
+
+    def _term_freqs_by_doc(self) -> Dict[str, Dict[str, int]]:
+        """文書ごとの語頻度（未構築なら転置リストから復元）"""
+        if self._term_freqs is None:
+            term_freqs: Dict[str, Dict[str, int]] = {doc_id: {} for doc_id in self._doc_lengths}
+            for term, posting in self._postings.items():
+                for doc_id, freq in posting.items():
+                    term_freqs[doc_id][term] = freq
+            self._term_freqs = term_freqs
+        return self._term_freqs
+
+    # =========================================================================
+    # 検索
+    # =========================================================================
+
+    def search(
+        self,
+        query_tokens: Iterable[str],
+        top_k: int = 10,
+        doc_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 スコア上位の文書を取得
+
+        Args:
+            query_tokens: クエリの索引語
+            top_k: 返す件数の上限
+            doc_filter: Trueを返した文書のみ対象にするフィルタ（省略時は全文書）
+
+        Returns:
+            (doc_id, score) のリスト（スコア降順、同点はdoc_id昇順）
+        """
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0 or top_k <= 0:
+            return []
+
+        avg_length = self._total_length / doc_count or 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = {}
+
+        for term, query_freq in Counter(query_tokens).items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = self._idf(len(posting), doc_count)
+            for doc_id, freq in posting.items():
+                norm = k1 * (1.0 - b + b * self._doc_lengths[doc_id] / avg_length)
+                score = idf * freq * (k1 + 1.0) / (freq + norm) * query_freq
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        if doc_filter is not None:
+            scores = {doc_id: s for doc_id, s in scores.items() if doc_filter(doc_id)}
+
+        return heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def score_documents(
+        self, query_tokens: Iterable[str], doc_ids: Iterable[str]
+    ) -> Dict[str, float]:
+        """
+        指定文書のみの BM25 スコアを計算
+
+        転置リストを全件走査せず候補文書ごとに引くため、
+        計算量はコーパスサイズではなく候補文書数 × クエリ語数に比例する。
+
+        Args:
+            query_tokens: クエリの索引語
+            doc_ids: スコアを計算する文書ID（未登録のIDは無視）
+
+        Returns:
+            doc_id → スコア（登録済みの全候補を含む、一致なしは0.0）
+        """
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0:
+            return {}
+
+        avg_length = self._total_length / doc_count or 1.0
+        k1, b = self.k1, self.b
+        weighted_postings = []
+        for term, query_freq in Counter(query_tokens).items():
+            posting = self._postings.get(term)
+            if posting:
+                weighted_postings.append((posting, self._idf(len(posting), doc_count) * query_freq))
+
+        scores: Dict[str, float] = {}
+        for doc_id in doc_ids:
+            length = self._doc_lengths.get(doc_id)
+            if length is None:
+                continue
+            norm = k1 * (1.0 - b + b * length / avg_length)
+            score = 0.0
+            for posting, weight in weighted_postings:
+                freq = posting.get(doc_id)
+                if freq:
+                    score += weight * freq * (k1 + 1.0) / (freq + norm)
+            scores[doc_id] = score
+        return scores
+
+    @staticmethod
+    def _idf(df: int, doc_count: int) -> float:
+        """逆文書頻度（負にならない Lucene 形式）"""
+        return math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+    # =========================================================================
+    # 永続化
+    # =========================================================================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        永続化用の辞書に変換
+
+        Returns:
+            {"k1": ..., "b": ..., "doc_lengths": {doc_id: 長さ},
+             "postings": {term: {doc_id: freq}}}
+        """
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_lengths": self._doc_lengths,
+            "postings": self._postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BM25Index":
+        """
+        to_dict() の出力から復元
+
+        転置リストと文書長の辞書はコピーせずそのまま採用するため、
+        呼び出し側は data を以後変更しないこと。
+        旧形式（"term_freqs"）の場合は転置リストを再構築する。
+
+        Args:
+            data: to_dict() の出力
+
+        Returns:
+            BM25Index インスタンス
+
+        Raises:
+            TypeError: 転置リスト・文書長が辞書でない場合
+        """
+        index = cls(k1=float(data.get("k1", DEFAULT_K1)), b=float(data.get("b", DEFAULT_B)))
+        if "postings" not in data:
+            for doc_id, term_freqs in data.get("term_freqs", {}).items():
+                index._add_term_freqs(doc_id, dict(term_freqs))
+            return index
+
+        postings, doc_lengths = data["postings"], data["doc_lengths"]
+        if not isinstance(postings, dict) or not isinstance(doc_lengths, dict):
+            raise TypeError("postings / doc_lengths must be objects")
+        index._postings = postings
+        index._doc_lengths = doc_lengths
+        index._total_length = sum(doc_lengths.values())
+        index._term_freqs = None
+        return index
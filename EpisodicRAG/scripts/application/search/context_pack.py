@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Context Pack Builder
+====================
+
+セッション継承用のコンテキストパックを予算内で組み立てる。
+
+新しいセッションの冒頭に貼り付けるテキストを、文字数またはトークン数の
+予算に収まるように次の優先順で構成する:
+
+    1. GrandDigest.major_digests の新しい階層（weekly から full_levels 個）は全文
+    2. それより古い階層は short 版（LongShortText の short、文字列は冒頭を切り出し）
+    3. 残りの予算を検索上位のヒット（スニペット）で埋める
+
+## 設計意図
+
+ARCHITECTURE: Memoization
+セッション開始時に毎回呼ばれるため、結果を Essences/ContextPack.json に保存し、
+入力とパラメータから作ったキーが一致すれば、検索インデックスを開かずにそのまま返す。
+入力は GrandDigest.txt と、検索ヒットの元になる全ファイル（Loop / 各階層の
+RegularDigest）のファイルごとの (mtime_ns, size)。ディレクトリの mtime だけでは
+その場で書き換えられた Loop を検出できないため、ファイル単位で比較する
+（ファイル名一覧は file_index のマニフェストから取るため、glob はしない）。
+
+Usage:
+    from application.search import ContextPackBuilder
+
+    builder = ContextPackBuilder(config)
+    pack = builder.build(budget=8000, unit="tokens")
+    print(pack.text)
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from application.config import DigestConfig
+from application.search.digest_search import (
+    DigestSearchIndex,
+    SearchHit,
+    iter_source_signatures,
+)
+from application.storage import get_digest_store, load_stored_document
+from domain.constants import DIGEST_LEVEL_NAMES, LOG_PREFIX_FILE, PLACEHOLDER_MARKER
+from domain.file_constants import CONTEXT_PACK_FILENAME, GRAND_DIGEST_FILENAME
+from domain.text_utils import extract_long_value, extract_short_value
+from infrastructure import get_structured_logger, log_debug, log_warning, save_json
+from infrastructure.json_repository import safe_read_json
+
+__all__ = [
+    "ContextPack",
+    "ContextPackBuilder",
+    "estimate_tokens",
+    "BUDGET_UNITS",
+    "DEFAULT_BUDGET",
+    "DEFAULT_BUDGET_UNIT",
+    "DEFAULT_FULL_LEVELS",
+    "DEFAULT_HIT_COUNT",
+]
+
+_logger = get_structured_logger(__name__)
+
+# キャッシュ形式のバージョン（変更時はキャッシュを無効化）
+CONTEXT_PACK_VERSION = 2
+
+# 予算の単位
+BUDGET_UNITS = ("tokens", "chars")
+
+# デフォルトの予算
+DEFAULT_BUDGET = 8000
+DEFAULT_BUDGET_UNIT = "tokens"
+
+# 全文で含める新しい階層の数（weekly から数える）
+DEFAULT_FULL_LEVELS = 2
+
+# 残り予算を埋める検索ヒットの最大数
+DEFAULT_HIT_COUNT = 10
+
+# short 版がない文字列から切り出す文字数
+SHORT_TEXT_LENGTH = 300
+
+# これより少ない残り予算には切り詰めたセクションを入れない
+MIN_SECTION_LENGTH = 80
+
+PACK_HEADER = "# EpisodicRAG Context"
+HITS_HEADER = "## 関連する記憶"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークン数を概算
+
+    ASCII は約4文字で1トークン、日本語などの非ASCII文字は1文字1トークンとみなす。
+    実際のトークナイザより多めに見積もるため、予算超過を避けられる。
+
+    Args:
+        text: 対象テキスト
+
+    Returns:
+        推定トークン数
+
+    Example:
+        >>> estimate_tokens("abcdefgh")
+        2
+        >>> estimate_tokens("振り返り")
+        4
+    """
+    ascii_count = sum(1 for char in text if char < "\x80")
+    return -(-ascii_count // 4) + (len(text) - ascii_count)
+
+
+@dataclass
+class ContextPack:
+    """
+    組み立て済みコンテキストパック
+
+    Attributes:
+        text: セッションに貼り付けるテキスト
+        budget: 予算
+        unit: 予算の単位（"tokens" / "chars"）
+        used: 使用量（unit 単位）
+        full_levels: 全文で含めた階層
+        short_levels: short 版で含めた階層
+        hits: 含めた検索ヒットの文書ID
+        truncated: 予算不足で省略・切り詰めたセクションがあるか
+        cached: キャッシュから返した場合True
+    """
+
+    text: str
+    budget: int
+    unit: str
+    used: int
+    full_levels: List[str] = field(default_factory=list)
+    short_levels: List[str] = field(default_factory=list)
+    hits: List[str] = field(default_factory=list)
+    truncated: bool = False
+    cached: bool = False
+
+
+class ContextPackBuilder:
+    """
+    GrandDigest と検索ヒットから予算内のコンテキストパックを組み立てる
+
+    Attributes:
+        config: DigestConfig インスタンス
+        cache_path: キャッシュファイルのパス
+
+    Example:
+        >>> builder = ContextPackBuilder(config)
+        >>> pack = builder.build(budget=4000, unit="chars")
+        >>> pack.used <= 4000
+        True
+    """
+
+    def __init__(
+        self,
+        config: DigestConfig,
+        search_index: Optional[DigestSearchIndex] = None,
+        cache_path: Optional[Path] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            config: DigestConfig インスタンス
+            search_index: DigestSearchIndex インスタンス（省略時は必要になった時点で生成）
+            cache_path: キャッシュファイルのパス（省略時は Essences/ContextPack.json）
+        """
+        self.config = config
+        self.cache_path = cache_path or config.essences_path / CONTEXT_PACK_FILENAME
+        self._search_index = search_index
+        self._memo: Dict[str, ContextPack] = {}
+
+    @property
+    def search_index(self) -> DigestSearchIndex:
+        """検索インデックス（キャッシュヒット時は生成しない）"""
+        if self._search_index is None:
+            self._search_index = DigestSearchIndex(self.config)
+        return self._search_index
+
+    def build(
+        self,
+        budget: int = DEFAULT_BUDGET,
+        unit: str = DEFAULT_BUDGET_UNIT,
+        full_levels: int = DEFAULT_FULL_LEVELS,
+        query: Optional[str] = None,
+        hit_count: int = DEFAULT_HIT_COUNT,
+        use_cache: bool = True,
+        refresh: bool = True,
+    ) -> ContextPack:
+        """
+        コンテキストパックを組み立てる
+
+        Args:
+            budget: 予算（unit 単位）
+            unit: "tokens"（推定トークン数）または "chars"（文字数）
+            full_levels: 全文で含める新しい階層の数
+            query: 検索クエリ（省略時は全文で含めた階層の keywords）
+            hit_count: 含める検索ヒットの最大数
+            use_cache: キャッシュを使うか
+            refresh: キャッシュミス時に検索インデックスの差分を取り込むか
+
+        Returns:
+            ContextPack
+
+        Raises:
+            ValueError: budget が負、または unit が不正な場合
+        """
+        if budget < 0:
+            raise ValueError(f"budget must be non-negative: {budget}")
+        if unit not in BUDGET_UNITS:
+            raise ValueError(f"unit must be one of {BUDGET_UNITS}: {unit}")
+
+        params = {
+            "budget": budget,
+            "unit": unit,
+            "full_levels": full_levels,
+            "query": query,
+            "hit_count": hit_count,
+        }
+        key = self._cache_key(params)
+        if use_cache:
+            cached = self._memo.get(key) or self._load_cached(key)
+            if cached is not None:
+                log_debug(f"{LOG_PREFIX_FILE} context pack cache hit: {self.cache_path}")
+                self._memo = {key: cached}
+                return cached
+
+        pack = self._assemble(budget, unit, full_levels, query, hit_count, refresh)
+        if use_cache:
+            save_json(
+                self.cache_path,
+                {"version": CONTEXT_PACK_VERSION, "key": key, "pack": asdict(pack)},
+                compact=True,
+            )
+            self._memo = {key: ContextPack(**{**asdict(pack), "cached": True})}
+        _logger.info(
+            f"コンテキストパック作成: {pack.used}/{budget} {unit}, "
+            f"全文 {len(pack.full_levels)}階層, short {len(pack.short_levels)}階層, "
+            f"ヒット {len(pack.hits)}件"
+        )
+        return pack
+
+    # =========================================================================
+    # 組み立て
+    # =========================================================================
+
+    def _assemble(
+        self,
+        budget: int,
+        unit: str,
+        full_levels: int,
+        query: Optional[str],
+        hit_count: int,
+        refresh: bool,
+    ) -> ContextPack:
+        measure: Callable[[str], int] = estimate_tokens if unit == "tokens" else len
+        writer = _BudgetWriter(budget, measure)
+        pack = ContextPack(text="", budget=budget, unit=unit, used=0)
+
+        writer.add(PACK_HEADER)
+        entries = self._grand_entries()
+        included: Set[str] = set()
+        keywords: List[str] = []
+
+        for rank, (level, overall) in enumerate(entries):
+            full = rank < full_levels
+            section = _render_entry(level, overall, full=full)
+            fitted = writer.add(section)
+            if not fitted and full:
+                # 全文が入らない場合は short 版にフォールバック
+                section = _render_entry(level, overall, full=False)
+                fitted = writer.add(section)
+                full = False
+            if not fitted:
+                fitted = writer.add_truncated(section)
+                pack.truncated = True
+            if not fitted:
+                continue
+            (pack.full_levels if full else pack.short_levels).append(level)
+            name = overall.get("name")
+            if isinstance(name, str) and name:
+                included.add(f"{level}/{name}.txt")
+            if full:
+                keywords.extend(_clean_keywords(overall.get("keywords")))
+
+        search_query = query or " ".join(dict.fromkeys(keywords))
+        if search_query and hit_count > 0 and writer.remaining > 0:
+            lines = []
+            for hit in self._search(search_query, hit_count + len(included), refresh):
+                if hit.doc_id.split("#", 1)[0] in included:
+                    continue
+                lines.append((hit.doc_id, _render_hit(hit)))
+                if len(lines) >= hit_count:
+                    break
+            if lines and writer.add(HITS_HEADER):
+                for doc_id, line in lines:
+                    if not writer.add(line):
+                        pack.truncated = True
+                        break
+                    pack.hits.append(doc_id)
+
+        pack.text = writer.text()
+        pack.used = measure(pack.text)
+        return pack
+
+    def _grand_entries(self) -> List[Tuple[str, Mapping[str, Any]]]:
+        """GrandDigest.major_digests の (level, overall_digest) を新しい階層順に取得"""
+        grand = load_stored_document(self.config, GRAND_DIGEST_FILENAME) or safe_read_json(
+            self.config.essences_path / GRAND_DIGEST_FILENAME, raise_on_error=False
+        )
+        major = grand.get("major_digests") if grand else None
+        if not isinstance(major, dict):
+            return []
+        entries: List[Tuple[str, Mapping[str, Any]]] = []
+        for level in DIGEST_LEVEL_NAMES:
+            entry = major.get(level)
+            overall = entry.get("overall_digest") if isinstance(entry, dict) else None
+            if isinstance(overall, dict) and overall:
+                entries.append((level, overall))
+        return entries
+
+    def _search(self, query: str, top_k: int, refresh: bool) -> List[SearchHit]:
+        """検索ヒットを取得（失敗してもパック作成は続行）"""
+        try:
+            if refresh:
+                self.search_index.refresh()
+            return self.search_index.search(query, top_k=top_k)
+        except Exception as e:
+            log_warning(f"コンテキストパックの検索に失敗: {e}")
+            return []
+
+    # =========================================================================
+    # キャッシュ
+    # =========================================================================
+
+    def _cache_key(self, params: Dict[str, Any]) -> str:
+        """パラメータと入力ファイルのシグネチャからキャッシュキーを生成"""
+        grand_path = self.config.essences_path / GRAND_DIGEST_FILENAME
+        try:
+            stat = os.stat(grand_path)
+            grand_signature: List[Any] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            grand_signature = [None, None]
+        store = get_digest_store(self.config)
+        if store is not None:
+            # SQLite バックエンドでは GrandDigest の revision で変更を検出
+            grand_signature.append(store.document_revision(GRAND_DIGEST_FILENAME))
+
+        sources = hashlib.sha256()
+        for level, _, name, signature in iter_source_signatures(self.config):
+            sources.update(f"{level}/{name}\0{signature}\n".encode("utf-8"))
+
+        payload = json.dumps(
+            [CONTEXT_PACK_VERSION, params, grand_signature, sources.hexdigest()],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[ContextPack]:
+        data = safe_read_json(self.cache_path, raise_on_error=False)
+        if not data or data.get("version") != CONTEXT_PACK_VERSION or data.get("key") != key:
+            return None
+        try:
+            pack = ContextPack(**data["pack"])
+        except (KeyError, TypeError):
+            return None
+        pack.cached = True
+        return pack
+
+
+# =============================================================================
+# 予算管理・整形
+# =============================================================================
+
+
+class _BudgetWriter:
+    """予算を超えない範囲でセクションを連結する"""
+
+    def __init__(self, budget: int, measure: Callable[[str], int]):
+        self.budget = budget
+        self.measure = measure
+        self.parts: List[str] = []
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.budget - self.used
+
+    def add(self, section: str) -> bool:
+        """区切りの改行を含めて予算内に収まる場合のみ追加"""
+        chunk = f"\n\n{section}" if self.parts else section
+        cost = self.measure(chunk)
+        if cost > self.remaining:
+            return False
+        self.parts.append(section)
+        self.used += cost
+        return True
+
+    def add_truncated(self, section: str) -> bool:
+        """
+        残り予算に合わせて切り詰めて追加
+
+        1文字は1トークン以上にならないため、残り予算の文字数で切れば
+        tokens / chars どちらの単位でも予算内に収まる。
+        """
+        limit = self.remaining - (2 if self.parts else 0) - 1
+        if limit < MIN_SECTION_LENGTH:
+            return False
+        return self.add(section[:limit] + "…")
+
+    def text(self) -> str:
+        return "\n\n".join(self.parts)
+
+
+def _clean_text(value: Any, full: bool) -> str:
+    """LongShortText / 文字列から本文を取得（PLACEHOLDERは除外）"""
+    if full:
+        text = extract_long_value(value) or extract_short_value(value)
+    else:
+        text = extract_short_value(value) or extract_long_value(value)
+        if not isinstance(value, dict) and len(text) > SHORT_TEXT_LENGTH:
+            text = text[:SHORT_TEXT_LENGTH] + "…"
+    if PLACEHOLDER_MARKER in text:
+        return ""
+    return text
+
+
+def _clean_keywords(value: Any) -> List[str]:
+    return [
+        kw
+        for kw in (value if isinstance(value, list) else [])
+        if isinstance(kw, str) and kw and PLACEHOLDER_MARKER not in kw
+    ]
+
+
+def _render_entry(level: str, overall: Mapping[str, Any], full: bool) -> str:
+    """GrandDigest エントリを Markdown セクションに整形"""
+    name = overall.get("name") or "(unnamed)"
+    lines = [f"## {level}: {name}"]
+    timestamp = overall.get("timestamp")
+    if isinstance(timestamp, str) and timestamp:
+        lines.append(f"- timestamp: {timestamp}")
+    digest_type = _clean_text(overall.get("digest_type", ""), full=True)
+    if digest_type:
+        lines.append(f"- type: {digest_type}")
+    keywords = _clean_keywords(overall.get("keywords"))
+    if keywords:
+        lines.append(f"- keywords: {', '.join(keywords)}")
+    abstract = _clean_text(overall.get("abstract", ""), full)
+    if abstract:
+        lines.append(f"- abstract: {abstract}")
+    impression = _clean_text(overall.get("impression", ""), full)
+    if impression:
+        lines.append(f"- impression: {impression}")
+    return "\n".join(lines)
+
+
+def _render_hit(hit: SearchHit) -> str:
+    """検索ヒットを1行に整形"""
+    location = f"{hit.file} > {hit.source_file}" if hit.source_file else hit.file
+    line = f"- [{hit.level}] {location}"
+    if hit.keywords:
+        line += f" ({', '.join(hit.keywords)})"
+    if hit.snippet:
+        line += f": {hit.snippet}"
+    return line
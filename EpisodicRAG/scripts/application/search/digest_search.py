@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+Digest Search Index
+===================
+
+Loop と全階層の RegularDigest を対象にした BM25 全文検索インデックス。
+
+索引対象:
+    - overall_digest の digest_type / keywords / abstract / impression
+    - individual_digests の各エントリ（同フィールド）
+
+## 設計意図
+
+ARCHITECTURE: Materialized View
+インデックスは Essences/SearchIndex.json に永続化し、
+ファイルごとの (mtime_ns, size) シグネチャで変更を検出して差分のみ再索引する。
+
+- DigestPersistence.save_regular_digest は保存直後に update_file() を呼ぶ
+- Loop は外部から追加されるため、検索前の refresh() で差分を取り込む
+- ファイル名一覧は infrastructure.file_index のマニフェストから取得し
+  （glob も Path の生成もしない）、名前ごとの stat だけで差分を判定する
+- BM25 は転置リストそのものを保存し、読み込み時に再構築しない。
+  ファイルは共有の読み込みキャッシュを経由せず直接パースする
+  （数MBの索引を複製しないため）
+
+SearchIndex.json は再構築できるキャッシュなので fast モード（atomic=False）で書き、
+壊れていれば読み込み時に全再構築する。保存は SearchIndex.json の排他ロック下で行い、
+update_file() はロック取得後にファイルが他プロセスに更新されていれば読み直してから
+反映する（確定処理と検索の同時実行で更新を失わない）。
+- アーカイブ済みファイル（infrastructure.archive）も元のパスで列挙し、索引に記録した
+  元のシグネチャで比較するため、アーカイブしても再索引されない
+
+## 階層検索
+
+ARCHITECTURE: Beam Search
+search_hierarchical() は上位階層から順にスコアを計算し、上位 beam_width 件の
+子ノード（source_files）のみを次の階層の候補にする。計算量は
+コーパスサイズではなく 階層数 × beam_width × 子の数 に比例する。
+親→子のリンクは索引時に DigestTree（Essences/DigestTree.json）へ記録し、
+GrandDigest.major_digests のリンクでも補完する。
+
+## 類似検索
+
+ARCHITECTURE: Hashed Vector Index
+各ファイルの overall_digest（Loop は本体）を HashedVectorIndex でベクトル化し、
+float32 行列を Essences/VectorIndex.bin に保存する（メタデータは SearchIndex.json）。
+most_similar() は Shadow の overall_digest など任意のテキストに類似した
+ダイジェストをコサイン類似度順に返す。
+
+Usage:
+    from application.search import DigestSearchIndex
+
+    index = DigestSearchIndex(config)
+    index.refresh()
+    for hit in index.search("振り返り", top_k=5):
+        print(hit.score, hit.file, hit.snippet)
+    index.search_hierarchical("振り返り", beam_width=3)
+    index.most_similar(shadow["latest_digests"]["weekly"]["overall_digest"], levels=["weekly"])
+"""
+
+import fnmatch
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from application.config import DigestConfig
+from application.search.bm25 import BM25Index
+from application.search.digest_tree import DigestTree, child_level_of, children_from_digest, node_id
+from application.search.tokenizer import DEFAULT_NGRAM_SIZE, tokenize
+from application.search.vector_index import HashedVectorIndex
+from application.storage import load_stored_document
+from domain.constants import (
+    DIGEST_LEVEL_NAMES,
+    LEVEL_NAMES,
+    LOG_PREFIX_FILE,
+    PLACEHOLDER_MARKER,
+)
+from domain.file_constants import (
+    DIGEST_TREE_FILENAME,
+    GRAND_DIGEST_FILENAME,
+    LOOP_FILE_PATTERN,
+    SEARCH_INDEX_FILENAME,
+    VECTOR_INDEX_FILENAME,
+)
+from domain.level_registry import get_level_registry
+from domain.text_utils import extract_long_value, extract_short_value
+from infrastructure import exclusive_lock, get_structured_logger, log_debug, save_json
+from infrastructure.archive import archived_names, archived_signature
+from infrastructure.file_index import get_file_index
+from infrastructure.json_repository import (
+    json_loads,
+    safe_read_json,
+    save_bytes,
+    try_read_json_from_file,
+)
+
+__all__ = [
+    "DigestSearchIndex",
+    "SearchHit",
+    "iter_source_signatures",
+    "SEARCH_INDEX_VERSION",
+    "DEFAULT_BEAM_WIDTH",
+]
+
+_logger = get_structured_logger(__name__)
+
+# インデックス形式のバージョン（変更時は全再構築）
+SEARCH_INDEX_VERSION = 4
+
+# スニペットの最大文字数
+SNIPPET_LENGTH = 120
+
+# 階層検索のデフォルトビーム幅
+DEFAULT_BEAM_WIDTH = 3
+
+# ファイルシグネチャ (mtime_ns, size)
+_Signature = Tuple[int, int]
+
+
+@dataclass
+class SearchHit:
+    """
+    検索結果1件
+
+    Attributes:
+        doc_id: 文書ID（"<level>/<ファイル名>" または "<level>/<ファイル名>#<番号>"）
+        score: BM25 スコア
+        level: 階層名（"loop", "weekly", ...）
+        file: ファイル名
+        source_file: individual_digests エントリの場合はそのソースファイル名
+        digest_type: ダイジェストタイプ
+        keywords: キーワード
+        snippet: abstract の冒頭
+    """
+
+    doc_id: str
+    score: float
+    level: str
+    file: str
+    source_file: Optional[str] = None
+    digest_type: str = ""
+    keywords: List[str] = field(default_factory=list)
+    snippet: str = ""
+
+
+class DigestSearchIndex:
+    """
+    Loop / RegularDigest の全文検索インデックス
+
+    Attributes:
+        config: DigestConfig インスタンス
+        index_path: インデックスファイルのパス
+
+    Example:
+        >>> index = DigestSearchIndex(config)
+        >>> index.refresh()
+        {'indexed': 12, 'removed': 0}
+        >>> index.search("検索")[0].file
+        'W0003_検索機能.txt'
+    """
+
+    def __init__(
+        self,
+        config: DigestConfig,
+        index_path: Optional[Path] = None,
+        tree_path: Optional[Path] = None,
+        vector_path: Optional[Path] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            config: DigestConfig インスタンス
+            index_path: インデックスファイルのパス（省略時は Essences/SearchIndex.json）
+            tree_path: 隣接リストファイルのパス（省略時は Essences/DigestTree.json）
+            vector_path: ベクトル行列ファイルのパス（省略時は Essences/VectorIndex.bin）
+        """
+        self.config = config
+        self.index_path = index_path or config.essences_path / SEARCH_INDEX_FILENAME
+        self.tree = DigestTree(tree_path or config.essences_path / DIGEST_TREE_FILENAME)
+        self.vector_path = vector_path or config.essences_path / VECTOR_INDEX_FILENAME
+
+        self._bm25 = BM25Index()
+        self._vectors = HashedVectorIndex()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._roots: Optional[Dict[str, List[str]]] = None
+        self._loaded = False
+        # 読み込み・保存した時点のインデックスファイルのシグネチャ
+        self._file_signature: Optional[_Signature] = None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._bm25)
+
+    # =========================================================================
+    # 更新
+    # =========================================================================
+
+    def refresh(self, save: bool = True) -> Dict[str, int]:
+        """
+        全ソースディレクトリを走査し、変更・追加・削除されたファイルを反映
+
+        Args:
+            save: 変更があった場合にインデックスを保存するか
+
+        Returns:
+            {"indexed": 再索引したファイル数, "removed": 削除したファイル数}
+        """
+        self._ensure_loaded()
+        seen = set()
+        indexed = 0
+
+        for level, directory, name, signature in iter_source_signatures(self.config):
+            key = self._source_key(level, name)
+            seen.add(key)
+            if signature is None:
+                continue
+            entry = self._sources.get(key)
+            if entry is not None and tuple(entry["signature"]) == signature:
+                continue
+            self._index_file(level, directory / name, signature)
+            indexed += 1
+
+        stale = [key for key in self._sources if key not in seen]
+        for key in stale:
+            self._remove_source(key)
+
+        linked = self._merge_grand_digest_links()
+
+        if (indexed or stale or linked) and save:
+            self.save()
+        log_debug(f"{LOG_PREFIX_FILE} search index refresh: indexed={indexed} removed={len(stale)}")
+        return {"indexed": indexed, "removed": len(stale)}
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        インデックスを破棄して全ファイルを再索引
+
+        Returns:
+            refresh() と同じ形式の件数
+        """
+        self._reset()
+        self._loaded = True
+        counts = self.refresh()
+        _logger.info(
+            f"検索インデックス再構築完了: {counts['indexed']}ファイル, {len(self._bm25)}文書"
+        )
+        return counts
+
+    def update_file(
+        self,
+        level: str,
+        path: Path,
+        data: Optional[Dict[str, Any]] = None,
+        save: bool = True,
+    ) -> int:
+        """
+        1ファイル分の文書を再索引
+
+        Args:
+            level: 階層名（"loop", "weekly", ...）
+            path: ファイルパス
+            data: ファイル内容（保存直後など既に手元にある場合、再読み込みを省略）
+            save: インデックスを保存するか
+
+        Returns:
+            索引した文書数
+        """
+        if not save:
+            self._ensure_loaded()
+            return self._update_file(level, path, data)
+        with exclusive_lock(self.index_path):
+            # 読み込み後に他プロセスが保存していれば、その内容に重ねる
+            if self._loaded and _file_signature(self.index_path) != self._file_signature:
+                self._reset()
+                self._loaded = False
+            self._ensure_loaded()
+            count = self._update_file(level, path, data)
+            self.save()
+        return count
+
+    def save(self) -> None:
+        """インデックスをファイルに保存（SearchIndex.json の排他ロック下）"""
+        data = {
+            "version": SEARCH_INDEX_VERSION,
+            "ngram_size": DEFAULT_NGRAM_SIZE,
+            "sources": self._sources,
+            "documents": self._documents,
+            "bm25": self._bm25.to_dict(),
+            "vectors": self._vectors.to_dict(),
+        }
+        with exclusive_lock(self.index_path):
+            # 行列を先に書き、メタデータの行数と突き合わせて不整合を検出できるようにする
+            save_bytes(self.vector_path, self._vectors.to_bytes())
+            # 再構築できるキャッシュなので fast モード（壊れていれば _ensure_loaded が再構築する）
+            save_json(self.index_path, data, compact=True, atomic=False)
+            self.tree.save()
+            self._file_signature = _file_signature(self.index_path)
+        log_debug(f"{LOG_PREFIX_FILE} search index saved: {self.index_path}")
+
+    # =========================================================================
+    # 検索
+    # =========================================================================
+
+    def search(
+        self, query: str, top_k: int = 10, levels: Optional[Sequence[str]] = None
+    ) -> List[SearchHit]:
+        """
+        クエリに一致する文書を BM25 スコア順に取得
+
+        Args:
+            query: 検索クエリ（日本語可）
+            top_k: 返す件数の上限
+            levels: 対象階層（省略時は全階層）
+
+        Returns:
+            SearchHit のリスト（スコア降順）
+        """
+        self._ensure_loaded()
+        doc_filter: Optional[Callable[[str], bool]] = None
+        if levels:
+            prefixes = tuple(f"{level}/" for level in levels)
+
+            def _in_levels(doc_id: str) -> bool:
+                return doc_id.startswith(prefixes)
+
+            doc_filter = _in_levels
+
+        return [
+            self._make_hit(doc_id, score)
+            for doc_id, score in self._bm25.search(tokenize(query), top_k, doc_filter)
+        ]
+
+    def search_hierarchical(
+        self,
+        query: str,
+        top_k: int = 10,
+        beam_width: int = DEFAULT_BEAM_WIDTH,
+    ) -> List[SearchHit]:
+        """
+        上位階層から子ノードへ降りるビームサーチ
+
+        各階層で「上位階層で選ばれたノードの子」と「まだ上位に統合されていない
+        ノード」のみをスコアリングし、上位 beam_width 件の子を次の階層へ展開する。
+
+        Args:
+            query: 検索クエリ（日本語可）
+            top_k: 返す件数の上限
+            beam_width: 各階層で展開するノード数
+
+        Returns:
+            スコアが正の SearchHit のリスト（スコア降順）。
+            各ノードの overall_digest（Loopは本体）を単位とする
+        """
+        self._ensure_loaded()
+        tokens = tokenize(query)
+        roots = self._roots_by_level()
+        scored: Dict[str, float] = {}
+        expanded: Set[str] = set()
+
+        # 上位階層（centurial）→ loop の順
+        for level in reversed(LEVEL_NAMES):
+            candidates = expanded.union(roots.get(level, []))
+            if not candidates:
+                continue
+            scores = self._bm25.score_documents(tokens, candidates)
+            scored.update(scores)
+            # スコアが同点の場合は新しい（番号の大きい）ノードを優先
+            beam = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+            expanded = {
+                child for parent, _ in beam[:beam_width] for child in self.tree.children(parent)
+            }
+
+        log_debug(f"{LOG_PREFIX_FILE} hierarchical search: scored={len(scored)} nodes")
+        ranked = sorted(
+            ((doc_id, score) for doc_id, score in scored.items() if score > 0),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [self._make_hit(doc_id, score) for doc_id, score in ranked[:top_k]]
+
+    def most_similar(
+        self,
+        query: Union[str, Mapping[str, Any]],
+        top_k: int = 10,
+        levels: Optional[Sequence[str]] = None,
+        exclude: Sequence[str] = (),
+    ) -> List[SearchHit]:
+        """
+        クエリに類似したダイジェストをコサイン類似度順に取得
+
+        キーワードが一致しなくても、文字 n-gram の分布が近い文書を返す。
+        対象は各ファイルの overall_digest（Loop は本体）単位。
+
+        Args:
+            query: テキスト、または overall_digest 形式の辞書
+                （Shadow の overall_digest / RegularDigest をそのまま渡せる）
+            top_k: 返す件数の上限
+            levels: 対象階層（省略時は全階層）
+            exclude: 除外する文書ID（"<level>/<ファイル名>"）
+
+        Returns:
+            SearchHit のリスト（score はコサイン類似度、降順）
+
+        Example:
+            >>> shadow = shadow_io.load_or_create()
+            >>> index.most_similar(
+            ...     shadow["latest_digests"]["weekly"]["overall_digest"], levels=["weekly"]
+            ... )
+        """
+        self._ensure_loaded()
+        if isinstance(query, Mapping):
+            overall = query.get("overall_digest", query)
+            text = _document_text(overall) if isinstance(overall, Mapping) else ""
+        else:
+            text = query
+        if not text:
+            return []
+        tokens = tokenize(text)
+
+        doc_filter: Optional[Callable[[str], bool]] = None
+        if levels:
+            prefixes = tuple(f"{level}/" for level in levels)
+
+            def _in_levels(doc_id: str) -> bool:
+                return doc_id.startswith(prefixes)
+
+            doc_filter = _in_levels
+
+        return [
+            self._make_hit(doc_id, score)
+            for doc_id, score in self._vectors.most_similar(tokens, top_k, doc_filter, exclude)
+        ]
+
+    def _make_hit(self, doc_id: str, score: float) -> SearchHit:
+        meta = self._documents.get(doc_id, {})
+        return SearchHit(
+            doc_id=doc_id,
+            score=round(score, 6),
+            level=meta.get("level", ""),
+            file=meta.get("file", ""),
+            source_file=meta.get("source_file"),
+            digest_type=meta.get("digest_type", ""),
+            keywords=list(meta.get("keywords", [])),
+            snippet=meta.get("snippet", ""),
+        )
+
+    # =========================================================================
+    # 内部処理
+    # =========================================================================
+
+    def _reset(self) -> None:
+        self._bm25 = BM25Index()
+        self._vectors = HashedVectorIndex()
+        self._sources = {}
+        self._documents = {}
+        self._roots = None
+        self.tree.clear()
+
+    def _ensure_loaded(self) -> None:
+        """インデックスファイルを読み込む（不正・旧形式の場合は空から再構築）"""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._file_signature = _file_signature(self.index_path)
+        data = _read_index_file(self.index_path)
+        if not data:
+            return
+        if not self.tree.load():
+            # 隣接リストがない場合は全ファイルを再索引して作り直す
+            log_debug(f"{LOG_PREFIX_FILE} digest tree missing, rebuilding")
+            return
+        if (
+            data.get("version") != SEARCH_INDEX_VERSION
+            or data.get("ngram_size") != DEFAULT_NGRAM_SIZE
+        ):
+            log_debug(f"{LOG_PREFIX_FILE} search index format changed, rebuilding")
+            self.tree.clear()
+            return
+        try:
+            self._bm25 = BM25Index.from_dict(data["bm25"])
+            self._vectors = HashedVectorIndex.from_dict(
+                data["vectors"], self.vector_path.read_bytes()
+            )
+            self._sources = dict(data["sources"])
+            self._documents = dict(data["documents"])
+        except (KeyError, TypeError, ValueError, AttributeError, OSError):
+            log_debug(f"{LOG_PREFIX_FILE} search index corrupted, rebuilding")
+            self._reset()
+
+    @staticmethod
+    def _source_key(level: str, filename: str) -> str:
+        return node_id(level, filename)
+
+    def _roots_by_level(self) -> Dict[str, List[str]]:
+        """上位ダイジェストに統合されていないノード（各階層の探索起点）"""
+        if self._roots is None:
+            linked = self.tree.all_children()
+            roots: Dict[str, List[str]] = {}
+            for key in self._sources:
+                if key not in linked:
+                    roots.setdefault(key.split("/", 1)[0], []).append(key)
+            self._roots = roots
+        return self._roots
+
+    def _merge_grand_digest_links(self) -> bool:
+        """
+        GrandDigest.major_digests のリンクで隣接リストを補完
+
+        RegularDigest ファイルが存在しない（移動・削除された）最新ダイジェストも
+        階層検索で辿れるようにする。
+
+        Returns:
+            隣接リストを変更した場合True
+        """
+        grand = load_stored_document(self.config, GRAND_DIGEST_FILENAME) or safe_read_json(
+            self.config.essences_path / GRAND_DIGEST_FILENAME, raise_on_error=False
+        )
+        major = grand.get("major_digests") if grand else None
+        if not isinstance(major, dict):
+            return False
+        changed = False
+        for level, entry in major.items():
+            overall = entry.get("overall_digest") if isinstance(entry, dict) else None
+            if child_level_of(level) is None or not isinstance(overall, dict):
+                continue
+            name = overall.get("name")
+            if not isinstance(name, str) or not name:
+                continue
+            parent = node_id(level, f"{name}.txt")
+            if parent in self.tree:
+                continue
+            children = children_from_digest(level, overall)
+            if children:
+                self.tree.set_children(parent, children)
+                self._roots = None
+                changed = True
+        return changed
+
+    @staticmethod
+    def _signature(path: Union[str, Path]) -> Optional[_Signature]:
+        return _source_signature(path)
+
+    def _remove_source(self, key: str) -> None:
+        entry = self._sources.pop(key, None)
+        if entry is None:
+            return
+        for doc_id in entry.get("docs", []):
+            self._bm25.remove(doc_id)
+            self._documents.pop(doc_id, None)
+        self._vectors.remove(key)
+        self.tree.remove(key)
+        self._roots = None
+
+    def _update_file(self, level: str, path: Path, data: Optional[Dict[str, Any]]) -> int:
+        signature = self._signature(path)
+        if signature is None:
+            return 0
+        return self._index_file(level, path, signature, data)
+
+    def _index_file(
+        self,
+        level: str,
+        path: Path,
+        signature: _Signature,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """ファイルの既存文書を削除し、現在の内容で索引し直す"""
+        key = self._source_key(level, path.name)
+        self._remove_source(key)
+
+        if data is None:
+            data = try_read_json_from_file(path, log_on_error=False)
+        doc_ids: List[str] = []
+        if data:
+            for doc_id, meta, text in _extract_documents(key, level, path.name, data):
+                tokens = tokenize(text)
+                self._bm25.add(doc_id, tokens)
+                if doc_id == key:
+                    self._vectors.add(doc_id, tokens)
+                self._documents[doc_id] = meta
+                doc_ids.append(doc_id)
+
+        if data and child_level_of(level) is not None:
+            self.tree.set_children(key, children_from_digest(level, data))
+        self._sources[key] = {"signature": list(signature), "docs": doc_ids}
+        self._roots = None
+        return len(doc_ids)
+
+
+def iter_source_signatures(
+    config: DigestConfig,
+) -> Iterator[Tuple[str, Path, str, Optional[_Signature]]]:
+    """
+    索引対象の全ファイルを (level, ディレクトリ, ファイル名, シグネチャ) で列挙
+
+    インデックスは読み込まない。ファイル名は file_index のマニフェストから取得する。
+
+    Args:
+        config: DigestConfig インスタンス
+
+    Yields:
+        Loop → weekly → ... の順（各階層内はファイル名順、アーカイブ済みを含む）。
+        シグネチャは (mtime_ns, size)、アーカイブ済みは元ファイルの値、取得できなければNone
+    """
+    yield from _iter_level_signatures("loop", config.loops_path, LOOP_FILE_PATTERN)
+    registry = get_level_registry()
+    for level in DIGEST_LEVEL_NAMES:
+        pattern = f"{registry.get_metadata(level).prefix}*.txt"
+        yield from _iter_level_signatures(level, config.get_level_dir(level), pattern)
+
+
+def _iter_level_signatures(
+    level: str, directory: Path, pattern: str
+) -> Iterator[Tuple[str, Path, str, Optional[_Signature]]]:
+    prefix = os.path.join(directory, "")
+    for name in _names_with_archive(directory, pattern):
+        yield level, directory, name, _source_signature(prefix + name)
+
+
+def _source_signature(path: Union[str, Path]) -> Optional[_Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # アーカイブ済みなら元ファイルのシグネチャ（再索引しない）
+        return archived_signature(Path(path))
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _names_with_archive(directory: Path, pattern: str) -> List[str]:
+    """ディレクトリのファイル名とアーカイブ済みファイル名を名前順に返す"""
+    names = get_file_index(directory, pattern).names()
+    archived = archived_names(directory)
+    if not archived:
+        return names
+    present = set(names)
+    extra = [name for name in archived if name not in present and fnmatch.fnmatch(name, pattern)]
+    if not extra:
+        return names
+    return sorted([*names, *extra])
+
+
+def _file_signature(path: Path) -> Optional[_Signature]:
+    """インデックスファイル自体の (mtime_ns, size)（存在しなければNone）"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_index_file(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    インデックスファイルを読み込む（存在しない・壊れている場合はNone）
+
+    safe_read_json の共有キャッシュは返却のたびに複製するため、
+    一度しか読まない数MBのインデックスには使わない。
+    """
+    try:
+        data = json_loads(path.read_bytes())
+    except (OSError, ValueError, UnicodeDecodeError):
+        # ValueError は json.JSONDecodeError と他コーデックのパースエラーを含む
+        return None
+    return data if isinstance(data, dict) else None
+
+
+# =============================================================================
+# 文書抽出
+# =============================================================================
+
+
+def _clean_text(value: Any) -> str:
+    """LongShortText / 文字列から索引用テキストを取得（PLACEHOLDERは除外）"""
+    text = extract_long_value(value) or extract_short_value(value)
+    if PLACEHOLDER_MARKER in text:
+        return ""
+    return text
+
+
+def _clean_keywords(value: Any) -> List[str]:
+    """keywords から PLACEHOLDER 以外の文字列を抽出"""
+    return [
+        kw
+        for kw in (value if isinstance(value, list) else [])
+        if isinstance(kw, str) and PLACEHOLDER_MARKER not in kw
+    ]
+
+
+def _document_text(entry: Mapping[str, Any]) -> str:
+    """
+    overall_digest / individual_digests エントリの索引用テキスト
+
+    RegularDigestBuilder.build が生成する overall_digest と同じフィールド
+    （digest_type / keywords / abstract / impression）を連結する。
+    """
+    parts = (
+        _clean_text(entry.get("digest_type", "")),
+        " ".join(_clean_keywords(entry.get("keywords", []))),
+        _clean_text(entry.get("abstract", "")),
+        _clean_text(entry.get("impression", "")),
+    )
+    return "\n".join(part for part in parts if part)
+
+
+def _build_document(
+    doc_id: str, level: str, filename: str, entry: Dict[str, Any], source_file: Optional[str]
+) -> Optional[Tuple[str, Dict[str, Any], str]]:
+    """overall_digest / individual_digests エントリから (doc_id, meta, text) を生成"""
+    text = _document_text(entry)
+    if not text:
+        return None
+
+    digest_type = _clean_text(entry.get("digest_type", ""))
+    keywords = _clean_keywords(entry.get("keywords", []))
+    abstract = _clean_text(entry.get("abstract", ""))
+
+    meta: Dict[str, Any] = {
+        "level": level,
+        "file": filename,
+        "digest_type": digest_type,
+        "keywords": keywords,
+        "snippet": abstract[:SNIPPET_LENGTH],
+    }
+    if source_file is not None:
+        meta["source_file"] = source_file
+    return doc_id, meta, text
+
+
+def _extract_documents(
+    key: str, level: str, filename: str, data: Dict[str, Any]
+) -> List[Tuple[str, Dict[str, Any], str]]:
+    """
+    ファイル内容から索引対象の文書を抽出
+
+    Args:
+        key: ソースキー（"<level>/<ファイル名>"）
+        level: 階層名
+        filename: ファイル名
+        data: ファイル内容
+
+    Returns:
+        (doc_id, meta, text) のリスト
+    """
+    documents = []
+
+    overall = data.get("overall_digest")
+    if isinstance(overall, dict):
+        document = _build_document(key, level, filename, overall, None)
+        if document is not None:
+            documents.append(document)
+
+    individuals = data.get("individual_digests")
+    if isinstance(individuals, list):
+        for i, entry in enumerate(individuals):
+            if not isinstance(entry, dict):
+                continue
+            source_file = entry.get("source_file")
+            document = _build_document(
+                f"{key}#{i}",
+                level,
+                filename,
+                entry,
+                source_file if isinstance(source_file, str) else "",
+            )
+            if document is not None:
+                documents.append(document)
+
+    return documents
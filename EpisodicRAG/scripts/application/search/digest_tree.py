@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Digest Tree
+===========
+
+階層ツリー（centurial → … → weekly → loop）の親→子隣接リスト。
+
+RegularDigest の overall_digest.source_files が子ノードへのリンクになっている。
+検索のたびに各ダイジェストを開かずに済むよう、隣接リストを
+Essences/DigestTree.json に永続化する。
+
+ノードIDは検索インデックスの文書IDと同じ "<level>/<ファイル名>" 形式。
+
+Usage:
+    from application.search.digest_tree import DigestTree
+
+    tree = DigestTree(essences_path / DIGEST_TREE_FILENAME)
+    tree.load()
+    tree.set_children("monthly/M0001_x.txt", ["weekly/W0001_a.txt", "weekly/W0002_b.txt"])
+    tree.children("monthly/M0001_x.txt")
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from domain.constants import LEVEL_CONFIG
+from infrastructure import save_json
+from infrastructure.json_repository import safe_read_json
+
+__all__ = [
+    "DigestTree",
+    "child_level_of",
+    "children_from_digest",
+    "node_id",
+    "DIGEST_TREE_VERSION",
+]
+
+# 隣接リスト形式のバージョン
+DIGEST_TREE_VERSION = 1
+
+# 親レベル → 子レベル（LEVEL_CONFIG の next の逆引き）
+_CHILD_LEVEL: Dict[str, str] = {
+    str(config["next"]): level for level, config in LEVEL_CONFIG.items() if config["next"]
+}
+
+
+def node_id(level: str, filename: str) -> str:
+    """
+    ノードIDを生成
+
+    Args:
+        level: 階層名
+        filename: ファイル名
+
+    Returns:
+        "<level>/<ファイル名>"
+    """
+    return f"{level}/{filename}"
+
+
+def child_level_of(level: str) -> Optional[str]:
+    """
+    子レベル名を取得
+
+    Args:
+        level: 階層名
+
+    Returns:
+        子レベル名（weekly → "loop"）、loop の場合はNone
+    """
+    return _CHILD_LEVEL.get(level)
+
+
+def children_from_digest(level: str, data: Mapping[str, Any]) -> List[str]:
+    """
+    RegularDigest / major_digests エントリから子ノードIDを抽出
+
+    Args:
+        level: ダイジェストの階層名
+        data: overall_digest を含む辞書、または overall_digest そのもの
+
+    Returns:
+        子ノードIDのリスト（source_files の順）
+    """
+    child_level = child_level_of(level)
+    if child_level is None:
+        return []
+    overall = data.get("overall_digest", data)
+    if not isinstance(overall, Mapping):
+        return []
+    source_files = overall.get("source_files", [])
+    if not isinstance(source_files, list):
+        return []
+    return [node_id(child_level, name) for name in source_files if isinstance(name, str)]
+
+
+class DigestTree:
+    """
+    親→子隣接リスト
+
+    Attributes:
+        path: 隣接リストファイルのパス
+
+    Example:
+        >>> tree = DigestTree(Path("Essences/DigestTree.json"))
+        >>> tree.set_children("weekly/W0001.txt", ["loop/L00001.txt"])
+        >>> tree.parent("loop/L00001.txt")
+        'weekly/W0001.txt'
+    """
+
+    def __init__(self, path: Path):
+        """
+        初期化
+
+        Args:
+            path: 隣接リストファイルのパス
+        """
+        self.path = path
+        self._children: Dict[str, List[str]] = {}
+        self._parents: Optional[Dict[str, str]] = None
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._children
+
+    def load(self) -> bool:
+        """
+        隣接リストを読み込む
+
+        Returns:
+            読み込めた場合True（ファイルなし・不正・旧形式の場合False）
+        """
+        self._children = {}
+        self._parents = None
+        data = safe_read_json(self.path, raise_on_error=False)
+        if not data or data.get("version") != DIGEST_TREE_VERSION:
+            return False
+        children = data.get("children")
+        if not isinstance(children, dict):
+            return False
+        self._children = {
+            parent: list(kids) for parent, kids in children.items() if isinstance(kids, list)
+        }
+        return True
+
+    def save(self) -> None:
+        """隣接リストをファイルに保存"""
+        save_json(
+            self.path,
+            {"version": DIGEST_TREE_VERSION, "children": self._children},
+            compact=True,
+        )
+
+    def clear(self) -> None:
+        """全ノードを削除"""
+        self._children = {}
+        self._parents = None
+
+    def set_children(self, parent: str, children: Iterable[str]) -> None:
+        """
+        親ノードの子を設定（既存の子は置き換え）
+
+        Args:
+            parent: 親ノードID
+            children: 子ノードIDのイテラブル
+        """
+        self._children[parent] = list(children)
+        self._parents = None
+
+    def remove(self, parent: str) -> None:
+        """
+        親ノードの子リストを削除
+
+        Args:
+            parent: 親ノードID
+        """
+        if self._children.pop(parent, None) is not None:
+            self._parents = None
+
+    def children(self, parent: str) -> List[str]:
+        """
+        子ノードIDのリスト
+
+        Args:
+            parent: 親ノードID
+
+        Returns:
+            子ノードIDのリスト（未登録の場合は空）
+        """
+        return self._children.get(parent, [])
+
+    def parent(self, child: str) -> Optional[str]:
+        """
+        親ノードID
+
+        Args:
+            child: 子ノードID
+
+        Returns:
+            親ノードID、未統合のノードはNone
+        """
+        return self._parent_map().get(child)
+
+    def has_parent(self, child: str) -> bool:
+        """子ノードが既に上位ダイジェストに統合されているか"""
+        return child in self._parent_map()
+
+    def all_children(self) -> Set[str]:
+        """いずれかの親を持つノードIDの集合"""
+        return set(self._parent_map())
+
+    def _parent_map(self) -> Dict[str, str]:
+        if self._parents is None:
+            self._parents = {
+                child: parent for parent, kids in self._children.items() for child in kids
+            }
+        return self._parents
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Search Tokenizer
+================
+
+全文検索用のトークナイザ。
+
+日本語は分かち書きされないため、形態素解析器（外部依存）を使わずに
+文字 n-gram（デフォルト: bigram）で索引語を生成する。
+英数字の連続は単語として扱う。
+
+Usage:
+    from application.search.tokenizer import tokenize
+
+    tokenize("EpisodicRAGの検索機能")
+    # ['episodicrag', 'の検', '検索', '索機', '機能']
+"""
+
+import re
+import unicodedata
+from typing import List
+
+__all__ = ["tokenize", "DEFAULT_NGRAM_SIZE"]
+
+# 日本語等の非ASCII文字列に適用する n-gram の長さ
+DEFAULT_NGRAM_SIZE = 2
+
+# 英数字の連続 / それ以外の単語構成文字の連続
+_SEGMENT_PATTERN = re.compile(r"[0-9a-z_]+|[^\W0-9a-z_]+")
+
+
+def tokenize(text: str, ngram_size: int = DEFAULT_NGRAM_SIZE) -> List[str]:
+    """
+    テキストを索引語のリストに分割
+
+    NFKC正規化・小文字化の後、英数字の連続は1語、
+    それ以外（ひらがな・カタカナ・漢字等）は文字 n-gram に分割する。
+    n より短い非ASCII文字列はそのまま1語とする。
+
+    Args:
+        text: 入力テキスト
+        ngram_size: 非ASCII文字列の n-gram 長（デフォルト: 2）
+
+    Returns:
+        索引語のリスト（出現順、重複あり）
+
+    Example:
+        >>> tokenize("Python入門")
+        ['python', '入門']
+        >>> tokenize("検索機能")
+        ['検索', '索機', '機能']
+    """
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens: List[str] = []
+    for segment in _SEGMENT_PATTERN.findall(normalized):
+        if segment.isascii():
+            tokens.append(segment)
+        elif len(segment) <= ngram_size:
+            tokens.append(segment)
+        else:
+            tokens.extend(segment[i : i + ngram_size] for i in range(len(segment) - ngram_size + 1))
+    return tokens
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Hashed Vector Index
+===================
+
+埋め込みモデルを使わない類似度検索用のベクトルインデックス。
+
+文字 n-gram（tokenize() の出力）を Feature Hashing で固定次元に写像し、
+サブリニア TF × IDF で重み付けしたうえで、オプションの疎ランダム射影で
+次元を削減する。ベクトルは L2 正規化するため内積がコサイン類似度になる。
+
+## 設計意図
+
+ARCHITECTURE: Flat Float32 Matrix
+全ベクトルを 1 本の array('f')（行優先、1行 = 1文書）に格納する。
+tobytes() の出力はそのまま np.memmap / np.frombuffer で読める生の float32 行列。
+NumPy が使える場合は行列積で類似度を計算する。使えない場合の純Python実装は
+math.dist（C実装）で各行との距離を求め、単位ベクトル同士の恒等式
+    q·r = (|q|² + |r|² - |q - r|²) / 2    （|r|² は 1、ゼロベクトルの行は 0）
+で内積に戻す。sum(map(mul, ...)) より約2倍速い。
+
+IDF について:
+    文書頻度（df）はハッシュバケット単位で保持する。各文書が寄与したバケットを
+    記録しておき、削除・置換時に df から減算する。格納済みのベクトルは追加時点の
+    df で重み付けされたままになる（近似）。add() はベクトル化を次回の検索・保存まで
+    遅延するため、一括追加した文書は最終的な df で揃う。rebuild すれば正確な値に戻る。
+
+Usage:
+    from application.search.vector_index import HashedVectorIndex
+
+    index = HashedVectorIndex()
+    index.add("weekly/W0001_a.txt", tokenize("週次の振り返り"))
+    index.most_similar(tokenize("振り返り"), top_k=10)   # [("weekly/W0001_a.txt", 0.8...)]
+"""
+
+import base64
+import heapq
+import math
+import random
+import sys
+import zlib
+from array import array
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+__all__ = [
+    "HashedVectorIndex",
+    "is_numpy_available",
+    "DEFAULT_HASH_DIMENSIONS",
+    "DEFAULT_PROJECTION_DIMENSIONS",
+    "DEFAULT_PROJECTION_SEED",
+]
+
+# Feature Hashing の次元数
+DEFAULT_HASH_DIMENSIONS = 1024
+
+# ランダム射影後の次元数（None で射影なし）。
+# 純Python実装で 1万文書の類似検索を 50ms 以内に収めるため 64 次元とする
+DEFAULT_PROJECTION_DIMENSIONS = 64
+
+# ランダム射影行列のシード
+DEFAULT_PROJECTION_SEED = 0
+
+# 疎ランダム射影で1バケットが寄与する出力次元数
+_PROJECTION_NONZEROS = 4
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - optional dependency
+    _np = None
+
+
+def is_numpy_available() -> bool:
+    """NumPy がインポート可能か"""
+    return _np is not None
+
+
+@lru_cache(maxsize=8)
+def _projection_table(
+    hash_dimensions: int, projection_dimensions: int, seed: int
+) -> Tuple[Tuple[Tuple[int, float], ...], ...]:
+    """
+    疎ランダム射影表を生成（バケットごとに (出力次元, ±1) の組）
+
+    Achlioptas / Li らの疎射影と同じく、各入力次元は少数の出力次元に
+    ±1 で寄与する。シードが同じなら常に同じ表になる。
+    """
+    rng = random.Random(seed)
+    nonzeros = min(_PROJECTION_NONZEROS, projection_dimensions)
+    return tuple(
+        tuple(
+            (column, 1.0 if rng.random() < 0.5 else -1.0)
+            for column in rng.sample(range(projection_dimensions), nonzeros)
+        )
+        for _ in range(hash_dimensions)
+    )
+
+
+class HashedVectorIndex:
+    """
+    ハッシュ化 TF-IDF ベクトルのインデックス
+
+    Attributes:
+        hash_dimensions: Feature Hashing の次元数
+        projection_dimensions: 射影後の次元数（None は射影なし）
+        seed: 射影行列のシード
+        dimensions: 格納するベクトルの次元数
+
+    Example:
+        >>> index = HashedVectorIndex()
+        >>> index.add("a", ["週次", "次の", "の振", "振り", "返り"])
+        >>> index.add("b", ["月次", "次の", "設計"])
+        >>> index.most_similar(["週次", "振り"], top_k=1)[0][0]
+        'a'
+    """
+
+    def __init__(
+        self,
+        hash_dimensions: int = DEFAULT_HASH_DIMENSIONS,
+        projection_dimensions: Optional[int] = DEFAULT_PROJECTION_DIMENSIONS,
+        seed: int = DEFAULT_PROJECTION_SEED,
+        use_numpy: Optional[bool] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            hash_dimensions: Feature Hashing の次元数
+            projection_dimensions: 射影後の次元数（None で射影なし）
+            seed: 射影行列のシード
+            use_numpy: NumPy を使うか（None は利用可能なら使う）
+        """
+        if hash_dimensions <= 0:
+            raise ValueError(f"hash_dimensions must be positive: {hash_dimensions}")
+        if projection_dimensions is not None and projection_dimensions <= 0:
+            raise ValueError(f"projection_dimensions must be positive: {projection_dimensions}")
+        self.hash_dimensions = hash_dimensions
+        self.projection_dimensions = projection_dimensions
+        self.seed = seed
+        self.dimensions = projection_dimensions or hash_dimensions
+        if use_numpy is None:
+            use_numpy = is_numpy_available()
+        self.use_numpy = use_numpy and is_numpy_available()
+
+        self._rows = array("f")
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._pending: Dict[str, Counter] = {}
+        self._doc_freqs = array("l", bytes(array("l").itemsize * hash_dimensions))
+        self._df_docs = 0
+        # 文書ごとの df に寄与したバケット（削除時の減算用）
+        self._doc_buckets: Dict[str, array] = {}
+        # ゼロベクトルの文書（純Python実装の恒等式では |r|² = 0 として扱う）
+        self._zero_ids: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._positions or doc_id in self._pending
+
+    # =========================================================================
+    # 更新
+    # =========================================================================
+
+    def add(self, doc_id: str, tokens: Iterable[str]) -> None:
+        """
+        文書を追加（既存の doc_id は置き換え）
+
+        ベクトル化は次回の検索・保存時にまとめて行う。
+
+        Args:
+            doc_id: 文書ID
+            tokens: 索引語のイテラブル
+        """
+        self.remove(doc_id)
+        bucket_counts = self._hash_counts(tokens)
+        for bucket in bucket_counts:
+            self._doc_freqs[bucket] += 1
+        self._df_docs += 1
+        self._doc_buckets[doc_id] = array("i", bucket_counts)
+        self._pending[doc_id] = bucket_counts
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        文書を削除（末尾行との入れ替えで行列を詰め、df から減算する）
+
+        Args:
+            doc_id: 文書ID
+
+        Returns:
+            削除した場合True、存在しなかった場合False
+        """
+        buckets = self._doc_buckets.pop(doc_id, None)
+        if buckets is not None:
+            for bucket in buckets:
+                self._doc_freqs[bucket] -= 1
+            self._df_docs -= 1
+        self._zero_ids.discard(doc_id)
+        if self._pending.pop(doc_id, None) is not None:
+            return True
+        position = self._positions.pop(doc_id, None)
+        if position is None:
+            return False
+        dim = self.dimensions
+        last = len(self._ids) - 1
+        if position != last:
+            moved = self._ids[last]
+            self._rows[position * dim : (position + 1) * dim] = self._rows[last * dim :]
+            self._ids[position] = moved
+            self._positions[moved] = position
+        del self._rows[last * dim :]
+        self._ids.pop()
+        return True
+
+    def _flush(self) -> None:
+        """保留中の文書をベクトル化して行列に追加"""
+        if not self._pending:
+            return
+        for doc_id, bucket_counts in self._pending.items():
+            self._positions[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            vector = self._vectorize_counts(bucket_counts)
+            if not any(vector):
+                self._zero_ids.add(doc_id)
+            self._rows.extend(vector)
+        self._pending = {}
+
+    # =========================================================================
+    # ベクトル化
+    # =========================================================================
+
+    def vectorize(self, tokens: Iterable[str]) -> List[float]:
+        """
+        索引語列を現在の IDF で L2 正規化済みベクトルに変換
+
+        Args:
+            tokens: 索引語のイテラブル
+
+        Returns:
+            dimensions 次元のベクトル（語がない場合はゼロベクトル）
+        """
+        return self._vectorize_counts(self._hash_counts(tokens))
+
+    def vector(self, doc_id: str) -> Optional[List[float]]:
+        """
+        格納済みの文書ベクトル
+
+        Args:
+            doc_id: 文書ID
+
+        Returns:
+            ベクトル、未登録の場合はNone
+        """
+        self._flush()
+        position = self._positions.get(doc_id)
+        if position is None:
+            return None
+        dim = self.dimensions
+        return self._rows[position * dim : (position + 1) * dim].tolist()
+
+    def _hash_counts(self, tokens: Iterable[str]) -> Counter:
+        """索引語 → 符号付きハッシュバケットの出現回数"""
+        counts: Counter = Counter()
+        hash_dimensions = self.hash_dimensions
+        for token, freq in Counter(tokens).items():
+            digest = zlib.crc32(token.encode("utf-8"))
+            bucket = (digest >> 1) % hash_dimensions
+            # 最下位ビットを符号に使い、ハッシュ衝突による偏りを打ち消す
+            counts[bucket] += freq if digest & 1 else -freq
+        return counts
+
+    def _vectorize_counts(self, bucket_counts: Counter) -> List[float]:
+        df_docs = self._df_docs
+        doc_freqs = self._doc_freqs
+        weights: List[Tuple[int, float]] = []
+        for bucket, count in bucket_counts.items():
+            if count == 0:
+                continue
+            tf = 1.0 + math.log(abs(count))
+            idf = math.log((1.0 + df_docs) / (1.0 + doc_freqs[bucket])) + 1.0
+            weights.append((bucket, math.copysign(tf * idf, count)))
+
+        vector = [0.0] * self.dimensions
+        if self.projection_dimensions is None:
+            for bucket, weight in weights:
+                vector[bucket] = weight
+        else:
+            table = _projection_table(self.hash_dimensions, self.projection_dimensions, self.seed)
+            for bucket, weight in weights:
+                for column, sign in table[bucket]:
+                    vector[column] += sign * weight
+
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0.0:
+            return vector
+        return [x / norm for x in vector]
+
+    # =========================================================================
+    # 検索
+    # =========================================================================
+
+    def most_similar(
+        self,
+        query: Iterable[Any],
+        top_k: int = 10,
+        doc_filter: Optional[Callable[[str], bool]] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, float]]:
+        """
+        コサイン類似度の上位文書を取得
+
+        Args:
+            query: クエリの索引語、または vectorize() / vector() の出力
+            top_k: 返す件数の上限
+            doc_filter: Trueを返した文書のみ対象にするフィルタ（省略時は全文書）
+            exclude: 結果から除外する文書ID
+
+        Returns:
+            (doc_id, similarity) のリスト（類似度降順、同点はdoc_id昇順）。
+            類似度が正の文書のみを含む
+        """
+        self._flush()
+        if not self._ids or top_k <= 0:
+            return []
+        query_items = list(query)
+        if query_items and isinstance(query_items[0], float):
+            if len(query_items) != self.dimensions:
+                raise ValueError(
+                    f"vector dimension mismatch: {len(query_items)} != {self.dimensions}"
+                )
+            query_vector: Sequence[float] = query_items
+        else:
+            query_vector = self.vectorize(query_items)
+
+        excluded = set(exclude)
+        if doc_filter is None and not excluded:
+            candidates: Sequence[int] = range(len(self._ids))
+        else:
+            candidates = [
+                i
+                for i, doc_id in enumerate(self._ids)
+                if doc_id not in excluded and (doc_filter is None or doc_filter(doc_id))
+            ]
+        if not candidates:
+            return []
+
+        if self.use_numpy:
+            scored = self._score_numpy(query_vector, candidates, top_k)
+        else:
+            scored = self._score_python(query_vector, candidates)
+
+        positive = [item for item in scored if item[1] > 0.0]
+        if len(positive) > top_k:
+            # k番目のスコア以上をすべて残してから並べる（同点は doc_id 昇順）
+            threshold = heapq.nlargest(top_k, positive, key=itemgetter(1))[-1][1]
+            positive = [item for item in positive if item[1] >= threshold]
+        ranked = sorted(
+            ((self._ids[i], score) for i, score in positive), key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:top_k]
+
+    def _score_python(
+        self, query_vector: Sequence[float], candidates: Sequence[int]
+    ) -> List[Tuple[int, float]]:
+        rows = memoryview(self._rows)
+        dim = self.dimensions
+        dist = math.dist
+        # 格納済みの行は単位ベクトルなので q·r = (|q|² + 1 - |q - r|²) / 2
+        offset = sum(x * x for x in query_vector) + 1.0
+        scored = [
+            (i, (offset - dist(query_vector, rows[i * dim : (i + 1) * dim]) ** 2) * 0.5)
+            for i in candidates
+        ]
+        if self._zero_ids:
+            zero_rows = {self._positions[doc_id] for doc_id in self._zero_ids}
+            scored = [(i, 0.0 if i in zero_rows else score) for i, score in scored]
+        return scored
+
+    def _score_numpy(
+        self, query_vector: Sequence[float], candidates: Sequence[int], top_k: int
+    ) -> List[Tuple[int, float]]:
+        matrix = _np.frombuffer(self._rows, dtype=_np.float32).reshape(-1, self.dimensions)
+        query_array = _np.asarray(query_vector, dtype=_np.float32)
+        if len(candidates) == len(self._ids):
+            indices = _np.arange(len(self._ids))
+            scores = matrix @ query_array
+        else:
+            indices = _np.asarray(candidates)
+            scores = matrix[indices] @ query_array
+        if len(scores) > top_k:
+            # 同点の取りこぼしを防ぐため、k番目のスコア以上をすべて残す
+            threshold = _np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            keep = scores >= threshold
+            indices, scores = indices[keep], scores[keep]
+        return list(zip(indices.tolist(), scores.tolist()))
+
+    # =========================================================================
+    # 永続化
+    # =========================================================================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        メタデータを永続化用の辞書に変換（行列本体は to_bytes()）
+
+        Returns:
+            {"hash_dimensions", "projection_dimensions", "seed", "byteorder",
+             "ids", "doc_freqs", "df_docs", "bucket_counts", "buckets", "zero_ids"}
+            （buckets は ids 順に連結した int32 バケット番号の base64。
+            数万文書でも JSON のパースが重くならないよう文字列1つにまとめる）
+        """
+        self._flush()
+        buckets = array("i")
+        bucket_counts = []
+        for doc_id in self._ids:
+            doc_buckets = self._doc_buckets.get(doc_id, array("i"))
+            buckets.extend(doc_buckets)
+            bucket_counts.append(len(doc_buckets))
+        return {
+            "hash_dimensions": self.hash_dimensions,
+            "projection_dimensions": self.projection_dimensions,
+            "seed": self.seed,
+            "byteorder": sys.byteorder,
+            "ids": self._ids,
+            "doc_freqs": self._doc_freqs.tolist(),
+            "df_docs": self._df_docs,
+            "bucket_counts": bucket_counts,
+            "buckets": base64.b64encode(buckets.tobytes()).decode("ascii"),
+            "zero_ids": sorted(self._zero_ids),
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+        行列本体を float32 のバイト列に変換（行優先、ネイティブバイトオーダー）
+
+        Returns:
+            len(self) × dimensions × 4 バイト
+        """
+        self._flush()
+        return self._rows.tobytes()
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], payload: bytes, use_numpy: Optional[bool] = None
+    ) -> "HashedVectorIndex":
+        """
+        to_dict() / to_bytes() の出力から復元
+
+        Args:
+            data: to_dict() の出力
+            payload: to_bytes() の出力
+            use_numpy: NumPy を使うか（None は利用可能なら使う）
+
+        Returns:
+            HashedVectorIndex インスタンス
+
+        Raises:
+            ValueError: メタデータと行列のサイズが一致しない場合
+        """
+        projection = data.get("projection_dimensions")
+        index = cls(
+            hash_dimensions=int(data["hash_dimensions"]),
+            projection_dimensions=int(projection) if projection is not None else None,
+            seed=int(data.get("seed", DEFAULT_PROJECTION_SEED)),
+            use_numpy=use_numpy,
+        )
+        ids = [str(doc_id) for doc_id in data["ids"]]
+        rows = array("f")
+        rows.frombytes(payload)
+        if data.get("byteorder", sys.byteorder) != sys.byteorder:
+            rows.byteswap()
+        if len(rows) != len(ids) * index.dimensions:
+            raise ValueError(
+                f"vector payload size mismatch: {len(rows)} != {len(ids)} x {index.dimensions}"
+            )
+        doc_freqs = data.get("doc_freqs", [])
+        if len(doc_freqs) != index.hash_dimensions:
+            raise ValueError(
+                f"doc_freqs size mismatch: {len(doc_freqs)} != {index.hash_dimensions}"
+            )
+
+        bucket_counts = data["bucket_counts"]
+        buckets = array("i")
+        buckets.frombytes(base64.b64decode(data["buckets"]))
+        if data.get("byteorder", sys.byteorder) != sys.byteorder:
+            buckets.byteswap()
+        if len(bucket_counts) != len(ids) or sum(bucket_counts) != len(buckets):
+            raise ValueError("bucket list size mismatch")
+
+        index._rows = rows
+        index._ids = ids
+        index._positions = {doc_id: i for i, doc_id in enumerate(ids)}
+        index._doc_freqs = array("l", doc_freqs)
+        index._df_docs = int(data.get("df_docs", len(ids)))
+        start = 0
+        for doc_id, count in zip(ids, bucket_counts):
+            index._doc_buckets[doc_id] = buckets[start : start + count]
+            start += count
+        index._zero_ids = set(data.get("zero_ids", [])) & set(index._positions)
+        return index
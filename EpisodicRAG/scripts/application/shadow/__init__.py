@@ -8,6 +8,8 @@ Components:
     - ShadowTemplate: テンプレート生成
     - FileDetector: 新規ファイル検出
     - ShadowIO: Shadow I/O処理
+    - ShardedShadowIO: 階層ごとに分割保存する Shadow I/O
+    - ShadowSession: Shadow更新のUnit of Work
     - ShadowUpdater: Shadow更新・カスケード処理
     - CascadeProcessor: カスケードデータ操作
     - CascadeOrchestrator: カスケードワークフロー制御
@@ -23,13 +25,18 @@ from .cascade_processor import CascadeProcessor
 from .file_detector import FileDetector
 from .provisional_appender import ProvisionalAppender
 from .shadow_io import ShadowIO
+from .shadow_session import ShadowSession
 from .shadow_updater import ShadowUpdater
+from .sharded_io import ShardedShadowIO, migrate_shadow_layout
 from .template import ShadowTemplate
 
 __all__ = [
     "ShadowTemplate",
     "FileDetector",
     "ShadowIO",
+    "ShardedShadowIO",
+    "migrate_shadow_layout",
+    "ShadowSession",
     "ShadowUpdater",
     "CascadeProcessor",
     "CascadeOrchestrator",
@@ -103,6 +103,12 @@ class CascadeResult:
         return {step.step_name: step.status for step in self.steps}
 
 
+def _record_step(span: Dict[str, Any], result: CascadeStepResult) -> None:
+    """ステップの結果を span のコンテキストに記録"""
+    span["step_status"] = result.status.value
+    span["files_processed"] = result.files_processed
+
+
 class CascadeOrchestrator:
     """
     カスケード処理ワークフローのオーケストレーター
@@ -116,6 +122,13 @@ class CascadeOrchestrator:
     3. add: 次レベルのShadowにファイル追加
     4. clear: 現在レベルのShadowをクリア
 
+    全ステップは cascade_processor.shadow_io の ShadowSession 内で実行され、
+    ShadowGrandDigest.txt の読み込み・保存はそれぞれ1回にまとめられる。
+
+    カスケード全体は "cascade"、各ステップは "cascade.<step_name>" の span で囲まれ、
+    所要時間・ステータス・処理ファイル数がログに出力される
+    （EPISODIC_RAG_LOG_FORMAT=json で JSON Lines）。
+
     Attributes:
         cascade_processor: データ操作を担当するCascadeProcessor
         file_detector: 新規ファイル検出
@@ -180,40 +193,55 @@ class CascadeOrchestrator:
         # Step 3: add     - next_level + 新規ファイル存在時のみ（Shadow追加）
         # Step 4: clear   - 常に実行（現階層 Shadow クリア）
 
-        # Step 1: Promote (Shadow → Grand 確認)
-        promote_result = self._step_promote(level)
-        steps.append(promote_result)
-
-        # Step 2: Detect (次レベルの新規ファイル検出)
-        new_files: List[Path] = []
-        if next_level:
-            detect_result, new_files = self._step_detect(next_level)
-            steps.append(detect_result)
-        else:
-            steps.append(
-                CascadeStepResult(
-                    step_name="detect",
-                    status=CascadeStepStatus.SKIPPED,
-                    message=f"{level}に上位レベルなし（最上位）",
+        # 全ステップを1つの ShadowSession 内で実行（読み込み1回・保存1回）
+        with (
+            _logger.span("cascade", level=level) as cascade_span,
+            self.cascade_processor.shadow_io.session(),
+        ):
+            # Step 1: Promote (Shadow → Grand 確認)
+            with _logger.span("cascade.promote", level=level) as span:
+                promote_result = self._step_promote(level)
+                _record_step(span, promote_result)
+            steps.append(promote_result)
+
+            # Step 2: Detect (次レベルの新規ファイル検出)
+            new_files: List[Path] = []
+            if next_level:
+                with _logger.span("cascade.detect", level=next_level) as span:
+                    detect_result, new_files = self._step_detect(next_level)
+                    _record_step(span, detect_result)
+                steps.append(detect_result)
+            else:
+                steps.append(
+                    CascadeStepResult(
+                        step_name="detect",
+                        status=CascadeStepStatus.SKIPPED,
+                        message=f"{level}に上位レベルなし（最上位）",
+                    )
                 )
-            )
 
-        # Step 3: Add (次レベルのShadowにファイル追加)
-        if next_level and new_files:
-            add_result = self._step_add(next_level, new_files)
-            steps.append(add_result)
-        else:
-            steps.append(
-                CascadeStepResult(
-                    step_name="add",
-                    status=CascadeStepStatus.SKIPPED,
-                    message="追加ファイルなし" if next_level else "上位レベルなし",
+            # Step 3: Add (次レベルのShadowにファイル追加)
+            if next_level and new_files:
+                with _logger.span("cascade.add", level=next_level) as span:
+                    add_result = self._step_add(next_level, new_files)
+                    _record_step(span, add_result)
+                steps.append(add_result)
+            else:
+                steps.append(
+                    CascadeStepResult(
+                        step_name="add",
+                        status=CascadeStepStatus.SKIPPED,
+                        message="追加ファイルなし" if next_level else "上位レベルなし",
+                    )
                 )
-            )
 
-        # Step 4: Clear (現在レベルのShadowをクリア)
-        clear_result = self._step_clear(level)
-        steps.append(clear_result)
+            # Step 4: Clear (現在レベルのShadowをクリア)
+            with _logger.span("cascade.clear", level=level) as span:
+                clear_result = self._step_clear(level)
+                _record_step(span, clear_result)
+            steps.append(clear_result)
+
+            cascade_span["files_processed"] = sum(step.files_processed for step in steps)
 
         # 結果集約
         result = CascadeResult(
@@ -41,13 +41,14 @@ Note:
     4. 現在レベルのShadowをクリア
 """
 
-from typing import TYPE_CHECKING, Dict, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 __all__ = ["CascadeProcessor"]
 
 from domain.types import LevelHierarchyEntry, OverallDigestData, RegularDigestData
 from domain.validators import is_valid_overall_digest
-from infrastructure import get_structured_logger
+from infrastructure import get_structured_logger, lazy
 
 from .file_detector import FileDetector
 from .shadow_io import ShadowIO
@@ -61,6 +62,12 @@ if TYPE_CHECKING:
 _logger = get_structured_logger(__name__)
 
 
+def _preview_names(files: List[Path], limit: int = 5) -> str:
+    """ログ用のファイル名一覧（先頭 limit 件、超過分は "..."）"""
+    names = [f.name for f in files[:limit]]
+    return f"{names}{'...' if len(files) > limit else ''}"
+
+
 class CascadeProcessor:
     """
     ダイジェスト確定時のカスケード処理を実行するクラス。
@@ -128,8 +135,8 @@ class CascadeProcessor:
             >>> digest["source_files"]
             ['L00186.txt', 'L00187.txt', ...]
         """
-        shadow_data = self.shadow_io.load_or_create()
-        overall_digest = shadow_data["latest_digests"][level]["overall_digest"]
+        # 分割レイアウトでは該当階層のファイルのみ読む
+        overall_digest = self.shadow_io.load_level(level)["overall_digest"]
 
         _logger.state("get_shadow_digest_for_level", level=level)
         _logger.validation("overall_digest", is_valid=is_valid_overall_digest(overall_digest))
@@ -227,36 +234,40 @@ class CascadeProcessor:
         Example:
             >>> processor.cascade_update_on_digest_finalize("weekly", finalized_digest)
             # weekly確定 → monthlyのShadow/Provisionalに追加 → weeklyのShadowクリア
+
+        Note:
+            全ステップは1つの ShadowSession 内で実行される。
+            途中で例外が発生した場合、ShadowGrandDigest.txt は変更されない。
         """
         _logger.info(f"[Step 3] ShadowGrandDigestカスケード処理: レベル {level}")
         _logger.state("cascade_update", starting_for_level=level)
 
-        # 1. Shadow → Grand 昇格の確認
-        self.promote_shadow_to_grand(level)
+        # ShadowGrandDigestの読み込み・保存はセッションで1回ずつにまとめる
+        with self.shadow_io.session():
+            # 1. Shadow → Grand 昇格の確認
+            self.promote_shadow_to_grand(level)
 
-        # 2. 次のレベルの新しいファイルを検出
-        next_level = self.level_hierarchy[level]["next"]
-        _logger.decision("next_level", level=next_level)
+            # 2. 次のレベルの新しいファイルを検出
+            next_level = self.level_hierarchy[level]["next"]
+            _logger.decision("next_level", level=next_level)
 
-        if next_level:
-            new_files = self.file_detector.find_new_files(next_level)
-            _logger.file_op(f"find_new_files({next_level})", found=len(new_files))
+            if next_level:
+                new_files = self.file_detector.find_new_files(next_level)
+                _logger.file_op(f"find_new_files({next_level})", found=len(new_files))
 
-            if new_files:
-                _logger.info(f"新規ファイル {len(new_files)}件検出: {next_level}")
-                file_names = [f.name for f in new_files[:5]]
-                suffix = "..." if len(new_files) > 5 else ""
-                _logger.file_op("new_files", names=f"{file_names}{suffix}")
+                if new_files:
+                    _logger.info(f"新規ファイル {len(new_files)}件検出: {next_level}")
+                    _logger.file_op("new_files", names=lazy(lambda: _preview_names(new_files)))
 
-                # 3. 次のレベルのShadowに増分追加
-                self.file_appender.add_files_to_shadow(next_level, new_files)
+                    # 3. 次のレベルのShadowに増分追加
+                    self.file_appender.add_files_to_shadow(next_level, new_files)
 
-            # 4. 次のレベルのProvisionalにindividual_digest追加
-            self._append_to_next_provisional(level, finalized_digest)
-        else:
-            _logger.info(f"{level}に上位レベルなし（最上位）")
+                # 4. 次のレベルのProvisionalにindividual_digest追加
+                self._append_to_next_provisional(level, finalized_digest)
+            else:
+                _logger.info(f"{level}に上位レベルなし（最上位）")
 
-        # 5. 現在のレベルのShadowをクリア
-        self.clear_shadow_level(level)
+            # 5. 現在のレベルのShadowをクリア
+            self.clear_shadow_level(level)
 
         _logger.info(f"[Step 3] カスケード処理完了: レベル {level}")
@@ -4,8 +4,12 @@ File Appender
 =============
 
 ファイル追加処理（Shadowへの増分追加）
+
+Monthly以上で読む Digest ファイルは overall_digest しか使わないため、
+ヘッダー索引（infrastructure.digest_headers）から読む。
 """
 
+import copy
 from pathlib import Path
 from typing import Dict, List, Set
 
@@ -15,8 +19,10 @@ from domain.validators import is_valid_dict, is_valid_overall_digest
 from infrastructure import (
     get_structured_logger,
     log_warning,
-    try_read_json_from_file,
 )
+from infrastructure.digest_headers import get_header_index
+from infrastructure.json_patch import make_patch
+from infrastructure.revision import get_revision
 
 from .file_detector import FileDetector
 from .placeholder_manager import PlaceholderManager
@@ -137,6 +143,7 @@ class FileAppender:
         for file_path in new_files:
             if file_path.name not in existing_files:
                 self._log_digest_content(file_path, level)
+        get_header_index(self.file_detector.get_source_path(level)).flush()
 
     def _log_digest_content(self, file_path: Path, level: str) -> None:
         """
@@ -149,7 +156,7 @@ class FileAppender:
         source_dir = self.file_detector.get_source_path(level)
         full_path = source_dir / file_path.name
 
-        digest_data = try_read_json_from_file(full_path)
+        digest_data = get_header_index(source_dir).get(full_path.name)
         if digest_data is None:
             return
 
@@ -173,6 +180,10 @@ class FileAppender:
         Weekly: source_filesのみ追加（PLACEHOLDERのまま）→ Claude分析待ち
         Monthly以上: Digestファイル内容を読み込んでログ出力（まだらボケ回避）
 
+        差分ログが有効な場合（ShadowIO.delta_enabled）は、レベルの変更分だけを
+        JSON Patch として追記する（文書全体を書き直さない）。ShadowSession 中は
+        セッションのコミット時に追記される。
+
         Args:
             level: レベル名
             new_files: 追加するファイルのリスト
@@ -182,6 +193,10 @@ class FileAppender:
             # shadow["weekly"]["source_files"]に"L00186.txt"が追加される
         """
         shadow_data = self.shadow_io.load_or_create()
+        use_delta = self.shadow_io.delta_enabled
+        if use_delta:
+            revision = get_revision(shadow_data)
+            before = copy.deepcopy(shadow_data["latest_digests"][level])
         overall_digest = self._ensure_overall_digest_initialized(shadow_data, level)
 
         existing_files = set(overall_digest["source_files"])
@@ -208,4 +223,10 @@ class FileAppender:
         _logger.state("total_files_after_add", total=total_files)
         self.placeholder_manager.update_or_preserve(overall_digest, total_files)
 
-        self.shadow_io.save(shadow_data)
+        if not use_delta:
+            self.shadow_io.save(shadow_data)
+            return
+        operations = make_patch(
+            before, shadow_data["latest_digests"][level], f"/latest_digests/{level}"
+        )
+        self.shadow_io.save_delta(shadow_data, operations, expected_revision=revision)
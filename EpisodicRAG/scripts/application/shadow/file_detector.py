@@ -4,6 +4,9 @@ File Detector for Shadow Updates
 ================================
 
 GrandDigest更新後に作成された新しいファイルを検出
+
+ファイル一覧は infrastructure.file_index の永続索引から取得するため、
+ディレクトリに変更がなければ glob・ファイル名解析は行われない。
 """
 
 from pathlib import Path
@@ -12,8 +15,8 @@ from typing import List, Optional
 from application.config import DigestConfig
 from application.tracking import DigestTimesTracker
 from domain.constants import LEVEL_CONFIG, SOURCE_TYPE_LOOPS, SOURCE_TYPE_RAW, build_level_hierarchy
-from domain.file_naming import filter_files_after
 from infrastructure import get_structured_logger
+from infrastructure.file_index import get_file_index
 
 # 構造化ロガー
 _logger = get_structured_logger(__name__)
@@ -149,15 +152,15 @@ class FileDetector:
             _logger.file_op("found", count=0, reason="source_dir_not_exists")
             return []
 
-        # ファイルを検出
-        all_files = sorted(source_dir.glob(pattern))
+        # 永続索引からファイルを検出（番号の二分探索）
+        index = get_file_index(source_dir, pattern)
 
         if max_file_number is None:
             # 初回は全ファイルを検出
+            all_files = index.files()
             _logger.file_op("found", count=len(all_files), filter="none_initial")
             return all_files
 
-        # 統一関数を使用してフィルタリング
-        result = filter_files_after(all_files, max_file_number)
-        _logger.file_op("found", count=len(result), filtered_from=len(all_files))
+        result = index.files_after(max_file_number)
+        _logger.file_op("found", count=len(result), filtered_from=index.count())
         return result
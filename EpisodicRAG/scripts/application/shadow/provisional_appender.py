@@ -242,5 +242,5 @@ class ProvisionalAppender:
         provisional_data["metadata"]["last_updated"] = datetime.now().isoformat()
 
         # 保存
-        save_json(provisional_path, provisional_data)
+        save_json(provisional_path, provisional_data, skip_unchanged=True)
         _logger.info(f"Provisional追加完了: {provisional_path.name}")
@@ -27,6 +27,9 @@ Usage:
     # 保存（タイムスタンプ自動更新）
     shadow_io.save(data)
 
+    # 差分ログ有効時（storage.shadow_delta_threshold > 0）は変更分だけを追記
+    shadow_io.apply_delta([{"op": "add", "path": "/latest_digests/weekly/...", ...}])
+
 Design Pattern:
     - Repository Pattern: ファイルI/Oの抽象化
     - Factory Pattern: テンプレート生成の遅延評価
@@ -35,6 +38,7 @@ Related Modules:
     - application.shadow.shadow_updater: Shadowの更新ロジック
     - application.shadow.template: テンプレート生成
     - infrastructure.json_repository: JSON I/O操作
+    - infrastructure.delta_log: 差分ログ（ShadowGrandDigest.delta.jsonl）
 
 Note:
     テンプレート生成は template_factory 経由で遅延評価される。
@@ -43,11 +47,36 @@ Note:
 
 from datetime import datetime
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional, Sequence, cast
 
 from domain.constants import LOG_PREFIX_FILE, LOG_PREFIX_STATE, LOG_PREFIX_VALIDATE
-from domain.types import ShadowDigestData, as_dict
-from infrastructure import load_json_with_template, log_debug, save_json
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import RevisionConflictError
+from domain.file_constants import SHADOW_DELTA_LOG_FILENAME
+from domain.types import ShadowDigestData, ShadowLevelData, as_dict
+from infrastructure import (
+    exclusive_lock,
+    lazy,
+    load_json_with_template,
+    log_debug,
+    shared_lock,
+)
+from infrastructure.delta_log import DeltaLog
+from infrastructure.json_patch import apply_patch
+from infrastructure.revision import (
+    DEFAULT_MAX_RETRIES,
+    REVISION_KEY,
+    get_revision,
+    is_unchanged,
+    read_revision,
+    retry_on_conflict,
+    save_with_revision,
+)
+
+if TYPE_CHECKING:
+    from infrastructure.sqlite_store import SqliteDigestStore
+
+    from .shadow_session import ShadowSession
 
 
 class ShadowIO:
@@ -69,18 +98,70 @@ class ShadowIO:
 
     Note:
         save()時にmetadata.last_updatedが自動更新される。
+        session() で開始したセッション中は、load_or_create() はメモリ上の
+        同一文書を返し、save() はセッション終了時まで書き込みを遅延する。
+        読み込みは共有ロック、保存とセッション全体は排他ロックの下で行う
+        （infrastructure.file_lock）。保存ごとに metadata.revision が1進み、
+        save(expected_revision=...) / update() で競合を検出できる
+        （infrastructure.revision）。
+        store を渡した場合（storage.backend = "sqlite"）は EpisodicRAG.db を
+        正本とし、ShadowGrandDigest.txt は保存のたびに書き出す写しになる。
+        写しが書き出し後に（エージェントの Edit 等で）編集されていれば、
+        読み込み時に DB へ取り込む（SqliteDigestStore.load_mirrored_document）。
+        delta_threshold > 0 の場合、apply_delta() / save_delta() は文書全体を
+        書き直さず ShadowGrandDigest.delta.jsonl に変更分（JSON Patch）を追記する。
+        セッション中の save_delta() はコミット時に1行にまとめて追記する
+        （セッション中に save() があれば文書全体を保存する）。
+        読み込みはベースと差分を合成し、差分ログが delta_threshold バイトを
+        超えたとき、または save() で文書全体を保存したとき（finalize 等）に
+        ベースへ書き戻して差分ログを空にする（コンパクション）。
+        エージェントは ShadowGrandDigest.txt（ベース）を直接 Read / Edit するため、
+        /digest の入口（interfaces.digest_entry）で compact() を呼ぶ。
     """
 
-    def __init__(self, shadow_digest_file: Path, template_factory: Callable[[], ShadowDigestData]):
+    def __init__(
+        self,
+        shadow_digest_file: Path,
+        template_factory: Callable[[], ShadowDigestData],
+        store: Optional["SqliteDigestStore"] = None,
+        delta_threshold: int = 0,
+    ):
         """
         初期化
 
         Args:
             shadow_digest_file: ShadowGrandDigest.txtのパス
             template_factory: テンプレートを返す関数（遅延評価用）
+            store: SQLite バックエンドのストア（Noneならテキストファイル）
+            delta_threshold: 差分ログをコンパクションするバイト数（0なら差分ログを使わない）
         """
         self.shadow_digest_file = shadow_digest_file
         self.template_factory = template_factory
+        self.store = store
+        self.delta_threshold = delta_threshold
+        self.delta_log = DeltaLog(shadow_digest_file.parent / SHADOW_DELTA_LOG_FILENAME)
+        self.active_session: Optional["ShadowSession"] = None
+
+    @property
+    def delta_enabled(self) -> bool:
+        """apply_delta() / save_delta() が差分ログに追記するか"""
+        return self.store is None and self.delta_threshold > 0
+
+    def session(self) -> "ShadowSession":
+        """
+        Unit of Work セッションを開始
+
+        Returns:
+            with文で使用する ShadowSession
+
+        Example:
+            >>> with shadow_io.session():
+            ...     processor.cascade_update_on_digest_finalize("weekly")
+            # 読み込み1回・保存1回で完了
+        """
+        from .shadow_session import ShadowSession
+
+        return ShadowSession(self)
 
     def load_or_create(self) -> ShadowDigestData:
         """
@@ -95,35 +176,288 @@ class ShadowIO:
             >>> list(data["latest_digests"].keys())
             ['weekly', 'monthly', 'quarterly', ...]
         """
-        log_debug(f"{LOG_PREFIX_FILE} load_or_create: {self.shadow_digest_file}")
-        log_debug(f"{LOG_PREFIX_FILE} file_exists: {self.shadow_digest_file.exists()}")
-
-        result = load_json_with_template(
-            target_file=self.shadow_digest_file,
-            default_factory=self.template_factory,
-            log_message="ShadowGrandDigest.txt not found. Creating new file.",
-        )
+        if self.active_session is not None:
+            log_debug(f"{LOG_PREFIX_FILE} load_or_create: using session document")
+            return self.active_session.data
 
-        log_debug(f"{LOG_PREFIX_VALIDATE} loaded_data: keys={list(result.keys())}")
+        result = self._read()
+        log_debug("%s loaded_data: keys=%s", LOG_PREFIX_VALIDATE, lazy(lambda: list(result.keys())))
         return result
 
-    def save(self, data: ShadowDigestData) -> None:
+    def load_level(self, level: str) -> ShadowLevelData:
+        """
+        指定レベルのデータのみを取得
+
+        分割レイアウト（ShardedShadowIO）では該当レベルのファイルだけを読む。
+
+        Args:
+            level: レベル名（"weekly" 等）
+
+        Returns:
+            latest_digests[level] のデータ
+
+        Raises:
+            KeyError: レベルが文書に存在しない場合
+
+        Example:
+            >>> shadow_io.load_level("weekly")["overall_digest"]["source_files"]
+            ['L00186.txt', 'L00187.txt']
+        """
+        return self.load_or_create()["latest_digests"][level]
+
+    def _read(self) -> ShadowDigestData:
+        """保存先から文書を読み込む（セッション外の load_or_create() から呼ばれる）"""
+        if self.store is not None:
+            return self._load_from_store(self.store)
+
+        log_debug("%s load_or_create: %s", LOG_PREFIX_FILE, self.shadow_digest_file)
+        log_debug("%s file_exists: %s", LOG_PREFIX_FILE, lazy(self.shadow_digest_file.exists))
+
+        # ファイルがなければテンプレートを書き込むため、その場合のみ排他ロックを取る
+        # （共有ロックでは他の読み手がテンプレートの書き込み途中を読み得る）
+        lock = shared_lock if self.shadow_digest_file.exists() else exclusive_lock
+        with lock(self.shadow_digest_file):
+            data = load_json_with_template(
+                target_file=self.shadow_digest_file,
+                default_factory=self.template_factory,
+                log_message="ShadowGrandDigest.txt not found. Creating new file.",
+            )
+            # 差分ログは設定に関わらず合成する（無効化後も未コンパクション分を失わない）
+            return cast(ShadowDigestData, self.delta_log.apply(as_dict(data)))
+
+    def _load_from_store(self, store: "SqliteDigestStore") -> ShadowDigestData:
+        """DB から読み込む（編集された写しは取り込む。どちらにもなければテンプレート）"""
+        name = self.shadow_digest_file.name
+        log_debug("%s load_or_create: sqlite %s::%s", LOG_PREFIX_FILE, store.db_path, name)
+        data = store.load_mirrored_document(name, self.shadow_digest_file)
+        if data is None:
+            return self.template_factory()
+        return data  # type: ignore[return-value]
+
+    def save(self, data: ShadowDigestData, expected_revision: Optional[int] = None) -> None:
         """
-        ShadowGrandDigestを保存
+        ShadowGrandDigestを保存（metadata.revision を1進める）
+
+        保存済みの内容と last_updated / revision 以外が同じ場合は、書き込みも
+        時刻・revision の更新も行わない（git 同期で差分を生まない）。
 
         Args:
             data: 保存するデータ
+            expected_revision: 読み込み時の metadata.revision
+                （指定時、ファイルの revision と異なれば保存しない）
+
+        Raises:
+            RevisionConflictError: 読み込み後に別の書き込みがあった場合
 
         Example:
             >>> data = shadow_io.load_or_create()
             >>> data["latest_digests"]["weekly"]["source_files"].append("new.txt")
-            >>> shadow_io.save(data)  # metadata.last_updatedが自動更新される
+            >>> shadow_io.save(data, expected_revision=get_revision(data))
         """
-        log_debug(f"{LOG_PREFIX_FILE} save: {self.shadow_digest_file}")
-        log_debug(f"{LOG_PREFIX_VALIDATE} data_keys: {list(data.keys())}")
+        if self.active_session is not None:
+            log_debug(f"{LOG_PREFIX_FILE} save: deferred to session commit")
+            self.active_session.mark_dirty(data)
+            return
+
+        log_debug("%s save: %s", LOG_PREFIX_FILE, self.shadow_digest_file)
+        log_debug("%s data_keys: %s", LOG_PREFIX_VALIDATE, lazy(lambda: list(data.keys())))
+
+        if self._is_unchanged(data, expected_revision):
+            return
 
         data["metadata"]["last_updated"] = datetime.now().isoformat()
-        log_debug(f"{LOG_PREFIX_STATE} updated_timestamp: {data['metadata']['last_updated']}")
+        log_debug("%s updated_timestamp: %s", LOG_PREFIX_STATE, data["metadata"]["last_updated"])
+
+        revision = self._write(data, expected_revision)
+        log_debug("%s saved_revision: %s", LOG_PREFIX_STATE, revision)
+
+    def _is_unchanged(self, data: ShadowDigestData, expected_revision: Optional[int]) -> bool:
+        """保存済みの文書と内容が同じか（SQLite バックエンドでは比較しない）"""
+        if self.store is not None or self.delta_log.has_records():
+            return False
+        return is_unchanged(self.shadow_digest_file, as_dict(data), expected_revision)
 
+    def _write(self, data: ShadowDigestData, expected_revision: Optional[int]) -> int:
+        """保存先へ文書を書き込み、保存後の revision を返す"""
         # Cast TypedDict to Dict for infrastructure compatibility
-        save_json(self.shadow_digest_file, as_dict(data))
+        if self.store is not None:
+            return self.store.save_mirrored_document(
+                self.shadow_digest_file.name,
+                as_dict(data),
+                self.shadow_digest_file,
+                expected_revision,
+            )
+        if not self.delta_log.has_records():
+            return save_with_revision(
+                self.shadow_digest_file, as_dict(data), expected_revision, fsync_dir=True
+            )
+        # 差分ログがあれば、文書全体の保存でベースに書き戻す（コンパクション）
+        with exclusive_lock(self.shadow_digest_file):
+            self._check_revision(expected_revision)
+            document = as_dict(data)
+            document.setdefault("metadata", {})[REVISION_KEY] = self._current_revision()
+            revision = save_with_revision(self.shadow_digest_file, document, fsync_dir=True)
+            self.delta_log.truncate()
+        log_debug(f"{LOG_PREFIX_STATE} delta log compacted: revision={revision}")
+        return revision
+
+    def _current_revision(self) -> int:
+        """ベースと差分ログを合成した文書の revision（ファイル全体は読まない）"""
+        return max(read_revision(self.shadow_digest_file), self.delta_log.last_revision())
+
+    def _check_revision(self, expected_revision: Optional[int]) -> int:
+        """現在の revision が expected_revision と異なれば RevisionConflictError"""
+        current = self._current_revision()
+        if expected_revision is not None and current != expected_revision:
+            formatter = get_error_formatter()
+            raise RevisionConflictError(
+                formatter.file.revision_conflict(
+                    self.shadow_digest_file, expected_revision, current
+                ),
+                expected=expected_revision,
+                actual=current,
+            )
+        return current
+
+    def apply_delta(
+        self, operations: Sequence[Mapping[str, Any]], expected_revision: Optional[int] = None
+    ) -> int:
+        """
+        変更分（JSON Patch の操作）だけを保存（metadata.revision を1進める）
+
+        差分ログが有効なら ShadowGrandDigest.delta.jsonl に1行追記するだけで、
+        文書全体は書き直さない（追記後に delta_threshold バイトを超えたら
+        コンパクションする）。無効なら読み込み → 適用 → save() と同じ。
+
+        Args:
+            operations: 読み込んだ文書に対する操作（infrastructure.json_patch.make_patch）
+            expected_revision: 読み込み時の metadata.revision
+
+        Returns:
+            保存後の revision
+
+        Raises:
+            RevisionConflictError: 読み込み後に別の書き込みがあった場合
+            ValidationError: 差分ログが無効で、操作を適用できない場合
+
+        Example:
+            >>> shadow_io.apply_delta(
+            ...     [{"op": "add", "path": "/latest_digests/weekly/overall_digest/source_files/-",
+            ...       "value": "L00186.txt"}]
+            ... )
+            13
+        """
+        if self.active_session is not None or not self.delta_enabled:
+            data = self.load_or_create()
+            if expected_revision is None:
+                expected_revision = get_revision(data)
+            data = apply_patch(data, operations)
+            self.save_delta(data, operations, expected_revision=expected_revision)
+            return get_revision(data)
+        return self._append_delta(operations, expected_revision)
+
+    def save_delta(
+        self,
+        data: ShadowDigestData,
+        operations: Sequence[Mapping[str, Any]],
+        expected_revision: Optional[int] = None,
+    ) -> None:
+        """
+        operations を適用済みの文書を保存（差分ログが有効なら operations だけを追記）
+
+        セッション中は操作を記録するだけで、コミット時にまとめて追記する。
+        差分ログが無効なら save() と同じ。
+
+        Args:
+            data: operations を適用済みの文書
+            operations: 読み込み時の文書から data への変更（infrastructure.json_patch.make_patch）
+            expected_revision: 読み込み時の metadata.revision
+
+        Raises:
+            RevisionConflictError: 読み込み後に別の書き込みがあった場合
+
+        Example:
+            >>> before = copy.deepcopy(data["latest_digests"]["weekly"])
+            >>> data["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00186.txt")
+            >>> ops = make_patch(before, data["latest_digests"]["weekly"], "/latest_digests/weekly")
+            >>> shadow_io.save_delta(data, ops)
+        """
+        if self.active_session is not None:
+            log_debug(f"{LOG_PREFIX_FILE} save_delta: deferred to session commit")
+            self.active_session.mark_delta(data, operations)
+            return
+        if not self.delta_enabled:
+            self.save(data, expected_revision=expected_revision)
+            return
+        if operations:
+            self._append_delta(operations, expected_revision)
+
+    def _append_delta(
+        self, operations: Sequence[Mapping[str, Any]], expected_revision: Optional[int]
+    ) -> int:
+        """差分ログに1行追記し、しきい値を超えたらコンパクションする"""
+        with exclusive_lock(self.shadow_digest_file):
+            if not self.shadow_digest_file.exists():
+                self._read()  # テンプレートをベースとして作成
+            revision = self._check_revision(expected_revision) + 1
+            timestamp: Dict[str, Any] = {
+                "op": "add",
+                "path": "/metadata/last_updated",
+                "value": datetime.now().isoformat(),
+            }
+            self.delta_log.append(revision, [*operations, timestamp])
+            log_debug(f"{LOG_PREFIX_STATE} delta appended: revision={revision}")
+            if self.delta_log.size() >= self.delta_threshold:
+                revision = self.compact()
+        return revision
+
+    def compact(self) -> int:
+        """
+        差分ログをベースに書き戻して空にする（差分がなければ何もしない）
+
+        書き戻しも保存の1回として metadata.revision を1進める。
+
+        Returns:
+            現在の revision
+
+        Example:
+            >>> shadow_io.compact()   # ShadowGrandDigest.txt = ベース + 差分
+            14
+        """
+        if self.store is not None:
+            return get_revision(self.load_or_create())
+        with exclusive_lock(self.shadow_digest_file):
+            if not self.delta_log.has_records():
+                return read_revision(self.shadow_digest_file)
+            return self._write(self._read(), None)
+
+    def update(
+        self,
+        mutate: Callable[[ShadowDigestData], None],
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> ShadowDigestData:
+        """
+        読み込み → 変更 → 保存を、リビジョン競合時は最新を読み直してやり直す
+
+        Args:
+            mutate: 文書をその場で変更する関数（競合時は再度呼ばれるため副作用を持たないこと）
+            max_retries: 競合時の再試行回数
+
+        Returns:
+            保存した文書
+
+        Raises:
+            RevisionConflictError: 再試行回数を超えて競合した場合
+
+        Example:
+            >>> def add_file(data):
+            ...     data["latest_digests"]["weekly"]["source_files"].append("L00042.txt")
+            >>> shadow_io.update(add_file)
+        """
+        if self.active_session is not None:
+            # セッションは排他ロックを保持しているため競合しない
+            data = self.active_session.data
+            mutate(data)
+            self.active_session.mark_dirty(data)
+            return data
+        return retry_on_conflict(self.load_or_create, self.save, mutate, max_retries)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shadow Session (Unit of Work)
+=============================
+
+ShadowGrandDigest.txt に対する一連の更新を1回の読み込み・1回の保存に
+まとめるUnit of Workを提供するアプリケーション層モジュール。
+
+カスケード処理では get_shadow_digest_for_level / add_files_to_shadow /
+clear_shadow_level がそれぞれ ShadowIO.load_or_create() と save() を呼ぶため、
+セッションなしでは同じ文書を何度もパース・シリアライズすることになる。
+セッション中は ShadowIO がメモリ上の同一オブジェクトを返し、
+save() は「変更あり」の記録のみを行う。
+差分ログが有効な場合（ShadowIO.delta_enabled）、save_delta() で記録した
+変更分だけのセッションは、コミット時に差分ログへ1行追記する。
+
+Usage:
+    from application.shadow import ShadowIO
+
+    with shadow_io.session() as data:
+        # 各ステップは shadow_io.load_or_create() で同じ data を受け取る
+        processor.clear_shadow_level("weekly")
+    # with ブロック正常終了時に1回だけ保存（commit）
+    # 例外発生時は保存せず破棄（rollback）
+    # セッション中は ShadowGrandDigest.txt の排他ロックを保持する
+
+Design Pattern:
+    - Unit of Work: 複数の変更を1トランザクションとして確定
+    - Identity Map: セッション中は文書インスタンスを1つに保つ
+
+Related Modules:
+    - application.shadow.shadow_io: セッションを開始するI/Oクラス
+    - application.shadow.cascade_processor: セッション内で各ステップを実行
+"""
+
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional, Sequence, Type
+
+from domain.constants import LOG_PREFIX_STATE
+from domain.types import ShadowDigestData
+from infrastructure import get_lock_manager, log_debug
+from infrastructure.file_lock import LOCK_EXCLUSIVE
+from infrastructure.revision import get_revision
+
+if TYPE_CHECKING:
+    from infrastructure.file_lock import FileLockManager
+
+    from .shadow_io import ShadowIO
+
+__all__ = ["ShadowSession"]
+
+
+class ShadowSession:
+    """
+    ShadowGrandDigestのUnit of Work
+
+    Attributes:
+        shadow_io: 対象のShadowIO
+        dirty: セッション中に save() / save_delta() が呼ばれたか
+
+    Example:
+        >>> with ShadowSession(shadow_io) as data:
+        ...     data["latest_digests"]["weekly"]["overall_digest"] = digest
+        ...     shadow_io.save(data)  # ここでは書き込まれない
+        # ブロック終了時に1回だけ書き込まれる
+
+    Note:
+        既にセッションが開いている ShadowIO で新たにセッションを開始した場合、
+        内側のセッションは外側のセッションに参加し、保存は外側に委ねられる。
+    """
+
+    def __init__(self, shadow_io: "ShadowIO"):
+        """
+        初期化
+
+        Args:
+            shadow_io: 対象のShadowIO インスタンス
+        """
+        self.shadow_io = shadow_io
+        self.dirty = False
+        self._full_save = False
+        self._operations: List[Dict[str, Any]] = []
+        self._data: Optional[ShadowDigestData] = None
+        self._outer: Optional["ShadowSession"] = None
+        self._lock_manager: Optional["FileLockManager"] = None
+        self._revision = 0
+
+    @property
+    def data(self) -> ShadowDigestData:
+        """
+        セッションが保持する文書
+
+        Raises:
+            RuntimeError: セッション開始前にアクセスした場合
+        """
+        if self._outer is not None:
+            return self._outer.data
+        if self._data is None:
+            raise RuntimeError("ShadowSession is not active")
+        return self._data
+
+    def mark_dirty(self, data: Optional[ShadowDigestData] = None) -> None:
+        """
+        変更ありとして記録（ShadowIO.save() から呼ばれる）
+
+        Args:
+            data: 保存対象の文書（セッション外で読み込んだ文書が渡された場合は差し替える）
+        """
+        if self._outer is not None:
+            self._outer.mark_dirty(data)
+            return
+        if data is not None:
+            self._data = data
+        self.dirty = True
+        self._full_save = True
+
+    def mark_delta(
+        self, data: Optional[ShadowDigestData], operations: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """
+        変更分を記録（ShadowIO.save_delta() から呼ばれる）
+
+        Args:
+            data: operations を適用済みの文書
+            operations: 文書への変更（JSON Patch の操作）
+        """
+        if self._outer is not None:
+            self._outer.mark_delta(data, operations)
+            return
+        if data is not None:
+            self._data = data
+        self.dirty = True
+        self._operations.extend(dict(operation) for operation in operations)
+
+    def __enter__(self) -> ShadowDigestData:
+        """セッション開始（文書を1回だけ読み込む）"""
+        active = self.shadow_io.active_session
+        if active is not None:
+            self._outer = active
+            log_debug(f"{LOG_PREFIX_STATE} shadow_session: joined outer session")
+            return active.data
+
+        # 読み込みから保存までを他プロセスの更新と直列化する
+        lock_manager = get_lock_manager()
+        lock_manager.acquire(self.shadow_io.shadow_digest_file, LOCK_EXCLUSIVE)
+        try:
+            self._data = self.shadow_io.load_or_create()
+            self._revision = get_revision(self._data)
+        except BaseException:
+            lock_manager.release(self.shadow_io.shadow_digest_file)
+            raise
+        self._lock_manager = lock_manager
+        self.shadow_io.active_session = self
+        log_debug(f"{LOG_PREFIX_STATE} shadow_session: begin")
+        return self._data
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Literal[False]:
+        """セッション終了（正常終了時はcommit、例外時はrollback）"""
+        if self._outer is not None:
+            self._outer = None
+            return False
+
+        self.shadow_io.active_session = None
+        try:
+            if exc_type is not None:
+                log_debug(f"{LOG_PREFIX_STATE} shadow_session: rollback ({exc_type.__name__})")
+            elif self.dirty and self._data is not None and not self._full_save:
+                log_debug(f"{LOG_PREFIX_STATE} shadow_session: commit (delta)")
+                self.shadow_io.save_delta(
+                    self._data, self._operations, expected_revision=self._revision
+                )
+            elif self.dirty and self._data is not None:
+                log_debug(f"{LOG_PREFIX_STATE} shadow_session: commit")
+                self.shadow_io.save(self._data, expected_revision=self._revision)
+            else:
+                log_debug(f"{LOG_PREFIX_STATE} shadow_session: no changes")
+        finally:
+            if self._lock_manager is not None:
+                self._lock_manager.release(self.shadow_io.shadow_digest_file)
+                self._lock_manager = None
+            self._data = None
+            self.dirty = False
+            self._full_save = False
+            self._operations = []
+        return False
@@ -190,20 +190,21 @@ class ShadowUpdater:
             # 新規Loopファイルがweekly Shadowに追加される
         """
         # Shadowファイルを読み込み（存在しなければ作成）
-        self.shadow_io.load_or_create()
+        # 読み込み・追加・保存を1つの ShadowSession にまとめる
+        with self.shadow_io.session():
+            new_files = self.file_detector.find_new_files("weekly")
 
-        new_files = self.file_detector.find_new_files("weekly")
+            if not new_files:
+                _logger.info("新規Loopファイルなし")
+                return
 
-        if not new_files:
-            _logger.info("新規Loopファイルなし")
-            return
+            _logger.info(f"新規Loopファイル {len(new_files)}件検出:")
 
-        _logger.info(f"新規Loopファイル {len(new_files)}件検出:")
-
-        # Shadowに増分追加
-        self.add_files_to_shadow("weekly", new_files)
+            # Shadowに増分追加
+            self.add_files_to_shadow("weekly", new_files)
 
         # loop レベルの last_processed を更新（重複検出を防止）
+        # Shadow保存（セッションcommit）後に記録し、失敗時の取りこぼしを防ぐ
         file_names = [f.name for f in new_files]
         self.file_detector.times_tracker.save("loop", file_names)
 
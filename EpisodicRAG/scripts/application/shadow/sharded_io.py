@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Sharded Shadow I/O
+==================
+
+ShadowGrandDigest を階層ごとのファイルに分割して読み書きする
+アプリケーション層モジュール（storage.shadow_layout = "sharded"）。
+
+    Essences/ShadowGrandDigest.shards/
+        _index.txt      # metadata + キー順序
+        weekly.txt      # latest_digests["weekly"]
+        ...
+
+load_or_create() が返す ShadowDigestData の形は単一ファイルの場合と同一で、
+ShadowUpdater / CascadeProcessor などの呼び出し側は変更不要。
+load_level() は該当階層のファイルだけを読むため、finalize 時の
+get_shadow_digest_for_level() は他の7階層をパースしない。
+
+Usage:
+    from application.shadow import ShardedShadowIO, migrate_shadow_layout
+
+    shadow_io = ShardedShadowIO(config.essences_path / "ShadowGrandDigest.txt", template_factory)
+    weekly = shadow_io.load_level("weekly")
+
+    # 単一ファイル ⇔ 分割レイアウトの変換
+    migrate_shadow_layout(shadow_file, template_factory, "sharded")
+
+Note:
+    読み書きのロックは ShadowGrandDigest.txt のパスに対して取る。
+    ShadowSession の排他ロックがそのまま分割ファイル全体に及ぶ。
+    分割レイアウトでは ShadowGrandDigest.txt 自体は存在しない。未移行のまま
+    単一ファイルが残っていれば初期値として読み、最初の保存で分割ファイルに
+    取り込んだあと削除する（古い内容の単一ファイルを残さない）。
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, cast
+
+from domain.constants import LOG_PREFIX_FILE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError
+from domain.file_constants import SHADOW_SHARD_DIRNAME
+from domain.types import ShadowDigestData, ShadowLevelData, as_dict
+from infrastructure import exclusive_lock, log_debug, save_json, try_read_json_from_file
+from infrastructure.file_lock import lock_path_for
+from infrastructure.sharded_json import (
+    SHADOW_LAYOUT_SHARDED,
+    SHADOW_LAYOUT_SINGLE,
+    SHADOW_LAYOUTS,
+    ShardedJsonDocument,
+)
+
+from .shadow_io import ShadowIO
+
+__all__ = ["ShardedShadowIO", "migrate_shadow_layout"]
+
+# 分割するトップレベルのキー
+_SECTION = "latest_digests"
+
+
+class ShardedShadowIO(ShadowIO):
+    """
+    階層ごとのファイルに分割して保存する ShadowIO
+
+    Attributes:
+        shadow_digest_file: ShadowGrandDigest.txt のパス（ロック・移行元として使用）
+        template_factory: テンプレート生成関数（遅延評価用）
+        document: 分割ファイルを扱う ShardedJsonDocument
+
+    Example:
+        >>> shadow_io = ShardedShadowIO(path, template_factory)
+        >>> data = shadow_io.load_or_create()
+        >>> shadow_io.save(data)
+        >>> shadow_io.document.last_written
+        ['weekly']
+
+    Note:
+        分割レイアウトが未作成なら、既存の ShadowGrandDigest.txt（なければテンプレート）
+        を初期値として返す。最初の save() で分割ファイルが作られ、
+        ShadowGrandDigest.txt は削除される。
+    """
+
+    def __init__(
+        self,
+        shadow_digest_file: Path,
+        template_factory: Callable[[], ShadowDigestData],
+        shard_dir: Optional[Path] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            shadow_digest_file: ShadowGrandDigest.txtのパス
+            template_factory: テンプレートを返す関数（遅延評価用）
+            shard_dir: 分割ファイルのディレクトリ
+                （Noneなら shadow_digest_file と同じ階層の ShadowGrandDigest.shards）
+        """
+        super().__init__(shadow_digest_file, template_factory)
+        self.document = ShardedJsonDocument(
+            shard_dir or shadow_digest_file.parent / SHADOW_SHARD_DIRNAME,
+            _SECTION,
+            lock_path=shadow_digest_file,
+        )
+
+    def load_level(self, level: str) -> ShadowLevelData:
+        """
+        指定レベルのファイルのみを読み込む
+
+        Args:
+            level: レベル名（"weekly" 等）
+
+        Returns:
+            latest_digests[level] のデータ
+
+        Raises:
+            KeyError: レベルが文書に存在しない場合
+        """
+        if self.active_session is not None or not self.document.exists():
+            return super().load_level(level)
+        return cast(ShadowLevelData, self.document.load_item(level))
+
+    def _read(self) -> ShadowDigestData:
+        data = self.document.load()
+        if data is not None:
+            return cast(ShadowDigestData, data)
+
+        # 未移行: 単一ファイルを初期値として使う（最初の保存で取り込んで削除する）
+        seed = try_read_json_from_file(self.shadow_digest_file, log_on_error=False)
+        if isinstance(seed, dict):
+            log_debug(f"{LOG_PREFIX_FILE} sharded layout not found, seeding from single file")
+            return cast(ShadowDigestData, seed)
+        return self.template_factory()
+
+    def _is_unchanged(self, data: ShadowDigestData, expected_revision: Optional[int]) -> bool:
+        # 変更の有無は ShardedJsonDocument.save が項目ごと・インデックスごとに判定する
+        return False
+
+    def _write(self, data: ShadowDigestData, expected_revision: Optional[int]) -> int:
+        with exclusive_lock(self.shadow_digest_file):
+            seeded = not self.document.exists()
+            revision = self.document.save(as_dict(data), expected_revision, fsync_dir=True)
+            if seeded and self.shadow_digest_file.exists():
+                # 初期値として読んだ単一ファイルは分割ファイルに取り込み済み
+                self.shadow_digest_file.unlink()
+                log_debug(f"{LOG_PREFIX_FILE} removed seed file: {self.shadow_digest_file}")
+        return revision
+
+
+def migrate_shadow_layout(
+    shadow_digest_file: Path,
+    template_factory: Callable[[], ShadowDigestData],
+    target: str,
+    remove_source: bool = True,
+) -> Dict[str, Any]:
+    """
+    ShadowGrandDigest を単一ファイル ⇔ 分割レイアウトの間で変換
+
+    Args:
+        shadow_digest_file: ShadowGrandDigest.txtのパス
+        template_factory: テンプレートを返す関数（移行元が無い場合に使用）
+        target: 変換先のレイアウト（"single" または "sharded"）
+        remove_source: 変換後に移行元を削除するか（残した移行元は更新されず古くなる。
+            単一ファイルへ戻すときの控えとして残す場合のみ False にする）
+
+    Returns:
+        {"target", "levels", "revision", "removed_source"} の辞書
+
+    Raises:
+        ConfigError: 未知のレイアウトが指定された場合
+
+    Example:
+        >>> migrate_shadow_layout(shadow_file, template.get_template, "sharded")
+        {'target': 'sharded', 'levels': 8, 'revision': 1, 'removed_source': True}
+    """
+    document = ShardedShadowIO(shadow_digest_file, template_factory).document
+    with exclusive_lock(shadow_digest_file):
+        if target == SHADOW_LAYOUT_SHARDED:
+            data = try_read_json_from_file(shadow_digest_file, log_on_error=False)
+            if not isinstance(data, dict):
+                data = as_dict(template_factory())
+            revision = document.save(data, fsync_dir=True)
+            removed = remove_source and shadow_digest_file.exists()
+            if removed:
+                shadow_digest_file.unlink()
+        elif target == SHADOW_LAYOUT_SINGLE:
+            loaded = document.load()
+            data = loaded if loaded is not None else as_dict(template_factory())
+            save_json(shadow_digest_file, data, fsync_dir=True)
+            revision = int(data.get("metadata", {}).get("revision", 0))
+            removed = remove_source and document.exists()
+            if removed:
+                for item in document.items():
+                    document.item_path(item).unlink(missing_ok=True)
+                document.index_file.unlink()
+                lock_path_for(document.index_file).unlink(missing_ok=True)
+                if not any(document.directory.iterdir()):
+                    document.directory.rmdir()
+        else:
+            formatter = get_error_formatter()
+            raise ConfigError(
+                formatter.config.config_invalid_value(
+                    "shadow_layout", " or ".join(SHADOW_LAYOUTS), target
+                )
+            )
+
+    levels = len(data.get(_SECTION) or {})
+    log_debug(f"{LOG_PREFIX_FILE} migrated shadow layout to {target}: {levels} levels")
+    return {"target": target, "levels": levels, "revision": revision, "removed_source": removed}
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Storage Package - Storage backend components
+============================================
+
+ストレージバックエンド（JSONファイル / SQLite）の選択とテキストレイアウトとの相互変換
+
+Components:
+    - get_digest_store: 設定に応じた SqliteDigestStore（JSONバックエンドではNone）
+    - load_stored_document: SQLite / 分割レイアウトに保存済みの Shadow / Grand 文書
+      （診断系の読み取り用）
+    - read_stored_document: 同上（DigestConfig を使わない CLI 用）
+    - TextLayoutExporter: SQLite の内容をテキストファイルのレイアウトへ書き出し
+    - TextLayoutImporter: テキストファイルのレイアウトを SQLite へ取り込み
+    - ColdArchiver: 処理済みの古い Loop / RegularDigest を圧縮バンドルへ移す
+"""
+
+from .archiver import ArchiveReport, ColdArchiver
+from .backend import get_digest_store, load_stored_document, read_stored_document
+from .text_layout import LayoutTransferResult, TextLayoutExporter, TextLayoutImporter
+
+__all__ = [
+    "get_digest_store",
+    "load_stored_document",
+    "read_stored_document",
+    "LayoutTransferResult",
+    "TextLayoutExporter",
+    "TextLayoutImporter",
+    "ArchiveReport",
+    "ColdArchiver",
+]
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Cold Archiver
+=============
+
+上位ダイジェストに統合済みの古い Loop / RegularDigest を、年ごとの
+圧縮バンドル（infrastructure.archive）へ移すアプリケーション層モジュール。
+
+## 設計意図
+
+ARCHITECTURE: Hot / Cold Tiering
+- 対象は「上位レベルに処理済み」のファイルのみ:
+  次レベルの確定済みダイジェスト（RegularDigest と GrandDigest）の
+  source_files に含まれるファイル（Loop なら Weekly の source_files）。
+  last_digest_times.json の last_processed は各レベル自身の番号のため使わない。
+  未処理のファイルは Shadow への追加やしきい値判定でディレクトリ走査の
+  対象になるため移さない
+- 経過年数はファイル内容の日時（overall_digest.timestamp / metadata.last_updated）で
+  判定し、なければ mtime を使う（git clone で mtime が揃っていても判定できる）
+- バンドルは日時の年ごと（例: Loops/.archive/2023.tar.xz）
+- 読み込み側（try_read_json_from_file / 検索インデックス / 番号採番）は
+  アーカイブを透過的に扱うため、移した後も元のパスで参照できる
+
+Usage:
+    from application.storage import ColdArchiver
+
+    archiver = ColdArchiver(config)
+    archiver.archive(min_age_years=2, dry_run=True)   # 対象の確認
+    archiver.archive()                                  # config の archive セクションに従う
+    archiver.status()["total"]["saved_bytes"]
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
+
+from domain.constants import LEVEL_CONFIG, LEVEL_NAMES
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError
+from domain.file_naming import extract_file_number
+from infrastructure import get_structured_logger, try_read_json_from_file
+from infrastructure.archive import (
+    ARCHIVE_COMPRESSIONS,
+    ArchiveStats,
+    archive_members,
+    archive_stats,
+)
+from infrastructure.file_index import get_file_index
+
+if TYPE_CHECKING:
+    from application.config import DigestConfig
+
+__all__ = ["ArchiveReport", "ColdArchiver", "DEFAULT_ARCHIVE_MIN_AGE_YEARS"]
+
+_logger = get_structured_logger(__name__)
+
+# config.json に archive セクションがない場合の既定値
+DEFAULT_ARCHIVE_MIN_AGE_YEARS = 2
+DEFAULT_ARCHIVE_COMPRESSION = "lzma"
+
+
+@dataclass
+class ArchiveReport:
+    """アーカイブ処理の結果（レベル → 期間 → ファイル名、レベル → 集計）"""
+
+    min_age_years: float
+    compression: str
+    dry_run: bool
+    planned: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    stats: Dict[str, ArchiveStats] = field(default_factory=dict)
+
+    @property
+    def files(self) -> int:
+        """対象ファイル数"""
+        return sum(len(names) for periods in self.planned.values() for names in periods.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON出力用の辞書に変換"""
+        return {
+            "min_age_years": self.min_age_years,
+            "compression": self.compression,
+            "dry_run": self.dry_run,
+            "files": self.files,
+            "planned": self.planned,
+            "stats": {level: stats.to_dict() for level, stats in self.stats.items()},
+        }
+
+
+class ColdArchiver:
+    """
+    処理済みの古いファイルを圧縮バンドルへ移す
+
+    Example:
+        >>> report = ColdArchiver(config).archive(min_age_years=2)
+        >>> report.stats["loop"].saved_bytes
+        10485760
+    """
+
+    def __init__(self, config: "DigestConfig"):
+        self.config = config
+
+    def _setting(self, key: str, default: Any) -> Any:
+        section = self.config.config.get("archive")
+        value = section.get(key) if isinstance(section, dict) else None
+        return value if value is not None else default
+
+    def _level_dir(self, level: str) -> Path:
+        if level == "loop":
+            return self.config.loops_path
+        return self.config.get_level_dir(level)
+
+    def _consumed_files(self) -> Dict[str, Optional[Set[str]]]:
+        """
+        レベル → 上位レベルに処理済みのファイル名（最上位は None = 全件）
+
+        次レベルの RegularDigest と GrandDigest の overall_digest.source_files から求める。
+        """
+        # 循環インポートを避けるためローカルインポート
+        from application.grand import GrandDigestManager
+
+        major_digests = GrandDigestManager(self.config).load_or_create().get("major_digests", {})
+        consumed: Dict[str, Optional[Set[str]]] = {}
+        for level in LEVEL_NAMES:
+            next_level = LEVEL_CONFIG[level]["next"]
+            if next_level is None:
+                consumed[level] = None
+                continue
+            names: Set[str] = set()
+            grand_entry = major_digests.get(str(next_level)) or {}
+            names.update(_source_files(grand_entry.get("overall_digest")))
+            next_prefix = str(LEVEL_CONFIG[str(next_level)]["prefix"])
+            directory = self._level_dir(str(next_level))
+            if directory.is_dir():
+                for path in get_file_index(directory, f"{next_prefix}*.txt").files():
+                    data = try_read_json_from_file(path, log_on_error=False) or {}
+                    names.update(_source_files(data.get("overall_digest")))
+            if names:
+                consumed[level] = names
+        return consumed
+
+    def _candidates(self, level: str, consumed: Optional[Set[str]]) -> Iterator[Path]:
+        """処理済み（consumed に含まれる、None なら全件）のファイル"""
+        prefix = str(LEVEL_CONFIG[level]["prefix"])
+        directory = self._level_dir(level)
+        if not directory.is_dir():
+            return
+        for path in get_file_index(directory, f"{prefix}*.txt").files():
+            parsed = extract_file_number(path.name)
+            if parsed is None or parsed[0] != prefix:
+                continue
+            if consumed is None or path.name in consumed:
+                yield path
+
+    def plan(
+        self, min_age_years: Optional[float] = None, now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, List[Path]]]:
+        """
+        アーカイブ対象を決める（書き込みなし）
+
+        Args:
+            min_age_years: これより古いファイルを対象にする（省略時は config）
+            now: 基準日時（テスト用）
+
+        Returns:
+            レベル → 期間（年）→ ファイルパスのリスト
+        """
+        age = self._min_age_years(min_age_years)
+        cutoff = (now or datetime.now()) - timedelta(days=365.25 * age)
+        planned: Dict[str, Dict[str, List[Path]]] = {}
+        for level, consumed in self._consumed_files().items():
+            for path in self._candidates(level, consumed):
+                written = _content_datetime(path)
+                if written >= cutoff:
+                    continue
+                planned.setdefault(level, {}).setdefault(str(written.year), []).append(path)
+        return planned
+
+    def archive(
+        self,
+        min_age_years: Optional[float] = None,
+        compression: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> ArchiveReport:
+        """
+        対象ファイルを年ごとのバンドルへ移す
+
+        Args:
+            min_age_years: これより古いファイルを対象にする（省略時は config、既定2年）
+            compression: "lzma" / "gzip"（省略時は config、既定 lzma）
+            dry_run: True の場合は対象の列挙のみ
+
+        Returns:
+            ArchiveReport
+
+        Raises:
+            ConfigError: 経過年数・圧縮方式が不正な場合
+        """
+        age = self._min_age_years(min_age_years)
+        method = str(compression or self._setting("compression", DEFAULT_ARCHIVE_COMPRESSION))
+        if method not in ARCHIVE_COMPRESSIONS:
+            formatter = get_error_formatter()
+            raise ConfigError(
+                formatter.config.config_invalid_value(
+                    "archive.compression", " or ".join(ARCHIVE_COMPRESSIONS), method
+                )
+            )
+
+        planned = self.plan(age)
+        report = ArchiveReport(min_age_years=age, compression=method, dry_run=dry_run)
+        report.planned = {
+            level: {period: [p.name for p in paths] for period, paths in periods.items()}
+            for level, periods in planned.items()
+        }
+        if dry_run:
+            return report
+
+        for level, periods in planned.items():
+            report.stats[level] = archive_members(self._level_dir(level), periods, method)
+            _logger.info(
+                f"アーカイブ: {level} {sum(len(p) for p in periods.values())}件 "
+                f"({report.stats[level].original_bytes} -> "
+                f"{report.stats[level].archived_bytes} bytes)"
+            )
+        return report
+
+    def status(self) -> Dict[str, Any]:
+        """
+        各レベルのアーカイブ集計と合計
+
+        Returns:
+            {"levels": {level: ArchiveStats.to_dict()}, "total": {...}}
+        """
+        levels: Dict[str, Any] = {}
+        total = ArchiveStats()
+        for level in LEVEL_NAMES:
+            stats = archive_stats(self._level_dir(level))
+            if not stats.bundles:
+                continue
+            levels[level] = stats.to_dict()
+            total.bundles += stats.bundles
+            total.members += stats.members
+            total.original_bytes += stats.original_bytes
+            total.archived_bytes += stats.archived_bytes
+        return {"levels": levels, "total": total.to_dict()}
+
+    def _min_age_years(self, value: Optional[float]) -> float:
+        age = (
+            value
+            if value is not None
+            else self._setting("min_age_years", DEFAULT_ARCHIVE_MIN_AGE_YEARS)
+        )
+        if isinstance(age, bool) or not isinstance(age, (int, float)) or age < 0:
+            formatter = get_error_formatter()
+            raise ConfigError(
+                formatter.config.config_invalid_value("archive.min_age_years", "number >= 0", age)
+            )
+        return float(age)
+
+
+def _source_files(overall_digest: Any) -> List[str]:
+    """overall_digest の source_files（形式が不正なら空）"""
+    if not isinstance(overall_digest, dict):
+        return []
+    files = overall_digest.get("source_files")
+    return [str(name) for name in files] if isinstance(files, list) else []
+
+
+def _content_datetime(path: Path) -> datetime:
+    """ファイル内容の日時（overall_digest.timestamp / metadata.last_updated、なければ mtime）"""
+    data = try_read_json_from_file(path, log_on_error=False) or {}
+    for section, key in (("overall_digest", "timestamp"), ("metadata", "last_updated")):
+        value = data.get(section, {}).get(key) if isinstance(data.get(section), dict) else None
+        if isinstance(value, str) and value:
+            try:
+                return datetime.fromisoformat(value).replace(tzinfo=None)
+            except ValueError:
+                continue
+    return datetime.fromtimestamp(path.stat().st_mtime)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Storage Backend Selection
+=========================
+
+DigestConfig.storage_backend に応じて SQLite ストアを返すアプリケーション層モジュール。
+診断系の読み取りでは storage.shadow_layout = "sharded" の分割ファイルと、
+ShadowGrandDigest の未コンパクションの差分ログ（ShadowGrandDigest.delta.jsonl）も扱う。
+
+ShadowIO / GrandDigestManager / DigestTimesTracker / DigestPersistence は
+get_digest_store() が None を返せば従来どおりテキストファイルを、
+SqliteDigestStore を返せば Essences/EpisodicRAG.db を使う。
+
+Usage:
+    from application.storage import get_digest_store
+
+    store = get_digest_store(config)  # "json" バックエンドでは None
+
+    # 診断系の読み取り専用アクセス（None ならテキストファイルを読む）
+    data = load_stored_document(config, SHADOW_GRAND_DIGEST_FILENAME)
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from domain.file_constants import (
+    SHADOW_DELTA_LOG_FILENAME,
+    SHADOW_GRAND_DIGEST_FILENAME,
+    SHADOW_SHARD_DIRNAME,
+)
+from infrastructure import try_read_json_from_file
+from infrastructure.delta_log import DeltaLog
+from infrastructure.sharded_json import SHADOW_LAYOUT_SHARDED, ShardedJsonDocument
+from infrastructure.sqlite_store import (
+    STORAGE_BACKEND_SQLITE,
+    SqliteDigestStore,
+    open_digest_store,
+)
+
+if TYPE_CHECKING:
+    from application.config import DigestConfig
+
+__all__ = ["get_digest_store", "load_stored_document", "read_stored_document"]
+
+
+def get_digest_store(config: "DigestConfig") -> Optional[SqliteDigestStore]:
+    """
+    設定に応じた SQLite ストアを取得
+
+    Args:
+        config: DigestConfig インスタンス
+
+    Returns:
+        storage_backend が "sqlite" なら共有の SqliteDigestStore、それ以外はNone
+
+    Example:
+        >>> store = get_digest_store(config)
+        >>> store is None  # デフォルトの "json" バックエンド
+        True
+    """
+    if getattr(config, "storage_backend", None) != STORAGE_BACKEND_SQLITE:
+        return None
+    return open_digest_store(config.essences_path)
+
+
+def load_stored_document(config: "DigestConfig", name: str) -> Optional[Dict[str, Any]]:
+    """
+    SQLite バックエンド・分割レイアウトに保存済みの文書を読み込む（診断系の読み込み用）
+
+    Args:
+        config: DigestConfig インスタンス
+        name: 文書名（"ShadowGrandDigest.txt" / "GrandDigest.txt"）
+
+    Returns:
+        保存済みの文書。単一のテキストファイルに保存されている場合はNone
+        （呼び出し側は従来どおりテキストファイルを読む）
+    """
+    return read_stored_document(
+        config.essences_path,
+        name,
+        getattr(config, "storage_backend", None),
+        getattr(config, "shadow_layout", None),
+    )
+
+
+def read_stored_document(
+    essences_path: Path,
+    name: str,
+    backend: Optional[str],
+    shadow_layout: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    DigestConfig を使わずに保存済みの文書を読み込む（config.json を直接読む CLI 用）
+
+    SQLite バックエンドの文書は、写し（ShadowGrandDigest.txt / GrandDigest.txt）に
+    未取り込みの編集があれば DB に取り込んでから返す。
+
+    Args:
+        essences_path: Essences ディレクトリ
+        name: 文書名
+        backend: resolve_storage_backend() の結果
+        shadow_layout: resolve_shadow_layout() の結果
+
+    Returns:
+        DB・分割ファイル・差分ログを合成した文書。いずれにも無ければNone
+
+    Example:
+        >>> read_stored_document(essences, "ShadowGrandDigest.txt", "json", "sharded")
+        {'metadata': {...}, 'latest_digests': {...}}
+    """
+    if backend == STORAGE_BACKEND_SQLITE:
+        return open_digest_store(essences_path).load_mirrored_document(name, essences_path / name)
+    if name == SHADOW_GRAND_DIGEST_FILENAME and shadow_layout == SHADOW_LAYOUT_SHARDED:
+        return ShardedJsonDocument(
+            essences_path / SHADOW_SHARD_DIRNAME, "latest_digests", lock_path=essences_path / name
+        ).load()
+    if name == SHADOW_GRAND_DIGEST_FILENAME:
+        delta_log = DeltaLog(essences_path / SHADOW_DELTA_LOG_FILENAME)
+        if delta_log.has_records():
+            base = try_read_json_from_file(essences_path / name, log_on_error=False)
+            if base is not None:
+                return delta_log.apply(base)
+    return None
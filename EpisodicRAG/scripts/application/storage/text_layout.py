@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Text Layout Transfer
+====================
+
+SQLite バックエンド（Essences/EpisodicRAG.db）とテキストファイルのレイアウト
+（ShadowGrandDigest.txt / GrandDigest.txt / last_digest_times.json / 各階層の RegularDigest）
+を相互に変換するアプリケーション層モジュール。
+
+SQLite バックエンドで運用していても、書き出したテキストファイルを git で
+コミットすれば従来どおり別環境へ継承でき、継承先では取り込みで DB を再構築できる。
+
+## 設計意図
+
+ARCHITECTURE: Export / Import
+- 書き出しは save_json（アトミック書き込み）で、JSONバックエンドと同じ書式・配置。
+  内容（metadata.last_updated 以外）が既存ファイルと同じなら書き込まない
+  （git 同期で内容の変わらない差分を出さない。件数は unchanged）
+- RegularDigest はカスケードの入力として常にテキストファイルにも保存されているため、
+  書き出しは DB にのみ存在するもの（削除・移動されたもの）だけを復元する
+  （overwrite_digests=True で全件書き直し）
+- 取り込みは RegularDigest を1トランザクションで一括登録する
+
+Usage:
+    from application.storage import TextLayoutExporter, TextLayoutImporter, get_digest_store
+
+    store = get_digest_store(config)
+    TextLayoutExporter(config, store).export()             # DB → テキストファイル
+    TextLayoutImporter(config, store).import_layout()       # テキストファイル → DB
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from domain.constants import DIGEST_LEVEL_NAMES, LEVEL_CONFIG, LOG_PREFIX_FILE
+from domain.file_constants import (
+    DIGEST_TIMES_FILENAME,
+    GRAND_DIGEST_FILENAME,
+    SHADOW_GRAND_DIGEST_FILENAME,
+)
+from infrastructure import get_structured_logger, log_debug, save_json, try_read_json_from_file
+from infrastructure.config import get_persistent_config_dir
+from infrastructure.json_repository import safe_read_json
+from infrastructure.sqlite_store import SqliteDigestStore
+
+if TYPE_CHECKING:
+    from application.config import DigestConfig
+
+__all__ = ["LayoutTransferResult", "TextLayoutExporter", "TextLayoutImporter"]
+
+_logger = get_structured_logger(__name__)
+
+# DB の文書として扱う Essences 配下のファイル
+_DOCUMENTS = (SHADOW_GRAND_DIGEST_FILENAME, GRAND_DIGEST_FILENAME)
+
+
+@dataclass
+class LayoutTransferResult:
+    """書き出し・取り込みの結果"""
+
+    documents: List[str] = field(default_factory=list)
+    digests: int = 0
+    skipped_digests: int = 0
+    times: int = 0
+    unchanged: int = 0  # 内容が同じため書き込まなかったファイル数（書き出しのみ）
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON出力用の辞書に変換"""
+        return asdict(self)
+
+
+def _digest_files(config: "DigestConfig") -> Iterator[Tuple[str, Path]]:
+    """各階層ディレクトリの RegularDigest ファイル (level, path) を列挙"""
+    for level in DIGEST_LEVEL_NAMES:
+        level_dir = config.get_level_dir(level)
+        if not level_dir.is_dir():
+            continue
+        prefix = str(LEVEL_CONFIG[level]["prefix"])
+        for path in sorted(level_dir.glob(f"{prefix}*.txt")):
+            yield level, path
+
+
+class TextLayoutExporter:
+    """
+    SQLite の内容をテキストファイルのレイアウトへ書き出す
+
+    Example:
+        >>> exporter = TextLayoutExporter(config, store)
+        >>> result = exporter.export()
+        >>> result.documents
+        ['ShadowGrandDigest.txt', 'GrandDigest.txt']
+    """
+
+    def __init__(self, config: "DigestConfig", store: SqliteDigestStore):
+        self.config = config
+        self.store = store
+
+    def export(
+        self,
+        output_dir: Optional[Path] = None,
+        include_digests: bool = True,
+        overwrite_digests: bool = False,
+    ) -> LayoutTransferResult:
+        """
+        DB の内容をテキストファイルに書き出す
+
+        Args:
+            output_dir: 書き出し先（Noneなら Essences / 永続設定 / 各階層ディレクトリ、
+                指定時はその配下に同じファイル名・階層ディレクトリ名で書き出す）
+            include_digests: RegularDigest も書き出すか
+            overwrite_digests: 既存の RegularDigest ファイルも書き直すか
+
+        Returns:
+            LayoutTransferResult
+        """
+        result = LayoutTransferResult()
+        essences_dir = output_dir or self.config.essences_path
+        for name in _DOCUMENTS:
+            if output_dir is None and name == SHADOW_GRAND_DIGEST_FILENAME:
+                # 写しは保存のたびに書き出し済み。未取り込みの編集を上書きしないよう同期のみ
+                if self.store.load_mirrored_document(name, essences_dir / name) is not None:
+                    result.documents.append(name)
+                continue
+            data = self.store.load_document(name)
+            if data is None:
+                continue
+            if not save_json(essences_dir / name, data, fsync_dir=True, skip_unchanged=True):
+                result.unchanged += 1
+            result.documents.append(name)
+
+        times = self.store.load_times()
+        if times:
+            times_dir = output_dir or get_persistent_config_dir()
+            times_file = times_dir / DIGEST_TIMES_FILENAME
+            merged: Dict[str, Any] = dict(safe_read_json(times_file, raise_on_error=False) or {})
+            merged.update(times)
+            if not save_json(times_file, merged, compact=True, skip_unchanged=True):
+                result.unchanged += 1
+            result.times = len(times)
+
+        if include_digests:
+            self._export_digests(output_dir, overwrite_digests, result)
+
+        _logger.info(
+            f"テキストレイアウトへ書き出し: 文書 {len(result.documents)}件, "
+            f"RegularDigest {result.digests}件, 変更なし {result.unchanged}件"
+        )
+        return result
+
+    def _export_digests(
+        self, output_dir: Optional[Path], overwrite: bool, result: LayoutTransferResult
+    ) -> None:
+        for level, name in self.store.list_digest_names():
+            if output_dir is None:
+                level_dir = self.config.get_level_dir(level)
+            else:
+                level_dir = output_dir / str(LEVEL_CONFIG[level]["dir"])
+            path = level_dir / f"{name}.txt"
+            if path.exists() and not overwrite:
+                result.skipped_digests += 1
+                continue
+            data = self.store.load_regular_digest(level, name)
+            if data is None:
+                continue
+            level_dir.mkdir(parents=True, exist_ok=True)
+            if not save_json(path, data, skip_unchanged=True):
+                result.unchanged += 1
+                continue
+            result.digests += 1
+            log_debug(f"{LOG_PREFIX_FILE} exported RegularDigest: {path}")
+
+
+class TextLayoutImporter:
+    """
+    テキストファイルのレイアウトを SQLite に取り込む
+
+    Example:
+        >>> importer = TextLayoutImporter(config, store)
+        >>> importer.import_layout().digests
+        42
+    """
+
+    def __init__(self, config: "DigestConfig", store: SqliteDigestStore):
+        self.config = config
+        self.store = store
+
+    def import_layout(self, include_digests: bool = True) -> LayoutTransferResult:
+        """
+        Essences / 永続設定 / 各階層ディレクトリのテキストファイルを DB に取り込む
+
+        Args:
+            include_digests: RegularDigest も取り込むか
+
+        Returns:
+            LayoutTransferResult
+        """
+        result = LayoutTransferResult()
+        for name in _DOCUMENTS:
+            data = try_read_json_from_file(self.config.essences_path / name, log_on_error=False)
+            if not isinstance(data, dict):
+                continue
+            # ファイル側の revision は DB の採番と無関係なので比較せずに保存
+            self.store.save_document(name, data)
+            result.documents.append(name)
+
+        times = safe_read_json(
+            get_persistent_config_dir() / DIGEST_TIMES_FILENAME, raise_on_error=False
+        )
+        for level, entry in (times or {}).items():
+            if isinstance(entry, Mapping) and entry.get("timestamp"):
+                self.store.save_time(level, entry["timestamp"], entry.get("last_processed"))
+                result.times += 1
+
+        if include_digests:
+            records: List[Tuple[str, str, Mapping[str, Any]]] = []
+            for level, path in _digest_files(self.config):
+                data = try_read_json_from_file(path, log_on_error=False)
+                if isinstance(data, dict):
+                    records.append((level, path.stem, data))
+                else:
+                    result.skipped_digests += 1
+            result.digests = self.store.save_regular_digests(records)
+
+        _logger.info(
+            f"テキストレイアウトを取り込み: 文書 {len(result.documents)}件, "
+            f"RegularDigest {result.digests}件"
+        )
+        return result
@@ -8,17 +8,29 @@ finalize_from_shadow.py から分離。
 """
 
 from datetime import datetime
-from typing import List, Optional, Union, cast
+from typing import TYPE_CHECKING, List, Mapping, Optional, Union, cast
 
 from application.config import DigestConfig
+from application.storage import get_digest_store
 from domain.constants import LEVEL_NAMES
 from domain.file_constants import DIGEST_TIMES_FILENAME, DIGEST_TIMES_TEMPLATE
 from domain.file_naming import extract_number_only, extract_numbers_formatted
-from domain.types import DigestTimesData
+from domain.types import DigestTimesData, as_dict
 from domain.validators import is_valid_list
-from infrastructure import get_structured_logger, load_json_with_template, log_warning, save_json
+from infrastructure import (
+    exclusive_lock,
+    get_structured_logger,
+    load_json_with_template,
+    log_warning,
+    save_json,
+    shared_lock,
+)
 from infrastructure.config import get_persistent_config_dir
 from infrastructure.config.persistent_path import get_template_dir
+from infrastructure.json_repository import safe_read_json
+
+if TYPE_CHECKING:
+    from infrastructure.sqlite_store import SqliteDigestStore
 
 _logger = get_structured_logger(__name__)
 
@@ -33,6 +45,8 @@ class DigestTimesTracker:
         # テンプレートは.claude-plugin/ディレクトリから取得
         template_dir = get_template_dir()
         self.template_file = template_dir / DIGEST_TIMES_TEMPLATE if template_dir else None
+        # storage.backend が "sqlite" の場合は digest_times テーブルに保存
+        self.store = get_digest_store(config)
 
     def _get_default_template(self) -> DigestTimesData:
         """テンプレートがない場合のデフォルト構造を返す"""
@@ -48,12 +62,26 @@ class DigestTimesTracker:
             >>> "weekly" in data
             True
         """
-        return load_json_with_template(
-            target_file=self.last_digest_file,
-            template_file=self.template_file,
-            default_factory=self._get_default_template,
-            log_message="Initialized last_digest_times.json from template",
-        )
+        if self.store is not None:
+            return self._load_from_store(self.store)
+
+        with shared_lock(self.last_digest_file):
+            return load_json_with_template(
+                target_file=self.last_digest_file,
+                template_file=self.template_file,
+                default_factory=self._get_default_template,
+                log_message="Initialized last_digest_times.json from template",
+            )
+
+    def _load_from_store(self, store: "SqliteDigestStore") -> DigestTimesData:
+        """DB から読み込む（未記録のレベルは既存ファイル、なければデフォルト値）"""
+        times = self._get_default_template()
+        if not store.has_times():
+            existing = safe_read_json(self.last_digest_file, raise_on_error=False)
+            if existing:
+                times.update(cast(DigestTimesData, existing))
+        times.update(cast(DigestTimesData, store.load_times()))
+        return times
 
     def extract_file_numbers(self, level: str, input_files: Optional[List[str]]) -> List[str]:
         """
@@ -96,6 +124,21 @@ class DigestTimesTracker:
         last_file_str = file_numbers[-1]
         return extract_number_only(last_file_str)
 
+    def _save_file(self, times: DigestTimesData) -> None:
+        """
+        last_digest_times.json に保存（排他ロックは呼び出し側で保持）
+
+        機械専用ファイルのためコンパクト形式で保存する。各レベルの timestamp だけが
+        変わった（last_processed が同じ）場合は書き込まない（git 同期の差分を出さない）。
+        """
+        save_json(
+            self.last_digest_file,
+            as_dict(times),
+            compact=True,
+            skip_unchanged=True,
+            volatile_fields=tuple(f"{level}.timestamp" for level in times),
+        )
+
     def _save_level_data(self, level: str, last_processed: Optional[int]) -> None:
         """
         共通保存ロジック（内部用）
@@ -104,12 +147,20 @@ class DigestTimesTracker:
             level: ダイジェストレベル
             last_processed: 最後に処理した番号（Noneも許容）
         """
-        times = self.load_or_create()
-        times[level] = {
-            "timestamp": datetime.now().isoformat(),
-            "last_processed": last_processed,
-        }
-        save_json(self.last_digest_file, times)
+        timestamp = datetime.now().isoformat()
+        if self.store is not None:
+            # 行単位の UPSERT なので他レベルの行には触れない
+            self.store.save_time(level, timestamp, last_processed)
+            return
+
+        # 他レベルの同時更新を失わないよう、読み込みから保存まで排他ロックを保持
+        with exclusive_lock(self.last_digest_file):
+            times = self.load_or_create()
+            times[level] = {
+                "timestamp": timestamp,
+                "last_processed": last_processed,
+            }
+            self._save_file(times)
 
     def save(self, level: str, input_files: Optional[List[str]] = None) -> None:
         """
@@ -177,3 +228,27 @@ class DigestTimesTracker:
         """
         self._save_level_data(level, digest_number)
         _logger.info(f"last_digest_times.json更新（確定）: {level} = {digest_number}")
+
+    def save_digest_numbers(self, numbers: Mapping[str, int]) -> None:
+        """
+        複数レベルの番号を1回の保存で記録（一括取り込み用）
+
+        Args:
+            numbers: レベル（loop, weekly等）→ 最後に処理・確定した番号
+
+        Example:
+            >>> tracker.save_digest_numbers({"loop": 500, "weekly": 100, "monthly": 20})
+        """
+        if not numbers:
+            return
+        timestamp = datetime.now().isoformat()
+        if self.store is not None:
+            for level, number in numbers.items():
+                self.store.save_time(level, timestamp, number)
+        else:
+            with exclusive_lock(self.last_digest_file):
+                times = self.load_or_create()
+                for level, number in numbers.items():
+                    times[level] = {"timestamp": timestamp, "last_processed": number}
+                self._save_file(times)
+        _logger.info(f"last_digest_times.json更新（一括）: {dict(numbers)}")
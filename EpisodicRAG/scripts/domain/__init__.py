@@ -58,28 +58,46 @@ from domain.exceptions import (
     DigestError,
     EpisodicRAGError,
     FileIOError,
+    LockTimeoutError,
+    LockUpgradeError,
+    RevisionConflictError,
     ValidationError,
 )
 
 # File constants
 from domain.file_constants import (
+    ANALYSIS_CACHE_DIRNAME,
+    ANALYSIS_CACHE_FILENAME,
+    ARCHIVE_DIRNAME,
+    ARCHIVE_INDEX_FILENAME,
+    BACKFILL_CHECKPOINT_FILENAME,
     CONFIG_FILENAME,
     CONFIG_TEMPLATE,
+    CONTEXT_PACK_FILENAME,
     DATA_DIR_NAME,
     DIGEST_TIMES_FILENAME,
     DIGEST_TIMES_TEMPLATE,
+    DIGEST_TREE_FILENAME,
     ESSENCES_DIR_NAME,
+    FINALIZE_JOURNAL_FILENAME,
     GRAND_DIGEST_FILENAME,
     GRAND_DIGEST_TEMPLATE,
     INDIVIDUAL_DIGEST_SUFFIX,
+    LOCK_DIRNAME,
     LOOP_FILE_PATTERN,
     LOOPS_DIR_NAME,
     MONTHLY_FILE_PATTERN,
     OVERALL_DIGEST_SUFFIX,
     PLUGIN_CONFIG_DIR,
     PROVISIONALS_SUBDIR,
+    SEARCH_INDEX_FILENAME,
+    SHADOW_DELTA_LOG_FILENAME,
     SHADOW_GRAND_DIGEST_FILENAME,
     SHADOW_GRAND_DIGEST_TEMPLATE,
+    SHADOW_SHARD_DIRNAME,
+    SHARD_INDEX_FILENAME,
+    STORAGE_DB_FILENAME,
+    VECTOR_INDEX_FILENAME,
     WEEKLY_FILE_PATTERN,
 )
 
@@ -117,6 +135,7 @@ from domain.text_utils import (
 
 # Types
 from domain.types import (
+    ArchiveConfigData,
     # Metadata
     BaseMetadata,
     ConfigData,
@@ -140,6 +159,7 @@ from domain.types import (
     RegularDigestData,
     ShadowDigestData,
     ShadowLevelData,
+    StorageConfigData,
     # Long/Short text type
     is_long_short_text,
 )
@@ -178,6 +198,21 @@ __all__ = [
     "CONFIG_TEMPLATE",
     "CONFIG_FILENAME",
     "DIGEST_TIMES_FILENAME",
+    "SEARCH_INDEX_FILENAME",
+    "DIGEST_TREE_FILENAME",
+    "VECTOR_INDEX_FILENAME",
+    "CONTEXT_PACK_FILENAME",
+    "STORAGE_DB_FILENAME",
+    "SHADOW_SHARD_DIRNAME",
+    "SHARD_INDEX_FILENAME",
+    "FINALIZE_JOURNAL_FILENAME",
+    "BACKFILL_CHECKPOINT_FILENAME",
+    "ANALYSIS_CACHE_DIRNAME",
+    "ANALYSIS_CACHE_FILENAME",
+    "ARCHIVE_DIRNAME",
+    "ARCHIVE_INDEX_FILENAME",
+    "SHADOW_DELTA_LOG_FILENAME",
+    "LOCK_DIRNAME",
     "PLUGIN_CONFIG_DIR",
     "ESSENCES_DIR_NAME",
     "LOOPS_DIR_NAME",
@@ -194,6 +229,9 @@ __all__ = [
     "DigestError",
     "ValidationError",
     "FileIOError",
+    "LockTimeoutError",
+    "LockUpgradeError",
+    "RevisionConflictError",
     "CorruptedDataError",
     # File naming utilities
     "extract_file_number",
@@ -218,6 +256,8 @@ __all__ = [
     # Types - Config data
     "PathsConfigData",
     "LevelsConfigData",
+    "StorageConfigData",
+    "ArchiveConfigData",
     "ConfigData",
     # Types - Times data
     "DigestTimeData",
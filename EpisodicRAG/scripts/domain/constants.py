@@ -143,6 +143,7 @@ LOG_PREFIX_STATE = "[STATE]"  # 状態変化のログ
 LOG_PREFIX_FILE = "[FILE]"  # ファイル操作のログ
 LOG_PREFIX_VALIDATE = "[VALIDATE]"  # 検証処理のログ
 LOG_PREFIX_DECISION = "[DECISION]"  # 判断分岐のログ
+LOG_PREFIX_SPAN = "[SPAN]"  # 処理区間（所要時間）のログ
 
 
 # =============================================================================
@@ -82,6 +82,58 @@ class FileErrorFormatter(BaseErrorFormatter):
         """
         return f"Failed to {operation} {self.format_path(path)}: {error}"
 
+    def lock_timeout(self, path: Path, mode: str, timeout: float) -> str:
+        """
+        ファイルロック取得タイムアウトのエラーメッセージ
+
+        Args:
+            path: ロック対象のファイルパス
+            mode: ロックモード（"shared" / "exclusive"）
+            timeout: 待機したタイムアウト秒数
+
+        Returns:
+            フォーマットされたエラーメッセージ
+
+        Example:
+            >>> formatter.lock_timeout(Path("Essences/GrandDigest.txt"), "exclusive", 10.0)
+            'Timed out after 10.0s waiting for exclusive lock on Essences/GrandDigest.txt'
+        """
+        return f"Timed out after {timeout}s waiting for {mode} lock on {self.format_path(path)}"
+
+    def lock_upgrade(self, path: Path) -> str:
+        """
+        共有ロックから排他ロックへの昇格エラーメッセージ
+
+        Args:
+            path: ロック対象のファイルパス
+
+        Returns:
+            フォーマットされたエラーメッセージ
+
+        Example:
+            >>> formatter.lock_upgrade(Path("Essences/ShadowGrandDigest.txt"))
+            'Cannot upgrade shared lock to exclusive on Essences/ShadowGrandDigest.txt'
+        """
+        return f"Cannot upgrade shared lock to exclusive on {self.format_path(path)}"
+
+    def revision_conflict(self, path: Path, expected: int, actual: int) -> str:
+        """
+        リビジョン競合のエラーメッセージ
+
+        Args:
+            path: 保存対象のファイルパス
+            expected: 保存時に期待したリビジョン
+            actual: ファイル上の現在のリビジョン
+
+        Returns:
+            フォーマットされたエラーメッセージ
+
+        Example:
+            >>> formatter.revision_conflict(Path("Essences/GrandDigest.txt"), 4, 5)
+            'Revision conflict on Essences/GrandDigest.txt: expected 4, found 5'
+        """
+        return f"Revision conflict on {self.format_path(path)}: expected {expected}, found {actual}"
+
     def directory_not_found(self, path: Path) -> str:
         """
         ディレクトリ未検出エラーメッセージ
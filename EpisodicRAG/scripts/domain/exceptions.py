@@ -185,6 +185,81 @@ class FileIOError(EpisodicRAGError):
     pass
 
 
+class LockTimeoutError(FileIOError):
+    """
+    ファイルロック取得タイムアウト
+
+    Examples:
+        - 別プロセスの finalize が ShadowGrandDigest.txt を排他ロック中
+        - digest_auto の読み取り中に書き込みロックを取得できない
+
+    Note:
+        FileIOError を継承するため、既存の FileIOError ハンドラで捕捉できる。
+    """
+
+    pass
+
+
+class LockUpgradeError(FileIOError):
+    """
+    共有ロックから排他ロックへの昇格エラー
+
+    同一スレッドが共有ロックを保持したまま同じファイルの排他ロックを要求した場合に発生。
+    2つの読み手が互いの共有ロック解放を待つデッドロックになり得るため、昇格は許可しない。
+
+    Examples:
+        - shared_lock(path) の with ブロック内で exclusive_lock(path) を取得
+
+    Note:
+        呼び出し側の誤用を示す。共有ロックを解放してから排他ロックを取り直すか、
+        最初から排他ロックを取得すること。
+        FileIOError を継承するため、既存の FileIOError ハンドラで捕捉できる。
+    """
+
+    pass
+
+
+class RevisionConflictError(EpisodicRAGError):
+    """
+    リビジョン競合エラー（楽観的並行制御）
+
+    読み込み時の metadata.revision を expected_revision として保存したが、
+    その間に別の書き込みでファイルのリビジョンが進んでいた場合に発生。
+
+    Attributes:
+        expected: 保存時に期待したリビジョン
+        actual: ファイル上の現在のリビジョン
+
+    Examples:
+        - 2つのエージェントが同じ ShadowGrandDigest.txt を並行して更新
+        - GrandDigest.txt の読み込み後に別プロセスが finalize を完了
+
+    Note:
+        再読み込みして変更をやり直せば解消できるため、
+        ShadowIO.update() / GrandDigestManager.update() は自動で再試行する。
+    """
+
+    def __init__(
+        self,
+        message: str,
+        expected: int,
+        actual: int,
+        context: Optional[DiagnosticContext] = None,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            message: エラーメッセージ
+            expected: 期待したリビジョン
+            actual: ファイル上の現在のリビジョン
+            context: 診断コンテキスト（オプション）
+        """
+        super().__init__(message, context)
+        self.expected = expected
+        self.actual = actual
+
+
 class CorruptedDataError(EpisodicRAGError):
     """
     データ破損エラー
@@ -24,6 +24,33 @@ GRAND_DIGEST_FILENAME = "GrandDigest.txt"
 SHADOW_GRAND_DIGEST_FILENAME = "ShadowGrandDigest.txt"
 """未確定Shadow Grand Digestのファイル名"""
 
+SHADOW_DELTA_LOG_FILENAME = "ShadowGrandDigest.delta.jsonl"
+"""Shadow Grand Digest の差分ログ（Essences配下、JSON Patch の JSON Lines）"""
+
+SHADOW_SHARD_DIRNAME = "ShadowGrandDigest.shards"
+"""階層ごとに分割したShadow Grand Digestのディレクトリ名（Essences配下）"""
+
+SHARD_INDEX_FILENAME = "_index.txt"
+"""分割保存した文書のインデックスファイル名（分割ディレクトリ配下）"""
+
+FINALIZE_JOURNAL_FILENAME = "FinalizeJournal.jsonl"
+"""finalize の先行書き込みジャーナル（Essences配下、JSON Lines）"""
+
+BACKFILL_CHECKPOINT_FILENAME = "BackfillCheckpoint.json"
+"""digest_backfill の再開用チェックポイント（Essences配下）"""
+
+ANALYSIS_CACHE_DIRNAME = ".analysis_cache"
+"""診断CLIの解析キャッシュのディレクトリ名（Essences配下。書き込みで Essences の mtime を変えない）"""
+
+ANALYSIS_CACHE_FILENAME = "AnalysisCache.json"
+"""診断CLIの解析キャッシュのファイル名（解析キャッシュディレクトリ配下）"""
+
+ARCHIVE_DIRNAME = ".archive"
+"""古いファイルの圧縮バンドルを置くディレクトリ名（Loops・各階層ディレクトリ配下）"""
+
+ARCHIVE_INDEX_FILENAME = "index.json"
+"""圧縮バンドルのメンバー索引ファイル名（アーカイブディレクトリ配下）"""
+
 
 # =============================================================================
 # テンプレートファイル名
@@ -52,6 +79,21 @@ CONFIG_FILENAME = "config.json"
 DIGEST_TIMES_FILENAME = "last_digest_times.json"
 """ダイジェスト生成時刻記録ファイル名"""
 
+SEARCH_INDEX_FILENAME = "SearchIndex.json"
+"""全文検索インデックスのファイル名（Essences配下）"""
+
+DIGEST_TREE_FILENAME = "DigestTree.json"
+"""階層の親→子隣接リストのファイル名（Essences配下）"""
+
+VECTOR_INDEX_FILENAME = "VectorIndex.bin"
+"""類似検索用ベクトル行列（float32）のファイル名（Essences配下）"""
+
+CONTEXT_PACK_FILENAME = "ContextPack.json"
+"""セッション継承用コンテキストパックのキャッシュファイル名（Essences配下）"""
+
+STORAGE_DB_FILENAME = "EpisodicRAG.db"
+"""SQLiteストレージバックエンドのデータベースファイル名（Essences配下）"""
+
 
 # =============================================================================
 # ディレクトリ名
@@ -63,6 +105,9 @@ PLUGIN_CONFIG_DIR = ".claude-plugin"
 PERSISTENT_CONFIG_DIR_NAME = ".episodicrag"
 """永続化設定ディレクトリ名（~/.claude/plugins/配下、auto-update対象外）"""
 
+LOCK_DIRNAME = ".locks"
+"""ファイルロックのディレクトリ名（永続化設定ディレクトリ配下。同期されるデータ配下に置かない）"""
+
 ESSENCES_DIR_NAME = "Essences"
 """Essences（ダイジェスト格納）ディレクトリ名"""
 
@@ -8,16 +8,22 @@ File Naming Utilities
 Usage:
     from domain.file_naming import extract_file_number, format_digest_number
     from domain.file_naming import find_max_number, filter_files_after
+    from domain.file_naming import extract_file_numbers, partition_by_prefix  # バッチ版
 
 Note:
     このモジュールはLevelRegistryProtocolを使用してOCP (Open/Closed Principle) を実現。
     新しいレベル追加時にこのファイルの修正は不要。
     Protocol経由の依存関係逆転により、循環インポートを解消。
+
+    プレフィックス正規表現は LevelRegistry.file_number_regex（コンパイル済み、
+    レベル登録時に無効化）を使用する。Protocol のみを満たす Registry の場合は
+    build_prefix_pattern() の結果をキーにコンパイル結果をキャッシュする。
 """
 
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
 
 from domain.protocols import LevelRegistryProtocol
 
@@ -112,17 +118,101 @@ def extract_file_number(
     if not isinstance(filename, str):
         return None
 
-    # Registry経由で動的にプレフィックスパターンを取得
-    reg = registry if registry is not None else _get_registry()
-    pattern = reg.build_prefix_pattern()
+    # Registry経由でコンパイル済みパターンを取得
+    regex = _get_file_number_regex(registry)
 
-    match = re.search(rf"({pattern})(\d+)", filename)
+    match = regex.search(filename)
     if match:
         return (match.group(1), int(match.group(2)))
 
     return None
 
 
+@lru_cache(maxsize=32)
+def _compile_file_number_regex(prefix_pattern: str) -> Pattern[str]:
+    """プレフィックスパターンから番号抽出用の正規表現をコンパイル（キャッシュ付き）"""
+    return re.compile(rf"({prefix_pattern})(\d+)")
+
+
+def _get_file_number_regex(registry: Optional[LevelRegistryProtocol] = None) -> Pattern[str]:
+    """
+    ファイル番号抽出用のコンパイル済み正規表現を取得
+
+    Args:
+        registry: オプショナルなLevelRegistryProtocol（未指定時はグローバルシングルトン）
+
+    Returns:
+        group(1) がプレフィックス、group(2) が番号の正規表現
+    """
+    reg = registry if registry is not None else _get_registry()
+    # LevelRegistry はコンパイル済みパターンを保持している
+    compiled = getattr(reg, "file_number_regex", None)
+    if isinstance(compiled, re.Pattern):
+        return compiled
+    return _compile_file_number_regex(reg.build_prefix_pattern())
+
+
+def extract_file_numbers(
+    filenames: Iterable[object],
+    registry: Optional[LevelRegistryProtocol] = None,
+) -> List[Optional[Tuple[str, int]]]:
+    """
+    複数のファイル名から (prefix, number) を一括抽出
+
+    正規表現の取得を1回にまとめたバッチ版の extract_file_number。
+    数千件以上のファイル名を処理する場合に使用する。
+
+    Args:
+        filenames: ファイル名のイテラブル（非文字列要素の結果はNone）
+        registry: オプショナルなLevelRegistryProtocol（DIによるテスト容易化）
+
+    Returns:
+        入力と同じ順序の結果リスト（各要素は (prefix, number) またはNone）
+
+    Examples:
+        >>> extract_file_numbers(["W0001_a.txt", "readme.md", "L00002_b.txt"])
+        [('W', 1), None, ('L', 2)]
+    """
+    search = _get_file_number_regex(registry).search
+    results: List[Optional[Tuple[str, int]]] = []
+    append = results.append
+    for filename in filenames:
+        match = search(filename) if isinstance(filename, str) else None
+        append((match.group(1), int(match.group(2))) if match else None)
+    return results
+
+
+def partition_by_prefix(
+    filenames: Iterable[object],
+    registry: Optional[LevelRegistryProtocol] = None,
+) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    ファイル名をプレフィックスごとに分類（1パス）
+
+    Args:
+        filenames: ファイル名のイテラブル（番号を抽出できない要素は除外）
+        registry: オプショナルなLevelRegistryProtocol（DIによるテスト容易化）
+
+    Returns:
+        プレフィックス → [(number, filename), ...]（番号昇順）の辞書
+
+    Examples:
+        >>> partition_by_prefix(["W0002_b.txt", "M001_a.txt", "W0001_a.txt"])
+        {'W': [(1, 'W0001_a.txt'), (2, 'W0002_b.txt')], 'M': [(1, 'M001_a.txt')]}
+    """
+    search = _get_file_number_regex(registry).search
+    groups: Dict[str, List[Tuple[int, str]]] = {}
+    for filename in filenames:
+        if not isinstance(filename, str):
+            continue
+        match = search(filename)
+        if match:
+            groups.setdefault(match.group(1), []).append((int(match.group(2)), filename))
+    for entries in groups.values():
+        entries.sort()
+    return groups
+
+
 def extract_number_only(filename: str) -> Optional[int]:
     """
     ファイル名から番号のみを抽出（後方互換性用）
@@ -203,6 +293,7 @@ def find_max_number(
     if not files:
         return None
 
+    search = _get_file_number_regex(registry).search
     max_num: Optional[int] = None
 
     for file in files:
@@ -214,9 +305,9 @@ def find_max_number(
         else:
             continue
 
-        result = extract_file_number(filename, registry=registry)
-        if result and result[0] == prefix:
-            num = result[1]
+        match = search(filename)
+        if match and match.group(1) == prefix:
+            num = int(match.group(2))
             if max_num is None or num > max_num:
                 max_num = num
 
@@ -241,10 +332,11 @@ def filter_files_after(files: List[Path], threshold: int) -> List[Path]:
     if not files:
         return []
 
+    search = _get_file_number_regex().search
     result = []
     for file in files:
-        file_num = extract_number_only(file.name)
-        if file_num is not None and file_num > threshold:
+        match = search(file.name)
+        if match and int(match.group(2)) > threshold:
             result.append(file)
 
     return result
@@ -279,12 +371,7 @@ def extract_numbers_formatted(
     reg = registry if registry is not None else _get_registry()
 
     numbers = []
-    for file in files:
-        # 型チェック
-        if not isinstance(file, str):
-            continue
-
-        result = extract_file_number(file, registry=reg)
+    for result in extract_file_numbers(files, registry=reg):
         if result:
             prefix, num = result
             # Registry経由でプレフィックスからレベルを逆引き
@@ -306,6 +393,8 @@ __all__ = [
     "find_max_number",
     "filter_files_after",
     "extract_numbers_formatted",
+    "extract_file_numbers",
+    "partition_by_prefix",
     "set_registry",
     "reset_registry",
 ]
@@ -50,7 +50,7 @@ Architecture:
 """
 
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern
 
 from domain.constants import LEVEL_CONFIG
 from domain.error_formatter import get_error_formatter
@@ -90,6 +90,9 @@ class LevelRegistry:
         """
         self._levels: Dict[str, tuple[LevelMetadata, LevelBehavior]] = {}
         self._prefix_to_level: Dict[str, str] = {}
+        # プレフィックス正規表現のキャッシュ（_register() で無効化）
+        self._prefix_pattern: Optional[str] = None
+        self._file_number_regex: Optional[Pattern[str]] = None
         self._initialize_from_config()
 
     def _initialize_from_config(self) -> None:
@@ -144,6 +147,9 @@ class LevelRegistry:
         """
         self._levels[name] = (metadata, behavior)
         self._prefix_to_level[metadata.prefix] = name
+        # プレフィックス集合が変わるためキャッシュを無効化
+        self._prefix_pattern = None
+        self._file_number_regex = None
 
     def get_behavior(self, level: str) -> LevelBehavior:
         """
@@ -286,14 +292,40 @@ class LevelRegistry:
         Returns:
             正規表現パターン文字列（例: "MD|W|M|Q|A|T|D|C|L"）
 
+        Note:
+            結果はキャッシュされ、レベル登録時に無効化される。
+
         Example:
             >>> registry = get_level_registry()
             >>> pattern = registry.build_prefix_pattern()
             >>> 'MD|' in pattern  # MDが先頭付近
             True
         """
-        prefixes = self.get_all_prefixes()
-        return "|".join(re.escape(p) for p in prefixes)
+        if self._prefix_pattern is None:
+            prefixes = self.get_all_prefixes()
+            self._prefix_pattern = "|".join(re.escape(p) for p in prefixes)
+        return self._prefix_pattern
+
+    @property
+    def file_number_regex(self) -> Pattern[str]:
+        """
+        ファイル名から (プレフィックス, 番号) を抽出するコンパイル済み正規表現
+
+        build_prefix_pattern() の結果から一度だけコンパイルし、
+        レベル登録時に無効化される。group(1) がプレフィックス、group(2) が番号。
+
+        Returns:
+            コンパイル済み正規表現（プレフィックスのグループ + 数字列のグループ）
+
+        Example:
+            >>> registry = get_level_registry()
+            >>> match = registry.file_number_regex.search("W0001_weekly.txt")
+            >>> match.group(1), int(match.group(2))
+            ('W', 1)
+        """
+        if self._file_number_regex is None:
+            self._file_number_regex = re.compile(rf"({self.build_prefix_pattern()})(\d+)")
+        return self._file_number_regex
 
 
 # =============================================================================
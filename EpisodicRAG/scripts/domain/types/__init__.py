@@ -17,11 +17,13 @@ Note:
 # Metadata types
 # Config types
 from domain.types.config import (
+    ArchiveConfigData,
     ConfigData,
     DigestTimeData,
     DigestTimesData,
     LevelsConfigData,
     PathsConfigData,
+    StorageConfigData,
 )
 
 # Digest types
@@ -103,6 +105,8 @@ __all__ = [
     # Config
     "PathsConfigData",
     "LevelsConfigData",
+    "StorageConfigData",
+    "ArchiveConfigData",
     "ConfigData",
     "DigestTimeData",
     "DigestTimesData",
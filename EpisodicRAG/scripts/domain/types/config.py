@@ -35,6 +35,25 @@ class LevelsConfigData(TypedDict, total=False):
     centurial_threshold: int
 
 
+class StorageConfigData(TypedDict, total=False):
+    """
+    config.json の storage セクション
+    """
+
+    backend: str  # "json"（デフォルト）または "sqlite"
+    shadow_layout: str  # "single"（デフォルト）または "sharded"
+    shadow_delta_threshold: int  # 差分ログのコンパクションしきい値（バイト、0で無効）
+
+
+class ArchiveConfigData(TypedDict, total=False):
+    """
+    config.json の archive セクション
+    """
+
+    min_age_years: float  # これより古い処理済みファイルをアーカイブ（デフォルト: 2）
+    compression: str  # "lzma"（デフォルト）または "gzip"
+
+
 class ConfigData(TypedDict, total=False):
     """
     config.json の全体構造
@@ -43,6 +62,8 @@ class ConfigData(TypedDict, total=False):
     base_dir: str
     paths: PathsConfigData
     levels: LevelsConfigData
+    storage: StorageConfigData
+    archive: ArchiveConfigData
     trusted_external_paths: List[str]
 
 
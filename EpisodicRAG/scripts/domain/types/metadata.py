@@ -14,10 +14,13 @@ class BaseMetadata(TypedDict, total=False):
     共通メタデータフィールド
 
     すべてのダイジェストファイルで使用される基本メタデータ。
+    revision は GrandDigest / ShadowGrandDigest の保存ごとに1ずつ増える
+    （楽観的並行制御用、旧ファイルでは欠落しており 0 とみなす）。
     """
 
     version: str
     last_updated: str
+    revision: int
 
 
 class DigestMetadata(BaseMetadata, total=False):
@@ -26,6 +26,9 @@ Usage:
         log_info,
         log_warning,
         log_error,
+        # File locking
+        shared_lock,
+        exclusive_lock,
     )
 """
 
@@ -37,6 +40,11 @@ from infrastructure.error_handling import (
     safe_file_operation,
     with_error_context,
 )
+from infrastructure.file_lock import (
+    exclusive_lock,
+    get_lock_manager,
+    shared_lock,
+)
 from infrastructure.file_scanner import (
     count_files,
     filter_files_after_number,
@@ -69,6 +77,7 @@ from infrastructure.logging_config import (
 from infrastructure.structured_logging import (
     StructuredLogger,
     get_structured_logger,
+    lazy,
 )
 
 # User Interaction
@@ -84,6 +93,10 @@ __all__ = [
     "try_load_json",
     "confirm_file_overwrite",
     "try_read_json_from_file",
+    # File Lock
+    "shared_lock",
+    "exclusive_lock",
+    "get_lock_manager",
     # File Scanner
     "scan_files",
     "get_files_by_pattern",
@@ -100,6 +113,7 @@ __all__ = [
     # Structured Logging
     "StructuredLogger",
     "get_structured_logger",
+    "lazy",
     # User Interaction
     "get_default_confirm_callback",
     # Error Handling
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache
+==============
+
+診断CLI（digest_auto / digest_readiness / shadow_state_checker / digest_entry）の
+分析結果を、入力ファイルのフィンガープリントと共に Essences 配下へ永続化する
+インフラストラクチャ層モジュール。
+
+1回の /digest の流れでは、これらの CLI が別プロセスとして続けて呼ばれ、
+そのたびに config.json を読み、パスを解決し、ShadowGrandDigest を読み直していた。
+入力が変わっていなければ、前回の結果をそのまま返す。
+
+    Essences/
+        .analysis_cache/
+            AnalysisCache.json     # {"version": 1, "entries": {key: {fingerprint, value}}}
+
+## 設計意図
+
+ARCHITECTURE: Fingerprinted Cache + Write-Invalidate
+- フィンガープリントは入力パスごとの (st_mtime_ns, st_size)（ディレクトリは
+  エントリの追加・削除で mtime が変わる）と EPISODIC_RAG_* 環境変数のハッシュ。
+  他プロセスの書き込みもこれで検出される
+- 永続化層（save_json / save_bytes / AppendOnlyJournal / SqliteDigestStore）は
+  書き込みのたびにキャッシュを削除する
+  （infrastructure.json_repository.invalidation.invalidate_analysis_cache）
+- 更新直後（RACY_WINDOW_NS 以内）の入力がある場合はフィンガープリントを作らず、
+  キャッシュを読みも書きもしない（mtime が同じまま書き換わり得るため）
+- 値は JSON 互換であること。結果型との変換は呼び出し側が行う
+- キャッシュの読み書きの失敗は分析を止めない（次回に再計算されるだけ）
+
+Usage:
+    from infrastructure.analysis_cache import AnalysisCache, shadow_inputs
+
+    cache = AnalysisCache(essences_path)
+    fingerprint = cache.fingerprint([config_file, *shadow_inputs(essences_path)])
+    value = cache.get("shadow_state:weekly", fingerprint)
+    if value is None:
+        value = compute()
+        cache.put("shadow_state:weekly", fingerprint, value)
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from domain.exceptions import FileIOError
+from domain.file_constants import (
+    ANALYSIS_CACHE_DIRNAME,
+    ANALYSIS_CACHE_FILENAME,
+    SHADOW_DELTA_LOG_FILENAME,
+    SHADOW_GRAND_DIGEST_FILENAME,
+    SHADOW_SHARD_DIRNAME,
+    SHARD_INDEX_FILENAME,
+    STORAGE_DB_FILENAME,
+)
+from infrastructure.file_index import RACY_WINDOW_NS
+from infrastructure.json_repository import save_json, track_analysis_cache, try_load_json
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "ANALYSIS_CACHE_VERSION",
+    "AnalysisCache",
+    "shadow_inputs",
+    "storage_inputs",
+]
+
+T = TypeVar("T")
+
+# キャッシュ形式のバージョン（値の形が変わったら上げる）
+ANALYSIS_CACHE_VERSION = 1
+
+# フィンガープリントに含める環境変数のプレフィックス（保存先・レイアウトの切り替え等）
+_ENV_PREFIXES = ("EPISODIC_RAG_", "EPISODICRAG_")
+
+
+def storage_inputs(essences_path: Path) -> Tuple[Path, ...]:
+    """
+    SQLite バックエンドのファイル（DB 本体と WAL）
+
+    Example:
+        >>> [p.name for p in storage_inputs(Path("/data/Essences"))]
+        ['EpisodicRAG.db', 'EpisodicRAG.db-wal']
+    """
+    db = essences_path / STORAGE_DB_FILENAME
+    return (db, db.with_name(db.name + "-wal"))
+
+
+def shadow_inputs(essences_path: Path) -> Tuple[Path, ...]:
+    """
+    ShadowGrandDigest の内容を決めるファイル（単一ファイル・差分ログ・分割レイアウト・SQLite）
+
+    Example:
+        >>> [p.name for p in shadow_inputs(Path("/data/Essences"))][:2]
+        ['ShadowGrandDigest.txt', 'ShadowGrandDigest.delta.jsonl']
+    """
+    shards = essences_path / SHADOW_SHARD_DIRNAME
+    return (
+        essences_path / SHADOW_GRAND_DIGEST_FILENAME,
+        essences_path / SHADOW_DELTA_LOG_FILENAME,
+        shards,
+        shards / SHARD_INDEX_FILENAME,
+        *storage_inputs(essences_path),
+    )
+
+
+class AnalysisCache:
+    """
+    Essences/.analysis_cache/AnalysisCache.json に保存される分析結果のキャッシュ
+
+    Attributes:
+        essences_path: Essences ディレクトリのパス
+        cache_file: キャッシュファイルのパス
+    """
+
+    def __init__(self, essences_path: Path):
+        """
+        Args:
+            essences_path: Essences ディレクトリのパス
+        """
+        self.essences_path = essences_path
+        self.cache_file = essences_path / ANALYSIS_CACHE_DIRNAME / ANALYSIS_CACHE_FILENAME
+        track_analysis_cache(self.cache_file)
+
+    def fingerprint(self, inputs: Iterable[Path]) -> Optional[str]:
+        """
+        入力のフィンガープリント
+
+        Args:
+            inputs: 結果が依存するファイル・ディレクトリ（存在しないものも可）
+
+        Returns:
+            フィンガープリント。更新直後の入力がある場合は None（キャッシュしない）
+
+        Example:
+            >>> cache.fingerprint([config_file, loops_path])
+            '3f2a...'
+        """
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        parts = []
+        for path in inputs:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                parts.append(f"{path}\0-")
+                continue
+            if stat.st_mtime_ns >= racy_after:
+                return None
+            parts.append(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}")
+        parts.extend(
+            f"{name}={value}"
+            for name, value in sorted(os.environ.items())
+            if name.startswith(_ENV_PREFIXES)
+        )
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        key: str,
+        fingerprint: Optional[str],
+        decode: Optional[Callable[[Any], T]] = None,
+    ) -> Optional[Any]:
+        """
+        フィンガープリントが一致する保存済みの値
+
+        Args:
+            key: 分析の種類（"shadow_state:weekly" 等）
+            fingerprint: fingerprint() の結果
+            decode: 保存済みの値を結果型に変換する関数。変換できない
+                （TypeError / KeyError / ValueError、古い形式の値等）場合は None を返す
+
+        Returns:
+            保存済みの値またはその変換結果（なければ・一致しなければ None）
+
+        Example:
+            >>> cache.get("shadow_state:weekly", fingerprint, lambda v: ShadowStateResult(**v))
+            ShadowStateResult(status='ok', level='weekly', ...)
+        """
+        if fingerprint is None:
+            return None
+        entry = self._entries().get(key)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            log_debug(f"analysis cache miss: {key}")
+            return None
+        value = entry.get("value")
+        if decode is not None and value is not None:
+            try:
+                value = decode(value)
+            except (TypeError, KeyError, ValueError) as e:
+                log_debug(f"analysis cache entry ignored: {key} ({e})")
+                return None
+        log_debug(f"analysis cache hit: {key}")
+        return value
+
+    def put(self, key: str, fingerprint: Optional[str], value: Any) -> None:
+        """
+        値を保存（fingerprint が None、または Essences がなければ何もしない）
+
+        fingerprint は値を計算する前に取ったものを渡す。計算中に入力が
+        変更された場合、保存した値は次回の get で一致しない。
+
+        Args:
+            key: 分析の種類
+            fingerprint: 計算前に取った fingerprint() の結果
+            value: JSON 互換の値
+        """
+        if fingerprint is None or not self.essences_path.is_dir():
+            return
+        entries = self._entries()
+        entries[key] = {"fingerprint": fingerprint, "value": value}
+        try:
+            # 再計算できるキャッシュなので fast モード（壊れていれば _entries が空とみなす）
+            save_json(
+                self.cache_file,
+                {"version": ANALYSIS_CACHE_VERSION, "entries": entries},
+                compact=True,
+                atomic=False,
+            )
+        except FileIOError as e:
+            log_debug(f"analysis cache write failed: {e}")
+
+    def _entries(self) -> Dict[str, Any]:
+        """保存済みのエントリ（ファイルがない・形式が違う場合は空）"""
+        data = try_load_json(self.cache_file, log_on_error=False)
+        if not data or data.get("version") != ANALYSIS_CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Cold-tier Archive
+=================
+
+古い Loop / RegularDigest を期間ごとの圧縮バンドル（tar.xz / tar.gz）に
+まとめて保存し、元のパスのまま読めるようにするインフラストラクチャ層モジュール。
+
+    Loops/
+        L00500_最近の会話.txt
+        .archive/
+            index.json          # メンバー索引（ファイル名 → バンドル、元のサイズ・mtime）
+            2023.tar.xz         # 2023年のファイル
+            2024.tar.xz
+
+## 設計意図
+
+ARCHITECTURE: Cold Tier + Member Index
+- バンドルは標準の tar（lzma / gzip 圧縮）。tar コマンドでも展開できる
+- index.json でメンバーの所在が分かるため、読み込み時にバンドルを走査しない
+- 同じ期間のバンドルへの追加は、既存メンバーと合わせて書き直す
+  （圧縮 tar は追記できない）。書き込み順は バンドル → 索引 → 元ファイル削除 で、
+  途中で落ちても元ファイルか索引のどちらかから読める
+- 読み込み時は展開したバンドルを少数だけメモリに保持する（同じ期間の
+  ファイルを続けて読むバッチ処理で、展開が1回で済む）
+- 索引には元ファイルの (st_mtime_ns, st_size) を記録し、アーカイブ後も
+  検索インデックス等のシグネチャが変わらないようにする
+
+Usage:
+    from infrastructure.archive import archive_members, read_archived_bytes
+
+    archive_members(loops_path, {"2023": [path1, path2]}, compression="lzma")
+    read_archived_bytes(loops_path / "L00001_古い会話.txt")   # バンドルから読む
+
+    # try_read_json_from_file は元のパスにファイルがなければアーカイブを読む
+"""
+
+import io
+import os
+import tarfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, cast
+
+from domain.constants import LOG_PREFIX_FILE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError
+from domain.file_constants import ARCHIVE_DIRNAME, ARCHIVE_INDEX_FILENAME
+from infrastructure.file_lock import exclusive_lock
+from infrastructure.json_repository import json_loads, save_bytes, save_json
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "ARCHIVE_COMPRESSIONS",
+    "ArchiveStats",
+    "archive_dir_for",
+    "archive_members",
+    "archived_names",
+    "archived_signature",
+    "archive_stats",
+    "read_archived_bytes",
+    "read_archived_json",
+    "reset_archive_cache",
+]
+
+# 圧縮方式 → (tarfile のモード接尾辞, バンドルの拡張子)
+ARCHIVE_COMPRESSIONS: Dict[str, Tuple[str, str]] = {
+    "lzma": ("xz", ".tar.xz"),
+    "gzip": ("gz", ".tar.gz"),
+}
+
+# 索引形式のバージョン
+ARCHIVE_INDEX_VERSION = 1
+
+# 展開済みバンドルを保持する数
+_BUNDLE_CACHE_SIZE = 2
+
+_Signature = Tuple[int, int]
+
+
+@dataclass
+class ArchiveStats:
+    """1ディレクトリ分のアーカイブの集計"""
+
+    bundles: int = 0
+    members: int = 0
+    original_bytes: int = 0
+    archived_bytes: int = 0
+    by_bundle: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def saved_bytes(self) -> int:
+        """削減できたバイト数"""
+        return self.original_bytes - self.archived_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON出力用の辞書に変換"""
+        return {**asdict(self), "saved_bytes": self.saved_bytes}
+
+
+def archive_dir_for(directory: Path) -> Path:
+    """ディレクトリのアーカイブ置き場（<directory>/.archive）"""
+    return directory / ARCHIVE_DIRNAME
+
+
+class _ArchiveCache:
+    """索引と展開済みバンドルのキャッシュ（ファイルの mtime/size で検証）"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: Dict[Path, Tuple[_Signature, Dict[str, Any]]] = {}
+        self._bundles: "OrderedDict[Path, Tuple[_Signature, Dict[str, bytes]]]" = OrderedDict()
+
+    def index(self, directory: Path) -> Dict[str, Any]:
+        path = archive_dir_for(directory) / ARCHIVE_INDEX_FILENAME
+        signature = _stat_signature(path)
+        if signature is None:
+            return {}
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        try:
+            data = json_loads(path.read_bytes())
+        except (OSError, ValueError):
+            log_debug(f"{LOG_PREFIX_FILE} archive index unreadable: {path}")
+            return {}
+        if not isinstance(data, dict) or not isinstance(data.get("members"), dict):
+            return {}
+        with self._lock:
+            self._indexes[path] = (signature, data)
+        return data
+
+    def bundle(self, path: Path, compression: str) -> Dict[str, bytes]:
+        signature = _stat_signature(path)
+        if signature is None:
+            return {}
+        with self._lock:
+            cached = self._bundles.get(path)
+            if cached is not None and cached[0] == signature:
+                self._bundles.move_to_end(path)
+                return cached[1]
+        members = _read_bundle(path, compression)
+        with self._lock:
+            self._bundles[path] = (signature, members)
+            while len(self._bundles) > _BUNDLE_CACHE_SIZE:
+                self._bundles.popitem(last=False)
+        return members
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._bundles.clear()
+
+
+_cache = _ArchiveCache()
+
+
+def reset_archive_cache() -> None:
+    """キャッシュを破棄（テスト用）"""
+    _cache.clear()
+
+
+def _stat_signature(path: Path) -> Optional[_Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _mode_suffix(compression: str) -> str:
+    if compression not in ARCHIVE_COMPRESSIONS:
+        formatter = get_error_formatter()
+        raise ConfigError(
+            formatter.config.config_invalid_value(
+                "archive.compression", " or ".join(ARCHIVE_COMPRESSIONS), compression
+            )
+        )
+    return ARCHIVE_COMPRESSIONS[compression][0]
+
+
+def _read_bundle(path: Path, compression: str) -> Dict[str, bytes]:
+    """バンドルを展開して {メンバー名: 内容} を返す"""
+    members: Dict[str, bytes] = {}
+    mode = cast(Literal["r:xz", "r:gz"], f"r:{_mode_suffix(compression)}")
+    with tarfile.open(path, mode) as tar:
+        for info in tar:
+            if not info.isfile():
+                continue
+            extracted = tar.extractfile(info)
+            if extracted is not None:
+                members[info.name] = extracted.read()
+    log_debug(f"{LOG_PREFIX_FILE} archive bundle loaded: {path.name} ({len(members)} members)")
+    return members
+
+
+def _write_bundle(
+    path: Path,
+    compression: str,
+    contents: Mapping[str, bytes],
+    mtimes: Mapping[str, int],
+) -> None:
+    """メンバーを名前順に圧縮 tar としてアトミックに書き込む"""
+    buffer = io.BytesIO()
+    mode = cast(Literal["w:xz", "w:gz"], f"w:{_mode_suffix(compression)}")
+    with tarfile.open(fileobj=buffer, mode=mode) as tar:
+        for name in sorted(contents):
+            data = contents[name]
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = mtimes.get(name, 0) // 1_000_000_000
+            tar.addfile(info, io.BytesIO(data))
+    save_bytes(path, buffer.getvalue())
+
+
+def archived_names(directory: Path) -> List[str]:
+    """アーカイブ済みのファイル名（名前順）"""
+    return sorted(_cache.index(directory).get("members", {}))
+
+
+def archived_signature(path: Path) -> Optional[_Signature]:
+    """
+    アーカイブ済みファイルの元の (st_mtime_ns, st_size)
+
+    Returns:
+        アーカイブされていなければNone
+    """
+    entry = _cache.index(path.parent).get("members", {}).get(path.name)
+    if not isinstance(entry, dict):
+        return None
+    return (int(entry.get("mtime_ns", 0)), int(entry.get("size", 0)))
+
+
+def read_archived_bytes(path: Path) -> Optional[bytes]:
+    """
+    アーカイブ済みファイルの内容を読む
+
+    Args:
+        path: 元のファイルパス（<directory>/<ファイル名>）
+
+    Returns:
+        ファイルの内容、アーカイブされていなければNone
+    """
+    index = _cache.index(path.parent)
+    entry = index.get("members", {}).get(path.name)
+    if not isinstance(entry, dict):
+        return None
+    bundle_name = str(entry.get("bundle", ""))
+    bundle_meta = index.get("bundles", {}).get(bundle_name, {})
+    compression = str(bundle_meta.get("compression", "lzma"))
+    bundle_path = archive_dir_for(path.parent) / bundle_name
+    try:
+        return _cache.bundle(bundle_path, compression).get(path.name)
+    except (OSError, tarfile.TarError, EOFError) as e:
+        log_debug(f"{LOG_PREFIX_FILE} archive bundle unreadable: {bundle_path}: {e}")
+        return None
+
+
+def read_archived_json(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    アーカイブ済みファイルを JSON として読む
+
+    Returns:
+        読み込んだ dict、アーカイブされていない・JSONでなければNone
+    """
+    data = read_archived_bytes(path)
+    if data is None:
+        return None
+    try:
+        result = json_loads(data)
+    except ValueError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def archive_members(
+    directory: Path,
+    files_by_period: Mapping[str, Sequence[Path]],
+    compression: str = "lzma",
+    remove_source: bool = True,
+) -> ArchiveStats:
+    """
+    ファイルを期間ごとのバンドルへ移す
+
+    Args:
+        directory: 対象ディレクトリ（ファイルはこの直下にあること）
+        files_by_period: 期間名（バンドル名の元、例: "2023"）→ ファイル
+        compression: "lzma" または "gzip"
+        remove_source: アーカイブ後に元ファイルを削除するか
+
+    Returns:
+        今回書き込んだバンドルの集計
+
+    Raises:
+        ConfigError: 未知の圧縮方式が指定された場合
+        FileIOError: バンドル・索引の書き込みに失敗した場合
+    """
+    _mode_suffix(compression)
+    extension = ARCHIVE_COMPRESSIONS[compression][1]
+    archive_dir = archive_dir_for(directory)
+    index_path = archive_dir / ARCHIVE_INDEX_FILENAME
+    stats = ArchiveStats()
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    with exclusive_lock(index_path):
+        index = dict(_cache.index(directory)) or {"version": ARCHIVE_INDEX_VERSION}
+        members: Dict[str, Any] = dict(index.get("members", {}))
+        bundles: Dict[str, Any] = dict(index.get("bundles", {}))
+        archived: List[Path] = []
+
+        for period, files in sorted(files_by_period.items()):
+            if not files:
+                continue
+            bundle_name = f"{period}{extension}"
+            bundle_path = archive_dir / bundle_name
+            previous = bundles.get(bundle_name, {})
+            contents: Dict[str, bytes] = {}
+            if previous:
+                contents.update(_read_bundle(bundle_path, str(previous["compression"])))
+            mtimes = {
+                name: int(entry.get("mtime_ns", 0))
+                for name, entry in members.items()
+                if entry.get("bundle") == bundle_name
+            }
+            for path in files:
+                stat = path.stat()
+                contents[path.name] = path.read_bytes()
+                mtimes[path.name] = stat.st_mtime_ns
+                members[path.name] = {
+                    "bundle": bundle_name,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+                archived.append(path)
+
+            _write_bundle(bundle_path, compression, contents, mtimes)
+            original = sum(len(data) for data in contents.values())
+            bundles[bundle_name] = {
+                "compression": compression,
+                "members": len(contents),
+                "original_bytes": original,
+                "archived_bytes": bundle_path.stat().st_size,
+            }
+            stats.bundles += 1
+            stats.members += len(contents)
+            stats.original_bytes += original
+            stats.archived_bytes += bundles[bundle_name]["archived_bytes"]
+            stats.by_bundle[bundle_name] = dict(bundles[bundle_name])
+            stats.by_bundle[bundle_name].pop("compression")
+
+        index.update(members=members, bundles=bundles)
+        save_json(index_path, index, compact=True)
+
+    if remove_source:
+        for path in archived:
+            path.unlink(missing_ok=True)
+    log_debug(
+        f"{LOG_PREFIX_FILE} archived {len(archived)} files in {directory}: "
+        f"{stats.original_bytes} -> {stats.archived_bytes} bytes"
+    )
+    return stats
+
+
+def archive_stats(directory: Path) -> ArchiveStats:
+    """
+    ディレクトリのアーカイブ全体の集計（索引のみ読む）
+
+    Example:
+        >>> archive_stats(loops_path).saved_bytes
+        10485760
+    """
+    stats = ArchiveStats()
+    for name, meta in _cache.index(directory).get("bundles", {}).items():
+        stats.bundles += 1
+        stats.members += int(meta.get("members", 0))
+        stats.original_bytes += int(meta.get("original_bytes", 0))
+        stats.archived_bytes += int(meta.get("archived_bytes", 0))
+        stats.by_bundle[name] = {
+            k: int(v) for k, v in meta.items() if k != "compression" and isinstance(v, int)
+        }
+    return stats
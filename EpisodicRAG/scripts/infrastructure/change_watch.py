@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Change Watch
+============
+
+ディレクトリの変更を待つインフラストラクチャ層モジュール（digest_auto --watch 用）。
+
+Linux では ctypes 経由の inotify で変更を待ち、使えない環境（macOS・Windows・
+inotify の上限超過など）では一定間隔のポーリングに切り替える。
+
+## 設計意図
+
+ARCHITECTURE: Wake-up Only
+- ChangeWatcher は「何か変わったかもしれない」ことを知らせるだけで、
+  何が変わったかは呼び出し側が mtime で判定する
+  （interfaces.workspace_snapshot.WorkspaceSnapshot.refresh）
+- inotify でも wait() は interval で必ず戻る。監視開始時に存在しなかった
+  ディレクトリの作成や、監視を追加できなかったディレクトリの変更も
+  ポーリングと同じ間隔で検出される
+- 外部依存なし（ctypes / select のみ）
+
+Usage:
+    from infrastructure.change_watch import ChangeWatcher
+
+    with ChangeWatcher([loops_path, essences_path], interval=1.0) as watcher:
+        while True:
+            watcher.wait()
+            snapshot, changed = snapshot.refresh()
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterable, List, Optional, Type
+
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "ChangeWatcher",
+    "WATCH_BACKEND_INOTIFY",
+    "WATCH_BACKEND_POLL",
+]
+
+WATCH_BACKEND_INOTIFY = "inotify"
+WATCH_BACKEND_POLL = "poll"
+
+# inotify のイベントマスク（<sys/inotify.h>）
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+# 連続した書き込み（一時ファイル作成 → rename 等）をまとめるための待ち時間（秒）
+_DEBOUNCE_SEC = 0.05
+
+
+def _load_libc() -> Optional[Any]:
+    """inotify 関数を持つ libc（使えなければ None）"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class ChangeWatcher:
+    """
+    ディレクトリの変更を待つ（inotify、使えなければポーリング）
+
+    Attributes:
+        interval: wait() が最長で待つ秒数
+        backend: "inotify" または "poll"
+    """
+
+    def __init__(
+        self, directories: Iterable[Path], interval: float = 1.0, backend: Optional[str] = None
+    ):
+        """
+        Args:
+            directories: 監視するディレクトリ（存在しないものは無視）
+            interval: wait() が最長で待つ秒数
+            backend: "inotify" / "poll"（None なら使えれば inotify）
+        """
+        self.interval = interval
+        self._fd: Optional[int] = None
+        self._directories = [Path(d) for d in directories]
+        if backend != WATCH_BACKEND_POLL:
+            self._fd = self._open_inotify(self._directories)
+        self.backend = WATCH_BACKEND_INOTIFY if self._fd is not None else WATCH_BACKEND_POLL
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        変更があるか timeout（省略時は interval）秒が経つまで待つ
+
+        Returns:
+            inotify で変更を受け取った場合True（ポーリング・タイムアウトはFalse）
+        """
+        timeout = self.interval if timeout is None else timeout
+        if self._fd is None:
+            time.sleep(timeout)
+            return False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        time.sleep(_DEBOUNCE_SEC)
+        self._drain()
+        return True
+
+    def close(self) -> None:
+        """inotify のファイルディスクリプタを閉じる"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "ChangeWatcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _drain(self) -> None:
+        """溜まったイベントを読み捨てる（内容は使わない）"""
+        if self._fd is None:
+            return
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    return
+            except BlockingIOError:
+                return
+
+    @staticmethod
+    def _open_inotify(directories: List[Path]) -> Optional[int]:
+        """inotify を初期化して各ディレクトリを登録（失敗したら None）"""
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            log_debug(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return None
+        watched = 0
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+                log_debug(
+                    f"inotify_add_watch failed for {directory}: {os.strerror(ctypes.get_errno())}"
+                )
+                continue
+            watched += 1
+        if watched == 0:
+            os.close(fd)
+            return None
+        return fd
@@ -26,6 +26,7 @@ from infrastructure.config.error_messages import (
     file_not_found_message,
     invalid_json_message,
 )
+from infrastructure.json_repository.codec import json_loads
 
 
 class ConfigLoader:
@@ -111,7 +112,7 @@ class ConfigLoader:
 
         try:
             with open(self.config_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = json_loads(f.read())
         except json.JSONDecodeError as e:
             raise ConfigError(invalid_json_message(self.config_file, e)) from e
 
@@ -12,6 +12,7 @@ from pathlib import Path
 from domain.exceptions import ConfigError
 from domain.types import ConfigData
 from infrastructure.config.error_messages import file_not_found_message, invalid_json_message
+from infrastructure.json_repository.codec import json_loads
 
 
 def load_config(config_file: Path) -> ConfigData:
@@ -37,7 +38,7 @@ def load_config(config_file: Path) -> ConfigData:
 
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
-            data: ConfigData = json.load(f)
+            data: ConfigData = json_loads(f.read())
             return data
     except json.JSONDecodeError as e:
         raise ConfigError(invalid_json_message(config_file, e)) from e
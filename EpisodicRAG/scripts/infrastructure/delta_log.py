@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Delta Log
+=========
+
+JSON 文書への変更を JSON Patch（RFC 6902）の操作として追記する差分ログ。
+文書全体を書き直す代わりに変更分だけを追記し、読み込み時に
+「ベースのファイル + 差分」を合成する。
+
+    Essences/
+        ShadowGrandDigest.txt               # ベース（metadata.revision = 12）
+        ShadowGrandDigest.delta.jsonl       # {"rev": 13, "at": ..., "ops": [...]}
+                                            # {"rev": 14, "at": ..., "ops": [...]}
+
+## 設計意図
+
+ARCHITECTURE: Base + Delta Log (LSM 風)
+- 1行 = 1回の変更（revision と操作列）。追記は AppendOnlyJournal（fsync 付き）
+- 各行の rev は適用後の文書の revision。合成時はベースの revision より大きい行だけを
+  適用するため、コンパクション（ベースの書き直し → ログの truncate）の途中で
+  落ちても二重適用にならない
+- コンパクションの判断（ログのサイズがしきい値を超えたら等）と、ベースとの
+  ロックの取り方は呼び出し側（ShadowIO）が決める
+- 有効化は環境変数 EPISODIC_RAG_SHADOW_DELTA_THRESHOLD または
+  config.json の storage.shadow_delta_threshold（コンパクションするログのバイト数。
+  0 で無効、既定は無効）
+
+Usage:
+    from infrastructure.delta_log import DeltaLog
+
+    log = DeltaLog(essences / "ShadowGrandDigest.delta.jsonl")
+    log.append(13, [{"op": "add", "path": "/files/-", "value": "L00186.txt"}])
+    document = log.apply(base)          # revision 12 のベースに rev 13 を適用
+    log.truncate()                      # ベースに書き戻した後
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from domain.constants import LOG_PREFIX_STATE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError
+from infrastructure.journal import AppendOnlyJournal
+from infrastructure.json_patch import apply_patch
+from infrastructure.logging_config import log_debug
+from infrastructure.revision import REVISION_KEY, get_revision
+
+__all__ = ["DEFAULT_SHADOW_DELTA_THRESHOLD", "DeltaLog", "resolve_delta_threshold"]
+
+# 差分ログを使わない（従来どおり毎回ベースを書き直す）
+DEFAULT_SHADOW_DELTA_THRESHOLD = 0
+
+
+def resolve_delta_threshold(config: Optional[Mapping[str, Any]] = None) -> int:
+    """
+    Shadow の差分ログのコンパクションしきい値（バイト数）を決定
+
+    環境変数 EPISODIC_RAG_SHADOW_DELTA_THRESHOLD が設定されていれば優先し、
+    なければ config.json の storage.shadow_delta_threshold、どちらもなければ 0（無効）。
+
+    Raises:
+        ConfigError: 0 以上の整数でない場合
+
+    Example:
+        >>> resolve_delta_threshold({"storage": {"shadow_delta_threshold": 65536}})
+        65536
+    """
+    value: Any = os.environ.get("EPISODIC_RAG_SHADOW_DELTA_THRESHOLD")
+    if not value:
+        storage = (config or {}).get("storage")
+        value = storage.get("shadow_delta_threshold") if isinstance(storage, Mapping) else None
+    if value is None:
+        return DEFAULT_SHADOW_DELTA_THRESHOLD
+    try:
+        threshold = int(value)
+    except (TypeError, ValueError):
+        threshold = -1
+    if isinstance(value, bool) or threshold < 0:
+        formatter = get_error_formatter()
+        raise ConfigError(
+            formatter.config.config_invalid_value(
+                "storage.shadow_delta_threshold", "integer >= 0", value
+            )
+        )
+    return threshold
+
+
+class DeltaLog:
+    """
+    JSON Patch の操作を追記する差分ログ
+
+    Attributes:
+        path: ログファイルのパス
+
+    Example:
+        >>> log = DeltaLog(Path("Essences/ShadowGrandDigest.delta.jsonl"))
+        >>> log.append(1, [{"op": "replace", "path": "/n", "value": 2}])
+        >>> log.apply({"metadata": {"revision": 0}, "n": 1})
+        {'metadata': {'revision': 1}, 'n': 2}
+    """
+
+    def __init__(self, path: Path):
+        self._journal = AppendOnlyJournal(path)
+
+    @property
+    def path(self) -> Path:
+        """ログファイルのパス"""
+        return self._journal.path
+
+    def has_records(self) -> bool:
+        """未コンパクションの差分があるか（ファイルサイズのみ確認）"""
+        return self.size() > 0
+
+    def size(self) -> int:
+        """ログのバイト数（ファイルがなければ 0）"""
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def append(self, revision: int, operations: Sequence[Mapping[str, Any]]) -> None:
+        """
+        1回の変更を追記（fsync 後に戻る）
+
+        Args:
+            revision: 適用後の文書の revision
+            operations: JSON Patch の操作
+
+        Raises:
+            FileIOError: 書き込みに失敗した場合
+        """
+        self._journal.append(
+            {"rev": revision, "at": datetime.now().isoformat(), "ops": list(operations)}
+        )
+
+    def records(self) -> List[Dict[str, Any]]:
+        """全レコード（追記順、書き込み途中の行は除く）"""
+        return self._journal.read()
+
+    def last_revision(self) -> int:
+        """最後のレコードの revision（なければ 0）"""
+        records = self.records()
+        return int(records[-1].get("rev", 0)) if records else 0
+
+    def apply(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ベースの revision より新しいレコードを順に適用
+
+        Args:
+            document: ベースの文書（その場で変更される）
+
+        Returns:
+            合成後の文書（metadata.revision は最後に適用したレコードの rev）
+
+        Raises:
+            ValidationError: 操作を適用できない場合（ログとベースの不整合）
+        """
+        if not self.has_records():
+            return document
+        base_revision = get_revision(document)
+        applied = 0
+        for record in self.records():
+            revision = int(record.get("rev", 0))
+            if revision <= base_revision:
+                continue
+            document = apply_patch(document, record.get("ops") or [])
+            document.setdefault("metadata", {})[REVISION_KEY] = revision
+            applied += 1
+        if applied:
+            log_debug(f"{LOG_PREFIX_STATE} delta log applied: {self.path.name} ({applied} records)")
+        return document
+
+    def truncate(self) -> None:
+        """ログを空にする（ベースへの書き戻し後に呼ぶ）"""
+        self._journal.truncate()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Digest Headers
+==============
+
+Loop / RegularDigest の「ヘッダー」（metadata と overall_digest）だけを読む
+インフラストラクチャ層モジュール。
+
+ProvisionalLoader（individual_digests の自動生成）や FileAppender（Digest 内容のログ）は
+overall_digest しか使わないが、RegularDigest には数百件の individual_digests が続くため、
+ファイル全体のパースが処理時間の大半を占めていた。
+
+## 設計意図
+
+ARCHITECTURE: Partial Reader + Sidecar Header Index
+- read_json_header: トップレベルのキーを先頭から順に読み、必要なキーが
+  揃った時点で読み込みをやめる。ファイルはチャンク単位で読むため、
+  RegularDigest（metadata → overall_digest → individual_digests の順）では
+  本体を読まずに済む
+- DigestHeaderIndex: ディレクトリごとに「ファイル名 → (シグネチャ, ヘッダー,
+  本体の開始位置)」を永続化する。シグネチャ (st_ino, st_mtime_ns, st_size) が
+  一致すればファイルを開かない。save_json はアトミックな rename で書き込むため、
+  書き換えれば inode が変わる
+- 索引は対象ディレクトリの親の `.digest_headers/` に保存する（対象ディレクトリに
+  書き込むと、その mtime を使う infrastructure.file_index が無効になるため）。
+  `.gitignore` を置いて git の同期対象から外し、索引には絶対パスではなく
+  ディレクトリ名のみを記録する
+- 更新直後（RACY_WINDOW_NS 以内）のファイルは mtime が同じまま書き換わり得るため
+  索引に載せず、毎回読む
+- ファイルがなければ .archive/ の圧縮バンドルから全体を読んでヘッダーを取り出す
+  （infrastructure.archive。索引には載せない）
+
+## 注意
+
+部分読み込みは必要なキーより後ろを検証しない。ヘッダーの後ろだけが壊れた
+ファイルも、ヘッダーは読める。
+
+Usage:
+    from infrastructure.digest_headers import get_header_index, read_digest_header
+
+    header = read_digest_header(weekly_dir / "W0001_設計.txt")
+    header["overall_digest"]["abstract"]
+
+    index = get_header_index(weekly_dir)
+    for name in names:
+        index.get(name)
+    index.flush()   # 新たに読んだヘッダーを保存
+"""
+
+import codecs
+import copy
+import hashlib
+import logging
+import os
+import re
+import time
+from json import JSONDecodeError, JSONDecoder
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Sequence, Tuple
+
+from domain.constants import DIGEST_FILE_EXTENSION
+from infrastructure.json_repository import (
+    ensure_cache_directory,
+    safe_read_json,
+    save_json,
+    try_read_json_from_file,
+)
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "DigestHeaderIndex",
+    "HEADER_INDEX_DIR_NAME",
+    "HEADER_KEYS",
+    "get_header_index",
+    "read_digest_header",
+    "read_json_header",
+    "reset_header_indexes",
+]
+
+logger = logging.getLogger("episodic_rag")
+
+# ヘッダーとして読むトップレベルのキー
+HEADER_KEYS: Tuple[str, ...] = ("metadata", "overall_digest")
+
+# 索引の保存ディレクトリ名（対象ディレクトリの親に作成）
+HEADER_INDEX_DIR_NAME = ".digest_headers"
+
+# 索引形式のバージョン
+HEADER_INDEX_VERSION = 2
+
+# 更新直後とみなす時間幅（ナノ秒）
+RACY_WINDOW_NS = 50_000_000
+
+# 1回に読むバイト数
+_CHUNK_SIZE = 16 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = JSONDecoder()
+
+# (st_ino, st_mtime_ns, st_size)
+_Signature = Tuple[int, int, int]
+
+
+class _ChunkedText:
+    """ファイルを UTF-8 テキストとして必要な分だけ読み進めるバッファ"""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.eof = False
+
+    def more(self) -> bool:
+        """次のチャンクを読む（EOF なら False）"""
+        if self.eof:
+            return False
+        chunk = self._stream.read(_CHUNK_SIZE)
+        self.eof = not chunk
+        self.text += self._decoder.decode(chunk, final=self.eof)
+        return True
+
+    def skip_whitespace(self, pos: int) -> int:
+        """pos から空白を読み飛ばし、次の文字の位置を返す（足りなければ読み進める）"""
+        while True:
+            end = _WHITESPACE.match(self.text, pos).end()  # type: ignore[union-attr]
+            if end < len(self.text) or not self.more():
+                return end
+
+    def decode(self, pos: int) -> Tuple[Any, int]:
+        """pos から JSON 値を1つ読む（値の直後の文字まで読めていなければ読み進める）"""
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, pos)
+            except JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # 数値・リテラルがチャンク境界で切れていないことを確認
+            if end < len(self.text) or not self.more():
+                return value, end
+
+
+def read_json_header(
+    file_path: Path, keys: Sequence[str] = HEADER_KEYS
+) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    JSON オブジェクトのトップレベルから keys だけを読む（揃った時点で読むのをやめる）
+
+    Args:
+        file_path: 対象ファイル
+        keys: 読むトップレベルのキー
+
+    Returns:
+        (ヘッダー, 最後に読んだ値の直後のバイト位置)。ファイルが存在しない・
+        JSON オブジェクトでない場合は None。keys にないキーは結果に含まない
+
+    Example:
+        >>> header, body_offset = read_json_header(Path("W0001.txt"))
+        >>> sorted(header)
+        ['metadata', 'overall_digest']
+    """
+    wanted = set(keys)
+    header: Dict[str, Any] = {}
+    try:
+        with open(file_path, "rb") as stream:
+            buffer = _ChunkedText(stream)
+            pos = buffer.skip_whitespace(0)
+            if buffer.text[pos : pos + 1] != "{":
+                return None
+            pos = buffer.skip_whitespace(pos + 1)
+            if buffer.text[pos : pos + 1] == "}":
+                wanted.clear()
+            while wanted:
+                key, pos = buffer.decode(pos)
+                pos = buffer.skip_whitespace(pos)
+                if not isinstance(key, str) or buffer.text[pos : pos + 1] != ":":
+                    return None
+                value, pos = buffer.decode(buffer.skip_whitespace(pos + 1))
+                if key in wanted:
+                    header[key] = value
+                    wanted.discard(key)
+                pos = buffer.skip_whitespace(pos)
+                separator = buffer.text[pos : pos + 1]
+                if separator == "}":
+                    break
+                if separator != ",":
+                    return None
+                pos = buffer.skip_whitespace(pos + 1)
+    except (OSError, JSONDecodeError):
+        return None
+    return header, len(buffer.text[:pos].encode("utf-8"))
+
+
+def read_digest_header(file_path: Path, log_on_error: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Loop / Digest ファイルのヘッダー（metadata, overall_digest）を読む（索引を使用）
+
+    try_read_json_from_file と同じく .txt 以外は None、読めなければ警告して None。
+    新たに読んだヘッダーは索引に保存する。
+
+    Example:
+        >>> read_digest_header(loops / "L00001_x.txt")["overall_digest"]["abstract"]
+        '...'
+    """
+    index = get_header_index(file_path.parent)
+    header = index.get(file_path.name, log_on_error=log_on_error)
+    index.flush()
+    return header
+
+
+class DigestHeaderIndex:
+    """
+    1ディレクトリ分のヘッダー索引
+
+    Attributes:
+        directory: 対象ディレクトリ
+        index_path: 索引の保存先
+
+    Example:
+        >>> index = DigestHeaderIndex(Path("Digests/1_Weekly"))
+        >>> index.get("W0001_設計.txt")["overall_digest"]["digest_type"]
+        '設計'
+        >>> index.body_offset("W0001_設計.txt")
+        812
+        >>> index.flush()
+    """
+
+    def __init__(self, directory: Path, index_path: Optional[Path] = None):
+        """
+        初期化
+
+        Args:
+            directory: 対象ディレクトリ
+            index_path: 索引の保存先（省略時は親ディレクトリの .digest_headers/ 配下）
+        """
+        self.directory = directory
+        self.index_path = index_path or self.default_index_path(directory)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+        self.stats = {"hits": 0, "reads": 0}
+
+    @staticmethod
+    def default_index_path(directory: Path) -> Path:
+        """
+        デフォルトの索引パス
+
+        Returns:
+            <親ディレクトリ>/.digest_headers/<ディレクトリ名>_<パスのハッシュ>.json
+        """
+        digest = hashlib.sha1(
+            str(directory.resolve()).encode("utf-8"), usedforsecurity=False
+        ).hexdigest()[:8]
+        return directory.parent / HEADER_INDEX_DIR_NAME / f"{directory.name}_{digest}.json"
+
+    def get(self, name: str, log_on_error: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        ファイルのヘッダー（索引が最新ならファイルを開かない）
+
+        Args:
+            name: ファイル名
+            log_on_error: 読めない場合に警告を出すか
+
+        Returns:
+            {"metadata": ..., "overall_digest": ...}（ファイルにないキーは含まない）。
+            .txt 以外・読めない場合は None
+        """
+        entry = self._entry(name, log_on_error)
+        # 索引の内容を呼び出し側の変更から守る
+        return copy.deepcopy(entry["header"]) if entry is not None else None
+
+    def body_offset(self, name: str) -> Optional[int]:
+        """ヘッダーの直後（individual_digests 等の本体が始まる位置）のバイト位置"""
+        entry = self._entry(name, log_on_error=False)
+        return entry.get("body_offset") if entry is not None else None
+
+    def flush(self) -> None:
+        """新たに読んだヘッダーを保存（書き込めない環境ではメモリ上の索引のみ使用）"""
+        if not self._dirty:
+            return
+        data = {
+            "version": HEADER_INDEX_VERSION,
+            "directory": self.directory.name,
+            "keys": list(HEADER_KEYS),
+            "entries": self._entries,
+        }
+        try:
+            ensure_cache_directory(self.index_path.parent)
+            # 再構築できるキャッシュなので fast モード（壊れていれば _load が無視する）
+            save_json(self.index_path, data, compact=True, atomic=False)
+            self._dirty = False
+        except Exception as e:  # FileIOError / PermissionError 等
+            log_debug(f"[FILE] digest header index not saved: {self.index_path} ({e})")
+
+    # =========================================================================
+    # 内部処理
+    # =========================================================================
+
+    def _entry(self, name: str, log_on_error: bool) -> Optional[Dict[str, Any]]:
+        if Path(name).suffix != DIGEST_FILE_EXTENSION:
+            return None
+        self._load()
+        file_path = self.directory / name
+        signature = _signature(file_path)
+        if signature is None:
+            self._forget(name)
+            return self._archived_entry(file_path)
+
+        entry = self._entries.get(name)
+        if entry is not None and tuple(entry["sig"]) == signature:
+            self.stats["hits"] += 1
+            return entry
+
+        self.stats["reads"] += 1
+        result = read_json_header(file_path)
+        if result is None:
+            self._forget(name)
+            if log_on_error:
+                logger.warning(f"Failed to parse {name} as JSON (skipped)")
+            return None
+        header, body_offset = result
+        entry = {"sig": list(signature), "header": header, "body_offset": body_offset}
+        if signature[1] < time.time_ns() - RACY_WINDOW_NS:
+            self._entries[name] = entry
+            self._dirty = True
+        else:
+            self._forget(name)
+        return entry
+
+    def _archived_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """アーカイブ済みのファイルは全体を読んでヘッダーを取り出す"""
+        data = try_read_json_from_file(file_path, log_on_error=False)
+        if data is None:
+            return None
+        return {"header": {key: data[key] for key in HEADER_KEYS if key in data}}
+
+    def _forget(self, name: str) -> None:
+        if self._entries.pop(name, None) is not None:
+            self._dirty = True
+
+    def _load(self) -> None:
+        """索引を読み込む（不正・不一致の場合は無視）"""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = safe_read_json(self.index_path, raise_on_error=False)
+        if (
+            not data
+            or data.get("version") != HEADER_INDEX_VERSION
+            or data.get("directory") != self.directory.name
+            or data.get("keys") != list(HEADER_KEYS)
+            or not isinstance(data.get("entries"), dict)
+        ):
+            return
+        self._entries = {
+            name: entry
+            for name, entry in data["entries"].items()
+            if isinstance(entry, dict) and isinstance(entry.get("sig"), list)
+        }
+
+
+def _signature(path: Path) -> Optional[_Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# プロセス内で共有する索引インスタンス
+_indexes: Dict[str, DigestHeaderIndex] = {}
+
+
+def get_header_index(directory: Path) -> DigestHeaderIndex:
+    """
+    ディレクトリに対応する DigestHeaderIndex を取得（プロセス内で共有）
+
+    Example:
+        >>> get_header_index(Path("Loops")).get("L00001_x.txt")
+        {'overall_digest': {...}}
+    """
+    key = os.path.abspath(directory)
+    index = _indexes.get(key)
+    if index is None:
+        index = DigestHeaderIndex(directory)
+        _indexes[key] = index
+    return index
+
+
+def reset_header_indexes() -> None:
+    """共有索引インスタンスを破棄（テスト用）"""
+    _indexes.clear()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Directory Scan
+==============
+
+ディレクトリを os.scandir で1回だけ走査し、パターンにマッチするファイル名と
+その番号を一括で求めるインフラストラクチャ層モジュール。
+
+DigestAutoAnalyzer は Loops を未処理検出と生成可能判定で別々に走査し、
+各階層ディレクトリも個別に走査していた。DirectoryScan は走査結果を
+値として保持し、件数・最大番号・「N より後のファイル」をメモリ上で求める。
+
+## 設計意図
+
+ARCHITECTURE: Snapshot Value + Batch Parse
+- 走査はディレクトリごとに1回。結果（名前・番号・ディレクトリの mtime）は
+  変更されない値として扱い、同じ走査から複数の判定を行う
+- 番号は名前を改行で連結した1つの文字列に正規表現を1回適用して求める
+  （名前ごとに search を呼ぶと 5 万件で数十ミリ秒かかる）。全ての名前が
+  先頭から「プレフィックス + 数字」で始まる場合、extract_file_number と
+  同じ結果になる。そうでない名前が混じる場合だけ名前ごとに解析する
+- パターンは fnmatchcase と同じ意味（"L*.txt" のような「* が1つ」の
+  パターンは startswith / endswith で判定する）
+- mtime_ns は監視（digest_auto --watch）の変更検出に使う。mtime が走査時刻から
+  RACY_WINDOW_NS 以内なら（file_index と同じく）変更の可能性ありとみなす
+
+Usage:
+    from infrastructure.directory_scan import scan_directory
+
+    loops = scan_directory(loops_path, "L*.txt")
+    loops.count()            # 50000
+    loops.names_after(49990)  # ['L49991_x.txt', ...]
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, Optional
+
+from domain.file_naming import extract_file_number
+from domain.level_registry import get_level_registry
+from infrastructure.file_index import RACY_WINDOW_NS
+
+__all__ = ["DirectoryScan", "scan_directory"]
+
+# 番号を持たない名前の番号
+UNNUMBERED = -1
+
+
+@dataclass(frozen=True)
+class DirectoryScan:
+    """
+    1ディレクトリ・1パターン分の走査結果
+
+    Attributes:
+        directory: 走査したディレクトリ
+        pattern: ファイル名パターン（fnmatch 形式）
+        mtime_ns: 走査時のディレクトリの mtime（ディレクトリがなければ None）
+        names: マッチしたファイル名（走査順）
+        numbers: names と同じ順の番号（番号がなければ -1）
+        scanned_at_ns: 走査した時刻
+    """
+
+    directory: Path
+    pattern: str
+    mtime_ns: Optional[int] = None
+    names: List[str] = field(default_factory=list)
+    numbers: List[int] = field(default_factory=list)
+    scanned_at_ns: int = 0
+
+    @property
+    def exists(self) -> bool:
+        """走査時にディレクトリが存在したか"""
+        return self.mtime_ns is not None
+
+    def is_current(self) -> bool:
+        """
+        走査後にディレクトリが変更されていないか（stat 1回で判定）
+
+        Returns:
+            mtime が走査時と同じで、かつ走査時刻より十分前ならTrue
+        """
+        try:
+            mtime_ns: Optional[int] = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != self.mtime_ns:
+            return False
+        return mtime_ns is None or mtime_ns < self.scanned_at_ns - RACY_WINDOW_NS
+
+    def count(self) -> int:
+        """マッチしたファイル数（len(list(directory.glob(pattern))) と同じ）"""
+        return len(self.names)
+
+    def max_number(self) -> Optional[int]:
+        """最大番号（番号を持つファイルがなければ None）"""
+        largest = max(self.numbers, default=UNNUMBERED)
+        return largest if largest != UNNUMBERED else None
+
+    def names_after(self, number: int) -> List[str]:
+        """
+        指定番号より大きい番号のファイル名（ファイル名順）
+
+        Example:
+            >>> scan.names_after(186)
+            ['L00187_a.txt', 'L00188_b.txt']
+        """
+        lowest = max(number, UNNUMBERED)
+        return sorted([name for name, n in zip(self.names, self.numbers) if n > lowest])
+
+
+def _filter_names(names: List[str], pattern: str) -> List[str]:
+    """fnmatchcase(name, pattern) にマッチする名前（「* が1つ」なら関数呼び出しなしで判定）"""
+    head, star, tail = pattern.partition("*")
+    if star and not any(c in pattern for c in "?[") and "*" not in tail:
+        minimum = len(head) + len(tail)
+        return [
+            name
+            for name in names
+            if name.startswith(head) and name.endswith(tail) and len(name) >= minimum
+        ]
+    return [name for name in names if fnmatchcase(name, pattern)]
+
+
+def _parse_numbers(names: List[str]) -> List[int]:
+    """ファイル名の番号を一括で求める（extract_file_number と同じ結果）"""
+    if not names:
+        return []
+    prefixes = get_level_registry().build_prefix_pattern()
+    joined = "\n" + "\n".join(names)
+    # 改行を含む名前がなく、全ての名前が「プレフィックス + 数字」で始まる場合
+    if joined.count("\n") == len(names):
+        digits = re.findall(rf"\n(?:{prefixes})(\d+)", joined)
+        if len(digits) == len(names):
+            return list(map(int, digits))
+    # それ以外は名前ごとに解析
+    numbers = []
+    for name in names:
+        parsed = extract_file_number(name)
+        numbers.append(parsed[1] if parsed is not None else UNNUMBERED)
+    return numbers
+
+
+def scan_directory(directory: Path, pattern: str) -> DirectoryScan:
+    """
+    ディレクトリを1回走査し、パターンにマッチする名前と番号を求める
+
+    Args:
+        directory: 走査するディレクトリ
+        pattern: ファイル名パターン（例: "L*.txt"）
+
+    Returns:
+        DirectoryScan（ディレクトリがなければ空）
+
+    Example:
+        >>> scan = scan_directory(Path("Loops"), "L*.txt")
+        >>> scan.count(), scan.max_number()
+        (186, 186)
+    """
+    scanned_at_ns = time.time_ns()
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as it:
+            names = _filter_names([entry.name for entry in it], pattern)
+    except OSError:
+        return DirectoryScan(directory, pattern, scanned_at_ns=scanned_at_ns)
+    return DirectoryScan(directory, pattern, mtime_ns, names, _parse_numbers(names), scanned_at_ns)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+File Index
+==========
+
+Loop / Digest ディレクトリの永続マニフェスト（番号→ファイル名の索引）を
+提供するインフラストラクチャ層モジュール。
+
+FileDetector.find_new_files や DigestAutoAnalyzer は呼び出しのたびに
+ディレクトリを glob し、全ファイル名を正規表現で解析していた。
+3万件を超えるLoopファイルではこれがCLIレイテンシの大半を占める。
+
+## 設計意図
+
+ARCHITECTURE: Index / Materialized View
+ディレクトリごとに「番号順にソートされた (番号, プレフィックス, ファイル名)」と
+ディレクトリの mtime をマニフェストとして永続化する。
+
+- ディレクトリの mtime はエントリの追加・削除・リネームでのみ変化するため、
+  mtime が一致すればファイル名一覧は変わっていない
+- mtime が変わった場合は os.scandir で名前だけを取得し、
+  既知の名前は再解析せず新規の名前のみ解析する（インクリメンタル再構築）
+- 「N より後のファイル」「最大番号」「件数」は二分探索 / 末尾参照 / len で求まる
+
+マニフェストは索引対象ディレクトリの親ディレクトリの `.file_index/` に保存する
+（索引対象ディレクトリ内に書き込むと、その mtime 自体が変化してしまうため）。
+データディレクトリは git で同期されるため、`.file_index/` には「*」だけの
+.gitignore を置いて追跡対象から外す。マニフェストには環境に依存する値
+（絶対パス・スキャン時刻）を保存しない。
+
+## 安全性
+
+mtime の分解能が粗いファイルシステム（FAT の 2 秒、一部のネットワーク・同期
+フォルダの 1 秒）では、スキャン直前の変更が同一 mtime になり得る。スキャン時刻から
+RACY_WINDOW_NS（2 秒）以内の mtime を持つマニフェストは信頼せず、次回アクセス時に
+再スキャンする。マニフェストはこの条件を満たす
+（racy でない）場合にのみ保存するため、読み込んだマニフェストは信頼できる。
+
+Usage:
+    from infrastructure.file_index import get_file_index
+
+    index = get_file_index(loops_path, "L*.txt")
+    index.files_after(186)   # [Path(".../L00187_x.txt"), ...]
+    index.max_number()       # 250
+    index.count()            # 250
+"""
+
+import bisect
+import hashlib
+import os
+import re
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from domain.file_naming import extract_file_number
+from domain.level_registry import get_level_registry
+from infrastructure.json_repository import ensure_cache_directory, json_loads, save_json
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "FileIndex",
+    "get_file_index",
+    "reset_file_indexes",
+    "INDEX_DIR_NAME",
+    "MANIFEST_VERSION",
+]
+
+# マニフェスト保存ディレクトリ名（索引対象ディレクトリの親に作成）
+INDEX_DIR_NAME = ".file_index"
+
+# マニフェスト形式のバージョン
+MANIFEST_VERSION = 2
+
+# 更新直後とみなす時間幅（ナノ秒）。mtime の分解能が最も粗い FAT の 2 秒に合わせる
+RACY_WINDOW_NS = 2_000_000_000
+
+# (番号, プレフィックス, ファイル名)
+_Entry = Tuple[int, str, str]
+
+
+class FileIndex:
+    """
+    1ディレクトリ・1パターン分のファイル索引
+
+    Attributes:
+        directory: 索引対象ディレクトリ
+        pattern: ファイル名パターン（glob形式、例: "L*.txt"）
+        manifest_path: マニフェストの保存先
+
+    Example:
+        >>> index = FileIndex(Path("Loops"), "L*.txt")
+        >>> index.max_number()
+        186
+        >>> [p.name for p in index.files_after(184)]
+        ['L00185_a.txt', 'L00186_b.txt']
+    """
+
+    def __init__(self, directory: Path, pattern: str, manifest_path: Optional[Path] = None):
+        """
+        初期化
+
+        Args:
+            directory: 索引対象ディレクトリ
+            pattern: ファイル名パターン（glob形式）
+            manifest_path: マニフェストの保存先（省略時は親ディレクトリの .file_index/ 配下）
+        """
+        self.directory = directory
+        self.pattern = pattern
+        self.manifest_path = manifest_path or self.default_manifest_path(directory, pattern)
+
+        self._dir_mtime_ns: Optional[int] = None
+        self._scanned_at_ns = 0
+        self._entries: List[_Entry] = []
+        self._numbers: List[int] = []
+        self._unnumbered: List[str] = []
+        self._sorted_names: Optional[List[str]] = None
+        self._loaded = False
+
+    @staticmethod
+    def default_manifest_path(directory: Path, pattern: str) -> Path:
+        """
+        デフォルトのマニフェストパスを取得
+
+        Args:
+            directory: 索引対象ディレクトリ
+            pattern: ファイル名パターン
+
+        Returns:
+            <親ディレクトリ>/.file_index/<ディレクトリ名>__<パターン>.json
+        """
+        safe_pattern = re.sub(r"[^A-Za-z0-9]+", "_", pattern).strip("_")
+        digest = hashlib.sha1(pattern.encode("utf-8"), usedforsecurity=False).hexdigest()[:8]
+        return directory.parent / INDEX_DIR_NAME / f"{directory.name}__{safe_pattern}_{digest}.json"
+
+    # =========================================================================
+    # 公開API
+    # =========================================================================
+
+    def files(self) -> List[Path]:
+        """
+        パターンにマッチする全ファイル（ファイル名順）
+
+        Returns:
+            sorted(directory.glob(pattern)) と同じ順序のPathリスト
+        """
+        return [self.directory / name for name in self.names()]
+
+    def names(self) -> List[str]:
+        """
+        パターンにマッチする全ファイル名（ファイル名順）
+
+        Path を生成しないため、大量のファイルを名前だけで比較する用途では files() より速い。
+
+        Returns:
+            files() と同じ順序のファイル名リスト（呼び出し側で変更しないこと）
+        """
+        self.refresh()
+        if self._sorted_names is None:
+            names = [entry[2] for entry in self._entries] + self._unnumbered
+            self._sorted_names = sorted(names)
+        return self._sorted_names
+
+    def files_after(self, number: int) -> List[Path]:
+        """
+        指定番号より大きい番号のファイル（ファイル名順）
+
+        Args:
+            number: この番号より大きいファイルを返す
+
+        Returns:
+            Pathリスト（番号を持たないファイルは含まない）
+        """
+        self.refresh()
+        start = bisect.bisect_right(self._numbers, number)
+        names = sorted(entry[2] for entry in self._entries[start:])
+        return [self.directory / name for name in names]
+
+    def max_number(self, prefix: Optional[str] = None) -> Optional[int]:
+        """
+        最大ファイル番号
+
+        Args:
+            prefix: 指定時はこのプレフィックスのファイルのみ対象
+
+        Returns:
+            最大番号、該当ファイルがない場合はNone
+        """
+        self.refresh()
+        for number, entry_prefix, _ in reversed(self._entries):
+            if prefix is None or entry_prefix == prefix:
+                return number
+        return None
+
+    def count(self) -> int:
+        """
+        パターンにマッチするファイル数
+
+        Returns:
+            len(list(directory.glob(pattern))) と同じ値
+        """
+        self.refresh()
+        return len(self._entries) + len(self._unnumbered)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        ディレクトリの mtime を確認し、変化していれば索引を更新
+
+        Args:
+            force: mtime に関わらず再スキャンするか
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._load_manifest()
+
+        try:
+            dir_mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            # ディレクトリなし → 空の索引
+            self._set_entries([], [])
+            self._dir_mtime_ns = None
+            return
+
+        if not force and dir_mtime_ns == self._dir_mtime_ns and not self._is_racy():
+            return
+
+        self._rescan(dir_mtime_ns)
+
+    # =========================================================================
+    # 内部処理
+    # =========================================================================
+
+    def _is_racy(self) -> bool:
+        """マニフェストの mtime がスキャン時刻に近すぎて信頼できないか"""
+        if self._dir_mtime_ns is None:
+            return True
+        return self._dir_mtime_ns >= self._scanned_at_ns - RACY_WINDOW_NS
+
+    def _rescan(self, dir_mtime_ns: int) -> None:
+        """名前一覧を取得し、新規の名前のみ解析して索引を更新"""
+        scanned_at_ns = time.time_ns()
+        try:
+            with os.scandir(self.directory) as it:
+                names = {entry.name for entry in it if fnmatchcase(entry.name, self.pattern)}
+        except OSError:
+            self._set_entries([], [])
+            self._dir_mtime_ns = None
+            return
+
+        known: Dict[str, _Entry] = {entry[2]: entry for entry in self._entries}
+        unnumbered_known = set(self._unnumbered)
+
+        entries: List[_Entry] = []
+        unnumbered: List[str] = []
+        parsed = 0
+        for name in names:
+            entry = known.get(name)
+            if entry is not None:
+                entries.append(entry)
+                continue
+            if name in unnumbered_known:
+                unnumbered.append(name)
+                continue
+            parsed += 1
+            result = extract_file_number(name)
+            if result is None:
+                unnumbered.append(name)
+            else:
+                entries.append((result[1], result[0], name))
+
+        entries.sort()
+        unnumbered.sort()
+
+        self._set_entries(entries, unnumbered)
+        self._dir_mtime_ns = dir_mtime_ns
+        self._scanned_at_ns = scanned_at_ns
+        log_debug(
+            f"[FILE] file_index rescan: {self.directory.name}/{self.pattern} "
+            f"total={len(entries) + len(unnumbered)} parsed={parsed}"
+        )
+        # 更新直後のディレクトリは次回も再スキャンするため、保存しても意味がない
+        if not self._is_racy():
+            self._save_manifest()
+
+    def _set_entries(self, entries: List[_Entry], unnumbered: List[str]) -> None:
+        self._entries = entries
+        self._numbers = [entry[0] for entry in entries]
+        self._unnumbered = unnumbered
+        self._sorted_names = None
+
+    def _parser_key(self) -> str:
+        """番号解析ルールの識別子（レベル設定が変わればマニフェストを破棄）"""
+        return get_level_registry().build_prefix_pattern()
+
+    def _load_manifest(self) -> None:
+        """マニフェストを読み込む（不正・不一致の場合は無視）"""
+        # 1プロセスで1度しか読まないため、共有の読み込みキャッシュ（複製あり）を経由しない
+        try:
+            data = json_loads(self.manifest_path.read_bytes())
+        except (OSError, ValueError, UnicodeDecodeError):
+            return
+        if not isinstance(data, dict):
+            return
+        if (
+            data.get("version") != MANIFEST_VERSION
+            or data.get("directory") != self.directory.name
+            or data.get("pattern") != self.pattern
+            or data.get("parser") != self._parser_key()
+        ):
+            return
+        try:
+            numbers, prefixes, names = data["numbers"], data["prefixes"], data["names"]
+            if not (len(numbers) == len(prefixes) == len(names)):
+                return
+            entries: List[_Entry] = list(zip(numbers, prefixes, names))
+            unnumbered = list(data["unnumbered"])
+            dir_mtime_ns = int(data["dir_mtime_ns"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self._set_entries(entries, unnumbered)
+        self._dir_mtime_ns = dir_mtime_ns
+        # 保存されるのは racy でないマニフェストだけなので、読み込み時刻をスキャン時刻とみなす
+        self._scanned_at_ns = time.time_ns()
+
+    def _save_manifest(self) -> None:
+        """マニフェストを保存（書き込めない環境ではメモリ上の索引のみ使用）"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "directory": self.directory.name,
+            "pattern": self.pattern,
+            "parser": self._parser_key(),
+            "dir_mtime_ns": self._dir_mtime_ns,
+            # 列指向で保存（読み込み時のオブジェクト生成を最小化）
+            "numbers": self._numbers,
+            "prefixes": [entry[1] for entry in self._entries],
+            "names": [entry[2] for entry in self._entries],
+            "unnumbered": self._unnumbered,
+        }
+        try:
+            ensure_cache_directory(self.manifest_path.parent)
+            # 再構築できるキャッシュなので fast モード（壊れていれば _load_manifest が無視する）
+            save_json(self.manifest_path, data, compact=True, atomic=False)
+        except Exception as e:  # FileIOError / PermissionError 等
+            log_debug(f"[FILE] file_index manifest not saved: {self.manifest_path} ({e})")
+
+
+# プロセス内で共有する索引インスタンス
+_indexes: Dict[Tuple[str, str], FileIndex] = {}
+
+
+def get_file_index(directory: Path, pattern: str) -> FileIndex:
+    """
+    ディレクトリ・パターンに対応する FileIndex を取得（プロセス内で共有）
+
+    Args:
+        directory: 索引対象ディレクトリ
+        pattern: ファイル名パターン（glob形式）
+
+    Returns:
+        FileIndex インスタンス
+
+    Example:
+        >>> get_file_index(Path("Loops"), "L*.txt").count()
+        250
+    """
+    key = (os.path.abspath(directory), pattern)
+    index = _indexes.get(key)
+    if index is None:
+        index = FileIndex(directory, pattern)
+        _indexes[key] = index
+    return index
+
+
+def reset_file_indexes() -> None:
+    """共有索引インスタンスを破棄（テスト用）"""
+    _indexes.clear()
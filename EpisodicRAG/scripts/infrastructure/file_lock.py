@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+File Lock
+=========
+
+Essences 配下のファイルに対するプロセス間の読み書きロック（Reader/Writer Lock）を
+提供するインフラストラクチャ層モジュール。
+
+save_json はアトミックな rename で書き込むため、読み手が壊れたファイルを
+見ることはない。しかし「読み込み → 変更 → 保存」の間に別プロセスが同じファイルを
+更新すると、その更新は上書きされて失われる（lost update）。
+2つの /digest 実行や、digest_auto の読み取りと finalize が重なるケースを防ぐ。
+
+## 設計意図
+
+ARCHITECTURE: Reader/Writer Lock
+- 読み取りは共有ロック、read-modify-write は排他ロックを取る
+- ロックはファイルごとに取るため、別ファイルを扱う処理同士は直列化されない
+- ロックファイルは永続化設定ディレクトリの `.locks/` に、対象の絶対パスの
+  ハッシュを付けた名前で置く（git で同期する Essences 等を汚さない。
+  環境変数 EPISODIC_RAG_LOCK_DIR で変更可能）。
+  flock 方式ではロックファイルを削除しない。削除すると別プロセスが
+  同名の新しいファイルをロックでき、排他が崩れるため
+
+実装:
+    - fcntl.flock が使える環境（POSIX）: 共有 / 排他ロックを非ブロッキングで試行
+    - 使えない環境（Windows 等）: O_CREAT | O_EXCL によるロックファイル方式。
+      共有ロックも排他として扱う。ロックファイルには保持プロセスの
+      「PID ホスト名」を書き、同じホストでそのプロセスが終了していれば
+      異常終了の残骸とみなして削除する。保持プロセスが生きている限り、
+      どれだけ長くても奪わない。別ホストのロック（ロックディレクトリを共有した場合）や
+      内容を読めないロックファイルは、STALE_LOCK_SECONDS より古い場合のみ残骸とみなす
+
+同一スレッド内の再入（排他ロック中の共有・排他ロック、共有ロック中の共有ロック）は
+深さのカウントのみで扱う。共有ロック中の排他ロックへの昇格は、2つの読み手が
+互いを待つデッドロックになり得るため LockUpgradeError とする
+（共有ロックを解放してから排他ロックを取り直すこと）。
+
+取得待ちが発生した回数・待ち時間・タイムアウト回数をファイルごとに記録し、
+stats() で参照できる（競合メトリクス）。
+
+Usage:
+    from infrastructure.file_lock import exclusive_lock, shared_lock
+
+    with shared_lock(grand_digest_file):
+        data = load_json(grand_digest_file)
+
+    with exclusive_lock(grand_digest_file, timeout=5.0):
+        data = load_json(grand_digest_file)
+        data["major_digests"]["weekly"] = ...
+        save_json(grand_digest_file, data)
+"""
+
+import hashlib
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, Optional, Set
+
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import LockTimeoutError, LockUpgradeError
+from domain.file_constants import LOCK_DIRNAME
+from infrastructure.config.persistent_path import get_persistent_config_dir
+from infrastructure.json_repository.operations import ensure_cache_directory
+from infrastructure.logging_config import log_debug
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = [
+    "FileLockManager",
+    "LockStats",
+    "LOCK_SHARED",
+    "LOCK_EXCLUSIVE",
+    "DEFAULT_LOCK_TIMEOUT",
+    "exclusive_lock",
+    "get_lock_manager",
+    "lock_directory",
+    "lock_path_for",
+    "reset_lock_manager",
+    "shared_lock",
+]
+
+LOCK_SHARED = "shared"
+LOCK_EXCLUSIVE = "exclusive"
+
+# ロック取得のデフォルトタイムアウト（秒）。環境変数 EPISODIC_RAG_LOCK_TIMEOUT で変更可能
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+# 取得再試行の待機間隔（秒）。初期値から倍々で上限まで伸ばす
+_POLL_INITIAL = 0.002
+_POLL_MAX = 0.05
+
+# ロックファイル方式で、保持プロセスを確認できないロックファイルを残骸とみなす経過時間（秒）
+STALE_LOCK_SECONDS = 300.0
+
+# Windows の GetExitCodeProcess が実行中のプロセスに返す値
+_STILL_ACTIVE = 259
+
+# ロックディレクトリを変更する環境変数
+LOCK_DIR_ENV_VAR = "EPISODIC_RAG_LOCK_DIR"
+
+# ensure_cache_directory() 済みのロックディレクトリ
+_prepared_lock_dirs: Set[Path] = set()
+
+
+def lock_directory() -> Path:
+    """
+    ロックファイルを置くディレクトリ（なければ作成）
+
+    Returns:
+        EPISODIC_RAG_LOCK_DIR、未設定なら永続化設定ディレクトリの `.locks/`
+
+    Example:
+        >>> lock_directory()
+        PosixPath('/home/user/.claude/plugins/.episodicrag/.locks')
+    """
+    override = os.environ.get(LOCK_DIR_ENV_VAR)
+    lock_dir = Path(override) if override else get_persistent_config_dir() / LOCK_DIRNAME
+    if lock_dir not in _prepared_lock_dirs:
+        ensure_cache_directory(lock_dir)
+        _prepared_lock_dirs.add(lock_dir)
+    return lock_dir
+
+
+def lock_path_for(path: Path) -> Path:
+    """
+    対象ファイルのロックファイルパス
+
+    同じファイルを指すパスは同じロックファイルになるよう、正規化した絶対パスの
+    ハッシュで区別する（同名の別ファイルとは衝突しない）。
+
+    Args:
+        path: ロック対象のファイルパス
+
+    Returns:
+        lock_directory() 配下の `<ファイル名>.<パスのハッシュ>.lock`
+
+    Example:
+        >>> lock_path_for(Path("Essences/GrandDigest.txt"))
+        PosixPath('/home/user/.claude/plugins/.episodicrag/.locks/GrandDigest.txt.3f1c9a0b2d4e6f80.lock')
+    """
+    key = os.path.normcase(os.path.abspath(path))
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return lock_directory() / f"{path.name}.{digest}.lock"
+
+
+@dataclass
+class LockStats:
+    """
+    ファイルごとのロック統計
+
+    Attributes:
+        acquisitions: 取得回数（再入を除く）
+        shared: 共有ロックの取得回数
+        exclusive: 排他ロックの取得回数
+        contended: 即座に取得できず待機した回数
+        timeouts: タイムアウトした回数
+        total_wait: 待機時間の合計（秒）
+        max_wait: 待機時間の最大値（秒）
+    """
+
+    acquisitions: int = 0
+    shared: int = 0
+    exclusive: int = 0
+    contended: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON出力用の辞書に変換"""
+        data = asdict(self)
+        data["total_wait"] = round(self.total_wait, 6)
+        data["max_wait"] = round(self.max_wait, 6)
+        return data
+
+
+class _Held:
+    """スレッドが保持中のロック"""
+
+    __slots__ = ("mode", "depth", "fd")
+
+    def __init__(self, mode: str, fd: Optional[int]):
+        self.mode = mode
+        self.depth = 1
+        self.fd = fd
+
+
+class FileLockManager:
+    """
+    ファイル単位の Reader/Writer ロック管理
+
+    Attributes:
+        default_timeout: timeout 省略時のタイムアウト秒数
+        use_flock: fcntl.flock を使うか（False はロックファイル方式）
+
+    Example:
+        >>> manager = FileLockManager()
+        >>> with manager.exclusive(Path("Essences/ShadowGrandDigest.txt")):
+        ...     ...  # read-modify-write
+        >>> manager.stats()["Essences/ShadowGrandDigest.txt"]["exclusive"]
+        1
+    """
+
+    def __init__(self, default_timeout: Optional[float] = None, use_flock: Optional[bool] = None):
+        """
+        初期化
+
+        Args:
+            default_timeout: デフォルトのタイムアウト秒数
+                （省略時は EPISODIC_RAG_LOCK_TIMEOUT、未設定なら DEFAULT_LOCK_TIMEOUT）
+            use_flock: fcntl.flock を使うか（省略時は利用可能なら使う）
+        """
+        if default_timeout is None:
+            default_timeout = _timeout_from_env()
+        self.default_timeout = default_timeout
+        if use_flock is None:
+            use_flock = fcntl is not None
+        self.use_flock = use_flock and fcntl is not None
+        self._local = threading.local()
+        self._stats: Dict[str, LockStats] = {}
+        self._stats_lock = threading.Lock()
+
+    # =========================================================================
+    # 公開API
+    # =========================================================================
+
+    @contextmanager
+    def shared(self, path: Path, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        共有ロック（読み取り用）
+
+        Args:
+            path: ロック対象のファイルパス
+            timeout: タイムアウト秒数（省略時は default_timeout、0 は1回だけ試行）
+
+        Raises:
+            LockTimeoutError: タイムアウトまでに取得できなかった場合
+        """
+        self.acquire(path, LOCK_SHARED, timeout)
+        try:
+            yield
+        finally:
+            self.release(path)
+
+    @contextmanager
+    def exclusive(self, path: Path, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        排他ロック（read-modify-write 用）
+
+        Args:
+            path: ロック対象のファイルパス
+            timeout: タイムアウト秒数（省略時は default_timeout、0 は1回だけ試行）
+
+        Raises:
+            LockUpgradeError: 同一スレッドが同じファイルの共有ロックを保持している場合
+            LockTimeoutError: タイムアウトまでに取得できなかった場合
+        """
+        self.acquire(path, LOCK_EXCLUSIVE, timeout)
+        try:
+            yield
+        finally:
+            self.release(path)
+
+    def acquire(self, path: Path, mode: str, timeout: Optional[float] = None) -> None:
+        """
+        ロックを取得（with文を使わない場合は release() と対で呼ぶ）
+
+        Args:
+            path: ロック対象のファイルパス
+            mode: LOCK_SHARED または LOCK_EXCLUSIVE
+            timeout: タイムアウト秒数
+
+        Raises:
+            ValueError: mode が不正な場合
+            LockUpgradeError: 同一スレッドで共有ロックから排他ロックへ昇格しようとした場合
+            LockTimeoutError: タイムアウトまでに取得できなかった場合
+        """
+        if mode not in (LOCK_SHARED, LOCK_EXCLUSIVE):
+            raise ValueError(f"Invalid lock mode: {mode}")
+        key = os.path.abspath(path)
+        held = self._held().get(key)
+        if held is not None:
+            if held.mode == LOCK_SHARED and mode == LOCK_EXCLUSIVE:
+                raise LockUpgradeError(get_error_formatter().file.lock_upgrade(path))
+            held.depth += 1
+            return
+
+        timeout = self.default_timeout if timeout is None else timeout
+        lock_file = lock_path_for(Path(key))
+        start = time.monotonic()
+        deadline = start + max(timeout, 0.0)
+        delay = _POLL_INITIAL
+        contended = False
+
+        fd = self._open_flock(lock_file) if self.use_flock else None
+        while True:
+            if self._try_lock(lock_file, fd, mode):
+                break
+            contended = True
+            now = time.monotonic()
+            if now >= deadline:
+                if fd is not None:
+                    os.close(fd)
+                self._record(key, mode, now - start, contended, timed_out=True)
+                formatter = get_error_formatter()
+                raise LockTimeoutError(formatter.file.lock_timeout(path, mode, timeout))
+            time.sleep(min(delay, deadline - now))
+            delay = min(delay * 2, _POLL_MAX)
+
+        waited = time.monotonic() - start
+        self._held()[key] = _Held(mode, fd)
+        self._record(key, mode, waited, contended, timed_out=False)
+        if contended:
+            log_debug(f"[FILE] lock contended: {mode} {path} waited {waited * 1000:.1f}ms")
+
+    def release(self, path: Path) -> None:
+        """
+        ロックを解放（再入している場合は深さを1つ戻すのみ）
+
+        Args:
+            path: ロック対象のファイルパス
+
+        Raises:
+            RuntimeError: このスレッドがロックを保持していない場合
+        """
+        key = os.path.abspath(path)
+        held_map = self._held()
+        held = held_map.get(key)
+        if held is None:
+            raise RuntimeError(f"Lock not held: {path}")
+        held.depth -= 1
+        if held.depth > 0:
+            return
+        del held_map[key]
+        if held.fd is not None:
+            # close で flock も解放される
+            os.close(held.fd)
+        else:
+            try:
+                os.unlink(lock_path_for(Path(key)))
+            except OSError:
+                pass
+
+    def held_mode(self, path: Path) -> Optional[str]:
+        """
+        このスレッドが保持しているロックのモード
+
+        Args:
+            path: ロック対象のファイルパス
+
+        Returns:
+            LOCK_SHARED / LOCK_EXCLUSIVE、保持していない場合はNone
+        """
+        held = self._held().get(os.path.abspath(path))
+        return held.mode if held is not None else None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        ファイルごとの競合メトリクス
+
+        Returns:
+            {ファイルの絶対パス: LockStats.to_dict()}
+        """
+        with self._stats_lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """競合メトリクスをリセット"""
+        with self._stats_lock:
+            self._stats.clear()
+
+    # =========================================================================
+    # 内部処理
+    # =========================================================================
+
+    def _held(self) -> Dict[str, _Held]:
+        held: Optional[Dict[str, _Held]] = getattr(self._local, "held", None)
+        if held is None:
+            held = {}
+            self._local.held = held
+        return held
+
+    @staticmethod
+    def _open_flock(lock_file: Path) -> int:
+        lock_file.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+
+    @staticmethod
+    def _try_lock(lock_file: Path, fd: Optional[int], mode: str) -> bool:
+        if fd is not None:
+            operation = fcntl.LOCK_SH if mode == LOCK_SHARED else fcntl.LOCK_EX
+            try:
+                fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                return False
+        return _try_create_lock_file(lock_file)
+
+    def _record(self, key: str, mode: str, waited: float, contended: bool, timed_out: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(key, LockStats())
+            if timed_out:
+                stats.timeouts += 1
+            else:
+                stats.acquisitions += 1
+                if mode == LOCK_SHARED:
+                    stats.shared += 1
+                else:
+                    stats.exclusive += 1
+            if contended:
+                stats.contended += 1
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+
+
+def _try_create_lock_file(lock_file: Path) -> bool:
+    """ロックファイル方式: 作成できればロック取得、残骸は削除して再試行"""
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        if _is_stale_lock_file(lock_file):
+            try:
+                os.unlink(lock_file)
+            except OSError:
+                pass
+        return False
+    try:
+        os.write(fd, f"{os.getpid()} {socket.gethostname()}".encode("utf-8"))
+    finally:
+        os.close(fd)
+    return True
+
+
+def _is_stale_lock_file(lock_file: Path) -> bool:
+    """
+    ロックファイルが異常終了したプロセスの残骸か
+
+    同じホストのプロセスが書いたロックは PID で生死を判定し、経過時間は見ない。
+    それ以外（別ホスト・書き込み途中で内容がない等）は経過時間で判定する。
+    """
+    try:
+        owner = lock_file.read_text(encoding="utf-8").split(maxsplit=1)
+        age = time.time() - os.stat(lock_file).st_mtime
+    except (OSError, UnicodeDecodeError):
+        return False
+    if len(owner) == 2 and owner[0].isdigit() and owner[1] == socket.gethostname():
+        pid = int(owner[0])
+        if _pid_alive(pid):
+            return False
+        log_debug(f"[FILE] removing stale lock file: {lock_file} (owner pid {pid} exited)")
+        return True
+    if age > STALE_LOCK_SECONDS:
+        log_debug(f"[FILE] removing stale lock file: {lock_file} ({age:.0f}s old)")
+        return True
+    return False
+
+
+def _pid_alive(pid: int) -> bool:
+    """プロセスが実行中か（判定できない場合は実行中とみなす）"""
+    if pid <= 0:
+        return False
+    if os.name == "nt":  # pragma: no cover - Windows
+        import ctypes
+
+        # os.kill(pid, 0) は Windows ではプロセスを終了させるため使わない
+        kernel32 = getattr(ctypes, "windll").kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            # ERROR_ACCESS_DENIED は他ユーザーの実行中プロセス
+            return bool(kernel32.GetLastError() == 5)
+        try:
+            code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # PermissionError 等: 存在はする
+        return True
+    return True
+
+
+def _timeout_from_env() -> float:
+    value = os.environ.get("EPISODIC_RAG_LOCK_TIMEOUT")
+    if not value:
+        return DEFAULT_LOCK_TIMEOUT
+    try:
+        return float(value)
+    except ValueError:
+        log_debug(f"[FILE] invalid EPISODIC_RAG_LOCK_TIMEOUT: {value!r}")
+        return DEFAULT_LOCK_TIMEOUT
+
+
+# プロセス内で共有するロックマネージャ
+_manager: Optional[FileLockManager] = None
+
+
+def get_lock_manager() -> FileLockManager:
+    """
+    共有ロックマネージャを取得
+
+    Returns:
+        FileLockManager インスタンス
+    """
+    global _manager
+    if _manager is None:
+        _manager = FileLockManager()
+    return _manager
+
+
+def reset_lock_manager() -> None:
+    """共有ロックマネージャを破棄（テスト用）"""
+    global _manager
+    _manager = None
+
+
+def shared_lock(path: Path, timeout: Optional[float] = None) -> ContextManager[None]:
+    """
+    共有ロックマネージャで共有ロックを取得
+
+    Args:
+        path: ロック対象のファイルパス
+        timeout: タイムアウト秒数
+
+    Returns:
+        with文で使うコンテキストマネージャ
+    """
+    return get_lock_manager().shared(path, timeout)
+
+
+def exclusive_lock(path: Path, timeout: Optional[float] = None) -> ContextManager[None]:
+    """
+    共有ロックマネージャで排他ロックを取得
+
+    Args:
+        path: ロック対象のファイルパス
+        timeout: タイムアウト秒数
+
+    Returns:
+        with文で使うコンテキストマネージャ
+    """
+    return get_lock_manager().exclusive(path, timeout)
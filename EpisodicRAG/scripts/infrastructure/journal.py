@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Append-only Journal
+===================
+
+JSON Lines 形式の追記専用ジャーナル（Write-Ahead Log）を提供する
+インフラストラクチャ層モジュール。
+
+複数ファイルにまたがる更新（finalize の5ステップ等）の途中でプロセスが
+落ちると、どこまで書き込んだかが分からなくなる。書き込みの前に「意図」を、
+書き込みの後に「完了」を1行ずつ追記しておけば、再起動時にジャーナルを
+先頭から1回読むだけで未完了の処理と残りのステップが分かる。
+
+## 設計意図
+
+ARCHITECTURE: Write-Ahead Log
+- 1レコード = 1行の JSON。append() は追記 → flush → fsync してから戻る
+- 追記は排他ロック（infrastructure.file_lock）の下で行い、複数プロセスの
+  行が混ざらないようにする
+- 書き込み途中で落ちた末尾の行（改行なし・JSONとして不正）は読み込み時に捨てる。
+  追記時は末尾が改行で終わっていなければ改行を補い、次のレコードを
+  壊れた行に連結しない
+- 未完了のレコードがなくなったら truncate() で空にする（コンパクション）。
+  レコードの意味づけ（トランザクションの区切り等）は呼び出し側が決める
+
+Usage:
+    from infrastructure.journal import AppendOnlyJournal
+
+    journal = AppendOnlyJournal(essences / "FinalizeJournal.jsonl")
+    journal.append({"txn": "a1b2", "op": "begin"})
+    for record in journal.read():
+        ...
+    journal.truncate()
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+from domain.constants import LOG_PREFIX_FILE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import FileIOError
+from infrastructure.file_lock import exclusive_lock, shared_lock
+from infrastructure.json_repository import invalidate_analysis_cache
+from infrastructure.logging_config import log_debug, log_warning
+
+__all__ = ["AppendOnlyJournal"]
+
+
+class AppendOnlyJournal:
+    """
+    JSON Lines 形式の追記専用ジャーナル
+
+    Attributes:
+        path: ジャーナルファイルのパス
+
+    Example:
+        >>> journal = AppendOnlyJournal(Path("Essences/FinalizeJournal.jsonl"))
+        >>> journal.append({"txn": "a1b2", "op": "begin"})
+        >>> journal.read()
+        [{'txn': 'a1b2', 'op': 'begin'}]
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        """
+        1レコードを追記し、ディスクへの書き込み（fsync）を待ってから戻る
+
+        Args:
+            record: JSON に変換できるレコード
+
+        Raises:
+            FileIOError: 書き込みに失敗した場合
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with exclusive_lock(self.path):
+                if not self._ends_with_newline():
+                    # 書き込み途中で落ちた末尾の行と分ける
+                    line = "\n" + line
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            formatter = get_error_formatter()
+            raise FileIOError(formatter.file.file_io_error("append", self.path, e)) from e
+        invalidate_analysis_cache(self.path)
+
+    def _ends_with_newline(self) -> bool:
+        """ファイルが空・存在しない、または改行で終わっているか"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        全レコードを追記順に読み込む
+
+        Returns:
+            レコードのリスト（ファイルがなければ空）。
+            JSON として読めない行（書き込み途中で落ちた末尾の行等）は除く
+        """
+        if not self.path.exists():
+            return []
+        with shared_lock(self.path):
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+
+        records: List[Dict[str, Any]] = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                log_warning(f"ジャーナルの不正な行を無視: {self.path.name}:{number}")
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        log_debug(f"{LOG_PREFIX_FILE} journal read: {self.path.name} ({len(records)} records)")
+        return records
+
+    def truncate(self) -> None:
+        """ジャーナルを空にする（未完了のレコードがないことは呼び出し側が確認する）"""
+        if not self.path.exists():
+            return
+        with exclusive_lock(self.path):
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+        invalidate_analysis_cache(self.path)
+        log_debug(f"{LOG_PREFIX_FILE} journal truncated: {self.path.name}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+JSON Patch
+==========
+
+RFC 6902（JSON Patch）の操作を JSON 文書に適用し、2つの文書の差分を
+操作列として求めるインフラストラクチャ層モジュール。
+
+    [{"op": "add", "path": "/latest_digests/weekly/overall_digest/source_files/-",
+      "value": "L00186.txt"},
+     {"op": "replace", "path": "/latest_digests/weekly/overall_digest/abstract",
+      "value": "..."}]
+
+## 設計意図
+
+ARCHITECTURE: Operation-based Delta
+- apply_patch は add / remove / replace / move / copy / test の6操作に対応する。
+  パスは RFC 6901（JSON Pointer）で、"~1" は "/"、"~0" は "~"。配列の "-" は末尾
+- make_patch は dict をキーごとに再帰的に比較し、配列は「末尾への追加だけ」なら
+  要素ごとの add、それ以外は配列全体の replace にする（source_files への追記が
+  そのまま1要素の add になる）
+- 適用は文書をその場で変更する。ルート（""）を置き換える操作のために、
+  適用後の文書を返す
+
+Usage:
+    from infrastructure.json_patch import apply_patch, make_patch
+
+    ops = make_patch(before, after, "/latest_digests/weekly")
+    document = apply_patch(document, ops)
+"""
+
+import copy
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ValidationError
+
+__all__ = ["apply_patch", "escape_pointer", "make_patch"]
+
+_Operation = Dict[str, Any]
+
+
+def escape_pointer(token: str) -> str:
+    """JSON Pointer の参照トークンをエスケープ（"~" → "~0"、"/" → "~1"）"""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _error(operation: Mapping[str, Any], reason: str) -> ValidationError:
+    formatter = get_error_formatter()
+    return ValidationError(formatter.validation.validation_error("json_patch", reason, operation))
+
+
+def _split(pointer: str, operation: Mapping[str, Any]) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise _error(operation, f"invalid pointer {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, operation: Mapping[str, Any], adding: bool) -> int:
+    if adding and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise _error(operation, f"invalid array index {token!r}")
+    index = int(token)
+    if index > len(container) or (not adding and index == len(container)):
+        raise _error(operation, f"array index out of range {token!r}")
+    return index
+
+
+def _resolve(document: Any, tokens: Sequence[str], operation: Mapping[str, Any]) -> Any:
+    """tokens の指す値"""
+    current = document
+    for token in tokens:
+        if isinstance(current, dict):
+            if token not in current:
+                raise _error(operation, f"path not found at {token!r}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_index(current, token, operation, adding=False)]
+        else:
+            raise _error(operation, f"cannot traverse into {type(current).__name__}")
+    return current
+
+
+def _parent(document: Any, pointer: str, operation: Mapping[str, Any]) -> Tuple[Any, str]:
+    tokens = _split(pointer, operation)
+    return _resolve(document, tokens[:-1], operation), tokens[-1]
+
+
+def _add(document: Any, pointer: str, value: Any, operation: Mapping[str, Any]) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(document, pointer, operation)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, operation, adding=True), value)
+    else:
+        raise _error(operation, f"cannot add into {type(parent).__name__}")
+    return document
+
+
+def _remove(document: Any, pointer: str, operation: Mapping[str, Any]) -> Any:
+    if pointer == "":
+        raise _error(operation, "cannot remove the whole document")
+    parent, token = _parent(document, pointer, operation)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise _error(operation, f"path not found at {token!r}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, operation, adding=False))
+    raise _error(operation, f"cannot remove from {type(parent).__name__}")
+
+
+def apply_patch(document: Any, operations: Sequence[Mapping[str, Any]]) -> Any:
+    """
+    JSON Patch の操作を順に適用
+
+    Args:
+        document: 対象の文書（その場で変更される）
+        operations: RFC 6902 の操作のリスト
+
+    Returns:
+        適用後の文書（ルートを置き換えた場合は新しい値）
+
+    Raises:
+        ValidationError: 操作が不正、パスが存在しない、test が一致しない場合
+            （それまでの操作は適用済み。呼び出し側は複製に適用すること）
+
+    Example:
+        >>> apply_patch({"files": ["a"]}, [{"op": "add", "path": "/files/-", "value": "b"}])
+        {'files': ['a', 'b']}
+    """
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path")
+        if not isinstance(path, str):
+            raise _error(operation, "missing path")
+        if op == "add":
+            document = _add(document, path, copy.deepcopy(operation.get("value")), operation)
+        elif op == "remove":
+            _remove(document, path, operation)
+        elif op == "replace":
+            _resolve(document, _split(path, operation), operation)
+            if path != "":
+                _remove(document, path, operation)
+            document = _add(document, path, copy.deepcopy(operation.get("value")), operation)
+        elif op in ("move", "copy"):
+            source = operation.get("from")
+            if not isinstance(source, str):
+                raise _error(operation, "missing from")
+            if op == "move":
+                value = _remove(document, source, operation)
+            else:
+                value = copy.deepcopy(_resolve(document, _split(source, operation), operation))
+            document = _add(document, path, value, operation)
+        elif op == "test":
+            if _resolve(document, _split(path, operation), operation) != operation.get("value"):
+                raise _error(operation, "test failed")
+        else:
+            raise _error(operation, f"unknown op {op!r}")
+    return document
+
+
+def make_patch(before: Any, after: Any, path: str = "") -> List[_Operation]:
+    """
+    before を after にする操作列を求める
+
+    Args:
+        before: 変更前の値
+        after: 変更後の値
+        path: 値の位置（JSON Pointer。操作のパスの接頭辞になる）
+
+    Returns:
+        操作のリスト（同じなら空）
+
+    Example:
+        >>> make_patch({"files": ["a"], "n": 1}, {"files": ["a", "b"], "n": 2})
+        [{'op': 'add', 'path': '/files/-', 'value': 'b'},
+         {'op': 'replace', 'path': '/n', 'value': 2}]
+    """
+    if before == after:
+        return []
+    if isinstance(before, dict) and isinstance(after, dict):
+        operations: List[_Operation] = []
+        for key, value in after.items():
+            child = f"{path}/{escape_pointer(key)}"
+            if key not in before:
+                operations.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+            else:
+                operations.extend(make_patch(before[key], value, child))
+        for key in before:
+            if key not in after:
+                operations.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+        return operations
+    if (
+        isinstance(before, list)
+        and isinstance(after, list)
+        and len(after) > len(before)
+        and after[: len(before)] == before
+    ):
+        return [
+            {"op": "add", "path": f"{path}/-", "value": copy.deepcopy(value)}
+            for value in after[len(before) :]
+        ]
+    return [{"op": "replace", "path": path, "value": copy.deepcopy(after)}]
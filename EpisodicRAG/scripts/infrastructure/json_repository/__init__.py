@@ -12,6 +12,10 @@ JSONファイルの読み書きを担当するインフラストラクチャ層
 json_repository/
 ├── __init__.py        # 公開API
 ├── operations.py      # 基本操作（load_json, save_json等）
+├── codec.py           # JSONコーデック（orjson/ujson/標準ライブラリ）
+├── read_cache.py      # mtime/size検証付きLRU読み込みキャッシュ
+├── content_hash.py    # 内容ハッシュ比較による書き込み省略
+├── invalidation.py    # 書き込み時の分析キャッシュ破棄
 ├── load_strategy.py   # Strategy Pattern実装
 └── chained_loader.py  # Chain of Responsibility
 ```
@@ -37,6 +41,22 @@ load_json_with_templateの読み込みロジックを戦略クラスに分離。
 ARCHITECTURE: Chain of Responsibility
 ChainedLoaderが戦略を順番に試行し、最初に成功したものを返す。
 
+ARCHITECTURE: Strategy Pattern (JSON Codec)
+パース・シリアライズは JsonCodec で抽象化され、orjson / ujson が利用可能なら
+自動的に使用される。出力は標準ライブラリとバイト単位で一致する。
+
+ARCHITECTURE: Cache-Aside
+safe_read_json は (path, st_mtime_ns, st_size) をキーとする共有LRUキャッシュを
+経由する。戦略チェーンからは透過的で、save_json が該当エントリを無効化する。
+
+ARCHITECTURE: Skip-unchanged Writes
+save_json(skip_unchanged=True) は揮発フィールド（metadata.last_updated 等）を除いた
+正規形ハッシュで保存済みの内容と比較し、同じなら書き込まない。
+
+ARCHITECTURE: Write-Invalidate
+save_json / save_bytes は書き込みのたびに診断CLIの分析キャッシュ
+（infrastructure.analysis_cache）を invalidate_analysis_cache で破棄する。
+
 Usage:
     from infrastructure.json_repository import load_json, save_json, load_json_with_template
     from infrastructure.json_repository import try_load_json, try_read_json_from_file
@@ -47,6 +67,27 @@ from pathlib import Path
 from typing import Any, Callable, Mapping, Optional, TypeVar
 
 from infrastructure.json_repository.chained_loader import ChainedLoader
+from infrastructure.json_repository.codec import (
+    JsonCodec,
+    available_json_codecs,
+    get_json_codec,
+    json_dumps,
+    json_loads,
+    reset_json_codec,
+    set_json_codec,
+)
+from infrastructure.json_repository.content_hash import (
+    DEFAULT_VOLATILE_FIELDS,
+    content_hash,
+    get_write_stats,
+    reset_write_stats,
+    stored_content_hash,
+)
+from infrastructure.json_repository.invalidation import (
+    invalidate_analysis_cache,
+    reset_analysis_cache_tracking,
+    track_analysis_cache,
+)
 from infrastructure.json_repository.load_strategy import (
     DefaultLoadStrategy,
     FactoryLoadStrategy,
@@ -57,14 +98,21 @@ from infrastructure.json_repository.load_strategy import (
 )
 from infrastructure.json_repository.operations import (
     confirm_file_overwrite,
+    ensure_cache_directory,
     ensure_directory,
     file_exists,
     load_json,
     safe_read_json,
+    save_bytes,
     save_json,
     try_load_json,
     try_read_json_from_file,
 )
+from infrastructure.json_repository.read_cache import (
+    JsonReadCache,
+    get_json_read_cache,
+    reset_json_read_cache,
+)
 
 # モジュールロガー
 logger = logging.getLogger("episodic_rag")
@@ -147,9 +195,11 @@ __all__ = [
     # 基本操作
     "load_json",
     "save_json",
+    "save_bytes",
     "load_json_with_template",
     "file_exists",
     "ensure_directory",
+    "ensure_cache_directory",
     "try_load_json",
     "confirm_file_overwrite",
     "try_read_json_from_file",
@@ -164,4 +214,26 @@ __all__ = [
     "DefaultLoadStrategy",
     # Chain of Responsibility（拡張用）
     "ChainedLoader",
+    # JSONコーデック
+    "JsonCodec",
+    "json_loads",
+    "json_dumps",
+    "get_json_codec",
+    "set_json_codec",
+    "reset_json_codec",
+    "available_json_codecs",
+    # 読み込みキャッシュ
+    "JsonReadCache",
+    "get_json_read_cache",
+    "reset_json_read_cache",
+    # 内容ハッシュ（書き込み省略）
+    "DEFAULT_VOLATILE_FIELDS",
+    "content_hash",
+    "stored_content_hash",
+    "get_write_stats",
+    "reset_write_stats",
+    # 分析キャッシュの破棄
+    "invalidate_analysis_cache",
+    "track_analysis_cache",
+    "reset_analysis_cache_tracking",
 ]
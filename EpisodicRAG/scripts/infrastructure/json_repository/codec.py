@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+JSON Codec - 差し替え可能なJSONエンコーダ/デコーダ
+==================================================
+
+JSONのパース・シリアライズを担当するバックエンドを抽象化する。
+orjson / ujson がインポート可能であれば高速なバックエンドを使用し、
+なければ標準ライブラリの json にフォールバックする。
+
+## 設計意図
+
+ARCHITECTURE: Strategy Pattern
+JsonCodec を継承したバックエンドを get_json_codec() で選択する。
+呼び出し側（operations.py, ConfigLoader, InputLoader）は json_loads / json_dumps
+のみを使い、バックエンドの違いを意識しない。
+
+## 出力の互換性
+
+どのバックエンドでも、出力は標準ライブラリの
+json.dumps(data, ensure_ascii=False, indent=indent) とバイト単位で一致する。
+
+- orjson: indent=2 とコンパクト形式のみ対応。表記が異なり得る浮動小数点数
+  （orjson は 1e16、標準ライブラリは 1e+16 など）を含む出力、64bitを超える整数、
+  str以外のキーは標準ライブラリで再エンコードする。
+  JSON仕様外の NaN / Infinity は orjson では null になる（本プラグインでは扱わない）
+- ujson: 出力形式が異なるため読み込みのみに使用する
+- 読み込みで高速バックエンドが失敗した場合（NaN リテラル等）は
+  標準ライブラリで再試行し、エラーメッセージも標準ライブラリのものになる
+
+## バックエンドの選択
+
+環境変数 EPISODIC_RAG_JSON_CODEC（auto / orjson / ujson / stdlib）で指定できる。
+デフォルトは auto（orjson → ujson → stdlib の順に利用可能なもの）。
+
+Usage:
+    from infrastructure.json_repository import json_dumps, json_loads
+
+    data = json_loads(text)
+    text = json_dumps(data)                 # indent=2（人が読むファイル）
+    text = json_dumps(data, compact=True)   # インデントなし（機械専用ファイル）
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Type, Union
+
+__all__ = [
+    "JsonCodec",
+    "StdlibJsonCodec",
+    "OrjsonCodec",
+    "UjsonCodec",
+    "get_json_codec",
+    "set_json_codec",
+    "reset_json_codec",
+    "available_json_codecs",
+    "json_loads",
+    "json_dumps",
+    "COMPACT_SEPARATORS",
+]
+
+# コンパクト形式の区切り文字（空白なし）
+COMPACT_SEPARATORS = (",", ":")
+
+# orjson と標準ライブラリで表記が異なり得る浮動小数点数
+# （指数表記、および orjson が 0.00001 のように小数表記する 1e-4 未満の値）。
+# 文字列中の "1e5" 等にもマッチするが、その場合は標準ライブラリで
+# 再エンコードするだけなので結果は常に正しい
+_FLOAT_MISMATCH_PATTERN = re.compile(rb"\de[-+\d]|0\.0000")
+
+
+class JsonCodec:
+    """
+    JSONコーデックの基底クラス（標準ライブラリ実装を兼ねる）
+
+    Attributes:
+        name: バックエンド名
+    """
+
+    name = "stdlib"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """バックエンドがインポート可能か"""
+        return True
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        """
+        JSON文字列をパース
+
+        Args:
+            text: JSON文字列
+
+        Returns:
+            パース結果
+
+        Raises:
+            json.JSONDecodeError: パースに失敗した場合
+        """
+        return json.loads(text)
+
+    def dumps(self, data: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        """
+        JSON文字列にシリアライズ
+
+        Args:
+            data: シリアライズするデータ
+            indent: インデント幅（compact=True の場合は無視）
+            compact: インデント・空白なしで出力するか
+
+        Returns:
+            JSON文字列
+        """
+        if compact:
+            return json.dumps(data, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+        return json.dumps(data, ensure_ascii=False, indent=indent)
+
+
+class StdlibJsonCodec(JsonCodec):
+    """標準ライブラリ json によるコーデック"""
+
+    name = "stdlib"
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson によるコーデック（読み書きとも高速化）"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        try:
+            return self._orjson.loads(text)
+        except self._orjson.JSONDecodeError:
+            # NaN/巨大整数などorjson非対応の入力、および正確なエラーメッセージのため
+            return json.loads(text)
+
+    def dumps(self, data: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        if compact:
+            option = 0
+        elif indent == 2:
+            option = self._orjson.OPT_INDENT_2
+        else:
+            return super().dumps(data, indent=indent, compact=compact)
+
+        try:
+            encoded: bytes = self._orjson.dumps(data, option=option)
+        except TypeError:
+            # 64bit超の整数、str以外のキー等
+            return super().dumps(data, indent=indent, compact=compact)
+        if _FLOAT_MISMATCH_PATTERN.search(encoded):
+            return super().dumps(data, indent=indent, compact=compact)
+        return encoded.decode("utf-8")
+
+
+class UjsonCodec(JsonCodec):
+    """ujson によるコーデック（読み込みのみ高速化、書き込みは標準ライブラリ）"""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import ujson  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        try:
+            return self._ujson.loads(text)
+        except ValueError:
+            return json.loads(text)
+
+
+# 自動選択の優先順位
+_CODEC_CLASSES: Dict[str, Type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "stdlib": StdlibJsonCodec,
+}
+
+_codec: Optional[JsonCodec] = None
+
+
+def available_json_codecs() -> List[str]:
+    """
+    利用可能なバックエンド名の一覧（優先順）
+
+    Returns:
+        バックエンド名のリスト（"stdlib" は常に含まれる）
+    """
+    return [name for name, cls in _CODEC_CLASSES.items() if cls.is_available()]
+
+
+def _create_codec(name: str) -> JsonCodec:
+    """名前からコーデックを生成（利用不可・不明な名前は自動選択）"""
+    name = name.lower()
+    codec_class = _CODEC_CLASSES.get(name)
+    if codec_class is not None and codec_class.is_available():
+        return codec_class()
+    for candidate in _CODEC_CLASSES.values():
+        if candidate.is_available():
+            return candidate()
+    return StdlibJsonCodec()
+
+
+def get_json_codec() -> JsonCodec:
+    """
+    現在のJSONコーデックを取得（シングルトン）
+
+    初回呼び出し時に環境変数 EPISODIC_RAG_JSON_CODEC を参照して選択する。
+
+    Returns:
+        JsonCodec インスタンス
+    """
+    global _codec
+    if _codec is None:
+        _codec = _create_codec(os.environ.get("EPISODIC_RAG_JSON_CODEC", "auto"))
+    return _codec
+
+
+def set_json_codec(codec: Union[str, JsonCodec]) -> JsonCodec:
+    """
+    JSONコーデックを明示的に設定
+
+    Args:
+        codec: バックエンド名（"orjson" / "ujson" / "stdlib" / "auto"）または JsonCodec
+
+    Returns:
+        設定された JsonCodec（指定バックエンドが利用不可の場合は自動選択の結果）
+    """
+    global _codec
+    _codec = codec if isinstance(codec, JsonCodec) else _create_codec(codec)
+    return _codec
+
+
+def reset_json_codec() -> None:
+    """コーデックをリセット（次回 get_json_codec() で再選択、テスト用）"""
+    global _codec
+    _codec = None
+
+
+def json_loads(text: Union[str, bytes]) -> Any:
+    """
+    現在のコーデックでJSON文字列をパース
+
+    Args:
+        text: JSON文字列
+
+    Returns:
+        パース結果
+
+    Raises:
+        json.JSONDecodeError: パースに失敗した場合
+    """
+    return get_json_codec().loads(text)
+
+
+def json_dumps(data: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+    """
+    現在のコーデックでJSON文字列にシリアライズ
+
+    Args:
+        data: シリアライズするデータ
+        indent: インデント幅（デフォルト: 2）
+        compact: インデント・空白なしで出力するか
+
+    Returns:
+        json.dumps(data, ensure_ascii=False, indent=indent) と同一の文字列
+        （compact=True の場合は separators=(",", ":")）
+    """
+    return get_json_codec().dumps(data, indent=indent, compact=compact)
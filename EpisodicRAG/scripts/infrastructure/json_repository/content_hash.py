@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Content Hash - 内容が変わらない書き込みの省略
+=============================================
+
+保存しようとしている dict と保存済みファイルの内容を、揮発的なフィールド
+（metadata.last_updated 等）を除いたハッシュで比較し、同じなら書き込みを
+省略するためのヘルパー。git 同期で内容の変わらないコミットが生じるのを防ぐ。
+
+## 設計意図
+
+ARCHITECTURE: Canonical Hash + Signature Cache
+- ハッシュはキーをソートした正規形（標準 json、区切り文字固定）の SHA-256。
+  キーの挿入順や JSON コーデック（orjson 等）の違いに依存せず、
+  同じデータは常に同じハッシュになる
+- 揮発フィールドは "metadata.last_updated" のようなドット区切りのパスで指定し、
+  該当する dict だけを複製して取り除く（元の dict は変更しない）
+- 保存済みファイルのハッシュは (st_ino, st_mtime_ns, st_size) ごとに記録し、
+  ファイルが変わっていなければ再読み込みしない。アトミックな rename でも
+  inode は再利用され得るため、記録時点で更新直後（RACY_WINDOW_NS 以内）の
+  ファイルは記録しない（read_cache と同じ）
+- 書き込み・省略の件数をプロセス全体で集計する（get_write_stats）
+
+Usage:
+    from infrastructure.json_repository import save_json, get_write_stats
+
+    save_json(path, data, skip_unchanged=True)   # 同じ内容なら書き込まない
+    get_write_stats()  # {"written": 3, "skipped": 5}
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from .codec import json_loads
+from .read_cache import RACY_WINDOW_NS
+
+__all__ = [
+    "DEFAULT_VOLATILE_FIELDS",
+    "content_hash",
+    "get_write_stats",
+    "record_write",
+    "remember_content_hash",
+    "reset_write_stats",
+    "stored_content_hash",
+]
+
+# 比較時に無視するフィールドのデフォルト
+DEFAULT_VOLATILE_FIELDS: Tuple[str, ...] = ("metadata.last_updated",)
+
+# (st_ino, st_mtime_ns, st_size)
+_Signature = Tuple[int, int, int]
+
+# 解決済みパス → (シグネチャ, 揮発フィールド, ハッシュ)
+_known: Dict[str, Tuple[_Signature, Tuple[str, ...], str]] = {}
+_stats = {"written": 0, "skipped": 0}
+_lock = threading.Lock()
+
+
+def _without(data: Mapping[str, Any], path: Sequence[str]) -> Mapping[str, Any]:
+    """path のキーを取り除いたコピー（経路上の dict のみ複製）"""
+    head, rest = path[0], path[1:]
+    if head not in data:
+        return data
+    copied = dict(data)
+    if not rest:
+        del copied[head]
+    elif isinstance(copied[head], Mapping):
+        copied[head] = _without(copied[head], rest)
+    return copied
+
+
+def content_hash(
+    data: Mapping[str, Any], volatile_fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS
+) -> str:
+    """
+    揮発フィールドを除いた内容のハッシュ（キー順に依存しない）
+
+    Args:
+        data: 対象の dict
+        volatile_fields: 無視するフィールドのドット区切りパス
+
+    Returns:
+        SHA-256 の16進文字列
+
+    Example:
+        >>> a = content_hash({"x": 1, "metadata": {"last_updated": "2025-01-01"}})
+        >>> a == content_hash({"metadata": {"last_updated": "2025-02-01"}, "x": 1})
+        True
+    """
+    for field in volatile_fields:
+        data = _without(data, field.split("."))
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _signature(path: Path) -> Optional[_Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _remember(
+    path: Path, signature: Optional[_Signature], fields: Tuple[str, ...], digest: str
+) -> None:
+    """ハッシュを記録（更新直後のファイルは同一シグネチャの上書きを見分けられないため記録しない）"""
+    key = os.path.abspath(path)
+    with _lock:
+        if signature is None or signature[1] >= time.time_ns() - RACY_WINDOW_NS:
+            _known.pop(key, None)
+        else:
+            _known[key] = (signature, fields, digest)
+
+
+def stored_content_hash(
+    file_path: Path, volatile_fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS
+) -> Optional[str]:
+    """
+    保存済みファイルの内容のハッシュ
+
+    自プロセスが最後に確認した時点からファイルが変わっていなければ
+    記録済みの値を返し、変わっていればファイルを読み込む。
+    更新直後のファイルは記録しないため、毎回読み込む。
+
+    Returns:
+        ハッシュ（ファイルが存在しない・JSONオブジェクトでない場合は None）
+    """
+    signature = _signature(file_path)
+    if signature is None:
+        return None
+    key = os.path.abspath(file_path)
+    fields = tuple(volatile_fields)
+    with _lock:
+        known = _known.get(key)
+    if known is not None and known[0] == signature and known[1] == fields:
+        return known[2]
+    try:
+        stored = json_loads(file_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(stored, dict):
+        return None
+    digest = content_hash(stored, fields)
+    _remember(file_path, signature, fields, digest)
+    return digest
+
+
+def remember_content_hash(
+    file_path: Path, digest: str, volatile_fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS
+) -> None:
+    """書き込んだ直後のファイルのハッシュを記録（更新直後の間は記録せず、古い記録を消す）"""
+    _remember(file_path, _signature(file_path), tuple(volatile_fields), digest)
+
+
+def record_write(written: bool) -> None:
+    """書き込み（True）・省略（False）を集計"""
+    with _lock:
+        _stats["written" if written else "skipped"] += 1
+
+
+def get_write_stats() -> Dict[str, int]:
+    """
+    書き込み・省略の件数
+
+    Returns:
+        {"written": n, "skipped": n}
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def reset_write_stats() -> None:
+    """記録済みのハッシュと件数を破棄（テスト用）"""
+    with _lock:
+        _known.clear()
+        _stats.update(written=0, skipped=0)
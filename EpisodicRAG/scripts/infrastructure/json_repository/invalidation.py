@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache Invalidation - 書き込み時の分析キャッシュ破棄
+==========================================================
+
+永続化層（save_json / save_bytes / AppendOnlyJournal / SqliteDigestStore）の
+書き込みのたびに呼ばれ、診断CLIの分析キャッシュ
+（Essences/.analysis_cache/AnalysisCache.json、infrastructure.analysis_cache）を削除する。
+
+## 設計意図
+
+ARCHITECTURE: Write-Invalidate
+- 分析キャッシュは入力ファイルの (mtime, size) のフィンガープリントで検証されるが、
+  書き込みの経路で明示的に破棄することで、mtime の分解能や時計に依存しない
+- 破棄するのは「書き込んだファイルと同じディレクトリの .analysis_cache」と
+  「このプロセスが読み書きした分析キャッシュ」（last_digest_times.json や
+  Digests/ のように Essences の外にあるファイルの書き込みも拾う）
+- ドットで始まるディレクトリ（.file_index / .analysis_cache 等の派生キャッシュ）
+  への書き込みでは破棄しない
+- json_repository 内の他モジュールに依存しない葉モジュール
+  （operations.py からも sqlite_store / journal からも循環なく使える）
+
+Usage:
+    from infrastructure.json_repository import invalidate_analysis_cache
+
+    invalidate_analysis_cache(written_path)
+"""
+
+import threading
+from pathlib import Path
+from typing import Set
+
+from domain.file_constants import ANALYSIS_CACHE_DIRNAME, ANALYSIS_CACHE_FILENAME
+
+__all__ = [
+    "invalidate_analysis_cache",
+    "reset_analysis_cache_tracking",
+    "track_analysis_cache",
+]
+
+_tracked: Set[Path] = set()
+_lock = threading.Lock()
+
+
+def track_analysis_cache(cache_file: Path) -> None:
+    """
+    このプロセスで使う分析キャッシュを登録（以降の書き込みで破棄される）
+
+    Args:
+        cache_file: 分析キャッシュファイルのパス
+    """
+    with _lock:
+        _tracked.add(cache_file)
+
+
+def invalidate_analysis_cache(written_path: Path) -> None:
+    """
+    ファイルの書き込みに伴って分析キャッシュを削除
+
+    Args:
+        written_path: 書き込んだファイルのパス
+
+    Example:
+        >>> invalidate_analysis_cache(essences / "ShadowGrandDigest.txt")
+        # essences/.analysis_cache/AnalysisCache.json が削除される
+    """
+    parent = written_path.parent
+    if parent.name.startswith("."):
+        return
+    with _lock:
+        targets = {parent / ANALYSIS_CACHE_DIRNAME / ANALYSIS_CACHE_FILENAME, *_tracked}
+    for target in targets:
+        try:
+            target.unlink()
+        except OSError:
+            # 存在しない・削除できない場合はフィンガープリントの検証に任せる
+            pass
+
+
+def reset_analysis_cache_tracking() -> None:
+    """登録済みの分析キャッシュをクリア（テスト用）"""
+    with _lock:
+        _tracked.clear()
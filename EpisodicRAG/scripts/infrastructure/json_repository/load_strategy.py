@@ -162,12 +162,12 @@ class TemplateLoadStrategy(LoadStrategy[T]):
     def __init__(
         self,
         read_func: Callable[[Path, bool], Optional[Dict[str, Any]]],
-        save_func: Callable[[Path, Dict[str, Any]], None],
+        save_func: Callable[[Path, Dict[str, Any]], object],
     ) -> None:
         """
         Args:
             read_func: JSON読み込み関数
-            save_func: JSON保存関数
+            save_func: JSON保存関数（戻り値は使わない）
         """
         self._read_func = read_func
         self._save_func = save_func
@@ -216,10 +216,10 @@ class FactoryLoadStrategy(LoadStrategy[T]):
     テンプレートも存在しない場合にファクトリ関数でデフォルト値を生成。
     """
 
-    def __init__(self, save_func: Callable[[Path, Dict[str, Any]], None]) -> None:
+    def __init__(self, save_func: Callable[[Path, Dict[str, Any]], object]) -> None:
         """
         Args:
-            save_func: JSON保存関数
+            save_func: JSON保存関数（戻り値は使わない）
         """
         self._save_func = save_func
 
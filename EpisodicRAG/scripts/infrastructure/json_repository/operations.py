@@ -4,6 +4,7 @@ JSON Operations - 基本的なJSON操作
 ==================================
 
 JSONファイルの読み書きに関する低レベル操作を提供。
+パース・シリアライズは codec.py のJSONコーデック（orjson等があれば高速版）を使用する。
 
 ## 設計意図
 
@@ -15,25 +16,60 @@ JSON操作のプリミティブをこのモジュールに集約し、
 
 | 関数 | 責務 |
 |------|------|
-| safe_read_json | JSONファイルを安全に読み込む（共通ヘルパー） |
+| safe_read_json | JSONファイルを安全に読み込む（共通ヘルパー、読み込みキャッシュ経由） |
 | load_json | 必須ファイルの読み込み（エラーは例外） |
-| save_json | ファイル保存（親ディレクトリ自動作成） |
+| save_json | ファイル保存（親ディレクトリ自動作成、デフォルトでアトミック書き込み、内容が同じなら省略可） |
+| save_bytes | バイナリファイルのアトミック保存 |
 | try_load_json | オプショナルファイル読み込み（エラーはdefault） |
-| try_read_json_from_file | バッチ処理向け読み込み（拡張子チェック付き） |
+| try_read_json_from_file | バッチ処理向け読み込み（拡張子チェック付き、アーカイブも読む） |
 | file_exists | ファイル存在チェック |
 | ensure_directory | ディレクトリ保証 |
+| ensure_cache_directory | キャッシュディレクトリ保証（.gitignore で追跡対象外） |
 | confirm_file_overwrite | 上書き確認 |
+
+## 書き込みの耐障害性
+
+save_json はデフォルトで「同一ディレクトリの一時ファイルに書き込み →
+fsync → os.replace で置換」するアトミック書き込みを行う。
+クラッシュや並行読み込みで GrandDigest.txt / ShadowGrandDigest.txt が
+途中まで書かれた状態で観測されることはない。
+再構築できるキャッシュ（file_index のマニフェスト、ヘッダー索引、分析キャッシュ、
+検索索引）は atomic=False（fastモード）で直接書き込む。書き込み途中のファイルは
+safe_read_json が不正なJSONとして扱い、読み手はキャッシュを作り直す。
+
+## 読み込みキャッシュ
+
+safe_read_json は read_cache.JsonReadCache を経由する。
+キーは (パス, st_mtime_ns, st_size) で、save_json は書き込んだパスを無効化する。
+
+## 分析キャッシュの破棄
+
+save_json / save_bytes は書き込みに成功すると invalidation.invalidate_analysis_cache で
+診断CLIの分析キャッシュ（Essences/.analysis_cache）を削除する。
 """
 
 import json
 import logging
+import os
+import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, Optional, Sequence, Union, cast
 
 from domain.constants import DIGEST_FILE_EXTENSION
 from domain.error_formatter import get_error_formatter
 from domain.exceptions import FileIOError
 
+from .codec import json_dumps, json_loads
+from .content_hash import (
+    DEFAULT_VOLATILE_FIELDS,
+    content_hash,
+    record_write,
+    remember_content_hash,
+    stored_content_hash,
+)
+from .invalidation import invalidate_analysis_cache
+from .read_cache import get_json_read_cache
+
 # モジュールロガー
 logger = logging.getLogger("episodic_rag")
 
@@ -52,6 +88,10 @@ def safe_read_json(file_path: Path, raise_on_error: bool = True) -> Optional[Dic
     Raises:
         FileIOError: raise_on_error=Trueの場合、JSONパースまたはI/Oエラー時
 
+    Note:
+        ファイルが前回読み込み時から変更されていなければ（mtime/size一致）、
+        共有キャッシュの複製を返す。返却値を変更してもキャッシュには影響しない。
+
     Example:
         >>> safe_read_json(Path("config.json"))
         {"version": "1.0"}
@@ -59,11 +99,19 @@ def safe_read_json(file_path: Path, raise_on_error: bool = True) -> Optional[Dic
         None
     """
     formatter = get_error_formatter()
+    cache = get_json_read_cache()
+    signature = cache.signature(file_path)
+    cached = cache.get(file_path, signature)
+    if cached is not None:
+        return cached
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            result: Dict[str, Any] = json.load(f)
-            return result
-    except json.JSONDecodeError as e:
+            result: Dict[str, Any] = json_loads(f.read())
+        if isinstance(result, dict):
+            cache.put(file_path, signature, result)
+        return result
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # fastモード（atomic=False）で書き込み途中のファイルは不正なJSON・UTF-8として扱う
         if raise_on_error:
             raise FileIOError(formatter.file.invalid_json(file_path, e)) from e
         return None
@@ -102,14 +150,114 @@ def load_json(file_path: Path) -> Dict[str, Any]:
     return cast(Dict[str, Any], result)
 
 
-def save_json(file_path: Path, data: Dict[str, Any], indent: int = 2) -> None:
+def _fsync_directory(dir_path: Path) -> None:
+    """
+    ディレクトリエントリをディスクに同期（rename の永続化）
+
+    Windows 等ディレクトリを開けない環境では何もしない。
+
+    Args:
+        dir_path: 同期するディレクトリ
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        # 一部のファイルシステムはディレクトリのfsyncをサポートしない
+        pass
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_text(file_path: Path, text: Union[str, bytes], fsync_dir: bool = False) -> None:
+    """
+    テキスト（またはバイト列）をアトミックに書き込む（一時ファイル + fsync + os.replace）
+
+    一時ファイルは対象と同じディレクトリに作成するため、os.replace は
+    同一ファイルシステム内のアトミックなrenameになる。
+    既存ファイルのパーミッションは引き継がれる。
+
+    Args:
+        file_path: 書き込み先のパス
+        text: 書き込む内容（bytes の場合はバイナリモードで書き込む）
+        fsync_dir: rename 後に親ディレクトリもfsyncするか
+
+    Raises:
+        OSError: 書き込み・置換に失敗した場合（一時ファイルは削除される）
+    """
+    mode = 0o666
+    if file_path.exists():
+        # 読み取り専用ファイルは直接書き込みと同様に拒否する
+        if not os.access(file_path, os.W_OK):
+            raise PermissionError(13, "Permission denied", str(file_path))
+        mode = file_path.stat().st_mode & 0o7777
+
+    tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    fd_owned = True
+    try:
+        if isinstance(text, bytes):
+            with open(fd, 'wb') as fb:
+                fd_owned = False  # 以降はファイルオブジェクトがfdをクローズする
+                fb.write(text)
+                fb.flush()
+                os.fsync(fb.fileno())
+        else:
+            with open(fd, 'w', encoding='utf-8') as f:
+                fd_owned = False
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+        if file_path.exists():
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if fd_owned:
+            os.close(fd)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+    if fsync_dir:
+        _fsync_directory(file_path.parent)
+
+
+def save_json(
+    file_path: Path,
+    data: Dict[str, Any],
+    indent: int = 2,
+    atomic: bool = True,
+    fsync_dir: bool = False,
+    compact: bool = False,
+    skip_unchanged: bool = False,
+    volatile_fields: Sequence[str] = DEFAULT_VOLATILE_FIELDS,
+) -> bool:
     """
     dictをJSONファイルに保存（親ディレクトリ自動作成）
 
+    デフォルトではアトミック書き込みを行うため、書き込み途中のクラッシュや
+    並行読み込みでも、読み手は旧内容か新内容のどちらか完全な状態のみを観測する。
+    skip_unchanged=True の場合、保存済みの内容と揮発フィールドを除いたハッシュが
+    同じなら書き込まない（省略件数は get_write_stats() で取得できる）。
+
     Args:
         file_path: 保存先のパス
         data: 保存するdict
         indent: インデント幅（デフォルト: 2）
+        atomic: アトミック書き込みを行うか（デフォルト: True）。
+            Falseの場合はfastモード（対象ファイルへ直接書き込み、fsyncなし）
+        fsync_dir: アトミック書き込み時、rename後に親ディレクトリもfsyncするか
+        compact: インデント・空白なしで保存するか（機械専用ファイル向け、indentは無視）
+        skip_unchanged: 内容が変わらない場合は書き込まないか
+        volatile_fields: skip_unchanged の比較で無視するフィールド
+            （ドット区切り、デフォルト: metadata.last_updated）
+
+    Returns:
+        書き込んだ場合True、内容が同じで省略した場合False
 
     Raises:
         FileIOError: ファイルの書き込みに失敗した場合
@@ -117,14 +265,63 @@ def save_json(file_path: Path, data: Dict[str, Any], indent: int = 2) -> None:
     Example:
         >>> save_json(Path("output/result.json"), {"status": "success", "count": 42})
         # output/result.json が作成される（親ディレクトリも自動作成）
+        >>> save_json(Path("scratch/tmp.json"), data, atomic=False)
+        # fastモード（使い捨てファイル向け）
+        >>> save_json(Path("last_digest_times.json"), times, compact=True)
+        # インデントなしで保存（機械専用ファイル向け）
+        >>> save_json(Path("GrandDigest.txt"), grand, skip_unchanged=True)
+        False  # last_updated 以外が同じなら書き込まない
+    """
+    formatter = get_error_formatter()
+    digest = content_hash(data, volatile_fields) if skip_unchanged else None
+    if digest is not None and stored_content_hash(file_path, volatile_fields) == digest:
+        record_write(False)
+        logger.debug(f"save_json skipped (unchanged): {file_path}")
+        return False
+
+    get_json_read_cache().invalidate(file_path)
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        text = json_dumps(data, indent=indent, compact=compact)
+        if atomic:
+            _atomic_write_text(file_path, text, fsync_dir=fsync_dir)
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+    except IOError as e:
+        raise FileIOError(formatter.file.file_io_error("write", file_path, e)) from e
+    invalidate_analysis_cache(file_path)
+    if digest is not None:
+        remember_content_hash(file_path, digest, volatile_fields)
+    record_write(True)
+    return True
+
+
+def save_bytes(file_path: Path, data: bytes, fsync_dir: bool = False) -> None:
+    """
+    バイト列をファイルにアトミックに保存（親ディレクトリ自動作成）
+
+    save_json と同じ一時ファイル + os.replace 方式のバイナリ版。
+    ベクトルデータ等、JSON以外の機械専用ファイル向け。
+
+    Args:
+        file_path: 保存先のパス
+        data: 保存するバイト列
+        fsync_dir: rename後に親ディレクトリもfsyncするか
+
+    Raises:
+        FileIOError: ファイルの書き込みに失敗した場合
+
+    Example:
+        >>> save_bytes(Path("Essences/VectorIndex.bin"), vectors.tobytes())
     """
     formatter = get_error_formatter()
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
+        _atomic_write_text(file_path, data, fsync_dir=fsync_dir)
     except IOError as e:
         raise FileIOError(formatter.file.file_io_error("write", file_path, e)) from e
+    invalidate_analysis_cache(file_path)
 
 
 def try_load_json(
@@ -168,6 +365,8 @@ def try_read_json_from_file(file_path: Path, log_on_error: bool = True) -> Optio
 
     ループ内で複数ファイルを処理する際に使用。
     エラー時はスキップしてNoneを返す。
+    ファイルが存在しない場合は、同じディレクトリの .archive/ に圧縮保存
+    されていればそこから読む（infrastructure.archive）。
 
     Args:
         file_path: 読み込むファイルパス
@@ -184,12 +383,15 @@ def try_read_json_from_file(file_path: Path, log_on_error: bool = True) -> Optio
                 continue
             # 処理を続行
     """
-    if not file_path.exists():
-        return None
-
     if file_path.suffix != DIGEST_FILE_EXTENSION:
         return None
 
+    if not file_path.exists():
+        # 循環インポートを避けるためローカルインポート
+        from infrastructure.archive import read_archived_json
+
+        return read_archived_json(file_path)
+
     result = safe_read_json(file_path, raise_on_error=False)
     if result is None and log_on_error:
         logger.warning(f"Failed to parse {file_path.name} as JSON (skipped)")
@@ -234,6 +436,37 @@ def ensure_directory(dir_path: Path) -> None:
         raise FileIOError(formatter.file.directory_creation_failed(dir_path, e)) from e
 
 
+# キャッシュディレクトリに置く .gitignore の内容（ディレクトリごと追跡対象外にする）
+CACHE_GITIGNORE = "# EpisodicRAG のキャッシュ（自動生成・再構築可能）\n*\n"
+
+
+def ensure_cache_directory(dir_path: Path) -> None:
+    """
+    再構築できるキャッシュ用のディレクトリを作成し、git の追跡対象から外す
+
+    データディレクトリを git で同期していても、キャッシュの書き換えが
+    コミットに混ざらないよう、ディレクトリ内に「*」だけの .gitignore を置く。
+
+    Args:
+        dir_path: キャッシュディレクトリのパス
+
+    Raises:
+        FileIOError: ディレクトリの作成に失敗した場合
+
+    Example:
+        >>> ensure_cache_directory(Path("Loops/../.file_index"))
+        # .file_index/.gitignore が作成される
+    """
+    ensure_directory(dir_path)
+    gitignore = dir_path / ".gitignore"
+    if gitignore.exists():
+        return
+    try:
+        gitignore.write_text(CACHE_GITIGNORE, encoding="utf-8")
+    except OSError as e:
+        logger.debug(f"cache .gitignore not written: {gitignore} ({e})")
+
+
 def confirm_file_overwrite(file_path: Path, force: bool = False) -> bool:
     """
     ファイルの上書き確認を行う
@@ -261,9 +494,11 @@ __all__ = [
     "safe_read_json",
     "load_json",
     "save_json",
+    "save_bytes",
     "try_load_json",
     "try_read_json_from_file",
     "file_exists",
     "ensure_directory",
+    "ensure_cache_directory",
     "confirm_file_overwrite",
 ]
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+JSON Read Cache - mtime/size検証付きLRU読み込みキャッシュ
+=========================================================
+
+1回の /digest 実行中に同じJSONファイル（last_digest_times.json,
+ShadowGrandDigest.txt, GrandDigest.txt, config.json）が何度も読み込まれる
+コストを削減する、プロセス全体で共有される読み込みキャッシュ。
+
+## 設計意図
+
+ARCHITECTURE: Cache-Aside Pattern
+safe_read_json の内部でのみ使用され、呼び出し側（LoadStrategy チェーン含む）
+からは透過的。キーは (解決済みパス, st_mtime_ns, st_size) で、ファイルが
+外部で変更されればキーが変わるため自動的にミスになる。
+自プロセスの save_json は書き込み時に該当パスを明示的に無効化する。
+
+## 安全性
+
+- 返却値は毎回複製（clone_json_value）されるため、呼び出し側が
+  返されたdictを変更してもキャッシュは汚染されない
+- mtime の分解能が粗いファイルシステムでの「同一mtime・同一サイズの上書き」
+  を誤検出しないよう、キャッシュ時点で更新直後（RACY_WINDOW_NS 以内）の
+  ファイルは再利用しない（racy-git と同じ考え方）
+
+Usage:
+    from infrastructure.json_repository import get_json_read_cache
+
+    cache = get_json_read_cache()
+    cache.stats()  # {"hits": 3, "misses": 2, "size": 2, "max_entries": 64}
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = [
+    "JsonReadCache",
+    "clone_json_value",
+    "get_json_read_cache",
+    "reset_json_read_cache",
+    "DEFAULT_MAX_ENTRIES",
+    "RACY_WINDOW_NS",
+]
+
+# デフォルトの最大エントリ数
+DEFAULT_MAX_ENTRIES = 64
+
+# 更新直後とみなす時間幅（ナノ秒）。この範囲のmtimeを持つエントリは再利用しない
+RACY_WINDOW_NS = 50_000_000
+
+# (st_mtime_ns, st_size)
+_Signature = Tuple[int, int]
+
+
+def clone_json_value(value: Any) -> Any:
+    """
+    JSON互換値の複製を作成
+
+    copy.deepcopy よりも高速な、dict/list のみを再帰的に複製する実装。
+    JSONから読み込んだ値（dict/list/str/int/float/bool/None）専用。
+
+    Args:
+        value: 複製する値
+
+    Returns:
+        複製された値（イミュータブルなスカラーは同一オブジェクト）
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: clone_json_value(v) for k, v in value.items()}
+    if value_type is list:
+        return [clone_json_value(v) for v in value]
+    return value
+
+
+class JsonReadCache:
+    """
+    mtime/sizeで検証されるスレッドセーフなLRUキャッシュ
+
+    Attributes:
+        max_entries: 保持する最大エントリ数（0でキャッシュ無効）
+        hits: キャッシュヒット数
+        misses: キャッシュミス数
+
+    Example:
+        >>> cache = JsonReadCache(max_entries=8)
+        >>> cache.get(path) is None  # 初回はミス
+        True
+        >>> cache.put(path, signature, data)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        初期化
+
+        Args:
+            max_entries: 保持する最大エントリ数
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[_Signature, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def signature(file_path: Path) -> Optional[_Signature]:
+        """
+        ファイルの検証用シグネチャを取得
+
+        Args:
+            file_path: 対象ファイル
+
+        Returns:
+            (st_mtime_ns, st_size)、ファイルが存在しない場合はNone
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, file_path: Path, signature: Optional[_Signature]) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュから読み込み結果を取得（複製を返す）
+
+        Args:
+            file_path: 対象ファイル
+            signature: 現在のファイルシグネチャ（signature() の結果）
+
+        Returns:
+            キャッシュ済みデータの複製、ミスの場合はNone
+        """
+        if self.max_entries <= 0 or signature is None:
+            return None
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = entry[1]
+        return clone_json_value(data)  # type: ignore[no-any-return]
+
+    def put(self, file_path: Path, signature: Optional[_Signature], data: Dict[str, Any]) -> None:
+        """
+        読み込み結果をキャッシュに登録
+
+        更新直後のファイル（mtimeが現在時刻から RACY_WINDOW_NS 以内）は
+        同一シグネチャでの上書きを検出できないため登録しない。
+
+        Args:
+            file_path: 対象ファイル
+            signature: 読み込み前に取得したファイルシグネチャ
+            data: 読み込んだデータ（複製して保持する）
+        """
+        if self.max_entries <= 0 or signature is None:
+            return
+        if signature[0] >= time.time_ns() - RACY_WINDOW_NS:
+            return
+        key = self._key(file_path)
+        stored = clone_json_value(data)
+        with self._lock:
+            self._entries[key] = (signature, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_path: Path) -> None:
+        """
+        指定ファイルのエントリを削除（save_json から呼ばれる）
+
+        Args:
+            file_path: 対象ファイル
+        """
+        with self._lock:
+            self._entries.pop(self._key(file_path), None)
+
+    def clear(self) -> None:
+        """全エントリを削除し、カウンタをリセット"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            hits / misses / size / max_entries を含むdict
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+# プロセス全体で共有するキャッシュ
+_cache: Optional[JsonReadCache] = None
+
+
+def get_json_read_cache() -> JsonReadCache:
+    """
+    共有JsonReadCacheを取得（シングルトン）
+
+    Returns:
+        JsonReadCache インスタンス
+    """
+    global _cache
+    if _cache is None:
+        _cache = JsonReadCache()
+    return _cache
+
+
+def reset_json_read_cache(max_entries: Optional[int] = None) -> None:
+    """
+    共有キャッシュをリセット（テスト用）
+
+    Args:
+        max_entries: 新しい最大エントリ数（Noneの場合はデフォルト）
+    """
+    global _cache
+    _cache = JsonReadCache(max_entries if max_entries is not None else DEFAULT_MAX_ENTRIES)
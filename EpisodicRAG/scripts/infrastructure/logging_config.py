@@ -10,16 +10,34 @@ Usage:
 
 環境変数:
     EPISODIC_RAG_LOG_LEVEL: ログレベル (DEBUG, INFO, WARNING, ERROR)
-    EPISODIC_RAG_LOG_FORMAT: ログフォーマット (simple, detailed)
+    EPISODIC_RAG_LOG_FORMAT: ログフォーマット (simple, detailed, json)
+    EPISODIC_RAG_LOG_FILE: json 形式の出力先ファイル（省略時は stderr）
+
+## JSON Lines 出力
+
+EPISODIC_RAG_LOG_FORMAT=json では、stderr のテキスト出力の代わりに
+ロガーレベル以上の全レコードを1行1JSONで出力する（stdout の INFO 出力はそのまま）。
+
+    {"timestamp": "2026-01-01T12:00:00.123+09:00", "level": "INFO",
+     "logger": "application.shadow.cascade_orchestrator", "event": "cascade.promote",
+     "kind": "span", "context": {"level": "weekly", "files_processed": 3},
+     "span_id": "9f1c...", "parent_id": "0b7e...", "duration_ms": 1.234, "status": "ok"}
+
+構造化ロガーの state / file_op / validation / decision は kind・context 付きで、
+span() は所要時間付きで出力される（infrastructure.structured_logging）。
 """
 
+import json
 import logging
 import os
 import sys
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 
 __all__ = [
+    "JsonLinesFormatter",
     "get_logger",
+    "json_log_enabled",
     "setup_logging",
     "log_info",
     "log_warning",
@@ -41,6 +59,46 @@ LOG_LEVELS = {
 # フォーマット定義
 FORMAT_SIMPLE = "[%(levelname)s] %(message)s"
 FORMAT_DETAILED = "[%(levelname)s] %(name)s: %(message)s"
+FORMAT_JSON = "json"
+
+# JSON 出力に含める構造化フィールド（LogRecord の extra として渡される）
+JSON_FIELDS = ("kind", "context", "span_id", "parent_id", "duration_ms", "status")
+
+
+# =============================================================================
+# JSON Lines フォーマッター
+# =============================================================================
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    LogRecord を1行の JSON に変換するフォーマッター
+
+    構造化ロガーが extra で渡した event / source / kind / context / span_id 等を
+    フィールドとして出力する。extra のない通常のレコードは message を event とする。
+    JSON に変換できない値（Path、lazy() の値等）は str() で文字列化する。
+
+    Example:
+        >>> handler.setFormatter(JsonLinesFormatter())
+        >>> # {"timestamp": "...", "level": "INFO", "logger": "...", "event": "...", ...}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": getattr(record, "source", record.name),
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+        for name in JSON_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
 
 # =============================================================================
@@ -72,13 +130,44 @@ def _get_log_level_from_env() -> int:
 
 
 def _get_log_format_from_env() -> str:
-    """環境変数からログフォーマットを取得"""
+    """環境変数からログフォーマットを取得（json の場合もテキスト出力は simple）"""
     format_name = os.environ.get("EPISODIC_RAG_LOG_FORMAT", "simple").lower()
     if format_name == "detailed":
         return FORMAT_DETAILED
     return FORMAT_SIMPLE
 
 
+def _is_json_format_from_env() -> bool:
+    """環境変数で JSON Lines 出力が指定されているか"""
+    return os.environ.get("EPISODIC_RAG_LOG_FORMAT", "").lower() == FORMAT_JSON
+
+
+def _create_json_handler() -> logging.Handler:
+    """JSON Lines のハンドラー（EPISODIC_RAG_LOG_FILE があればファイル、なければ stderr）"""
+    log_file = os.environ.get("EPISODIC_RAG_LOG_FILE")
+    handler: logging.Handler
+    if log_file:
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+# setup_logging で JSON Lines 出力を有効にしたか
+_json_enabled = False
+
+
+def json_log_enabled() -> bool:
+    """
+    JSON Lines 出力が有効か（EPISODIC_RAG_LOG_FORMAT=json で setup_logging 済み）
+
+    Example:
+        >>> level = logging.INFO if json_log_enabled() else logging.DEBUG
+    """
+    return _json_enabled
+
+
 def setup_logging(level: Optional[int] = None) -> logging.Logger:
     """
     デフォルトのロギング設定をセットアップ
@@ -94,6 +183,7 @@ def setup_logging(level: Optional[int] = None) -> logging.Logger:
         >>> logger = setup_logging(logging.DEBUG)
         >>> logger.debug("Debug message enabled")
     """
+    global _json_enabled
     logger = logging.getLogger("episodic_rag")
 
     # 既にハンドラーが設定されている場合はスキップ
@@ -104,23 +194,28 @@ def setup_logging(level: Optional[int] = None) -> logging.Logger:
     if level is None:
         level = _get_log_level_from_env()
     log_format = _get_log_format_from_env()
-
-    # stderrハンドラー（WARNING以上）
-    stderr_handler = logging.StreamHandler(sys.stderr)
-    stderr_handler.setLevel(logging.WARNING)
-    stderr_handler.setFormatter(logging.Formatter(log_format))
-
-    # stdoutハンドラー（INFO）
+    _json_enabled = _is_json_format_from_env()
+
+    if _json_enabled:
+        # JSON Lines ハンドラー（ロガーレベル以上の全レコード）
+        logger.addHandler(_create_json_handler())
+    else:
+        # stderrハンドラー（WARNING以上）
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setLevel(logging.WARNING)
+        stderr_handler.setFormatter(logging.Formatter(log_format))
+        logger.addHandler(stderr_handler)
+
+    # stdoutハンドラー（INFO、span 等の構造化レコードは除く）
     class StdoutFilter(logging.Filter):
         def filter(self, record: logging.LogRecord) -> bool:
-            return record.levelno == logging.INFO
+            return record.levelno == logging.INFO and not hasattr(record, "event")
 
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setLevel(logging.INFO)
     stdout_handler.addFilter(StdoutFilter())
     stdout_handler.setFormatter(logging.Formatter(log_format))
 
-    logger.addHandler(stderr_handler)
     logger.addHandler(stdout_handler)
     logger.setLevel(level)
 
@@ -181,14 +276,19 @@ def log_info(message: str) -> None:
     _logger.info(message)
 
 
-def log_debug(message: str) -> None:
+def log_debug(message: str, *args: Any) -> None:
     """
     デバッグメッセージを出力
 
+    args を渡すと message は %-style の書式として扱われ、DEBUG ログが
+    出力されるときにだけ組み立てられる（ホットパス向け）。
+
     Args:
-        message: デバッグメッセージ
+        message: デバッグメッセージ（args があれば書式）
+        *args: 書式の引数
 
     Example:
         >>> log_debug("Variable x = 42")
+        >>> log_debug("loaded_data: keys=%s", lazy(lambda: list(data.keys())))
     """
-    _logger.debug(message)
+    _logger.debug(message, *args)
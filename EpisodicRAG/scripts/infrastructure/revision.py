@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Document Revision
+=================
+
+GrandDigest.txt / ShadowGrandDigest.txt の metadata.revision による
+楽観的並行制御（Optimistic Concurrency Control）を提供するインフラストラクチャ層モジュール。
+
+保存のたびに revision を1ずつ増やし、呼び出し側が読み込み時の revision を
+expected_revision として渡せば、その間に別の書き込みがあった場合は
+RevisionConflictError で即座に失敗する。読み込み側はロックも比較も不要。
+
+## 設計意図
+
+ARCHITECTURE: Optimistic Concurrency + Compare-and-Swap
+- 比較と書き込みはファイルの排他ロック（infrastructure.file_lock）の下で行い、
+  「比較してから書く」間に割り込まれないようにする
+- 現在の revision は自プロセスが最後に読み書きした時点の
+  (st_ino, st_mtime_ns, st_size) と一致すれば再パースせずに返す。
+  save_json のアトミックな rename でも inode が変わるとは限らない
+  （ext4 などは解放された inode を再利用し、2つを交互に使い得る）ため、
+  記録時点で更新直後（RACY_WINDOW_NS 以内）のファイルは記録せず、
+  次回も読み直す（read_cache と同じ racy-git の考え方）
+- retry_on_conflict() は「読み込み → 変更 → 期待リビジョン付き保存」を
+  競合がなくなるまで（上限回数まで）やり直す
+- is_unchanged() は last_updated / revision を除いた内容ハッシュで保存済みの
+  文書と比較する。同じなら呼び出し側は保存（と revision・時刻の更新）を省略できる
+
+Usage:
+    from infrastructure.revision import get_revision, retry_on_conflict
+
+    data = manager.load_or_create()
+    manager.save(data, expected_revision=get_revision(data))  # 競合時は例外
+
+    # 競合時は最新を読み直して mutate をやり直す
+    retry_on_conflict(manager.load_or_create, manager.save, mutate)
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+from domain.constants import LOG_PREFIX_STATE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import RevisionConflictError
+from infrastructure.file_lock import exclusive_lock
+from infrastructure.json_repository import (
+    content_hash,
+    save_json,
+    stored_content_hash,
+    try_read_json_from_file,
+)
+from infrastructure.json_repository.content_hash import record_write, remember_content_hash
+from infrastructure.json_repository.read_cache import RACY_WINDOW_NS
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "DEFAULT_MAX_RETRIES",
+    "REVISION_KEY",
+    "REVISION_VOLATILE_FIELDS",
+    "get_revision",
+    "is_unchanged",
+    "read_revision",
+    "reset_revision_cache",
+    "retry_on_conflict",
+    "save_with_revision",
+]
+
+# metadata 内のキー名
+REVISION_KEY = "revision"
+
+# is_unchanged の比較で無視するフィールド（保存のたびに変わる）
+REVISION_VOLATILE_FIELDS = ("metadata.last_updated", f"metadata.{REVISION_KEY}")
+
+# retry_on_conflict の再試行回数のデフォルト
+DEFAULT_MAX_RETRIES = 5
+
+T = TypeVar("T")
+
+# (st_ino, st_mtime_ns, st_size)
+_Signature = Tuple[int, int, int]
+
+# 解決済みパス → (最後に確認したファイルのシグネチャ, その revision)
+_known: Dict[str, Tuple[_Signature, int]] = {}
+_known_lock = threading.Lock()
+
+
+def get_revision(data: object) -> int:
+    """
+    文書の metadata.revision を取得
+
+    Args:
+        data: GrandDigest / ShadowGrandDigest の文書
+
+    Returns:
+        revision（欠落・不正な場合は 0）
+
+    Example:
+        >>> get_revision({"metadata": {"revision": 3}})
+        3
+        >>> get_revision({"metadata": {}})
+        0
+    """
+    if not isinstance(data, Mapping):
+        return 0
+    metadata = data.get("metadata")
+    if not isinstance(metadata, Mapping):
+        return 0
+    revision = metadata.get(REVISION_KEY, 0)
+    return revision if isinstance(revision, int) and not isinstance(revision, bool) else 0
+
+
+def _signature(path: Path) -> Optional[_Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _remember(path: Path, signature: Optional[_Signature], revision: int) -> None:
+    """revision を記録（更新直後のファイルは同一シグネチャの上書きを見分けられないため記録しない）"""
+    key = os.path.abspath(path)
+    with _known_lock:
+        if signature is None or signature[1] >= time.time_ns() - RACY_WINDOW_NS:
+            _known.pop(key, None)
+        else:
+            _known[key] = (signature, revision)
+
+
+def read_revision(file_path: Path) -> int:
+    """
+    ファイル上の現在の revision を取得
+
+    自プロセスが最後に読み込んだ時点からファイルが変わっていなければ
+    記録済みの値を返し、変わっていればファイルを読み込む。
+    更新直後のファイルは記録しないため、毎回読み込む。
+
+    Args:
+        file_path: 対象ファイルのパス
+
+    Returns:
+        現在の revision（ファイルが存在しない・読めない場合は 0）
+    """
+    signature = _signature(file_path)
+    if signature is None:
+        return 0
+    with _known_lock:
+        known = _known.get(os.path.abspath(file_path))
+    if known is not None and known[0] == signature:
+        return known[1]
+
+    data = try_read_json_from_file(file_path, log_on_error=False)
+    revision = get_revision(data) if data is not None else 0
+    _remember(file_path, signature, revision)
+    return revision
+
+
+def save_with_revision(
+    file_path: Path,
+    data: Dict[str, Any],
+    expected_revision: Optional[int] = None,
+    fsync_dir: bool = False,
+) -> int:
+    """
+    revision を1進めて保存（expected_revision 指定時は比較してから保存）
+
+    Args:
+        file_path: 保存先のパス
+        data: 保存する文書（metadata.revision が更新される）
+        expected_revision: 読み込み時の revision（Noneなら比較しない）
+        fsync_dir: 親ディレクトリもfsyncするか
+
+    Returns:
+        保存後の revision
+
+    Raises:
+        RevisionConflictError: ファイルの revision が expected_revision と異なる場合
+        FileIOError: 書き込みに失敗した場合
+
+    Example:
+        >>> data = load_json(path)
+        >>> save_with_revision(path, data, expected_revision=get_revision(data))
+        4
+    """
+    with exclusive_lock(file_path):
+        current = read_revision(file_path)
+        if expected_revision is not None and current != expected_revision:
+            formatter = get_error_formatter()
+            raise RevisionConflictError(
+                formatter.file.revision_conflict(file_path, expected_revision, current),
+                expected=expected_revision,
+                actual=current,
+            )
+        revision = max(current, get_revision(data)) + 1
+        data.setdefault("metadata", {})[REVISION_KEY] = revision
+        save_json(file_path, data, fsync_dir=fsync_dir)
+        _remember(file_path, _signature(file_path), revision)
+        remember_content_hash(
+            file_path, content_hash(data, REVISION_VOLATILE_FIELDS), REVISION_VOLATILE_FIELDS
+        )
+    return revision
+
+
+def is_unchanged(
+    file_path: Path, data: Mapping[str, Any], expected_revision: Optional[int] = None
+) -> bool:
+    """
+    保存済みの文書と内容が同じか（metadata.last_updated / revision は無視）
+
+    True の場合は省略として集計する（get_write_stats の skipped）。
+    ロックは不要: 比較後に別の書き込みがあっても、省略した保存がその書き込みより
+    先に行われた場合と同じ結果になる。
+
+    Args:
+        file_path: 保存先のパス
+        data: 保存しようとしている文書
+        expected_revision: 読み込み時の revision（ファイルの revision と異なれば
+            False を返し、保存側で競合として扱わせる）
+
+    Returns:
+        保存を省略できる場合True
+
+    Example:
+        >>> if not is_unchanged(path, data, expected_revision=get_revision(data)):
+        ...     save_with_revision(path, data, expected_revision=get_revision(data))
+    """
+    if expected_revision is not None and read_revision(file_path) != expected_revision:
+        return False
+    stored = stored_content_hash(file_path, REVISION_VOLATILE_FIELDS)
+    if stored is None or stored != content_hash(data, REVISION_VOLATILE_FIELDS):
+        return False
+    record_write(False)
+    log_debug(f"{LOG_PREFIX_STATE} unchanged, save skipped: {file_path.name}")
+    return True
+
+
+def retry_on_conflict(
+    load: Callable[[], T],
+    save: Callable[..., None],
+    mutate: Callable[[T], None],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> T:
+    """
+    読み込み → 変更 → 期待リビジョン付き保存を、競合がなくなるまでやり直す
+
+    Args:
+        load: 最新の文書を読み込む関数
+        save: save(data, expected_revision=...) 形式の保存関数
+        mutate: 文書をその場で変更する関数（再試行時は新しい文書で再度呼ばれる）
+        max_retries: 競合時の再試行回数
+
+    Returns:
+        保存した文書
+
+    Raises:
+        RevisionConflictError: 再試行回数を超えて競合した場合
+    """
+    attempt = 0
+    while True:
+        data = load()
+        expected = get_revision(data) if isinstance(data, Mapping) else 0
+        mutate(data)
+        try:
+            save(data, expected_revision=expected)
+            return data
+        except RevisionConflictError as e:
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            log_debug(f"{LOG_PREFIX_STATE} revision conflict (retry {attempt}/{max_retries}): {e}")
+
+
+def reset_revision_cache() -> None:
+    """記録済みのファイル revision を破棄（テスト用）"""
+    with _known_lock:
+        _known.clear()
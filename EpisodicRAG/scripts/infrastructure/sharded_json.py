@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Sharded JSON Document
+=====================
+
+1つの JSON 文書を「インデックス + 項目ごとのファイル」に分割して保存する
+インフラストラクチャ層モジュール。
+
+ShadowGrandDigest.txt は latest_digests に全8階層を持つため、weekly に
+Loop を1件追加するだけで centurial まで書き直していた。分割レイアウト
+（storage.shadow_layout = "sharded"）では latest_digests の階層ごとに
+ShadowGrandDigest.shards/<level>.txt を持ち、変更された階層のファイルだけを書き換える。
+
+    Essences/ShadowGrandDigest.shards/
+        _index.txt      # metadata（revision 含む）+ キー順序 + 分割した項目の一覧
+        weekly.txt      # latest_digests["weekly"]
+        monthly.txt
+        ...
+
+## 設計意図
+
+ARCHITECTURE: Sharded Document
+- 論理的な文書の形（load() の戻り値）は分割前と同一
+- load_item() は1項目のファイルだけを読む（他の階層はパースしない）
+- save() は内容が変わった項目だけを書き、インデックスを最後に書く。
+  revision はインデックスの metadata.revision で管理し、比較から書き込みまでを
+  lock_path の排他ロック下で行う（infrastructure.revision と同じ規約）
+- 文書に存在しなくなった項目のファイルは、インデックスを書いた後に削除する
+- 各ファイルの書き込みはアトミックだが、複数ファイルにまたがる save() 全体は
+  アトミックではない。項目とインデックスの間で中断すると、書き終えた項目は
+  新しい内容のまま、インデックス（metadata・revision・項目一覧）は前回のままになる。
+  どのファイルも完全な JSON で、新しく追加した項目はインデックスに載るまで
+  読まれないため、読み込みは常に成功し、次の save() で全体が揃う。
+  中断の検出（インテントの記録）は行わない
+
+Usage:
+    from infrastructure.sharded_json import ShardedJsonDocument
+
+    doc = ShardedJsonDocument(essences / "ShadowGrandDigest.shards", "latest_digests")
+    data = doc.load()                       # 分割前と同じ形の dict
+    weekly = doc.load_item("weekly")        # weekly.txt のみ読む
+    doc.save(data, expected_revision=3)     # 変更された階層のみ書き込み
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from domain.constants import LOG_PREFIX_FILE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError, RevisionConflictError
+from domain.file_constants import SHARD_INDEX_FILENAME
+from infrastructure.file_lock import exclusive_lock, shared_lock
+from infrastructure.json_repository import safe_read_json, save_json
+from infrastructure.logging_config import log_debug
+from infrastructure.revision import is_unchanged, read_revision, save_with_revision
+
+__all__ = [
+    "SHADOW_LAYOUT_SINGLE",
+    "SHADOW_LAYOUT_SHARDED",
+    "SHADOW_LAYOUTS",
+    "ShardedJsonDocument",
+    "resolve_shadow_layout",
+]
+
+SHADOW_LAYOUT_SINGLE = "single"
+SHADOW_LAYOUT_SHARDED = "sharded"
+SHADOW_LAYOUTS = (SHADOW_LAYOUT_SINGLE, SHADOW_LAYOUT_SHARDED)
+
+# インデックス内でレイアウト情報を保持するキー
+_LAYOUT_KEY = "_layout"
+
+
+def resolve_shadow_layout(config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    ShadowGrandDigest の保存レイアウトを決定
+
+    環境変数 EPISODIC_RAG_SHADOW_LAYOUT が設定されていれば優先し、
+    なければ config.json の storage.shadow_layout、どちらもなければ "single"。
+
+    Args:
+        config: config.json の内容
+
+    Returns:
+        "single" または "sharded"
+
+    Raises:
+        ConfigError: 未知のレイアウトが指定された場合
+
+    Example:
+        >>> resolve_shadow_layout({"storage": {"shadow_layout": "sharded"}})
+        'sharded'
+    """
+    layout = os.environ.get("EPISODIC_RAG_SHADOW_LAYOUT")
+    if not layout:
+        storage = (config or {}).get("storage")
+        layout = storage.get("shadow_layout") if isinstance(storage, Mapping) else None
+    layout = (layout or SHADOW_LAYOUT_SINGLE).lower()
+    if layout not in SHADOW_LAYOUTS:
+        formatter = get_error_formatter()
+        raise ConfigError(
+            formatter.config.config_invalid_value(
+                "storage.shadow_layout", " or ".join(SHADOW_LAYOUTS), layout
+            )
+        )
+    return layout
+
+
+class ShardedJsonDocument:
+    """
+    項目ごとのファイルに分割して保存する JSON 文書
+
+    Attributes:
+        directory: 分割ファイルを置くディレクトリ
+        section: 分割するトップレベルのキー（例: "latest_digests"）
+        lock_path: 読み書き時にロックするパス（省略時はインデックスファイル）
+        last_written: 直近の save() で書き込んだ項目名
+
+    Example:
+        >>> doc = ShardedJsonDocument(shard_dir, "latest_digests")
+        >>> doc.save({"metadata": {}, "latest_digests": {"weekly": {...}}})
+        1
+        >>> doc.load_item("weekly")
+        {...}
+    """
+
+    def __init__(self, directory: Path, section: str, lock_path: Optional[Path] = None):
+        self.directory = directory
+        self.section = section
+        self.lock_path = lock_path or directory / SHARD_INDEX_FILENAME
+        self.last_written: List[str] = []
+
+    @property
+    def index_file(self) -> Path:
+        """インデックスファイルのパス"""
+        return self.directory / SHARD_INDEX_FILENAME
+
+    def item_path(self, item: str) -> Path:
+        """項目ファイルのパス"""
+        return self.directory / f"{item}.txt"
+
+    def exists(self) -> bool:
+        """分割レイアウトで保存済みか"""
+        return self.index_file.exists()
+
+    def revision(self) -> int:
+        """インデックスの metadata.revision（未保存なら 0）"""
+        return read_revision(self.index_file)
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        index = safe_read_json(self.index_file, raise_on_error=False)
+        if not isinstance(index, dict) or not isinstance(index.get(_LAYOUT_KEY), dict):
+            return None
+        return index
+
+    def items(self) -> List[str]:
+        """分割されている項目名（保存順）"""
+        index = self._read_index()
+        return list(index[_LAYOUT_KEY].get("items", [])) if index else []
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        文書全体を読み込む
+
+        Returns:
+            分割前と同じ形の文書、未保存ならNone
+        """
+        with shared_lock(self.lock_path):
+            index = self._read_index()
+            if index is None:
+                return None
+            layout = index.pop(_LAYOUT_KEY)
+            items = layout.get("items", [])
+            section = {
+                item: safe_read_json(self.item_path(item), raise_on_error=False) for item in items
+            }
+            # 元のキー順序を復元（section はキー順序の位置に挿入）
+            data: Dict[str, Any] = {}
+            for key in layout.get("keys", list(index) + [self.section]):
+                if key == self.section:
+                    data[key] = section
+                elif key in index:
+                    data[key] = index[key]
+            log_debug(f"{LOG_PREFIX_FILE} sharded load: {self.directory} ({len(items)} items)")
+            return data
+
+    def load_item(self, item: str) -> Any:
+        """
+        1項目のファイルだけを読み込む
+
+        Args:
+            item: 項目名（例: "weekly"）
+
+        Returns:
+            項目の値
+
+        Raises:
+            KeyError: 項目が文書に存在しない場合
+        """
+        with shared_lock(self.lock_path):
+            if item not in self.items():
+                raise KeyError(item)
+            log_debug(f"{LOG_PREFIX_FILE} sharded load_item: {self.item_path(item)}")
+            return safe_read_json(self.item_path(item), raise_on_error=False)
+
+    def save(
+        self,
+        data: Dict[str, Any],
+        expected_revision: Optional[int] = None,
+        fsync_dir: bool = False,
+    ) -> int:
+        """
+        内容が変わった項目のみ書き込み、インデックスの revision を1進める
+
+        どの項目も変わらず、インデックスも last_updated / revision 以外が同じなら
+        何も書き込まず、現在の revision を返す。
+
+        Args:
+            data: 保存する文書（metadata.revision が更新される）
+            expected_revision: 読み込み時の revision（Noneなら比較しない）
+            fsync_dir: 親ディレクトリもfsyncするか
+
+        Returns:
+            保存後の revision
+
+        Raises:
+            RevisionConflictError: 保存済みの revision が expected_revision と異なる場合
+            FileIOError: 書き込みに失敗した場合
+        """
+        section: Mapping[str, Any] = data.get(self.section) or {}
+        with exclusive_lock(self.lock_path):
+            current = self.revision()
+            if expected_revision is not None and current != expected_revision:
+                formatter = get_error_formatter()
+                raise RevisionConflictError(
+                    formatter.file.revision_conflict(self.index_file, expected_revision, current),
+                    expected=expected_revision,
+                    actual=current,
+                )
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            written: List[str] = []
+            for item, value in section.items():
+                path = self.item_path(item)
+                if path.exists() and safe_read_json(path, raise_on_error=False) == value:
+                    continue
+                save_json(path, value)
+                written.append(item)
+
+            # インデックスは最後に書く（読み込み側はインデックスの項目一覧に従う）
+            index: Dict[str, Any] = {k: v for k, v in data.items() if k != self.section}
+            index[_LAYOUT_KEY] = {"keys": list(data), "items": list(section)}
+            stale_items = set(self.items()) - set(section)
+            if not written and not stale_items and is_unchanged(self.index_file, index):
+                # どの項目も変わっていなければ revision も進めない
+                revision = current
+            else:
+                revision = save_with_revision(self.index_file, index, fsync_dir=fsync_dir)
+                # インデックスから外れた後に削除する（中断しても一覧の項目は欠けない）
+                for stale in stale_items:
+                    self.item_path(stale).unlink(missing_ok=True)
+            metadata = data.get("metadata")
+            if isinstance(metadata, dict):
+                metadata["revision"] = revision
+        self.last_written = written
+        log_debug(
+            f"{LOG_PREFIX_FILE} sharded save: {self.directory} wrote {written} revision={revision}"
+        )
+        return revision
@@ -0,0 +1,730 @@
+#!/usr/bin/env python3
+"""
+SQLite Digest Store
+===================
+
+標準ライブラリ sqlite3（WALモード）によるストレージバックエンド。
+
+config.json の storage.backend（または環境変数 EPISODIC_RAG_STORAGE_BACKEND）が
+"sqlite" の場合、ShadowIO / GrandDigestManager / DigestTimesTracker は
+ShadowGrandDigest.txt / GrandDigest.txt / last_digest_times.json の代わりに
+Essences/EpisodicRAG.db を読み書きし、DigestPersistence は確定した RegularDigest を
+digests / individual_digests / source_links テーブルにも記録する。
+
+## 設計意図
+
+ARCHITECTURE: Repository Backend
+- Shadow / Grand は「文書」として documents テーブルで revision を持ち、
+  本体はトップレベルのキー × 階層ごとの行（document_sections）に分割する。
+  保存時は内容が変わった行だけを書き換えるため、1階層の更新で
+  文書全体を再シリアライズ・再書き込みしない
+- 期待リビジョンの比較と書き込みは BEGIN IMMEDIATE のトランザクション内で行う
+  （infrastructure.revision と同じ RevisionConflictError を送出）
+- 接続はスレッドごと（sqlite3 の接続はスレッド間で共有できないため）
+- WAL モードにより、書き込み中も読み取りはブロックされない
+- エージェントが Read / Edit で直接扱う ShadowGrandDigest.txt / GrandDigest.txt は、DB の文書の
+  写し（ミラー）として保存のたびに書き出す（save_mirrored_document）。
+  書き出した内容のハッシュを document_mirrors に記録し、読み込み時
+  （load_mirrored_document）に写しが書き出し後に編集されていれば、
+  その内容を DB に取り込んでから返す。エージェントの編集が DB に
+  上書きされて失われることはない
+
+テキストレイアウト（git での継承用）への書き出しは
+application.storage.text_layout が担当する。
+
+Usage:
+    from infrastructure.sqlite_store import open_digest_store
+
+    store = open_digest_store(essences_path)
+    data = store.load_document("GrandDigest.txt")
+    store.save_document("GrandDigest.txt", data, expected_revision=3)
+    store.save_mirrored_document("ShadowGrandDigest.txt", shadow, shadow_file)
+    store.save_regular_digest("weekly", "W0001_初週", regular_digest)
+    store.find_digests_by_source("L00003_会話.txt")  # [("weekly", "W0001_初週")]
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from domain.constants import LOG_PREFIX_FILE
+from domain.error_formatter import get_error_formatter
+from domain.exceptions import ConfigError, FileIOError, RevisionConflictError
+from domain.file_constants import STORAGE_DB_FILENAME
+from domain.file_naming import extract_number_only
+from infrastructure.file_lock import exclusive_lock
+from infrastructure.json_repository import (
+    invalidate_analysis_cache,
+    json_dumps,
+    json_loads,
+    save_json,
+)
+from infrastructure.logging_config import log_debug
+
+__all__ = [
+    "STORAGE_BACKEND_JSON",
+    "STORAGE_BACKEND_SQLITE",
+    "STORAGE_BACKENDS",
+    "SqliteDigestStore",
+    "open_digest_store",
+    "reset_digest_stores",
+    "resolve_storage_backend",
+]
+
+STORAGE_BACKEND_JSON = "json"
+STORAGE_BACKEND_SQLITE = "sqlite"
+STORAGE_BACKENDS = (STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE)
+
+# 書き込みロック待ちの上限（ミリ秒）
+_BUSY_TIMEOUT_MS = 30_000
+
+# 分割しないトップレベルのキー（document_sections.item が空文字）
+_WHOLE = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_sections (
+    name TEXT NOT NULL REFERENCES documents(name) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    item TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (name, section, item)
+);
+CREATE TABLE IF NOT EXISTS digests (
+    level TEXT NOT NULL,
+    name TEXT NOT NULL,
+    number INTEGER,
+    metadata TEXT NOT NULL,
+    overall_digest TEXT,
+    saved_at TEXT NOT NULL,
+    PRIMARY KEY (level, name)
+);
+CREATE INDEX IF NOT EXISTS idx_digests_level_number ON digests(level, number);
+CREATE TABLE IF NOT EXISTS individual_digests (
+    level TEXT NOT NULL,
+    digest_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    source_file TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (level, digest_name, position),
+    FOREIGN KEY (level, digest_name) REFERENCES digests(level, name) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS source_links (
+    level TEXT NOT NULL,
+    digest_name TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    PRIMARY KEY (level, digest_name, source_file),
+    FOREIGN KEY (level, digest_name) REFERENCES digests(level, name) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_source_links_source ON source_links(source_file);
+CREATE TABLE IF NOT EXISTS document_mirrors (
+    name TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS digest_times (
+    level TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    last_processed INTEGER
+);
+"""
+
+
+def resolve_storage_backend(config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    使用するストレージバックエンドを決定
+
+    環境変数 EPISODIC_RAG_STORAGE_BACKEND が設定されていれば優先し、
+    なければ config.json の storage.backend、どちらもなければ "json"。
+
+    Args:
+        config: config.json の内容
+
+    Returns:
+        "json" または "sqlite"
+
+    Raises:
+        ConfigError: 未知のバックエンドが指定された場合
+
+    Example:
+        >>> resolve_storage_backend({"storage": {"backend": "sqlite"}})
+        'sqlite'
+    """
+    backend = os.environ.get("EPISODIC_RAG_STORAGE_BACKEND")
+    if not backend:
+        storage = (config or {}).get("storage")
+        backend = storage.get("backend") if isinstance(storage, Mapping) else None
+    backend = (backend or STORAGE_BACKEND_JSON).lower()
+    if backend not in STORAGE_BACKENDS:
+        formatter = get_error_formatter()
+        raise ConfigError(
+            formatter.config.config_invalid_value(
+                "storage.backend", " or ".join(STORAGE_BACKENDS), backend
+            )
+        )
+    return backend
+
+
+def _compact(value: Any) -> str:
+    return json_dumps(value, compact=True)
+
+
+def _split_document(data: Mapping[str, Any]) -> List[Tuple[str, str, int, str]]:
+    """文書を (section, item, position, body) の行に分割"""
+    rows: List[Tuple[str, str, int, str]] = []
+    for section, value in data.items():
+        if section != "metadata" and isinstance(value, Mapping) and value:
+            for item, item_value in value.items():
+                rows.append((section, str(item), len(rows), _compact(item_value)))
+        else:
+            rows.append((section, _WHOLE, len(rows), _compact(value)))
+    return rows
+
+
+def _digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _read_mirror(mirror_path: Path) -> Optional[bytes]:
+    """写しの内容（存在しなければNone）"""
+    try:
+        return mirror_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        formatter = get_error_formatter()
+        raise FileIOError(formatter.file.file_io_error("read", mirror_path, e)) from e
+
+
+class SqliteDigestStore:
+    """
+    EpisodicRAG.db へのアクセスを担当するストア
+
+    Attributes:
+        db_path: データベースファイルのパス
+
+    Example:
+        >>> store = SqliteDigestStore(essences_path / "EpisodicRAG.db")
+        >>> store.save_time("weekly", "2025-01-01T00:00:00", 12)
+        >>> store.load_times()["weekly"]["last_processed"]
+        12
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        初期化（データベースとテーブルがなければ作成）
+
+        Args:
+            db_path: データベースファイルのパス
+
+        Raises:
+            FileIOError: データベースを開けない場合
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(_SCHEMA)
+
+    # =========================================================================
+    # 接続管理
+    # =========================================================================
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, timeout=_BUSY_TIMEOUT_MS / 1000, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+        except (sqlite3.Error, OSError) as e:
+            formatter = get_error_formatter()
+            raise FileIOError(formatter.file.file_io_error("open", self.db_path, e)) from e
+        self._local.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みトランザクション（BEGIN IMMEDIATE で最初に書き込みロックを取る）"""
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            formatter = get_error_formatter()
+            raise FileIOError(formatter.file.file_io_error("write", self.db_path, e)) from e
+        committed = False
+        try:
+            yield conn
+            conn.execute("COMMIT")
+            committed = True
+        except sqlite3.Error as e:
+            formatter = get_error_formatter()
+            raise FileIOError(formatter.file.file_io_error("write", self.db_path, e)) from e
+        finally:
+            # COMMIT の失敗（SQLITE_BUSY / ディスクフル等）でもトランザクションを残さない
+            if not committed and conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+        invalidate_analysis_cache(self.db_path)
+
+    def close(self) -> None:
+        """全スレッドの接続を閉じる"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # 別スレッドで作成された接続（スレッド終了時に破棄される）
+                pass
+        self._local = threading.local()
+
+    # =========================================================================
+    # 文書（ShadowGrandDigest / GrandDigest）
+    # =========================================================================
+
+    def has_document(self, name: str) -> bool:
+        """文書が保存済みか"""
+        row = (
+            self._connection().execute("SELECT 1 FROM documents WHERE name = ?", (name,)).fetchone()
+        )
+        return row is not None
+
+    def load_document(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        文書を読み込む
+
+        Args:
+            name: 文書名（"GrandDigest.txt" 等、テキストレイアウトのファイル名）
+
+        Returns:
+            文書（metadata.revision 付き）、存在しなければNone
+        """
+        conn = self._connection()
+        head = conn.execute("SELECT revision FROM documents WHERE name = ?", (name,)).fetchone()
+        if head is None:
+            return None
+        data: Dict[str, Any] = {}
+        rows = conn.execute(
+            "SELECT section, item, body FROM document_sections WHERE name = ? ORDER BY position",
+            (name,),
+        )
+        for section, item, body in rows:
+            value = json_loads(body)
+            if item == _WHOLE:
+                data[section] = value
+            else:
+                data.setdefault(section, {})[item] = value
+        metadata = data.get("metadata")
+        if isinstance(metadata, dict):
+            metadata["revision"] = head[0]
+        return data
+
+    def document_revision(self, name: str) -> int:
+        """文書の現在の revision（存在しなければ 0）"""
+        row = (
+            self._connection()
+            .execute("SELECT revision FROM documents WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return int(row[0]) if row is not None else 0
+
+    def save_document(
+        self, name: str, data: Dict[str, Any], expected_revision: Optional[int] = None
+    ) -> int:
+        """
+        文書を保存（revision を1進め、内容が変わった行のみ書き換える）
+
+        Args:
+            name: 文書名
+            data: 保存する文書（metadata.revision が更新される）
+            expected_revision: 読み込み時の revision（Noneなら比較しない）
+
+        Returns:
+            保存後の revision
+
+        Raises:
+            RevisionConflictError: 保存済みの revision が expected_revision と異なる場合
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT revision FROM documents WHERE name = ?", (name,)).fetchone()
+            current = int(row[0]) if row is not None else 0
+            if expected_revision is not None and current != expected_revision:
+                formatter = get_error_formatter()
+                raise RevisionConflictError(
+                    formatter.file.revision_conflict(
+                        self.db_path / name, expected_revision, current
+                    ),
+                    expected=expected_revision,
+                    actual=current,
+                )
+            revision = current + 1
+            metadata = data.get("metadata")
+            if isinstance(metadata, dict):
+                metadata["revision"] = revision
+
+            conn.execute(
+                "INSERT INTO documents (name, revision, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "revision = excluded.revision, updated_at = excluded.updated_at",
+                (name, revision, datetime.now().isoformat()),
+            )
+            rows = _split_document(data)
+            conn.executemany(
+                "INSERT INTO document_sections (name, section, item, position, body) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name, section, item) DO UPDATE SET "
+                "position = excluded.position, body = excluded.body "
+                "WHERE body != excluded.body OR position != excluded.position",
+                [(name, section, item, position, body) for section, item, position, body in rows],
+            )
+            keep = {(section, item) for section, item, _, _ in rows}
+            existing = conn.execute(
+                "SELECT section, item FROM document_sections WHERE name = ?", (name,)
+            ).fetchall()
+            stale = [(name, s, i) for s, i in existing if (s, i) not in keep]
+            if stale:
+                conn.executemany(
+                    "DELETE FROM document_sections WHERE name = ? AND section = ? AND item = ?",
+                    stale,
+                )
+        log_debug(f"{LOG_PREFIX_FILE} sqlite save_document: {name} revision={revision}")
+        return revision
+
+    # =========================================================================
+    # テキストの写し（ShadowGrandDigest.txt / GrandDigest.txt）
+    # =========================================================================
+
+    def load_mirrored_document(self, name: str, mirror_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        文書を読み込む（写しが書き出し後に編集されていれば DB に取り込む）
+
+        写しがなければ DB の文書から書き出す。DB にも写しにもなければ None。
+
+        Args:
+            name: 文書名
+            mirror_path: 写しのテキストファイル
+
+        Returns:
+            文書（metadata.revision 付き）、存在しなければNone
+
+        Raises:
+            FileIOError: 写しを読めない・JSONとして不正な場合
+        """
+        raw = _read_mirror(mirror_path)
+        if raw is not None and self._mirror_digest(name) == _digest(raw):
+            return self.load_document(name)
+        with exclusive_lock(mirror_path):
+            return self._sync_mirror(name, mirror_path)
+
+    def save_mirrored_document(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        mirror_path: Path,
+        expected_revision: Optional[int] = None,
+    ) -> int:
+        """
+        文書を保存し、写しを書き出す（revision を1進める）
+
+        写しに未取り込みの編集があれば先に取り込む。そのため expected_revision を
+        指定した保存は、読み込み後の編集を上書きせず RevisionConflictError になる。
+
+        Args:
+            name: 文書名
+            data: 保存する文書（metadata.revision が更新される）
+            mirror_path: 写しのテキストファイル
+            expected_revision: 読み込み時の revision（Noneなら比較しない）
+
+        Returns:
+            保存後の revision
+
+        Raises:
+            RevisionConflictError: 保存済みの revision が expected_revision と異なる場合
+            FileIOError: 写しの読み書きに失敗した場合
+        """
+        with exclusive_lock(mirror_path):
+            self._sync_mirror(name, mirror_path)
+            revision = self.save_document(name, data, expected_revision)
+            self._export_mirror(name, data, mirror_path)
+        return revision
+
+    def _mirror_digest(self, name: str) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute("SELECT digest FROM document_mirrors WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return str(row[0]) if row is not None else None
+
+    def _sync_mirror(self, name: str, mirror_path: Path) -> Optional[Dict[str, Any]]:
+        """写しと DB を揃えて文書を返す（排他ロックの下で呼ぶ）"""
+        raw = _read_mirror(mirror_path)
+        if raw is None:
+            data = self.load_document(name)
+            if data is not None:
+                self._export_mirror(name, data, mirror_path)
+            return data
+        if self._mirror_digest(name) == _digest(raw):
+            return self.load_document(name)
+
+        # 書き出し後に編集された（または DB 導入前から存在する）写しを取り込む
+        try:
+            edited = json_loads(raw)
+        except ValueError as e:
+            formatter = get_error_formatter()
+            raise FileIOError(formatter.file.invalid_json(mirror_path, e)) from e
+        if not isinstance(edited, dict):
+            formatter = get_error_formatter()
+            raise FileIOError(
+                formatter.file.invalid_json(mirror_path, TypeError("not a JSON object"))
+            )
+        self.save_document(name, edited)
+        self._export_mirror(name, edited, mirror_path)
+        log_debug(f"{LOG_PREFIX_FILE} sqlite imported edited mirror: {mirror_path}")
+        return edited
+
+    def _export_mirror(self, name: str, data: Dict[str, Any], mirror_path: Path) -> None:
+        save_json(mirror_path, data, fsync_dir=True)
+        raw = _read_mirror(mirror_path)
+        if raw is None:
+            return
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO document_mirrors (name, digest) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET digest = excluded.digest",
+                (name, _digest(raw)),
+            )
+
+    # =========================================================================
+    # RegularDigest
+    # =========================================================================
+
+    def save_regular_digest(self, level: str, name: str, data: Mapping[str, Any]) -> None:
+        """
+        確定した RegularDigest を記録（同名があれば置き換え）
+
+        Args:
+            level: ダイジェストレベル
+            name: ダイジェスト名（拡張子なし、例: "W0001_初週"）
+            data: RegularDigest
+        """
+        self.save_regular_digests([(level, name, data)])
+
+    def save_regular_digests(self, records: Iterable[Tuple[str, str, Mapping[str, Any]]]) -> int:
+        """
+        RegularDigest をまとめて記録（1トランザクション）
+
+        Args:
+            records: (level, name, data) の反復
+
+        Returns:
+            記録した件数
+        """
+        now = datetime.now().isoformat()
+        count = 0
+        with self._transaction() as conn:
+            for level, name, data in records:
+                overall = data.get("overall_digest")
+                conn.execute("DELETE FROM digests WHERE level = ? AND name = ?", (level, name))
+                conn.execute(
+                    "INSERT INTO digests "
+                    "(level, name, number, metadata, overall_digest, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        level,
+                        name,
+                        extract_number_only(name),
+                        _compact(data.get("metadata", {})),
+                        _compact(overall) if overall is not None else None,
+                        now,
+                    ),
+                )
+                individuals = data.get("individual_digests") or []
+                conn.executemany(
+                    "INSERT INTO individual_digests "
+                    "(level, digest_name, position, source_file, body) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (level, name, position, entry.get("source_file"), _compact(entry))
+                        for position, entry in enumerate(individuals)
+                        if isinstance(entry, Mapping)
+                    ],
+                )
+                sources = overall.get("source_files", []) if isinstance(overall, Mapping) else []
+                conn.executemany(
+                    "INSERT OR IGNORE INTO source_links (level, digest_name, source_file) "
+                    "VALUES (?, ?, ?)",
+                    [(level, name, source) for source in sources if isinstance(source, str)],
+                )
+                count += 1
+        return count
+
+    def load_regular_digest(self, level: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        RegularDigest を読み込む
+
+        Args:
+            level: ダイジェストレベル
+            name: ダイジェスト名（拡張子なし）
+
+        Returns:
+            RegularDigest、存在しなければNone
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT metadata, overall_digest FROM digests WHERE level = ? AND name = ?",
+            (level, name),
+        ).fetchone()
+        if row is None:
+            return None
+        individuals = [
+            json_loads(body)
+            for (body,) in conn.execute(
+                "SELECT body FROM individual_digests "
+                "WHERE level = ? AND digest_name = ? ORDER BY position",
+                (level, name),
+            )
+        ]
+        return {
+            "metadata": json_loads(row[0]),
+            "overall_digest": json_loads(row[1]) if row[1] is not None else None,
+            "individual_digests": individuals,
+        }
+
+    def list_digest_names(self, level: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        記録済みの RegularDigest 一覧
+
+        Args:
+            level: 絞り込むレベル（Noneなら全レベル）
+
+        Returns:
+            (level, name) のリスト（レベル内は番号順）
+        """
+        conn = self._connection()
+        if level is None:
+            rows = conn.execute("SELECT level, name FROM digests ORDER BY level, number, name")
+        else:
+            rows = conn.execute(
+                "SELECT level, name FROM digests WHERE level = ? ORDER BY number, name", (level,)
+            )
+        return [(row[0], row[1]) for row in rows]
+
+    def count_digests(self, level: Optional[str] = None) -> int:
+        """記録済みの RegularDigest 数"""
+        conn = self._connection()
+        if level is None:
+            row = conn.execute("SELECT COUNT(*) FROM digests").fetchone()
+        else:
+            row = conn.execute("SELECT COUNT(*) FROM digests WHERE level = ?", (level,)).fetchone()
+        return int(row[0])
+
+    def find_digests_by_source(self, source_file: str) -> List[Tuple[str, str]]:
+        """
+        ソースファイルを含む RegularDigest を逆引き
+
+        Args:
+            source_file: ソースファイル名（例: "L00003_会話.txt"）
+
+        Returns:
+            (level, name) のリスト
+        """
+        rows = self._connection().execute(
+            "SELECT level, digest_name FROM source_links WHERE source_file = ? "
+            "ORDER BY level, digest_name",
+            (source_file,),
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    # =========================================================================
+    # last_digest_times
+    # =========================================================================
+
+    def has_times(self) -> bool:
+        """digest_times に記録があるか"""
+        row = self._connection().execute("SELECT 1 FROM digest_times LIMIT 1").fetchone()
+        return row is not None
+
+    def load_times(self) -> Dict[str, Dict[str, Any]]:
+        """
+        レベルごとの最終ダイジェスト生成時刻
+
+        Returns:
+            last_digest_times.json と同じ構造の辞書
+        """
+        rows = self._connection().execute(
+            "SELECT level, timestamp, last_processed FROM digest_times"
+        )
+        return {
+            level: {"timestamp": timestamp, "last_processed": last_processed}
+            for level, timestamp, last_processed in rows
+        }
+
+    def save_time(self, level: str, timestamp: str, last_processed: Optional[int]) -> None:
+        """
+        1レベル分の最終ダイジェスト生成時刻を保存（他レベルの行には触れない）
+
+        Args:
+            level: ダイジェストレベル
+            timestamp: ISO形式のタイムスタンプ
+            last_processed: 最後に処理した番号
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO digest_times (level, timestamp, last_processed) VALUES (?, ?, ?) "
+                "ON CONFLICT(level) DO UPDATE SET "
+                "timestamp = excluded.timestamp, last_processed = excluded.last_processed",
+                (level, timestamp, last_processed),
+            )
+
+
+# データベースパスごとに共有するストア
+_stores: Dict[str, SqliteDigestStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_digest_store(essences_path: Path) -> SqliteDigestStore:
+    """
+    Essences 配下の EpisodicRAG.db を開く（プロセス内で共有）
+
+    Args:
+        essences_path: Essences ディレクトリのパス
+
+    Returns:
+        SqliteDigestStore インスタンス
+    """
+    db_path = essences_path / STORAGE_DB_FILENAME
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SqliteDigestStore(db_path)
+            _stores[key] = store
+        return store
+
+
+def reset_digest_stores() -> None:
+    """共有ストアの接続を閉じて破棄（テスト用）"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
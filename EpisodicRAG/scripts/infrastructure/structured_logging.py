@@ -7,23 +7,116 @@ Structured Logging
 LOG_PREFIX_* 定数を使用したボイラープレートを統合し、
 一貫したログ出力を提供。
 
+## 設計意図
+
+ARCHITECTURE: Lazy Formatting
+FileDetector.find_new_files や FileAppender（ファイルごと）など、ホットパスから
+頻繁に呼ばれる。通常の INFO レベルでは DEBUG ログは出力されないため、
+- まず isEnabledFor(DEBUG) を確認し、無効なら何も組み立てずに戻る
+- 有効な場合も「key=value」の連結は %-style の引数として logging に渡し、
+  ハンドラーが実際に出力するときまで遅延する
+- 組み立て自体が高価な値は lazy() で包むと、出力時にだけ評価される
+
+ARCHITECTURE: Spans
+span() で囲んだ区間は、終了時に所要時間（duration_ms）と結果（status）付きの
+[SPAN] レコードを1件出力する。
+- span_id / parent_id は contextvars で引き継がれ、入れ子の区間や区間内の
+  state / file_op 等のレコードを対応付けられる
+- EPISODIC_RAG_LOG_FORMAT=json では INFO、それ以外では DEBUG で出力する
+  （JSON Lines から本番環境の遅いステップを探せるように）
+- 出力されないレベルでは時間も計らず、コンテキストを返すだけ
+
 Usage:
-    from infrastructure.structured_logging import get_structured_logger
+    from infrastructure.structured_logging import get_structured_logger, lazy
 
     logger = get_structured_logger(__name__)
     logger.state("cascade_update", level="weekly", count=5)
     # -> [DEBUG] [STATE] cascade_update: level=weekly count=5
+    logger.validation("loaded_data", keys=lazy(lambda: list(data.keys())))
+
+    with logger.span("cascade.promote", level="weekly") as span:
+        span["files_processed"] = promote()
+    # -> [DEBUG] [SPAN] cascade.promote: level=weekly files_processed=3 duration_ms=1.2 status=ok
 """
 
-from typing import Any, Protocol
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Protocol
 
 from domain.constants import (
     LOG_PREFIX_DECISION,
     LOG_PREFIX_FILE,
+    LOG_PREFIX_SPAN,
     LOG_PREFIX_STATE,
     LOG_PREFIX_VALIDATE,
 )
-from infrastructure.logging_config import log_debug, log_info
+from infrastructure.logging_config import get_logger, json_log_enabled, log_info
+
+__all__ = [
+    "LazyValue",
+    "StructuredLogger",
+    "StructuredLoggerProtocol",
+    "get_structured_logger",
+    "lazy",
+]
+
+# 出力先のロガー（logging_config.setup_logging で設定済み）
+_logger = get_logger()
+
+# 実行中の span の ID（入れ子の span の parent_id になる）
+_current_span: ContextVar[Optional[str]] = ContextVar("episodic_rag_span", default=None)
+
+
+class LazyValue:
+    """
+    文字列化されるときに初めて評価される値
+
+    Example:
+        >>> value = lazy(lambda: sorted(names))
+        >>> f"{value}"   # ここで sorted(names) が呼ばれる
+    """
+
+    __slots__ = ("_func",)
+
+    def __init__(self, func: Callable[[], Any]):
+        self._func = func
+
+    def __str__(self) -> str:
+        return str(self._func())
+
+    def __repr__(self) -> str:
+        return repr(self._func())
+
+
+def lazy(func: Callable[[], Any]) -> LazyValue:
+    """
+    ログ出力時にだけ評価する値を作成
+
+    Args:
+        func: 引数なしで値を返す関数
+
+    Returns:
+        LazyValue（DEBUG ログが無効なら func は呼ばれない）
+
+    Example:
+        >>> logger.file_op("new_files", names=lazy(lambda: [f.name for f in files]))
+    """
+    return LazyValue(func)
+
+
+class _ContextText:
+    """コンテキスト辞書の「key=value」表現（ハンドラーが出力するときに連結）"""
+
+    __slots__ = ("_context",)
+
+    def __init__(self, context: Dict[str, Any]):
+        self._context = context
+
+    def __str__(self) -> str:
+        return " ".join(f"{k}={v}" for k, v in self._context.items())
 
 
 class StructuredLoggerProtocol(Protocol):
@@ -49,6 +142,10 @@ class StructuredLoggerProtocol(Protocol):
         """判断分岐のログ"""
         ...
 
+    def span(self, name: str, **context: Any) -> ContextManager[Dict[str, Any]]:
+        """処理区間の所要時間のログ"""
+        ...
+
 
 class StructuredLogger:
     """
@@ -85,22 +182,42 @@ class StructuredLogger:
         """
         if not context:
             return ""
-        return " ".join(f"{k}={v}" for k, v in context.items())
+        return str(_ContextText(context))
+
+    def is_enabled(self) -> bool:
+        """
+        構造化ログ（DEBUG）が出力されるか
+
+        ログのためだけに高価な値を求める場合の事前確認に使う。
+
+        Example:
+            >>> if logger.is_enabled():
+            ...     logger.state("summary", **build_summary())
+        """
+        return _logger.isEnabledFor(logging.DEBUG)
 
-    def _log(self, prefix: str, message: str, **context: Any) -> None:
+    def _log(self, prefix: str, message: str, context: Dict[str, Any]) -> None:
         """
-        プレフィックス付きでログを出力
+        プレフィックス付きでログを出力（DEBUG が無効なら何も組み立てない）
 
         Args:
             prefix: LOG_PREFIX_* 定数
             message: ログメッセージ
-            **context: 追加のコンテキスト情報
+            context: 追加のコンテキスト情報
         """
-        ctx_str = self._format_context(context)
-        if ctx_str:
-            log_debug(f"{prefix} {message}: {ctx_str}")
+        if not _logger.isEnabledFor(logging.DEBUG):
+            return
+        extra = {
+            "event": message,
+            "source": self._name,
+            "kind": prefix.strip("[]").lower(),
+            "context": context,
+            "span_id": _current_span.get(),
+        }
+        if context:
+            _logger.debug("%s %s: %s", prefix, message, _ContextText(context), extra=extra)
         else:
-            log_debug(f"{prefix} {message}")
+            _logger.debug("%s %s", prefix, message, extra=extra)
 
     def info(self, message: str) -> None:
         """
@@ -127,7 +244,7 @@ class StructuredLogger:
             logger.state("cascade_update", level="weekly", count=5)
             # -> [DEBUG] [STATE] cascade_update: level=weekly count=5
         """
-        self._log(LOG_PREFIX_STATE, message, **context)
+        self._log(LOG_PREFIX_STATE, message, context)
 
     def file_op(self, message: str, **context: Any) -> None:
         """
@@ -141,7 +258,7 @@ class StructuredLogger:
             logger.file_op("new_files", count=3, names=["a.txt", "b.txt"])
             # -> [DEBUG] [FILE] new_files: count=3 names=['a.txt', 'b.txt']
         """
-        self._log(LOG_PREFIX_FILE, message, **context)
+        self._log(LOG_PREFIX_FILE, message, context)
 
     def validation(self, message: str, **context: Any) -> None:
         """
@@ -155,7 +272,7 @@ class StructuredLogger:
             logger.validation("overall_digest", is_valid=True)
             # -> [DEBUG] [VALIDATE] overall_digest: is_valid=True
         """
-        self._log(LOG_PREFIX_VALIDATE, message, **context)
+        self._log(LOG_PREFIX_VALIDATE, message, context)
 
     def decision(self, message: str, **context: Any) -> None:
         """
@@ -169,7 +286,65 @@ class StructuredLogger:
             logger.decision("next_level", level="monthly")
             # -> [DEBUG] [DECISION] next_level: level=monthly
         """
-        self._log(LOG_PREFIX_DECISION, message, **context)
+        self._log(LOG_PREFIX_DECISION, message, context)
+
+    @contextmanager
+    def span(self, name: str, **context: Any) -> Iterator[Dict[str, Any]]:
+        """
+        処理区間の所要時間を計り、終了時に [SPAN] ログを出力
+
+        yield されるコンテキスト辞書に書き込んだ値（処理件数等）も出力される。
+        例外で抜けた場合は status="error" として出力し、例外はそのまま送出する。
+
+        Args:
+            name: 区間名（"cascade.promote" 等）
+            **context: 追加のコンテキスト情報
+
+        Yields:
+            コンテキスト辞書（ログが出力されない場合も書き込める）
+
+        Example:
+            with logger.span("cascade.detect", level="monthly") as span:
+                span["files_processed"] = len(detect())
+            # -> [DEBUG] [SPAN] cascade.detect: level=monthly files_processed=2
+            #    duration_ms=0.8 status=ok
+            # (EPISODIC_RAG_LOG_FORMAT=json では INFO の JSON 1行)
+        """
+        level = logging.INFO if json_log_enabled() else logging.DEBUG
+        if not _logger.isEnabledFor(level):
+            yield context
+            return
+
+        span_id = uuid.uuid4().hex[:16]
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        status = "ok"
+        started = time.perf_counter()
+        try:
+            yield context
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            _current_span.reset(token)
+            _logger.log(
+                level,
+                "%s %s: %s",
+                LOG_PREFIX_SPAN,
+                name,
+                _ContextText({**context, "duration_ms": duration_ms, "status": status}),
+                extra={
+                    "event": name,
+                    "source": self._name,
+                    "kind": "span",
+                    "context": context,
+                    "span_id": span_id,
+                    "parent_id": parent_id,
+                    "duration_ms": duration_ms,
+                    "status": status,
+                },
+            )
 
 
 def get_structured_logger(name: str) -> StructuredLogger:
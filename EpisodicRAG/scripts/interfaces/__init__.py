@@ -11,7 +11,14 @@ Scripts:
     - save_provisional_digest: ProvisionalDigestを保存
     - digest_setup: 初期セットアップCLI
     - digest_config: 設定変更CLI
-    - digest_auto: 健全性診断CLI
+    - digest_auto: 健全性診断CLI（--watch で差分を出力し続ける）
+    - digest_search: 全文検索CLI
+    - context_pack: セッション継承用コンテキストパックCLI
+    - digest_storage: ストレージバックエンド（SQLite）の書き出し・取り込みCLI
+    - digest_backfill: Loop の一括取り込みで全階層のダイジェストを構築
+
+Helpers:
+    - workspace_snapshot: 診断用にワークスペースを1回の走査で取得するスナップショット
 
 Submodules:
     - provisional: Modular components for provisional digest handling
@@ -22,9 +29,14 @@ Usage:
     python -m interfaces.digest_setup check
     python -m interfaces.digest_config show
     python -m interfaces.digest_auto --output json
+    python -m interfaces.digest_search "検索クエリ"
+    python -m interfaces.context_pack --budget 8000
+    python -m interfaces.digest_storage export
+    python -m interfaces.digest_backfill --workers 4
 """
 
-from interfaces.digest_auto import DigestAutoAnalyzer
+from interfaces.digest_auto import DigestAutoAnalyzer, DigestAutoWatch
+from interfaces.digest_backfill import DigestBackfill
 from interfaces.digest_config import ConfigEditor
 from interfaces.digest_setup import SetupManager
 from interfaces.finalize_from_shadow import DigestFinalizerFromShadow
@@ -35,6 +47,7 @@ from interfaces.provisional import (
     ProvisionalFileManager,
 )
 from interfaces.save_provisional_digest import ProvisionalDigestSaver
+from interfaces.workspace_snapshot import WorkspaceSnapshot
 
 __all__ = [
     # Main classes
@@ -44,9 +57,12 @@ __all__ = [
     "SetupManager",
     "ConfigEditor",
     "DigestAutoAnalyzer",
+    "DigestAutoWatch",
+    "DigestBackfill",
     # Helpers
     "sanitize_filename",
     "get_next_digest_number",
+    "WorkspaceSnapshot",
     # Provisional submodule
     "InputLoader",
     "ProvisionalFileManager",
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Context Pack CLI
+================
+
+セッション継承用のコンテキストパックを予算内で出力するCLI。
+
+GrandDigest.major_digests の新しい階層を全文、古い階層を short 版で含め、
+残りの予算を検索上位のヒットで埋める。入力の mtime が変わっていなければ
+Essences/ContextPack.json のキャッシュをそのまま返す。
+
+Usage:
+    python -m interfaces.context_pack
+    python -m interfaces.context_pack --budget 4000 --unit chars
+    python -m interfaces.context_pack --full-levels 3 --query "検索の設計"
+    python -m interfaces.context_pack --output text   # パック本文のみ出力
+"""
+
+import argparse
+import sys
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from application.config import DigestConfig
+from application.search import ContextPackBuilder
+from application.search.context_pack import (
+    BUDGET_UNITS,
+    DEFAULT_BUDGET,
+    DEFAULT_BUDGET_UNIT,
+    DEFAULT_FULL_LEVELS,
+    DEFAULT_HIT_COUNT,
+)
+from interfaces.cli_helpers import output_error, output_json
+
+__all__ = ["build_context_pack", "main"]
+
+
+def build_context_pack(
+    config: Optional[DigestConfig] = None,
+    budget: int = DEFAULT_BUDGET,
+    unit: str = DEFAULT_BUDGET_UNIT,
+    full_levels: int = DEFAULT_FULL_LEVELS,
+    query: Optional[str] = None,
+    hit_count: int = DEFAULT_HIT_COUNT,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    コンテキストパックを作成してCLI出力形式に変換
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+        budget: 予算（unit 単位）
+        unit: "tokens" または "chars"
+        full_levels: 全文で含める新しい階層の数
+        query: 検索クエリ（省略時は全文で含めた階層の keywords）
+        hit_count: 含める検索ヒットの最大数
+        use_cache: キャッシュを使うか
+
+    Returns:
+        {"status": "ok", "text": ..., "used": ..., ...}
+    """
+    builder = ContextPackBuilder(config or DigestConfig())
+    pack = builder.build(
+        budget=budget,
+        unit=unit,
+        full_levels=full_levels,
+        query=query,
+        hit_count=hit_count,
+        use_cache=use_cache,
+    )
+    return {"status": "ok", **asdict(pack)}
+
+
+def main() -> None:
+    """CLIエントリーポイント"""
+    parser = argparse.ArgumentParser(
+        description="EpisodicRAG セッション継承用コンテキストパック",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python -m interfaces.context_pack
+    python -m interfaces.context_pack --budget 4000 --unit chars
+    python -m interfaces.context_pack --output text
+        """,
+    )
+    parser.add_argument(
+        "--budget", type=int, default=DEFAULT_BUDGET, help=f"予算 (default: {DEFAULT_BUDGET})"
+    )
+    parser.add_argument(
+        "--unit",
+        choices=BUDGET_UNITS,
+        default=DEFAULT_BUDGET_UNIT,
+        help=f"予算の単位 (default: {DEFAULT_BUDGET_UNIT})",
+    )
+    parser.add_argument(
+        "--full-levels",
+        type=int,
+        default=DEFAULT_FULL_LEVELS,
+        help=f"全文で含める新しい階層の数 (default: {DEFAULT_FULL_LEVELS})",
+    )
+    parser.add_argument("--query", help="残り予算を埋める検索クエリ（省略時は keywords）")
+    parser.add_argument(
+        "--hits",
+        type=int,
+        default=DEFAULT_HIT_COUNT,
+        help=f"含める検索ヒットの最大数 (default: {DEFAULT_HIT_COUNT})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="キャッシュを使わずに作成")
+    parser.add_argument(
+        "--output",
+        choices=["json", "text"],
+        default="json",
+        help="Output format (default: json)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        result = build_context_pack(
+            budget=args.budget,
+            unit=args.unit,
+            full_levels=args.full_levels,
+            query=args.query,
+            hit_count=args.hits,
+            use_cache=not args.no_cache,
+        )
+        if args.output == "json":
+            output_json(result)
+        else:
+            print(result["text"])
+
+    except Exception as e:
+        output_error(str(e))
+
+
+if __name__ == "__main__":
+    import io
+
+    # Windows UTF-8入出力対応
+    if sys.platform == "win32":
+        sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+
+    main()
@@ -9,36 +9,49 @@ Digest Auto CLI
 Usage:
     python -m interfaces.digest_auto --output json
     python -m interfaces.digest_auto --output text
+    python -m interfaces.digest_auto --watch          # JSON Lines で差分を出力し続ける
 """
 
 import argparse
+import json
 import re
 import sys
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from application.finalize import FinalizeJournal
 from domain.constants import DIGEST_LEVEL_NAMES, LEVEL_CONFIG
 from domain.exceptions import FileIOError
-from domain.file_constants import (
-    CONFIG_FILENAME,
-    DIGEST_TIMES_FILENAME,
-    GRAND_DIGEST_FILENAME,
-    SHADOW_GRAND_DIGEST_FILENAME,
-)
+from domain.file_constants import CONFIG_FILENAME, DIGEST_TIMES_FILENAME, SHADOW_SHARD_DIRNAME
+from infrastructure.analysis_cache import AnalysisCache
+from infrastructure.change_watch import ChangeWatcher
 from infrastructure.config import get_persistent_config_dir
 from infrastructure.json_repository import load_json, try_load_json
 from interfaces.cli_helpers import output_error, output_json
+from interfaces.workspace_snapshot import (
+    INPUT_CONFIG,
+    INPUT_GRAND,
+    INPUT_LOOPS,
+    INPUT_SHADOW,
+    INPUT_TIMES,
+    WorkspaceSnapshot,
+    resolve_workspace_paths,
+    snapshot_inputs,
+)
 
 # 表示制限の定数
 MAX_DISPLAY_FILES = 5  # テキストレポートに表示する最大ファイル数
 
+# 分析キャッシュのキー
+ANALYSIS_CACHE_KEY = "digest_auto"
+
 
 @dataclass
 class Issue:
     """検出された問題"""
 
-    type: str  # "unprocessed_loops" | "placeholders" | "gaps"
+    type: str  # "unprocessed_loops" | "placeholders" | "gaps" | "pending_finalize"
     level: Optional[str] = None
     count: int = 0
     files: List[str] = field(default_factory=list)
@@ -67,6 +80,34 @@ class AnalysisResult:
     recommendations: List[str] = field(default_factory=list)
     error: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisResult":
+        """
+        asdict() の結果から復元（分析キャッシュ用）
+
+        Raises:
+            TypeError / KeyError: 形式が異なる場合
+        """
+        return cls(
+            status=data["status"],
+            issues=[Issue(**issue) for issue in data.get("issues", [])],
+            generatable_levels=[LevelStatus(**s) for s in data.get("generatable_levels", [])],
+            insufficient_levels=[LevelStatus(**s) for s in data.get("insufficient_levels", [])],
+            recommendations=list(data.get("recommendations", [])),
+            error=data.get("error"),
+        )
+
+
+@dataclass
+class AnalysisState:
+    """各チェックの結果（--watch で入力が変わったチェックだけを再計算する単位）"""
+
+    unprocessed_loops: List[str] = field(default_factory=list)
+    placeholders: Dict[str, List[str]] = field(default_factory=dict)  # 階層 → source_files
+    gaps: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # 階層 → range / missing
+    levels: Dict[str, LevelStatus] = field(default_factory=dict)  # 階層 → 生成可能判定
+    pending_finalize: List[Issue] = field(default_factory=list)  # 未完了の確定処理
+
 
 class DigestAutoAnalyzer:
     """健全性診断クラス"""
@@ -79,42 +120,19 @@ class DigestAutoAnalyzer:
         self.config_file = persistent_config_dir / CONFIG_FILENAME
         self.last_digest_file = persistent_config_dir / DIGEST_TIMES_FILENAME
 
-    def _load_config(self) -> Dict[str, Any]:
-        """設定ファイルを読み込む"""
-        return load_json(self.config_file)
-
-    def _resolve_base_dir(self, config: Dict[str, Any]) -> Path:
-        """base_dirを解決"""
-        base_dir_str = config.get("base_dir", "")
-        if not base_dir_str:
-            raise ValueError("base_dir is required in config.json")
-        base_path = Path(base_dir_str).expanduser()
-        if not base_path.is_absolute():
-            raise ValueError("base_dir must be an absolute path")
-        return base_path.resolve()
-
-    def _resolve_paths(self, config: Dict[str, Any]) -> Tuple[Path, Path, Path]:
-        """設定から各種パスを解決
-
-        Args:
-            config: 設定データ
-
-        Returns:
-            (loops_path, essences_path, digests_path) のタプル
-        """
-        base_dir = self._resolve_base_dir(config)
-        paths = config.get("paths", {})
-
-        loops_path = base_dir / paths.get("loops_dir", "data/Loops")
-        essences_path = base_dir / paths.get("essences_dir", "data/Essences")
-        digests_path = base_dir / paths.get("digests_dir", "data/Digests")
-
-        return loops_path, essences_path, digests_path
-
     def _load_json_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """JSONファイルを読み込む（存在しない場合はNone）"""
         return try_load_json(file_path, log_on_error=False)
 
+    def capture_snapshot(self) -> WorkspaceSnapshot:
+        """
+        ワークスペースの状態を1回の走査・読み込みで取得
+
+        Raises:
+            FileIOError: config.json が存在しない・読めない場合
+        """
+        return WorkspaceSnapshot.capture(self.config_file, self.last_digest_file)
+
     def _extract_file_number(self, filename: str) -> Optional[int]:
         """ファイル名から番号を抽出"""
         # L00001, W0001, M001 などのパターンにマッチ
@@ -135,253 +153,316 @@ class DigestAutoAnalyzer:
                 gaps.append(n)
         return gaps
 
-    def analyze(self) -> AnalysisResult:
-        """分析実行"""
-        issues: List[Issue] = []
-        recommendations: List[str] = []
+    def analyze(self, snapshot: Optional[WorkspaceSnapshot] = None) -> AnalysisResult:
+        """
+        分析実行
+
+        各ディレクトリの走査と各ファイルの読み込みは capture_snapshot() で1回だけ行い、
+        全てのチェックはスナップショットからメモリ上で求める。
+        スナップショットを省略した場合、入力が前回の分析から変わっていなければ
+        Essences の分析キャッシュ（infrastructure.analysis_cache）の結果を返す。
 
+        Args:
+            snapshot: 取得済みのスナップショット（省略時はここで取得）
+        """
         try:
-            # 1. 設定とパス解決
-            config = self._load_config()
-            loops_path, essences_path, digests_path = self._resolve_paths(config)
-
-            # 2. 未処理Loop検出
-            unprocessed_loops = self._check_unprocessed_loops(loops_path)
-            if unprocessed_loops:
-                issues.append(
-                    Issue(
-                        type="unprocessed_loops",
-                        count=len(unprocessed_loops),
-                        files=unprocessed_loops,
-                    )
-                )
-                recommendations.append("Run /digest to process unprocessed loops first")
-
-            # 3. ShadowGrandDigest確認
-            shadow_file = essences_path / SHADOW_GRAND_DIGEST_FILENAME
-            shadow_data = self._load_json_file(shadow_file)
-            if shadow_data is None:
-                return AnalysisResult(
-                    status="error",
-                    error="ShadowGrandDigest.txt not found or corrupted",
-                    recommendations=["Run @digest-setup to initialize"],
+            cache: Optional[AnalysisCache] = None
+            fingerprint: Optional[str] = None
+            if snapshot is None:
+                cache, fingerprint = self._open_cache()
+                cached: Optional[AnalysisResult] = cache.get(
+                    ANALYSIS_CACHE_KEY, fingerprint, AnalysisResult.from_dict
                 )
+                if cached is not None:
+                    return cached
 
-            # 4. プレースホルダー検出
-            placeholders = self._check_placeholders(shadow_data)
-            if placeholders:
-                for level, files in placeholders:
-                    issues.append(
-                        Issue(
-                            type="placeholders",
-                            level=level,
-                            count=len(files),
-                            files=files,
-                        )
-                    )
-                recommendations.append("Run /digest to complete pending analysis")
-
-            # 5. 中間ファイルスキップ検出（警告のみ）
-            gaps = self._check_gaps(shadow_data)
-            if gaps:
-                for level, gap_info in gaps.items():
-                    issues.append(
-                        Issue(
-                            type="gaps",
-                            level=level,
-                            count=len(gap_info["missing"]),
-                            details=gap_info,
-                        )
-                    )
-                recommendations.append("Consider adding missing files to prevent memory gaps")
-
-            # 6. GrandDigest確認と生成可能な階層判定
-            grand_file = essences_path / GRAND_DIGEST_FILENAME
-            grand_data = self._load_json_file(grand_file) or {}
-
-            generatable, insufficient = self._determine_generatable_levels(
-                config=config,
-                loops_path=loops_path,
-                digests_path=digests_path,
-                grand_data=grand_data,
-                unprocessed_count=len(unprocessed_loops),
-            )
+                # 1. 設定・ディレクトリ・Shadow / Grand / last_digest_times を一括取得
+                snapshot = self.capture_snapshot()
+            if snapshot.shadow is None:
+                return self.missing_shadow_result()
 
-            # 推奨アクションの追加
-            if generatable:
-                for level_status in generatable:
-                    recommendations.append(f"Run /digest {level_status.level} to generate digest")
-
-            # 7. 結果構築
-            return self._build_analysis_result(
-                issues=issues,
-                recommendations=recommendations,
-                generatable=generatable,
-                insufficient=insufficient,
-                has_unprocessed=bool(unprocessed_loops),
-                has_placeholders=bool(placeholders),
-            )
+            # 2. 各チェック
+            state, _ = self.run_checks(snapshot)
+
+            # 3. 結果構築
+            result = self.build_result(state)
+            if cache is not None:
+                cache.put(ANALYSIS_CACHE_KEY, fingerprint, asdict(result))
+            return result
 
-        except FileIOError as e:
-            return AnalysisResult(
-                status="error",
-                error=str(e),
-                recommendations=["Run @digest-setup first"],
-            )
         except Exception as e:
+            return self.error_result(e)
+
+    def _open_cache(self) -> Tuple[AnalysisCache, Optional[str]]:
+        """
+        分析キャッシュと、スナップショットの入力のフィンガープリント
+
+        Raises:
+            FileIOError: config.json が存在しない・読めない場合
+            ValueError: base_dir が不正な場合
+        """
+        paths = resolve_workspace_paths(load_json(self.config_file))
+        cache = AnalysisCache(paths["essences"])
+        inputs = snapshot_inputs(self.config_file, self.last_digest_file, paths)
+        return cache, cache.fingerprint(inputs)
+
+    def error_result(self, error: Exception) -> AnalysisResult:
+        """分析中の例外から結果を構築（FileIOError ならセットアップを推奨）"""
+        if isinstance(error, FileIOError):
             return AnalysisResult(
                 status="error",
-                error=str(e),
+                error=str(error),
+                recommendations=["Run @digest-setup first"],
             )
+        return AnalysisResult(
+            status="error",
+            error=str(error),
+        )
 
-    def _check_unprocessed_loops(self, loops_path: Path) -> List[str]:
-        """未処理Loop検出"""
-        if not loops_path.exists():
-            return []
-
-        # Loopファイルを取得
-        loop_files = list(loops_path.glob("L*.txt"))
-        if not loop_files:
-            return []
-
-        # last_processed を取得
-        # file_detector.py と同様に、loop.last_processed を参照
-        # (weekly.last_processed は Weekly番号であり、Loop番号ではない)
-        last_digest_data = self._load_json_file(self.last_digest_file)
-        last_processed = None
-        if last_digest_data:
-            loop_data = last_digest_data.get("loop", {})
-            last_processed = loop_data.get("last_processed")
-
-        # last_processedより後のLoopを検出
-        unprocessed = []
-        for f in loop_files:
-            file_num = self._extract_file_number(f.stem)
-            if file_num is not None:
-                if last_processed is None or file_num > last_processed:
-                    unprocessed.append(f.stem)
-
-        return sorted(unprocessed)
-
-    def _check_placeholders(self, shadow_data: Dict[str, Any]) -> List[Tuple[str, List[str]]]:
-        """プレースホルダー検出"""
-        placeholders = []
-        latest_digests = shadow_data.get("latest_digests", {})
+    def missing_shadow_result(self) -> AnalysisResult:
+        """ShadowGrandDigest が読めない場合の結果"""
+        return AnalysisResult(
+            status="error",
+            error="ShadowGrandDigest.txt not found or corrupted",
+            recommendations=["Run @digest-setup to initialize"],
+        )
 
-        for level in DIGEST_LEVEL_NAMES:
-            level_data = latest_digests.get(level, {})
-            overall_digest = level_data.get("overall_digest")
+    def run_checks(
+        self,
+        snapshot: WorkspaceSnapshot,
+        previous: Optional[Tuple[WorkspaceSnapshot, AnalysisState]] = None,
+        changed: Optional[Set[str]] = None,
+    ) -> Tuple[AnalysisState, List[str]]:
+        """
+        各チェックを実行（previous と changed があれば入力が変わったチェックだけ）
 
-            if overall_digest is not None:
-                source_files = overall_digest.get("source_files", [])
-                # source_filesがあるのにabstractがプレースホルダーの場合
-                abstract = overall_digest.get("abstract", "")
-                if source_files and isinstance(abstract, str) and "<!-- PLACEHOLDER" in abstract:
-                    placeholders.append((level, source_files))
+        チェックと入力の対応:
+            unprocessed_loops      ← loops, times
+            placeholders:{level}   ← shadow の latest_digests[level]
+            gaps:{level}           ← shadow の latest_digests[level]
+            level:{level}          ← config, ソース（loops または下位階層ディレクトリ）,
+                                     grand の major_digests[下位階層]
+            pending_finalize       ← FinalizeJournal（いずれかの入力が変わったとき）
 
-        return placeholders
+        Args:
+            snapshot: 現在のスナップショット（shadow は None でないこと）
+            previous: 前回の (スナップショット, チェック結果)
+            changed: previous から内容が変わった入力名（WorkspaceSnapshot.refresh の結果）
 
-    def _check_gaps(self, shadow_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        """中間ファイルスキップ検出"""
-        gaps = {}
-        latest_digests = shadow_data.get("latest_digests", {})
+        Returns:
+            (チェック結果, 再計算したチェック名のリスト)
 
+        Example:
+            >>> state, recomputed = analyzer.run_checks(new, (old, old_state), {"shadow"})
+            >>> recomputed
+            ['placeholders:weekly', 'gaps:weekly']
+        """
+        if previous is None or changed is None or INPUT_CONFIG in changed:
+            old_snapshot: Optional[WorkspaceSnapshot] = None
+            state = AnalysisState()
+        else:
+            old_snapshot, old_state = previous
+            state = replace(
+                old_state,
+                placeholders=dict(old_state.placeholders),
+                gaps=dict(old_state.gaps),
+                levels=dict(old_state.levels),
+            )
+        recomputed: List[str] = []
+
+        def has_changed(name: str, section: str, key: str) -> bool:
+            """全体の再計算時、または入力 name の section[key] が前回と異なるか"""
+            if old_snapshot is None:
+                return True
+            if changed is None or name not in changed:
+                return False
+            old = (old_snapshot.document(name) or {}).get(section, {}) or {}
+            new = (snapshot.document(name) or {}).get(section, {}) or {}
+            return bool(old.get(key) != new.get(key))
+
+        # 未処理Loop検出
+        if old_snapshot is None or (changed or set()) & {INPUT_LOOPS, INPUT_TIMES}:
+            state.unprocessed_loops = self._check_unprocessed_loops(snapshot)
+            recomputed.append("unprocessed_loops")
+
+        latest_digests = (snapshot.shadow or {}).get("latest_digests", {})
         for level in DIGEST_LEVEL_NAMES:
-            level_data = latest_digests.get(level, {})
-            overall_digest = level_data.get("overall_digest")
-
-            if overall_digest is not None:
-                source_files = overall_digest.get("source_files", [])
-                if len(source_files) > 1:
-                    numbers = []
-                    for f in source_files:
-                        num = self._extract_file_number(f)
-                        if num is not None:
-                            numbers.append(num)
-
-                    if numbers:
-                        missing = self._find_gaps(numbers)
-                        if missing:
-                            gaps[level] = {
-                                "range": f"{source_files[0]}～{source_files[-1]}",
-                                "missing": missing,
-                            }
+            # プレースホルダー・中間ファイルスキップ検出
+            if has_changed(INPUT_SHADOW, "latest_digests", level):
+                level_data = latest_digests.get(level, {})
+                self._store_check(state.placeholders, level, self._check_placeholders(level_data))
+                self._store_check(state.gaps, level, self._check_gaps(level_data))
+                recomputed.extend([f"placeholders:{level}", f"gaps:{level}"])
+
+            # 生成可能判定
+            source = str(LEVEL_CONFIG[level]["source"])
+            source_changed = (
+                old_snapshot is None
+                or source in (changed or set())
+                or (source == "loops" and INPUT_LOOPS in (changed or set()))
+                or has_changed(INPUT_GRAND, "major_digests", source)
+            )
+            if source_changed:
+                state.levels[level] = self._level_status(snapshot, level)
+                recomputed.append(f"level:{level}")
+
+        # 未完了の確定処理（finalize は Shadow / Grand / 階層ディレクトリのいずれかを書き換える）
+        if old_snapshot is None or changed:
+            state.pending_finalize = self._check_pending_finalize(snapshot)
+            recomputed.append("pending_finalize")
+
+        return state, recomputed
+
+    @staticmethod
+    def _store_check(results: Dict[str, Any], level: str, value: Any) -> None:
+        """階層のチェック結果を保存（問題がなければ削除）"""
+        if value:
+            results[level] = value
+        else:
+            results.pop(level, None)
 
-        return gaps
+    def build_result(self, state: AnalysisState) -> AnalysisResult:
+        """
+        チェック結果から分析結果を構築
 
-    def _determine_generatable_levels(
-        self,
-        config: Dict[str, Any],
-        loops_path: Path,
-        digests_path: Path,
-        grand_data: Dict[str, Any],
-        unprocessed_count: int,
-    ) -> Tuple[List[LevelStatus], List[LevelStatus]]:
-        """生成可能な階層判定"""
-        levels_config = config.get("levels", {})
-        major_digests = grand_data.get("major_digests", {})
-
-        generatable = []
-        insufficient = []
-
-        # 各階層のファイル数をカウント
-        level_counts: Dict[str, int] = {}
+        Args:
+            state: run_checks() の結果
 
-        for level in DIGEST_LEVEL_NAMES:
-            level_cfg = LEVEL_CONFIG[level]
-            source = level_cfg["source"]
-            # 設定ファイルのthreshold_keyまたはLEVEL_CONFIGのデフォルト値を使用
-            threshold_key = f"{level}_threshold"
-            threshold = levels_config.get(threshold_key, level_cfg["threshold"])
-
-            if source == "loops":
-                # Loopファイル数（未処理含む）
-                if loops_path.exists():
-                    current = len(list(loops_path.glob("L*.txt")))
-                else:
-                    current = 0
-            else:
-                # 下位階層のRegular Digest数
-                source_level_data = major_digests.get(source, {})
-                overall = source_level_data.get("overall_digest")
-                if overall:
-                    # GrandDigestにある = 確定済み
-                    # 実際のファイル数をカウント
-                    source_dir = self._get_level_dir(digests_path, source)
-                    if source_dir.exists():
-                        # Provisional以外のファイルをカウント
-                        current = len(
-                            [
-                                f
-                                for f in source_dir.glob("*.txt")
-                                if "Provisional" not in str(f.parent)
-                            ]
-                        )
-                    else:
-                        current = 0
-                else:
-                    current = 0
-
-            level_counts[level] = current
-
-            status = LevelStatus(
-                level=level,
-                current=current,
-                threshold=threshold,
-                ready=current >= threshold,
-                source_type=source,
+        Returns:
+            AnalysisResult（問題・推奨アクションの順序は階層順）
+        """
+        issues: List[Issue] = []
+        recommendations: List[str] = []
+
+        if state.unprocessed_loops:
+            issues.append(
+                Issue(
+                    type="unprocessed_loops",
+                    count=len(state.unprocessed_loops),
+                    files=state.unprocessed_loops,
+                )
+            )
+            recommendations.append("Run /digest to process unprocessed loops first")
+
+        placeholder_levels = [level for level in DIGEST_LEVEL_NAMES if level in state.placeholders]
+        for level in placeholder_levels:
+            files = state.placeholders[level]
+            issues.append(Issue(type="placeholders", level=level, count=len(files), files=files))
+        if placeholder_levels:
+            recommendations.append("Run /digest to complete pending analysis")
+
+        gap_levels = [level for level in DIGEST_LEVEL_NAMES if level in state.gaps]
+        for level in gap_levels:
+            gap_info = state.gaps[level]
+            issues.append(
+                Issue(type="gaps", level=level, count=len(gap_info["missing"]), details=gap_info)
+            )
+        if gap_levels:
+            recommendations.append("Consider adding missing files to prevent memory gaps")
+
+        statuses = [state.levels[level] for level in DIGEST_LEVEL_NAMES]
+        generatable = [status for status in statuses if status.ready]
+        insufficient = [status for status in statuses if not status.ready]
+        for level_status in generatable:
+            recommendations.append(f"Run /digest {level_status.level} to generate digest")
+
+        issues.extend(state.pending_finalize)
+        for issue in state.pending_finalize:
+            recommendations.append(
+                f"Run /digest {issue.level} again to recover the interrupted finalize"
             )
 
-            if status.ready:
-                generatable.append(status)
-            else:
-                insufficient.append(status)
+        return self._build_analysis_result(
+            issues=issues,
+            recommendations=recommendations,
+            generatable=generatable,
+            insufficient=insufficient,
+            has_unprocessed=bool(state.unprocessed_loops) or bool(state.pending_finalize),
+            has_placeholders=bool(placeholder_levels),
+        )
 
-        return generatable, insufficient
+    def _check_unprocessed_loops(self, snapshot: WorkspaceSnapshot) -> List[str]:
+        """未処理Loop検出"""
+        if snapshot.loops.count() == 0:
+            return []
 
-    def _get_level_dir(self, digests_path: Path, level: str) -> Path:
-        """階層のディレクトリパスを取得"""
-        return digests_path / LEVEL_CONFIG[level]["dir"]
+        # file_detector.py と同様に、loop.last_processed を参照
+        # (weekly.last_processed は Weekly番号であり、Loop番号ではない)
+        last_processed = snapshot.last_processed_loop()
+
+        # last_processedより後のLoopを検出（未処理時は番号付き全件）
+        threshold = last_processed if last_processed is not None else -1
+        return sorted(Path(name).stem for name in snapshot.loops.names_after(threshold))
+
+    def _check_pending_finalize(self, snapshot: WorkspaceSnapshot) -> List[Issue]:
+        """未完了の確定処理検出（FinalizeJournal に commit / abort のないトランザクション）"""
+        return [
+            Issue(
+                type="pending_finalize",
+                level=txn.level,
+                count=1,
+                files=[str(txn.plan.get("digest_name", ""))],
+                details={"txn": txn.txn_id, "completed": sorted(txn.completed)},
+            )
+            for txn in FinalizeJournal(snapshot.essences_path).pending()
+        ]
+
+    def _check_placeholders(self, level_data: Dict[str, Any]) -> List[str]:
+        """プレースホルダー検出（1階層分、プレースホルダーのままの source_files）"""
+        overall_digest = (level_data or {}).get("overall_digest")
+        if overall_digest is None:
+            return []
+        source_files: List[str] = overall_digest.get("source_files", [])
+        # source_filesがあるのにabstractがプレースホルダーの場合
+        abstract = overall_digest.get("abstract", "")
+        if source_files and isinstance(abstract, str) and "<!-- PLACEHOLDER" in abstract:
+            return source_files
+        return []
+
+    def _check_gaps(self, level_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """中間ファイルスキップ検出（1階層分）"""
+        overall_digest = (level_data or {}).get("overall_digest")
+        if overall_digest is None:
+            return None
+        source_files = overall_digest.get("source_files", [])
+        if len(source_files) <= 1:
+            return None
+        numbers = []
+        for f in source_files:
+            num = self._extract_file_number(f)
+            if num is not None:
+                numbers.append(num)
+        missing = self._find_gaps(numbers) if numbers else []
+        if not missing:
+            return None
+        return {"range": f"{source_files[0]}～{source_files[-1]}", "missing": missing}
+
+    def _level_status(self, snapshot: WorkspaceSnapshot, level: str) -> LevelStatus:
+        """生成可能判定（1階層分）"""
+        level_cfg = LEVEL_CONFIG[level]
+        source = str(level_cfg["source"])
+        # 設定ファイルのthreshold_keyまたはLEVEL_CONFIGのデフォルト値を使用
+        threshold_key = f"{level}_threshold"
+        threshold = snapshot.config.get("levels", {}).get(threshold_key, level_cfg["threshold"])
+
+        if source == "loops":
+            # Loopファイル数（未処理含む）
+            current = snapshot.loops.count()
+        else:
+            # 下位階層のRegular Digest数
+            major_digests = (snapshot.grand or {}).get("major_digests", {})
+            overall = major_digests.get(source, {}).get("overall_digest")
+            # GrandDigestにある = 確定済み
+            # 実際のファイル数（Provisional以外、直下のみ）
+            current = snapshot.levels[source].count() if overall else 0
+
+        return LevelStatus(
+            level=level,
+            current=current,
+            threshold=threshold,
+            ready=current >= threshold,
+            source_type=source,
+        )
 
     def _build_analysis_result(
         self,
@@ -399,7 +480,7 @@ class DigestAutoAnalyzer:
             recommendations: 推奨アクションリスト
             generatable: 生成可能な階層リスト
             insufficient: 不足している階層リスト
-            has_unprocessed: 未処理Loopがあるか
+            has_unprocessed: 未処理Loop・未完了の確定処理があるか
             has_placeholders: プレースホルダーがあるか
 
         Returns:
@@ -420,6 +501,144 @@ class DigestAutoAnalyzer:
         )
 
 
+class DigestAutoWatch:
+    """
+    --watch のセッション
+
+    前回のスナップショット・チェック結果・分析結果をメモリに保持し、
+    変更された入力だけを読み直して、その入力に依存するチェックだけを再計算する。
+    結果が変わった場合だけ差分イベントを返す。
+
+    Example:
+        >>> session = DigestAutoWatch(DigestAutoAnalyzer())
+        >>> session.start()["event"]
+        'snapshot'
+        >>> session.poll()  # Loop が1つ増えた後
+        {'event': 'delta', 'changed_inputs': ['loops'], 'recomputed': [...], ...}
+    """
+
+    def __init__(self, analyzer: DigestAutoAnalyzer) -> None:
+        self.analyzer = analyzer
+        self.snapshot: Optional[WorkspaceSnapshot] = None
+        self.state: Optional[AnalysisState] = None
+        self.result: Optional[AnalysisResult] = None
+
+    def start(self) -> Dict[str, Any]:
+        """
+        全チェックを実行して "snapshot" イベントを返す
+
+        Returns:
+            {"event": "snapshot", "result": AnalysisResult の dict}
+        """
+        self.snapshot = None
+        self.state = None
+        self.result, _, _ = self._update()
+        return {"event": "snapshot", "result": asdict(self.result)}
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        変更を確認して再分析し、結果が変わっていれば "delta" イベントを返す
+
+        Returns:
+            差分イベント（結果が変わらなければ None）。キー:
+            changed_inputs / recomputed / status / error / issues_added /
+            issues_removed / levels（変わった階層の LevelStatus）/ recommendations
+        """
+        previous = self.result
+        result, changed, recomputed = self._update()
+        self.result = result
+        old = asdict(previous) if previous is not None else asdict(AnalysisResult(status=""))
+        new = asdict(result)
+        if new == old:
+            return None
+
+        old_levels = {
+            status["level"]: status
+            for status in old["generatable_levels"] + old["insufficient_levels"]
+        }
+        levels = [
+            status
+            for status in new["generatable_levels"] + new["insufficient_levels"]
+            if old_levels.get(status["level"]) != status
+        ]
+        return {
+            "event": "delta",
+            "changed_inputs": changed,
+            "recomputed": recomputed,
+            "status": new["status"],
+            "error": new["error"],
+            "issues_added": [issue for issue in new["issues"] if issue not in old["issues"]],
+            "issues_removed": [issue for issue in old["issues"] if issue not in new["issues"]],
+            "levels": sorted(levels, key=lambda status: DIGEST_LEVEL_NAMES.index(status["level"])),
+            "recommendations": new["recommendations"],
+        }
+
+    def directories(self) -> List[Path]:
+        """監視するディレクトリ（設定・Loops・Essences・各階層）"""
+        directories = [self.analyzer.config_file.parent, self.analyzer.last_digest_file.parent]
+        if self.snapshot is not None:
+            directories.extend([self.snapshot.loops_path, self.snapshot.essences_path])
+            directories.append(self.snapshot.essences_path / SHADOW_SHARD_DIRNAME)
+            directories.extend(scan.directory for scan in self.snapshot.levels.values())
+        return list(dict.fromkeys(directories))
+
+    def run(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        interval: float = 1.0,
+        backend: Optional[str] = None,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """
+        初回の結果と、以降の差分を emit に渡し続ける
+
+        Args:
+            emit: イベントを受け取る関数（CLI では JSON Lines で標準出力へ）
+            interval: 変更を確認する最長間隔（秒）
+            backend: ChangeWatcher のバックエンド（None なら使えれば inotify）
+            max_polls: 確認回数の上限（None なら無制限）
+        """
+        emit(self.start())
+        with ChangeWatcher(self.directories(), interval=interval, backend=backend) as watcher:
+            polls = 0
+            while max_polls is None or polls < max_polls:
+                watcher.wait()
+                polls += 1
+                event = self.poll()
+                if event is not None:
+                    emit(event)
+
+    def _update(self) -> Tuple[AnalysisResult, List[str], List[str]]:
+        """スナップショットを更新して再分析（結果, 変更された入力, 再計算したチェック）"""
+        old_snapshot = self.snapshot
+        try:
+            if old_snapshot is None:
+                snapshot = self.analyzer.capture_snapshot()
+                changed: Optional[Set[str]] = None
+            else:
+                snapshot, changed = old_snapshot.refresh()
+                if not changed and self.result is not None:
+                    self.snapshot = snapshot
+                    return self.result, [], []
+            self.snapshot = snapshot
+            # 全体を取り直した場合は "*"
+            inputs = sorted(changed) if changed is not None else ["*"]
+            if snapshot.shadow is None:
+                self.state = None
+                return self.analyzer.missing_shadow_result(), inputs, []
+
+            previous = None
+            if old_snapshot is not None and self.state is not None:
+                previous = (old_snapshot, self.state)
+            self.state, recomputed = self.analyzer.run_checks(snapshot, previous, changed)
+            return self.analyzer.build_result(self.state), inputs, recomputed
+        except Exception as e:
+            # 次回は全体を取り直す
+            self.snapshot = None
+            self.state = None
+            return self.analyzer.error_result(e), ["*"], []
+
+
 def format_text_report(result: AnalysisResult) -> str:
     """テキスト形式でレポートをフォーマット（テスト可能）
 
@@ -463,6 +682,12 @@ def format_text_report(result: AnalysisResult) -> str:
                 output.append(f"⚠️ プレースホルダー検出 ({issue.level}): {issue.count}個")
                 output.append("")
 
+            elif issue.type == "pending_finalize":
+                names = ", ".join(issue.files)
+                output.append(f"⚠️ 未完了の確定処理 ({issue.level}): {names}")
+                output.append("  次回の確定時に再実行またはロールバックされます")
+                output.append("")
+
             elif issue.type == "gaps":
                 output.append(f"⚠️ 中間ファイルスキップ ({issue.level})")
                 if issue.details:
@@ -502,6 +727,11 @@ def format_text_report(result: AnalysisResult) -> str:
     return "\n".join(output)
 
 
+def emit_json_line(event: Dict[str, Any]) -> None:
+    """イベントを JSON Lines の1行として標準出力へ（--watch 用）"""
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
 def print_text_report(result: AnalysisResult) -> None:
     """テキスト形式でレポートを出力（VSCode対応）"""
     print(format_text_report(result))
@@ -520,11 +750,28 @@ def main() -> None:
         default="json",
         help="Output format (default: json)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and emit JSON-lines deltas when the workspace changes",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Maximum seconds between change checks in --watch mode (default: 1.0)",
+    )
 
     args = parser.parse_args()
 
     try:
         analyzer = DigestAutoAnalyzer()
+        if args.watch:
+            try:
+                DigestAutoWatch(analyzer).run(emit_json_line, interval=args.interval)
+            except KeyboardInterrupt:
+                pass
+            return
         result = analyzer.analyze()
 
         if args.output == "json":
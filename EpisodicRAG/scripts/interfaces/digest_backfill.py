@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+EpisodicRAG Digest Backfill (Facade)
+====================================
+
+長年分の Loop ファイルを一括で取り込み、全階層の RegularDigest・GrandDigest・
+ShadowGrandDigest・ProvisionalDigest・last_digest_times を組み立てる。
+
+update_shadow_for_new_loops と finalize_from_shadow を数百回繰り返すと、
+そのたびに全ファイルの走査と Shadow / Grand の読み書きが発生する。
+digest_backfill は Loop を番号順に1回だけ読み、メモリ上で下の階層から順に
+確定していく。
+
+## 設計意図
+
+ARCHITECTURE: Streaming Bottom-up Builder
+- Loop は番号順に weekly_threshold 件ずつのチャンクとして流す。ヘッダー
+  （metadata / overall_digest）だけを読み、パースはプロセスプールに任せる
+  （--workers。1 以下なら同じプロセスで読む）
+- 階層ごとのキュー（Shadow の source_files に相当）が閾値に達したら確定し、
+  RegularDigest を保存して次の階層のキューに積む。確定済みの RegularDigest
+  以外（GrandDigest / ShadowGrandDigest / last_digest_times / Provisional /
+  検索インデックス）は最後に1回ずつ書き込む
+- overall_digest はソースから機械的に合成する（digest_type は最頻値、
+  keywords は出現頻度の上位、abstract / impression はソースの連結を
+  PLACEHOLDER_LIMITS の文字数で切り詰め）。metadata.generated_by に
+  "digest_backfill" を記録するため、後から Claude で再分析できる。
+  個別ダイジェストは、その番号の Provisional があればそれを使う
+- チェックポイント（Essences/BackfillCheckpoint.json）にキューと採番状態を
+  定期的に保存し、中断後は続きから再開する。ダイジェスト名はソースの範囲
+  （例: "L00001-L00005"）から決まるため、チェックポイント後に保存済みの
+  RegularDigest は同じ内容で上書きされる
+
+使用方法：
+    python -m interfaces.digest_backfill [--workers N] [--checkpoint-interval N] [--restart]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, cast
+
+from application.config import DigestConfig
+from application.finalize import DigestPersistence, RegularDigestBuilder
+from application.grand import GrandDigestManager, ShadowGrandDigestManager
+from application.search import DigestSearchIndex
+from application.shadow import ShadowTemplate
+from application.shadow.placeholder_manager import PlaceholderManager
+from application.tracking import DigestTimesTracker
+from domain.constants import DIGEST_LEVEL_NAMES, LEVEL_CONFIG, PLACEHOLDER_LIMITS
+from domain.exceptions import EpisodicRAGError
+from domain.file_constants import BACKFILL_CHECKPOINT_FILENAME
+from domain.file_naming import extract_number_only, format_digest_number
+from domain.level_registry import get_level_registry
+from domain.text_utils import extract_long_value
+from domain.types import IndividualDigestData, OverallDigestData, ShadowDigestData
+from infrastructure import (
+    get_structured_logger,
+    log_error,
+    log_warning,
+    save_json,
+    try_read_json_from_file,
+)
+from infrastructure.digest_headers import get_header_index, read_json_header
+from infrastructure.file_index import get_file_index
+from infrastructure.json_repository import safe_read_json
+from interfaces.cli_helpers import output_json
+from interfaces.interface_helpers import get_next_digest_number, sanitize_filename
+
+__all__ = ["DigestBackfill", "main"]
+
+_logger = get_structured_logger(__name__)
+
+# チェックポイントの形式バージョン（互換性のない変更で上げる）
+CHECKPOINT_VERSION = 1
+
+# 何チャンクごとにチェックポイントを保存するか
+DEFAULT_CHECKPOINT_INTERVAL = 20
+
+# 合成した overall_digest の metadata.generated_by
+GENERATED_BY = "digest_backfill"
+
+# キューの要素: {"file": ファイル名, "overall": overall_digest}
+_QueueEntry = Dict[str, Any]
+
+
+def _read_loop_headers(paths: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Loop ファイルの overall_digest を読む（プロセスプールのワーカーで実行）
+
+    Returns:
+        paths と同じ順の overall_digest（読めないファイルは None）
+    """
+    results: List[Optional[Dict[str, Any]]] = []
+    for path in paths:
+        try:
+            parsed = read_json_header(Path(path), ("overall_digest",))
+        except (OSError, ValueError):
+            parsed = None
+        overall = parsed[0].get("overall_digest") if parsed else None
+        results.append(overall if isinstance(overall, dict) else None)
+    return results
+
+
+def _stem(filename: str) -> str:
+    """ "L00001_タイトル.txt" → "L00001" """
+    return filename.rsplit(".", 1)[0].split("_", 1)[0]
+
+
+class DigestBackfill:
+    """Loop の一括取り込みで全階層のダイジェストを構築するFacade"""
+
+    def __init__(
+        self,
+        config: Optional[DigestConfig] = None,
+        grand_digest_manager: Optional[GrandDigestManager] = None,
+        shadow_manager: Optional[ShadowGrandDigestManager] = None,
+        times_tracker: Optional[DigestTimesTracker] = None,
+    ):
+        """
+        Args:
+            config: DigestConfig インスタンス（省略時は自動生成）
+            grand_digest_manager: GrandDigestManager インスタンス（省略時は自動生成）
+            shadow_manager: ShadowGrandDigestManager インスタンス（省略時は自動生成）
+            times_tracker: DigestTimesTracker インスタンス（省略時は自動生成）
+
+        Example:
+            >>> backfill = DigestBackfill()
+            >>> backfill.run(workers=4)["digests"]
+            {'weekly': 104, 'monthly': 26, ...}
+        """
+        if config is None:
+            config = DigestConfig()
+        self.config = config
+        self.grand_digest_manager = grand_digest_manager or GrandDigestManager(config)
+        self.shadow_manager = shadow_manager or ShadowGrandDigestManager(config)
+        self.times_tracker = times_tracker or DigestTimesTracker(config)
+        self.levels = list(DIGEST_LEVEL_NAMES)
+        self.checkpoint_path = config.essences_path / BACKFILL_CHECKPOINT_FILENAME
+        self._persistence = DigestPersistence(
+            config,
+            self.grand_digest_manager,
+            self.shadow_manager,
+            self.times_tracker,
+            confirm_callback=lambda _message: True,
+        )
+        self._registry = get_level_registry()
+        self._template = ShadowTemplate(self.levels)
+        self._state: Dict[str, Any] = {}
+
+    # ========================================
+    # 状態（チェックポイントに保存する内容）
+    # ========================================
+
+    def _initial_state(self) -> Dict[str, Any]:
+        """既存の Shadow と last_digest_times から取り込み開始時の状態を作る"""
+        times = self.times_tracker.load_or_create()
+        last_loop = (times.get("loop") or {}).get("last_processed") or 0
+        queues: Dict[str, List[_QueueEntry]] = {}
+        for level in self.levels:
+            overall = self.shadow_manager.get_shadow_digest_for_level(level) or {}
+            source_files = overall.get("source_files") or []
+            headers = get_header_index(self.config.get_source_dir(level))
+            queue = []
+            for name in source_files:
+                header = headers.get(name) or {}
+                queue.append({"file": name, "overall": header.get("overall_digest") or {}})
+            headers.flush()
+            queues[level] = queue
+        return {
+            "version": CHECKPOINT_VERSION,
+            "started_at": datetime.now().isoformat(),
+            "last_loop": int(last_loop),
+            "loops": 0,
+            "queues": queues,
+            "touched": [],
+            "next_numbers": {
+                level: get_next_digest_number(self.config.digests_path, level)
+                for level in self.levels
+            },
+            "finalized": {},
+            "digests": {level: 0 for level in self.levels},
+        }
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """再開可能なチェックポイント（なければ None）"""
+        data = safe_read_json(self.checkpoint_path, raise_on_error=False)
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            return None
+        return data
+
+    def _save_checkpoint(self) -> None:
+        self._state["saved_at"] = datetime.now().isoformat()
+        save_json(self.checkpoint_path, self._state, compact=True)
+
+    # ========================================
+    # 確定
+    # ========================================
+
+    def _synthesize_overall(self, sources: List[_QueueEntry]) -> OverallDigestData:
+        """ソースの overall_digest から overall_digest を機械的に合成"""
+        limits = PLACEHOLDER_LIMITS
+        overalls = [entry["overall"] for entry in sources]
+        types = Counter(o.get("digest_type") for o in overalls if o.get("digest_type"))
+        keywords: Counter = Counter()
+        for o in overalls:
+            keywords.update(k for k in o.get("keywords") or [] if isinstance(k, str))
+        abstract = "\n".join(extract_long_value(o.get("abstract", "")) for o in overalls)
+        impression = "\n".join(extract_long_value(o.get("impression", "")) for o in overalls)
+        timestamps = [str(o["timestamp"]) for o in overalls if o.get("timestamp")]
+        return {
+            "timestamp": max(timestamps) if timestamps else datetime.now().isoformat(),
+            "source_files": [entry["file"] for entry in sources],
+            "digest_type": types.most_common(1)[0][0] if types else "統合",
+            "keywords": [k for k, _ in keywords.most_common(limits["keyword_count"])],
+            "abstract": abstract.strip()[: limits["abstract_chars"]],
+            "impression": impression.strip()[: limits["impression_chars"]],
+        }
+
+    def _provisional_path(self, level: str, number: int) -> Path:
+        digest_num = str(number).zfill(int(str(LEVEL_CONFIG[level]["digits"])))
+        prefix = LEVEL_CONFIG[level]["prefix"]
+        return self.config.get_provisional_dir(level) / f"{prefix}{digest_num}_Individual.txt"
+
+    def _individual_digests(
+        self, level: str, number: int, sources: List[_QueueEntry]
+    ) -> Tuple[List[IndividualDigestData], Optional[Path]]:
+        """その番号の Provisional があれば使い、なければソースから生成"""
+        provisional_path = self._provisional_path(level, number)
+        provisional = try_read_json_from_file(provisional_path, log_on_error=False)
+        if isinstance(provisional, dict) and provisional.get("individual_digests"):
+            return provisional["individual_digests"], provisional_path
+        entries: List[IndividualDigestData] = [
+            {
+                "source_file": entry["file"],
+                "digest_type": entry["overall"].get("digest_type", ""),
+                "keywords": entry["overall"].get("keywords", []),
+                "abstract": entry["overall"].get("abstract", ""),
+                "impression": entry["overall"].get("impression", ""),
+            }
+            for entry in sources
+        ]
+        return entries, provisional_path if provisional_path.exists() else None
+
+    def _finalize(self, level: str, sources: List[_QueueEntry]) -> _QueueEntry:
+        """キューの先頭 threshold 件を確定して RegularDigest を保存"""
+        number = int(self._state["next_numbers"][level])
+        digest_num = str(number).zfill(int(str(LEVEL_CONFIG[level]["digits"])))
+        title = sanitize_filename(f"{_stem(sources[0]['file'])}-{_stem(sources[-1]['file'])}")
+        digest_name = f"{format_digest_number(level, number)}_{title}"
+
+        overall = self._synthesize_overall(sources)
+        individual_digests, provisional_file = self._individual_digests(level, number, sources)
+        regular_digest = RegularDigestBuilder.build(
+            level, digest_name, digest_num, overall, individual_digests
+        )
+        metadata = cast(Dict[str, Any], regular_digest["metadata"])
+        metadata["generated_by"] = GENERATED_BY
+        path = self._persistence.save_regular_digest(
+            level, regular_digest, digest_name, update_search_index=False
+        )
+        if provisional_file is not None and provisional_file.exists():
+            provisional_file.unlink()
+
+        self._state["next_numbers"][level] = number + 1
+        self._state["digests"][level] += 1
+        self._state["finalized"][level] = {
+            "name": digest_name,
+            "number": number,
+            "overall": dict(regular_digest["overall_digest"]),
+        }
+        return {"file": path.name, "overall": dict(regular_digest["overall_digest"])}
+
+    def _cascade(self) -> None:
+        """閾値に達した階層を下から順に確定し、次の階層のキューに積む"""
+        queues = self._state["queues"]
+        touched = set(self._state["touched"])
+        for index, level in enumerate(self.levels):
+            threshold = max(1, self.config.get_threshold(level))
+            queue = queues[level]
+            while len(queue) >= threshold:
+                sources, queue = queue[:threshold], queue[threshold:]
+                finalized = self._finalize(level, sources)
+                touched.add(level)
+                if self._registry.should_cascade(level) and index + 1 < len(self.levels):
+                    next_level = self.levels[index + 1]
+                    queues[next_level].append(finalized)
+                    touched.add(next_level)
+            queues[level] = queue
+        self._state["touched"] = [level for level in self.levels if level in touched]
+
+    # ========================================
+    # 最後に1回ずつ書き込む出力
+    # ========================================
+
+    def _write_shadow(self) -> None:
+        """確定した階層の Shadow を空にし、残りのキューを source_files にする"""
+        finalized = self._state["finalized"]
+        queues = self._state["queues"]
+        touched = self._state["touched"]
+        placeholders = PlaceholderManager()
+
+        def apply(data: ShadowDigestData) -> None:
+            for level in touched:
+                level_data = cast(Dict[str, Any], data["latest_digests"]).setdefault(level, {})
+                overall = level_data.get("overall_digest")
+                if level in finalized or not overall:
+                    overall = self._template.create_empty_overall_digest()
+                overall["source_files"] = [entry["file"] for entry in queues[level]]
+                if overall["source_files"]:
+                    placeholders.update_or_preserve(overall, len(overall["source_files"]))
+                level_data["overall_digest"] = overall
+
+        self.shadow_manager.update_shadow(apply)
+
+    def _write_provisionals(self) -> None:
+        """確定待ちのキュー（weekly より上）を次番号の Provisional に書き出す"""
+        for level in self._state["touched"]:
+            queue = self._state["queues"][level]
+            if level == self.levels[0] or not queue:
+                continue
+            number = int(self._state["next_numbers"][level])
+            path = self._provisional_path(level, number)
+            existing = try_read_json_from_file(path, log_on_error=False) or {}
+            entries = list(existing.get("individual_digests") or [])
+            known = {e.get("source_file") or e.get("filename") for e in entries}
+            generated, _ = self._individual_digests(level, number, queue)
+            entries.extend(e for e in generated if e.get("source_file") not in known)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            save_json(
+                path,
+                {
+                    "metadata": {
+                        "digest_level": level,
+                        "digest_number": str(number).zfill(int(str(LEVEL_CONFIG[level]["digits"]))),
+                        "last_updated": datetime.now().isoformat(),
+                        "version": "1.0",
+                        "generated_by": GENERATED_BY,
+                    },
+                    "individual_digests": entries,
+                },
+            )
+
+    def _write_outputs(self) -> None:
+        finalized = self._state["finalized"]
+        self.grand_digest_manager.update_digests(
+            {
+                level: (entry["name"], cast(OverallDigestData, entry["overall"]))
+                for level, entry in finalized.items()
+            }
+        )
+        self._write_shadow()
+        self._write_provisionals()
+        numbers = {level: int(entry["number"]) for level, entry in finalized.items()}
+        if self._state["loops"]:
+            numbers = {"loop": int(self._state["last_loop"]), **numbers}
+        self.times_tracker.save_digest_numbers(numbers)
+        if any(self._state["digests"].values()):
+            try:
+                DigestSearchIndex(self.config).refresh()
+            except Exception as e:  # 検索インデックスは派生データ
+                log_warning(f"検索インデックスの更新に失敗: {e}")
+
+    # ========================================
+    # 実行
+    # ========================================
+
+    def run(
+        self,
+        workers: int = 1,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        restart: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        未処理の Loop を取り込み、全階層のダイジェストを構築
+
+        Args:
+            workers: Loop のパースに使うプロセス数（1 以下ならプロセスプールを使わない）
+            checkpoint_interval: 何チャンクごとにチェックポイントを保存するか
+            restart: チェックポイントがあっても最初からやり直す
+            progress: チャンクごとの進捗を受け取る関数
+
+        Returns:
+            {"loops", "skipped", "digests", "elapsed_sec", "loops_per_sec", "resumed"}
+
+        Raises:
+            FileIOError: ファイルの読み書きに失敗した場合
+
+        Example:
+            >>> DigestBackfill().run(workers=4)
+            {'loops': 520, 'skipped': 0, 'digests': {'weekly': 104, ...}, ...}
+        """
+        started = time.perf_counter()
+        checkpoint = None if restart else self._load_checkpoint()
+        resumed = checkpoint is not None
+        self._state = checkpoint if checkpoint is not None else self._initial_state()
+
+        chunk_size = max(1, self.config.get_threshold(self.levels[0]))
+        files = get_file_index(self.config.loops_path, "L*.txt").files_after(
+            int(self._state["last_loop"])
+        )
+        total = len(files)
+        processed = skipped = chunks = 0
+        executor: Optional[Executor] = ProcessPoolExecutor(workers) if workers > 1 else None
+        _logger.info(f"Backfill開始: {total} Loop（再開: {resumed}）")
+        try:
+            # ワーカー数の2倍のチャンクずつパースし、読み終えた順に確定していく
+            window = max(1, workers) * 2 * chunk_size
+            for start in range(0, total, window):
+                batch = [
+                    files[i : i + chunk_size]
+                    for i in range(start, min(start + window, total), chunk_size)
+                ]
+                names = [[str(path) for path in chunk] for chunk in batch]
+                if executor is not None:
+                    parsed = list(executor.map(_read_loop_headers, names))
+                else:
+                    parsed = [_read_loop_headers(chunk) for chunk in names]
+                for chunk, overalls in zip(batch, parsed):
+                    for path, overall in zip(chunk, overalls):
+                        number = extract_number_only(path.name)
+                        if overall is None:
+                            log_warning(f"Loopを読み込めないためスキップ: {path.name}")
+                            skipped += 1
+                        else:
+                            self._state["queues"][self.levels[0]].append(
+                                {"file": path.name, "overall": overall}
+                            )
+                            self._state["loops"] += 1
+                            if self.levels[0] not in self._state["touched"]:
+                                self._state["touched"].insert(0, self.levels[0])
+                        if number is not None:
+                            self._state["last_loop"] = number
+                        processed += 1
+                    self._cascade()
+                    chunks += 1
+                    if checkpoint_interval > 0 and chunks % checkpoint_interval == 0:
+                        self._save_checkpoint()
+                if progress is not None:
+                    elapsed = time.perf_counter() - started
+                    progress(
+                        {
+                            "processed": processed,
+                            "total": total,
+                            "digests": dict(self._state["digests"]),
+                            "elapsed_sec": round(elapsed, 3),
+                            "loops_per_sec": round(processed / elapsed, 1) if elapsed else 0.0,
+                        }
+                    )
+        except BaseException:
+            # 確定済みの分から再開できるよう、中断時の状態を残す
+            self._save_checkpoint()
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self._write_outputs()
+        self.checkpoint_path.unlink(missing_ok=True)
+
+        elapsed = time.perf_counter() - started
+        report = {
+            "loops": processed - skipped,
+            "skipped": skipped,
+            "digests": {k: v for k, v in self._state["digests"].items() if v},
+            "elapsed_sec": round(elapsed, 3),
+            "loops_per_sec": round(processed / elapsed, 1) if elapsed else 0.0,
+            "resumed": resumed,
+        }
+        _logger.info(f"Backfill完了: {report}")
+        return report
+
+
+def main() -> None:
+    """メイン実行関数"""
+    parser = argparse.ArgumentParser(
+        description="Backfill all digest levels from Loop files in one pass",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Loop files are streamed in number order and chunked by weekly_threshold.
+Digests are finalized bottom-up in memory; GrandDigest, ShadowGrandDigest,
+Provisional and last_digest_times are written once at the end.
+An interrupted run resumes from Essences/BackfillCheckpoint.json.
+
+Example:
+  python -m interfaces.digest_backfill --workers 4
+        """,
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Loop のパースに使うプロセス数")
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help="何チャンクごとにチェックポイントを保存するか（0 で保存しない）",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="チェックポイントを無視して最初から実行"
+    )
+    args = parser.parse_args()
+
+    def report_progress(status: Dict[str, Any]) -> None:
+        print(
+            f"[backfill] {status['processed']}/{status['total']} loops "
+            f"({status['loops_per_sec']}/s) digests={status['digests']}",
+            file=sys.stderr,
+        )
+
+    try:
+        result = DigestBackfill().run(
+            workers=args.workers,
+            checkpoint_interval=args.checkpoint_interval,
+            restart=args.restart,
+            progress=report_progress,
+        )
+    except EpisodicRAGError as e:
+        log_error(str(e))
+        sys.exit(1)
+    output_json(result)
+
+
+if __name__ == "__main__":
+    main()
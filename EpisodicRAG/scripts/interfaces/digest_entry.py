@@ -21,10 +21,15 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from domain.constants import DIGEST_LEVEL_NAMES
-from domain.file_constants import CONFIG_FILENAME
+from domain.file_constants import CONFIG_FILENAME, DIGEST_TIMES_FILENAME, SHADOW_DELTA_LOG_FILENAME
+from infrastructure.analysis_cache import AnalysisCache, storage_inputs
 from infrastructure.config import get_persistent_config_dir
+from infrastructure.delta_log import DeltaLog
 from infrastructure.json_repository import load_json
 
+# 分析キャッシュのキー（Pattern 1 の新規Loop検出）
+NEW_LOOPS_CACHE_KEY = "new_loops"
+
 
 @dataclass
 class DigestEntryResult:
@@ -75,17 +80,58 @@ def get_paths_from_config() -> Dict[str, Any]:
     }
 
 
-def get_new_loops() -> List[str]:
-    """新規Loopファイルを検出（ShadowUpdaterと同じロジック）"""
+def compact_shadow_delta(paths: Dict[str, Any]) -> None:
+    """
+    Shadow の差分ログをベースへ書き戻す（差分がなければ何もしない）
+
+    /digest の以降のステップではエージェントが ShadowGrandDigest.txt を直接
+    Read / Edit するため、エントリポイントでベースを最新にしておく。
+    """
+    if not DeltaLog(paths["essences_path"] / SHADOW_DELTA_LOG_FILENAME).has_records():
+        return
+    from application.config import DigestConfig
+    from application.grand import ShadowGrandDigestManager
+
+    ShadowGrandDigestManager(DigestConfig()).compact()
+
+
+def get_new_loops(paths: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    新規Loopファイルを検出（ShadowUpdaterと同じロジック）
+
+    config.json・last_digest_times・Loopsディレクトリが前回の検出から
+    変わっていなければ、Essences の分析キャッシュの結果を返す。
+
+    Args:
+        paths: get_paths_from_config() の結果（省略時はここで取得）
+    """
     from application.config import DigestConfig
     from application.grand import ShadowGrandDigestManager
 
+    if paths is None:
+        paths = get_paths_from_config()
+    persistent_config_dir = get_persistent_config_dir()
+    cache = AnalysisCache(paths["essences_path"])
+    fingerprint = cache.fingerprint(
+        [
+            persistent_config_dir / CONFIG_FILENAME,
+            persistent_config_dir / DIGEST_TIMES_FILENAME,
+            *storage_inputs(paths["essences_path"]),
+            paths["loops_path"],
+        ]
+    )
+    cached: Optional[List[str]] = cache.get(NEW_LOOPS_CACHE_KEY, fingerprint, list)
+    if cached is not None:
+        return cached
+
     config = DigestConfig()
     manager = ShadowGrandDigestManager(config)
 
     # FileDetectorを使って新規ファイルを検出
     new_files = manager._detector.find_new_files("weekly")
-    return [f.stem for f in new_files]
+    new_loops = [f.stem for f in new_files]
+    cache.put(NEW_LOOPS_CACHE_KEY, fingerprint, new_loops)
+    return new_loops
 
 
 def get_weekly_source_count() -> int:
@@ -99,7 +145,7 @@ def get_weekly_source_count() -> int:
 
 def run_pattern1(paths: Dict[str, Any]) -> DigestEntryResult:
     """Pattern 1: 新Loop検出"""
-    new_loops = get_new_loops()
+    new_loops = get_new_loops(paths)
     weekly_source_count = get_weekly_source_count()
     weekly_threshold = paths["weekly_threshold"]
 
@@ -256,6 +302,7 @@ Examples:
 
     try:
         paths = get_paths_from_config()
+        compact_shadow_delta(paths)
 
         if args.level is None:
             result = run_pattern1(paths)
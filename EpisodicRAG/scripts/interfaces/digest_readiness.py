@@ -15,11 +15,14 @@ import argparse
 import json
 import sys
 from dataclasses import asdict, dataclass, field
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from application.config import DigestConfig
+from application.storage import load_stored_document
 from domain.constants import DIGEST_LEVEL_NAMES, PLACEHOLDER_MARKER
 from domain.file_constants import SHADOW_GRAND_DIGEST_FILENAME
+from infrastructure.analysis_cache import AnalysisCache, shadow_inputs
 from infrastructure.json_repository import load_json
 
 # Windows UTF-8対応（pytest実行時はスキップ）
@@ -76,66 +79,19 @@ class DigestReadinessChecker:
             )
 
         try:
-            # 基本情報取得
-            level_threshold = self.config._threshold_provider.get_threshold(level)
-
-            # SDG読み込み
-            shadow_path = self.config.essences_path / SHADOW_GRAND_DIGEST_FILENAME
-            shadow_data = load_json(shadow_path)
-
-            # 対象レベルのデータ取得
-            latest_digests = shadow_data.get("latest_digests", {})
-            level_data = latest_digests.get(level, {})
-            overall_digest = level_data.get("overall_digest") or {}
-            source_files = overall_digest.get("source_files", [])
-            source_count = len(source_files)
-
-            # threshold判定
-            threshold_met = source_count >= level_threshold
-
-            # SDG完備判定
-            sgd_ready, missing_sgd_files = self._check_sgd_ready(overall_digest, source_files)
-
-            # Provisional完備判定
-            provisional_ready, missing_provisionals = self._check_provisional_ready(
-                level, source_files
+            # 入力（config.json・Shadow・Provisional）が前回から変わっていなければ前回の結果を返す
+            cache = AnalysisCache(self.config.essences_path)
+            key = f"readiness:{level}"
+            fingerprint = cache.fingerprint(self._cache_inputs(level))
+            cached: Optional[DigestReadinessResult] = cache.get(
+                key, fingerprint, lambda value: DigestReadinessResult(**value)
             )
+            if cached is not None:
+                return cached
 
-            # can_finalize判定
-            can_finalize = threshold_met and sgd_ready and provisional_ready
-
-            # blockers生成
-            blockers = self._generate_blockers(
-                threshold_met,
-                source_count,
-                level_threshold,
-                sgd_ready,
-                missing_sgd_files,
-                overall_digest,
-                provisional_ready,
-                missing_provisionals,
-            )
-
-            # メッセージ生成
-            if can_finalize:
-                message = "Digest確定可能"
-            else:
-                message = f"Digest確定不可: {len(blockers)}件の未達条件あり"
-
-            return DigestReadinessResult(
-                status="ok",
-                level=level,
-                source_count=source_count,
-                level_threshold=level_threshold,
-                threshold_met=threshold_met,
-                sgd_ready=sgd_ready,
-                missing_sgd_files=missing_sgd_files,
-                provisional_ready=provisional_ready,
-                missing_provisionals=missing_provisionals,
-                can_finalize=can_finalize,
-                blockers=blockers,
-                message=message,
-            )
+            result = self._check_readiness(level)
+            cache.put(key, fingerprint, asdict(result))
+            return result
 
         except Exception as e:
             return DigestReadinessResult(
@@ -144,6 +100,79 @@ class DigestReadinessChecker:
                 error=f"Unexpected error: {e}",
             )
 
+    def _cache_inputs(self, level: str) -> List[Path]:
+        """判定結果が依存するファイル・ディレクトリ（分析キャッシュのフィンガープリント用）"""
+        provisional_dir = self.config.get_provisional_dir(level)
+        return [
+            self.config.config_file,
+            *shadow_inputs(self.config.essences_path),
+            provisional_dir,
+            *sorted(provisional_dir.glob("*_Individual.txt")),
+        ]
+
+    def _check_readiness(self, level: str) -> DigestReadinessResult:
+        """Shadow と Provisional を読み込み、指定レベルのDigest確定可否を判定"""
+        # 基本情報取得
+        level_threshold = self.config._threshold_provider.get_threshold(level)
+
+        # SDG読み込み
+        shadow_path = self.config.essences_path / SHADOW_GRAND_DIGEST_FILENAME
+        shadow_data = load_stored_document(self.config, SHADOW_GRAND_DIGEST_FILENAME) or load_json(
+            shadow_path
+        )
+
+        # 対象レベルのデータ取得
+        latest_digests = shadow_data.get("latest_digests", {})
+        level_data = latest_digests.get(level, {})
+        overall_digest = level_data.get("overall_digest") or {}
+        source_files = overall_digest.get("source_files", [])
+        source_count = len(source_files)
+
+        # threshold判定
+        threshold_met = source_count >= level_threshold
+
+        # SDG完備判定
+        sgd_ready, missing_sgd_files = self._check_sgd_ready(overall_digest, source_files)
+
+        # Provisional完備判定
+        provisional_ready, missing_provisionals = self._check_provisional_ready(level, source_files)
+
+        # can_finalize判定
+        can_finalize = threshold_met and sgd_ready and provisional_ready
+
+        # blockers生成
+        blockers = self._generate_blockers(
+            threshold_met,
+            source_count,
+            level_threshold,
+            sgd_ready,
+            missing_sgd_files,
+            overall_digest,
+            provisional_ready,
+            missing_provisionals,
+        )
+
+        # メッセージ生成
+        if can_finalize:
+            message = "Digest確定可能"
+        else:
+            message = f"Digest確定不可: {len(blockers)}件の未達条件あり"
+
+        return DigestReadinessResult(
+            status="ok",
+            level=level,
+            source_count=source_count,
+            level_threshold=level_threshold,
+            threshold_met=threshold_met,
+            sgd_ready=sgd_ready,
+            missing_sgd_files=missing_sgd_files,
+            provisional_ready=provisional_ready,
+            missing_provisionals=missing_provisionals,
+            can_finalize=can_finalize,
+            blockers=blockers,
+            message=message,
+        )
+
     def _check_sgd_ready(
         self, overall_digest: Dict[str, Any], source_files: List[str]
     ) -> tuple[bool, List[str]]:
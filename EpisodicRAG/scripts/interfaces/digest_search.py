@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Digest Search CLI
+=================
+
+Loop / RegularDigest の全文検索CLI。
+Essences/SearchIndex.json の BM25 インデックスを使い、上位k件を返す。
+
+検索前に Loop・Digest ディレクトリの差分を取り込む（--no-refresh で省略）。
+--beam-width を指定すると、上位階層から source_files を辿って降りる
+階層ビームサーチで検索する（--level は無視される）。
+--similar-to-shadow を指定すると、ShadowGrandDigest の指定階層の overall_digest に
+類似したダイジェストをベクトル類似度で返す（--level 省略時は同じ階層が対象）。
+
+Usage:
+    python -m interfaces.digest_search "検索クエリ"
+    python -m interfaces.digest_search "振り返り" --top-k 5 --level weekly --level monthly
+    python -m interfaces.digest_search "設計" --output text
+    python -m interfaces.digest_search "設計" --beam-width 3   # 階層ビームサーチ
+    python -m interfaces.digest_search "設計" --similar        # ベクトル類似検索
+    python -m interfaces.digest_search --similar-to-shadow weekly   # Shadowに似た過去の週
+    python -m interfaces.digest_search --rebuild
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from application.config import DigestConfig
+from application.search import DigestSearchIndex, SearchHit
+from application.storage import load_stored_document
+from domain.constants import DIGEST_LEVEL_NAMES, LEVEL_NAMES
+from domain.file_constants import SHADOW_GRAND_DIGEST_FILENAME
+from infrastructure.json_repository import load_json
+from interfaces.cli_helpers import output_error, output_json
+
+__all__ = ["DigestSearcher", "main"]
+
+
+class DigestSearcher:
+    """全文検索CLIのユースケース"""
+
+    def __init__(
+        self,
+        config: Optional[DigestConfig] = None,
+        search_index: Optional[DigestSearchIndex] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            config: DigestConfig インスタンス（省略時は自動生成）
+            search_index: DigestSearchIndex インスタンス（テスト用に差し替え可能）
+        """
+        self.config = config or DigestConfig()
+        self.search_index = search_index or DigestSearchIndex(self.config)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        levels: Optional[Sequence[str]] = None,
+        refresh: bool = True,
+        beam_width: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        検索を実行
+
+        Args:
+            query: 検索クエリ
+            top_k: 返す件数の上限
+            levels: 対象階層（省略時は全階層）
+            refresh: 検索前に差分を取り込むか
+            beam_width: 指定時は階層ビームサーチ（levels は無視）
+
+        Returns:
+            {"status": "ok", "query": ..., "results": [...], "elapsed_ms": ...}
+        """
+        start = time.perf_counter()
+        refreshed = self.search_index.refresh() if refresh else None
+        if beam_width is not None:
+            hits = self.search_index.search_hierarchical(query, top_k=top_k, beam_width=beam_width)
+        else:
+            hits = self.search_index.search(query, top_k=top_k, levels=levels)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        result: Dict[str, Any] = {
+            "status": "ok",
+            "query": query,
+            "total_documents": len(self.search_index),
+            "results": [asdict(hit) for hit in hits],
+            "elapsed_ms": round(elapsed_ms, 2),
+        }
+        if refreshed is not None:
+            result["refreshed"] = refreshed
+        return result
+
+    def similar(
+        self,
+        query: Union[str, Mapping[str, Any]],
+        top_k: int = 10,
+        levels: Optional[Sequence[str]] = None,
+        refresh: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        ベクトル類似検索を実行
+
+        Args:
+            query: テキスト、または overall_digest 形式の辞書
+            top_k: 返す件数の上限
+            levels: 対象階層（省略時は全階層）
+            refresh: 検索前に差分を取り込むか
+
+        Returns:
+            search() と同じ形式（score はコサイン類似度）
+        """
+        start = time.perf_counter()
+        refreshed = self.search_index.refresh() if refresh else None
+        hits = self.search_index.most_similar(query, top_k=top_k, levels=levels)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        result: Dict[str, Any] = {
+            "status": "ok",
+            "query": query if isinstance(query, str) else "",
+            "total_documents": len(self.search_index),
+            "results": [asdict(hit) for hit in hits],
+            "elapsed_ms": round(elapsed_ms, 2),
+        }
+        if refreshed is not None:
+            result["refreshed"] = refreshed
+        return result
+
+    def similar_to_shadow(
+        self,
+        level: str,
+        top_k: int = 10,
+        levels: Optional[Sequence[str]] = None,
+        refresh: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Shadow の overall_digest に類似した過去のダイジェストを検索
+
+        Args:
+            level: Shadow の階層名（"weekly" など）
+            top_k: 返す件数の上限
+            levels: 対象階層（省略時は level と同じ階層）
+            refresh: 検索前に差分を取り込むか
+
+        Returns:
+            similar() と同じ形式（"shadow_level" を追加）
+        """
+        shadow = load_stored_document(self.config, SHADOW_GRAND_DIGEST_FILENAME) or load_json(
+            self.config.essences_path / SHADOW_GRAND_DIGEST_FILENAME
+        )
+        overall = shadow.get("latest_digests", {}).get(level, {}).get("overall_digest") or {}
+        result = self.similar(overall, top_k=top_k, levels=levels or [level], refresh=refresh)
+        result["shadow_level"] = level
+        return result
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        インデックスを再構築
+
+        Returns:
+            {"status": "ok", "indexed": ..., "total_documents": ...}
+        """
+        counts = self.search_index.rebuild()
+        return {
+            "status": "ok",
+            "indexed": counts["indexed"],
+            "total_documents": len(self.search_index),
+        }
+
+
+def format_text_results(hits: List[SearchHit]) -> str:
+    """
+    検索結果をテキスト形式に整形
+
+    Args:
+        hits: SearchHit のリスト
+
+    Returns:
+        表示用テキスト
+    """
+    if not hits:
+        return "該当なし"
+    lines = []
+    for rank, hit in enumerate(hits, 1):
+        location = f"{hit.file} > {hit.source_file}" if hit.source_file else hit.file
+        lines.append(f"{rank}. [{hit.level}] {location}  (score={hit.score:.3f})")
+        if hit.digest_type:
+            lines.append(f"   type: {hit.digest_type}")
+        if hit.keywords:
+            lines.append(f"   keywords: {', '.join(hit.keywords)}")
+        if hit.snippet:
+            lines.append(f"   {hit.snippet}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """CLIエントリーポイント"""
+    parser = argparse.ArgumentParser(
+        description="EpisodicRAG 全文検索",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python -m interfaces.digest_search "検索クエリ"
+    python -m interfaces.digest_search "振り返り" --top-k 5 --level weekly
+    python -m interfaces.digest_search --similar-to-shadow weekly
+    python -m interfaces.digest_search --rebuild
+        """,
+    )
+    parser.add_argument("query", nargs="?", help="検索クエリ")
+    parser.add_argument("--top-k", type=int, default=10, help="返す件数 (default: 10)")
+    parser.add_argument(
+        "--level",
+        action="append",
+        choices=LEVEL_NAMES,
+        help="対象階層（複数指定可、省略時は全階層）",
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        help="階層ビームサーチで各階層から展開するノード数（指定時のみ階層検索）",
+    )
+    parser.add_argument(
+        "--similar",
+        action="store_true",
+        help="キーワード一致ではなくベクトル類似度で検索",
+    )
+    parser.add_argument(
+        "--similar-to-shadow",
+        choices=DIGEST_LEVEL_NAMES,
+        metavar="LEVEL",
+        help="ShadowGrandDigest の指定階層に類似したダイジェストを検索",
+    )
+    parser.add_argument(
+        "--no-refresh", action="store_true", help="検索前のインデックス差分更新を省略"
+    )
+    parser.add_argument("--rebuild", action="store_true", help="インデックスを再構築")
+    parser.add_argument(
+        "--output",
+        choices=["json", "text"],
+        default="json",
+        help="Output format (default: json)",
+    )
+
+    args = parser.parse_args()
+
+    if not args.rebuild and not args.query and not args.similar_to_shadow:
+        parser.error("query is required unless --rebuild or --similar-to-shadow is given")
+
+    try:
+        searcher = DigestSearcher()
+        if args.rebuild:
+            result = searcher.rebuild()
+            if not args.query and not args.similar_to_shadow:
+                output_json(result)
+                return
+
+        if args.similar_to_shadow:
+            result = searcher.similar_to_shadow(
+                args.similar_to_shadow,
+                top_k=args.top_k,
+                levels=args.level,
+                refresh=not args.no_refresh,
+            )
+        elif args.similar:
+            result = searcher.similar(
+                args.query, top_k=args.top_k, levels=args.level, refresh=not args.no_refresh
+            )
+        else:
+            result = searcher.search(
+                args.query,
+                top_k=args.top_k,
+                levels=args.level,
+                refresh=not args.no_refresh,
+                beam_width=args.beam_width,
+            )
+        if args.output == "json":
+            output_json(result)
+        else:
+            print(format_text_results([SearchHit(**hit) for hit in result["results"]]))
+
+    except Exception as e:
+        output_error(str(e))
+
+
+if __name__ == "__main__":
+    import io
+
+    # Windows UTF-8入出力対応
+    if sys.platform == "win32":
+        sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+
+    main()
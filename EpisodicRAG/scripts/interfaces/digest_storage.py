@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Digest Storage CLI
+==================
+
+SQLite ストレージバックエンド（Essences/EpisodicRAG.db）の管理CLI。
+
+- export: DB の内容をテキストファイルのレイアウトに書き出す（git での継承用）
+- import: テキストファイルのレイアウトを DB に取り込む（継承先での再構築・移行）
+- status: 使用中のバックエンドと DB の登録件数を表示
+- shadow-layout: ShadowGrandDigest を単一ファイル ⇔ 階層ごとの分割ファイルに変換
+- archive: 処理済みの古い Loop / RegularDigest を年ごとの圧縮バンドルへ移す
+- archive-status: アーカイブの件数と削減バイト数を表示
+
+Usage:
+    python -m interfaces.digest_storage status
+    python -m interfaces.digest_storage export
+    python -m interfaces.digest_storage export --output-dir /path/to/repo --overwrite-digests
+    python -m interfaces.digest_storage import
+    python -m interfaces.digest_storage shadow-layout sharded
+    python -m interfaces.digest_storage archive --min-age-years 2 --dry-run
+    python -m interfaces.digest_storage archive-status
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from application.config import DigestConfig
+from application.shadow import ShadowTemplate, migrate_shadow_layout
+from application.storage import ColdArchiver, TextLayoutExporter, TextLayoutImporter
+from domain.constants import DIGEST_LEVEL_NAMES
+from domain.file_constants import GRAND_DIGEST_FILENAME, SHADOW_GRAND_DIGEST_FILENAME
+from infrastructure.archive import ARCHIVE_COMPRESSIONS
+from infrastructure.sharded_json import SHADOW_LAYOUTS
+from infrastructure.sqlite_store import open_digest_store
+from interfaces.cli_helpers import output_error, output_json
+
+__all__ = [
+    "archive_old_files",
+    "archive_status",
+    "convert_shadow_layout",
+    "export_layout",
+    "import_layout",
+    "storage_status",
+    "main",
+]
+
+
+def storage_status(config: Optional[DigestConfig] = None) -> Dict[str, Any]:
+    """
+    使用中のバックエンドと DB の登録件数
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+
+    Returns:
+        {"status": "ok", "backend": ..., "database": ..., ...}
+    """
+    config = config or DigestConfig()
+    store = open_digest_store(config.essences_path)
+    return {
+        "status": "ok",
+        "backend": config.storage_backend,
+        "shadow_layout": config.shadow_layout,
+        "database": str(store.db_path),
+        "documents": {
+            name: store.document_revision(name)
+            for name in (SHADOW_GRAND_DIGEST_FILENAME, GRAND_DIGEST_FILENAME)
+            if store.has_document(name)
+        },
+        "digests": store.count_digests(),
+        "times": len(store.load_times()),
+    }
+
+
+def export_layout(
+    config: Optional[DigestConfig] = None,
+    output_dir: Optional[Path] = None,
+    include_digests: bool = True,
+    overwrite_digests: bool = False,
+) -> Dict[str, Any]:
+    """
+    DB の内容をテキストファイルのレイアウトに書き出す
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+        output_dir: 書き出し先（省略時は通常の配置）
+        include_digests: RegularDigest も書き出すか
+        overwrite_digests: 既存の RegularDigest ファイルも書き直すか
+
+    Returns:
+        {"status": "ok", "documents": [...], "digests": n, ...}
+    """
+    config = config or DigestConfig()
+    exporter = TextLayoutExporter(config, open_digest_store(config.essences_path))
+    result = exporter.export(
+        output_dir=output_dir,
+        include_digests=include_digests,
+        overwrite_digests=overwrite_digests,
+    )
+    return {"status": "ok", **result.to_dict()}
+
+
+def import_layout(
+    config: Optional[DigestConfig] = None, include_digests: bool = True
+) -> Dict[str, Any]:
+    """
+    テキストファイルのレイアウトを DB に取り込む
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+        include_digests: RegularDigest も取り込むか
+
+    Returns:
+        {"status": "ok", "documents": [...], "digests": n, ...}
+    """
+    config = config or DigestConfig()
+    importer = TextLayoutImporter(config, open_digest_store(config.essences_path))
+    result = importer.import_layout(include_digests=include_digests)
+    return {"status": "ok", **result.to_dict()}
+
+
+def convert_shadow_layout(
+    target: str, config: Optional[DigestConfig] = None, remove_source: bool = True
+) -> Dict[str, Any]:
+    """
+    ShadowGrandDigest の保存レイアウトを変換
+
+    変換後は config.json の storage.shadow_layout（または EPISODIC_RAG_SHADOW_LAYOUT）を
+    target に合わせる。移行元は remove_source=False を指定しない限り削除する
+    （残した移行元は以後更新されない）。
+
+    Args:
+        target: 変換先（"single" / "sharded"）
+        config: DigestConfig インスタンス（省略時は自動生成）
+        remove_source: 移行元（単一ファイル / 分割ファイル）を削除するか
+
+    Returns:
+        {"status": "ok", "target": ..., "levels": n, "revision": n, "removed_source": bool}
+    """
+    config = config or DigestConfig()
+    result = migrate_shadow_layout(
+        config.essences_path / SHADOW_GRAND_DIGEST_FILENAME,
+        ShadowTemplate(DIGEST_LEVEL_NAMES).get_template,
+        target,
+        remove_source=remove_source,
+    )
+    return {"status": "ok", **result}
+
+
+def archive_old_files(
+    config: Optional[DigestConfig] = None,
+    min_age_years: Optional[float] = None,
+    compression: Optional[str] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    処理済みの古い Loop / RegularDigest を年ごとの圧縮バンドルへ移す
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+        min_age_years: これより古いファイルを対象にする（省略時は config の archive セクション）
+        compression: "lzma" / "gzip"（省略時は config の archive セクション）
+        dry_run: 対象の列挙のみ
+
+    Returns:
+        {"status": "ok", "files": n, "planned": {...}, "stats": {...}, ...}
+    """
+    config = config or DigestConfig()
+    report = ColdArchiver(config).archive(
+        min_age_years=min_age_years, compression=compression, dry_run=dry_run
+    )
+    return {"status": "ok", **report.to_dict()}
+
+
+def archive_status(config: Optional[DigestConfig] = None) -> Dict[str, Any]:
+    """
+    アーカイブの件数と削減バイト数
+
+    Args:
+        config: DigestConfig インスタンス（省略時は自動生成）
+
+    Returns:
+        {"status": "ok", "levels": {...}, "total": {"saved_bytes": n, ...}}
+    """
+    config = config or DigestConfig()
+    return {"status": "ok", **ColdArchiver(config).status()}
+
+
+def main() -> None:
+    """CLIエントリーポイント"""
+    parser = argparse.ArgumentParser(
+        description="EpisodicRAG ストレージバックエンド管理",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python -m interfaces.digest_storage status
+    python -m interfaces.digest_storage export
+    python -m interfaces.digest_storage import
+    python -m interfaces.digest_storage shadow-layout sharded
+    python -m interfaces.digest_storage archive --dry-run
+    python -m interfaces.digest_storage archive-status
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="バックエンドと DB の登録件数を表示")
+
+    export_parser = subparsers.add_parser("export", help="DB → テキストファイル")
+    export_parser.add_argument("--output-dir", type=Path, help="書き出し先（省略時は通常の配置）")
+    export_parser.add_argument(
+        "--no-digests", action="store_true", help="RegularDigest を書き出さない"
+    )
+    export_parser.add_argument(
+        "--overwrite-digests", action="store_true", help="既存の RegularDigest も書き直す"
+    )
+
+    import_parser = subparsers.add_parser("import", help="テキストファイル → DB")
+    import_parser.add_argument(
+        "--no-digests", action="store_true", help="RegularDigest を取り込まない"
+    )
+
+    layout_parser = subparsers.add_parser(
+        "shadow-layout", help="ShadowGrandDigest の保存レイアウトを変換"
+    )
+    layout_parser.add_argument("target", choices=SHADOW_LAYOUTS, help="変換先のレイアウト")
+    layout_parser.add_argument(
+        "--keep-source",
+        action="store_true",
+        help="移行元を削除せずに残す（以後は更新されない控えになる）",
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive", help="処理済みの古いファイルを圧縮バンドルへ移す"
+    )
+    archive_parser.add_argument(
+        "--min-age-years", type=float, help="これより古いファイルを対象にする（既定: config）"
+    )
+    archive_parser.add_argument(
+        "--compression", choices=list(ARCHIVE_COMPRESSIONS), help="圧縮方式（既定: config）"
+    )
+    archive_parser.add_argument("--dry-run", action="store_true", help="対象の列挙のみ")
+
+    subparsers.add_parser("archive-status", help="アーカイブの件数と削減バイト数を表示")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "status":
+            output_json(storage_status())
+        elif args.command == "export":
+            output_json(
+                export_layout(
+                    output_dir=args.output_dir,
+                    include_digests=not args.no_digests,
+                    overwrite_digests=args.overwrite_digests,
+                )
+            )
+        elif args.command == "shadow-layout":
+            output_json(convert_shadow_layout(args.target, remove_source=not args.keep_source))
+        elif args.command == "archive":
+            output_json(
+                archive_old_files(
+                    min_age_years=args.min_age_years,
+                    compression=args.compression,
+                    dry_run=args.dry_run,
+                )
+            )
+        elif args.command == "archive-status":
+            output_json(archive_status())
+        else:
+            output_json(import_layout(include_digests=not args.no_digests))
+
+    except Exception as e:
+        output_error(str(e))
+
+
+if __name__ == "__main__":
+    import io
+
+    # Windows UTF-8入出力対応
+    if sys.platform == "win32":
+        sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+
+    main()
@@ -59,20 +59,30 @@ __init__で依存オブジェクト（managers, tracker）をオプション引
     【処理4】last_digest_times.json 更新
         - 最終ダイジェスト生成時刻を記録
         - 処理対象ファイルの連番リストを保存
+
+    【処理5】ProvisionalDigest 削除
+
+クラッシュ復旧：
+    各処理の前後を Essences/FinalizeJournal.jsonl に記録する。
+    finalize_from_shadow() は開始時にジャーナルに残った未完了の確定処理を
+    再実行（RegularDigest 保存済み）またはロールバック（未保存）する。
 """
 
 import argparse
 import sys
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 # 設定
 from application.config import DigestConfig
 from application.finalize import (
     DigestPersistence,
+    FinalizeJournal,
+    FinalizeRecovery,
     ProvisionalLoader,
     RegularDigestBuilder,
     ShadowValidator,
 )
+from application.finalize.journal import STEP_GRAND_DIGEST, STEP_REGULAR_DIGEST
 
 # Application層
 from application.grand import GrandDigestManager, ShadowGrandDigestManager
@@ -83,9 +93,11 @@ from domain.constants import LEVEL_CONFIG, LOG_SEPARATOR
 from domain.exceptions import EpisodicRAGError
 from domain.file_naming import format_digest_number
 from domain.level_registry import get_level_registry
+from domain.types import as_dict
 
 # Infrastructure層
 from infrastructure import get_structured_logger, log_error
+from infrastructure.json_repository import content_hash, get_write_stats
 
 # Helpers
 from interfaces.interface_helpers import get_next_digest_number, sanitize_filename
@@ -149,6 +161,20 @@ class DigestFinalizerFromShadow:
         self._persistence = DigestPersistence(
             self.config, self.grand_digest_manager, self.shadow_manager, self.times_tracker
         )
+        self._journal = FinalizeJournal(config.essences_path)
+
+    def recover_pending(self) -> List[Dict[str, Any]]:
+        """
+        ジャーナルに残った未完了の確定処理を再実行またはロールバック
+
+        Returns:
+            トランザクションごとの結果（FinalizeRecovery.recover()）
+
+        Example:
+            >>> finalizer.recover_pending()
+            [{'txn': 'a1b2c3d4e5f6', 'level': 'weekly', 'action': 'replayed', ...}]
+        """
+        return FinalizeRecovery(self._journal, self._persistence).recover()
 
     def validate_shadow_content(self, level: str, source_files: list) -> None:
         """
@@ -181,10 +207,29 @@ class DigestFinalizerFromShadow:
             >>> finalizer = DigestFinalizerFromShadow()
             >>> finalizer.finalize_from_shadow("weekly", "知性射程理論と協働AI実現")
         """
+        # 前回落ちた確定処理があれば先に片付ける
+        self.recover_pending()
+
         _logger.info(LOG_SEPARATOR)
         _logger.info(f"Shadowからダイジェスト確定: {level.upper()}")
         _logger.info(LOG_SEPARATOR)
 
+        with _logger.span("finalize", level=level) as span:
+            span["digest_name"] = self._finalize(level, weave_title)
+
+        _logger.info(LOG_SEPARATOR)
+        _logger.info("ダイジェスト確定処理完了！")
+        stats = get_write_stats()
+        _logger.info(f"書き込み: {stats['written']}件 / 変更なしで省略: {stats['skipped']}件")
+        _logger.info(LOG_SEPARATOR)
+
+    def _finalize(self, level: str, weave_title: str) -> str:
+        """
+        処理1〜5を実行（各ステップはジャーナルの span として記録される）
+
+        Returns:
+            確定したダイジェスト名
+        """
         # ===== 処理1: RegularDigest作成 =====
         _logger.info("[Step 1] ShadowからRegularDigest作成中...")
 
@@ -210,21 +255,51 @@ class DigestFinalizerFromShadow:
             level, new_digest_name, digest_num, shadow_digest, individual_digests
         )
 
-        # ファイル保存（例外を投げる）
-        self._persistence.save_regular_digest(level, regular_digest, new_digest_name)
-
-        # ===== 処理2: GrandDigest更新（例外を投げる） =====
-        self._persistence.update_grand_digest(level, regular_digest, new_digest_name)
-
-        # ===== 処理3-5: カスケードとクリーンアップ =====
-        # regular_digestを渡すことで、次レベルProvisionalにindividual_digestが追加される
-        self._persistence.process_cascade_and_cleanup(
-            level, next_num, provisional_file_to_delete, regular_digest
+        digest_path = self._persistence.regular_digest_path(level, new_digest_name)
+        txn = self._journal.begin(
+            level,
+            {
+                "digest_name": new_digest_name,
+                "digest_number": next_num,
+                "digest_path": str(digest_path),
+                "provisional_file": (
+                    str(provisional_file_to_delete) if provisional_file_to_delete else None
+                ),
+            },
         )
 
-        _logger.info(LOG_SEPARATOR)
-        _logger.info("ダイジェスト確定処理完了！")
-        _logger.info(LOG_SEPARATOR)
+        try:
+            # ファイル保存（例外を投げる）
+            txn.run(
+                STEP_REGULAR_DIGEST,
+                lambda: self._persistence.save_regular_digest(
+                    level, regular_digest, new_digest_name
+                ),
+                existed=digest_path.exists(),
+                content_hash=content_hash(as_dict(regular_digest)),
+            )
+
+            # ===== 処理2: GrandDigest更新（例外を投げる） =====
+            txn.run(
+                STEP_GRAND_DIGEST,
+                lambda: self._persistence.update_grand_digest(
+                    level, regular_digest, new_digest_name
+                ),
+            )
+
+            # ===== 処理3-5: カスケードとクリーンアップ =====
+            # regular_digestを渡すことで、次レベルProvisionalにindividual_digestが追加される
+            self._persistence.process_cascade_and_cleanup(
+                level, next_num, provisional_file_to_delete, regular_digest, txn
+            )
+        except BaseException as e:
+            if not txn.is_done(STEP_REGULAR_DIGEST):
+                # 何も書き込んでいない（上書きキャンセル・Ctrl-C 等）ので中止として記録
+                txn.abort(str(e) or type(e).__name__)
+            # RegularDigest 保存後の失敗は次回起動時に再実行する
+            raise
+        txn.commit()
+        return new_digest_name
 
 
 def main() -> None:
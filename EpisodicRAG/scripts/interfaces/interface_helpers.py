@@ -11,7 +11,6 @@ Interfaces層で使用するヘルパー関数。
 
 import re
 from pathlib import Path
-from typing import List, Union
 
 from domain.error_formatter import get_error_formatter
 from domain.exceptions import ConfigError, ValidationError
@@ -68,7 +67,7 @@ def get_next_digest_number(digests_path: Path, level: str) -> int:
     """
     指定レベルの次のDigest番号を取得。
 
-    既存のRegularDigestファイルをスキャンし、最大番号+1を返す。
+    既存のRegularDigestファイル（アーカイブ済みを含む）の最大番号+1を返す。
     ファイルが存在しない場合は1を返す。
 
     Args:
@@ -88,7 +87,9 @@ def get_next_digest_number(digests_path: Path, level: str) -> int:
     """
     # 循環インポートを避けるためローカルインポート
     from domain.constants import LEVEL_CONFIG
-    from domain.file_naming import find_max_number
+    from domain.file_naming import extract_file_number
+    from infrastructure.archive import archived_names
+    from infrastructure.file_index import get_file_index
 
     config = LEVEL_CONFIG.get(level)
     if not config:
@@ -101,14 +102,17 @@ def get_next_digest_number(digests_path: Path, level: str) -> int:
     if not level_dir.exists():
         return 1
 
-    # 統一関数を使用して最大番号を取得
+    # 永続索引から最大番号を取得（ディレクトリ未変更ならスキャン不要）
     pattern = f"{prefix}*_*.txt"
-    existing_files = list(level_dir.glob(pattern))
-    # Cast to List[Path | str] for find_max_number compatibility
-    files_for_search: List[Union[Path, str]] = list(existing_files)
-    max_num = find_max_number(files_for_search, prefix)
+    max_num = get_file_index(level_dir, pattern).max_number(prefix) or 0
 
-    return (max_num or 0) + 1
+    # アーカイブ済みの番号も再利用しない
+    for name in archived_names(level_dir):
+        parsed = extract_file_number(name)
+        if parsed is not None and parsed[0] == prefix:
+            max_num = max(max_num, parsed[1])
+
+    return max_num + 1
 
 
 __all__ = [
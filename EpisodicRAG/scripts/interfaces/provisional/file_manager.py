@@ -5,15 +5,16 @@ Handles file I/O operations, numbering, and directory management.
 """
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Optional
 
 from application.config import DigestConfig
 from domain.constants import LEVEL_CONFIG
 from domain.error_formatter import get_error_formatter
 from domain.exceptions import ConfigError
-from domain.file_naming import find_max_number, format_digest_number
+from domain.file_naming import format_digest_number
 from domain.types import LevelConfigData
 from infrastructure import load_json
+from infrastructure.file_index import get_file_index
 
 
 class ProvisionalFileManager:
@@ -55,16 +56,9 @@ class ProvisionalFileManager:
         prefix = str(level_cfg["prefix"])
         provisional_dir = self.config.get_provisional_dir(level)
 
-        # Search for Individual files in provisional directory
+        # Search for Individual files via the persistent directory index
         pattern = f"{prefix}[0-9]*_Individual.txt"
-        existing_files = list(provisional_dir.glob(pattern))
-
-        if not existing_files:
-            return None
-
-        # Cast to expected type for find_max_number
-        files_for_search: List[Union[Path, str]] = list(existing_files)
-        return find_max_number(files_for_search, prefix)
+        return get_file_index(provisional_dir, pattern).max_number(prefix)
 
     def load_existing_provisional(self, level: str, digest_num: int) -> Optional[Dict[str, Any]]:
         """
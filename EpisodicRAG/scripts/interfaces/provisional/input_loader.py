@@ -4,13 +4,13 @@ Input loading utilities for provisional digests.
 Handles JSON parsing from files or strings.
 """
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
 from domain.error_formatter import get_error_formatter
 from domain.exceptions import ValidationError
 from domain.types import IndividualDigestData
+from infrastructure.json_repository import json_loads
 from interfaces.provisional.validator import validate_input_format
 
 # Type alias for JSON data
@@ -79,7 +79,7 @@ class InputLoader:
             Parsed JSON data
         """
         with open(file_path, 'r', encoding='utf-8') as f:
-            result: JsonData = json.load(f)
+            result: JsonData = json_loads(f.read())
             return result
 
     @staticmethod
@@ -93,5 +93,5 @@ class InputLoader:
         Returns:
             Parsed JSON data
         """
-        result: JsonData = json.loads(json_string)
+        result: JsonData = json_loads(json_string)
         return result
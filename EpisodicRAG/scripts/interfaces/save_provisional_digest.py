@@ -45,6 +45,7 @@ from domain.version import DIGEST_FORMAT_VERSION
 
 # Infrastructure層
 from infrastructure import get_structured_logger, log_error, log_warning, save_json
+from infrastructure.json_repository import get_write_stats
 
 # Helpers
 from interfaces.interface_helpers import get_next_digest_number
@@ -100,7 +101,8 @@ class ProvisionalDigestSaver:
         provisional_data = self._build_provisional_data(
             level, digest_num, digits, individual_digests
         )
-        save_json(file_path, provisional_data)
+        # 追加分がなければ（last_updated 以外が同じなら）書き込まない
+        save_json(file_path, provisional_data, skip_unchanged=True)
 
         return file_path
 
@@ -225,6 +227,8 @@ Note: JSONはファイルまたは--stdinで渡してください。
         _logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         _logger.info(f"パス: {saved_path}")
         _logger.info(f"個別ダイジェスト: {len(individual_digests)}件")
+        stats = get_write_stats()
+        _logger.info(f"書き込み: {stats['written']}件 / 変更なしで省略: {stats['skipped']}件")
         if args.append:
             _logger.info("モード: 追加（既存ファイルとマージ）")
         else:
@@ -18,10 +18,14 @@ from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from application.storage import read_stored_document
 from domain.exceptions import FileIOError
 from domain.file_constants import CONFIG_FILENAME, SHADOW_GRAND_DIGEST_FILENAME
+from infrastructure.analysis_cache import AnalysisCache, shadow_inputs
 from infrastructure.config import get_persistent_config_dir
 from infrastructure.json_repository import load_json
+from infrastructure.sharded_json import SHADOW_LAYOUT_SINGLE, resolve_shadow_layout
+from infrastructure.sqlite_store import resolve_storage_backend
 
 # Windows UTF-8対応（pytest実行時はスキップ）
 if sys.platform == "win32" and "pytest" not in sys.modules:
@@ -68,6 +72,8 @@ class ShadowStateChecker:
         """Initialize ShadowStateChecker"""
         self.config_file = get_persistent_config_dir() / CONFIG_FILENAME
         self.shadow_file: Optional[Path] = None
+        self.storage_backend: Optional[str] = None
+        self.shadow_layout = SHADOW_LAYOUT_SINGLE
 
     def _load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込む"""
@@ -89,6 +95,11 @@ class ShadowStateChecker:
         if self.shadow_file is None:
             raise ValueError("Shadow file path not set")
 
+        stored = read_stored_document(
+            self.shadow_file.parent, self.shadow_file.name, self.storage_backend, self.shadow_layout
+        )
+        if stored is not None:
+            return stored
         return load_json(self.shadow_file)
 
     def _has_placeholder(self, text: Optional[str]) -> bool:
@@ -121,61 +132,22 @@ class ShadowStateChecker:
             config = self._load_config()
             essences_path = self._get_essences_path(config)
             self.shadow_file = essences_path / SHADOW_GRAND_DIGEST_FILENAME
-
-            # Shadow読み込み
-            shadow_data = self._load_shadow()
-
-            # 指定レベルのデータを取得
-            latest_digests = shadow_data.get("latest_digests", {})
-            level_data = latest_digests.get(level, {})
-
-            if not level_data:
-                return ShadowStateResult(
-                    status="ok",
-                    level=level,
-                    analyzed=True,
-                    source_files=[],
-                    source_count=0,
-                    placeholder_fields=[],
-                    message=f"No data for level: {level}",
-                )
-
-            # overall_digestを取得（Noneの場合は空辞書として扱う）
-            overall_digest = level_data.get("overall_digest") or {}
-            source_files = overall_digest.get("source_files", [])
-
-            # プレースホルダー確認
-            placeholder_fields = []
-            abstract = overall_digest.get("abstract")
-            impression = overall_digest.get("impression")
-            digest_type = overall_digest.get("digest_type")
-            keywords = overall_digest.get("keywords")
-
-            if self._has_placeholder(abstract):
-                placeholder_fields.append("abstract")
-            if self._has_placeholder(impression):
-                placeholder_fields.append("impression")
-            if self._has_placeholder(digest_type):
-                placeholder_fields.append("digest_type")
-            if keywords is None or (isinstance(keywords, list) and len(keywords) == 0):
-                placeholder_fields.append("keywords")
-
-            analyzed = len(placeholder_fields) == 0
-
-            if analyzed:
-                message = "All fields analyzed"
-            else:
-                message = f"Placeholders detected in: {', '.join(placeholder_fields)} - run DigestAnalyzer"
-
-            return ShadowStateResult(
-                status="ok",
-                level=level,
-                analyzed=analyzed,
-                source_files=source_files,
-                source_count=len(source_files),
-                placeholder_fields=placeholder_fields,
-                message=message,
+            self.storage_backend = resolve_storage_backend(config)
+            self.shadow_layout = resolve_shadow_layout(config)
+
+            # 入力（config.json・Shadow）が前回から変わっていなければ前回の結果を返す
+            cache = AnalysisCache(essences_path)
+            key = f"shadow_state:{level}"
+            fingerprint = cache.fingerprint([self.config_file, *shadow_inputs(essences_path)])
+            cached: Optional[ShadowStateResult] = cache.get(
+                key, fingerprint, lambda value: ShadowStateResult(**value)
             )
+            if cached is not None:
+                return cached
+
+            result = self._check_shadow(level)
+            cache.put(key, fingerprint, asdict(result))
+            return result
 
         except FileIOError as e:
             return ShadowStateResult(
@@ -192,6 +164,70 @@ class ShadowStateChecker:
                 error=f"Unexpected error: {e}",
             )
 
+    def _check_shadow(self, level: str) -> ShadowStateResult:
+        """
+        Shadowを読み込み、指定レベルのプレースホルダー有無を判定
+
+        Raises:
+            FileIOError: Shadowが読めない場合
+        """
+        # Shadow読み込み
+        shadow_data = self._load_shadow()
+
+        # 指定レベルのデータを取得
+        latest_digests = shadow_data.get("latest_digests", {})
+        level_data = latest_digests.get(level, {})
+
+        if not level_data:
+            return ShadowStateResult(
+                status="ok",
+                level=level,
+                analyzed=True,
+                source_files=[],
+                source_count=0,
+                placeholder_fields=[],
+                message=f"No data for level: {level}",
+            )
+
+        # overall_digestを取得（Noneの場合は空辞書として扱う）
+        overall_digest = level_data.get("overall_digest") or {}
+        source_files = overall_digest.get("source_files", [])
+
+        # プレースホルダー確認
+        placeholder_fields = []
+        abstract = overall_digest.get("abstract")
+        impression = overall_digest.get("impression")
+        digest_type = overall_digest.get("digest_type")
+        keywords = overall_digest.get("keywords")
+
+        if self._has_placeholder(abstract):
+            placeholder_fields.append("abstract")
+        if self._has_placeholder(impression):
+            placeholder_fields.append("impression")
+        if self._has_placeholder(digest_type):
+            placeholder_fields.append("digest_type")
+        if keywords is None or (isinstance(keywords, list) and len(keywords) == 0):
+            placeholder_fields.append("keywords")
+
+        analyzed = len(placeholder_fields) == 0
+
+        if analyzed:
+            message = "All fields analyzed"
+        else:
+            message = (
+                f"Placeholders detected in: {', '.join(placeholder_fields)} - run DigestAnalyzer"
+            )
+
+        return ShadowStateResult(
+            status="ok",
+            level=level,
+            analyzed=analyzed,
+            source_files=source_files,
+            source_count=len(source_files),
+            placeholder_fields=placeholder_fields,
+            message=message,
+        )
+
 
 def main() -> None:
     """CLIエントリーポイント"""
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Workspace Snapshot
+==================
+
+診断 CLI（digest_auto 等）が参照するワークスペースの状態を、1回の読み込みで
+まとめて取得する。
+
+    config.json                 → config / 各パス
+    Loops/                      → loops（L*.txt の名前と番号）
+    Digests/{level}/            → levels（*.txt の名前と番号）
+    Essences/ShadowGrandDigest  → shadow
+    Essences/GrandDigest        → grand
+    last_digest_times.json      → times
+
+## 設計意図
+
+ARCHITECTURE: Immutable Snapshot
+- 各ディレクトリは os.scandir で1回だけ走査し（infrastructure.directory_scan）、
+  各ファイルは1回だけ読む。未処理検出・プレースホルダー・欠番・生成可能判定は
+  すべてスナップショットからメモリ上で求める
+- SQLite バックエンド・分割レイアウト・差分ログに保存済みの Shadow / Grand は
+  そちらを読む（application.storage.read_stored_document）
+- スナップショットは変更されない値。refresh() はディレクトリの mtime と
+  ファイルの (mtime, size) を比べ、変わった入力だけを読み直した新しい
+  スナップショットと、内容が変わった入力名を返す（digest_auto --watch）
+
+Usage:
+    from interfaces.workspace_snapshot import WorkspaceSnapshot
+
+    snapshot = WorkspaceSnapshot.capture(config_file, last_digest_file)
+    snapshot.loops.names_after(186)
+    snapshot, changed = snapshot.refresh()   # changed: {"loops", "shadow"}
+"""
+
+import os
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from application.storage import read_stored_document
+from domain.constants import DIGEST_LEVEL_NAMES, LEVEL_CONFIG
+from domain.file_constants import (
+    DIGEST_TIMES_FILENAME,
+    GRAND_DIGEST_FILENAME,
+    SHADOW_GRAND_DIGEST_FILENAME,
+)
+from infrastructure.analysis_cache import shadow_inputs, storage_inputs
+from infrastructure.directory_scan import DirectoryScan, scan_directory
+from infrastructure.file_index import RACY_WINDOW_NS
+from infrastructure.json_repository import load_json, try_load_json
+from infrastructure.sharded_json import resolve_shadow_layout
+from infrastructure.sqlite_store import (
+    STORAGE_BACKEND_SQLITE,
+    open_digest_store,
+    resolve_storage_backend,
+)
+
+__all__ = [
+    "DOCUMENT_INPUTS",
+    "INPUT_CONFIG",
+    "INPUT_GRAND",
+    "INPUT_LOOPS",
+    "INPUT_SHADOW",
+    "INPUT_TIMES",
+    "LOOP_PATTERN",
+    "WorkspaceSnapshot",
+    "resolve_workspace_paths",
+    "snapshot_inputs",
+]
+
+# Loopファイルのパターン
+LOOP_PATTERN = "L*.txt"
+
+# 階層ディレクトリのパターン（glob は非再帰のため Provisional/ は含まない）
+LEVEL_PATTERN = "*.txt"
+
+# 入力の名前（refresh() が返す変更集合の要素。階層ディレクトリは階層名）
+INPUT_CONFIG = "config"
+INPUT_LOOPS = "loops"
+INPUT_SHADOW = "shadow"
+INPUT_GRAND = "grand"
+INPUT_TIMES = "times"
+
+# 文書の入力名 → Essences 配下のファイル名（times は last_digest_file）
+DOCUMENT_INPUTS: Dict[str, str] = {
+    INPUT_SHADOW: SHADOW_GRAND_DIGEST_FILENAME,
+    INPUT_GRAND: GRAND_DIGEST_FILENAME,
+    INPUT_TIMES: DIGEST_TIMES_FILENAME,
+}
+
+# ファイルのシグネチャ（パスごとの (mtime_ns, size)、存在しなければ None）
+_Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def _signature(paths: Iterable[Path]) -> _Signature:
+    """各パスの (mtime_ns, size)"""
+    result: List[Optional[Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            result.append(None)
+            continue
+        result.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(result)
+
+
+def resolve_workspace_paths(config: Dict[str, Any]) -> Dict[str, Path]:
+    """
+    config.json の内容から loops / essences / digests のパスを解決
+
+    Raises:
+        ValueError: base_dir が未設定または相対パスの場合
+
+    Example:
+        >>> resolve_workspace_paths({"base_dir": "/data/rag"})["loops"]
+        PosixPath('/data/rag/data/Loops')
+    """
+    base_dir_str = config.get("base_dir", "")
+    if not base_dir_str:
+        raise ValueError("base_dir is required in config.json")
+    base_path = Path(base_dir_str).expanduser()
+    if not base_path.is_absolute():
+        raise ValueError("base_dir must be an absolute path")
+    base_dir = base_path.resolve()
+    paths = config.get("paths", {})
+    return {
+        "loops": base_dir / paths.get("loops_dir", "data/Loops"),
+        "essences": base_dir / paths.get("essences_dir", "data/Essences"),
+        "digests": base_dir / paths.get("digests_dir", "data/Digests"),
+    }
+
+
+def snapshot_inputs(
+    config_file: Path, last_digest_file: Path, paths: Dict[str, Path]
+) -> List[Path]:
+    """
+    capture() が読むファイル・ディレクトリ（分析キャッシュのフィンガープリント用）
+
+    Args:
+        config_file: config.json のパス
+        last_digest_file: last_digest_times.json のパス
+        paths: resolve_workspace_paths() の結果
+
+    Example:
+        >>> inputs = snapshot_inputs(config_file, last_digest_file, paths)
+        >>> inputs[:2] == [config_file, last_digest_file]
+        True
+    """
+    essences = paths["essences"]
+    return [
+        config_file,
+        last_digest_file,
+        paths["loops"],
+        *(paths["digests"] / str(LEVEL_CONFIG[level]["dir"]) for level in DIGEST_LEVEL_NAMES),
+        *shadow_inputs(essences),
+        essences / GRAND_DIGEST_FILENAME,
+    ]
+
+
+@dataclass(frozen=True)
+class WorkspaceSnapshot:
+    """
+    ワークスペースの状態（1回の走査・読み込みの結果）
+
+    Attributes:
+        config_file / last_digest_file: 読み込んだ設定ファイルのパス
+        config: config.json の内容
+        loops_path / essences_path / digests_path: 解決済みのパス
+        loops: Loops の走査結果
+        levels: 階層名 → その階層ディレクトリの走査結果
+        shadow: ShadowGrandDigest（存在しない・壊れている場合は None）
+        grand: GrandDigest（同上）
+        times: last_digest_times（同上。SQLite の記録を重ねたもの）
+        signatures: 入力名 → (読み込んだ時刻, 読み込み時のファイルのシグネチャ)
+    """
+
+    config_file: Path
+    last_digest_file: Path
+    config: Dict[str, Any]
+    loops_path: Path
+    essences_path: Path
+    digests_path: Path
+    loops: DirectoryScan
+    levels: Dict[str, DirectoryScan] = field(default_factory=dict)
+    shadow: Optional[Dict[str, Any]] = None
+    grand: Optional[Dict[str, Any]] = None
+    times: Optional[Dict[str, Any]] = None
+    signatures: Dict[str, Tuple[int, _Signature]] = field(default_factory=dict)
+
+    @classmethod
+    def capture(cls, config_file: Path, last_digest_file: Path) -> "WorkspaceSnapshot":
+        """
+        config.json を読み、各ディレクトリを1回ずつ走査して各ファイルを1回ずつ読む
+
+        Args:
+            config_file: config.json のパス
+            last_digest_file: last_digest_times.json のパス
+
+        Raises:
+            FileIOError: config.json が存在しない・読めない場合
+            ValueError: base_dir が不正な場合
+
+        Example:
+            >>> snapshot = WorkspaceSnapshot.capture(config_file, last_digest_file)
+            >>> snapshot.loops.count()
+            186
+        """
+        config_signature = (time.time_ns(), _signature([config_file]))
+        config = load_json(config_file)
+        paths = resolve_workspace_paths(config)
+        snapshot = cls(
+            config_file=config_file,
+            last_digest_file=last_digest_file,
+            config=config,
+            loops_path=paths["loops"],
+            essences_path=paths["essences"],
+            digests_path=paths["digests"],
+            loops=scan_directory(paths["loops"], LOOP_PATTERN),
+            levels={
+                level: scan_directory(
+                    paths["digests"] / str(LEVEL_CONFIG[level]["dir"]), LEVEL_PATTERN
+                )
+                for level in DIGEST_LEVEL_NAMES
+            },
+            signatures={INPUT_CONFIG: config_signature},
+        )
+        return snapshot._with_documents(set(DOCUMENT_INPUTS))
+
+    def refresh(self) -> Tuple["WorkspaceSnapshot", Set[str]]:
+        """
+        変更された入力だけを読み直した新しいスナップショットを返す
+
+        ディレクトリは mtime、ファイルは (mtime, size) で変更を検出し、読み直した
+        結果が以前と同じなら変更には含めない。config.json が変わった場合は全体を
+        取り直す。
+
+        Returns:
+            (新しいスナップショット, 変更された入力名の集合)
+
+        Example:
+            >>> snapshot, changed = snapshot.refresh()
+            >>> changed
+            {'loops', 'shadow'}
+        """
+        if self._is_stale(INPUT_CONFIG, [self.config_file]):
+            fresh = WorkspaceSnapshot.capture(self.config_file, self.last_digest_file)
+            return fresh, self.changed_inputs(fresh)
+
+        loops = (
+            self.loops if self.loops.is_current() else scan_directory(self.loops_path, LOOP_PATTERN)
+        )
+        levels = {
+            level: scan if scan.is_current() else scan_directory(scan.directory, scan.pattern)
+            for level, scan in self.levels.items()
+        }
+        documents = self._documents()
+        stale = {name for name in DOCUMENT_INPUTS if self._is_stale(name, documents[name])}
+        fresh = replace(self, loops=loops, levels=levels)._with_documents(stale)
+        return fresh, self.changed_inputs(fresh)
+
+    def changed_inputs(self, other: "WorkspaceSnapshot") -> Set[str]:
+        """
+        内容が異なる入力名（config が異なれば全ての入力）
+
+        Example:
+            >>> old.changed_inputs(new)
+            {'loops'}
+        """
+        if other.config != self.config:
+            return {INPUT_CONFIG, INPUT_LOOPS, *DIGEST_LEVEL_NAMES, *DOCUMENT_INPUTS}
+        changed = {name for name in DOCUMENT_INPUTS if other.document(name) != self.document(name)}
+        if other.loops.names != self.loops.names:
+            changed.add(INPUT_LOOPS)
+        changed.update(
+            level for level, scan in self.levels.items() if other.levels[level].names != scan.names
+        )
+        return changed
+
+    def document(self, name: str) -> Optional[Dict[str, Any]]:
+        """文書の入力名（shadow / grand / times）→ 読み込んだ内容"""
+        value: Optional[Dict[str, Any]] = getattr(self, name)
+        return value
+
+    def last_processed_loop(self) -> Optional[int]:
+        """last_digest_times の loop.last_processed（未記録なら None）"""
+        if not self.times:
+            return None
+        return (self.times.get("loop") or {}).get("last_processed")
+
+    def _is_stale(self, name: str, paths: Iterable[Path]) -> bool:
+        """読み込み後にファイルが変更された（または区別できない）か"""
+        if name not in self.signatures:
+            return True
+        read_at_ns, signature = self.signatures[name]
+        if _signature(paths) != signature:
+            return True
+        return any(
+            entry is not None and entry[0] >= read_at_ns - RACY_WINDOW_NS for entry in signature
+        )
+
+    def _documents(self) -> Dict[str, Tuple[Path, ...]]:
+        """文書の入力名 → 変更検出に使うパス（SQLite・分割ファイル・差分ログを含む）"""
+        store = storage_inputs(self.essences_path)
+        return {
+            INPUT_SHADOW: shadow_inputs(self.essences_path),
+            INPUT_GRAND: (self.essences_path / GRAND_DIGEST_FILENAME, *store),
+            INPUT_TIMES: (self.last_digest_file, *store),
+        }
+
+    def _with_documents(self, names: Set[str]) -> "WorkspaceSnapshot":
+        """指定した文書（Shadow / Grand / last_digest_times）を読み直したコピー"""
+        if not names:
+            return self
+        sqlite = resolve_storage_backend(self.config) == STORAGE_BACKEND_SQLITE
+        layout = resolve_shadow_layout(self.config)
+        documents = self._documents()
+        signatures = dict(self.signatures)
+        # 入力名（shadow / grand / times）→ 読み込んだ文書（存在しなければ None）
+        values: Dict[str, Any] = {}
+
+        for name in names:
+            # シグネチャは読み込み前に取る（読み込み中の変更は次回の refresh で検出）
+            signatures[name] = (time.time_ns(), _signature(documents[name]))
+            if name == INPUT_TIMES:
+                times = try_load_json(self.last_digest_file, log_on_error=False)
+                if sqlite:
+                    store = open_digest_store(self.essences_path)
+                    if store.has_times():
+                        times = {**(times or {}), **store.load_times()}
+                values[name] = times
+                continue
+            filename = DOCUMENT_INPUTS[name]
+            stored = read_stored_document(
+                self.essences_path, filename, STORAGE_BACKEND_SQLITE if sqlite else None, layout
+            )
+            if stored is None:
+                stored = try_load_json(self.essences_path / filename, log_on_error=False)
+            values[name] = stored
+
+        # 入力名はフィールド名と同じ
+        return replace(self, signatures=signatures, **values)
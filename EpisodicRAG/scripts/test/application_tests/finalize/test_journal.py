@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+test_journal.py
+===============
+
+application/finalize/journal.py のテスト。
+トランザクションの記録と未完了判定、コンパクション、ロールバック、
+ステップの span をテスト。
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from application.finalize import FinalizeJournal, FinalizeRecovery
+from application.finalize.journal import (
+    STEP_GRAND_DIGEST,
+    STEP_REGULAR_DIGEST,
+    STEP_SHADOW_CASCADE,
+)
+from domain.constants import build_level_hierarchy
+from infrastructure.json_repository import content_hash
+
+if TYPE_CHECKING:
+    from application.config import DigestConfig
+
+
+@pytest.fixture
+def journal(tmp_path: Path) -> FinalizeJournal:
+    return FinalizeJournal(tmp_path)
+
+
+class TestFinalizeJournal:
+    """FinalizeJournal / FinalizeTransaction のテスト"""
+
+    @pytest.mark.unit
+    def test_pending_restores_progress(self, journal: FinalizeJournal) -> None:
+        """未完了のトランザクションを intent / done ごと復元する"""
+        txn = journal.begin("weekly", {"digest_name": "W0001_x", "digest_number": 1})
+        txn.run(STEP_REGULAR_DIGEST, lambda: None, existed=False)
+        txn.intent(STEP_GRAND_DIGEST)
+
+        pending = journal.pending()
+
+        assert len(pending) == 1
+        restored = pending[0]
+        assert (restored.txn_id, restored.level) == (txn.txn_id, "weekly")
+        assert restored.plan == {"digest_name": "W0001_x", "digest_number": 1}
+        assert restored.completed == {STEP_REGULAR_DIGEST}
+        assert restored.intents == {STEP_REGULAR_DIGEST: {"existed": False}, STEP_GRAND_DIGEST: {}}
+
+    @pytest.mark.unit
+    def test_run_skips_done_steps(self, journal: FinalizeJournal) -> None:
+        """完了済みのステップは実行しない"""
+        txn = journal.begin("weekly", {})
+        action = MagicMock()
+        txn.run(STEP_GRAND_DIGEST, action)
+        txn.run(STEP_GRAND_DIGEST, action)
+
+        action.assert_called_once_with()
+
+    @pytest.mark.unit
+    def test_run_wraps_step_in_span(
+        self, journal: FinalizeJournal, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """実行したステップだけが finalize.<step> の span として出力される"""
+        txn = journal.begin("weekly", {})
+
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            txn.run(STEP_GRAND_DIGEST, lambda: None)
+            txn.run(STEP_GRAND_DIGEST, lambda: None)
+
+        spans = [r for r in caplog.records if getattr(r, "kind", None) == "span"]
+        assert [r.event for r in spans] == [f"finalize.{STEP_GRAND_DIGEST}"]
+        assert spans[0].context == {"level": "weekly", "txn_id": txn.txn_id}
+        assert spans[0].status == "ok"
+
+    @pytest.mark.unit
+    def test_begin_after_torn_tail_is_pending(self, journal: FinalizeJournal) -> None:
+        """前回の書き込み途中で落ちた行があっても、次の begin は未完了として読める"""
+        journal.begin("weekly", {"digest_name": "W0001_x"}).commit()
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"txn": "dead", "op": "inte')
+
+        txn = journal.begin("weekly", {"digest_name": "W0002_y"})
+
+        assert [t.txn_id for t in journal.pending()] == [txn.txn_id]
+
+    @pytest.mark.unit
+    def test_commit_compacts_when_idle(self, journal: FinalizeJournal) -> None:
+        """未完了がなくなった時点でジャーナルを空にする"""
+        first = journal.begin("weekly", {})
+        second = journal.begin("monthly", {})
+
+        first.commit()
+        assert [t.txn_id for t in journal.pending()] == [second.txn_id]
+        assert journal.path.read_text(encoding="utf-8") != ""
+
+        second.abort("cancelled")
+        assert journal.pending() == []
+        assert journal.path.read_text(encoding="utf-8") == ""
+
+
+class TestFinalizeRecovery:
+    """FinalizeRecovery のテスト"""
+
+    @pytest.mark.unit
+    def test_rollback_when_regular_digest_missing(
+        self, journal: FinalizeJournal, tmp_path: Path
+    ) -> None:
+        """RegularDigest が保存されていなければ何も実行せず中止する"""
+        journal.begin(
+            "weekly",
+            {
+                "digest_name": "W0001_x",
+                "digest_number": 1,
+                "digest_path": str(tmp_path / "W0001_x.txt"),
+            },
+        )
+        persistence = MagicMock()
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert [r["action"] for r in results] == ["rolled_back"]
+        persistence.replay.assert_not_called()
+        assert journal.pending() == []
+
+    @staticmethod
+    def _interrupted_during_overwrite(
+        journal: FinalizeJournal, tmp_path: Path, on_disk: Dict[str, Any]
+    ) -> None:
+        """既存の RegularDigest の上書き中（done の記録前）に落ちた状態を作る"""
+        digest_path = tmp_path / "W0001_x.txt"
+        digest_path.write_text(json.dumps(on_disk), encoding="utf-8")
+        new_digest = {"overall_digest": {"name": "W0001_x", "abstract": "新しい"}}
+        txn = journal.begin(
+            "weekly",
+            {"digest_name": "W0001_x", "digest_number": 1, "digest_path": str(digest_path)},
+        )
+        txn.intent(STEP_REGULAR_DIGEST, existed=True, content_hash=content_hash(new_digest))
+
+    @pytest.mark.unit
+    def test_rollback_when_overwrite_not_written(
+        self, journal: FinalizeJournal, tmp_path: Path
+    ) -> None:
+        """上書き前の古い RegularDigest が残っていればロールバックする"""
+        old_digest = {"overall_digest": {"name": "W0001_x", "abstract": "古い"}}
+        self._interrupted_during_overwrite(journal, tmp_path, old_digest)
+        persistence = MagicMock()
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert [r["action"] for r in results] == ["rolled_back"]
+        persistence.replay.assert_not_called()
+        assert journal.pending() == []
+
+    @pytest.mark.unit
+    def test_replay_when_overwrite_written(self, journal: FinalizeJournal, tmp_path: Path) -> None:
+        """上書き済み（内容ハッシュが一致）なら done を補って再実行する"""
+        new_digest = {"overall_digest": {"name": "W0001_x", "abstract": "新しい"}}
+        self._interrupted_during_overwrite(journal, tmp_path, new_digest)
+        persistence = self._persistence({"weekly": ["L00001.txt"]})
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert [r["action"] for r in results] == ["replayed"]
+        replayed_txn = persistence.replay.call_args.args[0]
+        assert replayed_txn.is_done(STEP_REGULAR_DIGEST)
+
+    @staticmethod
+    def _interrupted_before_cascade(journal: FinalizeJournal, tmp_path: Path) -> None:
+        """RegularDigest / GrandDigest 保存後、カスケード中に落ちた状態を作る"""
+        digest_path = tmp_path / "W0001_x.txt"
+        digest_path.write_text(
+            '{"overall_digest": {"name": "W0001_x", "source_files": ["L00001.txt", "L00002.txt"]}}',
+            encoding="utf-8",
+        )
+        txn = journal.begin(
+            "weekly",
+            {"digest_name": "W0001_x", "digest_number": 1, "digest_path": str(digest_path)},
+        )
+        txn.run(STEP_REGULAR_DIGEST, lambda: None)
+        txn.run(STEP_GRAND_DIGEST, lambda: None)
+        txn.intent(STEP_SHADOW_CASCADE)
+
+    @staticmethod
+    def _persistence(shadow: Dict[str, List[str]]) -> MagicMock:
+        """レベル → Shadow の source_files を返す DigestPersistence のモック"""
+        persistence = MagicMock()
+        persistence.shadow_manager.level_hierarchy = build_level_hierarchy()
+        persistence.shadow_manager.get_shadow_digest_for_level.side_effect = lambda level: (
+            {"source_files": shadow[level]} if shadow.get(level) else None
+        )
+        return persistence
+
+    @pytest.mark.unit
+    def test_cascade_applied_when_sources_cleared(
+        self, journal: FinalizeJournal, tmp_path: Path
+    ) -> None:
+        """確定したソースが Shadow から消えていればカスケードは適用済み"""
+        self._interrupted_before_cascade(journal, tmp_path)
+        persistence = self._persistence({"weekly": ["L00003.txt"]})
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert results[0]["action"] == "replayed"
+        assert STEP_SHADOW_CASCADE not in results[0]["steps"]
+        replayed_txn = persistence.replay.call_args.args[0]
+        assert replayed_txn.is_done(STEP_SHADOW_CASCADE)
+        assert persistence.replay.call_args.args[1:3] == ("W0001_x", 1)
+
+    @pytest.mark.unit
+    def test_cascade_applied_when_next_level_has_digest(
+        self, journal: FinalizeJournal, tmp_path: Path
+    ) -> None:
+        """確定したダイジェストが次レベルの Shadow にあればカスケードは適用済み"""
+        self._interrupted_before_cascade(journal, tmp_path)
+        persistence = self._persistence({"weekly": ["L00002.txt"], "monthly": ["W0001_x.txt"]})
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert STEP_SHADOW_CASCADE not in results[0]["steps"]
+
+    @pytest.mark.unit
+    def test_cascade_replayed_when_shadow_unchanged(
+        self, journal: FinalizeJournal, tmp_path: Path
+    ) -> None:
+        """ソースが Shadow に残っていれば（他の更新で revision が進んでいても）再実行する"""
+        self._interrupted_before_cascade(journal, tmp_path)
+        persistence = self._persistence({"weekly": ["L00001.txt", "L00002.txt", "L00003.txt"]})
+        persistence.shadow_manager.get_revision.return_value = 99
+
+        results = FinalizeRecovery(journal, persistence).recover()
+
+        assert STEP_SHADOW_CASCADE in results[0]["steps"]
+        replayed_txn = persistence.replay.call_args.args[0]
+        assert not replayed_txn.is_done(STEP_SHADOW_CASCADE)
+
+    @pytest.mark.integration
+    def test_journal_in_essences(self, digest_config: "DigestConfig") -> None:
+        """ジャーナルは Essences/FinalizeJournal.jsonl"""
+        journal = FinalizeJournal(digest_config.essences_path)
+        assert journal.path == digest_config.essences_path / "FinalizeJournal.jsonl"
@@ -270,3 +270,78 @@ class TestGrandDigestManagerIntegration:
             grand_manager.update_digest("weekly", "W0001", {})
 
         assert "major_digests" in str(exc_info.value)
+
+
+# =============================================================================
+# リビジョン（楽観的並行制御）
+# =============================================================================
+
+
+class TestGrandDigestRevision:
+    """metadata.revision による競合検出のテスト"""
+
+    @pytest.mark.integration
+    def test_save_increments_revision(self, grand_manager) -> None:
+        """内容を変えて save() するごとに metadata.revision が1進む"""
+        data = grand_manager.load_or_create()
+        data["major_digests"]["weekly"]["overall_digest"] = {"name": "W0001_x"}
+        grand_manager.save(data)
+        data["major_digests"]["weekly"]["overall_digest"] = {"name": "W0002_y"}
+        grand_manager.save(data)
+
+        assert grand_manager.load_or_create()["metadata"]["revision"] == 2
+
+    @pytest.mark.integration
+    def test_unchanged_save_skipped(self, grand_manager) -> None:
+        """last_updated 以外が同じなら書き込まず、revision も進めない"""
+        from infrastructure.json_repository import get_write_stats
+
+        data = grand_manager.load_or_create()
+        data["major_digests"]["weekly"]["overall_digest"] = {"name": "W0001_x"}
+        grand_manager.save(data)
+        mtime = grand_manager.grand_digest_file.stat().st_mtime_ns
+        skipped = get_write_stats()["skipped"]
+
+        data["metadata"]["last_updated"] = "2099-01-01T00:00:00"
+        grand_manager.save(data)
+
+        assert grand_manager.grand_digest_file.stat().st_mtime_ns == mtime
+        assert grand_manager.load_or_create()["metadata"]["revision"] == 1
+        assert get_write_stats()["skipped"] == skipped + 1
+
+    @pytest.mark.integration
+    def test_save_with_stale_revision_raises(self, grand_manager) -> None:
+        """読み込み後に別の保存があれば expected_revision で検出する"""
+        from domain.exceptions import RevisionConflictError
+        from infrastructure.revision import get_revision
+
+        grand_manager.save(grand_manager.get_template())
+        mine = grand_manager.load_or_create()
+        theirs = grand_manager.load_or_create()
+        theirs["major_digests"]["weekly"]["overall_digest"] = {"name": "W0001_theirs"}
+        grand_manager.save(theirs, expected_revision=get_revision(theirs))
+
+        with pytest.raises(RevisionConflictError):
+            grand_manager.save(mine, expected_revision=get_revision(mine))
+
+    @pytest.mark.integration
+    def test_parallel_updates_of_different_levels(self, grand_manager) -> None:
+        """別レベルを並行して update_digest() しても、どちらの更新も失われない"""
+        import threading
+
+        levels = ["weekly", "monthly", "quarterly", "annual"]
+
+        def update(level: str) -> None:
+            for i in range(5):
+                grand_manager.update_digest(level, f"{level}-{i}", {"name": f"{level}-{i}"})
+
+        threads = [threading.Thread(target=update, args=(level,)) for level in levels]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data = grand_manager.load_or_create()
+        for level in levels:
+            assert data["major_digests"][level]["overall_digest"] == {"name": f"{level}-4"}
+        assert data["metadata"]["revision"] == 20
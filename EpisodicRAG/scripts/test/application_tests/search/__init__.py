@@ -0,0 +1 @@
+# Application/Search tests
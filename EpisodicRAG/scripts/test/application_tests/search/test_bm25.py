@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+test_bm25.py
+============
+
+application/search/bm25.py の単体テスト。
+スコア順序、文書の置換・削除、永続化の往復をテスト。
+"""
+
+import json
+
+import pytest
+
+from application.search.bm25 import BM25Index
+from application.search.tokenizer import tokenize
+
+
+@pytest.fixture
+def index() -> BM25Index:
+    """3文書を登録済みのインデックス"""
+    bm25 = BM25Index()
+    bm25.add("a", tokenize("週次の振り返り。検索機能を設計した。"))
+    bm25.add("b", tokenize("月次の振り返り。テストを追加した。"))
+    bm25.add("c", tokenize("検索 検索 検索 インデックス"))
+    return bm25
+
+
+class TestBM25Search:
+    """検索結果のテスト"""
+
+    @pytest.mark.unit
+    def test_relevant_documents_ranked(self, index: BM25Index) -> None:
+        """語頻度の高い文書が上位"""
+        result = index.search(tokenize("検索"))
+        assert [doc_id for doc_id, _ in result] == ["c", "a"]
+        assert result[0][1] > result[1][1] > 0
+
+    @pytest.mark.unit
+    def test_rare_term_scores_higher(self, index: BM25Index) -> None:
+        """出現文書の少ない語ほどスコアが高い"""
+        common = index.search(tokenize("振り返り"))
+        rare = index.search(tokenize("テスト"))
+        assert rare[0][1] > common[0][1]
+
+    @pytest.mark.unit
+    def test_top_k(self, index: BM25Index) -> None:
+        """top_k で件数を制限"""
+        assert len(index.search(tokenize("振り返り検索"), top_k=1)) == 1
+        assert index.search(tokenize("検索"), top_k=0) == []
+
+    @pytest.mark.unit
+    def test_unknown_term(self, index: BM25Index) -> None:
+        """未知語は結果なし"""
+        assert index.search(["存在しない"]) == []
+
+    @pytest.mark.unit
+    def test_doc_filter(self, index: BM25Index) -> None:
+        """フィルタで対象文書を制限"""
+        result = index.search(tokenize("検索"), doc_filter=lambda doc_id: doc_id != "c")
+        assert [doc_id for doc_id, _ in result] == ["a"]
+
+
+class TestBM25Update:
+    """文書の更新・削除のテスト"""
+
+    @pytest.mark.unit
+    def test_add_replaces_existing(self, index: BM25Index) -> None:
+        """同じ doc_id の追加は置換"""
+        index.add("c", tokenize("全く別の内容"))
+        assert len(index) == 3
+        assert [doc_id for doc_id, _ in index.search(tokenize("検索"))] == ["a"]
+
+    @pytest.mark.unit
+    def test_remove(self, index: BM25Index) -> None:
+        """削除した文書は検索されず、空になった転置リストも消える"""
+        assert index.remove("c") is True
+        assert index.remove("c") is False
+        assert "c" not in index
+        postings = index.to_dict()["postings"]
+        assert all(posting for posting in postings.values())
+        assert not any("c" in posting for posting in postings.values())
+        assert index.search(tokenize("インデックス")) == []
+
+    @pytest.mark.unit
+    def test_roundtrip(self, index: BM25Index) -> None:
+        """to_dict / from_dict で同じ検索結果"""
+        restored = BM25Index.from_dict(index.to_dict())
+        query = tokenize("検索の振り返り")
+        assert restored.search(query) == index.search(query)
+        assert len(restored) == len(index)
+
+    @pytest.mark.unit
+    def test_restored_index_supports_remove(self, index: BM25Index) -> None:
+        """JSON から復元した索引でも削除・置換できる（語頻度は転置リストから復元）"""
+        restored = BM25Index.from_dict(json.loads(json.dumps(index.to_dict())))
+        assert restored.remove("c") is True
+        restored.add("a", tokenize("全く別の内容"))
+        index.remove("c")
+        index.add("a", tokenize("全く別の内容"))
+        for query in ("検索", "インデックス", "別の内容"):
+            assert restored.search(tokenize(query)) == index.search(tokenize(query))
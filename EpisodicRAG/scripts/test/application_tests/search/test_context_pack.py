@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+test_context_pack.py
+====================
+
+application/search/context_pack.py のテスト。
+予算内の組み立て、full / short の切り替え、検索ヒットでの補完、
+mtime キーのキャッシュをテスト。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from application.search import ContextPackBuilder
+from application.search.context_pack import estimate_tokens
+from domain.constants import PLACEHOLDER_SIMPLE
+from domain.file_constants import CONTEXT_PACK_FILENAME, GRAND_DIGEST_FILENAME
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+    from application.config import DigestConfig
+
+
+def _overall(name: str, abstract: Any, keywords: Any = None) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "timestamp": "2025-01-01T00:00:00",
+        "digest_type": "統合",
+        "keywords": keywords or [],
+        "abstract": abstract,
+        "impression": "",
+    }
+
+
+def _write_grand(config: "DigestConfig", major: Dict[str, Any]) -> Path:
+    path = config.essences_path / GRAND_DIGEST_FILENAME
+    path.write_text(
+        json.dumps({"metadata": {}, "major_digests": major}, ensure_ascii=False), encoding="utf-8"
+    )
+    return path
+
+
+@pytest.fixture
+def pack_env(temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"):
+    """GrandDigest 3階層と Loop 2件を配置した環境"""
+    _write_grand(
+        digest_config,
+        {
+            "weekly": {"overall_digest": _overall("W0002_検索", "検索の週。" * 20, ["全文検索"])},
+            "monthly": {"overall_digest": _overall("M0001_設計", "設計の月。" * 20)},
+            "quarterly": {
+                "overall_digest": _overall(
+                    "Q0001_振り返り", {"long": "四半期の詳細。" * 50, "short": "四半期の要約。"}
+                )
+            },
+            "annual": {"overall_digest": None},
+        },
+    )
+    for i, abstract in enumerate(["全文検索の索引を作った。", "夕食のレシピ。"], 1):
+        data = {"overall_digest": {"digest_type": "会話", "keywords": [], "abstract": abstract}}
+        (temp_plugin_env.loops_path / f"L{i:05d}_loop.txt").write_text(
+            json.dumps(data, ensure_ascii=False), encoding="utf-8"
+        )
+    return digest_config
+
+
+class TestEstimateTokens:
+    """estimate_tokens のテスト"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "text,expected",
+        [("", 0), ("abcd", 1), ("abcde", 2), ("振り返り", 4), ("ab振り", 3)],
+    )
+    def test_estimate(self, text: str, expected: int) -> None:
+        """ASCII は4文字1トークン、非ASCII は1文字1トークン"""
+        assert estimate_tokens(text) == expected
+
+
+class TestContextPackBuild:
+    """組み立てのテスト"""
+
+    @pytest.mark.integration
+    def test_full_short_and_hits(self, pack_env: "DigestConfig") -> None:
+        """新しい階層は全文、古い階層は short、残りは検索ヒット"""
+        pack = ContextPackBuilder(pack_env).build(budget=5000, unit="chars", full_levels=2)
+
+        assert pack.full_levels == ["weekly", "monthly"]
+        assert pack.short_levels == ["quarterly"]
+        assert "検索の週。" * 20 in pack.text
+        assert "四半期の要約。" in pack.text
+        assert "四半期の詳細。" not in pack.text
+        # 既定のクエリは全文階層の keywords
+        assert pack.hits[0] == "loop/L00001_loop.txt"
+        assert pack.used == len(pack.text) <= 5000
+        assert pack.truncated is False
+
+    @pytest.mark.integration
+    def test_budget_respected(self, pack_env: "DigestConfig") -> None:
+        """予算が小さい場合は short 版・切り詰めで予算内に収める"""
+        for unit in ("chars", "tokens"):
+            pack = ContextPackBuilder(pack_env).build(budget=100, unit=unit, use_cache=False)
+
+            measure = len if unit == "chars" else estimate_tokens
+            assert measure(pack.text) == pack.used <= 100
+            assert pack.truncated is True
+            assert pack.full_levels == []
+
+    @pytest.mark.integration
+    def test_placeholder_and_missing_grand(self, temp_plugin_env, digest_config) -> None:
+        """GrandDigest がなくても空のパックを返し、PLACEHOLDER は含めない"""
+        pack = ContextPackBuilder(digest_config).build(use_cache=False)
+        assert pack.full_levels == [] and pack.hits == []
+
+        _write_grand(
+            digest_config, {"weekly": {"overall_digest": _overall("W0001", PLACEHOLDER_SIMPLE)}}
+        )
+        pack = ContextPackBuilder(digest_config).build(use_cache=False)
+        assert PLACEHOLDER_SIMPLE not in pack.text
+
+    @pytest.mark.integration
+    def test_search_failure_does_not_block(self, pack_env: "DigestConfig") -> None:
+        """検索の失敗はパック作成を妨げない"""
+        builder = ContextPackBuilder(pack_env)
+        with patch.object(builder.search_index, "refresh", side_effect=OSError("disk")):
+            pack = builder.build(use_cache=False)
+
+        assert pack.hits == []
+        assert pack.full_levels == ["weekly", "monthly"]
+
+    @pytest.mark.unit
+    def test_invalid_arguments(self, digest_config: "DigestConfig") -> None:
+        """不正な予算・単位は ValueError"""
+        builder = ContextPackBuilder(digest_config)
+        with pytest.raises(ValueError):
+            builder.build(budget=-1)
+        with pytest.raises(ValueError):
+            builder.build(unit="words")
+
+
+class TestContextPackCache:
+    """入力ファイルのシグネチャをキーにしたキャッシュ"""
+
+    @pytest.mark.integration
+    def test_cache_hit_skips_search(self, pack_env: "DigestConfig") -> None:
+        """入力が変わらなければ検索インデックスを開かずにキャッシュを返す"""
+        first = ContextPackBuilder(pack_env).build()
+        assert (pack_env.essences_path / CONTEXT_PACK_FILENAME).exists()
+
+        builder = ContextPackBuilder(pack_env)
+        with patch("application.search.context_pack.DigestSearchIndex") as index_class:
+            second = builder.build()
+            index_class.assert_not_called()
+
+        assert second.cached is True
+        assert second.text == first.text
+
+    @pytest.mark.integration
+    def test_grand_digest_change_invalidates(self, pack_env: "DigestConfig") -> None:
+        """GrandDigest.txt の更新でキャッシュが無効になる"""
+        ContextPackBuilder(pack_env).build()
+        path = _write_grand(
+            pack_env, {"weekly": {"overall_digest": _overall("W0003_新しい週", "新しい週。")}}
+        )
+        os.utime(path, ns=(1, 1))
+
+        pack = ContextPackBuilder(pack_env).build()
+        assert pack.cached is False
+        assert "W0003_新しい週" in pack.text
+
+    @pytest.mark.integration
+    def test_new_loop_invalidates(
+        self, pack_env: "DigestConfig", temp_plugin_env: "TempPluginEnvironment"
+    ) -> None:
+        """Loop の追加でキャッシュが無効になる"""
+        ContextPackBuilder(pack_env).build()
+        (temp_plugin_env.loops_path / "L00003_loop.txt").write_text(
+            json.dumps({"overall_digest": {"abstract": "全文検索の続き。"}}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.utime(temp_plugin_env.loops_path, ns=(2, 2))
+
+        pack = ContextPackBuilder(pack_env).build()
+        assert pack.cached is False
+        assert "loop/L00003_loop.txt" in pack.hits
+
+    @pytest.mark.integration
+    def test_loop_edited_in_place_invalidates(
+        self, pack_env: "DigestConfig", temp_plugin_env: "TempPluginEnvironment"
+    ) -> None:
+        """ディレクトリの mtime が変わらないその場の書き換えでもキャッシュが無効になる"""
+        ContextPackBuilder(pack_env).build(query="ラーメン")
+        loop = sorted(temp_plugin_env.loops_path.glob("L*.txt"))[0]
+        dir_stat = os.stat(temp_plugin_env.loops_path)
+        loop.write_text(
+            json.dumps(
+                {"overall_digest": {"abstract": "ラーメンの食べ歩き。"}}, ensure_ascii=False
+            ),
+            encoding="utf-8",
+        )
+        os.utime(temp_plugin_env.loops_path, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+        pack = ContextPackBuilder(pack_env).build(query="ラーメン")
+        assert pack.cached is False
+        assert f"loop/{loop.name}" in pack.hits
+
+    @pytest.mark.integration
+    def test_parameters_part_of_key(self, pack_env: "DigestConfig") -> None:
+        """パラメータが異なればキャッシュを使わない"""
+        builder = ContextPackBuilder(pack_env)
+        builder.build(budget=5000)
+
+        assert builder.build(budget=5000).cached is True
+        assert builder.build(budget=4000).cached is False
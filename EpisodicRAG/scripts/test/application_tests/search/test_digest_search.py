@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+test_digest_search.py
+=====================
+
+application/search/digest_search.py の統合テスト。
+Loop / RegularDigest の索引、インクリメンタル更新、永続化、
+DigestPersistence からの更新をテスト。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from application.search import DigestSearchIndex
+from domain.constants import PLACEHOLDER_SIMPLE
+from domain.file_constants import SEARCH_INDEX_FILENAME, VECTOR_INDEX_FILENAME
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+    from application.config import DigestConfig
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _loop(abstract: str, keywords: Any = None) -> Dict[str, Any]:
+    return {
+        "overall_digest": {
+            "digest_type": "会話",
+            "keywords": keywords or [],
+            "abstract": abstract,
+            "impression": "",
+        }
+    }
+
+
+def _weekly_digest() -> Dict[str, Any]:
+    return {
+        "metadata": {"digest_level": "weekly", "digest_number": "0001"},
+        "overall_digest": {
+            "name": "W0001_テスト週",
+            "digest_type": "統合",
+            "keywords": ["インデックス設計"],
+            "abstract": "今週は全文検索インデックスの設計を進めた。",
+            "impression": "順調",
+        },
+        "individual_digests": [
+            {
+                "source_file": "L00001_a.txt",
+                "digest_type": "会話",
+                "keywords": ["転置インデックス"],
+                "abstract": {"long": "転置インデックスの構造を議論した。", "short": "転置"},
+                "impression": {"long": "", "short": ""},
+            },
+            {
+                "source_file": "L00002_b.txt",
+                "digest_type": "会話",
+                "keywords": ["料理"],
+                "abstract": {"long": "夕食のカレーのレシピについて話した。", "short": "料理"},
+                "impression": {"long": "", "short": ""},
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def populated_env(temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"):
+    """Loop 2件と weekly Digest 1件を配置した環境"""
+    _write_json(
+        temp_plugin_env.loops_path / "L00001_a.txt", _loop("転置インデックスの構造を議論した。")
+    )
+    _write_json(
+        temp_plugin_env.loops_path / "L00002_b.txt", _loop("夕食のカレーのレシピについて話した。")
+    )
+    _write_json(digest_config.get_level_dir("weekly") / "W0001_テスト週.txt", _weekly_digest())
+    return temp_plugin_env, digest_config
+
+
+class TestDigestSearchIndexBuild:
+    """インデックス構築と検索"""
+
+    @pytest.mark.integration
+    def test_refresh_indexes_loops_and_digests(self, populated_env) -> None:
+        """Loop と RegularDigest（overall + individual）を索引"""
+        _, config = populated_env
+        index = DigestSearchIndex(config)
+
+        assert index.refresh() == {"indexed": 3, "removed": 0}
+        # Loop 2 + overall 1 + individual 2
+        assert len(index) == 5
+
+    @pytest.mark.integration
+    def test_search_japanese(self, populated_env) -> None:
+        """日本語クエリで関連文書が上位"""
+        _, config = populated_env
+        index = DigestSearchIndex(config)
+        index.refresh()
+
+        hits = index.search("カレーのレシピ")
+        assert {hit.doc_id for hit in hits[:2]} == {
+            "loop/L00002_b.txt",
+            "weekly/W0001_テスト週.txt#1",
+        }
+        individual = next(hit for hit in hits if hit.level == "weekly")
+        assert individual.source_file == "L00002_b.txt"
+        assert individual.file == "W0001_テスト週.txt"
+        assert "カレー" in individual.snippet
+
+    @pytest.mark.integration
+    def test_level_filter(self, populated_env) -> None:
+        """levels 指定で階層を絞り込み"""
+        _, config = populated_env
+        index = DigestSearchIndex(config)
+        index.refresh()
+
+        hits = index.search("インデックス", levels=["weekly"])
+        assert hits
+        assert all(hit.level == "weekly" for hit in hits)
+
+    @pytest.mark.integration
+    def test_placeholder_not_indexed(
+        self, temp_plugin_env: "TempPluginEnvironment", digest_config
+    ) -> None:
+        """PLACEHOLDER を含むフィールドは索引しない"""
+        _write_json(
+            temp_plugin_env.loops_path / "L00001_a.txt",
+            _loop(PLACEHOLDER_SIMPLE, keywords=[PLACEHOLDER_SIMPLE]),
+        )
+        index = DigestSearchIndex(digest_config)
+        index.refresh()
+
+        assert index.search("placeholder") == []
+
+
+class TestDigestSearchIndexIncremental:
+    """インクリメンタル更新と永続化"""
+
+    @pytest.mark.integration
+    def test_persisted_and_reloaded(self, populated_env) -> None:
+        """保存したインデックスを別インスタンスで再利用（再索引なし）"""
+        _, config = populated_env
+        DigestSearchIndex(config).refresh()
+        assert (config.essences_path / SEARCH_INDEX_FILENAME).exists()
+
+        index = DigestSearchIndex(config)
+        with patch("application.search.digest_search.try_read_json_from_file") as reader:
+            assert index.refresh() == {"indexed": 0, "removed": 0}
+            reader.assert_not_called()
+        assert index.search("カレー")
+
+    @pytest.mark.integration
+    def test_only_changed_files_reindexed(self, populated_env) -> None:
+        """変更・追加・削除されたファイルのみ反映"""
+        env, config = populated_env
+        DigestSearchIndex(config).refresh()
+
+        changed = _write_json(env.loops_path / "L00001_a.txt", _loop("ラーメンの食べ歩き記録。"))
+        os.utime(changed, ns=(1, 1))
+        _write_json(env.loops_path / "L00003_c.txt", _loop("新しいラーメン屋を見つけた。"))
+        (env.loops_path / "L00002_b.txt").unlink()
+
+        index = DigestSearchIndex(config)
+        assert index.refresh() == {"indexed": 2, "removed": 1}
+
+        loop_hits = [hit.file for hit in index.search("ラーメン", levels=["loop"])]
+        assert sorted(loop_hits) == ["L00001_a.txt", "L00003_c.txt"]
+        assert index.search("カレー", levels=["loop"]) == []
+
+    @pytest.mark.integration
+    def test_corrupted_index_rebuilt(self, populated_env) -> None:
+        """壊れたインデックスファイルは無視して再構築"""
+        _, config = populated_env
+        (config.essences_path / SEARCH_INDEX_FILENAME).write_text("{broken", encoding="utf-8")
+
+        index = DigestSearchIndex(config)
+        assert index.refresh()["indexed"] == 3
+
+    @pytest.mark.integration
+    def test_update_file_uses_given_data(self, populated_env) -> None:
+        """update_file は渡されたデータを使い、ファイルを再読込しない"""
+        _, config = populated_env
+        path = config.get_level_dir("weekly") / "W0001_テスト週.txt"
+        index = DigestSearchIndex(config)
+
+        with patch("application.search.digest_search.try_read_json_from_file") as reader:
+            assert index.update_file("weekly", path, _weekly_digest()) == 3
+            reader.assert_not_called()
+        assert index.search("転置インデックス", levels=["weekly"])
+
+    @pytest.mark.integration
+    def test_update_file_keeps_concurrent_updates(self, populated_env) -> None:
+        """読み込み後に他のインスタンスが保存した内容を上書きで失わない"""
+        env, config = populated_env
+        stale = DigestSearchIndex(config)
+        stale.refresh()
+
+        other = DigestSearchIndex(config)
+        added = _write_json(env.loops_path / "L00003_c.txt", _loop("新しいラーメン屋を見つけた。"))
+        other.update_file("loop", added)
+
+        path = config.get_level_dir("weekly") / "W0001_テスト週.txt"
+        stale.update_file("weekly", path, _weekly_digest())
+
+        index = DigestSearchIndex(config)
+        assert [hit.file for hit in index.search("ラーメン屋", levels=["loop"])] == ["L00003_c.txt"]
+        assert index.search("転置インデックス", levels=["weekly"])
+
+
+class TestPersistenceIntegration:
+    """DigestPersistence.save_regular_digest からの更新"""
+
+    @pytest.mark.integration
+    def test_save_regular_digest_updates_index(self, digest_config: "DigestConfig") -> None:
+        """RegularDigest 保存時にインデックスが更新される"""
+        from application.finalize.persistence import DigestPersistence
+        from application.grand import GrandDigestManager, ShadowGrandDigestManager
+        from application.tracking import DigestTimesTracker
+
+        persistence = DigestPersistence(
+            digest_config,
+            GrandDigestManager(digest_config),
+            ShadowGrandDigestManager(digest_config),
+            DigestTimesTracker(digest_config),
+        )
+        persistence.save_regular_digest("weekly", _weekly_digest(), "W0001_テスト週")
+
+        hits = DigestSearchIndex(digest_config).search("全文検索")
+        assert hits[0].doc_id == "weekly/W0001_テスト週.txt"
+
+    @pytest.mark.integration
+    def test_index_failure_does_not_block_save(self, digest_config: "DigestConfig") -> None:
+        """インデックス更新の失敗は保存を妨げない"""
+        from application.finalize.persistence import DigestPersistence
+        from application.grand import GrandDigestManager, ShadowGrandDigestManager
+        from application.tracking import DigestTimesTracker
+
+        class FailingIndex:
+            def update_file(self, *args: Any, **kwargs: Any) -> int:
+                raise OSError("disk full")
+
+        persistence = DigestPersistence(
+            digest_config,
+            GrandDigestManager(digest_config),
+            ShadowGrandDigestManager(digest_config),
+            DigestTimesTracker(digest_config),
+            search_index=FailingIndex(),  # type: ignore[arg-type]
+        )
+        path = persistence.save_regular_digest("weekly", _weekly_digest(), "W0001_テスト週")
+
+        assert path.exists()
+
+
+# =============================================================================
+# 階層ビームサーチ
+# =============================================================================
+
+
+def _digest(abstract: str, source_files: Any) -> Dict[str, Any]:
+    return {
+        "overall_digest": {
+            "digest_type": "統合",
+            "keywords": [],
+            "abstract": abstract,
+            "impression": "",
+            "source_files": source_files,
+        },
+        "individual_digests": [],
+    }
+
+
+@pytest.fixture
+def tree_env(temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"):
+    """
+    monthly M0001 ─┬─ weekly W0001 ─┬─ L00001（料理）
+                   │                └─ L00002（料理）
+                   └─ weekly W0002 ─┬─ L00003（検索）
+                                    └─ L00004（検索）
+    未統合: L00005（検索）
+    """
+    loops = temp_plugin_env.loops_path
+    _write_json(loops / "L00001_a.txt", _loop("カレーのレシピ。"))
+    _write_json(loops / "L00002_b.txt", _loop("パスタの茹で方。"))
+    _write_json(loops / "L00003_c.txt", _loop("転置インデックスの検索速度。"))
+    _write_json(loops / "L00004_d.txt", _loop("検索結果のランキング。"))
+    _write_json(loops / "L00005_e.txt", _loop("ビームサーチで検索を高速化。"))
+    _write_json(
+        digest_config.get_level_dir("weekly") / "W0001_料理.txt",
+        _digest("料理の話題の週。", ["L00001_a.txt", "L00002_b.txt"]),
+    )
+    _write_json(
+        digest_config.get_level_dir("weekly") / "W0002_検索.txt",
+        _digest("検索エンジンの週。", ["L00003_c.txt", "L00004_d.txt"]),
+    )
+    _write_json(
+        digest_config.get_level_dir("monthly") / "M0001_月.txt",
+        _digest("料理と検索の月。", ["W0001_料理.txt", "W0002_検索.txt"]),
+    )
+    index = DigestSearchIndex(digest_config)
+    index.refresh()
+    return index
+
+
+class TestHierarchicalSearch:
+    """search_hierarchical のテスト"""
+
+    @pytest.mark.integration
+    def test_tree_built_from_source_files(self, tree_env: DigestSearchIndex) -> None:
+        """索引時に親→子リンクが記録される"""
+        tree = tree_env.tree
+        assert tree.children("monthly/M0001_月.txt") == [
+            "weekly/W0001_料理.txt",
+            "weekly/W0002_検索.txt",
+        ]
+        assert tree.parent("loop/L00003_c.txt") == "weekly/W0002_検索.txt"
+        assert tree.path.exists()
+
+    @pytest.mark.integration
+    def test_descends_only_best_branch(self, tree_env: DigestSearchIndex) -> None:
+        """beam_width=1 では最良の枝の子のみスコアリングする"""
+        with patch.object(
+            tree_env._bm25, "score_documents", wraps=tree_env._bm25.score_documents
+        ) as scorer:
+            hits = tree_env.search_hierarchical("検索", beam_width=1)
+
+        scored = set().union(*(set(call.args[1]) for call in scorer.call_args_list))
+        assert "loop/L00003_c.txt" in scored
+        assert "loop/L00001_a.txt" not in scored
+        assert "weekly/W0001_料理.txt" in scored  # 兄弟ノードは比較される
+
+        files = [hit.file for hit in hits]
+        assert "L00003_c.txt" in files
+        assert "L00005_e.txt" in files  # 未統合のLoopも起点になる
+        assert "L00001_a.txt" not in files
+
+    @pytest.mark.integration
+    def test_wider_beam_reaches_more(self, tree_env: DigestSearchIndex) -> None:
+        """ビーム幅を広げると他の枝も探索する"""
+        narrow = {hit.file for hit in tree_env.search_hierarchical("カレー", beam_width=1)}
+        wide = {hit.file for hit in tree_env.search_hierarchical("カレー", beam_width=2)}
+        assert "L00001_a.txt" in wide
+        assert narrow <= wide
+
+    @pytest.mark.integration
+    def test_tree_persisted(
+        self, tree_env: DigestSearchIndex, digest_config: "DigestConfig"
+    ) -> None:
+        """新しいインスタンスはファイルを開かずに階層検索できる"""
+        index = DigestSearchIndex(digest_config)
+        with patch("application.search.digest_search.try_read_json_from_file") as reader:
+            hits = index.search_hierarchical("ランキング", beam_width=1)
+            reader.assert_not_called()
+        assert hits[0].file == "L00004_d.txt"
+
+    @pytest.mark.integration
+    def test_grand_digest_links_merged(
+        self, temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"
+    ) -> None:
+        """RegularDigest ファイルがなくても major_digests のリンクを使う"""
+        _write_json(temp_plugin_env.loops_path / "L00001_a.txt", _loop("検索の話。"))
+        _write_json(
+            digest_config.essences_path / "GrandDigest.txt",
+            {
+                "metadata": {},
+                "major_digests": {
+                    "weekly": {
+                        "overall_digest": {
+                            "name": "W0009_消えた週",
+                            "source_files": ["L00001_a.txt"],
+                        }
+                    },
+                    "monthly": {"overall_digest": None},
+                },
+            },
+        )
+        index = DigestSearchIndex(digest_config)
+        index.refresh()
+
+        assert index.tree.parent("loop/L00001_a.txt") == "weekly/W0009_消えた週.txt"
+
+    @pytest.mark.integration
+    def test_removed_digest_unlinks_children(
+        self, tree_env: DigestSearchIndex, digest_config
+    ) -> None:
+        """ダイジェストの削除で子ノードは未統合（起点）に戻る"""
+        (digest_config.get_level_dir("weekly") / "W0001_料理.txt").unlink()
+        tree_env.refresh()
+
+        assert tree_env.tree.parent("loop/L00001_a.txt") is None
+        hits = tree_env.search_hierarchical("カレー", beam_width=1)
+        assert hits[0].file == "L00001_a.txt"
+
+
+# =============================================================================
+# ベクトル類似検索
+# =============================================================================
+
+
+class TestMostSimilar:
+    """most_similar のテスト"""
+
+    @pytest.mark.integration
+    def test_similar_weeks_to_shadow_overall_digest(self, tree_env: DigestSearchIndex) -> None:
+        """Shadow の overall_digest をそのまま渡して類似した週を取得"""
+        shadow_overall = {
+            "digest_type": "統合",
+            "keywords": ["検索エンジン"],
+            "abstract": "検索エンジンのランキングを改善した週。",
+            "impression": "",
+            "source_files": ["L00005_e.txt"],
+        }
+        hits = tree_env.most_similar(shadow_overall, levels=["weekly"])
+
+        assert [hit.file for hit in hits] == ["W0002_検索.txt", "W0001_料理.txt"][: len(hits)]
+        assert hits[0].level == "weekly"
+        assert 0 < hits[0].score <= 1.0
+
+    @pytest.mark.integration
+    def test_text_query_and_exclude(self, tree_env: DigestSearchIndex) -> None:
+        """テキストクエリ、exclude 指定"""
+        hits = tree_env.most_similar("転置インデックスの検索", levels=["loop"])
+        assert hits[0].file == "L00003_c.txt"
+
+        excluded = tree_env.most_similar(
+            "転置インデックスの検索", levels=["loop"], exclude=["loop/L00003_c.txt"]
+        )
+        assert "L00003_c.txt" not in [hit.file for hit in excluded]
+
+    @pytest.mark.integration
+    def test_placeholder_query_returns_nothing(self, tree_env: DigestSearchIndex) -> None:
+        """PLACEHOLDER のみの overall_digest は空の結果"""
+        assert tree_env.most_similar({"abstract": PLACEHOLDER_SIMPLE}) == []
+
+    @pytest.mark.integration
+    def test_vectors_persisted(self, tree_env: DigestSearchIndex, digest_config) -> None:
+        """ベクトル行列が保存され、別インスタンスで再利用される"""
+        assert (digest_config.essences_path / VECTOR_INDEX_FILENAME).exists()
+        expected = tree_env.most_similar("カレー")
+
+        index = DigestSearchIndex(digest_config)
+        with patch("application.search.digest_search.try_read_json_from_file") as reader:
+            assert index.most_similar("カレー") == expected
+            reader.assert_not_called()
+
+    @pytest.mark.integration
+    def test_missing_vector_file_rebuilds(self, tree_env: DigestSearchIndex, digest_config) -> None:
+        """ベクトル行列ファイルがない場合は再構築"""
+        (digest_config.essences_path / VECTOR_INDEX_FILENAME).unlink()
+
+        index = DigestSearchIndex(digest_config)
+        assert index.refresh()["indexed"] == 8
+        assert index.most_similar("カレー", levels=["loop"])[0].file == "L00001_a.txt"
+
+    @pytest.mark.integration
+    def test_removed_file_removed_from_vectors(
+        self, tree_env: DigestSearchIndex, digest_config
+    ) -> None:
+        """削除したファイルは類似検索の対象外"""
+        (digest_config.get_level_dir("weekly") / "W0002_検索.txt").unlink()
+        tree_env.refresh()
+
+        files = [hit.file for hit in tree_env.most_similar("検索エンジン", levels=["weekly"])]
+        assert "W0002_検索.txt" not in files
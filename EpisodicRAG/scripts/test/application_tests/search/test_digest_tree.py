@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+test_digest_tree.py
+===================
+
+application/search/digest_tree.py の単体テスト。
+親子リンクの抽出、隣接リストの更新と永続化をテスト。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from application.search.digest_tree import (
+    DigestTree,
+    child_level_of,
+    children_from_digest,
+    node_id,
+)
+
+
+class TestHelpers:
+    """ノードID・レベル関係のヘルパー"""
+
+    @pytest.mark.unit
+    def test_child_level(self) -> None:
+        """LEVEL_CONFIG の next の逆引き"""
+        assert child_level_of("weekly") == "loop"
+        assert child_level_of("monthly") == "weekly"
+        assert child_level_of("centurial") == "multi_decadal"
+        assert child_level_of("loop") is None
+
+    @pytest.mark.unit
+    def test_children_from_regular_digest(self) -> None:
+        """RegularDigest の overall_digest.source_files から子ノードIDを生成"""
+        data = {"overall_digest": {"source_files": ["W0001_a.txt", "W0002_b.txt"]}}
+        assert children_from_digest("monthly", data) == [
+            node_id("weekly", "W0001_a.txt"),
+            node_id("weekly", "W0002_b.txt"),
+        ]
+
+    @pytest.mark.unit
+    def test_children_from_overall_digest(self) -> None:
+        """overall_digest そのもの（major_digests のエントリ）も受け付ける"""
+        assert children_from_digest("weekly", {"source_files": ["L00001.txt"]}) == [
+            "loop/L00001.txt"
+        ]
+
+    @pytest.mark.unit
+    def test_invalid_source_files(self) -> None:
+        """不正な source_files は無視"""
+        assert children_from_digest("weekly", {"overall_digest": {"source_files": "x"}}) == []
+        assert children_from_digest("weekly", {"overall_digest": None}) == []
+        assert children_from_digest("loop", {"source_files": ["x"]}) == []
+
+
+class TestDigestTree:
+    """DigestTree のテスト"""
+
+    @pytest.mark.unit
+    def test_parent_lookup(self, tmp_path: Path) -> None:
+        """子から親を逆引き"""
+        tree = DigestTree(tmp_path / "DigestTree.json")
+        tree.set_children("weekly/W0001.txt", ["loop/L00001.txt", "loop/L00002.txt"])
+
+        assert tree.parent("loop/L00002.txt") == "weekly/W0001.txt"
+        assert tree.has_parent("loop/L00001.txt")
+        assert not tree.has_parent("loop/L00003.txt")
+
+    @pytest.mark.unit
+    def test_set_children_replaces(self, tmp_path: Path) -> None:
+        """set_children は既存の子を置き換え、逆引きも更新"""
+        tree = DigestTree(tmp_path / "DigestTree.json")
+        tree.set_children("weekly/W0001.txt", ["loop/L00001.txt"])
+        assert tree.has_parent("loop/L00001.txt")
+
+        tree.set_children("weekly/W0001.txt", ["loop/L00002.txt"])
+        assert not tree.has_parent("loop/L00001.txt")
+        assert tree.all_children() == {"loop/L00002.txt"}
+
+    @pytest.mark.unit
+    def test_remove(self, tmp_path: Path) -> None:
+        """親ノードの削除"""
+        tree = DigestTree(tmp_path / "DigestTree.json")
+        tree.set_children("weekly/W0001.txt", ["loop/L00001.txt"])
+        tree.remove("weekly/W0001.txt")
+
+        assert "weekly/W0001.txt" not in tree
+        assert tree.parent("loop/L00001.txt") is None
+
+    @pytest.mark.integration
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """保存した隣接リストを読み込み"""
+        path = tmp_path / "DigestTree.json"
+        tree = DigestTree(path)
+        tree.set_children("monthly/M0001.txt", ["weekly/W0001.txt"])
+        tree.save()
+
+        loaded = DigestTree(path)
+        assert loaded.load() is True
+        assert loaded.children("monthly/M0001.txt") == ["weekly/W0001.txt"]
+
+    @pytest.mark.integration
+    def test_load_missing_or_invalid(self, tmp_path: Path) -> None:
+        """ファイルなし・旧形式は False"""
+        path = tmp_path / "DigestTree.json"
+        assert DigestTree(path).load() is False
+
+        path.write_text('{"version": 0, "children": {}}', encoding="utf-8")
+        assert DigestTree(path).load() is False
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+test_tokenizer.py
+=================
+
+application/search/tokenizer.py の単体テスト。
+日本語の文字 n-gram 分割、英数字の単語分割、正規化をテスト。
+"""
+
+import pytest
+
+from application.search.tokenizer import tokenize
+
+
+class TestTokenize:
+    """tokenize のテスト"""
+
+    @pytest.mark.unit
+    def test_japanese_bigrams(self) -> None:
+        """日本語は文字 bigram に分割"""
+        assert tokenize("検索機能") == ["検索", "索機", "機能"]
+
+    @pytest.mark.unit
+    def test_ascii_words(self) -> None:
+        """英数字の連続は1語（小文字化）"""
+        assert tokenize("BM25 Search index") == ["bm25", "search", "index"]
+
+    @pytest.mark.unit
+    def test_mixed_script(self) -> None:
+        """英数字と日本語の境界で分割"""
+        assert tokenize("Python入門") == ["python", "入門"]
+
+    @pytest.mark.unit
+    def test_short_segment_kept(self) -> None:
+        """n より短い非ASCII文字列はそのまま1語"""
+        assert tokenize("猫 と 犬") == ["猫", "と", "犬"]
+
+    @pytest.mark.unit
+    def test_nfkc_normalization(self) -> None:
+        """全角英数字・半角カナは正規化される"""
+        assert tokenize("ＲＡＧ") == ["rag"]
+        assert tokenize("ｶﾀｶﾅ") == tokenize("カタカナ")
+
+    @pytest.mark.unit
+    def test_punctuation_splits(self) -> None:
+        """句読点・記号で分割"""
+        assert tokenize("設計、実装。") == ["設計", "実装"]
+
+    @pytest.mark.unit
+    def test_empty(self) -> None:
+        """空文字列"""
+        assert tokenize("") == []
+
+    @pytest.mark.unit
+    def test_custom_ngram_size(self) -> None:
+        """n-gram 長の指定"""
+        assert tokenize("検索機能", ngram_size=3) == ["検索機", "索機能"]
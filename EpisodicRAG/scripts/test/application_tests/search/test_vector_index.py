@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+test_vector_index.py
+====================
+
+application/search/vector_index.py の単体テスト。
+ハッシュ化 TF-IDF ベクトル化、射影、類似度検索、永続化をテスト。
+"""
+
+import math
+
+import pytest
+
+from application.search.tokenizer import tokenize
+from application.search.vector_index import (
+    DEFAULT_PROJECTION_DIMENSIONS,
+    HashedVectorIndex,
+    is_numpy_available,
+)
+
+
+def _populated(**kwargs) -> HashedVectorIndex:
+    index = HashedVectorIndex(use_numpy=False, **kwargs)
+    index.add("weekly/W0001.txt", tokenize("全文検索インデックスの設計と転置リストの実装"))
+    index.add("weekly/W0002.txt", tokenize("夕食のカレーのレシピと買い物リスト"))
+    index.add("monthly/M0001.txt", tokenize("検索インデックス設計の月次まとめ"))
+    return index
+
+
+class TestVectorize:
+    """ベクトル化"""
+
+    @pytest.mark.unit
+    def test_vectors_are_normalized(self) -> None:
+        """ベクトルは L2 正規化される"""
+        index = _populated()
+        vector = index.vector("weekly/W0001.txt")
+
+        assert vector is not None
+        assert len(vector) == index.dimensions == DEFAULT_PROJECTION_DIMENSIONS
+        assert math.isclose(math.fsum(x * x for x in vector), 1.0, rel_tol=1e-5)
+
+    @pytest.mark.unit
+    def test_without_projection(self) -> None:
+        """projection_dimensions=None ではハッシュ次元のまま"""
+        index = _populated(hash_dimensions=256, projection_dimensions=None)
+        assert len(index.vectorize(tokenize("検索"))) == 256
+
+    @pytest.mark.unit
+    def test_empty_tokens_zero_vector(self) -> None:
+        """索引語がない場合はゼロベクトル"""
+        assert not any(HashedVectorIndex().vectorize([]))
+
+    @pytest.mark.unit
+    def test_deterministic_across_instances(self) -> None:
+        """同じシードなら同じベクトル"""
+        assert _populated().vector("weekly/W0002.txt") == _populated().vector("weekly/W0002.txt")
+
+    @pytest.mark.unit
+    def test_invalid_dimensions(self) -> None:
+        """次元数が正でない場合は ValueError"""
+        with pytest.raises(ValueError):
+            HashedVectorIndex(hash_dimensions=0)
+        with pytest.raises(ValueError):
+            HashedVectorIndex(projection_dimensions=0)
+
+
+class TestMostSimilar:
+    """類似度検索"""
+
+    @pytest.mark.unit
+    def test_related_documents_ranked_first(self) -> None:
+        """キーワードが完全一致しなくても文字 n-gram の重なりで上位になる"""
+        results = _populated().most_similar(tokenize("インデックスを設計した"))
+
+        top_two = {doc_id for doc_id, _ in results[:2]}
+        assert top_two == {"monthly/M0001.txt", "weekly/W0001.txt"}
+        assert all(score > 0 for _, score in results)
+
+    @pytest.mark.unit
+    def test_filter_and_exclude(self) -> None:
+        """doc_filter と exclude で対象を絞り込む"""
+        index = _populated()
+        results = index.most_similar(
+            tokenize("検索インデックス設計"),
+            doc_filter=lambda doc_id: doc_id.startswith("weekly/"),
+            exclude=["weekly/W0001.txt"],
+        )
+        assert all(doc_id == "weekly/W0002.txt" for doc_id, _ in results)
+
+    @pytest.mark.unit
+    def test_query_by_vector(self) -> None:
+        """格納済みベクトルをクエリにすると自身が最上位"""
+        index = _populated()
+        vector = index.vector("weekly/W0002.txt")
+        assert vector is not None
+
+        doc_id, score = index.most_similar(vector, top_k=1)[0]
+        assert doc_id == "weekly/W0002.txt"
+        assert score == pytest.approx(1.0, rel=1e-5)
+
+    @pytest.mark.unit
+    def test_vector_dimension_mismatch(self) -> None:
+        """次元の合わないベクトルは ValueError"""
+        with pytest.raises(ValueError):
+            _populated().most_similar([0.5, 0.5])
+
+    @pytest.mark.unit
+    def test_empty_index(self) -> None:
+        """空のインデックスは空リスト"""
+        assert HashedVectorIndex().most_similar(tokenize("検索")) == []
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not is_numpy_available(), reason="numpy not installed")
+    def test_numpy_matches_python(self) -> None:
+        """NumPy 実装と純Python実装の結果が一致"""
+        python_index = _populated()
+        numpy_index = HashedVectorIndex.from_dict(
+            python_index.to_dict(), python_index.to_bytes(), use_numpy=True
+        )
+        query = tokenize("検索インデックス")
+
+        expected = python_index.most_similar(query)
+        actual = numpy_index.most_similar(query)
+        assert [doc_id for doc_id, _ in actual] == [doc_id for doc_id, _ in expected]
+
+
+class TestUpdate:
+    """追加・置換・削除"""
+
+    @pytest.mark.unit
+    def test_replace_document(self) -> None:
+        """同じ doc_id の追加は置き換え"""
+        index = _populated()
+        index.add("weekly/W0002.txt", tokenize("全文検索インデックスの設計"))
+
+        assert len(index) == 3
+        top = [doc_id for doc_id, _ in index.most_similar(tokenize("全文検索"), top_k=2)]
+        assert "weekly/W0002.txt" in top
+
+    @pytest.mark.unit
+    def test_remove_compacts_rows(self) -> None:
+        """削除後も残りの文書のベクトルが保たれる"""
+        index = _populated()
+        expected = index.vector("monthly/M0001.txt")
+
+        assert index.remove("weekly/W0001.txt") is True
+        assert index.remove("weekly/W0001.txt") is False
+        assert len(index) == 2
+        assert "weekly/W0001.txt" not in index
+        assert index.vector("monthly/M0001.txt") == expected
+        assert len(index.to_bytes()) == 2 * index.dimensions * 4
+
+    @pytest.mark.unit
+    def test_remove_and_replace_update_doc_freqs(self) -> None:
+        """削除・置換した文書の寄与は df から減算される"""
+        index = _populated()
+        index.add("weekly/W0002.txt", tokenize("全文検索インデックスの設計"))
+        index.remove("monthly/M0001.txt")
+
+        expected = HashedVectorIndex(use_numpy=False)
+        expected.add("weekly/W0001.txt", tokenize("全文検索インデックスの設計と転置リストの実装"))
+        expected.add("weekly/W0002.txt", tokenize("全文検索インデックスの設計"))
+        assert index.to_dict()["doc_freqs"] == expected.to_dict()["doc_freqs"]
+        assert index.to_dict()["df_docs"] == 2
+
+    @pytest.mark.unit
+    def test_zero_vector_never_similar(self) -> None:
+        """ゼロベクトルの文書は純Python実装でも類似度 0（結果に含まれない）"""
+        index = _populated()
+        index.add("weekly/W0003.txt", [])
+
+        hits = index.most_similar(tokenize("全文検索インデックス"), top_k=10)
+        assert "weekly/W0003.txt" not in [doc_id for doc_id, _ in hits]
+        assert len(hits) >= 2
+
+
+class TestPersistence:
+    """永続化"""
+
+    @pytest.mark.unit
+    def test_round_trip(self) -> None:
+        """to_dict / to_bytes から同じ結果を復元"""
+        index = _populated()
+        restored = HashedVectorIndex.from_dict(index.to_dict(), index.to_bytes(), use_numpy=False)
+
+        query = tokenize("カレーのレシピ")
+        assert restored.most_similar(query) == index.most_similar(query)
+        assert restored.vectorize(query) == index.vectorize(query)
+
+    @pytest.mark.unit
+    def test_round_trip_keeps_doc_buckets(self) -> None:
+        """復元した索引でも削除時に df が減算される"""
+        index = _populated()
+        restored = HashedVectorIndex.from_dict(index.to_dict(), index.to_bytes(), use_numpy=False)
+
+        index.remove("weekly/W0002.txt")
+        restored.remove("weekly/W0002.txt")
+        assert restored.to_dict()["doc_freqs"] == index.to_dict()["doc_freqs"]
+
+    @pytest.mark.unit
+    def test_payload_size_mismatch(self) -> None:
+        """行列サイズがメタデータと一致しない場合は ValueError"""
+        index = _populated()
+        with pytest.raises(ValueError):
+            HashedVectorIndex.from_dict(index.to_dict(), index.to_bytes()[:-4])
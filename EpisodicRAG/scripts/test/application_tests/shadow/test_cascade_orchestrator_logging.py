@@ -3,14 +3,17 @@
 cascade_orchestrator DEBUGログのテスト
 =======================================
 
-CascadeOrchestratorのDEBUGレベルトレースが正しく出力されることを検証。
+CascadeOrchestratorのDEBUGレベルトレースと、ステップごとの span が
+正しく出力されることを検証。
 
 Usage:
     pytest scripts/test/application_tests/shadow/test_cascade_orchestrator_logging.py -v
 """
 
 import logging
+from pathlib import Path
 from typing import TYPE_CHECKING, Dict
+from unittest.mock import patch
 
 import pytest
 
@@ -174,3 +177,41 @@ class TestCascadeOrchestratorLogging:
         # DEBUG用のプレフィックスが含まれていないことを確認
         # （INFOレベルのログには[STATE]等のプレフィックスは使われない）
         assert "step_promote" not in caplog.text
+
+
+class TestCascadeOrchestratorSpans:
+    """CascadeOrchestratorのステップ span テスト"""
+
+    @pytest.mark.unit
+    def test_each_step_is_wrapped_in_span(
+        self,
+        cascade_orchestrator: CascadeOrchestrator,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """4ステップがそれぞれ cascade span の子として所要時間付きで出力される"""
+        new_files = [Path("W0001_test.txt"), Path("W0002_test.txt")]
+        with (
+            patch.object(
+                cascade_orchestrator.file_detector, "find_new_files", return_value=new_files
+            ),
+            patch.object(cascade_orchestrator.file_appender, "add_files_to_shadow"),
+            caplog.at_level(logging.DEBUG, logger="episodic_rag"),
+        ):
+            cascade_orchestrator.execute_cascade("weekly")
+
+        spans = {r.event: r for r in caplog.records if getattr(r, "kind", None) == "span"}
+        assert list(spans) == [
+            "cascade.promote",
+            "cascade.detect",
+            "cascade.add",
+            "cascade.clear",
+            "cascade",
+        ]
+        root = spans.pop("cascade")
+        assert root.parent_id is None
+        for record in spans.values():
+            assert record.parent_id == root.span_id
+            assert record.status == "ok"
+            assert record.duration_ms >= 0
+        assert spans["cascade.detect"].context["files_processed"] == 2
+        assert spans["cascade.add"].context["level"] == "monthly"
@@ -211,3 +211,32 @@ class TestLogDigestContent:
         file_appender._log_digest_content(weekly_file, "monthly")
 
         # 警告が出力されていることを確認
+
+
+class TestAddFilesToShadowDelta:
+    """差分ログ有効時の add_files_to_shadow のテスト"""
+
+    @pytest.mark.integration
+    def test_appends_delta_only(
+        self,
+        file_appender,
+        temp_plugin_env: "TempPluginEnvironment",
+    ) -> None:
+        """文書全体を書き直さず、source_files への追加が差分ログに残る"""
+        shadow_io = file_appender.shadow_io
+        shadow_io.delta_threshold = 1_000_000
+        shadow_io.load_or_create()
+        base = shadow_io.shadow_digest_file.read_bytes()
+        loop = create_test_loop_file(temp_plugin_env.loops_path, 1)
+
+        file_appender.add_files_to_shadow("weekly", [loop])
+
+        assert shadow_io.shadow_digest_file.read_bytes() == base
+        (record,) = shadow_io.delta_log.records()
+        assert {
+            "op": "add",
+            "path": "/latest_digests/weekly/overall_digest/source_files/-",
+            "value": loop.name,
+        } in record["ops"]
+        data = shadow_io.load_or_create()
+        assert data["latest_digests"]["weekly"]["overall_digest"]["source_files"] == [loop.name]
@@ -172,6 +172,50 @@ class TestShadowGrandDigestManager:
         assert overall["source_files"] == ["Loop0001.txt"]
 
 
+class TestShadowGrandDigestManagerDeltaLog:
+    """差分ログ（shadow_delta_threshold > 0）での Loop 取り込みのテスト"""
+
+    @staticmethod
+    def _delta_manager(
+        shadow_manager: "ShadowGrandDigestManager", threshold: int
+    ) -> "ShadowGrandDigestManager":
+        shadow_manager.config.shadow_delta_threshold = threshold
+        return ShadowGrandDigestManager(shadow_manager.config)
+
+    @pytest.mark.integration
+    def test_ingest_appends_delta(self, shadow_manager: "ShadowGrandDigestManager") -> None:
+        """ShadowUpdater 経由の取り込みはベースを書き直さず、差分を1行だけ追記する"""
+        manager = self._delta_manager(shadow_manager, 1_000_000)
+        manager._io.load_or_create()
+        base = manager.shadow_digest_file.read_bytes()
+        loops_path = shadow_manager._temp_env.loops_path
+        (loops_path / "L00001_test.txt").write_text("{}")
+        (loops_path / "L00002_test.txt").write_text("{}")
+
+        manager.update_shadow_for_new_loops()
+
+        assert manager.shadow_digest_file.read_bytes() == base
+        assert len(manager._io.delta_log.records()) == 1
+        data = manager._io.load_or_create()
+        source_files = data["latest_digests"]["weekly"]["overall_digest"]["source_files"]
+        assert source_files == ["L00001_test.txt", "L00002_test.txt"]
+        assert data["metadata"]["revision"] == 1
+
+    @pytest.mark.integration
+    def test_ingest_compacts_at_threshold(self, shadow_manager: "ShadowGrandDigestManager") -> None:
+        """差分ログがしきい値を超えた取り込みではベースへ書き戻す"""
+        manager = self._delta_manager(shadow_manager, 1)
+        (shadow_manager._temp_env.loops_path / "L00001_test.txt").write_text("{}")
+
+        manager.update_shadow_for_new_loops()
+
+        assert not manager._io.delta_log.has_records()
+        stored = json.loads(manager.shadow_digest_file.read_text(encoding="utf-8"))
+        assert stored["latest_digests"]["weekly"]["overall_digest"]["source_files"] == [
+            "L00001_test.txt"
+        ]
+
+
 class TestShadowGrandDigestManagerInit:
     """ShadowGrandDigestManager 初期化テスト"""
 
@@ -265,3 +265,241 @@ class TestShadowIOInit:
 
         io = ShadowIO(shadow_file, factory)
         assert io.template_factory is factory
+
+
+# =============================================================================
+# リビジョン（楽観的並行制御）
+# =============================================================================
+
+
+def _level_files(data, level: str) -> list:
+    """指定レベルの overall_digest.source_files（なければ作成）"""
+    return data["latest_digests"][level]["overall_digest"].setdefault("source_files", [])
+
+
+def _weekly_files(data) -> list:
+    return _level_files(data, "weekly")
+
+
+class TestShadowIORevision:
+    """metadata.revision による競合検出と update() のテスト"""
+
+    @pytest.fixture
+    def shadow_io(self, temp_plugin_env: "TempPluginEnvironment") -> ShadowIO:
+        """Essences配下のShadowIO"""
+        template = ShadowTemplate(levels=LEVEL_NAMES)
+        return ShadowIO(
+            temp_plugin_env.essences_path / "ShadowGrandDigest.txt", template.get_template
+        )
+
+    @pytest.mark.integration
+    def test_conflict_detected(self, shadow_io: ShadowIO) -> None:
+        """読み込み後に別の保存があれば RevisionConflictError"""
+        from domain.exceptions import RevisionConflictError
+
+        stale = shadow_io.load_or_create()
+        theirs = shadow_io.load_or_create()
+        _weekly_files(theirs).append("L00001.txt")
+        shadow_io.save(theirs, expected_revision=0)
+
+        with pytest.raises(RevisionConflictError):
+            shadow_io.save(stale, expected_revision=0)
+
+    @pytest.mark.integration
+    def test_unchanged_save_keeps_file(self, shadow_io: ShadowIO) -> None:
+        """内容が同じなら last_updated・revision を更新せず、ファイルも書き換えない"""
+        data = shadow_io.load_or_create()
+        _weekly_files(data).append("L00001.txt")
+        shadow_io.save(data)
+        saved = shadow_io.shadow_digest_file.read_bytes()
+        stat = shadow_io.shadow_digest_file.stat()
+
+        again = shadow_io.load_or_create()
+        shadow_io.save(again, expected_revision=1)
+
+        assert shadow_io.shadow_digest_file.read_bytes() == saved
+        assert shadow_io.shadow_digest_file.stat().st_mtime_ns == stat.st_mtime_ns
+        assert again["metadata"]["revision"] == 1
+
+    @pytest.mark.integration
+    def test_update_retries_and_keeps_both_changes(self, shadow_io: ShadowIO) -> None:
+        """update() は競合時に最新を読み直して変更を適用し直す"""
+        calls = []
+
+        def add_weekly(data) -> None:
+            if not calls:
+                # 1回目の変更中に別のエージェントが monthly を更新
+                def add_monthly(other) -> None:
+                    _level_files(other, "monthly").append("W0001.txt")
+
+                shadow_io.update(add_monthly)
+            calls.append(1)
+            _weekly_files(data).append("L00001.txt")
+
+        shadow_io.update(add_weekly)
+
+        data = shadow_io.load_or_create()
+        assert len(calls) == 2
+        assert _weekly_files(data) == ["L00001.txt"]
+        assert _level_files(data, "monthly") == ["W0001.txt"]
+        assert data["metadata"]["revision"] == 2
+
+    @pytest.mark.integration
+    def test_update_within_session_is_deferred(self, shadow_io: ShadowIO) -> None:
+        """セッション中の update() はセッションの文書を変更し、commit で1回だけ保存"""
+        with shadow_io.session():
+            shadow_io.update(lambda d: _weekly_files(d).append("a.txt"))
+            shadow_io.update(lambda d: _weekly_files(d).append("b.txt"))
+
+        data = shadow_io.load_or_create()
+        assert _weekly_files(data) == ["a.txt", "b.txt"]
+        assert data["metadata"]["revision"] == 1
+
+
+class TestShadowIODeltaLog:
+    """差分ログ（delta_threshold > 0）による保存のテスト"""
+
+    @pytest.fixture
+    def shadow_io(self, temp_plugin_env: "TempPluginEnvironment") -> ShadowIO:
+        """差分ログが有効な ShadowIO（しきい値は十分大きい）"""
+        template = ShadowTemplate(levels=LEVEL_NAMES)
+        return ShadowIO(
+            temp_plugin_env.essences_path / "ShadowGrandDigest.txt",
+            template.get_template,
+            delta_threshold=1_000_000,
+        )
+
+    @staticmethod
+    def _append_op(name: str) -> list:
+        path = "/latest_digests/weekly/overall_digest/source_files/-"
+        return [{"op": "add", "path": path, "value": name}]
+
+    @pytest.mark.integration
+    def test_apply_delta_appends_without_rewrite(self, shadow_io: ShadowIO) -> None:
+        """ベースは書き直さず、読み込みはベース + 差分を返す"""
+        shadow_io.load_or_create()
+        base = shadow_io.shadow_digest_file.read_bytes()
+
+        assert shadow_io.apply_delta(self._append_op("L00001.txt")) == 1
+        assert shadow_io.apply_delta(self._append_op("L00002.txt")) == 2
+
+        assert shadow_io.shadow_digest_file.read_bytes() == base
+        data = shadow_io.load_or_create()
+        assert _weekly_files(data) == ["L00001.txt", "L00002.txt"]
+        assert data["metadata"]["revision"] == 2
+
+    @pytest.mark.integration
+    def test_full_save_compacts(self, shadow_io: ShadowIO) -> None:
+        """save() でベースへ書き戻し、差分ログは空になる"""
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+        data = shadow_io.load_or_create()
+        _level_files(data, "monthly").append("W0001.txt")
+
+        shadow_io.save(data, expected_revision=1)
+
+        assert not shadow_io.delta_log.has_records()
+        stored = json.loads(shadow_io.shadow_digest_file.read_text(encoding="utf-8"))
+        assert _weekly_files(stored) == ["L00001.txt"]
+        assert _level_files(stored, "monthly") == ["W0001.txt"]
+        assert stored["metadata"]["revision"] == 2
+
+    @pytest.mark.integration
+    def test_threshold_triggers_compaction(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """差分ログがしきい値を超えるとコンパクションする"""
+        template = ShadowTemplate(levels=LEVEL_NAMES)
+        shadow_file = temp_plugin_env.essences_path / "ShadowGrandDigest.txt"
+        shadow_io = ShadowIO(shadow_file, template.get_template, delta_threshold=1)
+
+        revision = shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        assert not shadow_io.delta_log.has_records()
+        stored = json.loads(shadow_file.read_text(encoding="utf-8"))
+        assert _weekly_files(stored) == ["L00001.txt"]
+        assert stored["metadata"]["revision"] == revision
+
+    @pytest.mark.integration
+    def test_compact_updates_base(self, shadow_io: ShadowIO) -> None:
+        """compact() でベースが最新になり、ベースだけを読んでも差分が見える"""
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        revision = shadow_io.compact()
+
+        assert not shadow_io.delta_log.has_records()
+        stored = json.loads(shadow_io.shadow_digest_file.read_text(encoding="utf-8"))
+        assert _weekly_files(stored) == ["L00001.txt"]
+        assert stored["metadata"]["revision"] == revision
+        assert shadow_io.compact() == revision  # 差分がなければ書き込まない
+
+    @pytest.mark.integration
+    def test_session_commits_one_delta(self, shadow_io: ShadowIO) -> None:
+        """セッション中の apply_delta() はコミット時に差分ログへ1行だけ追記する"""
+        shadow_io.load_or_create()
+        base = shadow_io.shadow_digest_file.read_bytes()
+
+        with shadow_io.session():
+            shadow_io.apply_delta(self._append_op("L00001.txt"))
+            shadow_io.apply_delta(self._append_op("L00002.txt"))
+            assert not shadow_io.delta_log.has_records()
+
+        assert shadow_io.shadow_digest_file.read_bytes() == base
+        assert len(shadow_io.delta_log.records()) == 1
+        data = shadow_io.load_or_create()
+        assert _weekly_files(data) == ["L00001.txt", "L00002.txt"]
+        assert data["metadata"]["revision"] == 1
+
+    @pytest.mark.integration
+    def test_session_with_full_save_compacts(self, shadow_io: ShadowIO) -> None:
+        """セッション中に save() があれば文書全体を保存し、差分ログは空になる"""
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        with shadow_io.session():
+            shadow_io.apply_delta(self._append_op("L00002.txt"))
+            shadow_io.update(lambda d: _level_files(d, "monthly").append("W0001.txt"))
+
+        assert not shadow_io.delta_log.has_records()
+        stored = json.loads(shadow_io.shadow_digest_file.read_text(encoding="utf-8"))
+        assert _weekly_files(stored) == ["L00001.txt", "L00002.txt"]
+        assert _level_files(stored, "monthly") == ["W0001.txt"]
+
+    @pytest.mark.integration
+    def test_conflict_detected(self, shadow_io: ShadowIO) -> None:
+        """読み込み後に差分が追記されていれば RevisionConflictError"""
+        from domain.exceptions import RevisionConflictError
+
+        data = shadow_io.load_or_create()
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        with pytest.raises(RevisionConflictError):
+            shadow_io.apply_delta(self._append_op("L00002.txt"), expected_revision=0)
+        _weekly_files(data).append("L00003.txt")
+        with pytest.raises(RevisionConflictError):
+            shadow_io.save(data, expected_revision=0)
+
+    @pytest.mark.integration
+    def test_disabled_falls_back_to_save(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """しきい値 0 では差分ログを使わず文書全体を保存する"""
+        template = ShadowTemplate(levels=LEVEL_NAMES)
+        shadow_file = temp_plugin_env.essences_path / "ShadowGrandDigest.txt"
+        shadow_io = ShadowIO(shadow_file, template.get_template)
+
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        assert not shadow_io.delta_enabled
+        assert not shadow_io.delta_log.path.exists()
+        stored = json.loads(shadow_file.read_text(encoding="utf-8"))
+        assert _weekly_files(stored) == ["L00001.txt"]
+
+    @pytest.mark.integration
+    def test_diagnostic_reads_merge_deltas(self, shadow_io: ShadowIO) -> None:
+        """read_stored_document（診断系の読み取り）もベース + 差分を返す"""
+        from application.storage import read_stored_document
+
+        essences = shadow_io.shadow_digest_file.parent
+        shadow_io.load_or_create()
+        assert read_stored_document(essences, "ShadowGrandDigest.txt", "json", "single") is None
+
+        shadow_io.apply_delta(self._append_op("L00001.txt"))
+
+        stored = read_stored_document(essences, "ShadowGrandDigest.txt", "json", "single")
+        assert stored is not None
+        assert _weekly_files(stored) == ["L00001.txt"]
@@ -139,7 +139,7 @@ class TestShadowIOTimestampProperties:
 
     @pytest.mark.property
     def test_save_updates_timestamp(self) -> None:
-        """saveでlast_updatedが更新される"""
+        """内容を変えたsaveでlast_updatedが更新される（変更のないsaveは書き込まれない）"""
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
             template = ShadowTemplate(LEVEL_NAMES)
@@ -153,7 +153,8 @@ class TestShadowIOTimestampProperties:
             # 確実に時刻差を出す
             time.sleep(0.02)
 
-            # 再保存
+            # 内容を変えて再保存
+            data1["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00001.txt")
             io.save(data1)
 
             # 再読み込み
@@ -164,7 +165,7 @@ class TestShadowIOTimestampProperties:
 
     @pytest.mark.property
     def test_multiple_saves_increment_timestamp(self) -> None:
-        """複数回のsaveでタイムスタンプが順次更新される"""
+        """内容を変えた複数回のsaveでタイムスタンプが順次更新される"""
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
             template = ShadowTemplate(LEVEL_NAMES)
@@ -174,8 +175,11 @@ class TestShadowIOTimestampProperties:
             timestamps = []
             data = io.load_or_create()
 
-            for _ in range(3):
+            for n in range(3):
                 time.sleep(0.02)
+                data["latest_digests"]["weekly"]["overall_digest"]["source_files"].append(
+                    f"L{n:05d}.txt"
+                )
                 io.save(data)
                 data = io.load_or_create()
                 timestamps.append(data["metadata"]["last_updated"])
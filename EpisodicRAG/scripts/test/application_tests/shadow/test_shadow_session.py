@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+shadow/shadow_session.py のユニットテスト
+=========================================
+
+ShadowSession（Unit of Work）の動作を検証。
+- セッション中の読み込み・保存の集約
+- 例外時のロールバック
+- ネストしたセッションの合流
+- カスケード処理が読み込み1回・保存1回で完了すること
+"""
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from application.config import DigestConfig
+from application.shadow import (
+    CascadeOrchestrator,
+    CascadeProcessor,
+    FileDetector,
+    ShadowIO,
+    ShadowSession,
+    ShadowTemplate,
+)
+from application.shadow.file_appender import FileAppender
+from application.shadow.placeholder_manager import PlaceholderManager
+from application.tracking import DigestTimesTracker
+from domain.constants import LEVEL_CONFIG, LEVEL_NAMES
+from infrastructure import load_json_with_template, save_json
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture
+def session_shadow_io(temp_plugin_env: "TempPluginEnvironment") -> ShadowIO:
+    """テスト用ShadowIO（Essences配下）"""
+    template = ShadowTemplate(levels=LEVEL_NAMES)
+    return ShadowIO(temp_plugin_env.essences_path / "ShadowGrandDigest.txt", template.get_template)
+
+
+@pytest.fixture
+def io_counters():
+    """ShadowIO の読み込み・保存回数を計測"""
+    with (
+        patch(
+            "application.shadow.shadow_io.load_json_with_template",
+            wraps=load_json_with_template,
+        ) as load_mock,
+        patch("infrastructure.revision.save_json", wraps=save_json) as save_mock,
+    ):
+        yield load_mock, save_mock
+
+
+# =============================================================================
+# ShadowSession 基本動作
+# =============================================================================
+
+
+class TestShadowSession:
+    """ShadowSession の基本動作テスト"""
+
+    @pytest.mark.unit
+    def test_session_returns_shadow_session(self, session_shadow_io: ShadowIO) -> None:
+        """session() は ShadowSession を返す"""
+        assert isinstance(session_shadow_io.session(), ShadowSession)
+
+    @pytest.mark.integration
+    def test_load_returns_same_document_within_session(
+        self, session_shadow_io: ShadowIO, io_counters
+    ) -> None:
+        """セッション中の load_or_create は同一オブジェクトを返し、読み込みは1回"""
+        load_mock, _ = io_counters
+        with session_shadow_io.session() as data:
+            assert session_shadow_io.load_or_create() is data
+            assert session_shadow_io.load_or_create() is data
+        assert load_mock.call_count == 1
+
+    @pytest.mark.integration
+    def test_saves_are_deferred_until_commit(
+        self, session_shadow_io: ShadowIO, io_counters
+    ) -> None:
+        """セッション中の save は遅延され、終了時に1回だけ書き込まれる"""
+        _, save_mock = io_counters
+        session_shadow_io.load_or_create()
+        save_mock.reset_mock()
+
+        with session_shadow_io.session() as data:
+            data["latest_digests"]["weekly"]["overall_digest"]["source_files"] = ["L00001.txt"]
+            session_shadow_io.save(data)
+            session_shadow_io.save(data)
+            assert save_mock.call_count == 0
+
+        assert save_mock.call_count == 1
+        with open(session_shadow_io.shadow_digest_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        assert saved["latest_digests"]["weekly"]["overall_digest"]["source_files"] == ["L00001.txt"]
+
+    @pytest.mark.integration
+    def test_no_write_without_changes(self, session_shadow_io: ShadowIO, io_counters) -> None:
+        """save が呼ばれなければ書き込みは発生しない"""
+        session_shadow_io.load_or_create()
+        _, save_mock = io_counters
+        save_mock.reset_mock()
+
+        with session_shadow_io.session():
+            session_shadow_io.load_or_create()
+
+        assert save_mock.call_count == 0
+
+    @pytest.mark.integration
+    def test_rollback_on_exception(self, session_shadow_io: ShadowIO) -> None:
+        """例外発生時はファイルを変更しない"""
+        session_shadow_io.load_or_create()
+        before = session_shadow_io.shadow_digest_file.read_text(encoding="utf-8")
+
+        with pytest.raises(RuntimeError):
+            with session_shadow_io.session() as data:
+                data["latest_digests"]["weekly"]["overall_digest"]["source_files"] = ["X.txt"]
+                session_shadow_io.save(data)
+                raise RuntimeError("boom")
+
+        assert session_shadow_io.shadow_digest_file.read_text(encoding="utf-8") == before
+        assert session_shadow_io.active_session is None
+
+    @pytest.mark.integration
+    def test_nested_session_joins_outer(self, session_shadow_io: ShadowIO, io_counters) -> None:
+        """ネストしたセッションは外側に合流し、外側の終了時にのみ保存する"""
+        load_mock, save_mock = io_counters
+        with session_shadow_io.session() as outer:
+            with session_shadow_io.session() as inner:
+                assert inner is outer
+                inner["latest_digests"]["weekly"]["overall_digest"]["source_files"] = ["L1.txt"]
+                session_shadow_io.save(inner)
+            assert save_mock.call_count == 0
+            assert session_shadow_io.active_session is not None
+
+        assert load_mock.call_count == 1
+        assert save_mock.call_count == 1
+
+    @pytest.mark.unit
+    def test_data_outside_session_raises(self, session_shadow_io: ShadowIO) -> None:
+        """開始前のセッションの data へのアクセスはエラー"""
+        with pytest.raises(RuntimeError):
+            _ = session_shadow_io.session().data
+
+
+# =============================================================================
+# カスケード処理での集約
+# =============================================================================
+
+
+class TestCascadeUsesSingleSession:
+    """カスケード処理が読み込み1回・保存1回で完了することを検証"""
+
+    @pytest.fixture
+    def components(self, temp_plugin_env: "TempPluginEnvironment", session_shadow_io: ShadowIO):
+        """カスケード処理に必要なコンポーネント群"""
+        config = DigestConfig()
+        level_hierarchy = {
+            level: {"source": cfg["source"], "next": cfg["next"]}
+            for level, cfg in LEVEL_CONFIG.items()
+        }
+        template = ShadowTemplate(list(LEVEL_CONFIG.keys()))
+        file_detector = FileDetector(config, DigestTimesTracker(config))
+        file_appender = FileAppender(
+            session_shadow_io, file_detector, template, level_hierarchy, PlaceholderManager()
+        )
+        processor = CascadeProcessor(
+            session_shadow_io, file_detector, template, level_hierarchy, file_appender
+        )
+        orchestrator = CascadeOrchestrator(
+            cascade_processor=processor,
+            file_detector=file_detector,
+            file_appender=file_appender,
+            level_hierarchy=level_hierarchy,
+        )
+
+        weekly_dir = temp_plugin_env.digests_path / LEVEL_CONFIG["weekly"]["dir"]
+        weekly_dir.mkdir(parents=True, exist_ok=True)
+        (weekly_dir / "W0001_test.txt").write_text("{}", encoding="utf-8")
+
+        session_shadow_io.load_or_create()
+        return processor, orchestrator
+
+    @pytest.mark.integration
+    def test_processor_cascade_single_load_and_save(self, components, io_counters) -> None:
+        """CascadeProcessor のカスケードは読み込み1回・保存1回"""
+        processor, _ = components
+        load_mock, save_mock = io_counters
+
+        processor.cascade_update_on_digest_finalize("weekly")
+
+        assert load_mock.call_count == 1
+        assert save_mock.call_count == 1
+        data = processor.shadow_io.load_or_create()
+        monthly = data["latest_digests"]["monthly"]["overall_digest"]
+        assert "W0001_test.txt" in monthly["source_files"]
+
+    @pytest.mark.integration
+    def test_orchestrator_cascade_single_load_and_save(self, components, io_counters) -> None:
+        """CascadeOrchestrator のカスケードは読み込み1回・保存1回"""
+        _, orchestrator = components
+        load_mock, save_mock = io_counters
+
+        result = orchestrator.execute_cascade("weekly")
+
+        assert result.success
+        assert load_mock.call_count == 1
+        assert save_mock.call_count == 1
+
+    @pytest.mark.integration
+    def test_cascade_failure_leaves_file_untouched(self, components) -> None:
+        """途中で失敗した場合 ShadowGrandDigest.txt は変更されない"""
+        processor, _ = components
+        shadow_file = processor.shadow_io.shadow_digest_file
+        before = shadow_file.read_text(encoding="utf-8")
+
+        with patch.object(processor, "clear_shadow_level", side_effect=RuntimeError("fail")):
+            with pytest.raises(RuntimeError):
+                processor.cascade_update_on_digest_finalize("weekly")
+
+        assert shadow_file.read_text(encoding="utf-8") == before
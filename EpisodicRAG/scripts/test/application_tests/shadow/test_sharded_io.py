@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+shadow/sharded_io.py のユニットテスト
+=====================================
+
+ShardedShadowIO（階層ごとの分割保存）と migrate_shadow_layout の動作を検証。
+- load_or_create() の形が単一ファイルと同一であること
+- load_level() が該当階層のファイルのみを読むこと
+- セッション・revision の扱い
+- 単一ファイル ⇔ 分割レイアウトの相互変換
+"""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from application.config import DigestConfig
+from application.grand import ShadowGrandDigestManager
+from application.shadow import ShadowTemplate, ShardedShadowIO, migrate_shadow_layout
+from domain.constants import DIGEST_LEVEL_NAMES
+from domain.exceptions import ConfigError
+from infrastructure.json_repository import safe_read_json
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+@pytest.fixture
+def shadow_file(temp_plugin_env: "TempPluginEnvironment") -> Path:
+    return temp_plugin_env.essences_path / "ShadowGrandDigest.txt"
+
+
+@pytest.fixture
+def sharded_io(shadow_file: Path) -> ShardedShadowIO:
+    return ShardedShadowIO(shadow_file, ShadowTemplate(DIGEST_LEVEL_NAMES).get_template)
+
+
+class TestShardedShadowIO:
+    """ShardedShadowIO のテスト"""
+
+    @pytest.mark.unit
+    def test_template_then_save_per_level(self, sharded_io: ShardedShadowIO) -> None:
+        """未作成ならテンプレートを返し、保存で階層ごとのファイルを作る"""
+        data = sharded_io.load_or_create()
+        assert list(data["latest_digests"]) == DIGEST_LEVEL_NAMES
+        assert not sharded_io.document.exists()
+
+        sharded_io.save(data)
+
+        assert sharded_io.document.items() == DIGEST_LEVEL_NAMES
+        assert not sharded_io.shadow_digest_file.exists()
+        reloaded = sharded_io.load_or_create()
+        assert reloaded["metadata"]["revision"] == 1
+        assert list(reloaded["latest_digests"]) == DIGEST_LEVEL_NAMES
+
+    @pytest.mark.unit
+    def test_update_rewrites_only_changed_level(self, sharded_io: ShardedShadowIO) -> None:
+        """1階層の変更ではその階層のファイルだけを書き直す"""
+        sharded_io.save(sharded_io.load_or_create())
+
+        def add_source(data):
+            data["latest_digests"]["monthly"]["overall_digest"]["source_files"] = ["W0001.txt"]
+
+        sharded_io.update(add_source)
+
+        assert sharded_io.document.last_written == ["monthly"]
+        assert sharded_io.load_level("monthly")["overall_digest"]["source_files"] == ["W0001.txt"]
+
+    @pytest.mark.unit
+    def test_load_level_reads_single_shard(self, sharded_io: ShardedShadowIO) -> None:
+        """load_level() は該当階層のファイルのみを読む"""
+        sharded_io.save(sharded_io.load_or_create())
+
+        with patch("infrastructure.sharded_json.safe_read_json", wraps=safe_read_json) as read_mock:
+            level = sharded_io.load_level("quarterly")
+
+        read_paths = [Path(call.args[0]).name for call in read_mock.call_args_list]
+        assert "quarterly.txt" in read_paths
+        assert not {"weekly.txt", "monthly.txt", "annual.txt"} & set(read_paths)
+        assert "overall_digest" in level
+        with pytest.raises(KeyError):
+            sharded_io.load_level("loop")
+
+    @pytest.mark.unit
+    def test_session_writes_once(self, sharded_io: ShardedShadowIO) -> None:
+        """セッション中の load_level() はメモリ上の文書を返し、保存は終了時の1回"""
+        sharded_io.save(sharded_io.load_or_create())
+
+        with sharded_io.session():
+            data = sharded_io.load_or_create()
+            data["latest_digests"]["weekly"]["overall_digest"]["source_files"] = ["L00001.txt"]
+            sharded_io.save(data)
+            assert sharded_io.load_level("weekly")["overall_digest"]["source_files"] == [
+                "L00001.txt"
+            ]
+            assert sharded_io.document.revision() == 1
+
+        assert sharded_io.document.revision() == 2
+        assert sharded_io.document.last_written == ["weekly"]
+
+    @pytest.mark.integration
+    def test_first_save_absorbs_single_file(
+        self, temp_plugin_env: "TempPluginEnvironment", sharded_io: ShardedShadowIO
+    ) -> None:
+        """未移行の ShadowGrandDigest.txt は初期値として読み、最初の保存で削除する"""
+        temp_plugin_env.create_shadow_digest(source_files=["L00001.txt"])
+
+        data = sharded_io.load_or_create()
+        assert data["latest_digests"]["weekly"]["overall_digest"]["source_files"] == ["L00001.txt"]
+        sharded_io.save(data)
+
+        assert not sharded_io.shadow_digest_file.exists()
+        assert sharded_io.load_level("weekly")["overall_digest"]["source_files"] == ["L00001.txt"]
+
+
+class TestShardedLayoutIntegration:
+    """shadow_layout = "sharded" でのマネージャー・カスケードの動作"""
+
+    @pytest.mark.integration
+    def test_manager_uses_sharded_io(
+        self, temp_plugin_env: "TempPluginEnvironment", monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ファイル追加とカスケードの結果が分割ファイルに保存される"""
+        monkeypatch.setenv("EPISODIC_RAG_SHADOW_LAYOUT", "sharded")
+        config = DigestConfig()
+        assert config.shadow_layout == "sharded"
+        manager = ShadowGrandDigestManager(config)
+        assert isinstance(manager._io, ShardedShadowIO)
+
+        loop = temp_plugin_env.loops_path / "L00001_test.txt"
+        loop.write_text(json.dumps({"content": "test"}), encoding="utf-8")
+        manager.add_files_to_shadow("weekly", [loop])
+
+        weekly = manager._io.load_level("weekly")
+        assert weekly["overall_digest"]["source_files"] == ["L00001_test.txt"]
+        assert manager.get_shadow_digest_for_level("weekly") is not None
+        assert not manager.shadow_digest_file.exists()
+
+
+class TestMigrateShadowLayout:
+    """migrate_shadow_layout のテスト"""
+
+    @pytest.mark.integration
+    def test_roundtrip(self, temp_plugin_env: "TempPluginEnvironment", shadow_file: Path) -> None:
+        """単一ファイル → 分割 → 単一ファイルで内容が変わらない"""
+        temp_plugin_env.create_shadow_digest(source_files=["L00001.txt", "L00002.txt"])
+        original = json.loads(shadow_file.read_text(encoding="utf-8"))
+        template = ShadowTemplate(DIGEST_LEVEL_NAMES).get_template
+
+        result = migrate_shadow_layout(shadow_file, template, "sharded", remove_source=True)
+        assert result == {
+            "target": "sharded",
+            "levels": len(original["latest_digests"]),
+            "revision": 1,
+            "removed_source": True,
+        }
+        assert not shadow_file.exists()
+
+        sharded_io = ShardedShadowIO(shadow_file, template)
+        assert sharded_io.load_level("weekly") == original["latest_digests"]["weekly"]
+
+        result = migrate_shadow_layout(shadow_file, template, "single", remove_source=True)
+        assert result["removed_source"] is True
+        assert not sharded_io.document.directory.exists()
+        restored = json.loads(shadow_file.read_text(encoding="utf-8"))
+        assert restored["metadata"].pop("revision") == 1
+        assert restored == original
+
+    @pytest.mark.integration
+    def test_keep_source(self, temp_plugin_env: "TempPluginEnvironment", shadow_file: Path) -> None:
+        """remove_source=False なら移行元を控えとして残し、以後の保存でも消さない"""
+        temp_plugin_env.create_shadow_digest(source_files=["L00001.txt"])
+        template = ShadowTemplate(DIGEST_LEVEL_NAMES).get_template
+
+        result = migrate_shadow_layout(shadow_file, template, "sharded", remove_source=False)
+        ShardedShadowIO(shadow_file, template).update(lambda data: None)
+
+        assert result["removed_source"] is False
+        assert shadow_file.exists()
+
+    @pytest.mark.unit
+    def test_unknown_target(self, shadow_file: Path) -> None:
+        """未知のレイアウトは ConfigError"""
+        with pytest.raises(ConfigError):
+            migrate_shadow_layout(shadow_file, ShadowTemplate(DIGEST_LEVEL_NAMES).get_template, "x")
@@ -0,0 +1 @@
+# Application/Storage tests
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+test_archiver.py
+================
+
+application/storage/archiver.py のテスト。
+処理済み・経過年数による対象の選択と、アーカイブ後の透過的な読み込み
+（ProvisionalLoader / 検索インデックス / 番号採番）をテスト。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from application.finalize import ProvisionalLoader
+from application.search import DigestSearchIndex
+from application.storage import ColdArchiver
+from domain.exceptions import ConfigError
+from interfaces.interface_helpers import get_next_digest_number
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+    from application.config import DigestConfig
+
+_OLD = "2020-03-01T00:00:00"
+
+
+def _write(
+    directory: Path,
+    name: str,
+    timestamp: str,
+    abstract: str,
+    source_files: Optional[List[str]] = None,
+) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    data = {
+        "overall_digest": {
+            "name": path.stem,
+            "timestamp": timestamp,
+            "source_files": source_files or [],
+            "digest_type": "テスト",
+            "keywords": ["archive"],
+            "abstract": abstract,
+            "impression": "所感",
+        }
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def archive_env(
+    temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"
+) -> "DigestConfig":
+    """L00001-2 は古く処理済み、L00003 は新しい、L00004 は古いが未処理
+
+    処理済み = W0001 の source_files に含まれる Loop と、M001 の source_files に含まれる W0001
+    """
+    loops = digest_config.loops_path
+    now = datetime.now().isoformat()
+    _write(loops, "L00001_古い.txt", _OLD, "氷河期の記録")
+    _write(loops, "L00002_古い.txt", _OLD, "古い記録")
+    _write(loops, "L00003_新しい.txt", now, "新しい記録")
+    _write(loops, "L00004_未処理.txt", _OLD, "未処理の記録")
+    _write(
+        digest_config.get_level_dir("weekly"),
+        "W0001_古い週.txt",
+        _OLD,
+        "古い週",
+        ["L00001_古い.txt", "L00002_古い.txt", "L00003_新しい.txt"],
+    )
+    _write(digest_config.get_level_dir("monthly"), "M001_月.txt", now, "月", ["W0001_古い週.txt"])
+    return digest_config
+
+
+class TestColdArchiver:
+    """ColdArchiver のテスト"""
+
+    @pytest.mark.integration
+    def test_selects_processed_and_old(self, archive_env: "DigestConfig") -> None:
+        """上位に処理済みで、内容の日時が min_age_years より古いファイルのみ対象"""
+        report = ColdArchiver(archive_env).archive(min_age_years=2, dry_run=True)
+
+        assert report.planned == {
+            "loop": {"2020": ["L00001_古い.txt", "L00002_古い.txt"]},
+            "weekly": {"2020": ["W0001_古い週.txt"]},
+        }
+        assert (archive_env.loops_path / "L00001_古い.txt").exists()
+        assert report.stats == {}
+
+    @pytest.mark.integration
+    def test_skipped_file_is_not_processed(self, archive_env: "DigestConfig") -> None:
+        """番号が処理済みの範囲内でも、上位の source_files にないファイルは対象外"""
+        _write(archive_env.loops_path, "L00000_欠番.txt", _OLD, "取り込まれなかった記録")
+
+        planned = ColdArchiver(archive_env).plan(min_age_years=2)
+
+        assert [p.name for p in planned["loop"]["2020"]] == ["L00001_古い.txt", "L00002_古い.txt"]
+
+    @pytest.mark.integration
+    def test_grand_digest_source_files(self, archive_env: "DigestConfig") -> None:
+        """GrandDigest にだけ残っている確定済みダイジェストの source_files も処理済みとみなす"""
+        from application.grand import GrandDigestManager
+
+        (archive_env.get_level_dir("weekly") / "W0001_古い週.txt").unlink()
+        GrandDigestManager(archive_env).update_digest(
+            "weekly",
+            "W0001_古い週",
+            {"source_files": ["L00001_古い.txt"], "abstract": "古い週"},  # type: ignore[typeddict-item]
+        )
+
+        planned = ColdArchiver(archive_env).plan(min_age_years=2)
+
+        assert [p.name for p in planned["loop"]["2020"]] == ["L00001_古い.txt"]
+
+    @pytest.mark.integration
+    def test_archive_and_status(self, archive_env: "DigestConfig") -> None:
+        """元ファイルはバンドルへ移り、status で削減量が分かる"""
+        report = ColdArchiver(archive_env).archive(min_age_years=2, compression="gzip")
+
+        assert report.files == 3
+        assert not (archive_env.loops_path / "L00001_古い.txt").exists()
+        assert (archive_env.loops_path / ".archive" / "2020.tar.gz").is_file()
+        status = ColdArchiver(archive_env).status()
+        assert set(status["levels"]) == {"loop", "weekly"}
+        assert status["total"]["members"] == 3
+        assert status["total"]["original_bytes"] == sum(
+            stats.original_bytes for stats in report.stats.values()
+        )
+
+    @pytest.mark.unit
+    def test_config_section_and_validation(self) -> None:
+        """config の archive セクションを既定値にし、不正な値は ConfigError"""
+        config = MagicMock()
+        config.config = {"archive": {"min_age_years": -1, "compression": "lzma"}}
+        with pytest.raises(ConfigError):
+            ColdArchiver(config).archive()
+        config.config = {"archive": {"min_age_years": 1, "compression": "zip"}}
+        with pytest.raises(ConfigError):
+            ColdArchiver(config).archive()
+
+
+class TestTransparentReads:
+    """アーカイブ後も元のパスで読めること"""
+
+    @pytest.mark.integration
+    def test_provisional_loader_reads_archived_loops(self, archive_env: "DigestConfig") -> None:
+        """ProvisionalLoader.generate_from_source はアーカイブ済み Loop を読む"""
+        ColdArchiver(archive_env).archive(min_age_years=2)
+        loader = ProvisionalLoader(archive_env, MagicMock())
+
+        individuals = loader.generate_from_source(
+            "weekly", {"source_files": ["L00001_古い.txt", "L00003_新しい.txt"]}
+        )
+
+        assert [entry["source_file"] for entry in individuals] == [
+            "L00001_古い.txt",
+            "L00003_新しい.txt",
+        ]
+
+    @pytest.mark.integration
+    def test_search_keeps_archived_documents(self, archive_env: "DigestConfig") -> None:
+        """アーカイブしても検索結果に残り、再索引もされない"""
+        index = DigestSearchIndex(archive_env)
+        index.refresh()
+
+        ColdArchiver(archive_env).archive(min_age_years=2)
+        counts = DigestSearchIndex(archive_env).refresh()
+
+        assert counts["removed"] == 0
+        assert counts["indexed"] == 0
+        hits = DigestSearchIndex(archive_env).search("氷河期")
+        assert hits[0].file == "L00001_古い.txt"
+
+    @pytest.mark.integration
+    def test_next_digest_number_counts_archived(self, archive_env: "DigestConfig") -> None:
+        """アーカイブ済みの番号は再利用しない"""
+        ColdArchiver(archive_env).archive(min_age_years=2)
+
+        assert not list(archive_env.get_level_dir("weekly").glob("W*.txt"))
+        assert get_next_digest_number(archive_env.digests_path, "weekly") == 2
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+test_sqlite_backend.py
+======================
+
+storage.backend = "sqlite" のときのリポジトリ層の切り替えをテスト。
+ShadowIO / GrandDigestManager / DigestTimesTracker / DigestPersistence が
+テキストファイルの代わりに EpisodicRAG.db を読み書きすること、
+既存ファイルを初期値として読むこと、診断系の読み取りが DB を参照することを確認。
+"""
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from application.storage import get_digest_store, load_stored_document
+from domain.file_constants import GRAND_DIGEST_FILENAME, SHADOW_GRAND_DIGEST_FILENAME
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+    from application.config import DigestConfig
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """環境変数で SQLite バックエンドを選択"""
+    monkeypatch.setenv("EPISODIC_RAG_STORAGE_BACKEND", "sqlite")
+
+
+def _overall(name: str) -> dict:
+    return {"name": name, "abstract": f"{name} の要約", "keywords": ["設計"]}
+
+
+class TestBackendSelection:
+    """get_digest_store のテスト"""
+
+    @pytest.mark.unit
+    def test_json_backend_has_no_store(
+        self, digest_config: "DigestConfig", monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """デフォルトの json バックエンドでは None"""
+        monkeypatch.delenv("EPISODIC_RAG_STORAGE_BACKEND", raising=False)
+        assert digest_config.storage_backend == "json"
+        assert get_digest_store(digest_config) is None
+        assert load_stored_document(digest_config, GRAND_DIGEST_FILENAME) is None
+
+    @pytest.mark.unit
+    def test_sqlite_backend_store(
+        self, digest_config: "DigestConfig", sqlite_backend: None
+    ) -> None:
+        """sqlite バックエンドでは Essences/EpisodicRAG.db"""
+        store = get_digest_store(digest_config)
+        assert store is not None
+        assert store.db_path == digest_config.essences_path / "EpisodicRAG.db"
+
+
+class TestRepositoriesOnSqlite:
+    """sqlite バックエンドでのリポジトリ"""
+
+    @pytest.mark.integration
+    def test_grand_digest_in_database(
+        self, digest_config: "DigestConfig", sqlite_backend: None
+    ) -> None:
+        """GrandDigest の更新は DB に保存され、GrandDigest.txt に写しが書き出される"""
+        from application.grand import GrandDigestManager
+
+        manager = GrandDigestManager(digest_config)
+        manager.update_digest("weekly", "W0001_a", _overall("W0001_a"))
+        manager.update_digest("monthly", "M001_a", _overall("M001_a"))
+
+        data = GrandDigestManager(digest_config).load_or_create()
+        assert data["major_digests"]["weekly"]["overall_digest"]["name"] == "W0001_a"
+        assert data["metadata"]["revision"] == 2
+        stored = load_stored_document(digest_config, GRAND_DIGEST_FILENAME)
+        assert stored is not None and stored["major_digests"]["monthly"]["overall_digest"]
+        mirror = digest_config.essences_path / GRAND_DIGEST_FILENAME
+        assert json.loads(mirror.read_text(encoding="utf-8")) == stored
+
+    @pytest.mark.integration
+    def test_existing_file_seeds_database(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        sqlite_backend: None,
+    ) -> None:
+        """DB に未保存なら既存の GrandDigest.txt を取り込み、以後の更新は写しにも反映される"""
+        from application.grand import GrandDigestManager
+
+        grand_file = temp_plugin_env.create_grand_digest()
+        original = json.loads(grand_file.read_text(encoding="utf-8"))
+        manager = GrandDigestManager(digest_config)
+
+        assert manager.load_or_create()["major_digests"] == original["major_digests"]
+        assert manager.store is not None and manager.store.has_document(GRAND_DIGEST_FILENAME)
+
+        manager.update_digest("weekly", "W0001_a", _overall("W0001_a"))
+        mirror = json.loads(grand_file.read_text(encoding="utf-8"))
+        assert mirror["major_digests"]["weekly"]["overall_digest"]["name"] == "W0001_a"
+        assert mirror == load_stored_document(digest_config, GRAND_DIGEST_FILENAME)
+
+    @pytest.mark.integration
+    def test_grand_text_edits_reach_database(
+        self, digest_config: "DigestConfig", sqlite_backend: None
+    ) -> None:
+        """GrandDigest.txt を直接編集しても、次の読み込みで DB に反映される"""
+        from application.grand import GrandDigestManager
+
+        GrandDigestManager(digest_config).update_digest("weekly", "W0001_a", _overall("W0001_a"))
+        mirror = digest_config.essences_path / GRAND_DIGEST_FILENAME
+        edited = json.loads(mirror.read_text(encoding="utf-8"))
+        edited["major_digests"]["weekly"]["overall_digest"]["name"] = "W0001_edited"
+        mirror.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+
+        data = GrandDigestManager(digest_config).load_or_create()
+
+        assert data["major_digests"]["weekly"]["overall_digest"]["name"] == "W0001_edited"
+        stored = load_stored_document(digest_config, GRAND_DIGEST_FILENAME)
+        assert stored is not None
+        assert stored["major_digests"]["weekly"]["overall_digest"]["name"] == "W0001_edited"
+
+    @pytest.mark.integration
+    def test_shadow_in_database(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        sqlite_backend: None,
+    ) -> None:
+        """Shadow への追加は DB に保存され、ShadowGrandDigest.txt に写しが書き出される"""
+        from application.grand import ShadowGrandDigestManager
+
+        loop = temp_plugin_env.loops_path / "L00001_test.txt"
+        loop.write_text(json.dumps({"overall_digest": {"abstract": "x"}}), encoding="utf-8")
+
+        ShadowGrandDigestManager(digest_config).add_files_to_shadow("weekly", [loop])
+
+        overall = ShadowGrandDigestManager(digest_config).get_shadow_digest_for_level("weekly")
+        assert overall is not None
+        assert overall["source_files"] == ["L00001_test.txt"]
+        mirror = digest_config.essences_path / SHADOW_GRAND_DIGEST_FILENAME
+        assert json.loads(mirror.read_text(encoding="utf-8")) == load_stored_document(
+            digest_config, SHADOW_GRAND_DIGEST_FILENAME
+        )
+
+    @pytest.mark.integration
+    def test_shadow_text_edits_reach_database(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        sqlite_backend: None,
+    ) -> None:
+        """エージェントが ShadowGrandDigest.txt を直接編集しても、次の読み込みで DB に反映される"""
+        from application.grand import ShadowGrandDigestManager
+
+        loop = temp_plugin_env.loops_path / "L00001_test.txt"
+        loop.write_text(json.dumps({"overall_digest": {"abstract": "x"}}), encoding="utf-8")
+        ShadowGrandDigestManager(digest_config).add_files_to_shadow("weekly", [loop])
+
+        mirror = digest_config.essences_path / SHADOW_GRAND_DIGEST_FILENAME
+        edited = json.loads(mirror.read_text(encoding="utf-8"))
+        edited["latest_digests"]["weekly"]["overall_digest"]["source_files"].append(
+            "L00002_edit.txt"
+        )
+        mirror.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+
+        overall = ShadowGrandDigestManager(digest_config).get_shadow_digest_for_level("weekly")
+        assert overall is not None
+        assert overall["source_files"] == ["L00001_test.txt", "L00002_edit.txt"]
+        stored = load_stored_document(digest_config, SHADOW_GRAND_DIGEST_FILENAME)
+        assert stored is not None
+        assert stored["latest_digests"]["weekly"]["overall_digest"]["source_files"][-1] == (
+            "L00002_edit.txt"
+        )
+
+    @pytest.mark.integration
+    def test_digest_times_in_database(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        sqlite_backend: None,
+    ) -> None:
+        """digest_times はレベルごとの行に保存され、未記録のレベルはデフォルト値"""
+        from application.tracking import DigestTimesTracker
+
+        DigestTimesTracker(digest_config).update_direct("loop", 12)
+        DigestTimesTracker(digest_config).save_digest_number("weekly", 3)
+
+        times = DigestTimesTracker(digest_config).load_or_create()
+        assert times["loop"]["last_processed"] == 12
+        assert times["weekly"]["last_processed"] == 3
+        assert times["monthly"]["last_processed"] is None
+        assert not (temp_plugin_env.persistent_config_dir / "last_digest_times.json").exists()
+
+    @pytest.mark.integration
+    def test_regular_digest_recorded(
+        self, digest_config: "DigestConfig", sqlite_backend: None
+    ) -> None:
+        """確定した RegularDigest はテキストファイルと DB の両方に保存される"""
+        from application.finalize.persistence import DigestPersistence
+        from application.grand import GrandDigestManager, ShadowGrandDigestManager
+        from application.tracking import DigestTimesTracker
+
+        persistence = DigestPersistence(
+            config=digest_config,
+            grand_digest_manager=GrandDigestManager(digest_config),
+            shadow_manager=ShadowGrandDigestManager(digest_config),
+            times_tracker=DigestTimesTracker(digest_config),
+        )
+        digest = {
+            "metadata": {"digest_level": "weekly"},
+            "overall_digest": {"name": "W0001_a", "source_files": ["L00001.txt"]},
+            "individual_digests": [{"source_file": "L00001.txt", "abstract": "a"}],
+        }
+
+        path = persistence.save_regular_digest("weekly", digest, "W0001_a")
+
+        assert path.exists()
+        store = get_digest_store(digest_config)
+        assert store is not None
+        assert store.find_digests_by_source("L00001.txt") == [("weekly", "W0001_a")]
+
+
+class TestDiagnosticsOnSqlite:
+    """診断系CLIが DB を参照すること"""
+
+    @pytest.mark.integration
+    def test_digest_readiness_reads_database(
+        self, digest_config: "DigestConfig", sqlite_backend: None
+    ) -> None:
+        """digest_readiness は DB の Shadow を読む"""
+        from application.shadow import ShadowTemplate
+        from interfaces.digest_readiness import DigestReadinessChecker
+
+        shadow = ShadowTemplate(["weekly"]).get_template()
+        shadow["latest_digests"]["weekly"]["overall_digest"] = {"source_files": ["L00001.txt"]}
+        store = get_digest_store(digest_config)
+        assert store is not None
+        store.save_document(SHADOW_GRAND_DIGEST_FILENAME, dict(shadow))
+
+        result = DigestReadinessChecker().check("weekly")
+
+        assert result.status == "ok"
+        assert result.source_count == 1
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+test_text_layout.py
+===================
+
+application/storage/text_layout.py のテスト。
+DB → テキストファイルの書き出しと、テキストファイル → DB の取り込みをテスト。
+"""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+
+import pytest
+
+from application.storage import TextLayoutExporter, TextLayoutImporter
+from domain.file_constants import GRAND_DIGEST_FILENAME, SHADOW_GRAND_DIGEST_FILENAME
+from infrastructure.sqlite_store import SqliteDigestStore, open_digest_store
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+    from application.config import DigestConfig
+
+
+def _digest(name: str, source: str) -> Dict[str, Any]:
+    return {
+        "metadata": {"digest_level": "weekly"},
+        "overall_digest": {"name": name, "source_files": [source]},
+        "individual_digests": [{"source_file": source, "abstract": name}],
+    }
+
+
+@pytest.fixture
+def store(digest_config: "DigestConfig") -> SqliteDigestStore:
+    return open_digest_store(digest_config.essences_path)
+
+
+class TestTextLayoutExporter:
+    """TextLayoutExporter のテスト"""
+
+    @pytest.mark.integration
+    def test_export_to_standard_layout(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        store: SqliteDigestStore,
+    ) -> None:
+        """文書・時刻・DB にのみある RegularDigest を通常の配置へ書き出す"""
+        store.save_document(GRAND_DIGEST_FILENAME, {"metadata": {}, "major_digests": {}})
+        store.save_time("weekly", "2025-01-01T00:00:00", 2)
+        store.save_regular_digest("weekly", "W0001_a", _digest("W0001_a", "L00001.txt"))
+        store.save_regular_digest("weekly", "W0002_b", _digest("W0002_b", "L00002.txt"))
+        weekly_dir = digest_config.get_level_dir("weekly")
+        weekly_dir.mkdir(parents=True, exist_ok=True)
+        (weekly_dir / "W0001_a.txt").write_text("{}", encoding="utf-8")
+
+        result = TextLayoutExporter(digest_config, store).export()
+
+        assert result.documents == [GRAND_DIGEST_FILENAME]
+        assert (result.digests, result.skipped_digests, result.times) == (1, 1, 1)
+        grand = json.loads((digest_config.essences_path / GRAND_DIGEST_FILENAME).read_text("utf-8"))
+        assert grand["metadata"]["revision"] == 1
+        times_file = temp_plugin_env.persistent_config_dir / "last_digest_times.json"
+        assert json.loads(times_file.read_text("utf-8"))["weekly"]["last_processed"] == 2
+        assert (weekly_dir / "W0001_a.txt").read_text(encoding="utf-8") == "{}"
+        restored = json.loads((weekly_dir / "W0002_b.txt").read_text(encoding="utf-8"))
+        assert restored == _digest("W0002_b", "L00002.txt")
+
+    @pytest.mark.integration
+    def test_export_skips_unchanged_files(
+        self, digest_config: "DigestConfig", store: SqliteDigestStore, tmp_path: Path
+    ) -> None:
+        """内容が同じファイルは書き直さず unchanged として数える"""
+        store.save_document(GRAND_DIGEST_FILENAME, {"metadata": {}, "major_digests": {}})
+        store.save_time("weekly", "2025-01-01T00:00:00", 2)
+        store.save_regular_digest("weekly", "W0001_a", _digest("W0001_a", "L00001.txt"))
+        exporter = TextLayoutExporter(digest_config, store)
+        first = exporter.export(output_dir=tmp_path, overwrite_digests=True)
+        grand_file = tmp_path / GRAND_DIGEST_FILENAME
+        written = grand_file.read_bytes()
+
+        second = exporter.export(output_dir=tmp_path, overwrite_digests=True)
+
+        assert (first.digests, first.unchanged) == (1, 0)
+        assert (second.digests, second.unchanged) == (0, 3)
+        assert second.documents == [GRAND_DIGEST_FILENAME]
+        assert grand_file.read_bytes() == written
+
+    @pytest.mark.integration
+    def test_export_to_output_dir(
+        self, digest_config: "DigestConfig", store: SqliteDigestStore, tmp_path: Path
+    ) -> None:
+        """output_dir 指定時はその配下に同じ名前で書き出す"""
+        store.save_document(SHADOW_GRAND_DIGEST_FILENAME, {"metadata": {}, "latest_digests": {}})
+        store.save_regular_digest("weekly", "W0001_a", _digest("W0001_a", "L00001.txt"))
+
+        result = TextLayoutExporter(digest_config, store).export(output_dir=tmp_path)
+
+        assert result.documents == [SHADOW_GRAND_DIGEST_FILENAME]
+        assert (tmp_path / SHADOW_GRAND_DIGEST_FILENAME).exists()
+        assert (tmp_path / "1_Weekly" / "W0001_a.txt").exists()
+        assert not (digest_config.essences_path / SHADOW_GRAND_DIGEST_FILENAME).exists()
+
+
+class TestTextLayoutImporter:
+    """TextLayoutImporter のテスト"""
+
+    @pytest.mark.integration
+    def test_import_then_export_roundtrip(
+        self,
+        temp_plugin_env: "TempPluginEnvironment",
+        digest_config: "DigestConfig",
+        store: SqliteDigestStore,
+        tmp_path: Path,
+    ) -> None:
+        """取り込んだ内容を書き出すと元のテキストファイルと同じ内容になる"""
+        temp_plugin_env.create_grand_digest()
+        temp_plugin_env.create_shadow_digest()
+        times_file = temp_plugin_env.persistent_config_dir / "last_digest_times.json"
+        times_file.write_text(
+            json.dumps({"loop": {"timestamp": "2025-01-01T00:00:00", "last_processed": 7}}),
+            encoding="utf-8",
+        )
+        weekly_dir = digest_config.get_level_dir("weekly")
+        weekly_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(1, 4):
+            digest = _digest(f"W000{i}_x", f"L0000{i}.txt")
+            (weekly_dir / f"W000{i}_x.txt").write_text(json.dumps(digest), encoding="utf-8")
+        (weekly_dir / "W0009_broken.txt").write_text("{not json", encoding="utf-8")
+
+        result = TextLayoutImporter(digest_config, store).import_layout()
+
+        assert result.documents == [SHADOW_GRAND_DIGEST_FILENAME, GRAND_DIGEST_FILENAME]
+        assert (result.digests, result.skipped_digests, result.times) == (3, 1, 1)
+        assert store.find_digests_by_source("L00002.txt") == [("weekly", "W0002_x")]
+        assert store.load_times()["loop"]["last_processed"] == 7
+
+        TextLayoutExporter(digest_config, store).export(output_dir=tmp_path)
+        original = json.loads(
+            (digest_config.essences_path / GRAND_DIGEST_FILENAME).read_text(encoding="utf-8")
+        )
+        exported = json.loads((tmp_path / GRAND_DIGEST_FILENAME).read_text(encoding="utf-8"))
+        exported["metadata"].pop("revision")
+        assert exported == original
+        assert json.loads((tmp_path / "1_Weekly" / "W0001_x.txt").read_text("utf-8")) == _digest(
+            "W0001_x", "L00001.txt"
+        )
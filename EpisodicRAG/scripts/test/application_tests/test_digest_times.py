@@ -237,6 +237,18 @@ class TestDigestTimesTracker:
         timestamp = datetime.fromisoformat(timestamp_str)
         assert timestamp is not None
 
+    @pytest.mark.integration
+    def test_same_number_is_not_rewritten(self, tracker) -> None:
+        """番号が変わらない（timestampだけが変わる）保存ではファイルを書き換えない"""
+        tracker.save_digest_number("weekly", 52)
+        before = tracker.last_digest_file.read_bytes()
+
+        tracker.save_digest_number("weekly", 52)
+        assert tracker.last_digest_file.read_bytes() == before
+
+        tracker.save_digest_number("weekly", 53)
+        assert tracker.load_or_create()["weekly"]["last_processed"] == 53
+
     @pytest.mark.integration
     def test_save_digest_number_preserves_other_levels(self, tracker) -> None:
         """save_digest_number()が他のレベルを保持"""
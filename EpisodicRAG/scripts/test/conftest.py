@@ -66,15 +66,47 @@ def reset_all_singletons() -> Generator[None, None, None]:
         - level_registry: レベル設定のシングルトン
         - file_naming: ファイル命名用レジストリ参照
         - error_formatter: エラーフォーマッタのデフォルトインスタンス
+        - json_read_cache: JSON読み込みキャッシュ
+        - json_codec: JSONコーデック（環境変数から再選択）
+        - file_index: ディレクトリ索引の共有インスタンス
+        - file_lock: ファイルロックマネージャ（競合メトリクス）
+        - revision: 記録済みのファイル revision
+        - sqlite_store: 共有の SQLite ストア（接続を閉じる）
+        - archive: アーカイブ索引・展開済みバンドルのキャッシュ
+        - content_hash: 保存済みファイルの内容ハッシュと書き込み・省略件数
+        - digest_headers: ヘッダー索引の共有インスタンス
+        - analysis_cache: このプロセスで使った分析キャッシュの登録
     """
     # テスト実行前：クリーンな状態で開始
     from domain.error_formatter import reset_error_formatter
     from domain.file_naming import reset_registry
     from domain.level_registry import reset_level_registry
+    from infrastructure.archive import reset_archive_cache
+    from infrastructure.digest_headers import reset_header_indexes
+    from infrastructure.file_index import reset_file_indexes
+    from infrastructure.file_lock import reset_lock_manager
+    from infrastructure.json_repository import (
+        reset_analysis_cache_tracking,
+        reset_json_codec,
+        reset_json_read_cache,
+        reset_write_stats,
+    )
+    from infrastructure.revision import reset_revision_cache
+    from infrastructure.sqlite_store import reset_digest_stores
 
     reset_level_registry()
     reset_registry()
     reset_error_formatter()
+    reset_json_read_cache()
+    reset_json_codec()
+    reset_file_indexes()
+    reset_lock_manager()
+    reset_revision_cache()
+    reset_digest_stores()
+    reset_archive_cache()
+    reset_write_stats()
+    reset_header_indexes()
+    reset_analysis_cache_tracking()
 
     yield  # テスト実行
 
@@ -82,6 +114,16 @@ def reset_all_singletons() -> Generator[None, None, None]:
     reset_level_registry()
     reset_registry()
     reset_error_formatter()
+    reset_json_read_cache()
+    reset_json_codec()
+    reset_file_indexes()
+    reset_lock_manager()
+    reset_revision_cache()
+    reset_digest_stores()
+    reset_archive_cache()
+    reset_write_stats()
+    reset_header_indexes()
+    reset_analysis_cache_tracking()
 
 
 # =============================================================================
@@ -185,6 +227,7 @@ def mock_persistent_config_dir(
             "infrastructure.config.persistent_path.get_persistent_config_dir",
             "infrastructure.config.get_persistent_config_dir",
             "application.tracking.digest_times.get_persistent_config_dir",
+            "application.storage.text_layout.get_persistent_config_dir",
         ]
 
         # get_config_path() のパッチ対象
@@ -207,6 +250,19 @@ def mock_persistent_config_dir(
         yield
 
 
+@pytest.fixture(autouse=True)
+def isolate_lock_directory(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    ロックファイルを一時ディレクトリに置く
+
+    本番の ~/.claude/plugins/.episodicrag/.locks を使わないようにする。
+    サブプロセスで実行する CLI にも環境変数で引き継がれる。
+    """
+    monkeypatch.setenv("EPISODIC_RAG_LOCK_DIR", str(tmp_path_factory.getbasetemp() / "locks"))
+
+
 @pytest.fixture
 def digest_config(
     temp_plugin_env: TempPluginEnvironment,
@@ -13,11 +13,13 @@ import pytest
 
 from domain.file_naming import (
     extract_file_number,
+    extract_file_numbers,
     extract_number_only,
     extract_numbers_formatted,
     filter_files_after,
     find_max_number,
     format_digest_number,
+    partition_by_prefix,
 )
 
 # =============================================================================
@@ -250,6 +252,52 @@ class TestExtractNumbersFormatted:
         assert len(result) == 2
 
 
+# =============================================================================
+# バッチ関数のテスト
+# =============================================================================
+
+
+class TestExtractFileNumbers:
+    """extract_file_numbers のテスト"""
+
+    def test_matches_single_version(self) -> None:
+        """extract_file_number を個別に呼んだ結果と一致"""
+        names = ["L00001_a.txt", "W0002_b.txt", "MD01_c.txt", "readme.md", "", None, 123]
+        assert extract_file_numbers(names) == [extract_file_number(n) for n in names]  # type: ignore[arg-type]
+
+    def test_accepts_generator(self) -> None:
+        """任意のイテラブルを受け付ける"""
+        result = extract_file_numbers(f"W{i:04d}.txt" for i in range(3))
+        assert result == [("W", 0), ("W", 1), ("W", 2)]
+
+    def test_empty(self) -> None:
+        """空入力"""
+        assert extract_file_numbers([]) == []
+
+
+class TestPartitionByPrefix:
+    """partition_by_prefix のテスト"""
+
+    def test_groups_and_sorts(self) -> None:
+        """プレフィックスごとに番号昇順で分類"""
+        names = ["W0010_b.txt", "M001_x.txt", "W0002_a.txt", "notes.txt", "L00005.txt"]
+        result = partition_by_prefix(names)
+        assert result == {
+            "W": [(2, "W0002_a.txt"), (10, "W0010_b.txt")],
+            "M": [(1, "M001_x.txt")],
+            "L": [(5, "L00005.txt")],
+        }
+
+    def test_md_not_confused_with_m(self) -> None:
+        """MD は M より優先してマッチ"""
+        result = partition_by_prefix(["MD01_a.txt", "M001_b.txt"])
+        assert result == {"MD": [(1, "MD01_a.txt")], "M": [(1, "M001_b.txt")]}
+
+    def test_non_string_skipped(self) -> None:
+        """非文字列要素は除外"""
+        assert partition_by_prefix([None, 42, "W0001.txt"]) == {"W": [(1, "W0001.txt")]}  # type: ignore[list-item]
+
+
 # =============================================================================
 # エッジケースのテスト
 # =============================================================================
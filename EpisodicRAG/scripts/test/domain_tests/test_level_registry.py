@@ -260,6 +260,29 @@ class TestLevelRegistry:
         # パイプで区切られている
         assert "|" in pattern
 
+    @pytest.mark.unit
+    def test_prefix_pattern_cached(self) -> None:
+        """パターン文字列とコンパイル済み正規表現はキャッシュされる"""
+        registry = LevelRegistry()
+        assert registry.build_prefix_pattern() is registry.build_prefix_pattern()
+        assert registry.file_number_regex is registry.file_number_regex
+
+    @pytest.mark.unit
+    def test_register_invalidates_prefix_cache(self) -> None:
+        """レベル登録でキャッシュが無効化され、新しいプレフィックスを認識する"""
+        registry = LevelRegistry()
+        old_regex = registry.file_number_regex
+        assert registry.file_number_regex.search("Z001_custom.txt") is None
+
+        metadata = LevelMetadata("custom", "Z", 3, "9_Custom", "weekly", None)
+        registry._register("custom", metadata, StandardLevelBehavior(metadata))
+
+        assert "Z" in registry.build_prefix_pattern()
+        assert registry.file_number_regex is not old_regex
+        match = registry.file_number_regex.search("Z001_custom.txt")
+        assert match is not None
+        assert (match.group(1), int(match.group(2))) == ("Z", 1)
+
     @pytest.mark.unit
     def test_get_behavior_unknown_level(self) -> None:
         """不明なレベルでConfigError"""
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+test_analysis_cache.py
+======================
+
+infrastructure/analysis_cache.py と json_repository/invalidation.py の単体テスト。
+フィンガープリントの一致・不一致、更新直後の入力の扱い、
+永続化層の書き込みによるキャッシュの破棄をテスト。
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from infrastructure.analysis_cache import AnalysisCache
+from infrastructure.file_index import RACY_WINDOW_NS
+from infrastructure.journal import AppendOnlyJournal
+from infrastructure.json_repository import save_json
+from infrastructure.sqlite_store import open_digest_store
+
+
+def _settle(*paths: Path) -> None:
+    """mtime を過去に設定（racyウィンドウ外にする）"""
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    for path in paths:
+        os.utime(path, ns=(past, past))
+
+
+@pytest.fixture
+def essences(tmp_path: Path) -> Path:
+    """入力ファイルを1つ持つ Essences ディレクトリ"""
+    directory = tmp_path / "Essences"
+    directory.mkdir()
+    (directory / "ShadowGrandDigest.txt").write_text("{}", encoding="utf-8")
+    _settle(directory / "ShadowGrandDigest.txt", directory)
+    return directory
+
+
+class TestAnalysisCache:
+    """AnalysisCache のテスト"""
+
+    @pytest.mark.unit
+    def test_round_trip(self, essences: Path) -> None:
+        """入力が変わらなければ保存した値を返す（別インスタンスでも）"""
+        inputs = [essences / "ShadowGrandDigest.txt"]
+        cache = AnalysisCache(essences)
+        fingerprint = cache.fingerprint(inputs)
+
+        cache.put("check", fingerprint, {"count": 3})
+
+        other = AnalysisCache(essences)
+        assert other.get("check", other.fingerprint(inputs)) == {"count": 3}
+        assert other.get("unknown", other.fingerprint(inputs)) is None
+
+    @pytest.mark.unit
+    def test_changed_input_misses(self, essences: Path) -> None:
+        """入力ファイルが変更されると一致しない"""
+        shadow = essences / "ShadowGrandDigest.txt"
+        cache = AnalysisCache(essences)
+        cache.put("check", cache.fingerprint([shadow]), 1)
+
+        shadow.write_text('{"x": 1}', encoding="utf-8")
+        _settle(shadow)
+
+        assert cache.get("check", cache.fingerprint([shadow])) is None
+
+    @pytest.mark.unit
+    def test_racy_input_is_not_cached(self, essences: Path) -> None:
+        """更新直後の入力があればフィンガープリントを作らない"""
+        shadow = essences / "ShadowGrandDigest.txt"
+        shadow.write_text('{"x": 1}', encoding="utf-8")
+        cache = AnalysisCache(essences)
+
+        assert cache.fingerprint([shadow]) is None
+        cache.put("check", None, 1)
+        assert not cache.cache_file.exists()
+
+    @pytest.mark.unit
+    def test_environment_is_part_of_fingerprint(
+        self, essences: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """EPISODIC_RAG_* 環境変数が変わると一致しない"""
+        inputs = [essences / "ShadowGrandDigest.txt"]
+        cache = AnalysisCache(essences)
+        before = cache.fingerprint(inputs)
+
+        monkeypatch.setenv("EPISODIC_RAG_STORAGE_BACKEND", "sqlite")
+
+        assert cache.fingerprint(inputs) != before
+
+    @pytest.mark.unit
+    def test_undecodable_value_misses(self, essences: Path) -> None:
+        """decode できない値はミス扱い"""
+        inputs = [essences / "ShadowGrandDigest.txt"]
+        cache = AnalysisCache(essences)
+        fingerprint = cache.fingerprint(inputs)
+        cache.put("check", fingerprint, {"unexpected": 1})
+
+        assert cache.get("check", fingerprint, lambda value: value["count"]) is None
+
+
+class TestInvalidation:
+    """永続化層の書き込みによる破棄のテスト"""
+
+    @staticmethod
+    def _filled_cache(essences: Path) -> AnalysisCache:
+        cache = AnalysisCache(essences)
+        cache.put("check", cache.fingerprint([essences / "ShadowGrandDigest.txt"]), 1)
+        assert cache.cache_file.exists()
+        return cache
+
+    @pytest.mark.unit
+    def test_save_json_in_essences(self, essences: Path) -> None:
+        """Essences への save_json でキャッシュが削除される"""
+        cache = self._filled_cache(essences)
+
+        save_json(essences / "GrandDigest.txt", {})
+
+        assert not cache.cache_file.exists()
+
+    @pytest.mark.unit
+    def test_save_json_elsewhere_drops_tracked_cache(self, essences: Path, tmp_path: Path) -> None:
+        """このプロセスで使ったキャッシュは Essences の外への書き込みでも削除される"""
+        cache = self._filled_cache(essences)
+
+        save_json(tmp_path / "config" / "last_digest_times.json", {})
+
+        assert not cache.cache_file.exists()
+
+    @pytest.mark.unit
+    def test_derived_cache_writes_keep_cache(self, essences: Path, tmp_path: Path) -> None:
+        """ドットで始まるディレクトリ（索引等）への書き込みでは削除しない"""
+        cache = self._filled_cache(essences)
+
+        save_json(tmp_path / ".file_index" / "manifest.json", {})
+
+        assert cache.cache_file.exists()
+
+    @pytest.mark.unit
+    def test_journal_and_sqlite_writes(self, essences: Path) -> None:
+        """ジャーナルの追記と SQLite のコミットでも削除される"""
+        cache = self._filled_cache(essences)
+        AppendOnlyJournal(essences / "FinalizeJournal.jsonl").append({"op": "begin"})
+        assert not cache.cache_file.exists()
+
+        cache = self._filled_cache(essences)
+        open_digest_store(essences).save_time("weekly", "2026-01-01T00:00:00", 3)
+        assert not cache.cache_file.exists()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+test_archive.py
+===============
+
+infrastructure/archive.py のテスト。
+バンドルへの移動と元のパスでの読み込み、既存バンドルへの追加、集計をテスト。
+"""
+
+import json
+import os
+import tarfile
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from domain.exceptions import ConfigError
+from infrastructure.archive import (
+    archive_members,
+    archive_stats,
+    archived_names,
+    archived_signature,
+    read_archived_bytes,
+    read_archived_json,
+)
+from infrastructure.json_repository import try_read_json_from_file
+
+
+def _write_loops(directory: Path, numbers: List[int]) -> List[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for number in numbers:
+        path = directory / f"L{number:05d}_会話.txt"
+        data = {"overall_digest": {"abstract": "振り返り " * 200, "number": number}}
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+class TestArchiveMembers:
+    """archive_members / 読み込みのテスト"""
+
+    @pytest.mark.unit
+    def test_roundtrip_through_original_path(self, tmp_path: Path) -> None:
+        """移したファイルは元のパスで読め、元ファイルは削除される"""
+        paths = _write_loops(tmp_path, [1, 2])
+        original = paths[0].read_bytes()
+        signature = (paths[0].stat().st_mtime_ns, paths[0].stat().st_size)
+
+        stats = archive_members(tmp_path, {"2023": paths})
+
+        assert not paths[0].exists()
+        assert (tmp_path / ".archive" / "2023.tar.xz").is_file()
+        assert archived_names(tmp_path) == [p.name for p in paths]
+        assert read_archived_bytes(paths[0]) == original
+        assert archived_signature(paths[0]) == signature
+        assert try_read_json_from_file(paths[1])["overall_digest"]["number"] == 2
+        assert stats.members == 2
+        assert stats.saved_bytes > 0
+
+    @pytest.mark.unit
+    def test_bundle_is_plain_tar(self, tmp_path: Path) -> None:
+        """バンドルは標準の tar.gz として展開できる"""
+        paths = _write_loops(tmp_path, [1])
+
+        archive_members(tmp_path, {"2024": paths}, compression="gzip")
+
+        with tarfile.open(tmp_path / ".archive" / "2024.tar.gz", "r:gz") as tar:
+            assert tar.getnames() == [paths[0].name]
+
+    @pytest.mark.unit
+    def test_merge_into_existing_bundle(self, tmp_path: Path) -> None:
+        """同じ期間への追加は既存メンバーを保ったまま書き直す"""
+        archive_members(tmp_path, {"2023": _write_loops(tmp_path, [1])})
+        later = _write_loops(tmp_path, [2])
+
+        archive_members(tmp_path, {"2023": later})
+
+        assert archived_names(tmp_path) == ["L00001_会話.txt", "L00002_会話.txt"]
+        assert read_archived_json(tmp_path / "L00001_会話.txt") is not None
+        assert archive_stats(tmp_path).bundles == 1
+        assert archive_stats(tmp_path).members == 2
+
+    @pytest.mark.unit
+    def test_keep_source(self, tmp_path: Path) -> None:
+        """remove_source=False なら元ファイルを残す"""
+        paths = _write_loops(tmp_path, [1])
+
+        archive_members(tmp_path, {"2023": paths}, remove_source=False)
+
+        assert paths[0].exists()
+
+    @pytest.mark.unit
+    def test_unknown_compression(self, tmp_path: Path) -> None:
+        """未知の圧縮方式は ConfigError"""
+        with pytest.raises(ConfigError):
+            archive_members(tmp_path, {"2023": _write_loops(tmp_path, [1])}, compression="zip")
+
+
+class TestArchiveReads:
+    """アーカイブがない・壊れている場合の読み込み"""
+
+    @pytest.mark.unit
+    def test_not_archived(self, tmp_path: Path) -> None:
+        """アーカイブがなければ None / 空"""
+        assert read_archived_bytes(tmp_path / "L00001_x.txt") is None
+        assert archived_signature(tmp_path / "L00001_x.txt") is None
+        assert archived_names(tmp_path) == []
+        assert try_read_json_from_file(tmp_path / "L00001_x.txt") is None
+        assert archive_stats(tmp_path).to_dict()["saved_bytes"] == 0
+
+    @pytest.mark.unit
+    def test_missing_bundle(self, tmp_path: Path) -> None:
+        """索引にあってもバンドルが読めなければ None"""
+        paths = _write_loops(tmp_path, [1])
+        archive_members(tmp_path, {"2023": paths})
+        bundle = tmp_path / ".archive" / "2023.tar.xz"
+        bundle.write_bytes(b"broken")
+        os.utime(bundle, ns=(1, 1))
+
+        assert read_archived_bytes(paths[0]) is None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+test_content_hash.py
+====================
+
+infrastructure/json_repository/content_hash.py と save_json(skip_unchanged=True) のテスト。
+キー順に依存しないハッシュ、揮発フィールドの無視、書き込み省略と件数をテスト。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.json_repository import (
+    content_hash,
+    get_write_stats,
+    save_json,
+    stored_content_hash,
+)
+from infrastructure.json_repository.read_cache import RACY_WINDOW_NS
+
+
+class TestContentHash:
+    """content_hash のテスト"""
+
+    @pytest.mark.unit
+    def test_key_order_independent(self) -> None:
+        """キーの挿入順が違っても同じハッシュ"""
+        a = {"x": 1, "nested": {"b": [1, 2], "a": "知性"}}
+        b = {"nested": {"a": "知性", "b": [1, 2]}, "x": 1}
+
+        assert content_hash(a) == content_hash(b)
+        assert content_hash(a) != content_hash({**a, "x": 2})
+
+    @pytest.mark.unit
+    def test_volatile_fields_ignored(self) -> None:
+        """揮発フィールドは無視し、元の dict は変更しない"""
+        data = {"metadata": {"last_updated": "2025-01-01", "version": "1.0"}}
+        other = {"metadata": {"last_updated": "2025-02-01", "version": "1.0"}}
+
+        assert content_hash(data) == content_hash(other)
+        assert data["metadata"]["last_updated"] == "2025-01-01"
+        assert content_hash(data, volatile_fields=()) != content_hash(other, volatile_fields=())
+
+
+class TestSaveJsonSkipUnchanged:
+    """save_json(skip_unchanged=True) のテスト"""
+
+    @pytest.mark.unit
+    def test_unchanged_write_skipped(self, tmp_path: Path) -> None:
+        """last_updated 以外が同じなら書き込まず、省略件数を数える"""
+        path = tmp_path / "GrandDigest.txt"
+        assert save_json(path, {"metadata": {"last_updated": "a"}, "v": 1}, skip_unchanged=True)
+        mtime = path.stat().st_mtime_ns
+
+        written = save_json(path, {"v": 1, "metadata": {"last_updated": "b"}}, skip_unchanged=True)
+
+        assert written is False
+        assert path.stat().st_mtime_ns == mtime
+        assert json.loads(path.read_text(encoding="utf-8"))["metadata"]["last_updated"] == "a"
+        assert get_write_stats() == {"written": 1, "skipped": 1}
+
+    @pytest.mark.unit
+    def test_changed_write_performed(self, tmp_path: Path) -> None:
+        """内容が変われば書き込む（skip_unchanged なしなら常に書き込む）"""
+        path = tmp_path / "data.json"
+        save_json(path, {"v": 1})
+
+        assert save_json(path, {"v": 2}, skip_unchanged=True) is True
+        assert save_json(path, {"v": 2}) is True
+        assert json.loads(path.read_text(encoding="utf-8")) == {"v": 2}
+
+    @pytest.mark.unit
+    def test_stored_hash_not_reread(self, tmp_path: Path) -> None:
+        """更新直後でないファイルのハッシュは記録済みで、ファイルを読み直さない"""
+        path = tmp_path / "data.json"
+        save_json(path, {"v": 1}, skip_unchanged=True)
+        past = time.time_ns() - RACY_WINDOW_NS * 100
+        os.utime(path, ns=(past, past))
+        assert stored_content_hash(path) == content_hash({"v": 1})
+
+        with patch.object(Path, "read_bytes", side_effect=AssertionError("re-read")):
+            assert stored_content_hash(path) == content_hash({"v": 1})
+
+    @pytest.mark.unit
+    def test_racy_overwrite_detected(self, tmp_path: Path) -> None:
+        """更新直後に同じ inode・mtime・サイズで上書きされても読み直す"""
+        path = tmp_path / "data.json"
+        save_json(path, {"v": 1}, skip_unchanged=True)
+        stat = os.stat(path)
+        path.write_text(path.read_text(encoding="utf-8").replace("1", "2"), encoding="utf-8")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert stored_content_hash(path) == content_hash({"v": 2})
+
+    @pytest.mark.unit
+    def test_external_change_detected(self, tmp_path: Path) -> None:
+        """外部で書き換えられたファイルは読み直して比較する"""
+        path = tmp_path / "data.json"
+        save_json(path, {"v": 1}, skip_unchanged=True)
+        path.write_text('{"v": 3, "extra": true}', encoding="utf-8")
+
+        assert save_json(path, {"v": 1}, skip_unchanged=True) is True
+        assert stored_content_hash(tmp_path / "missing.json") is None
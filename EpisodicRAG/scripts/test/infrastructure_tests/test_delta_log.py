@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+test_delta_log.py
+=================
+
+infrastructure/delta_log.py のテスト。
+差分の追記と合成（ベースより古いレコードの無視）、しきい値の設定をテスト。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from domain.exceptions import ConfigError
+from infrastructure.delta_log import DeltaLog, resolve_delta_threshold
+
+
+def _add(value: str) -> list:
+    return [{"op": "add", "path": "/files/-", "value": value}]
+
+
+class TestDeltaLog:
+    """DeltaLog のテスト"""
+
+    @pytest.mark.unit
+    def test_apply_newer_records(self, tmp_path: Path) -> None:
+        """ベースの revision より新しいレコードだけを順に適用する"""
+        log = DeltaLog(tmp_path / "doc.delta.jsonl")
+        log.append(2, _add("a"))
+        log.append(3, _add("b"))
+        log.append(4, _add("c"))
+
+        # revision 3 のベース（a, b はコンパクション済み）
+        result = log.apply({"metadata": {"revision": 3}, "files": ["a", "b"]})
+
+        assert result == {"metadata": {"revision": 4}, "files": ["a", "b", "c"]}
+        assert log.last_revision() == 4
+
+    @pytest.mark.unit
+    def test_empty_and_truncate(self, tmp_path: Path) -> None:
+        """ログがなければ何もしない。truncate で空になる"""
+        log = DeltaLog(tmp_path / "doc.delta.jsonl")
+        document = {"metadata": {"revision": 1}, "files": []}
+
+        assert log.apply(document) is document
+        assert log.size() == 0
+        log.append(2, _add("a"))
+        assert log.has_records()
+        log.truncate()
+        assert not log.has_records()
+        assert log.last_revision() == 0
+
+
+class TestResolveDeltaThreshold:
+    """resolve_delta_threshold のテスト"""
+
+    @pytest.mark.unit
+    def test_env_then_config_then_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """環境変数 > storage.shadow_delta_threshold > 0"""
+        config = {"storage": {"shadow_delta_threshold": 4096}}
+        assert resolve_delta_threshold(None) == 0
+        assert resolve_delta_threshold(config) == 4096
+        monkeypatch.setenv("EPISODIC_RAG_SHADOW_DELTA_THRESHOLD", "128")
+        assert resolve_delta_threshold(config) == 128
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value", [-1, "many", True])
+    def test_invalid_value(self, value) -> None:
+        """0 以上の整数でなければ ConfigError"""
+        with pytest.raises(ConfigError):
+            resolve_delta_threshold({"storage": {"shadow_delta_threshold": value}})
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+test_digest_headers.py
+======================
+
+infrastructure/digest_headers.py のテスト。
+部分読み込み（本体を読まない）、チャンク境界、ヘッダー索引の再利用と無効化をテスト。
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure import digest_headers
+from infrastructure.digest_headers import (
+    DigestHeaderIndex,
+    read_digest_header,
+    read_json_header,
+)
+
+
+def _regular_digest(abstract: str = "設計の記録", individuals: int = 200) -> dict:
+    return {
+        "metadata": {"digest_level": "weekly", "digest_number": "0001"},
+        "overall_digest": {"name": "W0001", "keywords": ["a", "b"], "abstract": abstract},
+        "individual_digests": [{"source_file": f"L{i:05d}.txt"} for i in range(individuals)],
+    }
+
+
+def _write(path: Path, data: dict, old: bool = True) -> Path:
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    if old:
+        # 更新直後のファイルは索引に載らないため、mtime を過去にする
+        os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    return path
+
+
+class TestReadJsonHeader:
+    """read_json_header のテスト"""
+
+    @pytest.mark.unit
+    def test_stops_before_body(self, tmp_path: Path) -> None:
+        """ヘッダーのキーだけを返し、本体の手前で読むのをやめる"""
+        data = _regular_digest()
+        path = _write(tmp_path / "W0001_x.txt", data)
+
+        with patch.object(digest_headers, "_CHUNK_SIZE", 64):
+            result = read_json_header(path)
+
+        assert result is not None
+        header, body_offset = result
+        assert header == {"metadata": data["metadata"], "overall_digest": data["overall_digest"]}
+        assert path.read_bytes()[body_offset:].lstrip(b", \n").startswith(b'"individual_digests"')
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7])
+    def test_chunk_boundaries(self, tmp_path: Path, chunk_size: int) -> None:
+        """マルチバイト文字・数値がチャンク境界をまたいでも正しく読む"""
+        data = {"n": 1234567, "overall_digest": {"abstract": "知性" * 5, "x": [1.5, None]}}
+        path = _write(tmp_path / "L00001_x.txt", data)
+
+        with patch.object(digest_headers, "_CHUNK_SIZE", chunk_size):
+            result = read_json_header(path, keys=("n", "overall_digest"))
+
+        assert result is not None
+        assert result[0] == data
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content", ["{ invalid json }", "[1, 2]", "", '{"a": 1'])
+    def test_invalid_returns_none(self, tmp_path: Path, content: str) -> None:
+        """JSON オブジェクトでない・壊れている場合は None"""
+        path = tmp_path / "L00001_x.txt"
+        path.write_text(content, encoding="utf-8")
+
+        assert read_json_header(path) is None
+        assert read_json_header(tmp_path / "missing.txt") is None
+
+
+class TestDigestHeaderIndex:
+    """DigestHeaderIndex のテスト"""
+
+    @pytest.mark.integration
+    def test_index_reused_across_instances(self, tmp_path: Path) -> None:
+        """保存した索引があればファイルを開かない"""
+        level_dir = tmp_path / "1_Weekly"
+        level_dir.mkdir()
+        _write(level_dir / "W0001_x.txt", _regular_digest())
+        index = DigestHeaderIndex(level_dir)
+        assert index.get("W0001_x.txt")["overall_digest"]["name"] == "W0001"
+        index.flush()
+
+        assert index.index_path.parent == tmp_path / ".digest_headers"
+        reopened = DigestHeaderIndex(level_dir)
+        with patch.object(digest_headers, "read_json_header") as reader:
+            header = reopened.get("W0001_x.txt")
+
+        reader.assert_not_called()
+        assert header["metadata"]["digest_number"] == "0001"
+        assert reopened.stats == {"hits": 1, "reads": 0}
+        assert reopened.body_offset("W0001_x.txt") > 0
+
+    @pytest.mark.integration
+    def test_index_directory_is_git_ignored(self, tmp_path: Path) -> None:
+        """索引ディレクトリは .gitignore で除外し、絶対パスを記録しない"""
+        level_dir = tmp_path / "1_Weekly"
+        level_dir.mkdir()
+        _write(level_dir / "W0001_x.txt", _regular_digest())
+        index = DigestHeaderIndex(level_dir)
+        index.get("W0001_x.txt")
+        index.flush()
+
+        gitignore = index.index_path.parent / ".gitignore"
+        assert gitignore.read_text(encoding="utf-8").splitlines()[-1] == "*"
+        stored = json.loads(index.index_path.read_text(encoding="utf-8"))
+        assert stored["directory"] == "1_Weekly"
+        assert str(tmp_path) not in index.index_path.read_text(encoding="utf-8")
+
+    @pytest.mark.integration
+    def test_rewritten_file_reread(self, tmp_path: Path) -> None:
+        """書き換えられたファイルは読み直す。更新直後のファイルは索引に載せない"""
+        path = _write(tmp_path / "W0001_x.txt", _regular_digest("古い"))
+        index = DigestHeaderIndex(tmp_path)
+        index.get(path.name)
+
+        _write(path, _regular_digest("新しい", individuals=3), old=False)
+
+        assert index.get(path.name)["overall_digest"]["abstract"] == "新しい"
+        assert index.get(path.name)["overall_digest"]["abstract"] == "新しい"
+        assert index.stats == {"hits": 0, "reads": 3}
+
+    @pytest.mark.integration
+    def test_non_txt_and_invalid(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """.txt 以外は None、壊れたファイルは警告して None"""
+        (tmp_path / "W0001_x.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "W0002_x.txt").write_text("{ invalid", encoding="utf-8")
+
+        assert read_digest_header(tmp_path / "W0001_x.json") is None
+        assert read_digest_header(tmp_path / "W0002_x.txt") is None
+        assert "Failed to parse W0002_x.txt as JSON (skipped)" in caplog.text
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+test_directory_scan.py
+======================
+
+infrastructure/directory_scan.py の単体テスト。
+glob / extract_file_number ベースの結果との一致、一括解析のフォールバック、
+存在しないディレクトリの扱いをテスト。
+"""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from domain.file_naming import extract_file_number
+from infrastructure.directory_scan import scan_directory
+
+
+def _make_loops(directory: Path, numbers: List[int]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for n in numbers:
+        (directory / f"L{n:05d}_test.txt").write_text("{}", encoding="utf-8")
+
+
+@pytest.fixture
+def loops_dir(tmp_path: Path) -> Path:
+    """Loopファイル入りのディレクトリ"""
+    directory = tmp_path / "Loops"
+    _make_loops(directory, [3, 1, 2, 10, 5])
+    (directory / "Lnotes.txt").write_text("x", encoding="utf-8")
+    (directory / "README.md").write_text("x", encoding="utf-8")
+    return directory
+
+
+class TestScanDirectory:
+    """glob ベースの実装と同じ結果を返すことを検証"""
+
+    @pytest.mark.unit
+    def test_names_match_glob(self, loops_dir: Path) -> None:
+        """names は glob と同じ集合"""
+        scan = scan_directory(loops_dir, "L*.txt")
+
+        assert sorted(scan.names) == sorted(p.name for p in loops_dir.glob("L*.txt"))
+        assert scan.count() == 6
+        assert scan.exists
+
+    @pytest.mark.unit
+    def test_numbers_match_extract_file_number(self, loops_dir: Path) -> None:
+        """番号は extract_file_number と一致し、番号なしは -1"""
+        scan = scan_directory(loops_dir, "L*.txt")
+
+        for name, number in zip(scan.names, scan.numbers):
+            parsed = extract_file_number(name)
+            assert number == (parsed[1] if parsed is not None else -1)
+        assert scan.max_number() == 10
+
+    @pytest.mark.unit
+    def test_names_after(self, loops_dir: Path) -> None:
+        """names_after は番号付きファイルのうち指定番号より後をファイル名順で返す"""
+        scan = scan_directory(loops_dir, "L*.txt")
+
+        assert scan.names_after(2) == ["L00003_test.txt", "L00005_test.txt", "L00010_test.txt"]
+        assert len(scan.names_after(-1)) == 5
+
+    @pytest.mark.unit
+    def test_complex_pattern_uses_fnmatch(self, loops_dir: Path) -> None:
+        """「* が1つ」でないパターンも fnmatch と同じ判定"""
+        scan = scan_directory(loops_dir, "L0000?_*.txt")
+
+        assert sorted(scan.names) == sorted(p.name for p in loops_dir.glob("L0000?_*.txt"))
+
+    @pytest.mark.unit
+    def test_mixed_levels_all_parsed(self, tmp_path: Path) -> None:
+        """異なるプレフィックスが混じっても全て解析される"""
+        for name in ["W0001_a.txt", "MD01_b.txt", "M002_c.txt"]:
+            (tmp_path / name).write_text("{}", encoding="utf-8")
+
+        scan = scan_directory(tmp_path, "*.txt")
+
+        assert dict(zip(scan.names, scan.numbers)) == {
+            "W0001_a.txt": 1,
+            "MD01_b.txt": 1,
+            "M002_c.txt": 2,
+        }
+
+    @pytest.mark.unit
+    def test_missing_directory(self, tmp_path: Path) -> None:
+        """存在しないディレクトリは空の結果"""
+        scan = scan_directory(tmp_path / "missing", "L*.txt")
+
+        assert not scan.exists
+        assert scan.count() == 0
+        assert scan.max_number() is None
+        assert scan.names_after(-1) == []
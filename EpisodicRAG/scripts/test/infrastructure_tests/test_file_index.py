@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+test_file_index.py
+==================
+
+infrastructure/file_index.py の単体テスト。
+glob ベースの結果との一致、マニフェストの永続化と再利用、
+インクリメンタル再構築をテスト。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from domain.file_naming import extract_file_number, filter_files_after
+from infrastructure.file_index import (
+    INDEX_DIR_NAME,
+    RACY_WINDOW_NS,
+    FileIndex,
+    get_file_index,
+)
+
+
+def _settle(directory: Path) -> None:
+    """ディレクトリのmtimeを過去に設定（racyウィンドウ外にする）"""
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    os.utime(directory, ns=(past, past))
+
+
+def _make_loops(directory: Path, numbers: List[int]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for n in numbers:
+        (directory / f"L{n:05d}_test.txt").write_text("{}", encoding="utf-8")
+
+
+@pytest.fixture
+def loops_dir(tmp_path: Path) -> Path:
+    """Loopファイル入りのディレクトリ"""
+    directory = tmp_path / "Loops"
+    _make_loops(directory, [3, 1, 2, 10, 5])
+    (directory / "Lnotes.txt").write_text("x", encoding="utf-8")
+    (directory / "README.md").write_text("x", encoding="utf-8")
+    _settle(directory)
+    return directory
+
+
+class TestFileIndexQueries:
+    """glob ベースの実装と同じ結果を返すことを検証"""
+
+    @pytest.mark.integration
+    def test_files_matches_sorted_glob(self, loops_dir: Path) -> None:
+        """files() は sorted(glob) と一致"""
+        assert FileIndex(loops_dir, "L*.txt").files() == sorted(loops_dir.glob("L*.txt"))
+
+    @pytest.mark.integration
+    def test_files_after_matches_filter(self, loops_dir: Path) -> None:
+        """files_after() は filter_files_after(sorted(glob)) と一致"""
+        index = FileIndex(loops_dir, "L*.txt")
+        expected = filter_files_after(sorted(loops_dir.glob("L*.txt")), 3)
+        assert index.files_after(3) == expected
+        assert [p.name for p in index.files_after(3)] == ["L00005_test.txt", "L00010_test.txt"]
+
+    @pytest.mark.integration
+    def test_max_and_count(self, loops_dir: Path) -> None:
+        """max_number() / count()"""
+        index = FileIndex(loops_dir, "L*.txt")
+        assert index.max_number() == 10
+        assert index.max_number("L") == 10
+        assert index.max_number("W") is None
+        assert index.count() == len(list(loops_dir.glob("L*.txt")))
+
+    @pytest.mark.integration
+    def test_missing_directory_is_empty(self, tmp_path: Path) -> None:
+        """存在しないディレクトリは空の索引"""
+        index = FileIndex(tmp_path / "missing", "L*.txt")
+        assert index.files() == []
+        assert index.count() == 0
+        assert index.max_number() is None
+        assert not (tmp_path / INDEX_DIR_NAME).exists()
+
+
+class TestFileIndexPersistence:
+    """マニフェストの永続化とインクリメンタル再構築"""
+
+    @pytest.mark.integration
+    def test_manifest_saved_in_parent(self, loops_dir: Path) -> None:
+        """マニフェストは親ディレクトリの .file_index/ に保存され、対象ディレクトリは汚さない"""
+        index = FileIndex(loops_dir, "L*.txt")
+        index.count()
+
+        assert index.manifest_path.parent == loops_dir.parent / INDEX_DIR_NAME
+        assert index.manifest_path.exists()
+        assert not any(p.name.startswith(".") for p in loops_dir.iterdir())
+
+    @pytest.mark.integration
+    def test_manifest_directory_is_git_ignored(self, loops_dir: Path) -> None:
+        """.file_index/ は .gitignore で追跡対象外になり、環境依存の値を保存しない"""
+        index = FileIndex(loops_dir, "L*.txt")
+        index.count()
+
+        gitignore = index.manifest_path.parent / ".gitignore"
+        assert gitignore.read_text(encoding="utf-8").splitlines()[-1] == "*"
+        manifest = json.loads(index.manifest_path.read_text(encoding="utf-8"))
+        assert manifest["directory"] == loops_dir.name
+        assert "scanned_at_ns" not in manifest
+        assert str(loops_dir.parent) not in index.manifest_path.read_text(encoding="utf-8")
+
+    @pytest.mark.integration
+    def test_manifest_reused_without_parsing(self, loops_dir: Path) -> None:
+        """mtime未変更なら新しいインスタンスでもファイル名解析を行わない"""
+        FileIndex(loops_dir, "L*.txt").count()
+
+        with patch(
+            "infrastructure.file_index.extract_file_number", wraps=extract_file_number
+        ) as parser:
+            index = FileIndex(loops_dir, "L*.txt")
+            assert index.max_number() == 10
+            assert index.count() == 6
+
+        parser.assert_not_called()
+
+    @pytest.mark.integration
+    def test_incremental_rebuild_parses_only_new_names(self, loops_dir: Path) -> None:
+        """ディレクトリ変更時は新規ファイル名のみ解析する"""
+        FileIndex(loops_dir, "L*.txt").count()
+        (loops_dir / "L00011_new.txt").write_text("{}", encoding="utf-8")
+        (loops_dir / "L00001_test.txt").unlink()
+
+        with patch(
+            "infrastructure.file_index.extract_file_number", wraps=extract_file_number
+        ) as parser:
+            index = FileIndex(loops_dir, "L*.txt")
+            assert index.max_number() == 11
+            assert [p.name for p in index.files_after(9)] == ["L00010_test.txt", "L00011_new.txt"]
+
+        assert parser.call_count == 1
+        assert index.files() == sorted(loops_dir.glob("L*.txt"))
+
+    @pytest.mark.integration
+    def test_recently_modified_directory_is_rescanned(self, loops_dir: Path) -> None:
+        """同一mtimeでも更新直後のディレクトリは毎回再スキャンする"""
+        index = FileIndex(loops_dir, "L*.txt")
+        (loops_dir / "L00020_a.txt").write_text("{}", encoding="utf-8")
+        assert index.max_number() == 20
+
+        # mtimeを固定したままファイルを追加（粗いmtime分解能のシミュレーション）
+        stat = os.stat(loops_dir)
+        (loops_dir / "L00021_b.txt").write_text("{}", encoding="utf-8")
+        os.utime(loops_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert index.max_number() == 21
+
+    @pytest.mark.integration
+    def test_coarse_mtime_resolution_is_racy(self, loops_dir: Path) -> None:
+        """1秒単位の mtime（スキャンの1秒前に丸められる）でも変更を見落とさない"""
+        coarse = (time.time_ns() // 1_000_000_000 - 1) * 1_000_000_000
+        os.utime(loops_dir, ns=(coarse, coarse))
+        assert FileIndex(loops_dir, "L*.txt").max_number() == 10
+
+        # 同じ秒に追加されたファイルは、丸められた mtime を変えない
+        (loops_dir / "L00020_a.txt").write_text("{}", encoding="utf-8")
+        os.utime(loops_dir, ns=(coarse, coarse))
+
+        assert FileIndex(loops_dir, "L*.txt").max_number() == 20
+
+    @pytest.mark.integration
+    def test_corrupt_manifest_ignored(self, loops_dir: Path) -> None:
+        """壊れたマニフェストは無視して再構築"""
+        index = FileIndex(loops_dir, "L*.txt")
+        index.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        index.manifest_path.write_text("{broken", encoding="utf-8")
+
+        assert index.count() == 6
+
+    @pytest.mark.integration
+    def test_truncated_manifest_ignored(self, loops_dir: Path) -> None:
+        """fastモードの書き込み途中（マルチバイト文字の途中で切れた）マニフェストも再構築"""
+        FileIndex(loops_dir, "L*.txt").count()
+        index = FileIndex(loops_dir, "L*.txt")
+        raw = '{"names": ["L00001_日本語'.encode("utf-8")
+        index.manifest_path.write_bytes(raw[:-1])
+
+        assert index.count() == 6
+
+
+class TestGetFileIndex:
+    """共有インスタンスの取得"""
+
+    @pytest.mark.unit
+    def test_same_instance_for_same_key(self, loops_dir: Path) -> None:
+        """同じディレクトリ・パターンには同じインスタンス"""
+        assert get_file_index(loops_dir, "L*.txt") is get_file_index(loops_dir, "L*.txt")
+        assert get_file_index(loops_dir, "L*.txt") is not get_file_index(loops_dir, "*.txt")
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+test_file_lock.py
+=================
+
+infrastructure/file_lock.py のテスト。
+共有・排他ロックの互換性、再入、タイムアウト、競合メトリクス、
+ロックファイル方式へのフォールバック、別プロセスとの排他をテスト。
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from domain.exceptions import FileIOError, LockTimeoutError, LockUpgradeError
+from infrastructure.file_lock import (
+    LOCK_EXCLUSIVE,
+    LOCK_SHARED,
+    FileLockManager,
+    exclusive_lock,
+    get_lock_manager,
+    lock_directory,
+    lock_path_for,
+    reset_lock_manager,
+    shared_lock,
+)
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2]
+
+needs_flock = pytest.mark.skipif(sys.platform == "win32", reason="fcntl.flock is POSIX only")
+
+
+def _hold_in_thread(
+    manager: FileLockManager, path: Path, mode: str, release: threading.Event
+) -> threading.Thread:
+    """別スレッドでロックを取得し、release がセットされるまで保持する"""
+    acquired = threading.Event()
+
+    def hold() -> None:
+        with getattr(manager, mode)(path):
+            acquired.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    assert acquired.wait(5)
+    return thread
+
+
+def _exited_pid() -> int:
+    """終了済みプロセスの PID"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class TestLockPath:
+    """lock_path_for のテスト"""
+
+    @pytest.mark.unit
+    def test_outside_target_directory(self, tmp_path: Path) -> None:
+        """対象のディレクトリではなく、git の追跡対象外のロックディレクトリに置く"""
+        lock_file = lock_path_for(tmp_path / "GrandDigest.txt")
+
+        assert lock_file.parent == lock_directory()
+        assert lock_file.parent != tmp_path
+        assert lock_file.name.startswith("GrandDigest.txt.")
+        assert (lock_directory() / ".gitignore").read_text(encoding="utf-8").strip().endswith("*")
+
+    @pytest.mark.unit
+    def test_keyed_by_target_path(self, tmp_path: Path) -> None:
+        """同じファイルを指すパスは同じロック、同名の別ファイルは別のロック"""
+        target = tmp_path / "Essences" / "GrandDigest.txt"
+
+        assert lock_path_for(target) == lock_path_for(
+            target.parent / ".." / "Essences" / target.name
+        )
+        assert lock_path_for(target) != lock_path_for(tmp_path / "other" / "GrandDigest.txt")
+
+    @pytest.mark.unit
+    def test_defaults_to_persistent_config_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """環境変数がなければ永続化設定ディレクトリの .locks/"""
+        monkeypatch.delenv("EPISODIC_RAG_LOCK_DIR")
+        monkeypatch.setattr(
+            "infrastructure.file_lock.get_persistent_config_dir", lambda: tmp_path / "persistent"
+        )
+
+        assert lock_directory() == tmp_path / "persistent" / ".locks"
+        assert (tmp_path / "persistent" / ".locks" / ".gitignore").exists()
+
+
+@needs_flock
+class TestFlockModes:
+    """flock 方式の共有・排他"""
+
+    @pytest.mark.unit
+    def test_shared_locks_coexist(self, tmp_path: Path) -> None:
+        """共有ロック同士は同時に保持できる"""
+        manager = FileLockManager()
+        target = tmp_path / "data.json"
+        release = threading.Event()
+        thread = _hold_in_thread(manager, target, LOCK_SHARED, release)
+        try:
+            with manager.shared(target, timeout=0):
+                pass
+        finally:
+            release.set()
+            thread.join()
+
+        assert manager.stats()[os.path.abspath(target)]["contended"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("held,requested", [("exclusive", "shared"), ("shared", "exclusive")])
+    def test_exclusive_conflicts_time_out(self, tmp_path: Path, held: str, requested: str) -> None:
+        """排他ロックは他のロックと両立せず、タイムアウトで LockTimeoutError"""
+        manager = FileLockManager()
+        target = tmp_path / "data.json"
+        release = threading.Event()
+        thread = _hold_in_thread(manager, target, held, release)
+        try:
+            start = time.monotonic()
+            with pytest.raises(LockTimeoutError, match=f"{requested} lock"):
+                with getattr(manager, requested)(target, timeout=0.05):
+                    pass
+            assert time.monotonic() - start >= 0.05
+        finally:
+            release.set()
+            thread.join()
+
+        stats = manager.stats()[os.path.abspath(target)]
+        assert stats["timeouts"] == 1
+        assert stats["contended"] == 1
+
+    @pytest.mark.unit
+    def test_waits_until_released(self, tmp_path: Path) -> None:
+        """解放されれば待っていた側が取得し、待ち時間が記録される"""
+        manager = FileLockManager()
+        target = tmp_path / "data.json"
+        release = threading.Event()
+        thread = _hold_in_thread(manager, target, LOCK_EXCLUSIVE, release)
+        threading.Timer(0.05, release.set).start()
+
+        with manager.exclusive(target, timeout=5):
+            pass
+        thread.join()
+
+        stats = manager.stats()[os.path.abspath(target)]
+        assert stats["acquisitions"] == 2
+        assert stats["exclusive"] == 2
+        assert stats["contended"] == 1
+        assert stats["max_wait"] >= 0.04
+
+    @pytest.mark.integration
+    def test_read_modify_write_no_lost_update(self, tmp_path: Path) -> None:
+        """排他ロック下の read-modify-write は更新を失わない"""
+        manager = FileLockManager()
+        target = tmp_path / "counter.txt"
+        target.write_text("0")
+
+        def increment() -> None:
+            for _ in range(20):
+                with manager.exclusive(target):
+                    value = int(target.read_text())
+                    time.sleep(0)
+                    target.write_text(str(value + 1))
+
+        threads = [threading.Thread(target=increment) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert target.read_text() == "100"
+
+    @pytest.mark.integration
+    def test_other_process_holds_lock(self, tmp_path: Path) -> None:
+        """別プロセスが保持する排他ロックとも競合する"""
+        target = tmp_path / "GrandDigest.txt"
+        script = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "from infrastructure.file_lock import exclusive_lock\n"
+            "with exclusive_lock(Path(sys.argv[1])):\n"
+            "    print('locked', flush=True)\n"
+            "    sys.stdin.read()\n"
+        )
+        child = subprocess.Popen(
+            [sys.executable, "-c", script, str(target)],
+            cwd=SCRIPTS_DIR,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert child.stdout is not None and child.stdout.readline().strip() == "locked"
+            with pytest.raises(LockTimeoutError):
+                with shared_lock(target, timeout=0.05):
+                    pass
+        finally:
+            child.communicate("", timeout=10)
+
+        with exclusive_lock(target, timeout=1):
+            pass
+
+
+class TestReentrancy:
+    """同一スレッド内の再入"""
+
+    @pytest.mark.unit
+    def test_nested_locks(self, tmp_path: Path) -> None:
+        """排他ロック中の共有・排他ロックは深さのみ増やす"""
+        manager = FileLockManager()
+        target = tmp_path / "data.json"
+
+        with manager.exclusive(target):
+            with manager.shared(target, timeout=0):
+                with manager.exclusive(target, timeout=0):
+                    assert manager.held_mode(target) == LOCK_EXCLUSIVE
+            assert manager.held_mode(target) == LOCK_EXCLUSIVE
+        assert manager.held_mode(target) is None
+        assert manager.stats()[os.path.abspath(target)]["acquisitions"] == 1
+
+    @pytest.mark.unit
+    def test_upgrade_rejected(self, tmp_path: Path) -> None:
+        """共有ロックから排他ロックへの昇格は LockUpgradeError（FileIOError）"""
+        manager = FileLockManager()
+        target = tmp_path / "data.json"
+
+        with manager.shared(target):
+            with pytest.raises(LockUpgradeError, match="upgrade"):
+                with manager.exclusive(target):
+                    pass
+            assert manager.held_mode(target) == LOCK_SHARED
+
+    @pytest.mark.unit
+    def test_release_without_acquire(self, tmp_path: Path) -> None:
+        """保持していないロックの解放は RuntimeError"""
+        with pytest.raises(RuntimeError):
+            FileLockManager().release(tmp_path / "data.json")
+
+    @pytest.mark.unit
+    def test_invalid_mode(self, tmp_path: Path) -> None:
+        """不正なモードは ValueError"""
+        with pytest.raises(ValueError):
+            FileLockManager().acquire(tmp_path / "data.json", "write")
+
+
+class TestLockFileFallback:
+    """fcntl が使えない環境向けのロックファイル方式"""
+
+    @pytest.mark.unit
+    def test_lock_file_created_and_removed(self, tmp_path: Path) -> None:
+        """取得中のみロックファイルが存在し、共有ロックも排他として扱う"""
+        manager = FileLockManager(use_flock=False)
+        target = tmp_path / "data.json"
+        release = threading.Event()
+        thread = _hold_in_thread(manager, target, LOCK_SHARED, release)
+        try:
+            assert lock_path_for(target).exists()
+            with pytest.raises(LockTimeoutError):
+                with manager.shared(target, timeout=0.02):
+                    pass
+        finally:
+            release.set()
+            thread.join()
+
+        assert not lock_path_for(target).exists()
+
+    @pytest.mark.unit
+    def test_stale_lock_file_removed(self, tmp_path: Path) -> None:
+        """古く、保持プロセスを確認できないロックファイルは残骸として削除して取得する"""
+        manager = FileLockManager(use_flock=False)
+        target = tmp_path / "data.json"
+        lock_file = lock_path_for(target)
+        lock_file.write_text("99999")
+        os.utime(lock_file, (0, 0))
+
+        with manager.exclusive(target, timeout=1):
+            assert lock_file.read_text() == f"{os.getpid()} {socket.gethostname()}"
+
+    @pytest.mark.unit
+    def test_lock_of_exited_process_removed(self, tmp_path: Path) -> None:
+        """同じホストで終了したプロセスのロックファイルは、新しくても削除して取得する"""
+        manager = FileLockManager(use_flock=False)
+        target = tmp_path / "data.json"
+        lock_file = lock_path_for(target)
+        lock_file.write_text(f"{_exited_pid()} {socket.gethostname()}")
+
+        with manager.exclusive(target, timeout=1):
+            assert lock_file.read_text().startswith(f"{os.getpid()} ")
+
+    @pytest.mark.unit
+    def test_lock_of_live_process_kept(self, tmp_path: Path) -> None:
+        """保持プロセスが生きていれば、古いロックファイルでも奪わない"""
+        manager = FileLockManager(use_flock=False)
+        target = tmp_path / "data.json"
+        lock_file = lock_path_for(target)
+        owner = f"{os.getpid()} {socket.gethostname()}"
+        lock_file.write_text(owner)
+        os.utime(lock_file, (0, 0))
+
+        with pytest.raises(LockTimeoutError):
+            with manager.exclusive(target, timeout=0.05):
+                pass
+        assert lock_file.read_text() == owner
+
+    @pytest.mark.unit
+    def test_lock_of_other_host_uses_age(self, tmp_path: Path) -> None:
+        """別ホストのロックファイルは経過時間で判定する"""
+        manager = FileLockManager(use_flock=False)
+        target = tmp_path / "data.json"
+        lock_file = lock_path_for(target)
+        lock_file.write_text(f"{os.getpid()} other-host.invalid")
+
+        with pytest.raises(LockTimeoutError):
+            with manager.exclusive(target, timeout=0.05):
+                pass
+
+        os.utime(lock_file, (0, 0))
+        with manager.exclusive(target, timeout=1):
+            assert lock_file.read_text().startswith(f"{os.getpid()} ")
+
+
+class TestSharedManager:
+    """共有ロックマネージャと設定"""
+
+    @pytest.mark.unit
+    def test_singleton_and_reset(self) -> None:
+        """get_lock_manager は同一インスタンス、reset で作り直す"""
+        manager = get_lock_manager()
+        assert get_lock_manager() is manager
+        reset_lock_manager()
+        assert get_lock_manager() is not manager
+
+    @pytest.mark.unit
+    def test_timeout_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """EPISODIC_RAG_LOCK_TIMEOUT でデフォルトのタイムアウトを変更できる"""
+        monkeypatch.setenv("EPISODIC_RAG_LOCK_TIMEOUT", "1.5")
+        assert FileLockManager().default_timeout == 1.5
+        monkeypatch.setenv("EPISODIC_RAG_LOCK_TIMEOUT", "soon")
+        assert FileLockManager().default_timeout == 30.0
+
+    @pytest.mark.unit
+    def test_lock_timeout_is_file_io_error(self) -> None:
+        """LockTimeoutError は FileIOError として扱える"""
+        assert issubclass(LockTimeoutError, FileIOError)
+
+    @pytest.mark.unit
+    def test_reset_stats(self, tmp_path: Path) -> None:
+        """reset_stats で競合メトリクスを消去"""
+        manager = FileLockManager()
+        with manager.shared(tmp_path / "data.json"):
+            pass
+        assert manager.stats()
+        manager.reset_stats()
+        assert manager.stats() == {}
+
+
+@needs_flock
+class TestRepositoryLocking:
+    """リポジトリクラスがロックを取ること"""
+
+    @pytest.mark.integration
+    def test_digest_times_concurrent_levels(self, temp_plugin_env, digest_config) -> None:
+        """別レベルの同時更新がどちらも last_digest_times.json に残る"""
+        from application.tracking import DigestTimesTracker
+
+        levels: List[str] = ["weekly", "monthly", "quarterly", "annual"]
+
+        def save(level: str) -> None:
+            for number in range(1, 6):
+                DigestTimesTracker(digest_config).save_digest_number(level, number)
+
+        threads = [threading.Thread(target=save, args=(level,)) for level in levels]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        times = DigestTimesTracker(digest_config).load_or_create()
+        assert all(times[level]["last_processed"] == 5 for level in levels)
+
+    @pytest.mark.integration
+    def test_shadow_session_holds_exclusive(self, temp_plugin_env, digest_config) -> None:
+        """ShadowSession はセッション中 ShadowGrandDigest.txt の排他ロックを保持する"""
+        from application.shadow import ShadowIO, ShadowTemplate
+
+        shadow_io = ShadowIO(
+            digest_config.essences_path / "ShadowGrandDigest.txt",
+            ShadowTemplate(["weekly", "monthly"]).get_template,
+        )
+        manager = get_lock_manager()
+        with shadow_io.session():
+            assert manager.held_mode(shadow_io.shadow_digest_file) == LOCK_EXCLUSIVE
+        assert manager.held_mode(shadow_io.shadow_digest_file) is None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+test_journal.py
+===============
+
+infrastructure/journal.py のテスト。
+追記・読み込み、書き込み途中の行の無視、truncate をテスト。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from infrastructure.journal import AppendOnlyJournal
+
+
+class TestAppendOnlyJournal:
+    """AppendOnlyJournal のテスト"""
+
+    @pytest.mark.unit
+    def test_append_and_read_in_order(self, tmp_path: Path) -> None:
+        """追記したレコードを追記順に読み込む（ファイルがなければ空）"""
+        journal = AppendOnlyJournal(tmp_path / "Essences" / "FinalizeJournal.jsonl")
+        assert journal.read() == []
+
+        journal.append({"txn": "a", "op": "begin", "data": {"title": "知性射程"}})
+        journal.append({"txn": "a", "op": "commit"})
+
+        assert journal.read() == [
+            {"txn": "a", "op": "begin", "data": {"title": "知性射程"}},
+            {"txn": "a", "op": "commit"},
+        ]
+        assert len(journal.path.read_text(encoding="utf-8").splitlines()) == 2
+
+    @pytest.mark.unit
+    def test_torn_tail_ignored(self, tmp_path: Path) -> None:
+        """書き込み途中で落ちた末尾の行は読み飛ばす"""
+        journal = AppendOnlyJournal(tmp_path / "FinalizeJournal.jsonl")
+        journal.append({"txn": "a", "op": "begin"})
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"txn": "a", "op": "do')
+
+        assert journal.read() == [{"txn": "a", "op": "begin"}]
+
+    @pytest.mark.unit
+    def test_append_after_torn_tail(self, tmp_path: Path) -> None:
+        """末尾の壊れた行に連結せず、次のレコードを新しい行に追記する"""
+        journal = AppendOnlyJournal(tmp_path / "FinalizeJournal.jsonl")
+        journal.append({"txn": "a", "op": "begin"})
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"txn": "a", "op": "do')
+
+        journal.append({"txn": "b", "op": "begin"})
+
+        assert journal.read() == [{"txn": "a", "op": "begin"}, {"txn": "b", "op": "begin"}]
+
+    @pytest.mark.unit
+    def test_truncate(self, tmp_path: Path) -> None:
+        """truncate で空になり、続けて追記できる"""
+        journal = AppendOnlyJournal(tmp_path / "FinalizeJournal.jsonl")
+        journal.truncate()
+        journal.append({"txn": "a", "op": "begin"})
+        journal.truncate()
+
+        assert journal.path.read_text(encoding="utf-8") == ""
+        journal.append({"txn": "b", "op": "begin"})
+        assert journal.read() == [{"txn": "b", "op": "begin"}]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+test_json_codec.py
+==================
+
+infrastructure/json_repository/codec.py の単体テスト。
+各バックエンドの出力が標準ライブラリとバイト単位で一致すること、
+フォールバック、コンパクト形式をテスト。
+"""
+
+import json
+import random
+import struct
+from pathlib import Path
+
+import pytest
+
+from infrastructure.json_repository import (
+    available_json_codecs,
+    get_json_codec,
+    json_dumps,
+    json_loads,
+    reset_json_codec,
+    save_json,
+    set_json_codec,
+)
+from infrastructure.json_repository.codec import StdlibJsonCodec
+
+# 代表的なダイジェスト形式のデータ
+SAMPLE_PAYLOADS = [
+    {
+        "metadata": {"last_updated": "2025-01-01T00:00:00", "version": "1.0"},
+        "latest_digests": {
+            "weekly": {
+                "overall_digest": {
+                    "source_files": ["L00001_テスト.txt", "L00002.txt"],
+                    "digest_type": "<!-- PLACEHOLDER -->",
+                    "keywords": ["日本語", "emoji😀", "tab\tnewline\n"],
+                    "abstract": {"long": "長い要約" * 50, "short": "短い"},
+                }
+            },
+            "monthly": {"overall_digest": None},
+        },
+        "empty_dict": {},
+        "empty_list": [],
+        "nested": [[[]], [{}], [1, 2, [3, {"a": None}]]],
+    },
+    {"control": "\x00\x01\x1f\x7f", "quotes": '"\\/', "separators": "  "},
+    {"ints": [0, -1, 2**31, 2**63 - 1, -(2**63)], "bools": [True, False, None]},
+    {"floats": [0.1, 1.5, -0.0, 123456789.123, 1e16, 1e-5, 3.4e-5, 1e22, 5e-324]},
+    {"big_int": 2**70},
+    [],
+    {},
+    "plain string",
+]
+
+
+@pytest.fixture(params=available_json_codecs())
+def codec_name(request):
+    """利用可能な各バックエンドで実行"""
+    set_json_codec(request.param)
+    yield request.param
+    reset_json_codec()
+
+
+class TestByteIdenticalOutput:
+    """全バックエンドで標準ライブラリと同一の出力になることを検証"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("payload", SAMPLE_PAYLOADS)
+    def test_indented_matches_stdlib(self, codec_name: str, payload) -> None:
+        """indent=2 の出力が json.dumps と一致"""
+        expected = json.dumps(payload, ensure_ascii=False, indent=2)
+        assert json_dumps(payload) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("payload", SAMPLE_PAYLOADS)
+    def test_compact_matches_stdlib(self, codec_name: str, payload) -> None:
+        """compact=True の出力が separators=(",", ":") の json.dumps と一致"""
+        expected = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        assert json_dumps(payload, compact=True) == expected
+
+    @pytest.mark.unit
+    def test_random_floats_match_stdlib(self, codec_name: str) -> None:
+        """ランダムな浮動小数点数でも一致"""
+        rng = random.Random(42)
+        values = [struct.unpack("d", struct.pack("Q", rng.getrandbits(64)))[0] for _ in range(2000)]
+        values = [v for v in values if v == v and v not in (float("inf"), float("-inf"))]
+        values += [rng.random() * 10 ** rng.randint(-30, 30) for _ in range(2000)]
+
+        assert json_dumps({"v": values}) == json.dumps({"v": values}, ensure_ascii=False, indent=2)
+
+    @pytest.mark.unit
+    def test_other_indent_matches_stdlib(self, codec_name: str) -> None:
+        """indent=4 等（orjson非対応）も一致"""
+        payload = SAMPLE_PAYLOADS[0]
+        assert json_dumps(payload, indent=4) == json.dumps(payload, ensure_ascii=False, indent=4)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("payload", SAMPLE_PAYLOADS)
+    def test_roundtrip(self, codec_name: str, payload) -> None:
+        """loads(dumps(x)) == x"""
+        assert json_loads(json_dumps(payload)) == payload
+
+
+class TestDecoding:
+    """読み込み時のフォールバック動作"""
+
+    @pytest.mark.unit
+    def test_invalid_json_raises_stdlib_error(self, codec_name: str) -> None:
+        """不正なJSONは json.JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads("{invalid")
+
+    @pytest.mark.unit
+    def test_nan_literal_falls_back_to_stdlib(self, codec_name: str) -> None:
+        """NaN リテラル（標準ライブラリのみ受理）もパースできる"""
+        result = json_loads('{"x": NaN}')
+        assert result["x"] != result["x"]
+
+    @pytest.mark.unit
+    def test_accepts_bytes(self, codec_name: str) -> None:
+        """bytes 入力も受け付ける"""
+        assert json_loads('{"a": "日本"}'.encode("utf-8")) == {"a": "日本"}
+
+
+class TestCodecSelection:
+    """バックエンドの選択"""
+
+    @pytest.mark.unit
+    def test_stdlib_always_available(self) -> None:
+        """stdlib は常に利用可能"""
+        assert "stdlib" in available_json_codecs()
+
+    @pytest.mark.unit
+    def test_unknown_name_falls_back(self) -> None:
+        """不明な名前は自動選択"""
+        codec = set_json_codec("no-such-codec")
+        assert codec.name == available_json_codecs()[0]
+
+    @pytest.mark.unit
+    def test_env_var_selects_stdlib(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """EPISODIC_RAG_JSON_CODEC=stdlib で標準ライブラリを使用"""
+        monkeypatch.setenv("EPISODIC_RAG_JSON_CODEC", "stdlib")
+        reset_json_codec()
+        assert isinstance(get_json_codec(), StdlibJsonCodec)
+
+
+class TestSaveJsonWithCodec:
+    """save_json のコーデック統合"""
+
+    @pytest.mark.integration
+    def test_file_bytes_identical_across_codecs(self, tmp_path: Path) -> None:
+        """どのバックエンドでも保存されるファイルはバイト単位で同一"""
+        outputs = []
+        for name in available_json_codecs():
+            set_json_codec(name)
+            path = tmp_path / f"{name}.json"
+            save_json(path, SAMPLE_PAYLOADS[0])
+            outputs.append(path.read_bytes())
+
+        assert all(output == outputs[0] for output in outputs)
+
+    @pytest.mark.integration
+    def test_compact_mode(self, tmp_path: Path) -> None:
+        """compact=True はインデント・空白なしで保存"""
+        path = tmp_path / "last_digest_times.json"
+        data = {"weekly": {"timestamp": "2025-01-01T00:00:00", "last_processed": 5}}
+
+        save_json(path, data, compact=True)
+
+        content = path.read_text(encoding="utf-8")
+        assert "\n" not in content
+        assert content == '{"weekly":{"timestamp":"2025-01-01T00:00:00","last_processed":5}}'
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+test_json_patch.py
+==================
+
+infrastructure/json_patch.py のテスト。
+RFC 6902 の各操作の適用と、make_patch の差分が元の文書を再現することをテスト。
+"""
+
+import copy
+
+import pytest
+
+from domain.exceptions import ValidationError
+from infrastructure.json_patch import apply_patch, escape_pointer, make_patch
+
+
+class TestApplyPatch:
+    """apply_patch のテスト"""
+
+    @pytest.mark.unit
+    def test_add_remove_replace(self) -> None:
+        """add（配列末尾・途中・dict）/ remove / replace"""
+        document = {"files": ["a", "c"], "n": 1, "old": True}
+
+        result = apply_patch(
+            document,
+            [
+                {"op": "add", "path": "/files/-", "value": "d"},
+                {"op": "add", "path": "/files/1", "value": "b"},
+                {"op": "add", "path": "/new", "value": {"x": 1}},
+                {"op": "remove", "path": "/old"},
+                {"op": "replace", "path": "/n", "value": 2},
+            ],
+        )
+
+        assert result == {"files": ["a", "b", "c", "d"], "n": 2, "new": {"x": 1}}
+
+    @pytest.mark.unit
+    def test_move_copy_test_and_escape(self) -> None:
+        """move / copy / test と、"~1" "~0" のエスケープ"""
+        document = {"a/b": {"~k": 1}, "list": []}
+
+        result = apply_patch(
+            document,
+            [
+                {"op": "test", "path": "/a~1b/~0k", "value": 1},
+                {"op": "copy", "from": "/a~1b", "path": "/list/-"},
+                {"op": "move", "from": "/a~1b", "path": "/moved"},
+            ],
+        )
+
+        assert result == {"list": [{"~k": 1}], "moved": {"~k": 1}}
+        assert escape_pointer("a/b~c") == "a~1b~0c"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/missing", "value": 1},
+            {"op": "add", "path": "/files/5", "value": 1},
+            {"op": "test", "path": "/n", "value": 2},
+            {"op": "frobnicate", "path": "/n"},
+            {"op": "add", "path": "n", "value": 1},
+        ],
+    )
+    def test_invalid_operation_raises(self, operation) -> None:
+        """存在しないパス・範囲外・test 不一致・未知の op は ValidationError"""
+        with pytest.raises(ValidationError):
+            apply_patch({"files": [], "n": 1}, [operation])
+
+
+class TestMakePatch:
+    """make_patch のテスト"""
+
+    @pytest.mark.unit
+    def test_append_becomes_element_adds(self) -> None:
+        """配列への追記は要素ごとの add、それ以外の変更は replace"""
+        before = {"source_files": ["L1"], "abstract": "x", "gone": 1}
+        after = {"source_files": ["L1", "L2", "L3"], "abstract": "y", "extra": []}
+
+        operations = make_patch(before, after, "/latest_digests/weekly")
+
+        assert operations == [
+            {"op": "add", "path": "/latest_digests/weekly/source_files/-", "value": "L2"},
+            {"op": "add", "path": "/latest_digests/weekly/source_files/-", "value": "L3"},
+            {"op": "replace", "path": "/latest_digests/weekly/abstract", "value": "y"},
+            {"op": "add", "path": "/latest_digests/weekly/extra", "value": []},
+            {"op": "remove", "path": "/latest_digests/weekly/gone"},
+        ]
+        assert make_patch(before, copy.deepcopy(before)) == []
+
+    @pytest.mark.unit
+    def test_roundtrip(self) -> None:
+        """make_patch の結果を before に適用すると after になる"""
+        before = {"a": {"b": [1, 2, 3], "c": None}, "d": "x"}
+        after = {"a": {"b": [3, 2], "c": {"e": "f"}}, "g/h": 0}
+
+        result = apply_patch(copy.deepcopy(before), make_patch(before, after))
+
+        assert result == after
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+test_json_read_cache.py
+=======================
+
+infrastructure/json_repository/read_cache.py の単体テスト。
+mtime/size検証、LRU追い出し、save_jsonによる無効化、
+LoadStrategyチェーンからの透過性をテスト。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from infrastructure.json_repository import (
+    JsonReadCache,
+    get_json_read_cache,
+    load_json_with_template,
+    reset_json_read_cache,
+    safe_read_json,
+    save_json,
+)
+from infrastructure.json_repository.read_cache import RACY_WINDOW_NS, clone_json_value
+
+
+def _write_settled(path: Path, data: dict) -> None:
+    """ファイルを書き込み、mtimeを過去に設定（racyウィンドウ外にする）"""
+    path.write_text(json.dumps(data), encoding="utf-8")
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    os.utime(path, ns=(past, past))
+
+
+# =============================================================================
+# JsonReadCache 単体
+# =============================================================================
+
+
+class TestJsonReadCache:
+    """JsonReadCache クラスのテスト"""
+
+    @pytest.mark.unit
+    def test_clone_is_independent(self) -> None:
+        """clone_json_value はネストしたdict/listを複製する"""
+        original = {"a": [1, {"b": 2}], "c": "x"}
+        cloned = clone_json_value(original)
+
+        cloned["a"][1]["b"] = 99
+        assert original == {"a": [1, {"b": 2}], "c": "x"}
+
+    @pytest.mark.integration
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """max_entries を超えると最も古いエントリが追い出される"""
+        cache = JsonReadCache(max_entries=2)
+        paths = [tmp_path / f"f{i}.json" for i in range(3)]
+        for i, path in enumerate(paths):
+            _write_settled(path, {"i": i})
+            cache.put(path, cache.signature(path), {"i": i})
+
+        assert cache.stats()["size"] == 2
+        assert cache.get(paths[0], cache.signature(paths[0])) is None
+        assert cache.get(paths[2], cache.signature(paths[2])) == {"i": 2}
+
+    @pytest.mark.integration
+    def test_recently_modified_file_not_cached(self, tmp_path: Path) -> None:
+        """更新直後（racyウィンドウ内）のファイルはキャッシュしない"""
+        cache = JsonReadCache()
+        path = tmp_path / "fresh.json"
+        path.write_text("{}", encoding="utf-8")
+
+        cache.put(path, cache.signature(path), {})
+
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.integration
+    def test_disabled_when_max_entries_zero(self, tmp_path: Path) -> None:
+        """max_entries=0 でキャッシュ無効"""
+        cache = JsonReadCache(max_entries=0)
+        path = tmp_path / "f.json"
+        _write_settled(path, {"a": 1})
+
+        cache.put(path, cache.signature(path), {"a": 1})
+
+        assert cache.get(path, cache.signature(path)) is None
+        assert cache.stats()["misses"] == 0
+
+
+# =============================================================================
+# safe_read_json / save_json との統合
+# =============================================================================
+
+
+class TestSafeReadJsonCaching:
+    """safe_read_json のキャッシュ動作テスト"""
+
+    @pytest.mark.integration
+    def test_second_read_is_hit(self, tmp_path: Path) -> None:
+        """変更されていないファイルの2回目の読み込みはヒット"""
+        path = tmp_path / "config.json"
+        _write_settled(path, {"k": "v"})
+
+        assert safe_read_json(path) == {"k": "v"}
+        assert safe_read_json(path) == {"k": "v"}
+
+        stats = get_json_read_cache().stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.integration
+    def test_returned_value_is_copy(self, tmp_path: Path) -> None:
+        """返却値を変更してもキャッシュは汚染されない"""
+        path = tmp_path / "config.json"
+        _write_settled(path, {"items": [1, 2]})
+
+        first = safe_read_json(path)
+        assert first is not None
+        first["items"].append(3)
+
+        assert safe_read_json(path) == {"items": [1, 2]}
+
+    @pytest.mark.integration
+    def test_external_modification_detected(self, tmp_path: Path) -> None:
+        """外部でファイルが変更された場合は再読み込みする"""
+        path = tmp_path / "config.json"
+        _write_settled(path, {"v": 1})
+        safe_read_json(path)
+
+        _write_settled(path, {"v": 22})
+        # mtimeを変えてサイズ以外でも検出されることを確認
+        later = time.time_ns() - RACY_WINDOW_NS * 10
+        os.utime(path, ns=(later, later))
+
+        assert safe_read_json(path) == {"v": 22}
+
+    @pytest.mark.integration
+    def test_save_json_invalidates(self, tmp_path: Path) -> None:
+        """save_json は該当パスのキャッシュを無効化する"""
+        path = tmp_path / "config.json"
+        _write_settled(path, {"v": 1})
+        safe_read_json(path)
+        assert get_json_read_cache().stats()["size"] == 1
+
+        save_json(path, {"v": 2})
+
+        assert get_json_read_cache().stats()["size"] == 0
+        assert safe_read_json(path) == {"v": 2}
+
+    @pytest.mark.integration
+    def test_transparent_to_load_strategy_chain(self, tmp_path: Path) -> None:
+        """load_json_with_template 経由でもキャッシュが効き、結果は同一"""
+        path = tmp_path / "times.json"
+        _write_settled(path, {"weekly": {"timestamp": "t"}})
+
+        first = load_json_with_template(path, default_factory=dict)
+        second = load_json_with_template(path, default_factory=dict)
+
+        assert first == second == {"weekly": {"timestamp": "t"}}
+        assert first is not second
+        assert get_json_read_cache().stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_reset_applies_max_entries(self) -> None:
+        """reset_json_read_cache で最大エントリ数を設定できる"""
+        reset_json_read_cache(max_entries=5)
+        assert get_json_read_cache().max_entries == 5
@@ -8,7 +8,9 @@ JSON読み書き、テンプレート処理、ディレクトリ作成をテス
 """
 
 import json
+import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -19,6 +21,7 @@ from infrastructure.json_repository import (
     file_exists,
     load_json,
     load_json_with_template,
+    save_bytes,
     save_json,
     try_load_json,
     try_read_json_from_file,
@@ -151,6 +154,107 @@ class TestSaveJson:
         assert "old" not in result
 
 
+class TestSaveJsonAtomic:
+    """save_json() のアトミック書き込みのテスト"""
+
+    @pytest.mark.integration
+    def test_no_temp_files_left(self, tmp_path: Path) -> None:
+        """書き込み後に一時ファイルが残らない"""
+        json_file = tmp_path / "atomic.json"
+
+        save_json(json_file, {"a": 1})
+        save_json(json_file, {"a": 2}, fsync_dir=True)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["atomic.json"]
+        assert json.loads(json_file.read_text()) == {"a": 2}
+
+    @pytest.mark.integration
+    def test_failed_replace_keeps_original(self, tmp_path: Path) -> None:
+        """置換に失敗した場合、元ファイルは無傷で一時ファイルも削除される"""
+        json_file = tmp_path / "atomic.json"
+        json_file.write_text('{"old": "data"}')
+
+        with patch("os.replace", side_effect=OSError("replace failed")):
+            with pytest.raises(FileIOError):
+                save_json(json_file, {"new": "data"})
+
+        assert json.loads(json_file.read_text()) == {"old": "data"}
+        assert [p.name for p in tmp_path.iterdir()] == ["atomic.json"]
+
+    @pytest.mark.integration
+    def test_unserializable_data_keeps_original(self, tmp_path: Path) -> None:
+        """シリアライズ不能なデータでも元ファイルは切り詰められない"""
+        json_file = tmp_path / "atomic.json"
+        json_file.write_text('{"old": "data"}')
+
+        with pytest.raises(TypeError):
+            save_json(json_file, {"bad": object()})
+
+        assert json.loads(json_file.read_text()) == {"old": "data"}
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+    def test_preserves_file_mode(self, tmp_path: Path) -> None:
+        """既存ファイルのパーミッションを引き継ぐ"""
+        json_file = tmp_path / "atomic.json"
+        json_file.write_text("{}")
+        json_file.chmod(0o640)
+
+        save_json(json_file, {"a": 1})
+
+        assert json_file.stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.integration
+    def test_fast_mode_writes_directly(self, tmp_path: Path) -> None:
+        """atomic=False（fastモード）は os.replace を使わず直接書き込む"""
+        json_file = tmp_path / "scratch.json"
+
+        with patch("os.replace") as mock_replace:
+            save_json(json_file, {"a": 1}, atomic=False)
+
+        mock_replace.assert_not_called()
+        assert json.loads(json_file.read_text()) == {"a": 1}
+
+    @pytest.mark.integration
+    def test_atomic_and_fast_produce_same_content(self, tmp_path: Path) -> None:
+        """アトミック/fastモードで同一の内容が書き込まれる"""
+        data = {"japanese": "こんにちは", "nested": {"values": [1, 2, 3]}}
+        atomic_file = tmp_path / "atomic.json"
+        fast_file = tmp_path / "fast.json"
+
+        save_json(atomic_file, data)
+        save_json(fast_file, data, atomic=False)
+
+        assert atomic_file.read_bytes() == fast_file.read_bytes()
+
+
+class TestSaveBytes:
+    """save_bytes() 関数のテスト"""
+
+    @pytest.mark.integration
+    def test_writes_bytes_atomically(self, tmp_path: Path) -> None:
+        """親ディレクトリを作成し、一時ファイルを残さずに書き込む"""
+        bin_file = tmp_path / "nested" / "data.bin"
+
+        save_bytes(bin_file, b"\x00\x01\xff")
+        save_bytes(bin_file, b"\x02", fsync_dir=True)
+
+        assert bin_file.read_bytes() == b"\x02"
+        assert [p.name for p in bin_file.parent.iterdir()] == ["data.bin"]
+
+    @pytest.mark.integration
+    def test_failed_replace_raises_file_io_error(self, tmp_path: Path) -> None:
+        """置換失敗時は FileIOError、元ファイルは無傷"""
+        bin_file = tmp_path / "data.bin"
+        bin_file.write_bytes(b"old")
+
+        with patch("os.replace", side_effect=OSError("replace failed")):
+            with pytest.raises(FileIOError):
+                save_bytes(bin_file, b"new")
+
+        assert bin_file.read_bytes() == b"old"
+
+
 # =============================================================================
 # load_json_with_template テスト
 # =============================================================================
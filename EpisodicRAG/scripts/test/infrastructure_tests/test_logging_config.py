@@ -7,22 +7,28 @@ infrastructure/logging_config.py のユニットテスト
 - setup_logging: ロガーの初期化
 - log_info/log_warning/log_error: ログ出力関数
 - 環境変数によるカスタマイズ
+- JsonLinesFormatter: JSON Lines 出力
 """
 
+import json
 import logging
 import os
 from io import StringIO
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from infrastructure import logging_config
 from infrastructure.logging_config import (
     FORMAT_DETAILED,
     FORMAT_SIMPLE,
     LOG_LEVELS,
+    JsonLinesFormatter,
     _get_log_format_from_env,
     _get_log_level_from_env,
     get_logger,
+    json_log_enabled,
     log_debug,
     log_error,
     log_info,
@@ -205,6 +211,35 @@ class TestSetupLogging:
             mock_logger.addHandler.assert_not_called()
             assert result is mock_logger
 
+    @pytest.mark.unit
+    def test_json_format_writes_json_lines(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """json 設定時は EPISODIC_RAG_LOG_FILE に JSON Lines、stdout には span 以外の INFO"""
+        log_file = tmp_path / "episodic_rag.jsonl"
+        monkeypatch.setattr(logging_config, "_json_enabled", False)
+        monkeypatch.setenv("EPISODIC_RAG_LOG_FORMAT", "json")
+        monkeypatch.setenv("EPISODIC_RAG_LOG_FILE", str(log_file))
+        logger = logging.getLogger("episodic_rag_test")
+        logger.propagate = False
+
+        with patch("infrastructure.logging_config.logging.getLogger", return_value=logger):
+            setup_logging()
+        logger.info("plain message")
+        logger.info("span", extra={"event": "cascade", "kind": "span", "duration_ms": 1.5})
+        for handler in logger.handlers:
+            handler.close()
+        logger.propagate = True
+
+        assert json_log_enabled()
+        lines = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+        assert [line["event"] for line in lines] == ["plain message", "cascade"]
+        assert lines[1]["kind"] == "span"
+        assert lines[1]["duration_ms"] == 1.5
+        out = capsys.readouterr().out
+        assert "plain message" in out
+        assert "span" not in out
+
 
 # =============================================================================
 # log_info テスト
@@ -353,3 +388,54 @@ class TestLogDebug:
             log_debug("Should not appear")
 
         assert "Should not appear" not in caplog.text
+
+
+# =============================================================================
+# JsonLinesFormatter テスト
+# =============================================================================
+
+
+class TestJsonLinesFormatter:
+    """JsonLinesFormatter のテスト"""
+
+    @staticmethod
+    def _record(msg: str, **extra: object) -> logging.LogRecord:
+        record = logging.LogRecord("episodic_rag", logging.INFO, __file__, 1, msg, None, None)
+        record.__dict__.update(extra)
+        return record
+
+    @pytest.mark.unit
+    def test_structured_record(self) -> None:
+        """構造化ロガーの extra がフィールドとして出力される"""
+        record = self._record(
+            "[SPAN] cascade.promote: level=weekly",
+            event="cascade.promote",
+            source="application.shadow.cascade_orchestrator",
+            kind="span",
+            context={"level": "weekly", "path": Path("a/b.txt")},
+            span_id="abc",
+            parent_id=None,
+            duration_ms=1.25,
+            status="ok",
+        )
+
+        line = JsonLinesFormatter().format(record)
+
+        assert "\n" not in line
+        entry = json.loads(line)
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "application.shadow.cascade_orchestrator"
+        assert entry["event"] == "cascade.promote"
+        assert entry["context"] == {"level": "weekly", "path": str(Path("a/b.txt"))}
+        assert (entry["span_id"], entry["duration_ms"], entry["status"]) == ("abc", 1.25, "ok")
+        assert "parent_id" not in entry
+        assert "T" in entry["timestamp"]
+
+    @pytest.mark.unit
+    def test_plain_record(self) -> None:
+        """extra のないレコードは message を event とし、Unicode はそのまま"""
+        entry = json.loads(JsonLinesFormatter().format(self._record("確定処理完了")))
+
+        assert entry["logger"] == "episodic_rag"
+        assert entry["event"] == "確定処理完了"
+        assert "kind" not in entry
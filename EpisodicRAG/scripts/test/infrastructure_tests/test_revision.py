@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+test_revision.py
+================
+
+infrastructure/revision.py のテスト。
+metadata.revision の取得・採番、期待リビジョンの比較、
+競合時の再試行、再パースを避ける記録済み revision をテスト。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from domain.exceptions import RevisionConflictError
+from infrastructure.json_repository.read_cache import RACY_WINDOW_NS
+from infrastructure.revision import (
+    get_revision,
+    read_revision,
+    retry_on_conflict,
+    save_with_revision,
+)
+
+
+def _write(path: Path, revision: int, **extra: Any) -> None:
+    path.write_text(json.dumps({"metadata": {"revision": revision}, **extra}), encoding="utf-8")
+
+
+def _settle(path: Path) -> None:
+    """ファイルのmtimeを過去に設定（racyウィンドウ外にする）"""
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    os.utime(path, ns=(past, past))
+
+
+class TestGetRevision:
+    """get_revision のテスト"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ({"metadata": {"revision": 7}}, 7),
+            ({"metadata": {}}, 0),
+            ({}, 0),
+            ({"metadata": None}, 0),
+            ({"metadata": {"revision": "7"}}, 0),
+            ({"metadata": {"revision": True}}, 0),
+            ([], 0),
+        ],
+    )
+    def test_get_revision(self, data: Any, expected: int) -> None:
+        """欠落・不正な値は 0"""
+        assert get_revision(data) == expected
+
+
+class TestSaveWithRevision:
+    """save_with_revision のテスト"""
+
+    @pytest.mark.unit
+    def test_increments_revision(self, tmp_path: Path) -> None:
+        """保存ごとに revision が1進む（新規ファイルは1から）"""
+        path = tmp_path / "GrandDigest.txt"
+        data: Dict[str, Any] = {"metadata": {}}
+
+        assert save_with_revision(path, data) == 1
+        assert save_with_revision(path, data) == 2
+        assert json.loads(path.read_text(encoding="utf-8"))["metadata"]["revision"] == 2
+
+    @pytest.mark.unit
+    def test_expected_revision_matches(self, tmp_path: Path) -> None:
+        """期待リビジョンが一致すれば保存"""
+        path = tmp_path / "GrandDigest.txt"
+        _write(path, 4)
+
+        assert save_with_revision(path, {"metadata": {"revision": 4}}, expected_revision=4) == 5
+
+    @pytest.mark.unit
+    def test_conflict_fails_fast(self, tmp_path: Path) -> None:
+        """読み込み後に進んだ revision は RevisionConflictError で保存しない"""
+        path = tmp_path / "GrandDigest.txt"
+        _write(path, 5, marker="theirs")
+
+        with pytest.raises(RevisionConflictError, match="expected 4, found 5") as exc_info:
+            save_with_revision(path, {"metadata": {"revision": 4}, "marker": "ours"}, 4)
+
+        assert (exc_info.value.expected, exc_info.value.actual) == (4, 5)
+        assert json.loads(path.read_text(encoding="utf-8"))["marker"] == "theirs"
+
+    @pytest.mark.unit
+    def test_stale_document_never_rewinds(self, tmp_path: Path) -> None:
+        """期待リビジョンなしで古い文書を保存しても revision は戻らない"""
+        path = tmp_path / "GrandDigest.txt"
+        _write(path, 9)
+
+        assert save_with_revision(path, {"metadata": {"revision": 2}}) == 10
+
+
+class TestReadRevision:
+    """read_revision のテスト"""
+
+    @pytest.mark.unit
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """存在しないファイルは 0"""
+        assert read_revision(tmp_path / "missing.txt") == 0
+
+    @pytest.mark.unit
+    def test_settled_file_not_reparsed(self, tmp_path: Path) -> None:
+        """更新直後でないファイルは、一度読めば変わるまで読み直さない"""
+        path = tmp_path / "GrandDigest.txt"
+        save_with_revision(path, {"metadata": {}})
+        _settle(path)
+        assert read_revision(path) == 1
+
+        with patch("infrastructure.revision.try_read_json_from_file") as reader:
+            assert read_revision(path) == 1
+            reader.assert_not_called()
+
+    @pytest.mark.unit
+    def test_racy_overwrite_detected(self, tmp_path: Path) -> None:
+        """更新直後に同じ inode・mtime・サイズで上書きされても読み直す"""
+        path = tmp_path / "GrandDigest.txt"
+        save_with_revision(path, {"metadata": {}})
+        stat = os.stat(path)
+
+        path.write_text(path.read_text(encoding="utf-8").replace("1", "7"), encoding="utf-8")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert os.stat(path).st_size == stat.st_size
+
+        assert read_revision(path) == 7
+
+    @pytest.mark.unit
+    def test_external_write_detected(self, tmp_path: Path) -> None:
+        """別の書き込み（アトミックな置き換え）は検出して読み直す"""
+        path = tmp_path / "GrandDigest.txt"
+        save_with_revision(path, {"metadata": {}})
+
+        replacement = tmp_path / "replacement.txt"
+        _write(replacement, 42)
+        replacement.replace(path)
+
+        assert read_revision(path) == 42
+
+
+class TestRetryOnConflict:
+    """retry_on_conflict のテスト"""
+
+    @pytest.mark.unit
+    def test_retries_with_fresh_document(self, tmp_path: Path) -> None:
+        """競合時は最新を読み直して mutate をやり直す"""
+        path = tmp_path / "GrandDigest.txt"
+        _write(path, 1, items=[])
+        seen: List[int] = []
+
+        def load() -> Dict[str, Any]:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if not seen:
+                # 1回目の読み込み直後に別の書き込みが割り込む
+                save_with_revision(path, {"metadata": {}, "items": ["theirs"]})
+            return data
+
+        def save(data: Dict[str, Any], expected_revision: int) -> None:
+            save_with_revision(path, data, expected_revision)
+
+        def mutate(data: Dict[str, Any]) -> None:
+            seen.append(get_revision(data))
+            data["items"].append("ours")
+
+        result = retry_on_conflict(load, save, mutate)
+
+        assert seen == [1, 2]
+        assert result["items"] == ["theirs", "ours"]
+        assert get_revision(result) == 3
+
+    @pytest.mark.unit
+    def test_gives_up_after_max_retries(self, tmp_path: Path) -> None:
+        """再試行回数を超えたら RevisionConflictError"""
+        calls: List[int] = []
+
+        def save(data: Dict[str, Any], expected_revision: int) -> None:
+            calls.append(expected_revision)
+            raise RevisionConflictError("conflict", expected=expected_revision, actual=99)
+
+        with pytest.raises(RevisionConflictError):
+            retry_on_conflict(lambda: {"metadata": {}}, save, lambda data: None, max_retries=2)
+
+        assert len(calls) == 3
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+test_sharded_json.py
+====================
+
+infrastructure/sharded_json.py のテスト。
+レイアウトの選択、分割保存と復元、変更された項目のみの書き込み、revision の比較をテスト。
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from domain.exceptions import ConfigError, RevisionConflictError
+from infrastructure.sharded_json import ShardedJsonDocument, resolve_shadow_layout
+
+
+def _document() -> Dict[str, Any]:
+    return {
+        "metadata": {"version": "1.0", "last_updated": "2025-01-01T00:00:00"},
+        "latest_digests": {
+            "weekly": {"overall_digest": {"source_files": ["L00001.txt"]}},
+            "monthly": {"overall_digest": None},
+        },
+    }
+
+
+@pytest.fixture
+def document(tmp_path: Path) -> ShardedJsonDocument:
+    return ShardedJsonDocument(tmp_path / "ShadowGrandDigest.shards", "latest_digests")
+
+
+class TestResolveShadowLayout:
+    """resolve_shadow_layout のテスト"""
+
+    @pytest.mark.unit
+    def test_default_config_and_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """未指定なら single、config.json の storage.shadow_layout、環境変数が優先"""
+        monkeypatch.delenv("EPISODIC_RAG_SHADOW_LAYOUT", raising=False)
+        assert resolve_shadow_layout(None) == "single"
+        assert resolve_shadow_layout({"storage": {"shadow_layout": "Sharded"}}) == "sharded"
+        monkeypatch.setenv("EPISODIC_RAG_SHADOW_LAYOUT", "single")
+        assert resolve_shadow_layout({"storage": {"shadow_layout": "sharded"}}) == "single"
+
+    @pytest.mark.unit
+    def test_unknown_layout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """未知のレイアウトは ConfigError"""
+        monkeypatch.delenv("EPISODIC_RAG_SHADOW_LAYOUT", raising=False)
+        with pytest.raises(ConfigError, match="storage.shadow_layout"):
+            resolve_shadow_layout({"storage": {"shadow_layout": "split"}})
+
+
+class TestShardedJsonDocument:
+    """ShardedJsonDocument のテスト"""
+
+    @pytest.mark.unit
+    def test_roundtrip_preserves_order(self, document: ShardedJsonDocument) -> None:
+        """項目ごとのファイルに分割し、キー順序ごと復元する"""
+        assert document.load() is None
+        assert document.save(_document()) == 1
+
+        names = sorted(p.name for p in document.directory.glob("*.txt"))
+        assert names == ["_index.txt", "monthly.txt", "weekly.txt"]
+        loaded = document.load()
+        assert loaded is not None
+        assert list(loaded) == ["metadata", "latest_digests"]
+        assert list(loaded["latest_digests"]) == ["weekly", "monthly"]
+        assert loaded["metadata"]["revision"] == 1
+        assert document.load_item("monthly") == {"overall_digest": None}
+
+    @pytest.mark.unit
+    def test_only_changed_items_written(self, document: ShardedJsonDocument) -> None:
+        """変更された項目のファイルだけを書き直す"""
+        data = _document()
+        document.save(data)
+        assert document.last_written == ["weekly", "monthly"]
+        monthly_mtime = document.item_path("monthly").stat().st_mtime_ns
+
+        data["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00002.txt")
+        assert document.save(data) == 2
+
+        assert document.last_written == ["weekly"]
+        assert document.item_path("monthly").stat().st_mtime_ns == monthly_mtime
+        weekly = json.loads(document.item_path("weekly").read_text(encoding="utf-8"))
+        assert weekly["overall_digest"]["source_files"] == ["L00001.txt", "L00002.txt"]
+
+    @pytest.mark.unit
+    def test_unchanged_save_writes_nothing(self, document: ShardedJsonDocument) -> None:
+        """項目もインデックス（last_updated 以外）も同じなら revision を進めない"""
+        document.save(_document())
+        index_mtime = document.index_file.stat().st_mtime_ns
+        data = _document()
+        data["metadata"]["last_updated"] = "2099-01-01T00:00:00"
+
+        assert document.save(data) == 1
+
+        assert document.last_written == []
+        assert document.index_file.stat().st_mtime_ns == index_mtime
+        assert data["metadata"]["revision"] == 1
+
+    @pytest.mark.unit
+    def test_removed_items_deleted(self, document: ShardedJsonDocument) -> None:
+        """文書から消えた項目のファイルは削除され、load_item は KeyError"""
+        data = _document()
+        document.save(data)
+        del data["latest_digests"]["monthly"]
+        document.save(data)
+
+        assert not document.item_path("monthly").exists()
+        assert document.items() == ["weekly"]
+        with pytest.raises(KeyError):
+            document.load_item("monthly")
+
+    @pytest.mark.unit
+    def test_revision_conflict(self, document: ShardedJsonDocument) -> None:
+        """期待リビジョンが異なれば RevisionConflictError で何も書かない"""
+        document.save(_document())
+        second = _document()
+        second["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00002.txt")
+        document.save(second)
+        changed = _document()
+        changed["latest_digests"]["monthly"] = {"overall_digest": {"source_files": []}}
+
+        with pytest.raises(RevisionConflictError) as exc_info:
+            document.save(changed, expected_revision=1)
+
+        assert (exc_info.value.expected, exc_info.value.actual) == (1, 2)
+        assert document.load_item("monthly") == {"overall_digest": None}
+        assert document.revision() == 2
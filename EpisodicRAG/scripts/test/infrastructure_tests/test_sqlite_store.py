@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+test_sqlite_store.py
+====================
+
+infrastructure/sqlite_store.py のテスト。
+バックエンドの選択、文書の行分割保存と revision の比較、
+RegularDigest / source_links の記録と逆引き、digest_times をテスト。
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from domain.exceptions import ConfigError, FileIOError, RevisionConflictError
+from infrastructure.sqlite_store import (
+    SqliteDigestStore,
+    open_digest_store,
+    reset_digest_stores,
+    resolve_storage_backend,
+)
+
+
+def _document() -> Dict[str, Any]:
+    return {
+        "metadata": {"version": "1.0", "last_updated": "2025-01-01T00:00:00"},
+        "latest_digests": {
+            "weekly": {"overall_digest": {"source_files": ["L00001.txt"]}},
+            "monthly": {"overall_digest": None},
+        },
+    }
+
+
+def _digest(name: str, sources: List[str]) -> Dict[str, Any]:
+    return {
+        "metadata": {"digest_level": "weekly"},
+        "overall_digest": {"name": name, "source_files": sources},
+        "individual_digests": [{"source_file": s, "abstract": s} for s in sources],
+    }
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SqliteDigestStore:
+    db = SqliteDigestStore(tmp_path / "EpisodicRAG.db")
+    yield db
+    db.close()
+
+
+class TestResolveStorageBackend:
+    """resolve_storage_backend のテスト"""
+
+    @pytest.mark.unit
+    def test_default_json(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """未指定なら json"""
+        monkeypatch.delenv("EPISODIC_RAG_STORAGE_BACKEND", raising=False)
+        assert resolve_storage_backend({}) == "json"
+        assert resolve_storage_backend(None) == "json"
+
+    @pytest.mark.unit
+    def test_config_and_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """config.json の storage.backend、環境変数が優先"""
+        monkeypatch.delenv("EPISODIC_RAG_STORAGE_BACKEND", raising=False)
+        assert resolve_storage_backend({"storage": {"backend": "SQLite"}}) == "sqlite"
+        monkeypatch.setenv("EPISODIC_RAG_STORAGE_BACKEND", "json")
+        assert resolve_storage_backend({"storage": {"backend": "sqlite"}}) == "json"
+
+    @pytest.mark.unit
+    def test_unknown_backend(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """未知のバックエンドは ConfigError"""
+        monkeypatch.delenv("EPISODIC_RAG_STORAGE_BACKEND", raising=False)
+        with pytest.raises(ConfigError, match="storage.backend"):
+            resolve_storage_backend({"storage": {"backend": "redis"}})
+
+
+class TestDocuments:
+    """文書（Shadow / Grand）の保存・読み込み"""
+
+    @pytest.mark.unit
+    def test_roundtrip_preserves_order(self, store: SqliteDigestStore) -> None:
+        """保存した文書をキー順序ごと復元し、revision を付与する"""
+        assert store.load_document("ShadowGrandDigest.txt") is None
+        assert store.save_document("ShadowGrandDigest.txt", _document()) == 1
+
+        loaded = store.load_document("ShadowGrandDigest.txt")
+        assert loaded is not None
+        assert list(loaded["latest_digests"]) == ["weekly", "monthly"]
+        assert loaded["latest_digests"]["monthly"] == {"overall_digest": None}
+        assert loaded["metadata"]["revision"] == 1
+
+    @pytest.mark.unit
+    def test_only_changed_sections_rewritten(self, store: SqliteDigestStore) -> None:
+        """1階層の変更では、その行だけが書き換わる"""
+        data = _document()
+        store.save_document("ShadowGrandDigest.txt", data)
+        conn = store._connection()
+        before = conn.total_changes
+
+        data["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00002.txt")
+        store.save_document("ShadowGrandDigest.txt", data)
+
+        # documents の revision 行 + metadata（revision が変わる）+ weekly の行
+        assert conn.total_changes - before == 3
+
+    @pytest.mark.unit
+    def test_removed_sections_deleted(self, store: SqliteDigestStore) -> None:
+        """文書から消えたキーの行は削除される"""
+        data = _document()
+        store.save_document("ShadowGrandDigest.txt", data)
+        del data["latest_digests"]["monthly"]
+        store.save_document("ShadowGrandDigest.txt", data)
+
+        loaded = store.load_document("ShadowGrandDigest.txt")
+        assert loaded is not None
+        assert list(loaded["latest_digests"]) == ["weekly"]
+
+    @pytest.mark.unit
+    def test_revision_conflict(self, store: SqliteDigestStore) -> None:
+        """期待リビジョンが異なれば RevisionConflictError で保存しない"""
+        store.save_document("GrandDigest.txt", _document())
+        store.save_document("GrandDigest.txt", _document())
+
+        with pytest.raises(RevisionConflictError) as exc_info:
+            store.save_document("GrandDigest.txt", {"metadata": {}}, expected_revision=1)
+
+        assert (exc_info.value.expected, exc_info.value.actual) == (1, 2)
+        assert store.document_revision("GrandDigest.txt") == 2
+        assert "latest_digests" in (store.load_document("GrandDigest.txt") or {})
+
+    @pytest.mark.integration
+    def test_concurrent_threads(self, store: SqliteDigestStore) -> None:
+        """スレッドごとの接続で並行に保存しても revision が失われない"""
+
+        def save() -> None:
+            for _ in range(10):
+                store.save_document("GrandDigest.txt", _document())
+
+        threads = [threading.Thread(target=save) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert store.document_revision("GrandDigest.txt") == 40
+
+
+class TestTransactions:
+    """書き込みトランザクションの後始末"""
+
+    @pytest.mark.unit
+    def test_failed_statement_wrapped(self, store: SqliteDigestStore) -> None:
+        """トランザクション内の sqlite3.Error は FileIOError になり、ロールバックされる"""
+        with pytest.raises(FileIOError):
+            with store._transaction() as conn:
+                conn.execute("INSERT INTO missing_table VALUES (1)")
+
+        assert not store._connection().in_transaction
+
+    @pytest.mark.unit
+    def test_failed_commit_rolled_back(self, store: SqliteDigestStore) -> None:
+        """COMMIT が失敗しても接続にトランザクションを残さない"""
+        with pytest.raises(FileIOError):
+            with store._transaction() as conn:
+                conn.execute("PRAGMA defer_foreign_keys = ON")
+                conn.execute(
+                    "INSERT INTO document_sections (name, section, item, position, body) "
+                    "VALUES ('missing', 'metadata', '', 0, '{}')"
+                )
+
+        assert not store._connection().in_transaction
+        assert store.save_document("GrandDigest.txt", _document()) == 1
+
+
+class TestMirroredDocuments:
+    """テキストの写し（ShadowGrandDigest.txt）との同期"""
+
+    @pytest.mark.unit
+    def test_save_exports_mirror(self, store: SqliteDigestStore, tmp_path: Path) -> None:
+        """保存のたびに写しを書き出し、未編集なら DB の文書を返す"""
+        mirror = tmp_path / "ShadowGrandDigest.txt"
+        store.save_mirrored_document(mirror.name, _document(), mirror)
+
+        assert json.loads(mirror.read_text(encoding="utf-8"))["metadata"]["revision"] == 1
+        assert store.load_mirrored_document(mirror.name, mirror) == store.load_document(mirror.name)
+        assert store.document_revision(mirror.name) == 1
+
+    @pytest.mark.unit
+    def test_edited_mirror_imported(self, store: SqliteDigestStore, tmp_path: Path) -> None:
+        """書き出し後に編集された写しは DB に取り込まれる"""
+        mirror = tmp_path / "ShadowGrandDigest.txt"
+        store.save_mirrored_document(mirror.name, _document(), mirror)
+        edited = json.loads(mirror.read_text(encoding="utf-8"))
+        edited["latest_digests"]["weekly"]["overall_digest"]["source_files"].append("L00002.txt")
+        mirror.write_text(json.dumps(edited), encoding="utf-8")
+
+        loaded = store.load_mirrored_document(mirror.name, mirror)
+
+        assert loaded is not None
+        assert loaded["latest_digests"]["weekly"]["overall_digest"]["source_files"] == [
+            "L00001.txt",
+            "L00002.txt",
+        ]
+        assert store.load_document(mirror.name) == loaded
+        assert store.document_revision(mirror.name) == 2
+
+    @pytest.mark.unit
+    def test_save_after_edit_conflicts(self, store: SqliteDigestStore, tmp_path: Path) -> None:
+        """読み込み後に写しが編集されていれば、期待リビジョン付きの保存は競合になる"""
+        mirror = tmp_path / "ShadowGrandDigest.txt"
+        store.save_mirrored_document(mirror.name, _document(), mirror)
+        data = store.load_mirrored_document(mirror.name, mirror)
+        assert data is not None
+        edited = json.loads(mirror.read_text(encoding="utf-8"))
+        edited["latest_digests"]["monthly"] = {"overall_digest": {"source_files": ["W0001.txt"]}}
+        mirror.write_text(json.dumps(edited), encoding="utf-8")
+
+        with pytest.raises(RevisionConflictError):
+            store.save_mirrored_document(mirror.name, data, mirror, expected_revision=1)
+
+        stored = store.load_document(mirror.name)
+        assert stored is not None and stored["latest_digests"]["monthly"]["overall_digest"]
+
+    @pytest.mark.unit
+    def test_missing_mirror_regenerated(self, store: SqliteDigestStore, tmp_path: Path) -> None:
+        """写しがなければ DB の文書から書き出す（どちらにもなければ None）"""
+        mirror = tmp_path / "ShadowGrandDigest.txt"
+        assert store.load_mirrored_document(mirror.name, mirror) is None
+        assert not mirror.exists()
+
+        store.save_document(mirror.name, _document())
+        store.load_mirrored_document(mirror.name, mirror)
+
+        assert json.loads(mirror.read_text(encoding="utf-8")) == store.load_document(mirror.name)
+
+    @pytest.mark.unit
+    def test_broken_mirror_rejected(self, store: SqliteDigestStore, tmp_path: Path) -> None:
+        """JSON として不正な写しは FileIOError（DB の文書は変えない）"""
+        mirror = tmp_path / "ShadowGrandDigest.txt"
+        store.save_mirrored_document(mirror.name, _document(), mirror)
+        mirror.write_text("{broken", encoding="utf-8")
+
+        with pytest.raises(FileIOError):
+            store.load_mirrored_document(mirror.name, mirror)
+        assert store.document_revision(mirror.name) == 1
+
+
+class TestRegularDigests:
+    """RegularDigest と source_links"""
+
+    @pytest.mark.unit
+    def test_roundtrip_and_reverse_lookup(self, store: SqliteDigestStore) -> None:
+        """保存した RegularDigest を復元し、ソースファイルから逆引きできる"""
+        digest = _digest("W0002_b", ["L00003.txt", "L00004.txt"])
+        first = _digest("W0001_a", ["L00001.txt"])
+        store.save_regular_digests([("weekly", "W0002_b", digest), ("weekly", "W0001_a", first)])
+
+        assert store.load_regular_digest("weekly", "W0002_b") == digest
+        assert store.list_digest_names("weekly") == [("weekly", "W0001_a"), ("weekly", "W0002_b")]
+        assert store.count_digests() == 2
+        assert store.find_digests_by_source("L00004.txt") == [("weekly", "W0002_b")]
+
+    @pytest.mark.unit
+    def test_replace_drops_old_links(self, store: SqliteDigestStore) -> None:
+        """同名の再保存は個別ダイジェストとリンクを置き換える"""
+        store.save_regular_digest("weekly", "W0001_a", _digest("W0001_a", ["L00001.txt"]))
+        store.save_regular_digest("weekly", "W0001_a", _digest("W0001_a", ["L00002.txt"]))
+
+        assert store.find_digests_by_source("L00001.txt") == []
+        loaded = store.load_regular_digest("weekly", "W0001_a")
+        assert loaded is not None
+        assert [d["source_file"] for d in loaded["individual_digests"]] == ["L00002.txt"]
+
+
+class TestDigestTimes:
+    """digest_times のテスト"""
+
+    @pytest.mark.unit
+    def test_save_time_per_level(self, store: SqliteDigestStore) -> None:
+        """レベルごとに UPSERT し、他レベルの行は変えない"""
+        assert store.has_times() is False
+        store.save_time("weekly", "2025-01-01T00:00:00", 3)
+        store.save_time("loop", "2025-01-02T00:00:00", 12)
+        store.save_time("weekly", "2025-01-03T00:00:00", 4)
+
+        times = store.load_times()
+        assert times["weekly"] == {"timestamp": "2025-01-03T00:00:00", "last_processed": 4}
+        assert times["loop"]["last_processed"] == 12
+
+
+class TestSharedStore:
+    """open_digest_store のテスト"""
+
+    @pytest.mark.unit
+    def test_shared_per_path_and_wal(self, tmp_path: Path) -> None:
+        """同じ Essences では同一インスタンス、WAL モードで作成"""
+        store = open_digest_store(tmp_path)
+        assert open_digest_store(tmp_path) is store
+        assert store.db_path == tmp_path / "EpisodicRAG.db"
+        assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        reset_digest_stores()
+        assert open_digest_store(tmp_path) is not store
+
+    @pytest.mark.unit
+    def test_closed_connection(self, tmp_path: Path) -> None:
+        """close 後は新しい接続を開き直す"""
+        store = SqliteDigestStore(tmp_path / "EpisodicRAG.db")
+        conn = store._connection()
+        store.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert store.count_digests() == 0
+        store.close()
@@ -8,19 +8,25 @@ infrastructure/structured_logging.py のテスト
 - StructuredLogger クラスの初期化と各メソッド
 - _format_context ヘルパー
 - get_structured_logger ファクトリ関数
+- DEBUG 無効時の遅延フォーマット（lazy）
+- span による処理区間の計測
 """
 
 import logging
+from typing import List
+from unittest.mock import patch
 
 import pytest
 
 from domain.constants import (
     LOG_PREFIX_DECISION,
     LOG_PREFIX_FILE,
+    LOG_PREFIX_SPAN,
     LOG_PREFIX_STATE,
     LOG_PREFIX_VALIDATE,
 )
-from infrastructure.structured_logging import StructuredLogger, get_structured_logger
+from infrastructure.logging_config import log_debug
+from infrastructure.structured_logging import StructuredLogger, get_structured_logger, lazy
 
 # =============================================================================
 # TestStructuredLoggerInit - 初期化テスト
@@ -386,3 +392,138 @@ class TestStructuredLoggerIntegration:
             logger.state("should_not_appear")
 
         assert "should_not_appear" not in caplog.text
+
+
+# =============================================================================
+# TestLazyFormatting - 遅延フォーマットテスト
+# =============================================================================
+
+
+class TestLazyFormatting:
+    """DEBUG が無効なときに何も組み立てないことのテスト"""
+
+    @pytest.mark.unit
+    def test_suppressed_call_does_not_evaluate(self, caplog: pytest.LogCaptureFixture) -> None:
+        """INFOレベルでは lazy() の関数も __str__ も呼ばれない"""
+        logger = get_structured_logger("test")
+        calls: List[str] = []
+
+        class Tracked:
+            def __str__(self) -> str:
+                calls.append("str")
+                return "tracked"
+
+        with caplog.at_level(logging.INFO, logger="episodic_rag"):
+            assert not logger.is_enabled()
+            logger.state("suppressed", value=Tracked(), keys=lazy(lambda: calls.append("lazy")))
+
+        assert calls == []
+
+    @pytest.mark.unit
+    def test_enabled_call_evaluates_lazy_values(self, caplog: pytest.LogCaptureFixture) -> None:
+        """DEBUGレベルでは出力時に lazy() の関数が呼ばれる"""
+        logger = get_structured_logger("test")
+
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            assert logger.is_enabled()
+            logger.file_op("new_files", names=lazy(lambda: ["a.txt", "b.txt"]))
+
+        assert "[FILE] new_files: names=['a.txt', 'b.txt']" in caplog.text
+
+    @pytest.mark.unit
+    def test_log_debug_with_args(self, caplog: pytest.LogCaptureFixture) -> None:
+        """log_debug は %-style の引数を出力時に埋め込む"""
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            log_debug("%s keys=%s", LOG_PREFIX_VALIDATE, lazy(lambda: ["metadata"]))
+
+        assert "[VALIDATE] keys=['metadata']" in caplog.text
+
+
+# =============================================================================
+# TestSpan - 処理区間の計測テスト
+# =============================================================================
+
+
+class TestSpan:
+    """StructuredLogger.span のテスト"""
+
+    @staticmethod
+    def _spans(caplog: pytest.LogCaptureFixture) -> List[logging.LogRecord]:
+        return [r for r in caplog.records if getattr(r, "kind", None) == "span"]
+
+    @pytest.mark.unit
+    def test_span_logs_duration_and_context(self, caplog: pytest.LogCaptureFixture) -> None:
+        """終了時に所要時間・ステータス・書き込んだコンテキストを出力"""
+        logger = get_structured_logger("test.module")
+
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            with logger.span("cascade.promote", level="weekly") as span:
+                span["files_processed"] = 3
+
+        (record,) = self._spans(caplog)
+        assert record.levelno == logging.DEBUG
+        assert record.event == "cascade.promote"
+        assert record.source == "test.module"
+        assert record.context == {"level": "weekly", "files_processed": 3}
+        assert record.status == "ok"
+        assert record.duration_ms >= 0
+        assert len(record.span_id) == 16
+        assert f"{LOG_PREFIX_SPAN} cascade.promote: level=weekly files_processed=3" in caplog.text
+
+    @pytest.mark.unit
+    def test_nested_spans_and_events_share_ids(self, caplog: pytest.LogCaptureFixture) -> None:
+        """入れ子の span は parent_id、区間内のログは span_id で対応付けられる"""
+        logger = get_structured_logger("test")
+
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            with logger.span("outer"):
+                with logger.span("inner"):
+                    logger.state("inside", count=1)
+            logger.state("outside")
+
+        inner, outer = self._spans(caplog)
+        inside, outside = [r for r in caplog.records if getattr(r, "kind", None) == "state"]
+        assert (outer.event, outer.parent_id) == ("outer", None)
+        assert inner.parent_id == outer.span_id
+        assert inside.span_id == inner.span_id
+        assert inside.context == {"count": 1}
+        assert outside.span_id is None
+
+    @pytest.mark.unit
+    def test_span_records_error_and_reraises(self, caplog: pytest.LogCaptureFixture) -> None:
+        """例外で抜けると status=error を出力し、例外はそのまま送出する"""
+        logger = get_structured_logger("test")
+
+        with caplog.at_level(logging.DEBUG, logger="episodic_rag"):
+            with pytest.raises(ValueError):
+                with logger.span("failing"):
+                    raise ValueError("boom")
+
+        (record,) = self._spans(caplog)
+        assert record.status == "error"
+
+    @pytest.mark.unit
+    def test_span_is_silent_at_info_level(self, caplog: pytest.LogCaptureFixture) -> None:
+        """INFOレベルでは何も出力せず、コンテキストへの書き込みだけ受け付ける"""
+        logger = get_structured_logger("test")
+
+        with caplog.at_level(logging.INFO, logger="episodic_rag"):
+            with logger.span("quiet", level="weekly") as span:
+                span["files_processed"] = 1
+
+        assert caplog.records == []
+
+    @pytest.mark.unit
+    def test_span_uses_info_in_json_mode(self, caplog: pytest.LogCaptureFixture) -> None:
+        """JSON Lines 出力が有効なら INFO レベルで出力する"""
+        logger = get_structured_logger("test")
+
+        with (
+            patch("infrastructure.structured_logging.json_log_enabled", return_value=True),
+            caplog.at_level(logging.INFO, logger="episodic_rag"),
+        ):
+            with logger.span("cascade"):
+                pass
+
+        (record,) = self._spans(caplog)
+        assert record.levelno == logging.INFO
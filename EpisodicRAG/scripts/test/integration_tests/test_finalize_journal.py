@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+test_finalize_journal.py
+========================
+
+finalize の途中で落ちた場合の、ジャーナルによる復旧の統合テスト。
+各ステップの直後でプロセスが落ちたものとして例外を送出し、
+次の DigestFinalizerFromShadow が起動時に残りのステップを実行することを確認する。
+"""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+from unittest.mock import patch
+
+import pytest
+from test_helpers import create_test_loop_file
+
+from application.config import DigestConfig
+from application.finalize import DigestPersistence, FinalizeTransaction
+from interfaces.finalize_from_shadow import DigestFinalizerFromShadow
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+class _Crash(BaseException):
+    """プロセスの異常終了の代わり（except Exception で捕捉されない）"""
+
+
+@pytest.fixture
+def env(temp_plugin_env: "TempPluginEnvironment") -> "TempPluginEnvironment":
+    temp_plugin_env.create_grand_digest()
+    temp_plugin_env.create_shadow_digest(
+        level="weekly", source_files=["L00001_test.txt", "L00002_test.txt"]
+    )
+    temp_plugin_env.create_last_digest_times()
+    create_test_loop_file(temp_plugin_env.loops_path, 1)
+    create_test_loop_file(temp_plugin_env.loops_path, 2)
+    return temp_plugin_env
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _weekly_grand(env: "TempPluginEnvironment") -> Any:
+    return _read(env.essences_path / "GrandDigest.txt")["major_digests"]["weekly"]["overall_digest"]
+
+
+class TestFinalizeCrashRecovery:
+    """クラッシュ後の再実行・ロールバック"""
+
+    @pytest.mark.integration
+    def test_replay_after_crash_before_grand(self, env: "TempPluginEnvironment") -> None:
+        """RegularDigest 保存後に落ちたら、次回起動時に処理2〜5を再実行する"""
+        with patch.object(DigestPersistence, "update_grand_digest", side_effect=_Crash):
+            with pytest.raises(_Crash):
+                DigestFinalizerFromShadow(DigestConfig()).finalize_from_shadow("weekly", "Crash")
+
+        assert list((env.digests_path / "1_Weekly").glob("W0001_*.txt"))
+        assert _weekly_grand(env) is None
+
+        finalizer = DigestFinalizerFromShadow(DigestConfig())
+        results = finalizer.recover_pending()
+
+        assert [r["action"] for r in results] == ["replayed"]
+        assert results[0]["steps"] == [
+            "grand_digest",
+            "shadow_cascade",
+            "digest_times",
+            "provisional_cleanup",
+        ]
+        assert "Crash" in _weekly_grand(env)["name"]
+        times = _read(env.persistent_config_dir / "last_digest_times.json")
+        assert times["weekly"]["last_processed"] == 1
+        shadow = _read(env.essences_path / "ShadowGrandDigest.txt")
+        assert shadow["latest_digests"]["weekly"]["overall_digest"]["source_files"] == []
+        assert finalizer._journal.path.read_text(encoding="utf-8") == ""
+
+    @pytest.mark.integration
+    def test_cascade_not_reapplied(self, env: "TempPluginEnvironment") -> None:
+        """カスケード保存後・完了記録前に落ちても、カスケードは再実行しない"""
+        original_done = FinalizeTransaction.done
+
+        def crash_after_cascade(txn: FinalizeTransaction, step: str) -> None:
+            if step == "shadow_cascade":
+                raise _Crash()
+            original_done(txn, step)
+
+        with patch.object(FinalizeTransaction, "done", crash_after_cascade):
+            with pytest.raises(_Crash):
+                DigestFinalizerFromShadow(DigestConfig()).finalize_from_shadow("weekly", "Crash")
+
+        shadow_file = env.essences_path / "ShadowGrandDigest.txt"
+        revision = _read(shadow_file)["metadata"]["revision"]
+
+        with patch(
+            "application.grand.ShadowGrandDigestManager.cascade_update_on_digest_finalize"
+        ) as cascade:
+            results = DigestFinalizerFromShadow(DigestConfig()).recover_pending()
+
+        cascade.assert_not_called()
+        assert results[0]["steps"] == ["digest_times", "provisional_cleanup"]
+        assert _read(shadow_file)["metadata"]["revision"] == revision
+
+    @pytest.mark.integration
+    def test_rollback_and_next_finalize(self, env: "TempPluginEnvironment") -> None:
+        """RegularDigest 保存前に落ちた finalize は中止され、次の finalize が通常どおり進む"""
+        with patch.object(DigestPersistence, "save_regular_digest", side_effect=_Crash):
+            with pytest.raises(_Crash):
+                DigestFinalizerFromShadow(DigestConfig()).finalize_from_shadow("weekly", "Crash")
+
+        DigestFinalizerFromShadow(DigestConfig()).finalize_from_shadow("weekly", "Retry")
+
+        names = [p.name for p in (env.digests_path / "1_Weekly").glob("W*.txt")]
+        assert names == ["W0001_Retry.txt"]
+        assert (env.essences_path / "FinalizeJournal.jsonl").read_text(encoding="utf-8") == ""
+
+    @pytest.mark.integration
+    def test_keyboard_interrupt_aborts(self, env: "TempPluginEnvironment") -> None:
+        """RegularDigest 保存前の Ctrl-C（上書き確認中等）は中止として記録し、復旧しない"""
+        with patch.object(DigestPersistence, "save_regular_digest", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                DigestFinalizerFromShadow(DigestConfig()).finalize_from_shadow("weekly", "Cancel")
+
+        finalizer = DigestFinalizerFromShadow(DigestConfig())
+        assert finalizer._journal.pending() == []
+        assert finalizer.recover_pending() == []
+        assert _weekly_grand(env) is None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+診断CLIの分析キャッシュのテスト
+================================
+
+DigestAutoAnalyzer / DigestReadinessChecker / ShadowStateChecker /
+digest_entry.get_new_loops を続けて呼んだとき、2回目は入力を読み直さずに
+分析キャッシュの結果を返し、永続化層の書き込み後は再計算することをテスト。
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.file_index import RACY_WINDOW_NS
+from infrastructure.json_repository import load_json, save_json
+from interfaces.digest_auto import DigestAutoAnalyzer
+from interfaces.digest_entry import get_new_loops, get_paths_from_config
+from interfaces.digest_readiness import DigestReadinessChecker
+from interfaces.shadow_state_checker import ShadowStateChecker
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+def _settle(env: "TempPluginEnvironment") -> None:
+    """全てのファイル・ディレクトリの mtime を過去に設定（racyウィンドウ外にする）"""
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    for root in (env.plugin_root, env.persistent_config_dir):
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                os.utime(Path(dirpath) / name, ns=(past, past))
+            os.utime(dirpath, ns=(past, past))
+
+
+@pytest.fixture
+def cache_env(
+    temp_plugin_env: "TempPluginEnvironment", monkeypatch: pytest.MonkeyPatch
+) -> "TempPluginEnvironment":
+    """Loop 3件・Shadow・Grand・空の last_digest_times を持つ環境"""
+    from test_helpers import create_test_loop_file
+
+    monkeypatch.setenv("EPISODICRAG_CONFIG_DIR", str(temp_plugin_env.persistent_config_dir))
+    for number in range(1, 4):
+        create_test_loop_file(temp_plugin_env.loops_path, number)
+    temp_plugin_env.create_shadow_digest(
+        source_files=["L00001_test.txt", "L00002_test.txt", "L00003_test.txt"]
+    )
+    temp_plugin_env.create_grand_digest()
+    (temp_plugin_env.persistent_config_dir / "last_digest_times.json").write_text(
+        "{}", encoding="utf-8"
+    )
+    _settle(temp_plugin_env)
+    return temp_plugin_env
+
+
+class TestBackToBackChecks:
+    """2回目の呼び出しがキャッシュから返ることのテスト"""
+
+    @pytest.mark.integration
+    def test_shadow_state_checker(self, cache_env: "TempPluginEnvironment") -> None:
+        """2回目は Shadow を読まない"""
+        first = ShadowStateChecker().check("weekly")
+
+        with patch.object(ShadowStateChecker, "_check_shadow") as check_shadow:
+            second = ShadowStateChecker().check("weekly")
+
+        check_shadow.assert_not_called()
+        assert first.source_count == 3
+        assert second == first
+
+    @pytest.mark.integration
+    def test_digest_readiness(self, cache_env: "TempPluginEnvironment") -> None:
+        """2回目は Shadow・Provisional を読まない"""
+        first = DigestReadinessChecker().check("weekly")
+
+        with patch.object(DigestReadinessChecker, "_check_readiness") as check_readiness:
+            second = DigestReadinessChecker().check("weekly")
+
+        check_readiness.assert_not_called()
+        assert first.status == "ok"
+        assert second == first
+
+    @pytest.mark.integration
+    def test_digest_auto(self, cache_env: "TempPluginEnvironment") -> None:
+        """2回目はワークスペースを走査しない"""
+        first = DigestAutoAnalyzer().analyze()
+
+        with patch.object(DigestAutoAnalyzer, "capture_snapshot") as capture:
+            second = DigestAutoAnalyzer().analyze()
+
+        capture.assert_not_called()
+        assert first.status == "warning"
+        assert second == first
+
+    @pytest.mark.integration
+    def test_new_loops(self, cache_env: "TempPluginEnvironment") -> None:
+        """2回目は DigestConfig / ShadowGrandDigestManager を作らない"""
+        paths = get_paths_from_config()
+        first = get_new_loops(paths)
+
+        with patch("application.grand.ShadowGrandDigestManager") as manager:
+            second = get_new_loops(paths)
+
+        manager.assert_not_called()
+        assert first == ["L00001_test", "L00002_test", "L00003_test"]
+        assert second == first
+
+
+class TestInvalidationByWrites:
+    """永続化層の書き込み後は再計算することのテスト"""
+
+    @pytest.mark.integration
+    def test_save_json_recomputes(self, cache_env: "TempPluginEnvironment") -> None:
+        """save_json で Shadow を書き換えると、次の確認は新しい内容を反映する"""
+        assert ShadowStateChecker().check("weekly").source_count == 3
+        shadow_file = cache_env.essences_path / "ShadowGrandDigest.txt"
+        shadow = load_json(shadow_file)
+        shadow["latest_digests"]["weekly"]["overall_digest"]["source_files"].append(
+            "L00004_test.txt"
+        )
+
+        save_json(shadow_file, shadow)
+        assert not (cache_env.essences_path / ".analysis_cache" / "AnalysisCache.json").exists()
+        _settle(cache_env)
+
+        assert ShadowStateChecker().check("weekly").source_count == 4
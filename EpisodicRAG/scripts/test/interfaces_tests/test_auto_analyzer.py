@@ -236,6 +236,32 @@ class TestDigestAutoAnalyzer(unittest.TestCase):
 
         assert len(result.recommendations) > 0
 
+    @pytest.mark.unit
+    def test_analyze_reports_pending_finalize(self) -> None:
+        """FinalizeJournal に残った未完了の確定処理を報告する"""
+        from application.finalize import FinalizeJournal
+        from interfaces.digest_auto import DigestAutoAnalyzer
+
+        journal = FinalizeJournal(self.plugin_root / "data" / "Essences")
+        txn = journal.begin("weekly", {"digest_name": "W0001_x", "digest_number": 1})
+        txn.run("regular_digest", lambda: None)
+
+        result = DigestAutoAnalyzer().analyze()
+
+        pending = [i for i in result.issues if i.type == "pending_finalize"]
+        assert len(pending) == 1
+        assert (pending[0].level, pending[0].files) == ("weekly", ["W0001_x"])
+        assert pending[0].details == {"txn": txn.txn_id, "completed": ["regular_digest"]}
+        assert result.status == "warning"
+        assert "Run /digest weekly again to recover the interrupted finalize" in (
+            result.recommendations
+        )
+
+        txn.commit()
+        assert not [
+            i for i in DigestAutoAnalyzer().analyze().issues if i.type == "pending_finalize"
+        ]
+
     @pytest.mark.unit
     def test_analyze_returns_error_when_config_missing(self) -> None:
         """設定ファイルがない場合にエラーを返す"""
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+digest_auto --watch のテスト
+============================
+
+WorkspaceSnapshot.refresh による変更検出、DigestAutoWatch の差分イベントと
+入力が変わったチェックだけの再計算、ChangeWatcher のバックエンドをテスト。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import pytest
+
+from infrastructure.change_watch import WATCH_BACKEND_POLL, ChangeWatcher
+from infrastructure.file_index import RACY_WINDOW_NS
+from interfaces.digest_auto import DigestAutoAnalyzer, DigestAutoWatch
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+def _settle(env: "TempPluginEnvironment") -> None:
+    """全てのファイル・ディレクトリの mtime を過去に設定（racyウィンドウ外にする）"""
+    past = time.time_ns() - RACY_WINDOW_NS * 100
+    for root in (env.plugin_root, env.persistent_config_dir):
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                os.utime(Path(dirpath) / name, ns=(past, past))
+            os.utime(dirpath, ns=(past, past))
+
+
+@pytest.fixture
+def watch_env(
+    temp_plugin_env: "TempPluginEnvironment", monkeypatch: pytest.MonkeyPatch
+) -> "TempPluginEnvironment":
+    """Loop 3件・Shadow・Grand を持つ環境（DigestAutoAnalyzer もこの環境を参照）"""
+    from test_helpers import create_test_loop_file
+
+    monkeypatch.setenv("EPISODICRAG_CONFIG_DIR", str(temp_plugin_env.persistent_config_dir))
+    for number in range(1, 4):
+        create_test_loop_file(temp_plugin_env.loops_path, number)
+    temp_plugin_env.create_shadow_digest(
+        source_files=["L00001_test.txt", "L00002_test.txt", "L00003_test.txt"]
+    )
+    temp_plugin_env.create_grand_digest()
+    _settle(temp_plugin_env)
+    return temp_plugin_env
+
+
+class TestSnapshotRefresh:
+    """WorkspaceSnapshot.refresh のテスト"""
+
+    @pytest.mark.integration
+    def test_unchanged_workspace(self, watch_env: "TempPluginEnvironment") -> None:
+        """変更がなければ何も読み直さず、変更集合は空"""
+        snapshot = DigestAutoAnalyzer().capture_snapshot()
+
+        refreshed, changed = snapshot.refresh()
+
+        assert changed == set()
+        assert refreshed.loops is snapshot.loops
+        assert refreshed.shadow is snapshot.shadow
+
+    @pytest.mark.integration
+    def test_detects_changed_inputs(self, watch_env: "TempPluginEnvironment") -> None:
+        """Loop の追加と last_digest_times の更新を検出し、他は読み直さない"""
+        from test_helpers import create_test_loop_file
+
+        snapshot = DigestAutoAnalyzer().capture_snapshot()
+        create_test_loop_file(watch_env.loops_path, 4)
+        (watch_env.persistent_config_dir / "last_digest_times.json").write_text(
+            json.dumps({"loop": {"last_processed": 3}}), encoding="utf-8"
+        )
+
+        refreshed, changed = snapshot.refresh()
+
+        assert changed == {"loops", "times"}
+        assert refreshed.loops.count() == 4
+        assert refreshed.last_processed_loop() == 3
+        assert refreshed.grand is snapshot.grand
+        assert refreshed.levels["weekly"] is snapshot.levels["weekly"]
+
+
+class TestDigestAutoWatch:
+    """DigestAutoWatch のテスト"""
+
+    @pytest.mark.integration
+    def test_new_loop_recomputes_weekly_checks_only(
+        self, watch_env: "TempPluginEnvironment"
+    ) -> None:
+        """新しい Loop が Shadow に入ると、weekly のチェックだけを再計算して差分を返す"""
+        from test_helpers import create_test_loop_file
+
+        session = DigestAutoWatch(DigestAutoAnalyzer())
+        first = session.start()
+        assert first["event"] == "snapshot"
+        assert first["result"]["issues"][0]["count"] == 3
+
+        create_test_loop_file(watch_env.loops_path, 5)
+        source_files = [f"L0000{n}_test.txt" for n in (1, 2, 3, 5)]
+        watch_env.create_shadow_digest(source_files=source_files)
+        delta = session.poll()
+
+        assert delta is not None
+        assert delta["event"] == "delta"
+        assert delta["changed_inputs"] == ["loops", "shadow"]
+        assert delta["recomputed"] == [
+            "unprocessed_loops",
+            "placeholders:weekly",
+            "gaps:weekly",
+            "level:weekly",
+            "pending_finalize",
+        ]
+        added = {issue["type"]: issue for issue in delta["issues_added"]}
+        assert added["gaps"]["details"]["missing"] == [4]
+        assert added["unprocessed_loops"]["count"] == 4
+        assert [status["level"] for status in delta["levels"]] == ["weekly"]
+        assert session.result == DigestAutoAnalyzer().analyze()
+
+    @pytest.mark.integration
+    def test_no_event_without_change(self, watch_env: "TempPluginEnvironment") -> None:
+        """結果が変わらなければイベントを返さない"""
+        session = DigestAutoWatch(DigestAutoAnalyzer())
+        session.start()
+
+        assert session.poll() is None
+
+    @pytest.mark.integration
+    def test_missing_shadow_and_recovery(self, watch_env: "TempPluginEnvironment") -> None:
+        """Shadow が消えるとエラー、戻ると全チェックをやり直す"""
+        session = DigestAutoWatch(DigestAutoAnalyzer())
+        session.start()
+        shadow_file = watch_env.essences_path / "ShadowGrandDigest.txt"
+        content = shadow_file.read_text(encoding="utf-8")
+
+        shadow_file.unlink()
+        error = session.poll()
+        shadow_file.write_text(content, encoding="utf-8")
+        recovered = session.poll()
+
+        assert error is not None and error["status"] == "error"
+        assert recovered is not None and recovered["status"] == "warning"
+        assert len(recovered["recomputed"]) == 1 + 8 * 3 + 1
+
+    @pytest.mark.integration
+    def test_run_emits_json_lines_events(self, watch_env: "TempPluginEnvironment") -> None:
+        """run() は初回の結果の後、変化がなければ何も出力しない"""
+        events: List[Dict[str, Any]] = []
+
+        DigestAutoWatch(DigestAutoAnalyzer()).run(
+            events.append, interval=0.01, backend=WATCH_BACKEND_POLL, max_polls=2
+        )
+
+        assert [event["event"] for event in events] == ["snapshot"]
+
+
+class TestChangeWatcher:
+    """ChangeWatcher のテスト"""
+
+    @pytest.mark.unit
+    def test_poll_backend_times_out(self, tmp_path: Path) -> None:
+        """poll バックエンドは interval だけ待って False"""
+        with ChangeWatcher([tmp_path], interval=0.01, backend=WATCH_BACKEND_POLL) as watcher:
+            assert watcher.backend == WATCH_BACKEND_POLL
+            assert watcher.wait() is False
+
+    @pytest.mark.unit
+    def test_inotify_backend_wakes_on_change(self, tmp_path: Path) -> None:
+        """inotify が使えれば、ファイル作成で wait() が True を返す"""
+        with ChangeWatcher([tmp_path], interval=5.0) as watcher:
+            if watcher.backend == WATCH_BACKEND_POLL:
+                pytest.skip("inotify is not available")
+            (tmp_path / "L00001_x.txt").write_text("{}", encoding="utf-8")
+            started = time.perf_counter()
+            assert watcher.wait() is True
+            assert time.perf_counter() - started < 5.0
+            assert watcher.wait(timeout=0.01) is False
+
+    @pytest.mark.unit
+    def test_missing_directories_fall_back_to_poll(self, tmp_path: Path) -> None:
+        """監視できるディレクトリがなければポーリング"""
+        with ChangeWatcher([tmp_path / "missing"], interval=0.01) as watcher:
+            assert watcher.backend == WATCH_BACKEND_POLL
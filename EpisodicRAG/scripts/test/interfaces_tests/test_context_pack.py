@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+context_pack.py のテスト
+========================
+
+build_context_pack と CLI エントリーポイントのテスト。
+"""
+
+import json
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from domain.file_constants import GRAND_DIGEST_FILENAME
+from interfaces.context_pack import build_context_pack, main
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+@pytest.fixture
+def grand_env(temp_plugin_env: "TempPluginEnvironment") -> "TempPluginEnvironment":
+    """weekly のみ確定済みの GrandDigest を配置した環境"""
+    overall = {"name": "W0001_検索", "keywords": ["索引"], "abstract": "検索の週。"}
+    (temp_plugin_env.essences_path / GRAND_DIGEST_FILENAME).write_text(
+        json.dumps({"major_digests": {"weekly": {"overall_digest": overall}}}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    return temp_plugin_env
+
+
+def _run_main(*argv: str) -> None:
+    with patch.object(sys, "argv", ["context_pack", *argv]):
+        main()
+
+
+class TestBuildContextPack:
+    """build_context_pack のテスト"""
+
+    @pytest.mark.integration
+    def test_returns_pack(self, grand_env: "TempPluginEnvironment") -> None:
+        """status と pack の各フィールドを返す"""
+        result = build_context_pack(budget=1000, unit="chars")
+
+        assert result["status"] == "ok"
+        assert result["full_levels"] == ["weekly"]
+        assert "検索の週。" in result["text"]
+        assert result["used"] <= 1000
+
+
+class TestContextPackCLI:
+    """CLI エントリーポイントのテスト"""
+
+    @pytest.mark.integration
+    def test_json_output(
+        self, grand_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """JSON形式で出力し、2回目はキャッシュを返す"""
+        _run_main("--budget", "500", "--unit", "chars")
+        first = json.loads(capsys.readouterr().out)
+        _run_main("--budget", "500", "--unit", "chars")
+        second = json.loads(capsys.readouterr().out)
+
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["text"] == first["text"]
+
+    @pytest.mark.integration
+    def test_text_output(
+        self, grand_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """テキスト形式ではパック本文のみ出力"""
+        _run_main("--output", "text", "--no-cache")
+
+        output = capsys.readouterr().out
+        assert output.startswith("# EpisodicRAG Context")
+        assert "## weekly: W0001_検索" in output
+
+    @pytest.mark.integration
+    def test_invalid_budget(
+        self, grand_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """負の予算はエラー出力"""
+        with pytest.raises(SystemExit) as exc_info:
+            _run_main("--budget", "-1")
+
+        assert exc_info.value.code == 1
+        assert json.loads(capsys.readouterr().out)["status"] == "error"
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+digest_backfill.py のテスト
+===========================
+
+Loop の一括取り込みによる全階層の確定、Shadow / Grand / last_digest_times /
+Provisional の書き込み、チェックポイントからの再開、プロセスプールでのパースをテスト。
+"""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from application.config import DigestConfig
+from application.grand import GrandDigestManager, ShadowGrandDigestManager
+from application.tracking import DigestTimesTracker
+from domain.file_constants import BACKFILL_CHECKPOINT_FILENAME
+from interfaces.digest_backfill import DigestBackfill
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+def _create_loops(env: "TempPluginEnvironment", count: int) -> None:
+    from test_helpers import create_test_loop_file
+
+    for number in range(1, count + 1):
+        create_test_loop_file(env.loops_path, number)
+
+
+class TestDigestBackfill:
+    """DigestBackfill.run のテスト（weekly_threshold=5, monthly_threshold=5）"""
+
+    @pytest.mark.integration
+    def test_builds_all_levels_bottom_up(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """57 Loop → Weekly 11件・Monthly 2件を確定し、残りを Shadow に積む"""
+        _create_loops(temp_plugin_env, 57)
+        config = DigestConfig()
+
+        report = DigestBackfill(config).run()
+
+        assert report["loops"] == 57
+        assert report["digests"] == {"weekly": 11, "monthly": 2}
+        weekly = sorted(p.name for p in (config.digests_path / "1_Weekly").glob("W*.txt"))
+        assert weekly[0] == "W0001_L00001-L00005.txt"
+        assert len(weekly) == 11
+
+        regular = json.loads((config.digests_path / "1_Weekly" / weekly[0]).read_text("utf-8"))
+        assert regular["metadata"]["generated_by"] == "digest_backfill"
+        assert regular["overall_digest"]["source_files"][0] == "L00001_test.txt"
+        assert regular["overall_digest"]["keywords"] == ["test", "sample"]
+        assert len(regular["individual_digests"]) == 5
+
+        shadow = ShadowGrandDigestManager(config)
+        weekly_shadow = shadow.get_shadow_digest_for_level("weekly")
+        monthly_shadow = shadow.get_shadow_digest_for_level("monthly")
+        quarterly_shadow = shadow.get_shadow_digest_for_level("quarterly")
+        assert weekly_shadow is not None and monthly_shadow is not None
+        assert quarterly_shadow is not None
+        assert weekly_shadow["source_files"] == ["L00056_test.txt", "L00057_test.txt"]
+        assert monthly_shadow["source_files"] == [weekly[-1]]
+        assert len(quarterly_shadow["source_files"]) == 2
+
+        grand = GrandDigestManager(config).load_or_create()
+        assert grand["major_digests"]["weekly"]["overall_digest"]["name"].startswith("W0011_")
+        assert grand["major_digests"]["monthly"]["overall_digest"]["name"].startswith("M0002_")
+
+        times = DigestTimesTracker(config).load_or_create()
+        assert times["loop"]["last_processed"] == 57
+        assert times["weekly"]["last_processed"] == 11
+        assert times["monthly"]["last_processed"] == 2
+
+        provisional = config.get_provisional_dir("monthly") / "M0003_Individual.txt"
+        entries = json.loads(provisional.read_text("utf-8"))["individual_digests"]
+        assert [e["source_file"] for e in entries] == [weekly[-1]]
+        assert not (config.essences_path / BACKFILL_CHECKPOINT_FILENAME).exists()
+
+    @pytest.mark.integration
+    def test_continues_from_existing_state(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """2回目の実行は last_processed より後の Loop だけを取り込み、Shadow の続きから確定"""
+        _create_loops(temp_plugin_env, 7)
+        config = DigestConfig()
+        DigestBackfill(config).run()
+
+        from test_helpers import create_test_loop_file
+
+        for number in range(8, 11):
+            create_test_loop_file(temp_plugin_env.loops_path, number)
+        report = DigestBackfill(config).run()
+
+        assert report["loops"] == 3
+        assert report["digests"] == {"weekly": 1}
+        assert (config.digests_path / "1_Weekly" / "W0002_L00006-L00010.txt").exists()
+        weekly_shadow = ShadowGrandDigestManager(config).get_shadow_digest_for_level("weekly")
+        assert weekly_shadow is None  # 全て確定済み
+
+    @pytest.mark.integration
+    def test_resumes_from_checkpoint(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """中断時のチェックポイントから再開し、同じ結果になる"""
+        _create_loops(temp_plugin_env, 30)
+        config = DigestConfig()
+        backfill = DigestBackfill(config)
+        with patch.object(backfill, "_write_outputs", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                backfill.run(checkpoint_interval=1)
+        checkpoint_path = config.essences_path / BACKFILL_CHECKPOINT_FILENAME
+
+        # 書き込み前に中断したため、Loop は全て読まれたが出力は未反映
+        checkpoint: Dict[str, Any] = json.loads(checkpoint_path.read_text("utf-8"))
+        assert checkpoint["last_loop"] == 30
+        assert checkpoint["digests"]["weekly"] == 6
+
+        report = DigestBackfill(config).run()
+
+        assert report["resumed"] is True
+        assert report["digests"] == {"weekly": 6, "monthly": 1}
+        times = DigestTimesTracker(config).load_or_create()
+        assert times["loop"]["last_processed"] == 30
+        assert times["weekly"]["last_processed"] == 6
+        assert not checkpoint_path.exists()
+
+    @pytest.mark.integration
+    def test_restart_ignores_checkpoint(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """restart=True ならチェックポイントを使わない"""
+        _create_loops(temp_plugin_env, 5)
+        config = DigestConfig()
+        (config.essences_path / BACKFILL_CHECKPOINT_FILENAME).write_text(
+            json.dumps({"version": 1, "last_loop": 5}), encoding="utf-8"
+        )
+
+        report = DigestBackfill(config).run(restart=True)
+
+        assert report["resumed"] is False
+        assert report["digests"] == {"weekly": 1}
+
+    @pytest.mark.integration
+    def test_process_pool_and_progress(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """workers=2 でもプロセスプールで同じ結果になり、進捗を報告する"""
+        _create_loops(temp_plugin_env, 23)
+        (temp_plugin_env.loops_path / "L00024_broken.txt").write_text("{", encoding="utf-8")
+        config = DigestConfig()
+        updates = []
+
+        report = DigestBackfill(config).run(workers=2, progress=updates.append)
+
+        assert report["loops"] == 23
+        assert report["skipped"] == 1
+        assert report["digests"] == {"weekly": 4}
+        assert updates[-1]["processed"] == updates[-1]["total"] == 24
+        assert updates[-1]["digests"]["weekly"] == 4
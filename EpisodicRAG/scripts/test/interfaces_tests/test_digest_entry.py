@@ -16,6 +16,7 @@ import pytest
 
 from interfaces.digest_entry import (
     DigestEntryResult,
+    compact_shadow_delta,
     format_text_output,
     get_paths_from_config,
     run_pattern1,
@@ -377,6 +378,34 @@ class TestFormatTextOutput:
         assert "他5個" in output
 
 
+# =============================================================================
+# compact_shadow_delta テスト
+# =============================================================================
+
+
+class TestCompactShadowDelta:
+    """compact_shadow_delta() のテスト"""
+
+    def test_skips_when_no_delta(self, tmp_path: Path) -> None:
+        """差分ログがなければ Shadow を読み込まない"""
+        with patch("application.grand.ShadowGrandDigestManager") as mock_manager:
+            compact_shadow_delta({"essences_path": tmp_path})
+
+        mock_manager.assert_not_called()
+
+    def test_compacts_pending_delta(self, tmp_path: Path) -> None:
+        """差分ログがあればベースへ書き戻す"""
+        (tmp_path / "ShadowGrandDigest.delta.jsonl").write_text(
+            '{"revision": 1, "ops": []}\n', encoding="utf-8"
+        )
+
+        with patch("application.config.DigestConfig"):
+            with patch("application.grand.ShadowGrandDigestManager") as mock_manager:
+                compact_shadow_delta({"essences_path": tmp_path})
+
+        mock_manager.return_value.compact.assert_called_once_with()
+
+
 # =============================================================================
 # CLI統合テスト
 # =============================================================================
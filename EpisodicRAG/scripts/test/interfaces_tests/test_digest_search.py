@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+digest_search.py のテスト
+=========================
+
+DigestSearcher クラスと CLI エントリーポイントのテスト。
+"""
+
+import json
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from interfaces.digest_search import DigestSearcher, format_text_results, main
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+@pytest.fixture
+def loops_env(temp_plugin_env: "TempPluginEnvironment") -> "TempPluginEnvironment":
+    """検索対象のLoopを配置した環境"""
+    for i, abstract in enumerate(["検索機能の設計を議論した。", "週末の旅行の計画を立てた。"], 1):
+        data = {"overall_digest": {"digest_type": "会話", "keywords": [], "abstract": abstract}}
+        (temp_plugin_env.loops_path / f"L{i:05d}_loop.txt").write_text(
+            json.dumps(data, ensure_ascii=False), encoding="utf-8"
+        )
+    return temp_plugin_env
+
+
+def _run_main(*argv: str) -> None:
+    with patch.object(sys, "argv", ["digest_search", *argv]):
+        main()
+
+
+class TestDigestSearcher:
+    """DigestSearcher のテスト"""
+
+    @pytest.mark.integration
+    def test_search_refreshes_and_returns_hits(self, loops_env: "TempPluginEnvironment") -> None:
+        """初回検索で索引を構築し、結果を返す"""
+        result = DigestSearcher().search("旅行の計画", top_k=5)
+
+        assert result["status"] == "ok"
+        assert result["refreshed"] == {"indexed": 2, "removed": 0}
+        assert result["results"][0]["file"] == "L00002_loop.txt"
+        assert result["elapsed_ms"] >= 0
+
+    @pytest.mark.integration
+    def test_no_refresh(self, loops_env: "TempPluginEnvironment") -> None:
+        """refresh=False は索引を更新しない"""
+        result = DigestSearcher().search("旅行", refresh=False)
+
+        assert "refreshed" not in result
+        assert result["results"] == []
+
+    @pytest.mark.integration
+    def test_rebuild(self, loops_env: "TempPluginEnvironment") -> None:
+        """rebuild は全件を再索引"""
+        result = DigestSearcher().rebuild()
+        assert result == {"status": "ok", "indexed": 2, "total_documents": 2}
+
+
+class TestDigestSearchCLI:
+    """CLI エントリーポイントのテスト"""
+
+    @pytest.mark.integration
+    def test_json_output(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """JSON形式で結果を出力"""
+        _run_main("検索機能", "--top-k", "1")
+
+        output = json.loads(capsys.readouterr().out)
+        assert [hit["file"] for hit in output["results"]] == ["L00001_loop.txt"]
+
+    @pytest.mark.integration
+    def test_text_output(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """テキスト形式で結果を出力"""
+        _run_main("検索機能", "--output", "text", "--level", "loop")
+
+        output = capsys.readouterr().out
+        assert "1. [loop] L00001_loop.txt" in output
+
+    @pytest.mark.integration
+    def test_beam_width_uses_hierarchical_search(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """--beam-width 指定時は階層ビームサーチ"""
+        with patch(
+            "application.search.DigestSearchIndex.search_hierarchical", return_value=[]
+        ) as hierarchical:
+            _run_main("検索機能", "--beam-width", "2")
+
+        assert hierarchical.call_args.kwargs["beam_width"] == 2
+        assert json.loads(capsys.readouterr().out)["results"] == []
+
+    @pytest.mark.integration
+    def test_similar_uses_vector_index(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """--similar はベクトル類似度で検索"""
+        with patch("application.search.DigestSearchIndex.most_similar", return_value=[]) as similar:
+            _run_main("旅行", "--similar", "--level", "loop")
+
+        assert similar.call_args.kwargs["levels"] == ["loop"]
+        assert json.loads(capsys.readouterr().out)["results"] == []
+
+    @pytest.mark.integration
+    def test_similar_to_shadow(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """--similar-to-shadow は Shadow の overall_digest に類似した文書を返す"""
+        loops_env.create_shadow_digest(
+            initial_data={
+                "metadata": {},
+                "latest_digests": {
+                    "weekly": {
+                        "overall_digest": {
+                            "digest_type": "統合",
+                            "keywords": ["旅行"],
+                            "abstract": "週末の旅行の計画を立てた週。",
+                            "impression": "",
+                        }
+                    }
+                },
+            }
+        )
+        _run_main("--similar-to-shadow", "weekly", "--level", "loop", "--top-k", "1")
+
+        output = json.loads(capsys.readouterr().out)
+        assert output["shadow_level"] == "weekly"
+        assert [hit["file"] for hit in output["results"]] == ["L00002_loop.txt"]
+
+    @pytest.mark.integration
+    def test_rebuild_only(
+        self, loops_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """クエリなしの --rebuild は再構築結果のみ出力"""
+        _run_main("--rebuild")
+
+        assert json.loads(capsys.readouterr().out)["indexed"] == 2
+
+    @pytest.mark.unit
+    def test_query_required(self) -> None:
+        """クエリも --rebuild もない場合はエラー"""
+        with pytest.raises(SystemExit) as exc_info:
+            _run_main()
+        assert exc_info.value.code == 2
+
+    @pytest.mark.unit
+    def test_format_no_results(self) -> None:
+        """結果なしの表示"""
+        assert format_text_results([]) == "該当なし"
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+digest_storage.py のテスト
+==========================
+
+storage_status / export_layout / import_layout と CLI エントリーポイントのテスト。
+"""
+
+import json
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from domain.file_constants import GRAND_DIGEST_FILENAME
+from interfaces.digest_storage import (
+    archive_old_files,
+    archive_status,
+    convert_shadow_layout,
+    export_layout,
+    import_layout,
+    main,
+    storage_status,
+)
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+def _run_main(*argv: str) -> None:
+    with patch.object(sys, "argv", ["digest_storage", *argv]):
+        main()
+
+
+class TestDigestStorage:
+    """取り込み・書き出し・状態表示のテスト"""
+
+    @pytest.mark.integration
+    def test_import_status_export(
+        self, temp_plugin_env: "TempPluginEnvironment", monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """テキストファイルを取り込み、DB から書き出し直せる"""
+        monkeypatch.setenv("EPISODIC_RAG_STORAGE_BACKEND", "sqlite")
+        grand_file = temp_plugin_env.create_grand_digest()
+
+        imported = import_layout()
+        assert imported["status"] == "ok"
+        assert imported["documents"] == [GRAND_DIGEST_FILENAME]
+
+        status = storage_status()
+        assert status["backend"] == "sqlite"
+        assert status["documents"] == {GRAND_DIGEST_FILENAME: 1}
+
+        grand_file.unlink()
+        exported = export_layout(include_digests=False)
+        assert exported["documents"] == [GRAND_DIGEST_FILENAME]
+        assert "major_digests" in json.loads(grand_file.read_text(encoding="utf-8"))
+
+    @pytest.mark.integration
+    def test_convert_shadow_layout(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """単一ファイルから分割レイアウトへ変換し、古くなる移行元は削除する"""
+        shadow_file = temp_plugin_env.create_shadow_digest(source_files=["L00001.txt"])
+
+        result = convert_shadow_layout("sharded")
+
+        assert result["status"] == "ok"
+        assert result["removed_source"] is True
+        assert not shadow_file.exists()
+        shard_dir = temp_plugin_env.essences_path / "ShadowGrandDigest.shards"
+        weekly = json.loads((shard_dir / "weekly.txt").read_text(encoding="utf-8"))
+        assert weekly["overall_digest"]["source_files"] == ["L00001.txt"]
+
+    @pytest.mark.integration
+    def test_archive_dry_run_and_status(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """未処理のファイルしかなければ対象なし、アーカイブもなし"""
+        temp_plugin_env.create_last_digest_times()
+
+        result = archive_old_files(min_age_years=0, dry_run=True)
+
+        assert result["status"] == "ok"
+        assert result["files"] == 0
+        assert archive_status()["total"]["saved_bytes"] == 0
+
+
+class TestDigestStorageCLI:
+    """CLI エントリーポイントのテスト"""
+
+    @pytest.mark.integration
+    def test_status_json_output(
+        self, temp_plugin_env: "TempPluginEnvironment", capsys: pytest.CaptureFixture
+    ) -> None:
+        """status サブコマンドは JSON を出力"""
+        _run_main("status")
+        result = json.loads(capsys.readouterr().out)
+
+        assert result["status"] == "ok"
+        assert result["digests"] == 0
+
+    @pytest.mark.unit
+    def test_shadow_layout_choices(self) -> None:
+        """shadow-layout は single / sharded のみ受け付ける"""
+        with pytest.raises(SystemExit):
+            _run_main("shadow-layout", "split")
+
+    @pytest.mark.unit
+    def test_archive_compression_choices(self) -> None:
+        """archive --compression は lzma / gzip のみ受け付ける"""
+        with pytest.raises(SystemExit):
+            _run_main("archive", "--compression", "zip")
+
+    @pytest.mark.unit
+    def test_command_required(self) -> None:
+        """サブコマンドなしは argparse エラー"""
+        with pytest.raises(SystemExit):
+            _run_main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+workspace_snapshot.py のテスト
+==============================
+
+config.json からのパス解決、各ディレクトリの走査、Shadow / Grand /
+last_digest_times の読み込みと、DigestAutoAnalyzer がスナップショットだけで
+分析することをテスト。
+"""
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from interfaces.digest_auto import DigestAutoAnalyzer
+from interfaces.workspace_snapshot import WorkspaceSnapshot, resolve_workspace_paths
+
+if TYPE_CHECKING:
+    from test_helpers import TempPluginEnvironment
+
+
+def _capture(env: "TempPluginEnvironment") -> WorkspaceSnapshot:
+    return WorkspaceSnapshot.capture(
+        env.persistent_config_dir / "config.json",
+        env.persistent_config_dir / "last_digest_times.json",
+    )
+
+
+class TestResolveWorkspacePaths:
+    """resolve_workspace_paths のテスト"""
+
+    @pytest.mark.unit
+    def test_requires_absolute_base_dir(self) -> None:
+        """base_dir が未設定・相対パスなら ValueError"""
+        with pytest.raises(ValueError):
+            resolve_workspace_paths({})
+        with pytest.raises(ValueError):
+            resolve_workspace_paths({"base_dir": "relative"})
+
+
+class TestWorkspaceSnapshot:
+    """WorkspaceSnapshot.capture のテスト"""
+
+    @pytest.mark.integration
+    def test_capture_reads_workspace_once(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """Loops・階層ディレクトリ・Shadow・Grand・last_digest_times をまとめて取得"""
+        from test_helpers import create_test_loop_file
+
+        for number in range(1, 4):
+            create_test_loop_file(temp_plugin_env.loops_path, number)
+        temp_plugin_env.create_shadow_digest()
+        temp_plugin_env.create_grand_digest()
+        (temp_plugin_env.persistent_config_dir / "last_digest_times.json").write_text(
+            json.dumps({"loop": {"last_processed": 1}}), encoding="utf-8"
+        )
+
+        snapshot = _capture(temp_plugin_env)
+
+        assert snapshot.loops.count() == 3
+        assert snapshot.loops.names_after(1) == ["L00002_test.txt", "L00003_test.txt"]
+        assert snapshot.levels["weekly"].count() == 0
+        assert snapshot.shadow is not None and "latest_digests" in snapshot.shadow
+        assert snapshot.grand is not None and "major_digests" in snapshot.grand
+        assert snapshot.last_processed_loop() == 1
+
+    @pytest.mark.integration
+    def test_analyze_uses_given_snapshot(self, temp_plugin_env: "TempPluginEnvironment") -> None:
+        """analyze(snapshot) はディレクトリを走査し直さない"""
+        from test_helpers import create_test_loop_file
+
+        for number in range(1, 6):
+            create_test_loop_file(temp_plugin_env.loops_path, number)
+        temp_plugin_env.create_shadow_digest()
+        temp_plugin_env.create_grand_digest()
+        snapshot = _capture(temp_plugin_env)
+
+        with patch("infrastructure.directory_scan.os.scandir") as scandir:
+            result = DigestAutoAnalyzer().analyze(snapshot)
+
+        scandir.assert_not_called()
+        assert result.issues[0].type == "unprocessed_loops"
+        assert result.issues[0].count == 5
+        assert [s.level for s in result.generatable_levels] == ["weekly"]
@@ -10,13 +10,14 @@ To run: pytest scripts/test/performance_tests/ -v --no-cov
 """
 
 import json
+import os
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, List
 
 if TYPE_CHECKING:
     from pathlib import Path
-    from typing import Any, Dict, List, Tuple
+    from typing import Any, Callable, Dict, List, Tuple
 
     from test_helpers import TempPluginEnvironment
 
@@ -355,6 +356,114 @@ class TestFileDetectionPerformance:
         print(f"\nFile detection: {elapsed:.3f}s for 10 iterations (1000 files)")
 
 
+@pytest.mark.performance
+@pytest.mark.slow
+class TestFileIndexPerformance:
+    """Performance tests for the persistent directory manifest index."""
+
+    def test_warm_index_queries_30000_loops(self, tmp_path: Path) -> None:
+        """Warm index lookups should not rescan a 30k-file Loops directory."""
+        import os
+
+        from infrastructure.file_index import RACY_WINDOW_NS, FileIndex
+
+        loops_dir = tmp_path / "Loops"
+        loops_dir.mkdir()
+        for i in range(1, 30001):
+            (loops_dir / f"L{i:05d}_TestLoop.txt").touch()
+        past = time.time_ns() - RACY_WINDOW_NS * 100
+        os.utime(loops_dir, ns=(past, past))
+
+        start = time.perf_counter()
+        FileIndex(loops_dir, "L*.txt").count()  # cold build + manifest save
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index = FileIndex(loops_dir, "L*.txt")  # fresh instance: manifest load only
+            assert index.max_number() == 30000
+            assert len(index.files_after(29990)) == 10
+            assert index.count() == 30000
+        warm = time.perf_counter() - start
+
+        assert cold < 5.0, f"Cold index build took {cold:.2f}s for 30000 files"
+        assert warm < 10.0, f"Warm index queries took {warm:.2f}s for 100 iterations"
+        print(f"\nFile index: cold {cold:.3f}s, warm {warm / 100 * 1000:.1f}ms/instance")
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestDigestAutoPerformance:
+    """Performance tests for the single-pass DigestAutoAnalyzer."""
+
+    @pytest.fixture
+    def analyzer_50000_loops(
+        self, temp_plugin_env: "TempPluginEnvironment", monkeypatch: pytest.MonkeyPatch
+    ):
+        """DigestAutoAnalyzer for a workspace with 50k Loops (10 unprocessed)."""
+        from infrastructure.file_index import RACY_WINDOW_NS
+        from interfaces.digest_auto import DigestAutoAnalyzer
+
+        monkeypatch.setenv("EPISODICRAG_CONFIG_DIR", str(temp_plugin_env.persistent_config_dir))
+        for i in range(1, 50001):
+            (temp_plugin_env.loops_path / f"L{i:05d}_TestLoop.txt").touch()
+        temp_plugin_env.create_shadow_digest()
+        temp_plugin_env.create_grand_digest()
+        (temp_plugin_env.persistent_config_dir / "last_digest_times.json").write_text(
+            json.dumps({"loop": {"last_processed": 49990}}), encoding="utf-8"
+        )
+        # Move the inputs out of the racy window so the analysis cache can be used
+        past = time.time_ns() - RACY_WINDOW_NS * 100
+        for root in (temp_plugin_env.plugin_root, temp_plugin_env.persistent_config_dir):
+            for dirpath, _, filenames in os.walk(root):
+                if Path(dirpath) != temp_plugin_env.loops_path:
+                    for name in filenames:
+                        os.utime(Path(dirpath) / name, ns=(past, past))
+                os.utime(dirpath, ns=(past, past))
+        return DigestAutoAnalyzer()
+
+    def test_analyze_50000_loops(self, analyzer_50000_loops) -> None:
+        """A full (uncached) analysis should take under 100ms on a 50k-Loop workspace."""
+        analyzer = analyzer_50000_loops
+
+        captures = []
+        timings = []
+        for _ in range(10):
+            start = time.perf_counter()
+            snapshot = analyzer.capture_snapshot()
+            captured = time.perf_counter()
+            # Passing the snapshot bypasses the analysis cache and runs every check
+            result = analyzer.analyze(snapshot)
+            timings.append(time.perf_counter() - start)
+            captures.append(captured - start)
+
+        assert result.status == "warning"
+        assert result.issues[0].count == 10
+        assert result.generatable_levels[0].current == 50000
+        best = min(timings)
+        assert best < 0.1, f"analyze() took {best * 1000:.1f}ms for 50000 loops"
+        print(
+            f"\nDigestAutoAnalyzer: best {best * 1000:.1f}ms for 50000 loops "
+            f"(capture {min(captures) * 1000:.1f}ms)"
+        )
+
+    def test_analyze_cache_hit_50000_loops(self, analyzer_50000_loops) -> None:
+        """Unchanged inputs should be answered from the analysis cache."""
+        analyzer = analyzer_50000_loops
+        expected = analyzer.analyze()
+
+        timings = []
+        for _ in range(10):
+            start = time.perf_counter()
+            result = analyzer.analyze()
+            timings.append(time.perf_counter() - start)
+
+        assert result == expected
+        best = min(timings)
+        assert best < 0.05, f"Cached analyze() took {best * 1000:.1f}ms for 50000 loops"
+        print(f"\nDigestAutoAnalyzer: cached {best * 1000:.2f}ms for 50000 loops")
+
+
 # =============================================================================
 # Shadow I/O Performance Tests
 # =============================================================================
@@ -418,6 +527,103 @@ class TestRegexPerformance:
         assert all(r is not None for r in results)
         print(f"\nRegex extraction: {elapsed:.3f}s for 10000 extractions")
 
+    def test_extract_file_number_100k(self) -> None:
+        """Per-name extraction over 100k names uses the cached compiled regex."""
+        from domain.file_naming import extract_file_number
+
+        filenames = [f"L{i:05d}_TestLoop.txt" for i in range(1, 100_001)]
+
+        start = time.perf_counter()
+        results = [extract_file_number(f) for f in filenames]
+        elapsed = time.perf_counter() - start
+
+        assert results[-1] == ("L", 100_000)
+        # >= 100k names/s
+        assert elapsed < 1.0, f"100k extractions took {elapsed:.2f}s"
+        print(f"\nRegex extraction: {len(filenames) / elapsed:,.0f} names/s (single)")
+
+    def test_extract_file_numbers_batch_100k(self) -> None:
+        """Batch extraction over 100k names should beat the per-name loop."""
+        from domain.file_naming import extract_file_numbers, partition_by_prefix
+
+        filenames = [f"L{i:05d}_TestLoop.txt" for i in range(1, 100_001)]
+
+        start = time.perf_counter()
+        results = extract_file_numbers(filenames)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 100_000
+        assert all(r is not None for r in results)
+        # >= 200k names/s
+        assert elapsed < 0.5, f"Batch extraction took {elapsed:.2f}s"
+        print(f"\nRegex extraction: {len(filenames) / elapsed:,.0f} names/s (batch)")
+
+        start = time.perf_counter()
+        groups = partition_by_prefix(filenames)
+        elapsed = time.perf_counter() - start
+
+        assert len(groups["L"]) == 100_000
+        assert elapsed < 0.5, f"Partition took {elapsed:.2f}s"
+
+
+# =============================================================================
+# Structured Logging Performance Tests
+# =============================================================================
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestStructuredLoggingPerformance:
+    """Overhead of structured log calls when DEBUG is disabled."""
+
+    def test_100k_suppressed_calls(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Suppressed calls should skip formatting entirely."""
+        import logging
+
+        from infrastructure.logging_config import log_debug
+        from infrastructure.structured_logging import get_structured_logger, lazy
+
+        logger = get_structured_logger("benchmark")
+        names = [f"L{i:05d}_TestLoop.txt" for i in range(20)]
+        count = 50_000  # 2 calls per iteration: 100k suppressed calls
+
+        def structured() -> None:
+            for i in range(count):
+                logger.state("find_new_files", level="weekly")
+                logger.file_op("found", count=i, names=lazy(lambda: names[:5]))
+
+        def eager() -> None:
+            # previous behaviour: build the key=value text before calling log_debug
+            for i in range(count):
+                for prefix, message, context in (
+                    ("[STATE]", "find_new_files", {"level": "weekly"}),
+                    ("[FILE]", "found", {"count": i, "names": names[:5]}),
+                ):
+                    text = " ".join(f"{k}={v}" for k, v in context.items())
+                    log_debug(f"{prefix} {message}: {text}")
+
+        def best_of(func: "Callable[[], None]", runs: int = 3) -> float:
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        with caplog.at_level(logging.INFO, logger="episodic_rag"):
+            lazy_time = best_of(structured)
+            eager_time = best_of(eager)
+
+        assert caplog.text == ""
+        assert lazy_time < eager_time / 2, (
+            f"suppressed calls {lazy_time:.3f}s vs eager formatting {eager_time:.3f}s"
+        )
+        assert lazy_time < 0.25, f"{2 * count} suppressed calls took {lazy_time:.3f}s"
+        print(
+            f"\nStructured logging: {lazy_time / (2 * count) * 1e9:.0f}ns/suppressed call "
+            f"(eager formatting {eager_time / (2 * count) * 1e9:.0f}ns)"
+        )
+
 
 # =============================================================================
 # Grand Digest Performance Tests
@@ -527,3 +733,309 @@ class TestFileAppendingPerformance:
         # 10 iterations of updating shadow should complete in under 10 seconds
         assert elapsed < 10.0, f"Shadow update took {elapsed:.2f}s for 10 iterations"
         print(f"\nShadow update: {elapsed:.3f}s for 10 iterations (50 files)")
+
+
+# =============================================================================
+# Full-text Search Performance Tests
+# =============================================================================
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestSearchPerformance:
+    """Performance tests for the BM25 digest search index."""
+
+    def test_search_5000_loops(
+        self, temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"
+    ) -> None:
+        """Top-k queries over 5k Loops should return in milliseconds."""
+        import random
+
+        from application.search import DigestSearchIndex
+        from infrastructure.file_index import reset_file_indexes
+        from infrastructure.json_repository import reset_json_read_cache
+
+        rng = random.Random(7)
+        vocabulary = [
+            "設計",
+            "実装",
+            "検索",
+            "索引",
+            "会話",
+            "振り返り",
+            "テスト",
+            "料理",
+            "旅行",
+            "読書",
+            "音楽",
+            "睡眠",
+            "運動",
+            "計画",
+            "記憶",
+            "要約",
+        ]
+        for i in range(1, 5001):
+            words = rng.sample(vocabulary, 6)
+            data = {
+                "overall_digest": {
+                    "digest_type": "会話",
+                    "keywords": words[:3],
+                    "abstract": "について話した。".join(words) * 5,
+                    "impression": f"{words[0]}が印象に残った。",
+                }
+            }
+            (temp_plugin_env.loops_path / f"L{i:05d}_Loop.txt").write_text(
+                json.dumps(data, ensure_ascii=False), encoding="utf-8"
+            )
+
+        start = time.perf_counter()
+        DigestSearchIndex(digest_config).refresh()
+        build = time.perf_counter() - start
+
+        # CLI の新しいプロセスと同じ状態（Loop追加から時間が経ち、前回の実行で
+        # file_index のマニフェストが保存済み。プロセス内キャッシュなし）
+        past = time.time_ns() - 10**10
+        os.utime(temp_plugin_env.loops_path, ns=(past, past))
+        reset_file_indexes()
+        DigestSearchIndex(digest_config).refresh()
+        reset_file_indexes()
+        reset_json_read_cache()
+
+        start = time.perf_counter()
+        index = DigestSearchIndex(digest_config)
+        assert index.refresh()["indexed"] == 0
+        hits = index.search("検索の設計について", top_k=10)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(20):
+            hits = index.search("検索の設計について", top_k=10)
+        query = (time.perf_counter() - start) / 20
+
+        assert len(hits) == 10
+        assert build < 20.0, f"Index build took {build:.2f}s for 5000 loops"
+        assert cold < 0.2, f"Cold load+refresh+query took {cold * 1000:.0f}ms"
+        assert query < 0.1, f"Search took {query * 1000:.1f}ms per query"
+        print(
+            f"\nSearch: build {build:.2f}s, cold load+refresh+query {cold * 1000:.0f}ms, "
+            f"query {query * 1000:.1f}ms (5000 loops)"
+        )
+
+    def test_hierarchical_search_cost_bounded(
+        self, temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"
+    ) -> None:
+        """Beam search should score O(depth x beam x fanout) nodes, not the corpus."""
+        from unittest.mock import patch
+
+        from application.search import DigestSearchIndex
+
+        fanout = 5
+        counts = {"loop": 3125, "weekly": 625, "monthly": 125, "quarterly": 25, "annual": 5}
+        topics = ["設計", "料理", "旅行", "読書", "音楽"]
+
+        def write(path: Path, data: dict) -> None:
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        names: dict = {}
+        for level, count in counts.items():
+            prefix = LEVEL_CONFIG[level]["prefix"]
+            digits = LEVEL_CONFIG[level]["digits"]
+            names[level] = [f"{prefix}{i:0{digits}d}_x.txt" for i in range(1, count + 1)]
+
+        children_level = {
+            "weekly": "loop",
+            "monthly": "weekly",
+            "quarterly": "monthly",
+            "annual": "quarterly",
+        }
+        for level, files in names.items():
+            directory = (
+                temp_plugin_env.loops_path
+                if level == "loop"
+                else digest_config.get_level_dir(level)
+            )
+            directory.mkdir(parents=True, exist_ok=True)
+            for i, name in enumerate(files):
+                overall = {"digest_type": "t", "abstract": f"{topics[i % 5]}の記録{i}"}
+                if level in children_level:
+                    overall["source_files"] = names[children_level[level]][
+                        i * fanout : (i + 1) * fanout
+                    ]
+                write(directory / name, {"overall_digest": overall})
+
+        index = DigestSearchIndex(digest_config)
+        index.refresh()
+        total = len(index)
+
+        with patch.object(
+            index._bm25, "score_documents", wraps=index._bm25.score_documents
+        ) as scorer:
+            start = time.perf_counter()
+            hits = index.search_hierarchical("設計の記録", beam_width=3)
+            elapsed = time.perf_counter() - start
+
+        scored = sum(len(call.args[1]) for call in scorer.call_args_list)
+        assert hits
+        # roots (5 annual) + 4 levels x beam 3 x fanout 5
+        assert scored <= 5 + 4 * 3 * fanout
+        assert elapsed < 0.05, f"Hierarchical search took {elapsed * 1000:.1f}ms"
+        print(f"\nHierarchical search: scored {scored}/{total} nodes in {elapsed * 1000:.2f}ms")
+
+    def test_most_similar_10k_digests(self) -> None:
+        """ "10 most similar past weeks" over 10k digest vectors."""
+        import random
+
+        from application.search.tokenizer import tokenize
+        from application.search.vector_index import HashedVectorIndex, is_numpy_available
+
+        rng = random.Random(11)
+        vocabulary = [
+            "設計",
+            "実装",
+            "検索",
+            "索引",
+            "会話",
+            "振り返り",
+            "テスト",
+            "料理",
+            "旅行",
+            "読書",
+            "音楽",
+            "睡眠",
+            "運動",
+            "計画",
+            "記憶",
+            "要約",
+        ]
+        index = HashedVectorIndex()
+        for i in range(1, 10001):
+            words = rng.sample(vocabulary, 6)
+            index.add(f"weekly/W{i:04d}_x.txt", tokenize("について話した。".join(words) * 3))
+
+        start = time.perf_counter()
+        index.most_similar(tokenize("warmup"), top_k=1)
+        build = time.perf_counter() - start
+
+        shadow = tokenize("検索の設計と実装について振り返った。")
+        start = time.perf_counter()
+        for _ in range(10):
+            hits = index.most_similar(shadow, top_k=10)
+        query = (time.perf_counter() - start) / 10
+
+        assert len(hits) == 10
+        # NumPy 行列積・純Python フォールバックとも 50ms 未満
+        assert query < 0.05, f"Similarity query took {query * 1000:.1f}ms"
+        print(
+            f"\nVector similarity: vectorize {build:.2f}s, "
+            f"query {query * 1000:.1f}ms (10k digests, numpy={is_numpy_available()})"
+        )
+
+    def test_context_pack_cache_hit(
+        self, temp_plugin_env: "TempPluginEnvironment", digest_config: "DigestConfig"
+    ) -> None:
+        """Session-start context pack should be served from the mtime-keyed cache."""
+        from application.search import ContextPackBuilder
+
+        overall = {"name": "W0001_x", "keywords": ["設計"], "abstract": "設計の振り返り。" * 200}
+        (digest_config.essences_path / "GrandDigest.txt").write_text(
+            json.dumps(
+                {"major_digests": {"weekly": {"overall_digest": overall}}}, ensure_ascii=False
+            ),
+            encoding="utf-8",
+        )
+        for i in range(1, 501):
+            data = {"overall_digest": {"abstract": f"設計の記録{i}"}}
+            (temp_plugin_env.loops_path / f"L{i:05d}_Loop.txt").write_text(
+                json.dumps(data, ensure_ascii=False), encoding="utf-8"
+            )
+
+        start = time.perf_counter()
+        ContextPackBuilder(digest_config).build()
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pack = ContextPackBuilder(digest_config).build()
+        warm = time.perf_counter() - start
+
+        assert pack.cached is True
+        assert warm < 0.05, f"Cached context pack took {warm * 1000:.1f}ms"
+        print(f"\nContext pack: cold {cold * 1000:.0f}ms, cached {warm * 1000:.2f}ms")
+
+
+# =============================================================================
+# Storage Backend Performance Tests
+# =============================================================================
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestStorageBackendPerformance:
+    """JSON text files vs. the SQLite backend on the same RegularDigest records."""
+
+    def test_json_files_vs_sqlite(self, tmp_path: Path) -> None:
+        """SQLite should beat per-file JSON on bulk writes and source reverse lookups.
+
+        The default size keeps the suite fast; set EPISODIC_RAG_BENCH_RECORDS=100000
+        for the full 100k-record comparison.
+        """
+        import os
+
+        from infrastructure.json_repository import safe_read_json, save_json
+        from infrastructure.sqlite_store import SqliteDigestStore
+
+        count = int(os.environ.get("EPISODIC_RAG_BENCH_RECORDS", "10000"))
+
+        def record(i: int) -> "Dict[str, Any]":
+            source = f"L{i:05d}_Loop.txt"
+            return {
+                "metadata": {"digest_level": "weekly", "version": "1.0"},
+                "overall_digest": {
+                    "name": f"W{i:05d}_x",
+                    "source_files": [source],
+                    "abstract": "週の振り返り。" * 20,
+                    "keywords": ["設計", "検索"],
+                },
+                "individual_digests": [{"source_file": source, "abstract": "記録。" * 10}],
+            }
+
+        targets = {f"L{i:05d}_Loop.txt" for i in range(1, count + 1, max(count // 100, 1))}
+
+        # JSON backend: one file per digest, reverse lookup scans every file
+        json_dir = tmp_path / "1_Weekly"
+        json_dir.mkdir()
+        start = time.perf_counter()
+        for i in range(1, count + 1):
+            save_json(json_dir / f"W{i:05d}_x.txt", record(i))
+        json_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        json_hits = {}
+        for path in json_dir.glob("W*.txt"):
+            data = safe_read_json(path, raise_on_error=False) or {}
+            for source in data.get("overall_digest", {}).get("source_files", []):
+                if source in targets:
+                    json_hits[source] = path.stem
+        json_lookup = time.perf_counter() - start
+
+        # SQLite backend: one transaction, indexed source_links
+        store = SqliteDigestStore(tmp_path / "EpisodicRAG.db")
+        start = time.perf_counter()
+        store.save_regular_digests(
+            ("weekly", f"W{i:05d}_x", record(i)) for i in range(1, count + 1)
+        )
+        sqlite_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sqlite_hits = {source: store.find_digests_by_source(source)[0][1] for source in targets}
+        sqlite_lookup = time.perf_counter() - start
+        store.close()
+
+        assert sqlite_hits == json_hits
+        assert sqlite_write < json_write
+        assert sqlite_lookup < json_lookup
+        print(
+            f"\nStorage backends ({count} records): "
+            f"write json {json_write:.2f}s / sqlite {sqlite_write:.2f}s, "
+            f"{len(targets)} reverse lookups json {json_lookup:.2f}s / "
+            f"sqlite {sqlite_lookup * 1000:.1f}ms"
+        )
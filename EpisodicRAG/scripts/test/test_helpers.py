@@ -208,6 +208,7 @@ class TempPluginEnvironment:
         "infrastructure.config.persistent_path.get_persistent_config_dir",
         "infrastructure.config.get_persistent_config_dir",
         "application.tracking.digest_times.get_persistent_config_dir",
+        "application.storage.text_layout.get_persistent_config_dir",
     ]
 
     # get_config_path()のモック対象パス